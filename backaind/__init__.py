@@ -3,15 +3,34 @@ import os
 
 from flask import Flask, g
 
-from . import aifile, ainteraction, auth, knowledge, settings, workshop
+from . import (
+    aifile,
+    ainteraction,
+    auth,
+    bench,
+    brain,
+    catalog,
+    conversations,
+    embedding_cache,
+    knowledge,
+    latency,
+    metrics,
+    response_cache,
+    settings,
+    tracing,
+    workshop,
+)
 from .api import ai as api_ai, knowledge as api_knowledge
 from .extensions import db, migrate, socketio
 from .models import *
 
 
-def create_app(test_config=None):
-    """Create a new ownAI Flask application."""
-    app = Flask(__name__)
+def create_app(test_config=None, instance_path=None):
+    """
+    Create a new ownAI Flask application.
+    The instance folder (e.g. with caches and logs) defaults to the "instance" folder.
+    """
+    app = Flask(__name__, instance_path=instance_path)
 
     if test_config is None:
         # load from environment when not testing
@@ -35,7 +54,16 @@ def create_app(test_config=None):
     auth.init_app(app)
     aifile.init_app(app)
     ainteraction.init_app(app)
+    brain.init_app(app)
+    bench.init_app(app)
+    catalog.init_app(app)
+    conversations.init_app(app)
+    embedding_cache.init_app(app)
     knowledge.init_app(app)
+    latency.init_app(app)
+    response_cache.init_app(app)
+    settings.init_app(app)
+    tracing.init_app(app)
 
     # register blueprints
     app.register_blueprint(auth.bp)
@@ -44,6 +72,8 @@ def create_app(test_config=None):
     app.register_blueprint(workshop.bp)
     app.register_blueprint(api_ai.bp)
     app.register_blueprint(api_knowledge.bp)
+    app.register_blueprint(metrics.bp)
+    app.register_blueprint(tracing.bp)
     app.add_url_rule("/", endpoint="index")
 
     return app
@@ -4,7 +4,9 @@ import json
 import click
 from flask import current_app
 
+from .catalog import invalidate_catalog
 from .extensions import db
+from .knowledge import get_retrieval_config, KnowledgeConfigError
 from .models import Ai
 
 MAX_AIFILEVERSION = 1
@@ -30,6 +32,11 @@ def validate_aifile(aifile):
     if aifile["aifileversion"] > MAX_AIFILEVERSION:
         raise InvalidAifileError("This aifile requires a newer version of ownAI.")
 
+    try:
+        get_retrieval_config(aifile.get("retrieval"))
+    except KnowledgeConfigError as error:
+        raise InvalidAifileError(str(error)) from error
+
 
 def get_input_keys(aifile):
     """Get all input keys for an aifile."""
@@ -77,6 +84,7 @@ def add_ai(aifile_path):
     input_labels = aifile.get("input_labels")
     chain = aifile["chain"]
     greeting = aifile.get("greeting")
+    retrieval = aifile.get("retrieval")
 
     existing_ai = db.session.query(Ai).filter_by(name=name).first()
 
@@ -87,17 +95,21 @@ def add_ai(aifile_path):
             input_labels=input_labels,
             chain=chain,
             greeting=greeting,
+            retrieval=retrieval,
         )
         db.session.add(new_ai)
         db.session.commit()
+        invalidate_catalog()
         click.echo(f"Added {name}. Say hello!")
     else:
         existing_ai.input_keys = input_keys
         existing_ai.input_labels = input_labels
         existing_ai.chain = chain
         existing_ai.greeting = greeting
+        existing_ai.retrieval = retrieval
         existing_ai.name = name
         db.session.commit()
+        invalidate_catalog()
         click.echo(f"Updated {name}. Say hello!")
 
 
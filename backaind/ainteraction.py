@@ -1,17 +1,48 @@
 """Allow interaction with an AI."""
 from datetime import datetime
 import json
+import time
+from typing import Hashable, Optional
 
-from flask import Blueprint, render_template, session, g, redirect, url_for
+from flask import (
+    Blueprint,
+    current_app,
+    make_response,
+    render_template,
+    request,
+    session,
+    g,
+    redirect,
+    url_for,
+)
 from flask_socketio import emit, disconnect
 from langchain.memory import ConversationBufferWindowMemory
 
-from .brain import reply
-from .extensions import db, socketio
-from .models import Ai, Knowledge
+from .brain import reply, summarize
+from .catalog import get_catalog
+from .conversations import (
+    ActiveConversation,
+    ConversationError,
+    delete_conversation,
+    get_conversation,
+    get_messages_to_summarize,
+    save_turn,
+    summarize_conversation,
+)
+from .extensions import socketio
+from .metrics import queue_wait_seconds, responses_total
+from .scheduler import (
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_CONCURRENT_PER_AI,
+    DEFAULT_MAX_QUEUE_SIZE,
+    QueueFullError,
+    Scheduler,
+)
 from .settings import get_settings
+from .tracing import add_span, set_trace_attributes, span, trace
 
 bp = Blueprint("ainteraction", __name__)
+scheduler = Scheduler()
 
 
 @bp.route("/")
@@ -24,115 +55,231 @@ def index(_ai=None):
     if is_public and not ais:
         return redirect(url_for("auth.login"))
 
-    return render_template(
-        "ainteraction/index.html",
-        ais=json.dumps(ais),
-        knowledges=json.dumps(get_knowledge_data(only_public=is_public)),
+    response = make_response(
+        render_template(
+            "ainteraction/index.html",
+            ais=json.dumps(ais),
+            knowledges=json.dumps(get_knowledge_data(only_public=is_public)),
+        )
     )
+    # repeated views of an unchanged page are answered with 304 Not Modified
+    response.headers["Cache-Control"] = "no-cache"
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 def handle_incoming_message(message):
     """Handle an incoming socket.io message from a user."""
-    is_public = session.get("user_id") is None
     ai_id = message.get("aiId")
     knowledge_id = message.get("knowledgeId")
+    with trace("message", ai_id=ai_id, knowledge_id=knowledge_id):
+        answer_message(message, ai_id, knowledge_id)
 
-    if not ai_id:
-        disconnect()
-        return
 
-    if is_public and not is_ai_public(ai_id):
-        disconnect()
-        return
+def handle_clear_conversation(message):
+    """Forget the conversation a user has cleared."""
+    try:
+        delete_conversation(message.get("conversationId"), session.get("user_id"))
+    except ConversationError:
+        pass
+
 
-    if is_public and knowledge_id and not is_knowledge_public(knowledge_id):
+def answer_message(message, ai_id: Optional[int], knowledge_id: Optional[int]):
+    """Check if the user may use the AI and knowledge and send the AI's response."""
+    is_public = session.get("user_id") is None
+
+    with span("auth_check"):
+        is_allowed = (
+            bool(ai_id)
+            and (not is_public or is_ai_public(ai_id))
+            and (not is_public or not knowledge_id or is_knowledge_public(knowledge_id))
+        )
+    if not is_allowed:
+        set_trace_attributes(result="disconnected")
         disconnect()
         return
 
     response_id = message.get("responseId")
     message_text = message.get("message", {}).get("text", "")
 
-    memory = ConversationBufferWindowMemory(k=3)
-    for history_message in message.get("history", []):
-        if history_message.get("author", {}).get("species") == "ai":
-            memory.chat_memory.add_ai_message(history_message.get("text", ""))
+    conversation = None
+    with span("memory_construction"):
+        if message.get("conversationId") is not None:
+            try:
+                conversation = get_conversation(
+                    message["conversationId"], session.get("user_id")
+                )
+            except ConversationError as exception:
+                send_response(response_id, str(exception), "error")
+                count_response(ai_id, knowledge_id, "error")
+                return
+            memory = conversation.memory
         else:
-            memory.chat_memory.add_user_message(history_message.get("text", ""))
+            # clients without a conversation send the full history with every message
+            memory = ConversationBufferWindowMemory(k=3)
+            for history_message in message.get("history", []):
+                if history_message.get("author", {}).get("species") == "ai":
+                    memory.chat_memory.add_ai_message(history_message.get("text", ""))
+                else:
+                    memory.chat_memory.add_user_message(history_message.get("text", ""))
 
+    user_key = session.get("user_id") or getattr(request, "sid", None)
+    queued_at = time.monotonic()
     try:
-        response = reply(
+        with scheduler.slot(
             ai_id,
-            message_text,
-            knowledge_id,
-            memory,
-            lambda token: send_next_token(response_id, token),
-            lambda progress: send_progress(response_id, progress),
-            get_settings(session.get("user_id", -1)).get("external-providers", {}),
-        )
+            user_key,
+            lambda position: send_progress(response_id, 0, position),
+        ):
+            queue_wait_seconds.observe(time.monotonic() - queued_at, ai_id=ai_id)
+            add_span("queue_wait", queued_at, time.monotonic())
+            with span("settings_lookup"):
+                user_settings = get_settings(session.get("user_id", -1))
+            response = reply(
+                ai_id,
+                message_text,
+                knowledge_id,
+                memory,
+                lambda token: send_next_token(response_id, token),
+                lambda progress, seconds: send_progress(
+                    response_id, progress, seconds_remaining=seconds
+                ),
+                user_settings.get("external-providers", {}),
+            )
         send_response(response_id, response.strip())
+        count_response(ai_id, knowledge_id, "success")
+        if conversation is not None:
+            with span("conversation_save"):
+                save_turn(conversation, message_text, response.strip())
+            start_summary(
+                conversation,
+                ai_id,
+                user_key,
+                user_settings.get("external-providers", {}),
+            )
+    except QueueFullError as exception:
+        send_response(response_id, str(exception), "error")
+        count_response(ai_id, knowledge_id, "queue_full")
     # pylint: disable=broad-exception-caught
     except Exception as exception:
         send_response(response_id, str(exception), "error")
+        count_response(ai_id, knowledge_id, "error")
         raise exception
 
 
-def init_app(_app):
-    """Register handling of incoming socket.io messages."""
+def start_summary(
+    conversation: ActiveConversation,
+    ai_id: int,
+    user_key: Hashable,
+    updated_environment: dict,
+):
+    """Compact the older messages of the conversation in the background if required."""
+    messages = get_messages_to_summarize(conversation)
+    if not messages:
+        return
+    # pylint: disable-next=protected-access
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    socketio.start_background_task(
+        run_summary, app, conversation, messages, ai_id, user_key, updated_environment
+    )
+
+
+# pylint: disable-next=too-many-arguments
+def run_summary(
+    app,
+    conversation: ActiveConversation,
+    messages: list,
+    ai_id: int,
+    user_key: Hashable,
+    updated_environment: dict,
+):
+    """
+    Add messages onto the summary of a conversation (runs after the response is sent).
+    Like a message of the user, the summary waits for a slot of the scheduler, so it counts
+    towards the concurrency limits.
+    """
+
+    def summarize_in_slot(summary: str, new_messages: list) -> str:
+        with scheduler.slot(ai_id, user_key):
+            return summarize(ai_id, summary, new_messages, updated_environment)
+
+    with app.app_context():
+        try:
+            summarize_conversation(conversation, messages, summarize_in_slot)
+        except QueueFullError:
+            app.logger.info(
+                "Postponed summary of conversation %s (queue is full).",
+                conversation.id,
+            )
+        # pylint: disable-next=broad-exception-caught
+        except Exception:
+            # the messages are kept and summarized with the next turn
+            app.logger.exception(
+                "Could not summarize conversation %s.", conversation.id
+            )
+
+
+def count_response(ai_id: int, knowledge_id: Optional[int], status: str):
+    """Count an answered message in the metrics."""
+    responses_total.inc(ai_id=ai_id, knowledge_id=knowledge_id or "", status=status)
+    set_trace_attributes(result=status)
+
+
+def init_app(app):
+    """Register handling of incoming socket.io messages and configure the scheduler."""
+    worker_pool_size = app.config.get("WORKER_POOL_SIZE", 0)
+    scheduler.configure(
+        app.config.get("SCHEDULER_MAX_QUEUE_SIZE", DEFAULT_MAX_QUEUE_SIZE),
+        app.config.get(
+            "SCHEDULER_MAX_CONCURRENT", worker_pool_size or DEFAULT_MAX_CONCURRENT
+        ),
+        app.config.get(
+            "SCHEDULER_MAX_CONCURRENT_PER_AI", DEFAULT_MAX_CONCURRENT_PER_AI
+        ),
+    )
     socketio.on("message")(handle_incoming_message)
+    socketio.on("clear")(handle_clear_conversation)
 
 
 def get_ai_data(only_public=True):
     """Get data for all AIs."""
-    ai_query = db.session.query(Ai)
-    if only_public:
-        ai_query = ai_query.filter_by(is_public=True)
-    return [
-        {
-            "id": ai.id,
-            "name": ai.name,
-            "input_keys": ai.input_keys,
-            "input_labels": ai.input_labels,
-            "greeting": ai.greeting,
-        }
-        for ai in ai_query.all()
-    ]
+    return get_catalog().get_ais(only_public)
 
 
 def get_knowledge_data(only_public=True):
     """Get data for all knowledges."""
-    knowledge_query = db.session.query(Knowledge)
-    if only_public:
-        knowledge_query = knowledge_query.filter_by(is_public=True)
-    return [
-        {
-            "id": knowledge.id,
-            "name": knowledge.name,
-        }
-        for knowledge in knowledge_query.all()
-    ]
+    return get_catalog().get_knowledges(only_public)
 
 
 def is_ai_public(ai_id: int):
     """Check if an AI is public."""
-    ai = db.session.get(Ai, ai_id)
-    return bool(ai and ai.is_public)
+    return ai_id in get_catalog().public_ai_ids
 
 
 def is_knowledge_public(knowledge_id: int):
     """Check if a knowledge is public."""
-    knowledge = db.session.get(Knowledge, knowledge_id)
-    return bool(knowledge and knowledge.is_public)
+    return knowledge_id in get_catalog().public_knowledge_ids
 
 
-def send_progress(response_id: int, progress: int):
-    """Send the current progress to the user."""
-    emit(
-        "progress",
-        {
-            "messageId": response_id,
-            "progress": progress,
-        },
-    )
+def send_progress(
+    response_id: int,
+    progress: int,
+    queue_position: Optional[int] = None,
+    seconds_remaining: Optional[float] = None,
+):
+    """
+    Send the current progress (or the position in the queue) to the user, optionally with
+    the estimated seconds until the response is complete.
+    """
+    data = {
+        "messageId": response_id,
+        "progress": progress,
+    }
+    if queue_position is not None:
+        data["queuePosition"] = queue_position
+    if seconds_remaining is not None:
+        data["secondsRemaining"] = round(seconds_remaining)
+    emit("progress", data)
 
 
 def send_next_token(response_id: int, token_text: str):
@@ -3,7 +3,9 @@ from flask import Blueprint, jsonify, request, make_response, abort
 
 from ..auth import login_required
 from ..brain import reset_global_chain
+from ..catalog import invalidate_catalog
 from ..extensions import db
+from ..knowledge import get_retrieval_config, KnowledgeConfigError
 from ..models import Ai
 
 bp = Blueprint("api-ai", __name__, url_prefix="/api/ai")
@@ -62,6 +64,10 @@ def validate(ai_json):
                 jsonify(error='The property "greeting" has to be a string.'), 400
             )
         )
+    try:
+        get_retrieval_config(ai_json.get("retrieval"))
+    except KnowledgeConfigError as error:
+        abort(make_response(jsonify(error=str(error)), 400))
 
 
 @bp.route("/", methods=["GET"])
@@ -91,15 +97,18 @@ def create_ai():
     input_labels = request.json.get("input_labels")
     chain = request.json["chain"]
     greeting = request.json.get("greeting")
+    retrieval = request.json.get("retrieval")
     new_ai = Ai(
         name=name,
         input_keys=input_keys,
         input_labels=input_labels,
         chain=chain,
         greeting=greeting,
+        retrieval=retrieval,
     )
     db.session.add(new_ai)
     db.session.commit()
+    invalidate_catalog()
     return (
         jsonify(new_ai.as_dict()),
         201,
@@ -118,6 +127,7 @@ def update_ai(ai_id):
     input_labels = request.json.get("input_labels")
     chain = request.json["chain"]
     greeting = request.json.get("greeting")
+    retrieval = request.json.get("retrieval")
 
     existing_ai = db.get_or_404(Ai, ai_id)
     existing_ai.name = name
@@ -125,7 +135,9 @@ def update_ai(ai_id):
     existing_ai.input_labels = input_labels
     existing_ai.chain = chain
     existing_ai.greeting = greeting
+    existing_ai.retrieval = retrieval
     db.session.commit()
+    invalidate_catalog()
     reset_global_chain(ai_id)
     return existing_ai.as_dict()
 
@@ -137,5 +149,6 @@ def delete_ai(ai_id):
     existing_ai = db.get_or_404(Ai, ai_id)
     db.session.delete(existing_ai)
     db.session.commit()
+    invalidate_catalog()
     reset_global_chain(ai_id)
     return ("", 204)
@@ -6,15 +6,22 @@ import uuid
 
 from flask import Blueprint, jsonify, request, make_response, abort, current_app
 from langchain.document_loaders.base import BaseLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from ..auth import login_required
+from ..catalog import invalidate_catalog
 from ..extensions import db
+from ..ingestion import (
+    cancel_ingestion_job,
+    get_ingestion_job,
+    get_ingestion_jobs,
+    submit_ingestion_job,
+)
 from ..knowledge import (
-    add_to_knowledge,
     reset_global_knowledge,
     get_from_knowledge,
     delete_from_knowledge,
+    DEFAULT_VECTOR_STORE,
+    VECTOR_STORE_BACKENDS,
 )
 from ..models import Knowledge
 
@@ -37,6 +44,10 @@ def validate(knowledge_json):
         )
     if not knowledge_json["embeddings"] in ("huggingface",):
         abort(make_response(jsonify(error="Unknown embeddings type."), 400))
+    if knowledge_json.get("vector_store", DEFAULT_VECTOR_STORE) not in (
+        VECTOR_STORE_BACKENDS
+    ):
+        abort(make_response(jsonify(error="Unknown vector store."), 400))
     if not "chunk_size" in knowledge_json:
         abort(
             make_response(jsonify(error='The property "chunk_size" is required.'), 400)
@@ -74,6 +85,7 @@ def create_knowledge():
     name = request.json["name"]
     embeddings = request.json["embeddings"]
     chunk_size = request.json["chunk_size"]
+    vector_store = request.json.get("vector_store", DEFAULT_VECTOR_STORE)
     persist_directory = os.path.join(
         current_app.instance_path, "knowledge-" + uuid.uuid4().hex
     )
@@ -84,9 +96,11 @@ def create_knowledge():
         embeddings=embeddings,
         chunk_size=chunk_size,
         persist_directory=persist_directory,
+        vector_store=vector_store,
     )
     db.session.add(new_knowledge)
     db.session.commit()
+    invalidate_catalog()
     return (
         jsonify(new_knowledge.as_dict()),
         201,
@@ -109,10 +123,19 @@ def update_knowledge(knowledge_id):
                 jsonify(error="Cannot change the embeddings type afterwards."), 400
             )
         )
+    if request.json.get("vector_store", existing_knowledge.vector_store) != (
+        existing_knowledge.vector_store
+    ):
+        abort(
+            make_response(
+                jsonify(error="Cannot change the vector store afterwards."), 400
+            )
+        )
 
     existing_knowledge.name = name
     existing_knowledge.chunk_size = chunk_size
     db.session.commit()
+    invalidate_catalog()
     reset_global_knowledge(knowledge_id)
     return jsonify(
         {
@@ -120,6 +143,7 @@ def update_knowledge(knowledge_id):
             "name": name,
             "embeddings": existing_knowledge.embeddings,
             "chunk_size": chunk_size,
+            "vector_store": existing_knowledge.vector_store,
         }
     )
 
@@ -132,6 +156,7 @@ def delete_knowledge(knowledge_id):
     persist_directory = existing_knowledge.persist_directory
     db.session.delete(existing_knowledge)
     db.session.commit()
+    invalidate_catalog()
     shutil.rmtree(persist_directory)
     reset_global_knowledge(knowledge_id)
     return ("", 204)
@@ -163,8 +188,7 @@ def upload_txt(knowledge_id):
 
     file_path = handle_upload(request.files.get("file"))
     loader = TextLoader(file_path, encoding="utf8")
-    load_into_knowledge(loader, knowledge_id)
-    return ("", 204)
+    return load_into_knowledge(loader, knowledge_id, file_path)
 
 
 @bp.route("/<int:knowledge_id>/document/pdf", methods=["POST"])
@@ -176,8 +200,7 @@ def upload_pdf(knowledge_id):
 
     file_path = handle_upload(request.files.get("file"))
     loader = PyPDFLoader(file_path)
-    load_into_knowledge(loader, knowledge_id)
-    return ("", 204)
+    return load_into_knowledge(loader, knowledge_id, file_path)
 
 
 @bp.route("/<int:knowledge_id>/document/docx", methods=["POST"])
@@ -189,8 +212,7 @@ def upload_docx(knowledge_id):
 
     file_path = handle_upload(request.files.get("file"))
     loader = Docx2txtLoader(file_path)
-    load_into_knowledge(loader, knowledge_id)
-    return ("", 204)
+    return load_into_knowledge(loader, knowledge_id, file_path)
 
 
 def handle_upload(file):
@@ -203,10 +225,46 @@ def handle_upload(file):
     return file_path
 
 
-def load_into_knowledge(loader: BaseLoader, knowledge_id: int):
-    """Load content from the document loader into knowledge."""
-    knowledge = db.get_or_404(Knowledge, knowledge_id)
-    chunks = loader.load_and_split(
-        RecursiveCharacterTextSplitter(chunk_size=knowledge.chunk_size)
+def load_into_knowledge(loader: BaseLoader, knowledge_id: int, file_path: str):
+    """
+    Queue the content of the document loader to be added to the knowledge.
+    With the form field replace=true, a previously uploaded file with the same name gets
+    replaced.
+    """
+    db.get_or_404(Knowledge, knowledge_id)
+    job = submit_ingestion_job(
+        knowledge_id,
+        loader,
+        os.path.dirname(file_path),
+        os.path.basename(file_path),
+        request.form.get("replace", "false").lower() == "true",
     )
-    add_to_knowledge(knowledge_id, chunks)
+    return (jsonify(job.as_dict()), 202)
+
+
+@bp.route("/<int:knowledge_id>/job", methods=["GET"])
+@login_required
+def get_jobs(knowledge_id):
+    """Get all known upload jobs of the knowledge."""
+    return [job.as_dict() for job in get_ingestion_jobs(knowledge_id)]
+
+
+@bp.route("/<int:knowledge_id>/job/<string:job_id>", methods=["GET"])
+@login_required
+def get_job(knowledge_id, job_id):
+    """Get the status and progress of an upload job."""
+    job = get_ingestion_job(job_id)
+    if job is None or job.knowledge_id != knowledge_id:
+        abort(404)
+    return job.as_dict()
+
+
+@bp.route("/<int:knowledge_id>/job/<string:job_id>", methods=["DELETE"])
+@login_required
+def cancel_job(knowledge_id, job_id):
+    """Cancel an upload job (already embedded chunks of the document get removed)."""
+    job = get_ingestion_job(job_id)
+    if job is None or job.knowledge_id != knowledge_id:
+        abort(404)
+    cancel_ingestion_job(job_id)
+    return (jsonify(job.as_dict()), 202)
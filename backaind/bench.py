@@ -0,0 +1,774 @@
+"""Benchmark the performance of ownAI."""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import math
+import multiprocessing
+import os
+import queue
+import random
+import secrets
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import click
+from flask import current_app
+from langchain.docstore.document import Document
+from langchain.embeddings.base import Embeddings
+from langchain.embeddings.fake import DeterministicFakeEmbedding
+from langchain.memory import ConversationBufferWindowMemory
+import numpy as np
+
+from .aifile import get_input_keys
+from .brain import process_chain_messages, reply, reset_global_chain
+from .catalog import invalidate_catalog
+from .extensions import db, socketio
+from .knowledge import (
+    add_to_knowledge,
+    create_vector_store,
+    get_embeddings,
+    reset_global_knowledge,
+    VECTOR_STORE_BACKENDS,
+)
+from .latency import approximate_token_count
+from .models import Ai, Knowledge
+from .streaming import DEFAULT_TOKEN_FLUSH_BYTES, DEFAULT_TOKEN_FLUSH_INTERVAL_MS
+from .workers import run_chain_process
+
+TIMESTAMP_SEPARATOR = "|"
+BENCHMARK_NAME = "ownAI Benchmark"
+BENCHMARK_PATHS = ("reply", "socketio")
+RETRIEVAL_BUILD_BATCH_SIZE = 1000
+SYNTHETIC_VOCABULARY = (
+    "apple banana cherry garden river mountain forest ocean planet rocket engine "
+    "battery circuit network server database cache memory kernel thread process "
+    "socket packet router browser window button keyboard screen pixel camera "
+    "music guitar piano violin poem story novel author library museum castle "
+    "bridge tunnel train bicycle harbor island desert valley volcano glacier"
+).split()
+
+
+class TimestampTokenChain:
+    """Stand-in for a chain that streams tokens containing their creation time."""
+
+    def __init__(self, tokens: int, tokens_per_second: float):
+        self.tokens = tokens
+        self.tokens_per_second = tokens_per_second
+
+    def __call__(self, _inputs, callbacks):
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+        for callback in callbacks:
+            callback.on_llm_start({}, ["Synthetic prompt"])
+        for _ in range(self.tokens):
+            token = f"{time.time():.6f}{TIMESTAMP_SEPARATOR}"
+            for callback in callbacks:
+                callback.on_llm_new_token(token)
+            if delay:
+                time.sleep(delay)
+        return {"output_text": ""}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Return the percentile of the values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def run_streaming_benchmark(
+    tokens: int, tokens_per_second: float, flush_interval_ms: float, flush_bytes: int
+) -> dict:
+    """
+    Stream synthetic tokens from a chain process to a simulated socket.io emit and measure
+    the number of messages and events as well as the latency of every token.
+    """
+    pipe_messages = 0
+    emitted_events = 0
+    latencies: List[float] = []
+
+    def emit(text: str):
+        nonlocal emitted_events
+        received_at = time.time()
+        json.dumps({"messageId": 1, "text": text})
+        emitted_events += 1
+        for timestamp in text.split(TIMESTAMP_SEPARATOR)[:-1]:
+            latencies.append((received_at - float(timestamp)) * 1000)
+
+    def receive_messages(result_queue):
+        nonlocal pipe_messages
+        while True:
+            try:
+                message = result_queue.get(True, 1)
+            except queue.Empty:
+                if not process.is_alive():
+                    yield ("error", "The benchmark process stopped unexpectedly.")
+                yield None
+                continue
+            if message[0] == "token":
+                pipe_messages += 1
+            yield message
+
+    result_queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=run_chain_process,
+        args=(
+            TimestampTokenChain(tokens, tokens_per_second),
+            {},
+            result_queue,
+            (flush_interval_ms, flush_bytes),
+        ),
+        daemon=True,
+    )
+    started_at = time.time()
+    process.start()
+    process_chain_messages(receive_messages(result_queue), emit, None)
+    duration = time.time() - started_at
+    process.join()
+
+    return {
+        "flush_interval_ms": flush_interval_ms,
+        "flush_bytes": flush_bytes,
+        "tokens": len(latencies),
+        "pipe_messages": pipe_messages,
+        "emitted_events": emitted_events,
+        "duration_s": duration,
+        "events_per_second": emitted_events / duration,
+        "tokens_per_second": len(latencies) / duration,
+        "latency_ms": {
+            "first_token": latencies[0] if latencies else 0.0,
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies, default=0.0),
+        },
+    }
+
+
+def generate_synthetic_text(rng: random.Random, words: int) -> str:
+    """Return a text of random words from the synthetic vocabulary."""
+    return " ".join(rng.choice(SYNTHETIC_VOCABULARY) for _ in range(words))
+
+
+def generate_synthetic_documents(
+    count: int, words: int = 80, seed: int = 0
+) -> List[Document]:
+    """Return reproducible documents of random words for a synthetic knowledge."""
+    rng = random.Random(seed)
+    return [
+        Document(
+            page_content=generate_synthetic_text(rng, words),
+            metadata={"source": f"synthetic-{index}"},
+        )
+        for index in range(count)
+    ]
+
+
+def get_benchmark_aifile(response_tokens: int, with_knowledge: bool) -> dict:
+    """Return an Aifile of a FakeListLLM answering with the given number of tokens."""
+    llm_chain = {
+        "_type": "llm_chain",
+        "llm": {
+            "_type": "fake-list",
+            "responses": [" ".join(["token"] * response_tokens)],
+        },
+        "output_key": "output_text",
+        "prompt": {
+            "_type": "prompt",
+            "input_variables": ["input_history", "input_text"]
+            + (["summaries"] if with_knowledge else []),
+            "template": ("{summaries}\n" if with_knowledge else "")
+            + "{input_history}\n{input_text}",
+        },
+    }
+    chain = (
+        {
+            "_type": "stuff_documents_chain",
+            "document_prompt": {
+                "_type": "prompt",
+                "input_variables": ["page_content"],
+                "template": "{page_content}",
+            },
+            "document_variable_name": "summaries",
+            "input_key": "input_knowledge",
+            "llm_chain": {**llm_chain, "output_key": "text"},
+            "output_key": "output_text",
+        }
+        if with_knowledge
+        else llm_chain
+    )
+    return {"name": BENCHMARK_NAME, "aifileversion": 1, "chain": chain}
+
+
+@contextmanager
+def benchmark_ai(
+    response_tokens: int, knowledge_documents: int, seed: int = 0
+) -> Iterator[Tuple[int, Optional[int]]]:
+    """
+    Add a temporary public AI (and knowledge with synthetic documents) for the benchmark
+    and yield their IDs. Both get removed again when leaving the context.
+    """
+    aifile = get_benchmark_aifile(response_tokens, knowledge_documents > 0)
+    ai = Ai(
+        name=BENCHMARK_NAME,
+        input_keys=list(get_input_keys(aifile)),
+        chain=aifile["chain"],
+        is_public=True,
+    )
+    db.session.add(ai)
+    knowledge = None
+    if knowledge_documents > 0:
+        knowledge = Knowledge(
+            name=BENCHMARK_NAME,
+            embeddings="huggingface",
+            chunk_size=500,
+            persist_directory=tempfile.mkdtemp(prefix="ownai-bench-"),
+            is_public=True,
+        )
+        db.session.add(knowledge)
+    db.session.commit()
+    invalidate_catalog()
+    ai_id = ai.id
+    knowledge_id = knowledge.id if knowledge else None
+    persist_directory = knowledge.persist_directory if knowledge else None
+    try:
+        if knowledge_id is not None:
+            add_to_knowledge(
+                knowledge_id,
+                generate_synthetic_documents(knowledge_documents, seed=seed),
+            )
+        yield (ai_id, knowledge_id)
+    finally:
+        db.session.rollback()
+        db.session.query(Ai).filter_by(id=ai_id).delete()
+        if knowledge_id is not None:
+            db.session.query(Knowledge).filter_by(id=knowledge_id).delete()
+        db.session.commit()
+        invalidate_catalog()
+        reset_global_chain(ai_id)
+        if knowledge_id is not None:
+            reset_global_knowledge(knowledge_id)
+            shutil.rmtree(persist_directory, ignore_errors=True)
+
+
+class ReceivedEvents(list):
+    """Events received by a socket.io test client, with the time they were received."""
+
+    def append(self, event):
+        super().append({**event, "received_at": time.monotonic()})
+
+
+def measure_message(
+    started: float, first_token_at: Optional[float], response: str, error: bool
+) -> dict:
+    """Return the measurements of a single answered message."""
+    finished = time.monotonic()
+    latency = finished - started
+    tokens = approximate_token_count(response) if not error else 0
+    return {
+        "ttft_ms": ((first_token_at or finished) - started) * 1000,
+        "latency_ms": latency * 1000,
+        "tokens": tokens,
+        "tokens_per_second": tokens / latency if latency > 0 else 0.0,
+        "error": error,
+    }
+
+
+def run_reply_session(
+    app, ai_id: int, knowledge_id: Optional[int], questions: List[str]
+) -> List[dict]:
+    """Ask the questions of a session with brain.reply and measure every response."""
+    measurements = []
+    memory = ConversationBufferWindowMemory(k=3)
+    with app.app_context():
+        for question in questions:
+            started = time.monotonic()
+            first_token_at: Optional[float] = None
+
+            def on_token(_token):
+                nonlocal first_token_at
+                first_token_at = first_token_at or time.monotonic()
+
+            try:
+                response = reply(ai_id, question, knowledge_id, memory, on_token)
+                error = False
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exception:
+                response = str(exception)
+                error = True
+            measurements.append(
+                measure_message(started, first_token_at, response, error)
+            )
+            memory.chat_memory.add_user_message(question)
+            memory.chat_memory.add_ai_message(response)
+    return measurements
+
+
+def run_socketio_session(
+    client, ai_id: int, knowledge_id: Optional[int], questions: List[str]
+) -> List[dict]:
+    """Send the questions of a session as socket.io messages and measure every response."""
+    measurements = []
+    conversation_id = secrets.token_hex(16)
+    for index, question in enumerate(questions):
+        message = {"author": {"species": "human"}, "text": question}
+        client.queue.clear()
+        started = time.monotonic()
+        client.emit(
+            "message",
+            {
+                "aiId": ai_id,
+                "knowledgeId": knowledge_id,
+                "responseId": index,
+                "message": message,
+                "conversationId": conversation_id,
+            },
+        )
+        events = list(client.queue)
+        first_token_at = next(
+            (event["received_at"] for event in events if event["name"] == "token"),
+            None,
+        )
+        responses = [event["args"] for event in events if event["name"] == "message"]
+        response = responses[-1]["text"] if responses else ""
+        error = not responses or responses[-1]["status"] != "done"
+        measurements.append(measure_message(started, first_token_at, response, error))
+    return measurements
+
+
+def get_percentiles(values: List[float]) -> Dict[str, float]:
+    """Return the p50, p95, p99 and maximum of the values."""
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values, default=0.0),
+    }
+
+
+def summarize_measurements(
+    sessions: int, measurements: List[dict], duration: float
+) -> dict:
+    """Return the latency percentiles and throughput of a benchmark run."""
+    answered = [entry for entry in measurements if not entry["error"]]
+    return {
+        "sessions": sessions,
+        "messages": len(measurements),
+        "errors": len(measurements) - len(answered),
+        "duration_s": duration,
+        "throughput_tokens_per_second": sum(entry["tokens"] for entry in answered)
+        / duration
+        if duration > 0
+        else 0.0,
+        "ttft_ms": get_percentiles([entry["ttft_ms"] for entry in answered]),
+        "latency_ms": get_percentiles([entry["latency_ms"] for entry in answered]),
+        "tokens_per_second": get_percentiles(
+            [entry["tokens_per_second"] for entry in answered]
+        ),
+    }
+
+
+# pylint: disable-next=too-many-arguments
+def run_chat_benchmark(
+    path: str,
+    sessions: int,
+    messages: int,
+    ai_id: int,
+    knowledge_id: Optional[int],
+    seed: int = 0,
+) -> dict:
+    """Run concurrent chat sessions on the path ("reply" or "socketio") and summarize them."""
+    # pylint: disable-next=protected-access
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    rng = random.Random(seed)
+    questions = [
+        [
+            f"Question {session}.{index}: {generate_synthetic_text(rng, 8)}?"
+            for index in range(messages)
+        ]
+        for session in range(sessions)
+    ]
+    clients = (
+        [socketio.test_client(app) for _ in range(sessions)]
+        if path == "socketio"
+        else []
+    )
+    for client in clients:
+        client.queue = ReceivedEvents()
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        if path == "socketio":
+            futures = [
+                executor.submit(
+                    run_socketio_session, client, ai_id, knowledge_id, session_questions
+                )
+                for client, session_questions in zip(clients, questions)
+            ]
+        else:
+            futures = [
+                executor.submit(
+                    run_reply_session, app, ai_id, knowledge_id, session_questions
+                )
+                for session_questions in questions
+            ]
+        measurements = [entry for future in futures for entry in future.result()]
+    duration = time.monotonic() - started
+    for client in clients:
+        client.disconnect()
+    return summarize_measurements(sessions, measurements, duration)
+
+
+def get_max_concurrent_sessions(levels: List[dict], max_p95_latency_ms: float) -> int:
+    """Return the most concurrent sessions answered without errors within the latency."""
+    return max(
+        (
+            level["sessions"]
+            for level in levels
+            if not level["errors"] and level["latency_ms"]["p95"] <= max_p95_latency_ms
+        ),
+        default=0,
+    )
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Embeddings returning vectors computed beforehand, so only the index gets measured."""
+
+    def __init__(self, vectors: Dict[str, List[float]]):
+        self.vectors = vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.vectors[text]
+
+
+def get_benchmark_embeddings(embeddings_type: str, dimensions: int) -> Embeddings:
+    """Return the embeddings model (or fast deterministic fake embeddings) to benchmark."""
+    if embeddings_type == "fake":
+        return DeterministicFakeEmbedding(size=dimensions)
+    return get_embeddings(embeddings_type)
+
+
+def embed_in_batches(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """Embed the texts in batches of the build batch size."""
+    vectors: List[List[float]] = []
+    for start in range(0, len(texts), RETRIEVAL_BUILD_BATCH_SIZE):
+        vectors.extend(
+            embeddings.embed_documents(
+                texts[start : start + RETRIEVAL_BUILD_BATCH_SIZE]
+            )
+        )
+    return vectors
+
+
+def get_directory_size(path: str) -> int:
+    """Return the size of all files in the directory in bytes."""
+    return sum(
+        os.path.getsize(os.path.join(directory, filename))
+        for directory, _, filenames in os.walk(path)
+        for filename in filenames
+    )
+
+
+def get_exact_neighbors(corpus: np.ndarray, query: np.ndarray, k: int) -> Set[int]:
+    """Return the indexes of the k nearest vectors by brute force (L2 distance)."""
+    distances = np.sum((corpus - query) ** 2, axis=1)
+    k = min(k, len(distances))
+    return set(np.argpartition(distances, k - 1)[:k].tolist()) if k else set()
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def run_retrieval_benchmark(
+    backend: str,
+    texts: List[str],
+    text_vectors: List[List[float]],
+    queries: List[str],
+    query_vectors: List[List[float]],
+    k: int,
+) -> dict:
+    """
+    Build a vector store of the backend with the texts and measure the build time, its size
+    on disk, the latency of similarity searches and their recall@k compared to brute force.
+    """
+    directory = tempfile.mkdtemp(prefix="ownai-bench-")
+    try:
+        store = create_vector_store(
+            directory,
+            PrecomputedEmbeddings(
+                {**dict(zip(texts, text_vectors)), **dict(zip(queries, query_vectors))}
+            ),
+            backend,
+        )
+        started = time.monotonic()
+        for start in range(0, len(texts), RETRIEVAL_BUILD_BATCH_SIZE):
+            end = min(start + RETRIEVAL_BUILD_BATCH_SIZE, len(texts))
+            store.add_texts(
+                texts[start:end],
+                [{"index": index} for index in range(start, end)],
+                ids=[str(index) for index in range(start, end)],
+            )
+        build_seconds = time.monotonic() - started
+        disk_bytes = get_directory_size(directory)
+
+        corpus = np.array(text_vectors, dtype=np.float32)
+        latencies: List[float] = []
+        recalls: List[float] = []
+        for query, query_vector in zip(queries, query_vectors):
+            started = time.monotonic()
+            documents = store.similarity_search(query, k=k)
+            latencies.append((time.monotonic() - started) * 1000)
+            exact = get_exact_neighbors(
+                corpus, np.array(query_vector, dtype=np.float32), k
+            )
+            found = {document.metadata["index"] for document in documents}
+            recalls.append(len(found & exact) / len(exact) if exact else 1.0)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "backend": backend,
+        "chunks": len(texts),
+        "queries": len(queries),
+        "k": k,
+        "build_s": build_seconds,
+        "chunks_per_second": len(texts) / build_seconds if build_seconds > 0 else 0.0,
+        "disk_bytes": disk_bytes,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            **get_percentiles(latencies),
+        },
+        "recall_at_k": sum(recalls) / len(recalls) if recalls else 0.0,
+    }
+
+
+def read_corpus(path: str) -> List[str]:
+    """Read a corpus file with one chunk per line (empty lines are skipped)."""
+    with open(path, "r", encoding="utf-8") as corpus_file:
+        return [line.strip() for line in corpus_file if line.strip()]
+
+
+@click.group("bench")
+def bench():
+    """Run benchmarks."""
+
+
+@bench.command("streaming")
+@click.option("--tokens", default=2000, help="Number of tokens to stream.")
+@click.option(
+    "--tokens-per-second",
+    default=0.0,
+    help="Generation speed of the synthetic chain (0 generates as fast as possible).",
+)
+@click.option("--flush-interval-ms", default=DEFAULT_TOKEN_FLUSH_INTERVAL_MS)
+@click.option("--flush-bytes", default=DEFAULT_TOKEN_FLUSH_BYTES)
+@click.option("--output", type=click.Path(), help="Write the results as JSON file.")
+# pylint: disable-next=too-many-arguments
+def bench_streaming(tokens, tokens_per_second, flush_interval_ms, flush_bytes, output):
+    """Compare streaming every single token with streaming batched tokens."""
+    results = {
+        "unbatched": run_streaming_benchmark(tokens, tokens_per_second, 0, 0),
+        "batched": run_streaming_benchmark(
+            tokens, tokens_per_second, flush_interval_ms, flush_bytes
+        ),
+    }
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        click.echo(
+            f"{name}: {result['pipe_messages']} pipe messages, "
+            f"{result['emitted_events']} events, "
+            f"{result['events_per_second']:.0f} events/s, "
+            f"{result['tokens_per_second']:.0f} tokens/s, "
+            f"latency first/p50/p95/max "
+            f"{latency['first_token']:.2f}/{latency['p50']:.2f}/"
+            f"{latency['p95']:.2f}/{latency['max']:.2f} ms"
+        )
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+@bench.command("chat")
+@click.option(
+    "--path",
+    "paths",
+    type=click.Choice(BENCHMARK_PATHS),
+    multiple=True,
+    default=BENCHMARK_PATHS,
+    help="Benchmark brain.reply and/or the socket.io message handling.",
+)
+@click.option(
+    "--sessions",
+    default="1,2,4,8",
+    help="Comma-separated numbers of concurrent chat sessions to run.",
+)
+@click.option("--messages", default=5, help="Number of messages per session.")
+@click.option("--response-tokens", default=50, help="Number of tokens per response.")
+@click.option(
+    "--knowledge-documents",
+    default=100,
+    help="Number of synthetic knowledge documents (0 benchmarks without knowledge).",
+)
+@click.option(
+    "--max-p95-latency-ms",
+    default=5000.0,
+    help="Latency limit for the maximum number of concurrent sessions.",
+)
+@click.option(
+    "--seed", default=0, help="Seed of the synthetic knowledge and questions."
+)
+@click.option("--output", type=click.Path(), help="Write the results as JSON file.")
+# pylint: disable-next=too-many-arguments
+def bench_chat(
+    paths,
+    sessions,
+    messages,
+    response_tokens,
+    knowledge_documents,
+    max_p95_latency_ms,
+    seed,
+    output,
+):
+    """Measure end-to-end chat latency and throughput with a fake AI."""
+    session_levels = sorted({int(level) for level in sessions.split(",") if level})
+    results: dict = {
+        "config": {
+            "sessions": session_levels,
+            "messages": messages,
+            "response_tokens": response_tokens,
+            "knowledge_documents": knowledge_documents,
+            "max_p95_latency_ms": max_p95_latency_ms,
+            "seed": seed,
+        },
+        "paths": {},
+    }
+    with benchmark_ai(response_tokens, knowledge_documents, seed) as (
+        ai_id,
+        knowledge_id,
+    ):
+        for path in paths:
+            levels = []
+            for level in session_levels:
+                result = run_chat_benchmark(
+                    path, level, messages, ai_id, knowledge_id, seed
+                )
+                levels.append(result)
+                click.echo(
+                    f"{path} with {level} sessions: {result['messages']} messages, "
+                    f"{result['errors']} errors, "
+                    f"{result['throughput_tokens_per_second']:.0f} tokens/s, "
+                    f"TTFT p50/p95/p99 {result['ttft_ms']['p50']:.1f}/"
+                    f"{result['ttft_ms']['p95']:.1f}/{result['ttft_ms']['p99']:.1f} ms, "
+                    f"latency p50/p95/p99 {result['latency_ms']['p50']:.1f}/"
+                    f"{result['latency_ms']['p95']:.1f}/"
+                    f"{result['latency_ms']['p99']:.1f} ms"
+                )
+            max_sessions = get_max_concurrent_sessions(levels, max_p95_latency_ms)
+            click.echo(f"{path}: max {max_sessions} concurrent sessions")
+            results["paths"][path] = {
+                "levels": levels,
+                "max_concurrent_sessions": max_sessions,
+            }
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+@bench.command("retrieval")
+@click.option(
+    "--backend",
+    "backends",
+    type=click.Choice(VECTOR_STORE_BACKENDS),
+    multiple=True,
+    default=VECTOR_STORE_BACKENDS,
+    help="Vector store backends to benchmark.",
+)
+@click.option(
+    "--chunks",
+    default="1000,10000",
+    help="Comma-separated numbers of chunks in the knowledge store.",
+)
+@click.option(
+    "--corpus",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Text file with one chunk per line (instead of synthetic chunks).",
+)
+@click.option("--queries", default=100, help="Number of similarity searches.")
+@click.option("-k", "k", default=4, help="Number of chunks returned per search.")
+@click.option(
+    "--embeddings",
+    "embeddings_type",
+    type=click.Choice(["fake", "huggingface"]),
+    default="fake",
+    help="Embed with fast deterministic fake embeddings or the real model.",
+)
+@click.option("--dimensions", default=768, help="Dimensions of the fake embeddings.")
+@click.option("--seed", default=0, help="Seed of the synthetic chunks and queries.")
+@click.option("--output", type=click.Path(), help="Write the results as JSON file.")
+# pylint: disable-next=too-many-arguments,too-many-locals
+def bench_retrieval(
+    backends, chunks, corpus, queries, k, embeddings_type, dimensions, seed, output
+):
+    """Measure build time, size, search latency and recall@k of knowledge stores."""
+    sizes = sorted({int(size) for size in chunks.split(",") if size})
+    rng = random.Random(seed)
+    if corpus:
+        texts = read_corpus(corpus)
+        sizes = sorted({min(size, len(texts)) for size in sizes})
+    else:
+        texts = [
+            document.page_content
+            for document in generate_synthetic_documents(max(sizes), seed=seed)
+        ]
+    texts = texts[: max(sizes)]
+    query_texts = [f"{generate_synthetic_text(rng, 8)}?" for _ in range(queries)]
+
+    embeddings = get_benchmark_embeddings(embeddings_type, dimensions)
+    started = time.monotonic()
+    text_vectors = embed_in_batches(embeddings, texts)
+    query_vectors = [embeddings.embed_query(query) for query in query_texts]
+    embedding_seconds = time.monotonic() - started
+    click.echo(f"Embedded {len(texts)} chunks in {embedding_seconds:.1f} s")
+
+    results: dict = {
+        "config": {
+            "chunks": sizes,
+            "corpus": corpus,
+            "queries": queries,
+            "k": k,
+            "embeddings": embeddings_type,
+            "seed": seed,
+        },
+        "embedding_s": embedding_seconds,
+        "results": [],
+    }
+    for backend in backends:
+        for size in sizes:
+            result = run_retrieval_benchmark(
+                backend,
+                texts[:size],
+                text_vectors[:size],
+                query_texts,
+                query_vectors,
+                k,
+            )
+            results["results"].append(result)
+            latency = result["latency_ms"]
+            click.echo(
+                f"{backend} with {size} chunks: built in {result['build_s']:.1f} s, "
+                f"{result['disk_bytes'] / 1024 / 1024:.1f} MiB on disk, "
+                f"latency p50/p95/p99 {latency['p50']:.2f}/{latency['p95']:.2f}/"
+                f"{latency['p99']:.2f} ms, recall@{k} {result['recall_at_k']:.3f}"
+            )
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+def init_app(app):
+    """Register CLI commands with the application instance."""
+    app.cli.add_command(bench)
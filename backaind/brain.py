@@ -1,66 +1,147 @@
 """Provide AI data processing capabilities."""
+import atexit
+from contextlib import closing
 import os
 import queue
 from threading import Lock
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from langchain.callbacks.base import BaseCallbackHandler
+from flask import current_app, has_app_context
 from langchain.chains.base import Chain
 from langchain.chains.loading import load_chain_from_config
-from langchain.llms.huggingface_text_gen_inference import HuggingFaceTextGenInference
-from langchain.schema import BaseMemory
+from langchain.schema import BaseMemory, BaseMessage, SystemMessage, get_buffer_string
 
+from backaind.cache import LruCache
+from backaind.context import get_context_packer, ContextPacker
 from backaind.extensions import db
-from backaind.knowledge import get_knowledge
+from backaind.knowledge import get_embeddings, get_retrieval_config, search_knowledge
+from backaind.latency import approximate_token_count, get_latency_model
+from backaind.metrics import (
+    chain_load_seconds,
+    generated_tokens_total,
+    process_spawn_seconds,
+    response_cache_lookups_total,
+    response_seconds,
+    time_to_first_token_seconds,
+    tokens_per_second,
+)
 from backaind.models import Ai
-
-DEFAULT_PPWPS = 2.0
+from backaind.response_cache import (
+    get_response_key,
+    invalidate_responses,
+    response_cache,
+    split_into_tokens,
+    ResponseKey,
+)
+from backaind.tracing import add_span, set_trace_attributes, span
+from backaind.streaming import (
+    DEFAULT_TOKEN_FLUSH_BYTES,
+    DEFAULT_TOKEN_FLUSH_INTERVAL_MS,
+)
+from backaind.workers import (
+    DEFAULT_LLAMACPP_STATE_CACHE_BYTES,
+    ChainRequest,
+    estimate_chain_size,
+    get_chain_environment,
+    get_chain_key,
+    get_summary_chain,
+    get_token_counter,
+    inject_environment,
+    run_chain_process,
+    set_text_generation_inference_token,
+    GeventWorker,
+    MultiprocessingWorker,
+    Worker,
+    WorkerPool,
+)
+
+DEFAULT_CHAIN_CACHE_MAX_ENTRIES = 2
+DEFAULT_CHAIN_CACHE_MAX_BYTES = 0
+DEFAULT_USER_CHAIN_CACHE_MAX_ENTRIES = 100
+DEFAULT_WORKER_POOL_SIZE = 0
+DEFAULT_WORKER_HEALTH_CHECK_INTERVAL = 60
 # pylint: disable=invalid-name
-global_chain = None
-global_chain_id = None
-global_chain_input_keys = None
-# prompt processing words per second
-global_chain_ppwps = DEFAULT_PPWPS
+global_worker_pool = None
 # pylint: enable=invalid-name
-chain_lock = Lock()
+chain_cache = LruCache(DEFAULT_CHAIN_CACHE_MAX_ENTRIES, DEFAULT_CHAIN_CACHE_MAX_BYTES)
+# Chains of external providers with the API keys of a user (they don't load model files),
+# kept apart so they never evict the chains of local models.
+user_chain_cache = LruCache(DEFAULT_USER_CHAIN_CACHE_MAX_ENTRIES)
+worker_pool_lock = Lock()
+
+
+class ChainError(Exception):
+    """The chain could not be run successfully."""
 
 
 def get_chain(
-    ai_id: int, updated_environment: Optional[dict] = None
+    ai_id: int, environment: Optional[Dict[str, str]] = None
 ) -> Tuple[Chain, Set[str]]:
-    """Load the AI chain or create a new chain if it doesn't exist."""
-    # pylint: disable=global-statement
-    global global_chain, global_chain_id, global_chain_input_keys, global_chain_ppwps
-    with chain_lock:
-        chain = global_chain
-        chain_id = global_chain_id
-        chain_input_keys = global_chain_input_keys
-        if not chain or not chain_input_keys or chain_id != ai_id:
-            aifile = db.get_or_404(Ai, ai_id)
-            chain_input_keys = aifile.input_keys
-            with UpdatedEnvironment(updated_environment or {}):
-                chain = load_chain_from_config(aifile.chain)
+    """
+    Load the AI chain from the chain cache or create a new chain if it isn't cached.
+    Chains with the environment of a user (see get_chain_environment) are cached per
+    environment. It is set as fields of the models (see inject_environment), so the
+    environment of the server process stays untouched.
+    """
+
+    def load_chain():
+        aifile = db.get_or_404(Ai, ai_id)
+        chain_input_keys = aifile.input_keys
+        chain_config = (
+            inject_environment(aifile.chain, environment)
+            if environment
+            else aifile.chain
+        )
+        if chain_config is None:
+            raise ChainError("The AI can only read the API keys from the environment.")
+        with chain_load_seconds.time(ai_id=ai_id):
+            chain = load_chain_from_config(chain_config)
             set_text_generation_inference_token(chain)
-            global_chain = chain
-            global_chain_id = ai_id
-            global_chain_input_keys = chain_input_keys
-            global_chain_ppwps = DEFAULT_PPWPS
+        return (chain, chain_input_keys, estimate_chain_size(aifile.chain))
+
+    if environment:
+        # the chain config is not part of the key, as changing it drops the cached chains
+        (chain, chain_input_keys, _size) = user_chain_cache.get_or_load(
+            get_chain_key(ai_id, {}, environment), load_chain
+        )
+    else:
+        (chain, chain_input_keys, _size) = chain_cache.get_or_load(
+            ai_id, load_chain, lambda entry: entry[2]
+        )
     return (chain, chain_input_keys)
 
 
 def reset_global_chain(ai_id=None):
     """
-    Drop the global chain instance.
-    If ai_id is set, it only drops the global chain instance if it matches this ID.
+    Drop cached chain instances (including the ones loaded in warm worker processes)
+    and cached responses.
+    If ai_id is set, it only drops the cached chain instances and responses for this ID
+    and forgets its measured latency (the chain might use a different model now).
     """
-    # pylint: disable=global-statement
-    global global_chain, global_chain_id, global_chain_input_keys, global_chain_ppwps
-    with chain_lock:
-        if not ai_id or ai_id == global_chain_id:
-            global_chain = None
-            global_chain_id = None
-            global_chain_input_keys = None
-            global_chain_ppwps = DEFAULT_PPWPS
+    chain_cache.invalidate(ai_id)
+    for chain_key in user_chain_cache.keys():
+        if ai_id is None or chain_key[0] == ai_id:
+            user_chain_cache.invalidate(chain_key)
+    invalidate_responses(ai_id)
+    if ai_id is not None:
+        get_latency_model().forget(ai_id)
+    with worker_pool_lock:
+        if global_worker_pool is not None:
+            global_worker_pool.invalidate(ai_id)
+
+
+def init_app(app):
+    """Configure the chain caches with the application's settings."""
+    chain_cache.configure(
+        app.config.get("CHAIN_CACHE_MAX_ENTRIES", DEFAULT_CHAIN_CACHE_MAX_ENTRIES),
+        app.config.get("CHAIN_CACHE_MAX_BYTES", DEFAULT_CHAIN_CACHE_MAX_BYTES),
+    )
+    user_chain_cache.configure(
+        app.config.get(
+            "USER_CHAIN_CACHE_MAX_ENTRIES", DEFAULT_USER_CHAIN_CACHE_MAX_ENTRIES
+        )
+    )
 
 
 def reply(
@@ -69,195 +150,504 @@ def reply(
     knowledge_id: Optional[int] = None,
     memory: Optional[BaseMemory] = None,
     on_token: Optional[Callable[[str], None]] = None,
-    on_progress: Optional[Callable[[int], None]] = None,
+    on_progress: Optional[Callable[[int, float], None]] = None,
     updated_environment: Optional[dict] = None,
 ) -> str:
     """Run the chain with an input message and return the AI output."""
-    (chain, chain_input_keys) = get_chain(ai_id, updated_environment)
-    inputs = {}
-    has_memory = (
-        memory
-        and "input_history" in chain_input_keys
-        and memory.load_memory_variables({})["history"]
+    use_worker_pool = get_worker_pool_size() > 0
+    environment = updated_environment or {}
+    aifile = None
+    with span("chain_fetch"):
+        if use_worker_pool or environment or response_cache.enabled:
+            aifile = db.get_or_404(Ai, ai_id)
+            # only the API keys used by the chain's models, so local models are shared
+            environment = get_chain_environment(aifile.chain, environment)
+        if use_worker_pool or not can_load_chain(aifile, environment):
+            # The chain is loaded in the process running it (with the environment of the
+            # user), so only its config is needed here.
+            (chain, chain_input_keys) = (None, aifile.input_keys)
+        else:
+            (chain, chain_input_keys) = get_chain(ai_id, environment)
+        if (
+            aifile is None
+            and has_app_context()
+            and ({"input_knowledge", "input_history"} & set(chain_input_keys))
+        ):
+            # the retrieval options and the context window are part of the AI's config
+            aifile = db.get_or_404(Ai, ai_id)
+    packer = (
+        get_context_packer(
+            aifile.chain, get_token_counter(chain) if chain is not None else None
+        )
+        if aifile is not None
+        else None
+    )
+    history = get_history(memory, chain_input_keys, packer)
+
+    response_key = None
+    input_embedding = None
+    if response_cache.enabled:
+        response_key = get_response_key(
+            ai_id,
+            aifile.chain,
+            knowledge_id if "input_knowledge" in chain_input_keys else None,
+            input_text,
+            history,
+        )
+        with span("response_cache_lookup"):
+            input_embedding = embed_response_input(response_key)
+            cached_response = response_cache.get(response_key, input_embedding)
+        response_cache_lookups_total.inc(
+            ai_id=ai_id, result="miss" if cached_response is None else "hit"
+        )
+        set_trace_attributes(
+            response_cache="miss" if cached_response is None else "hit"
+        )
+        if cached_response is not None:
+            for token in split_into_tokens(cached_response) if on_token else []:
+                on_token(token)
+            return cached_response
+
+    with response_seconds.time(ai_id=ai_id, knowledge_id=knowledge_id or ""):
+        inputs = get_chain_inputs(
+            chain_input_keys,
+            input_text,
+            knowledge_id,
+            memory,
+            aifile.retrieval if aifile is not None else None,
+            packer,
+        )
+        if use_worker_pool:
+            response = run_chain_on_worker_pool(
+                ai_id, aifile.chain, inputs, on_token, on_progress, environment
+            )
+        elif is_running_on_gunicorn():
+            response = run_chain_on_gunicorn(
+                chain or ChainRequest(aifile.chain, environment),
+                inputs,
+                on_token,
+                on_progress,
+                ai_id,
+            )
+        else:
+            response = run_chain_on_multiprocessing(
+                chain or ChainRequest(aifile.chain, environment),
+                inputs,
+                on_token,
+                on_progress,
+                ai_id,
+            )
+    if response_key is not None:
+        response_cache.put(response_key, response, input_embedding)
+    return response
+
+
+def summarize(
+    ai_id: int,
+    summary: str,
+    messages: List[BaseMessage],
+    updated_environment: Optional[dict] = None,
+) -> str:
+    """
+    Add the messages onto the summary of a conversation using the model of the AI.
+    Like a reply, it runs in a worker process, so the chain in the server process is not
+    blocked.
+    """
+    inputs = {"summary": summary, "new_lines": get_buffer_string(messages)}
+    environment = updated_environment or {}
+    with span("summarize", summarized_messages=len(messages)):
+        if environment or get_worker_pool_size() > 0:
+            aifile = db.get_or_404(Ai, ai_id)
+            environment = get_chain_environment(aifile.chain, environment)
+        if get_worker_pool_size() > 0:
+            chain_messages = get_worker_pool().run_chain(
+                ai_id,
+                aifile.chain,
+                inputs,
+                environment,
+                get_token_flush(),
+                "summarize",
+            )
+            with closing(chain_messages):
+                return process_chain_messages(chain_messages, None, None).strip()
+        summary_chain: Union[Chain, ChainRequest]
+        if environment and not can_load_chain(aifile, environment):
+            summary_chain = ChainRequest(aifile.chain, environment, "summarize")
+        else:
+            (chain, _chain_input_keys) = get_chain(ai_id, environment)
+            summary_chain = get_summary_chain(chain)
+        if is_running_on_gunicorn():
+            return run_chain_on_gunicorn(summary_chain, inputs, None, None).strip()
+        return run_chain_on_multiprocessing(summary_chain, inputs, None, None).strip()
+
+
+def can_load_chain(aifile: Optional[Ai], environment: Dict[str, str]) -> bool:
+    """
+    Check if the chain can be loaded (and cached) in the server process with the environment.
+    Otherwise, it has to be loaded by the process running it.
+    """
+    if not environment:
+        return True
+    return (
+        aifile is not None and inject_environment(aifile.chain, environment) is not None
+    )
+
+
+def get_history(
+    memory: Optional[BaseMemory],
+    chain_input_keys: Iterable[str],
+    packer: Optional[ContextPacker] = None,
+) -> str:
+    """
+    Return the history of the memory as text.
+    If the context gets packed, the history contains all messages (the packer decides how
+    many fit), otherwise it is limited by the memory itself.
+    """
+    if memory is None or "input_history" not in chain_input_keys:
+        return ""
+    messages = get_history_messages(memory)
+    if packer is None or messages is None:
+        return memory.load_memory_variables({})["history"]
+    return get_buffer_string(messages)
+
+
+def get_history_messages(memory: Optional[BaseMemory]) -> Optional[List[BaseMessage]]:
+    """
+    Return all messages of the memory (or None if it doesn't keep the messages).
+    The summary of older messages of a summarizing memory comes first.
+    """
+    chat_memory = getattr(memory, "chat_memory", None)
+    if chat_memory is None:
+        return None
+    summary = getattr(memory, "moving_summary_buffer", "")
+    return ([SystemMessage(content=summary)] if summary else []) + list(
+        chat_memory.messages
     )
+
+
+# pylint: disable-next=too-many-arguments
+def get_chain_inputs(
+    chain_input_keys: Iterable[str],
+    input_text: str,
+    knowledge_id: Optional[int],
+    memory: Optional[BaseMemory] = None,
+    retrieval: Optional[dict] = None,
+    packer: Optional[ContextPacker] = None,
+) -> dict:
+    """
+    Return the inputs for the chain (including the knowledge relevant to the input).
+    The knowledge is retrieved with the retrieval options of the AI. With a context packer,
+    the knowledge chunks and history turns fitting into the context window are chosen,
+    otherwise fewer chunks are used if there is a history.
+    """
+    history = get_history(memory, chain_input_keys, packer)
+    documents = []
+    if "input_knowledge" in chain_input_keys and knowledge_id is not None:
+        config = get_retrieval_config(retrieval)
+        documents = search_knowledge(
+            knowledge_id,
+            input_text,
+            k=config["k_with_history"] if history and not packer else config["k"],
+            mode=config["mode"],
+            candidates=config["candidates"],
+            reranker=config["reranker"],
+        )
+    messages = get_history_messages(memory) if history else None
+    if packer is not None:
+        with span("context_packing"):
+            # a history without messages can't be shortened, so it counts like the input
+            (documents, packed_messages) = packer.pack(
+                input_text if messages is not None else input_text + history,
+                documents,
+                messages or [],
+            )
+        if messages is not None:
+            history = get_buffer_string(packed_messages)
+        set_trace_attributes(
+            packed_chunks=len(documents),
+            packed_messages=len(packed_messages),
+        )
+
+    inputs: dict = {}
     for input_key in chain_input_keys:
         if input_key == "input_text":
             inputs["input_text"] = input_text
         elif input_key == "input_knowledge":
-            if knowledge_id is None:
-                inputs["input_knowledge"] = []
-            else:
-                with UpdatedEnvironment({"TOKENIZERS_PARALLELISM": "false"}):
-                    knowledge = get_knowledge(knowledge_id)
-                    inputs["input_knowledge"] = knowledge.similarity_search(
-                        input_text, k=1 if has_memory else 4
-                    )
+            inputs["input_knowledge"] = documents
         elif input_key == "input_history":
-            if memory is None:
-                inputs["input_history"] = ""
-            else:
-                inputs["input_history"] = memory.load_memory_variables({})["history"]
+            inputs["input_history"] = history
+    return inputs
 
-    if "gunicorn" in os.environ.get("SERVER_SOFTWARE", ""):
-        return run_chain_on_gunicorn(chain, inputs, on_token, on_progress)
-    return run_chain_on_multiprocessing(chain, inputs, on_token, on_progress)
+
+def embed_response_input(response_key: ResponseKey) -> Optional[List[float]]:
+    """Embed the normalized input if similar inputs may share cached responses."""
+    if not response_cache.similarity_threshold:
+        return None
+    return get_embeddings("huggingface").embed_query(response_key[4])
+
+
+def is_running_on_gunicorn() -> bool:
+    """Check if the application is served by gunicorn (and therefore uses gevent)."""
+    return "gunicorn" in os.environ.get("SERVER_SOFTWARE", "")
+
+
+def get_token_flush() -> Tuple[float, int]:
+    """Return how tokens are coalesced while streaming (interval in ms, max bytes)."""
+    if not has_app_context():
+        return (DEFAULT_TOKEN_FLUSH_INTERVAL_MS, DEFAULT_TOKEN_FLUSH_BYTES)
+    return (
+        current_app.config.get(
+            "TOKEN_FLUSH_INTERVAL_MS", DEFAULT_TOKEN_FLUSH_INTERVAL_MS
+        ),
+        current_app.config.get("TOKEN_FLUSH_BYTES", DEFAULT_TOKEN_FLUSH_BYTES),
+    )
+
+
+def get_worker_pool_size() -> int:
+    """Return the configured number of warm worker processes (0 if disabled)."""
+    if not has_app_context():
+        return 0
+    return current_app.config.get("WORKER_POOL_SIZE", DEFAULT_WORKER_POOL_SIZE)
+
+
+def run_chain_on_worker_pool(
+    ai_id: int,
+    chain_config: dict,
+    inputs: dict,
+    on_token: Optional[Callable[[str], None]],
+    on_progress: Optional[Callable[[int, float], None]],
+    updated_environment: Optional[dict] = None,
+):
+    """Run the chain in one of the long-lived worker processes of the worker pool."""
+    messages = get_worker_pool().run_chain(
+        ai_id, chain_config, inputs, updated_environment or {}, get_token_flush()
+    )
+    with closing(messages):
+        return process_chain_messages(messages, on_token, on_progress, ai_id)
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the worker pool or create it if it doesn't exist yet."""
+    # pylint: disable=global-statement
+    global global_worker_pool
+    with worker_pool_lock:
+        if global_worker_pool is None:
+            config = current_app.config
+            worker_class = (
+                GeventWorker if is_running_on_gunicorn() else MultiprocessingWorker
+            )
+            workers: List[Worker] = [
+                worker_class(
+                    config.get(
+                        "CHAIN_CACHE_MAX_ENTRIES", DEFAULT_CHAIN_CACHE_MAX_ENTRIES
+                    ),
+                    config.get("CHAIN_CACHE_MAX_BYTES", DEFAULT_CHAIN_CACHE_MAX_BYTES),
+                    config.get(
+                        "LLAMACPP_STATE_CACHE_BYTES", DEFAULT_LLAMACPP_STATE_CACHE_BYTES
+                    ),
+                )
+                for _ in range(get_worker_pool_size())
+            ]
+            global_worker_pool = WorkerPool(
+                workers,
+                config.get(
+                    "WORKER_HEALTH_CHECK_INTERVAL",
+                    DEFAULT_WORKER_HEALTH_CHECK_INTERVAL,
+                ),
+            )
+        return global_worker_pool
+
+
+def reset_worker_pool():
+    """Stop all worker processes and drop the worker pool."""
+    # pylint: disable=global-statement
+    global global_worker_pool
+    with worker_pool_lock:
+        if global_worker_pool is not None:
+            global_worker_pool.stop()
+            global_worker_pool = None
+
+
+# Stop the worker processes before the interpreter shuts down (so no worker gets restarted).
+atexit.register(reset_worker_pool)
 
 
 def run_chain_on_gunicorn(
-    chain: Chain,
+    chain: Union[Chain, ChainRequest],
     inputs: dict,
     on_token: Optional[Callable[[str], None]],
-    on_progress: Optional[Callable[[int], None]],
+    on_progress: Optional[Callable[[int, float], None]],
+    ai_id: Optional[int] = None,
 ):
     """Run the chain with gipc in the context of gevent."""
     # pylint: disable=import-outside-toplevel
     import gevent
     import gipc
 
-    with gipc.pipe() as (readend, writeend):
-        gipc.start_process(
-            target=run_chain_process, args=(chain, inputs, writeend), daemon=True
-        )
-        seconds_estimated = 0
-        seconds_passed = 0
-        prompt = ""
-        updated_global_chain_ppwps = False
+    def receive_messages(readend):
         while True:
             message = None
             with gevent.Timeout(1, False) as timeout:
                 message = readend.get(timeout=timeout)
-            if message is None:
-                if seconds_estimated:
-                    seconds_passed += 1
-                    if on_progress and seconds_passed <= seconds_estimated:
-                        on_progress(int(seconds_passed / seconds_estimated * 100))
-            else:
-                result_type, text = message
-                if result_type == "token":
-                    if on_token:
-                        on_token(text)
-                    if not updated_global_chain_ppwps:
-                        updated_global_chain_ppwps = True
-                        update_global_chain_ppwps(prompt, seconds_passed)
-                elif result_type == "done":
-                    return text
-                elif result_type == "prompts":
-                    prompt = "\n".join(text)
-                    seconds_estimated = estimate_processing_time(prompt)
+            yield message
+
+    with gipc.pipe() as (readend, writeend):
+        with process_spawn_seconds.time(ai_id="" if ai_id is None else ai_id), span(
+            "process_spawn"
+        ):
+            gipc.start_process(
+                target=run_chain_process,
+                args=(chain, inputs, writeend, get_token_flush()),
+                daemon=True,
+            )
+        return process_chain_messages(
+            receive_messages(readend), on_token, on_progress, ai_id
+        )
 
 
 def run_chain_on_multiprocessing(
-    chain: Chain,
+    chain: Union[Chain, ChainRequest],
     inputs: dict,
     on_token: Optional[Callable[[str], None]],
-    on_progress: Optional[Callable[[int], None]],
+    on_progress: Optional[Callable[[int, float], None]],
+    ai_id: Optional[int] = None,
 ):
     """Run the chain with multiprocessing (won't work with gevent)."""
     # pylint: disable-next=import-outside-toplevel
     import multiprocessing
 
-    result_queue = multiprocessing.Queue()
-    multiprocessing.Process(
-        target=run_chain_process, args=(chain, inputs, result_queue), daemon=True
-    ).start()
-    seconds_estimated = 0
-    seconds_passed = 0
-    prompt = ""
-    updated_global_chain_ppwps = False
-    while True:
-        try:
-            result_type, text = result_queue.get(True, 1)
-            if result_type == "token":
-                if on_token:
-                    on_token(text)
-                if not updated_global_chain_ppwps:
-                    updated_global_chain_ppwps = True
-                    update_global_chain_ppwps(prompt, seconds_passed)
-            elif result_type == "done":
-                return text
-            elif result_type == "prompts":
-                prompt = "\n".join(text)
-                seconds_estimated = estimate_processing_time(prompt)
-        except queue.Empty:
-            if seconds_estimated:
-                seconds_passed += 1
-                if on_progress and seconds_passed <= seconds_estimated:
-                    on_progress(int(seconds_passed / seconds_estimated * 100))
-
-
-def run_chain_process(chain: Chain, inputs: dict, putable):
-    """Run the chain in a separate process and put the results in the putable."""
-
-    class CallbackHandler(BaseCallbackHandler):
-        """Callback handler that puts tokens in the putable as they are generated."""
-
-        def on_chat_model_start(self, serialized, messages, **kwargs):
-            pass
-
-        def on_llm_start(
-            self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any
-        ) -> Any:
-            putable.put(("prompts", prompts))
-
-        def on_llm_new_token(self, token: str, **kwargs) -> None:
-            putable.put(("token", token))
-
-    output_text = chain(inputs, callbacks=[CallbackHandler()])["output_text"]
-    putable.put(("done", output_text))
-
-
-def find_instances(obj, cls):
-    """Find all instances of a class in an object."""
-    instances = []
-    if isinstance(obj, cls):
-        instances.append(obj)
-    if isinstance(obj, list):
-        for item in obj:
-            instances.extend(find_instances(item, cls))
-    elif hasattr(obj, "__dict__"):
-        for prop in vars(obj).values():
-            instances.extend(find_instances(prop, cls))
-    return instances
-
-
-def set_text_generation_inference_token(chain: Chain):
-    """Set the token for all HuggingFaceTextGenInference instances in the chain."""
-    token = os.environ.get("TEXT_GENERATION_INFERENCE_TOKEN", None)
-    if not token:
-        return
-    all_huggingface_instances = find_instances(chain, HuggingFaceTextGenInference)
-    for instance in all_huggingface_instances:
-        instance.client.headers = {"Authorization": f"Bearer {token}"}
-
-
-def estimate_processing_time(prompt: str) -> int:
-    """Estimate the processing time for a prompt."""
-    return int(len(prompt.split()) / global_chain_ppwps) or 1
-
-
-def update_global_chain_ppwps(prompt: str, seconds_passed: int):
-    """Update the global chain prompt processing words per second score."""
-    # pylint: disable=global-statement
-    global global_chain_ppwps
-    global_chain_ppwps = len(prompt.split()) / (seconds_passed or 1)
+    def receive_messages(result_queue):
+        while True:
+            try:
+                yield result_queue.get(True, 1)
+            except queue.Empty:
+                yield None
 
+    result_queue = multiprocessing.Queue()
+    with process_spawn_seconds.time(ai_id="" if ai_id is None else ai_id), span(
+        "process_spawn"
+    ):
+        multiprocessing.Process(
+            target=run_chain_process,
+            args=(chain, inputs, result_queue, get_token_flush()),
+            daemon=True,
+        ).start()
+    return process_chain_messages(
+        receive_messages(result_queue), on_token, on_progress, ai_id
+    )
 
-class UpdatedEnvironment:
-    """Temporarily update the environment variables."""
 
-    def __init__(self, new_values):
-        self.new_values = new_values
-        self.old_values = {}
+# pylint: disable-next=too-many-branches
+def process_chain_messages(
+    messages: Iterable[Optional[Tuple[str, Any]]],
+    on_token: Optional[Callable[[str], None]],
+    on_progress: Optional[Callable[[int, float], None]],
+    ai_id: Optional[int] = None,
+) -> str:
+    """
+    Handle the messages of a running chain and return the output text.
+    A message of None means that no message has been received for a second.
+    Until the first token, on_progress gets the progress of the prompt processing (in percent)
+    and the estimated seconds until the response is complete (including its generation).
+    The measured prompt processing and generation speed update the latency model of the AI
+    and are added as spans to the current trace.
+    """
+    latency_model = get_latency_model()
+    started = time.monotonic()
+    prompt_started: Optional[float] = None
+    first_token_at: Optional[float] = None
+    prompt_tokens = 0
+    generated_tokens = 0
+    (prompt_seconds, generation_seconds) = (0.0, 0.0)
+    for message in messages:
+        if message is None:
+            if on_progress and prompt_seconds and first_token_at is None:
+                seconds_passed = time.monotonic() - (prompt_started or 0.0)
+                on_progress(
+                    min(int(seconds_passed / prompt_seconds * 100), 99),
+                    max(prompt_seconds - seconds_passed, 0.0) + generation_seconds,
+                )
+            continue
+        result_type, payload = message
+        if result_type == "token":
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+                if ai_id is not None:
+                    time_to_first_token_seconds.observe(
+                        first_token_at - started, ai_id=ai_id
+                    )
+            if on_token:
+                on_token(payload)
+        elif result_type == "done":
+            add_chain_spans(started, prompt_started, first_token_at, generated_tokens)
+            if ai_id is not None and prompt_started is not None:
+                record_response_latency(
+                    ai_id,
+                    prompt_tokens,
+                    prompt_started,
+                    first_token_at,
+                    generated_tokens,
+                )
+            return payload
+        elif result_type == "error":
+            raise ChainError(payload)
+        elif result_type == "prompts" and first_token_at is None:
+            prompt_started = time.monotonic()
+            prompt_tokens = approximate_token_count("\n".join(payload))
+            (prompt_seconds, generation_seconds) = latency_model.predict(
+                ai_id, prompt_tokens
+            )
+        elif result_type == "prompt_tokens" and first_token_at is None:
+            prompt_tokens = payload
+            (prompt_seconds, generation_seconds) = latency_model.predict(
+                ai_id, prompt_tokens
+            )
+        elif result_type == "generated_tokens":
+            generated_tokens = payload
+    raise ChainError("The chain stopped without output.")
+
+
+def add_chain_spans(
+    started: float,
+    prompt_started: Optional[float],
+    first_token_at: Optional[float],
+    generated_tokens: int,
+):
+    """
+    Add the spans of a finished chain to the current trace: the prompt evaluation (until the
+    first token), the time to the first token (since the chain was started) and the completion
+    (generating the remaining tokens).
+    """
+    finished = time.monotonic()
+    if first_token_at is None:
+        add_span("completion", started, finished, generated_tokens=generated_tokens)
+        return
+    if prompt_started is not None:
+        add_span("prompt_eval", prompt_started, first_token_at)
+    add_span("first_token", started, first_token_at)
+    add_span("completion", first_token_at, finished, generated_tokens=generated_tokens)
 
-    def __enter__(self):
-        for key, new_value in self.new_values.items():
-            if key in os.environ:
-                self.old_values[key] = os.environ[key]
-            os.environ[key] = new_value
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        for key in self.new_values.keys():
-            if key in self.old_values:
-                os.environ[key] = self.old_values[key]
-            else:
-                del os.environ[key]
+def record_response_latency(
+    ai_id: int,
+    prompt_tokens: int,
+    prompt_started: float,
+    first_token_at: Optional[float],
+    generated_tokens: int,
+):
+    """Update the latency model and the metrics with the measurements of a response."""
+    if first_token_at is None:
+        return
+    generation_seconds = time.monotonic() - first_token_at
+    get_latency_model().record(
+        ai_id,
+        prompt_tokens,
+        first_token_at - prompt_started,
+        generated_tokens,
+        generation_seconds,
+    )
+    generated_tokens_total.inc(generated_tokens, ai_id=ai_id)
+    if generated_tokens > 1 and generation_seconds > 0:
+        tokens_per_second.observe(
+            (generated_tokens - 1) / generation_seconds, ai_id=ai_id
+        )
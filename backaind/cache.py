@@ -0,0 +1,145 @@
+"""Provide a bounded least-recently-used cache for expensive objects like chains."""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class LruCache:
+    """
+    Thread-safe least-recently-used cache, bounded by number of entries and resident bytes.
+    Every key has its own load lock, so loading one entry does not block access to others.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1,
+        max_bytes: int = 0,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._entries: OrderedDict = OrderedDict()
+        self._load_locks: Dict[Hashable, Lock] = {}
+        self._generations: Dict[Hashable, int] = {}
+        self._lock = Lock()
+
+    def configure(self, max_entries: int, max_bytes: int = 0):
+        """Change the limits of the cache and evict entries exceeding them."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            evicted = self._evict()
+        self._notify_evicted(evicted)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for the key (marking it as recently used) or the default."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0):
+        """Add a value to the cache, evicting the least recently used entries if required."""
+        with self._lock:
+            self._entries[key] = (value, size)
+            self._entries.move_to_end(key)
+            evicted = self._evict()
+        self._notify_evicted(evicted)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_of: Optional[Callable[[Any], int]] = None,
+    ) -> Any:
+        """
+        Return the cached value for the key or load it with the loader function.
+        Concurrent calls for the same key wait for a single load, other keys are not blocked.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            load_lock = self._load_locks.setdefault(key, Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key][0]
+                generation = self._generations.get(key, 0)
+
+            try:
+                value = loader()
+                size = size_of(value) if size_of else 0
+
+                with self._lock:
+                    # Don't cache the value if the key has been invalidated while loading.
+                    evicted = []
+                    if self._generations.get(key, 0) == generation:
+                        self._entries[key] = (value, size)
+                        self._entries.move_to_end(key)
+                        evicted = self._evict()
+            finally:
+                with self._lock:
+                    self._load_locks.pop(key, None)
+        self._notify_evicted(evicted)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop the entry for the key or all entries if no key is given."""
+        with self._lock:
+            if key is None:
+                evicted = list(self._entries.items())
+                self._entries.clear()
+                for generation_key in set(self._generations) | set(self._load_locks):
+                    self._generations[generation_key] = (
+                        self._generations.get(generation_key, 0) + 1
+                    )
+            else:
+                evicted = (
+                    [(key, self._entries.pop(key))] if key in self._entries else []
+                )
+                self._generations[key] = self._generations.get(key, 0) + 1
+        self._notify_evicted([(k, value) for k, (value, _size) in evicted])
+
+    def keys(self) -> List[Hashable]:
+        """Return the cached keys from least to most recently used."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    @property
+    def resident_bytes(self) -> int:
+        """Return the estimated number of bytes held by all cached values."""
+        with self._lock:
+            return sum(size for _value, size in self._entries.values())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self) -> List[Tuple[Hashable, Any]]:
+        """Remove least recently used entries until the limits are met (call with lock)."""
+        evicted = []
+        total_bytes = sum(size for _value, size in self._entries.values())
+        # The most recently used entry is always kept, even if it exceeds max_bytes alone.
+        while len(self._entries) > 1 and (
+            (self.max_entries > 0 and len(self._entries) > self.max_entries)
+            or (self.max_bytes > 0 and total_bytes > self.max_bytes)
+        ):
+            key, (value, size) = self._entries.popitem(last=False)
+            total_bytes -= size
+            evicted.append((key, value))
+        return evicted
+
+    def _notify_evicted(self, evicted: List[Tuple[Hashable, Any]]):
+        """Call the on_evict callback for all evicted entries (call without lock)."""
+        if self.on_evict:
+            for key, value in evicted:
+                self.on_evict(key, value)
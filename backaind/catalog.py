@@ -0,0 +1,146 @@
+"""Cache the catalog of AIs and knowledge shown on every page view and checked per message."""
+from threading import Lock
+import time
+from typing import Callable, FrozenSet, List, NamedTuple, Optional
+
+from .extensions import db
+from .models import Ai, Knowledge
+
+DEFAULT_CATALOG_CACHE_TTL = 60
+
+
+class Catalog(NamedTuple):
+    """Snapshot of all AIs and knowledge (without their chains)."""
+
+    version: int
+    created: float
+    ais: List[dict]
+    knowledges: List[dict]
+    public_ai_ids: FrozenSet[int]
+    public_knowledge_ids: FrozenSet[int]
+
+    def get_ais(self, only_public: bool = True) -> List[dict]:
+        """Return the data of all (or only the public) AIs."""
+        return [
+            ai for ai in self.ais if not only_public or ai["id"] in self.public_ai_ids
+        ]
+
+    def get_knowledges(self, only_public: bool = True) -> List[dict]:
+        """Return the data of all (or only the public) knowledge."""
+        return [
+            knowledge
+            for knowledge in self.knowledges
+            if not only_public or knowledge["id"] in self.public_knowledge_ids
+        ]
+
+
+class CatalogCache:
+    """
+    Thread-safe cache of the catalog.
+    Every change of AIs or knowledge increments the version, so the next lookup loads a new
+    snapshot. The time to live limits how long changes made outside of the application
+    (e.g. directly in the database or by other processes) remain unnoticed.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CATALOG_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.clock = clock
+        self.version = 0
+        self._catalog: Optional[Catalog] = None
+        self._lock = Lock()
+        self._load_lock = Lock()
+
+    def configure(self, ttl: float):
+        """Change the time to live and drop the cached catalog."""
+        self.ttl = ttl
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the cached catalog (the next lookup loads it again)."""
+        with self._lock:
+            self.version += 1
+            self._catalog = None
+
+    def get(self) -> Catalog:
+        """Return the cached catalog or load it if it is outdated."""
+        catalog = self._get_current()
+        if catalog is not None:
+            return catalog
+        # concurrent lookups wait for a single load instead of all querying the database
+        with self._load_lock:
+            catalog = self._get_current()
+            if catalog is not None:
+                return catalog
+            with self._lock:
+                version = self.version
+            catalog = load_catalog(version, self.clock())
+            with self._lock:
+                # a catalog changed while loading is only returned, not cached
+                if self.version == version:
+                    self._catalog = catalog
+            return catalog
+
+    def _get_current(self) -> Optional[Catalog]:
+        """Return the cached catalog if it is still current (or None)."""
+        with self._lock:
+            catalog = self._catalog
+            if catalog is None or catalog.version != self.version:
+                return None
+            if self.ttl > 0 and self.clock() - catalog.created > self.ttl:
+                return None
+            return catalog
+
+
+catalog_cache = CatalogCache()
+
+
+def load_catalog(version: int, created: float) -> Catalog:
+    """Load all AIs and knowledge (without their chains) from the database."""
+    ais = db.session.query(
+        Ai.id, Ai.name, Ai.input_keys, Ai.input_labels, Ai.greeting, Ai.is_public
+    ).all()
+    knowledges = db.session.query(
+        Knowledge.id, Knowledge.name, Knowledge.is_public
+    ).all()
+    return Catalog(
+        version=version,
+        created=created,
+        ais=[
+            {
+                "id": ai.id,
+                "name": ai.name,
+                "input_keys": ai.input_keys,
+                "input_labels": ai.input_labels,
+                "greeting": ai.greeting,
+            }
+            for ai in ais
+        ],
+        knowledges=[
+            {"id": knowledge.id, "name": knowledge.name} for knowledge in knowledges
+        ],
+        public_ai_ids=frozenset(ai.id for ai in ais if ai.is_public),
+        public_knowledge_ids=frozenset(
+            knowledge.id for knowledge in knowledges if knowledge.is_public
+        ),
+    )
+
+
+def get_catalog() -> Catalog:
+    """Return the current catalog."""
+    return catalog_cache.get()
+
+
+def invalidate_catalog():
+    """Make the next lookup load the changed AIs and knowledge."""
+    catalog_cache.invalidate()
+
+
+def init_app(app):
+    """Configure the catalog cache with the application's settings."""
+    catalog_cache.configure(
+        app.config.get("CATALOG_CACHE_TTL", DEFAULT_CATALOG_CACHE_TTL)
+    )
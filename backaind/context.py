@@ -0,0 +1,164 @@
+"""Pack knowledge and history into the context window of an AI's model."""
+import re
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from langchain.docstore.document import Document
+from langchain.schema import BaseMessage, get_buffer_string
+
+from .latency import approximate_token_count
+
+# Keys of the chain configuration setting the context window and the response length
+CONTEXT_WINDOW_KEYS = ("n_ctx", "context_length")
+RESPONSE_TOKENS_KEYS = ("max_tokens", "max_new_tokens")
+DEFAULT_RESPONSE_TOKENS = 256
+# Share of the context window kept free for differences in tokenization (e.g. special tokens
+# or the approximate token count if the tokenizer of the model is unknown)
+CONTEXT_SAFETY_MARGIN = 0.1
+
+
+def find_config_values(config: Any, keys: Sequence[str]) -> Iterator[Any]:
+    """Yield all values of the keys in a (nested) chain configuration."""
+    if isinstance(config, dict):
+        for key, value in config.items():
+            if key in keys:
+                yield value
+            else:
+                yield from find_config_values(value, keys)
+    elif isinstance(config, list):
+        for item in config:
+            yield from find_config_values(item, keys)
+
+
+def get_fixed_prompt_text(config: Any) -> Tuple[str, str]:
+    """
+    Return the text of the prompt templates without their variables, once for the prompts
+    and once for a single document of a stuff documents chain (including the separator).
+    """
+    prompt_text = ""
+    document_text = ""
+    if isinstance(config, dict):
+        for key, value in config.items():
+            if key == "document_prompt" and isinstance(value, dict):
+                document_text += remove_template_variables(value.get("template", ""))
+            elif key == "document_separator" and isinstance(value, str):
+                document_text += value
+            elif key == "template" and isinstance(value, str):
+                prompt_text += remove_template_variables(value)
+            else:
+                (nested_prompt_text, nested_document_text) = get_fixed_prompt_text(
+                    value
+                )
+                prompt_text += nested_prompt_text
+                document_text += nested_document_text
+    elif isinstance(config, list):
+        for item in config:
+            (nested_prompt_text, nested_document_text) = get_fixed_prompt_text(item)
+            prompt_text += nested_prompt_text
+            document_text += nested_document_text
+    return (prompt_text, document_text)
+
+
+def remove_template_variables(template: str) -> str:
+    """Remove the {variables} from a prompt template."""
+    return re.sub(r"\{[^{}]*\}", "", template)
+
+
+class ContextPacker:
+    """
+    Fill the prompt with the most relevant knowledge chunks and the most recent history
+    turns fitting into the context window of the model.
+    The budget is the context window minus the tokens reserved for the response, the
+    prompt templates and the input text.
+    """
+
+    def __init__(
+        self,
+        context_window: int,
+        response_tokens: int,
+        prompt_text: str = "",
+        document_text: str = "",
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ):
+        self.count_tokens = count_tokens or approximate_token_count
+        self.context_window = context_window
+        # at least half of the context window is left for the prompt
+        self.response_tokens = min(response_tokens, context_window // 2)
+        self.prompt_tokens = self.count_tokens(prompt_text) if prompt_text else 0
+        self.document_tokens = self.count_tokens(document_text) if document_text else 0
+
+    def get_budget(self, input_text: str) -> int:
+        """Return the number of tokens left for knowledge and history."""
+        return (
+            int(self.context_window * (1 - CONTEXT_SAFETY_MARGIN))
+            - self.response_tokens
+            - self.prompt_tokens
+            - self.count_tokens(input_text)
+        )
+
+    def pack(
+        self,
+        input_text: str,
+        documents: List[Document],
+        messages: List[BaseMessage],
+    ) -> Tuple[List[Document], List[BaseMessage]]:
+        """
+        Return the documents (best first) and messages (most recent first) fitting into the
+        budget, taking turns between knowledge and history.
+        Documents too large for the remaining budget are skipped, the history ends at the
+        first turn not fitting anymore.
+        """
+        budget = self.get_budget(input_text)
+        turns = [messages[max(end - 2, 0) : end] for end in range(len(messages), 0, -2)]
+        packed_documents: List[Document] = []
+        packed_turns: List[List[BaseMessage]] = []
+        document_index = 0
+        turn_index = 0
+        while document_index < len(documents) or turn_index < len(turns):
+            if document_index < len(documents):
+                tokens = self.document_tokens + self.count_tokens(
+                    documents[document_index].page_content
+                )
+                if tokens <= budget:
+                    packed_documents.append(documents[document_index])
+                    budget -= tokens
+                document_index += 1
+            if turn_index < len(turns):
+                tokens = self.count_tokens(get_buffer_string(turns[turn_index])) + 1
+                if tokens <= budget:
+                    packed_turns.insert(0, turns[turn_index])
+                    budget -= tokens
+                    turn_index += 1
+                else:
+                    turn_index = len(turns)
+        return (
+            packed_documents,
+            [message for turn in packed_turns for message in turn],
+        )
+
+
+def get_context_packer(
+    chain_config: dict, count_tokens: Optional[Callable[[str], int]] = None
+) -> Optional[ContextPacker]:
+    """Return the context packer of a chain (or None if its context window is unknown)."""
+    context_window = next(
+        (
+            value
+            for value in find_config_values(chain_config, CONTEXT_WINDOW_KEYS)
+            if isinstance(value, int) and value > 0
+        ),
+        None,
+    )
+    if context_window is None:
+        return None
+    response_tokens = next(
+        (
+            value
+            for value in find_config_values(chain_config, RESPONSE_TOKENS_KEYS)
+            if isinstance(value, int) and value > 0
+        ),
+        DEFAULT_RESPONSE_TOKENS,
+    )
+    (prompt_text, document_text) = get_fixed_prompt_text(chain_config)
+    return ContextPacker(
+        context_window, response_tokens, prompt_text, document_text, count_tokens
+    )
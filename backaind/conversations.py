@@ -0,0 +1,350 @@
+"""Keep the history of conversations on the server, so clients only send new messages."""
+from datetime import datetime, timedelta
+import re
+from threading import Lock
+import time
+from typing import Callable, List, Optional
+
+from langchain.memory import ConversationBufferMemory, ConversationBufferWindowMemory
+from langchain.schema import BaseMessage, SystemMessage, get_buffer_string
+
+from .cache import LruCache
+from .extensions import db
+from .latency import approximate_token_count
+from .models import Conversation, ConversationMessage
+
+DEFAULT_CONVERSATION_CACHE_MAX_ENTRIES = 1000
+DEFAULT_CONVERSATION_MAX_MESSAGES = 50
+# "window" keeps the last turns, "summary" compacts older turns into a running summary
+CONVERSATION_MEMORY_MODES = ("window", "summary")
+DEFAULT_CONVERSATION_MEMORY = "window"
+DEFAULT_CONVERSATION_SUMMARY_TOKENS = 1000
+DEFAULT_CONVERSATION_RETENTION_DAYS = 30
+# expired conversations are looked for at most once per interval
+CONVERSATION_CLEANUP_INTERVAL_SECONDS = 3600
+# Conversation IDs are generated by the client and have to be hard to guess.
+CONVERSATION_ID_PATTERN = re.compile(r"[A-Za-z0-9-]{16,64}")
+
+
+class ConversationError(Exception):
+    """Invalid or foreign conversation."""
+
+
+# pylint: disable-next=too-many-ancestors
+class SummaryBufferMemory(ConversationBufferMemory):
+    """
+    Memory of the recent messages, preceded by a summary of the older ones.
+    Unlike ConversationSummaryBufferMemory, it doesn't summarize by itself, so the summary
+    can be computed between the turns.
+    """
+
+    moving_summary_buffer: str = ""
+
+    @property
+    def buffer_as_messages(self) -> List[BaseMessage]:
+        """Return the summary (as system message) and the recent messages."""
+        summary = (
+            [SystemMessage(content=self.moving_summary_buffer)]
+            if self.moving_summary_buffer
+            else []
+        )
+        return summary + self.chat_memory.messages
+
+    @property
+    def buffer_as_str(self) -> str:
+        """Return the summary and the recent messages as text."""
+        return get_buffer_string(
+            self.buffer_as_messages,
+            human_prefix=self.human_prefix,
+            ai_prefix=self.ai_prefix,
+        )
+
+
+# pylint: disable-next=too-many-instance-attributes
+class ActiveConversation:
+    """
+    A conversation kept in memory between its turns.
+    The memory object is reused for every message, so the history only grows by the new turn.
+    """
+
+    def __init__(
+        self,
+        conversation_id: str,
+        user_id: Optional[int],
+        max_messages: int,
+        memory_mode: str = DEFAULT_CONVERSATION_MEMORY,
+    ):
+        self.id = conversation_id  # pylint: disable=invalid-name
+        self.user_id = user_id
+        self.max_messages = max_messages
+        self.is_persisted = False
+        self.is_summarizing = False
+        # number of stored messages before the first message in memory
+        self.first_message_index = 0
+        self.lock = Lock()
+        self.memory = (
+            SummaryBufferMemory()
+            if memory_mode == "summary"
+            else ConversationBufferWindowMemory(k=3)
+        )
+
+    def add_message(self, author: str, text: str):
+        """Append a message to the memory, dropping the oldest beyond the limit."""
+        if author == "ai":
+            self.memory.chat_memory.add_ai_message(text)
+        else:
+            self.memory.chat_memory.add_user_message(text)
+        messages = self.memory.chat_memory.messages
+        if len(messages) > self.max_messages:
+            self.first_message_index += len(messages) - self.max_messages
+            del messages[: len(messages) - self.max_messages]
+
+
+# Active conversations by ID, the least recently used ones get reloaded from the database.
+conversation_cache = LruCache(DEFAULT_CONVERSATION_CACHE_MAX_ENTRIES)
+# pylint: disable=invalid-name
+max_conversation_messages = DEFAULT_CONVERSATION_MAX_MESSAGES
+conversation_memory = DEFAULT_CONVERSATION_MEMORY
+conversation_summary_tokens = DEFAULT_CONVERSATION_SUMMARY_TOKENS
+conversation_retention_days = DEFAULT_CONVERSATION_RETENTION_DAYS
+last_cleanup_at = 0.0
+# pylint: enable=invalid-name
+cleanup_lock = Lock()
+
+
+def get_conversation(
+    conversation_id: str, user_id: Optional[int]
+) -> ActiveConversation:
+    """Return the active conversation, loading it from the database if it is not cached."""
+    if not isinstance(conversation_id, str) or not CONVERSATION_ID_PATTERN.fullmatch(
+        conversation_id
+    ):
+        raise ConversationError("Invalid conversation ID.")
+    conversation = conversation_cache.get_or_load(
+        conversation_id, lambda: load_conversation(conversation_id, user_id)
+    )
+    if conversation.user_id != user_id:
+        raise ConversationError("Unknown conversation.")
+    return conversation
+
+
+def load_conversation(
+    conversation_id: str, user_id: Optional[int]
+) -> ActiveConversation:
+    """Load the summary and the most recent messages of a conversation (or start a new one)."""
+    stored_conversation = db.session.get(Conversation, conversation_id)
+    if stored_conversation is None:
+        return ActiveConversation(
+            conversation_id, user_id, max_conversation_messages, conversation_memory
+        )
+
+    conversation = ActiveConversation(
+        conversation_id,
+        stored_conversation.user_id,
+        max_conversation_messages,
+        conversation_memory,
+    )
+    conversation.is_persisted = True
+    total_messages = (
+        db.session.query(ConversationMessage)
+        .filter_by(conversation_id=conversation_id)
+        .count()
+    )
+    unsummarized_messages = total_messages
+    if isinstance(conversation.memory, SummaryBufferMemory):
+        conversation.memory.moving_summary_buffer = stored_conversation.summary or ""
+        unsummarized_messages -= stored_conversation.summarized_messages
+    messages = (
+        db.session.query(ConversationMessage)
+        .filter_by(conversation_id=conversation_id)
+        .order_by(ConversationMessage.id.desc())
+        .limit(max(min(max_conversation_messages, unsummarized_messages), 0))
+        .all()
+    )
+    conversation.first_message_index = total_messages - len(messages)
+    for message in reversed(messages):
+        conversation.add_message(message.author, message.text)
+    return conversation
+
+
+def save_turn(conversation: ActiveConversation, input_text: str, response: str):
+    """
+    Append a question and its answer to the conversation and write them through.
+    Conversations of anonymous users are only kept in memory, so they can't fill the database.
+    """
+    with conversation.lock:
+        if conversation.user_id is not None:
+            if (
+                not conversation.is_persisted
+                or db.session.query(Conversation)
+                .filter_by(id=conversation.id)
+                .update({"updated": datetime.now()})
+                == 0
+            ):
+                db.session.add(
+                    Conversation(id=conversation.id, user_id=conversation.user_id)
+                )
+            db.session.add_all(
+                [
+                    ConversationMessage(
+                        conversation_id=conversation.id,
+                        author="human",
+                        text=input_text,
+                    ),
+                    ConversationMessage(
+                        conversation_id=conversation.id, author="ai", text=response
+                    ),
+                ]
+            )
+            db.session.commit()
+            conversation.is_persisted = True
+        conversation.add_message("human", input_text)
+        conversation.add_message("ai", response)
+    delete_expired_conversations_if_due()
+
+
+def delete_conversation(conversation_id: str, user_id: Optional[int]):
+    """Delete a conversation of the user from the database and the memory."""
+    if not isinstance(conversation_id, str) or not CONVERSATION_ID_PATTERN.fullmatch(
+        conversation_id
+    ):
+        raise ConversationError("Invalid conversation ID.")
+    stored_conversation = db.session.get(Conversation, conversation_id)
+    if stored_conversation is not None:
+        if stored_conversation.user_id != user_id:
+            raise ConversationError("Unknown conversation.")
+        delete_stored_conversations([conversation_id])
+    conversation = conversation_cache.get(conversation_id)
+    if conversation is not None and conversation.user_id == user_id:
+        conversation_cache.invalidate(conversation_id)
+
+
+def delete_expired_conversations() -> int:
+    """Delete the conversations not continued within the retention period."""
+    if not conversation_retention_days:
+        return 0
+    expired_before = datetime.now() - timedelta(days=conversation_retention_days)
+    conversation_ids = [
+        conversation_id
+        for (conversation_id,) in db.session.query(Conversation.id).filter(
+            Conversation.updated < expired_before
+        )
+    ]
+    delete_stored_conversations(conversation_ids)
+    for conversation_id in conversation_ids:
+        conversation_cache.invalidate(conversation_id)
+    return len(conversation_ids)
+
+
+def delete_expired_conversations_if_due():
+    """Delete the expired conversations unless they have been deleted recently."""
+    # pylint: disable=global-statement
+    global last_cleanup_at
+    with cleanup_lock:
+        if time.monotonic() - last_cleanup_at < CONVERSATION_CLEANUP_INTERVAL_SECONDS:
+            return
+        last_cleanup_at = time.monotonic()
+    delete_expired_conversations()
+
+
+def delete_stored_conversations(conversation_ids: List[str]):
+    """Delete conversations and their messages from the database."""
+    if not conversation_ids:
+        return
+    db.session.query(ConversationMessage).filter(
+        ConversationMessage.conversation_id.in_(conversation_ids)
+    ).delete(synchronize_session=False)
+    db.session.query(Conversation).filter(Conversation.id.in_(conversation_ids)).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+
+
+def get_messages_to_summarize(conversation: ActiveConversation) -> List[BaseMessage]:
+    """
+    Return the oldest messages to add onto the summary if the recent messages exceed the
+    token limit (or an empty list if no summary is due).
+    Enough messages are returned to get below half of the limit, so the summary is updated
+    every few turns only. The most recent turn is always kept as it is.
+    """
+    with conversation.lock:
+        if conversation.is_summarizing or not isinstance(
+            conversation.memory, SummaryBufferMemory
+        ):
+            return []
+        messages = list(conversation.memory.chat_memory.messages)
+        tokens = [approximate_token_count(get_buffer_string([m])) for m in messages]
+        remaining_tokens = sum(tokens)
+        if remaining_tokens <= conversation_summary_tokens:
+            return []
+        count = 0
+        while count < len(messages) - 2 and (
+            remaining_tokens > conversation_summary_tokens // 2
+        ):
+            remaining_tokens -= tokens[count]
+            count += 1
+        if count == 0:
+            return []
+        conversation.is_summarizing = True
+        return messages[:count]
+
+
+def summarize_conversation(
+    conversation: ActiveConversation,
+    messages: List[BaseMessage],
+    summarize: Callable[[str, List[BaseMessage]], str],
+):
+    """
+    Add the messages onto the summary of the conversation with the summarize function,
+    then replace them in memory and store the new summary.
+    """
+    try:
+        summary = summarize(conversation.memory.moving_summary_buffer, messages)
+        with conversation.lock:
+            chat_messages = conversation.memory.chat_memory.messages
+            # the messages may have been dropped meanwhile (if the limit has been exceeded)
+            if len(chat_messages) < len(messages) or any(
+                chat_message is not message
+                for chat_message, message in zip(chat_messages, messages)
+            ):
+                return
+            del chat_messages[: len(messages)]
+            conversation.first_message_index += len(messages)
+            conversation.memory.moving_summary_buffer = summary
+            stored_conversation = db.session.get(Conversation, conversation.id)
+            if stored_conversation is not None:
+                stored_conversation.summary = summary
+                stored_conversation.summarized_messages = (
+                    conversation.first_message_index
+                )
+                db.session.commit()
+    finally:
+        conversation.is_summarizing = False
+
+
+def init_app(app):
+    """Configure the conversation cache with the application's settings and empty it."""
+    # pylint: disable=global-statement
+    global max_conversation_messages, conversation_memory, conversation_summary_tokens
+    global conversation_retention_days, last_cleanup_at
+    max_conversation_messages = app.config.get(
+        "CONVERSATION_MAX_MESSAGES", DEFAULT_CONVERSATION_MAX_MESSAGES
+    )
+    conversation_memory = app.config.get(
+        "CONVERSATION_MEMORY", DEFAULT_CONVERSATION_MEMORY
+    )
+    if conversation_memory not in CONVERSATION_MEMORY_MODES:
+        raise ValueError(f"Unknown conversation memory: {conversation_memory}")
+    conversation_summary_tokens = app.config.get(
+        "CONVERSATION_SUMMARY_TOKENS", DEFAULT_CONVERSATION_SUMMARY_TOKENS
+    )
+    conversation_retention_days = app.config.get(
+        "CONVERSATION_RETENTION_DAYS", DEFAULT_CONVERSATION_RETENTION_DAYS
+    )
+    last_cleanup_at = 0.0
+    conversation_cache.configure(
+        app.config.get(
+            "CONVERSATION_CACHE_MAX_ENTRIES", DEFAULT_CONVERSATION_CACHE_MAX_ENTRIES
+        )
+    )
+    conversation_cache.invalidate()
@@ -0,0 +1,236 @@
+"""Persist computed embeddings on disk, so identical texts are only embedded once."""
+from array import array
+import hashlib
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain.embeddings.base import Embeddings
+
+from .metrics import embedding_cache_entries, embedding_cache_lookups_total
+
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = 100000
+EMBEDDING_CACHE_FILENAME = "embedding-cache.sqlite3"
+# Number of cache hits whose last use is written at once
+TOUCH_BATCH_SIZE = 256
+# pylint: disable=invalid-name
+global_embedding_cache: Optional["EmbeddingCache"] = None
+# pylint: enable=invalid-name
+
+
+# pylint: disable-next=too-many-instance-attributes
+class EmbeddingCache:
+    """
+    Size-bounded SQLite cache of embeddings, keyed by the embeddings model and text hash.
+    When max_entries is exceeded, the least recently used embeddings get removed (a tenth of
+    max_entries at once, so it doesn't happen with every added embedding).
+    The last use of cache hits is written in batches instead of with every lookup.
+    """
+
+    def __init__(
+        self, path: str, max_entries: int = DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+        # last use of the recent hits by model and text hash (not written yet)
+        self.pending_touches: Dict[Tuple[str, str], float] = {}
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS embedding ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "last_used REAL NOT NULL, PRIMARY KEY (model, text_hash))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embedding_last_used "
+                "ON embedding (last_used)"
+            )
+            # approximated between evictions (other processes may add embeddings as well)
+            self.entries = self.count_entries()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings of the texts by text hash and count hits/misses."""
+        hashes = list({get_text_hash(text) for text in texts})
+        found: Dict[str, List[float]] = {}
+        with self.lock:
+            # stay below the SQLite limit of host parameters per statement
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    "SELECT text_hash, vector FROM embedding "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+                for text_hash, vector in rows:
+                    found[text_hash] = array("f", vector).tolist()
+            now = time.time()
+            for text_hash in found:
+                self.pending_touches[(model, text_hash)] = now
+            if len(self.pending_touches) >= TOUCH_BATCH_SIZE:
+                self.flush_touches()
+            hits = sum(1 for text in texts if get_text_hash(text) in found)
+            self.hits += hits
+            self.misses += len(texts) - hits
+        if hits:
+            embedding_cache_lookups_total.inc(hits, result="hit")
+        if len(texts) > hits:
+            embedding_cache_lookups_total.inc(len(texts) - hits, result="miss")
+        return found
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: List[List[float]]):
+        """Add embeddings to the cache and remove the least recently used if it's full."""
+        now = time.time()
+        with self.lock:
+            # the order of the least recently used embeddings has to be up to date
+            self.flush_touches()
+            with self.connection:
+                # an embedding of the same model and text is the same, so it's kept
+                cursor = self.connection.executemany(
+                    "INSERT OR IGNORE INTO embedding VALUES (?, ?, ?, ?)",
+                    [
+                        (model, get_text_hash(text), array("f", vector).tobytes(), now)
+                        for text, vector in zip(texts, vectors)
+                    ],
+                )
+                self.entries += max(cursor.rowcount, 0)
+                if self.max_entries > 0 and self.entries > self.max_entries:
+                    self.remove_least_recently_used()
+
+    def remove_least_recently_used(self):
+        """Remove embeddings until a tenth of max_entries is free (call with lock)."""
+        self.entries = self.count_entries()
+        excess = self.entries - (self.max_entries - self.max_entries // 10)
+        if self.entries <= self.max_entries or excess <= 0:
+            return
+        # the index on last_used finds the oldest embeddings without scanning the table
+        cursor = self.connection.execute(
+            "DELETE FROM embedding WHERE rowid IN (SELECT rowid FROM embedding "
+            "ORDER BY last_used, rowid LIMIT ?)",
+            (excess,),
+        )
+        self.entries -= cursor.rowcount
+
+    def flush_touches(self):
+        """Write the last use of the recent hits (call with lock)."""
+        if not self.pending_touches:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE embedding SET last_used = ? WHERE model = ? AND text_hash = ?",
+                [
+                    (last_used, model, text_hash)
+                    for (model, text_hash), last_used in self.pending_touches.items()
+                ],
+            )
+        self.pending_touches.clear()
+
+    def count_entries(self) -> int:
+        """Return the number of cached embeddings (call with lock)."""
+        return self.connection.execute("SELECT COUNT(*) FROM embedding").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the number of hits, misses and cached embeddings."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": self.count_entries(),
+            }
+
+    def close(self):
+        """Write the pending last uses and close the database connection."""
+        with self.lock:
+            self.flush_touches()
+            self.connection.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper looking up and storing the embeddings in the embedding cache."""
+
+    def __init__(self, embeddings: Embeddings, model: str):
+        self.embeddings = embeddings
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed the texts which are not cached yet and return all embeddings."""
+        cache = get_embedding_cache()
+        if cache is None:
+            return self.embeddings.embed_documents(texts)
+        found = cache.get_many(self.model, texts)
+        missing = list(
+            dict.fromkeys(text for text in texts if get_text_hash(text) not in found)
+        )
+        if missing:
+            vectors = self.embeddings.embed_documents(missing)
+            cache.put_many(self.model, missing, vectors)
+            for text, vector in zip(missing, vectors):
+                found[get_text_hash(text)] = vector
+        return [found[get_text_hash(text)] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Return the cached embedding of the query or embed it."""
+        cache = get_embedding_cache()
+        if cache is None:
+            return self.embeddings.embed_query(text)
+        # queries may be embedded differently than documents by some models
+        model = f"{self.model}#query"
+        found = cache.get_many(model, [text])
+        if found:
+            return found[get_text_hash(text)]
+        vector = self.embeddings.embed_query(text)
+        cache.put_many(model, [text], [vector])
+        return vector
+
+    def __getattr__(self, name):
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+
+def get_text_hash(text: str) -> str:
+    """Return the hash identifying a text in the embedding cache."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the embedding cache of the application (or None if it is disabled)."""
+    return global_embedding_cache
+
+
+def count_cached_embeddings() -> Optional[int]:
+    """Return the number of cached embeddings (or None if the cache is disabled)."""
+    cache = get_embedding_cache()
+    return cache.get_stats()["entries"] if cache is not None else None
+
+
+embedding_cache_entries.set_function(count_cached_embeddings)
+
+
+def reset_embedding_cache():
+    """Close the embedding cache."""
+    # pylint: disable=global-statement
+    global global_embedding_cache
+    if global_embedding_cache is not None:
+        global_embedding_cache.close()
+        global_embedding_cache = None
+
+
+def init_app(app):
+    """Open the embedding cache in the instance folder (unless it is disabled)."""
+    # pylint: disable=global-statement
+    global global_embedding_cache
+    reset_embedding_cache()
+    max_entries = app.config.get(
+        "EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES
+    )
+    if int(max_entries) >= 0:
+        global_embedding_cache = EmbeddingCache(
+            os.path.join(app.instance_path, EMBEDDING_CACHE_FILENAME), int(max_entries)
+        )
@@ -0,0 +1,270 @@
+"""Load, split and embed uploaded documents into knowledge in the background."""
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+import shutil
+from threading import Lock
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+import uuid
+
+from flask import current_app
+from langchain.docstore.document import Document
+from langchain.document_loaders.base import BaseLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter, TextSplitter
+
+from .extensions import db
+from .knowledge import (
+    add_to_knowledge,
+    delete_from_knowledge,
+    get_content_hash,
+    get_document_chunks,
+)
+from .models import Knowledge
+
+DEFAULT_INGESTION_WORKERS = 1
+DEFAULT_INGESTION_BATCH_SIZE = 32
+MAX_FINISHED_JOBS = 100
+# pylint: disable=invalid-name
+global_executor: Optional[Executor] = None
+# pylint: enable=invalid-name
+jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+jobs_lock = Lock()
+
+
+class IngestionCancelledError(Exception):
+    """The ingestion job has been cancelled."""
+
+
+# pylint: disable-next=too-many-instance-attributes
+class IngestionJob:
+    """
+    A document waiting to be or being added to a knowledge.
+    With replace, the chunks of a previously uploaded document with the same name are
+    replaced (only changed chunks get embedded).
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        knowledge_id: int,
+        loader: BaseLoader,
+        upload_directory: Optional[str] = None,
+        document_name: Optional[str] = None,
+        replace: bool = False,
+    ):
+        self.id = uuid.uuid4().hex  # pylint: disable=invalid-name
+        self.knowledge_id = knowledge_id
+        self.loader = loader
+        self.upload_directory = upload_directory
+        self.document_name = document_name
+        self.replace = replace
+        self.status = "queued"
+        self.chunks_total = 0
+        self.chunks_embedded = 0
+        self.chunks_skipped = 0
+        self.chunks_removed = 0
+        self.content_hashes: Set[str] = set()
+        self.chunks_per_second = 0.0
+        self.error: Optional[str] = None
+        self.cancel_requested = False
+        self.created = datetime.now()
+
+    @property
+    def is_finished(self) -> bool:
+        """Check if the job doesn't run anymore."""
+        return self.status in ("done", "failed", "cancelled")
+
+    def as_dict(self):
+        """Return the job status as dictionary."""
+        return {
+            "id": self.id,
+            "knowledge_id": self.knowledge_id,
+            "document_name": self.document_name,
+            "replace": self.replace,
+            "status": self.status,
+            "chunks_total": self.chunks_total,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_skipped": self.chunks_skipped,
+            "chunks_removed": self.chunks_removed,
+            "chunks_per_second": self.chunks_per_second,
+            "error": self.error,
+            "created": self.created.isoformat(),
+        }
+
+
+def get_executor() -> Executor:
+    """Return the pool of ingestion workers or create it if it doesn't exist yet."""
+    # pylint: disable=global-statement
+    global global_executor
+    with jobs_lock:
+        if global_executor is None:
+            workers = current_app.config.get(
+                "INGESTION_WORKERS", DEFAULT_INGESTION_WORKERS
+            )
+            # On gunicorn, threading is monkeypatched by gevent, so the workers are greenlets
+            # like the requests (using the same locks and a session per app context).
+            global_executor = ThreadPoolExecutor(max_workers=workers)
+        return global_executor
+
+
+def submit_ingestion_job(
+    knowledge_id: int,
+    loader: BaseLoader,
+    upload_directory: Optional[str] = None,
+    document_name: Optional[str] = None,
+    replace: bool = False,
+) -> IngestionJob:
+    """Queue a document to be added to the knowledge and return the job."""
+    job = IngestionJob(knowledge_id, loader, upload_directory, document_name, replace)
+    with jobs_lock:
+        jobs[job.id] = job
+        finished = [job_id for job_id, entry in jobs.items() if entry.is_finished]
+        for job_id in finished[: max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del jobs[job_id]
+    # pylint: disable-next=protected-access
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    get_executor().submit(run_ingestion_job, app, job)
+    return job
+
+
+def get_ingestion_job(job_id: str) -> Optional[IngestionJob]:
+    """Return the job with the given ID (or None if it doesn't exist)."""
+    with jobs_lock:
+        return jobs.get(job_id)
+
+
+def get_ingestion_jobs(knowledge_id: int) -> List[IngestionJob]:
+    """Return all known jobs of the knowledge."""
+    with jobs_lock:
+        return [job for job in jobs.values() if job.knowledge_id == knowledge_id]
+
+
+def cancel_ingestion_job(job_id: str) -> Optional[IngestionJob]:
+    """Request the cancellation of a job and return it (or None if it doesn't exist)."""
+    job = get_ingestion_job(job_id)
+    if job is not None and not job.is_finished:
+        job.cancel_requested = True
+    return job
+
+
+def run_ingestion_job(app, job: IngestionJob):
+    """Load, split and embed the document of the job (runs in an ingestion worker)."""
+    document_ids: List[str] = []
+
+    def on_batch(ids: List[str], skipped: int, seconds: float):
+        document_ids.extend(ids)
+        job.chunks_embedded += len(ids)
+        job.chunks_skipped += skipped
+        job.chunks_per_second = len(ids) / seconds if seconds > 0 else 0.0
+        app.logger.debug(
+            "Embedded %d chunks into knowledge %d (%.1f chunks/s).",
+            len(ids),
+            job.knowledge_id,
+            job.chunks_per_second,
+        )
+        # let other greenlets (e.g. socket.io responses) run between the batches
+        time.sleep(0)
+
+    with app.app_context():
+        try:
+            check_cancelled(job)
+            job.status = "running"
+            knowledge = db.session.get(Knowledge, job.knowledge_id)
+            if knowledge is None:
+                raise ValueError("The knowledge does not exist anymore.")
+            previous_chunks = (
+                get_document_chunks(job.knowledge_id, job.document_name)
+                if job.replace and job.document_name
+                else {}
+            )
+            chunks = split_lazily(
+                load_lazily(job.loader),
+                RecursiveCharacterTextSplitter(chunk_size=knowledge.chunk_size),
+            )
+            add_to_knowledge(
+                job.knowledge_id,
+                count_chunks(job, chunks),
+                app.config.get("INGESTION_BATCH_SIZE", DEFAULT_INGESTION_BATCH_SIZE),
+                on_batch,
+            )
+            remove_outdated_chunks(job, previous_chunks)
+            job.status = "done"
+        except IngestionCancelledError:
+            remove_documents(job, document_ids)
+            job.status = "cancelled"
+        # pylint: disable-next=broad-exception-caught
+        except Exception as exception:
+            remove_documents(job, document_ids)
+            job.error = str(exception)
+            job.status = "failed"
+        finally:
+            if job.upload_directory:
+                shutil.rmtree(job.upload_directory, ignore_errors=True)
+
+
+def load_lazily(loader: BaseLoader) -> Iterator[Document]:
+    """Load the documents one by one if the loader supports it, otherwise all at once."""
+    try:
+        yield from loader.lazy_load()
+    except NotImplementedError:
+        yield from loader.load()
+
+
+def split_lazily(
+    documents: Iterable[Document], splitter: TextSplitter
+) -> Iterator[Document]:
+    """Split the documents into chunks one document after another."""
+    for document in documents:
+        yield from splitter.split_documents([document])
+
+
+def count_chunks(job: IngestionJob, chunks: Iterable[Document]) -> Iterator[Document]:
+    """Pass on the chunks, count, hash and name them and stop if the job gets cancelled."""
+    for chunk in chunks:
+        check_cancelled(job)
+        job.chunks_total += 1
+        chunk.metadata["content_hash"] = get_content_hash(chunk.page_content)
+        job.content_hashes.add(chunk.metadata["content_hash"])
+        if job.document_name:
+            chunk.metadata["document"] = job.document_name
+        yield chunk
+    check_cancelled(job)
+
+
+def remove_outdated_chunks(job: IngestionJob, previous_chunks: Dict[str, str]):
+    """Remove the chunks of the replaced document which are not in the new version."""
+    outdated_ids = [
+        chunk_id
+        for chunk_id, content_hash in previous_chunks.items()
+        if content_hash not in job.content_hashes
+    ]
+    if outdated_ids:
+        delete_from_knowledge(job.knowledge_id, outdated_ids)
+    job.chunks_removed = len(outdated_ids)
+
+
+def check_cancelled(job: IngestionJob):
+    """Raise IngestionCancelledError if the cancellation of the job was requested."""
+    if job.cancel_requested:
+        raise IngestionCancelledError()
+
+
+def remove_documents(job: IngestionJob, document_ids: List[str]):
+    """Remove the already embedded documents of an unfinished job."""
+    if document_ids:
+        delete_from_knowledge(job.knowledge_id, document_ids)
+        job.chunks_embedded = 0
+
+
+def reset_ingestion():
+    """Wait for running jobs, stop the ingestion workers and forget all jobs."""
+    # pylint: disable=global-statement
+    global global_executor
+    with jobs_lock:
+        executor = global_executor
+        global_executor = None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    with jobs_lock:
+        jobs.clear()
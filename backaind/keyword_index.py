@@ -0,0 +1,135 @@
+"""Rank the chunks of knowledge by their keywords (BM25) using an inverted index."""
+from collections import Counter
+import math
+import re
+import sqlite3
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+KEYWORD_INDEX_FILENAME = "keyword-index.sqlite3"
+BM25_K1 = 1.2
+BM25_B = 0.75
+SQLITE_MAX_PARAMETERS = 500
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase words."""
+    return re.findall(r"\w+", text.lower())
+
+
+class KeywordIndex:
+    """
+    Inverted index of the words of every chunk in a SQLite file.
+    It is updated incrementally when chunks are added or deleted, so no rebuild is needed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS chunk ("
+                "label INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+                "length INTEGER NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS posting (term TEXT NOT NULL, "
+                "label INTEGER NOT NULL, frequency INTEGER NOT NULL, "
+                "PRIMARY KEY (term, label)) WITHOUT ROWID"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_posting_label ON posting (label)"
+            )
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]):
+        """Add (or replace) the words of chunks."""
+        with self.lock, self.connection:
+            self._delete_rows(ids)
+            for chunk_id, text in zip(ids, texts):
+                terms = tokenize(text)
+                label = self.connection.execute(
+                    "INSERT INTO chunk (id, length) VALUES (?, ?)",
+                    (chunk_id, len(terms)),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO posting VALUES (?, ?, ?)",
+                    [(term, label, count) for term, count in Counter(terms).items()],
+                )
+
+    def delete(self, ids: Sequence[str]):
+        """Delete the words of chunks."""
+        with self.lock, self.connection:
+            self._delete_rows(ids)
+
+    def _delete_rows(self, ids: Sequence[str]):
+        """Delete the chunks and their postings (call with lock)."""
+        ids = list(ids)
+        for start in range(0, len(ids), SQLITE_MAX_PARAMETERS):
+            chunk_ids = ids[start : start + SQLITE_MAX_PARAMETERS]
+            placeholders = ",".join("?" * len(chunk_ids))
+            labels = self.connection.execute(
+                f"SELECT label FROM chunk WHERE id IN ({placeholders})", chunk_ids
+            ).fetchall()
+            self.connection.executemany("DELETE FROM posting WHERE label = ?", labels)
+            self.connection.executemany("DELETE FROM chunk WHERE label = ?", labels)
+
+    def clear(self):
+        """Delete all chunks."""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM posting")
+            self.connection.execute("DELETE FROM chunk")
+
+    def count(self) -> int:
+        """Return the number of indexed chunks."""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM chunk").fetchone()[0]
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Return the IDs and BM25 scores of the k chunks best matching the query."""
+        terms = list(set(tokenize(query)))[:SQLITE_MAX_PARAMETERS]
+        if not terms or k <= 0:
+            return []
+        with self.lock:
+            chunk_count, total_length = self.connection.execute(
+                "SELECT COUNT(*), SUM(length) FROM chunk"
+            ).fetchone()
+            if not chunk_count:
+                return []
+            placeholders = ",".join("?" * len(terms))
+            postings = self.connection.execute(
+                "SELECT posting.term, posting.label, posting.frequency, chunk.length "
+                "FROM posting JOIN chunk ON chunk.label = posting.label "
+                f"WHERE posting.term IN ({placeholders})",
+                terms,
+            ).fetchall()
+            document_frequencies = Counter(term for term, _, _, _ in postings)
+            average_length = (total_length / chunk_count) or 1.0
+            scores: Dict[int, float] = {}
+            for term, label, frequency, length in postings:
+                idf = math.log(
+                    1
+                    + (chunk_count - document_frequencies[term] + 0.5)
+                    / (document_frequencies[term] + 0.5)
+                )
+                length_norm = 1 - BM25_B + BM25_B * length / average_length
+                scores[label] = scores.get(label, 0.0) + idf * frequency * (
+                    BM25_K1 + 1
+                ) / (frequency + BM25_K1 * length_norm)
+            best = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)[:k]
+            if not best:
+                return []
+            placeholders = ",".join("?" * len(best))
+            ids = dict(
+                self.connection.execute(
+                    f"SELECT label, id FROM chunk WHERE label IN ({placeholders})",
+                    [label for label, _ in best],
+                )
+            )
+        return [(ids[label], score) for label, score in best]
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self.lock:
+            self.connection.close()
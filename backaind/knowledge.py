@@ -1,101 +1,493 @@
 """
     Provide vector store capabilities to save and access 'knowledge'.
-    Currently only Chroma is supported as vector store.
+    Every knowledge uses one of the vector store backends in VECTOR_STORE_BACKENDS.
 """
-from typing import List
-from threading import Lock
+from contextlib import contextmanager
+import hashlib
+from itertools import islice
+import os
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from threading import Condition, Lock
 import uuid
 
 import click
 from langchain.docstore.document import Document
 from langchain.embeddings.base import Embeddings
 from langchain.vectorstores.base import VectorStore
-from langchain.vectorstores.chroma import Chroma
 
+from .cache import LruCache
+from .catalog import invalidate_catalog
+from .embedding_cache import CachedEmbeddings
 from .extensions import db
+from .metrics import (
+    embeddings_load_seconds,
+    embeddings_memory_bytes,
+    knowledge_chunks_added_total,
+    retrieval_seconds,
+)
 from .models import Knowledge
+from .response_cache import invalidate_responses
+from .tracing import span
+from .vector_stores import KnowledgeStore, VECTOR_STORE_CLASSES
 
-# pylint: disable=invalid-name
-global_knowledge = None
-global_knowledge_id = None
-# pylint: enable=invalid-name
+# The tokenizers of the embeddings models would warn (or deadlock) after the server forks the
+# processes running chains. It is set once here, as the environment of the server process is
+# shared by all concurrent requests and must not be changed per request.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+DEFAULT_KNOWLEDGE_CACHE_MAX_ENTRIES = 4
+DEFAULT_EMBEDDING_BATCH_SIZE = 32
+VECTOR_STORE_BACKENDS = tuple(VECTOR_STORE_CLASSES)
+DEFAULT_VECTOR_STORE = "chroma"
+RETRIEVAL_MODES = ("vector", "hybrid")
+# Retrieval options of an AI (the candidates are the pool the final k chunks are chosen from).
+DEFAULT_RETRIEVAL: Dict[str, Any] = {
+    "mode": "vector",
+    "k": 4,
+    "k_with_history": 1,
+    "candidates": 20,
+    "reranker": None,
+}
+# Constant of the reciprocal rank fusion, higher values flatten the weight of the top ranks.
+RRF_K = 60
+knowledge_locks: Dict[int, "ReadWriteLock"] = {}
 knowledge_lock = Lock()
+# Embeddings models are shared by all vector stores and loaded only once per process.
+embeddings_registry = LruCache(max_entries=0)
+embeddings_info: Dict[Tuple[str, str], Dict[str, Any]] = {}
+# Cross-encoder reranking models by name, loaded only once per process.
+rerankers_registry = LruCache(max_entries=0)
 
 
 class KnowledgeConfigError(Exception):
     """Invalid or missing knowledge configuration."""
 
 
-def get_embeddings(embeddings_type: str) -> Embeddings:
-    """Return an Embeddings instance for the given embeddings_type."""
-    if embeddings_type.lower() == "huggingface":
+def close_knowledge(_knowledge_id: int, knowledge: VectorStore):
+    """Close a vector store evicted from the knowledge cache."""
+    if isinstance(knowledge, KnowledgeStore):
+        knowledge.close()
+
+
+# Open vector stores by knowledge ID, the least recently used ones get closed first.
+knowledge_cache = LruCache(
+    DEFAULT_KNOWLEDGE_CACHE_MAX_ENTRIES, on_evict=close_knowledge
+)
+
+
+def get_embeddings(
+    embeddings_type: str, model_name: Optional[str] = None
+) -> Embeddings:
+    """
+    Return the shared Embeddings instance for the given embeddings_type and model.
+    The embeddings are looked up in and added to the embedding cache.
+    """
+    embeddings_type = embeddings_type.lower()
+    if embeddings_type == "huggingface":
+        # pylint: disable=import-outside-toplevel
+        from langchain.embeddings.huggingface import DEFAULT_MODEL_NAME
+
+        model_name = model_name or DEFAULT_MODEL_NAME
+    else:
+        raise KnowledgeConfigError(f"Unknown embeddings type: {embeddings_type}")
+
+    key = (embeddings_type, model_name)
+
+    def load_embeddings():
         # pylint: disable=import-outside-toplevel
         from langchain.embeddings import HuggingFaceEmbeddings
 
-        return HuggingFaceEmbeddings()
+        start = time.monotonic()
+        embeddings = HuggingFaceEmbeddings(model_name=model_name)
+        embeddings_info[key] = {
+            "type": embeddings_type,
+            "model_name": model_name,
+            "load_seconds": time.monotonic() - start,
+            "memory_bytes": estimate_embeddings_size(embeddings),
+        }
+        return CachedEmbeddings(embeddings, f"{embeddings_type}/{model_name}")
+
+    return embeddings_registry.get_or_load(key, load_embeddings)
+
+
+def estimate_embeddings_size(embeddings: Embeddings) -> int:
+    """Estimate the memory footprint of an embeddings model by its parameters and buffers."""
+    client = getattr(embeddings, "client", None)
+    size = 0
+    for tensors in ("parameters", "buffers"):
+        if hasattr(client, tensors):
+            for tensor in getattr(client, tensors)():
+                size += tensor.numel() * tensor.element_size()
+    return size
+
 
-    raise KnowledgeConfigError(f"Unknown embeddings type: {embeddings_type}")
+def get_embeddings_info() -> List[Dict[str, Any]]:
+    """Return load time and memory footprint of all loaded embeddings models."""
+    return [
+        embeddings_info[key]
+        for key in embeddings_registry.keys()
+        if key in embeddings_info
+    ]
+
+
+embeddings_load_seconds.set_function(
+    lambda: {
+        (info["type"], info["model_name"]): info["load_seconds"]
+        for info in get_embeddings_info()
+    }
+)
+embeddings_memory_bytes.set_function(
+    lambda: {
+        (info["type"], info["model_name"]): info["memory_bytes"]
+        for info in get_embeddings_info()
+    }
+)
+
+
+def reset_embeddings():
+    """Drop all loaded embeddings models."""
+    embeddings_registry.invalidate()
+    embeddings_info.clear()
+
+
+class ReadWriteLock:
+    """Allow many concurrent readers or a single writer (waiting writers go first)."""
+
+    def __init__(self):
+        self.condition = Condition()
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading while in the context."""
+        with self.condition:
+            while self.writing or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock exclusively while in the context."""
+        with self.condition:
+            self.waiting_writers += 1
+            try:
+                while self.writing or self.readers:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
 
 
 def get_knowledge(knowledge_id: int) -> VectorStore:
     """Return a vector store instance to be used for knowledge access."""
-    # pylint: disable=global-statement
-    global global_knowledge, global_knowledge_id
-    with knowledge_lock:
-        knowledge = global_knowledge
-        if not knowledge or global_knowledge_id != knowledge_id:
-            knowledge_entry = db.get_or_404(Knowledge, knowledge_id)
-            knowledge = Chroma(
-                persist_directory=knowledge_entry.persist_directory,
-                embedding_function=get_embeddings(knowledge_entry.embeddings),
+
+    def open_knowledge():
+        knowledge_entry = db.get_or_404(Knowledge, knowledge_id)
+        return create_vector_store(
+            knowledge_entry.persist_directory,
+            get_embeddings(knowledge_entry.embeddings),
+            knowledge_entry.vector_store,
+        )
+
+    return knowledge_cache.get_or_load(knowledge_id, open_knowledge)
+
+
+def create_vector_store(
+    persist_directory: str, embeddings: Embeddings, backend: str = DEFAULT_VECTOR_STORE
+) -> VectorStore:
+    """Open (or create) the vector store of the backend in the persist directory."""
+    if backend not in VECTOR_STORE_CLASSES:
+        raise KnowledgeConfigError(f"Unknown vector store backend: {backend}")
+    return VECTOR_STORE_CLASSES[backend](  # type: ignore[call-arg]
+        persist_directory=persist_directory, embedding_function=embeddings
+    )
+
+
+def get_reranker(model_name: str) -> Any:
+    """Return the shared cross-encoder model to rerank chunks by their relevance."""
+
+    def load_reranker():
+        # pylint: disable-next=import-outside-toplevel
+        from sentence_transformers import CrossEncoder
+
+        return CrossEncoder(model_name)
+
+    return rerankers_registry.get_or_load(model_name, load_reranker)
+
+
+def get_retrieval_config(retrieval: Optional[dict]) -> Dict[str, Any]:
+    """
+    Return the retrieval options of an AI, using the defaults for missing options.
+    Raises KnowledgeConfigError if an option is invalid.
+    """
+    if retrieval is None:
+        retrieval = {}
+    if not isinstance(retrieval, dict):
+        raise KnowledgeConfigError("The retrieval options have to be an object.")
+    for option in retrieval:
+        if option not in DEFAULT_RETRIEVAL:
+            raise KnowledgeConfigError(f"Unknown retrieval option: {option}")
+    config = {**DEFAULT_RETRIEVAL, **retrieval}
+    if config["mode"] not in RETRIEVAL_MODES:
+        raise KnowledgeConfigError(f"Unknown retrieval mode: {config['mode']}")
+    for option in ("k", "k_with_history", "candidates"):
+        if (
+            not isinstance(config[option], int)
+            or isinstance(config[option], bool)
+            or config[option] < 1
+        ):
+            raise KnowledgeConfigError(
+                f"The retrieval option {option} has to be a positive number."
             )
-            global_knowledge = knowledge
-            global_knowledge_id = knowledge_id
-    return knowledge
+    if config["reranker"] is not None and not isinstance(config["reranker"], str):
+        raise KnowledgeConfigError(
+            "The retrieval option reranker has to be a model name."
+        )
+    return config
+
+
+def get_knowledge_lock(knowledge_id: int) -> ReadWriteLock:
+    """Return the lock guarding reads and writes of the knowledge."""
+    with knowledge_lock:
+        return knowledge_locks.setdefault(knowledge_id, ReadWriteLock())
 
 
 def reset_global_knowledge(knowledge_id=None):
     """
-    Drop the global knowledge instance.
-    If knowledge_id is set, it only drops the global knowledge instance if it matches this ID.
+    Close the open vector store instances.
+    If knowledge_id is set, it only closes the vector store instance with this ID.
+    Cached responses based on the knowledge get dropped as well.
     """
-    # pylint: disable=global-statement
-    global global_knowledge, global_knowledge_id
-    with knowledge_lock:
-        if not knowledge_id or knowledge_id == global_knowledge_id:
-            global_knowledge = None
-            global_knowledge_id = None
+    knowledge_cache.invalidate(knowledge_id or None)
+    invalidate_responses(knowledge_id=knowledge_id or None)
 
 
-def add_to_knowledge(knowledge_id: int, documents: List[Document]):
-    """Add documents to the specified knowledge."""
-    knowledge = get_knowledge(knowledge_id)
-    knowledge.add_documents(
-        documents, ids=[str(uuid.uuid4()) for _ in range(len(documents))]
+# pylint: disable-next=too-many-arguments
+def search_knowledge(
+    knowledge_id: int,
+    query: str,
+    k: int = 4,
+    mode: str = "vector",
+    candidates: int = 0,
+    reranker: Optional[str] = None,
+) -> List[Document]:
+    """
+    Return the documents of the knowledge most relevant to the query.
+    In hybrid mode, the candidates most similar to the query and the candidates best matching
+    its keywords (BM25) are fused by their ranks. With a reranker, the candidates are
+    reordered by the cross-encoder model before the best k are returned.
+    """
+    with retrieval_seconds.time(knowledge_id=knowledge_id), span(
+        "retrieval", k=k, mode=mode
+    ):
+        knowledge = get_knowledge(knowledge_id)
+        if mode == "vector" and not reranker:
+            with get_knowledge_lock(knowledge_id).read():
+                return knowledge.similarity_search(query, k=k)
+
+        pool_size = max(candidates, k)
+        with get_knowledge_lock(knowledge_id).read():
+            vector_hits = knowledge.search_chunks(query, pool_size)
+            documents = dict(vector_hits)
+            rankings = [[chunk_id for chunk_id, _ in vector_hits]]
+            if mode == "hybrid":
+                keyword_hits = knowledge.get_keyword_index().search(query, pool_size)
+                rankings.append([chunk_id for chunk_id, _ in keyword_hits])
+                documents.update(
+                    knowledge.get_documents(
+                        [
+                            chunk_id
+                            for chunk_id, _ in keyword_hits
+                            if chunk_id not in documents
+                        ]
+                    )
+                )
+        ranked_documents = [
+            documents[chunk_id]
+            for chunk_id in fuse_rankings(rankings)
+            if chunk_id in documents
+        ][:pool_size]
+        if reranker:
+            with span("rerank", candidates=len(ranked_documents)):
+                ranked_documents = rerank(reranker, query, ranked_documents)
+        return ranked_documents[:k]
+
+
+def fuse_rankings(rankings: List[List[str]]) -> List[str]:
+    """Merge rankings of chunk IDs by reciprocal rank fusion (best first)."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, 1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1 / (RRF_K + rank)
+    return sorted(scores, key=lambda chunk_id: scores[chunk_id], reverse=True)
+
+
+def rerank(model_name: str, query: str, documents: List[Document]) -> List[Document]:
+    """Sort the documents by the relevance to the query the cross-encoder model predicts."""
+    if not documents:
+        return documents
+    scores = get_reranker(model_name).predict(
+        [(query, document.page_content) for document in documents]
     )
+    return [
+        document
+        for _, document in sorted(
+            zip(scores, documents), key=lambda entry: entry[0], reverse=True
+        )
+    ]
+
+
+def add_to_knowledge(
+    knowledge_id: int,
+    documents: Iterable[Document],
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    on_batch: Optional[Callable[[List[str], int, float], None]] = None,
+    skip_existing: bool = True,
+) -> List[str]:
+    """
+    Add documents to the specified knowledge and return their IDs.
+    The documents are pulled lazily and embedded in batches, so only one batch is kept in
+    memory. Every document gets the hash of its content as content_hash metadata.
+    With skip_existing, documents whose content is already in the same uploaded document
+    (the document metadata) are skipped, so every uploaded document owns all of its chunks.
+    on_batch is called with the new IDs, the number of skipped documents and the seconds
+    taken for every batch.
+    """
+    knowledge = get_knowledge(knowledge_id)
+    document_ids = []
+    added_hashes = set()
+    for batch in iterate_batches(documents, batch_size):
+        start = time.monotonic()
+        for document in batch:
+            document.metadata.setdefault(
+                "content_hash", get_content_hash(document.page_content)
+            )
+        existing_hashes = (
+            get_existing_hashes(
+                knowledge_id, [document.metadata["content_hash"] for document in batch]
+            )
+            if skip_existing
+            else set()
+        )
+        new_documents = []
+        for document in batch:
+            owned_hash = (
+                document.metadata.get("document"),
+                document.metadata["content_hash"],
+            )
+            if skip_existing and (
+                owned_hash in existing_hashes or owned_hash in added_hashes
+            ):
+                continue
+            added_hashes.add(owned_hash)
+            new_documents.append(document)
+        ids = [str(uuid.uuid4()) for _ in new_documents]
+        if new_documents:
+            texts = [document.page_content for document in new_documents]
+            # embed outside of the lock, so searches are only blocked while writing
+            embeddings = knowledge.embeddings.embed_documents(texts)
+            with get_knowledge_lock(knowledge_id).write():
+                knowledge.upsert_chunks(
+                    ids, embeddings, texts, [doc.metadata for doc in new_documents]
+                )
+                knowledge.get_keyword_index().add(ids, texts)
+            invalidate_responses(knowledge_id=knowledge_id)
+            knowledge_chunks_added_total.inc(len(ids), knowledge_id=knowledge_id)
+        document_ids.extend(ids)
+        if on_batch:
+            on_batch(ids, len(batch) - len(new_documents), time.monotonic() - start)
+    with get_knowledge_lock(knowledge_id).read():
+        knowledge.persist()
+    return document_ids
+
+
+def get_content_hash(text: str) -> str:
+    """Return the hash identifying a text in the knowledge."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_existing_hashes(
+    knowledge_id: int, content_hashes: List[str]
+) -> Set[Tuple[Optional[str], str]]:
+    """
+    Return the uploaded documents (or None) and the given content hashes of the chunks
+    which are already in the knowledge.
+    """
+    knowledge = get_knowledge(knowledge_id)
+    with get_knowledge_lock(knowledge_id).read():
+        chunks = knowledge.find_chunks("content_hash", content_hashes)
+    return {
+        (metadata.get("document"), metadata["content_hash"])
+        for metadata in chunks.values()
+    }
+
+
+def get_document_chunks(knowledge_id: int, document_name: str) -> Dict[str, str]:
+    """Return the IDs and content hashes of all chunks of an uploaded document."""
+    knowledge = get_knowledge(knowledge_id)
+    with get_knowledge_lock(knowledge_id).read():
+        chunks = knowledge.find_chunks("document", [document_name])
+    return {
+        chunk_id: metadata.get("content_hash", "")
+        for chunk_id, metadata in chunks.items()
+    }
+
+
+def iterate_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to batch_size items, pulling the items lazily."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, max(batch_size, 1)))
+        if not batch:
+            return
+        yield batch
 
 
 def get_from_knowledge(knowledge_id: int, limit: int, offset: int):
     """Get documents from the specified knowledge."""
     knowledge = get_knowledge(knowledge_id)
-    assert isinstance(
-        knowledge, Chroma
-    ), "Can only get documents from Chroma vector stores."
-    total = knowledge._collection.count()  # pylint: disable=protected-access
-    collection = knowledge.get(limit=limit, offset=offset)
+    with get_knowledge_lock(knowledge_id).read():
+        total = knowledge.count_chunks()
+        chunks = knowledge.get_chunks(limit, offset)
     return {
         "total": total,
-        "items": [
-            {"id": id, "text": text}
-            for id, text in zip(collection["ids"], collection["documents"])
-        ],
+        "items": [{"id": chunk_id, "text": text} for chunk_id, text in chunks],
     }
 
 
 def delete_from_knowledge(knowledge_id: int, document_ids: List[str]):
     """Delete documents from the specified knowledge."""
     knowledge = get_knowledge(knowledge_id)
-    knowledge.delete(document_ids)
+    with get_knowledge_lock(knowledge_id).write():
+        knowledge.delete_chunks(document_ids)
+        knowledge.get_keyword_index().delete(document_ids)
+        knowledge.persist()
+    invalidate_responses(knowledge_id=knowledge_id)
 
 
 @click.command("add-knowledge")
@@ -109,7 +501,13 @@ def delete_from_knowledge(knowledge_id: int, document_ids: List[str]):
 @click.option(
     "--persist-directory", prompt="Directory to persist the knowledge database"
 )
-def add_knowledge(name, embeddings, chunk_size, persist_directory):
+@click.option(
+    "--vector-store",
+    type=click.Choice(VECTOR_STORE_BACKENDS),
+    default=DEFAULT_VECTOR_STORE,
+    help="Vector store backend of a new knowledge store.",
+)
+def add_knowledge(name, embeddings, chunk_size, persist_directory, vector_store):
     """Register a new knowledge store or update a knowledge store with the same name."""
     embeddings = embeddings.lower()
     existing_knowledge = db.session.query(Knowledge).filter_by(name=name).first()
@@ -120,9 +518,11 @@ def add_knowledge(name, embeddings, chunk_size, persist_directory):
             embeddings=embeddings,
             chunk_size=chunk_size,
             persist_directory=persist_directory,
+            vector_store=vector_store,
         )
         db.session.add(new_knowledge)
         db.session.commit()
+        invalidate_catalog()
         click.echo(f"Added {name}. Thank you for making me smarter!")
     else:
         existing_knowledge.embeddings = embeddings
@@ -130,10 +530,16 @@ def add_knowledge(name, embeddings, chunk_size, persist_directory):
         existing_knowledge.persist_directory = persist_directory
         existing_knowledge.name = name
         db.session.commit()
+        invalidate_catalog()
         reset_global_knowledge()
         click.echo(f"Updated {name}. Thank you for making me smarter!")
 
 
 def init_app(app):
-    """Register CLI commands with the application instance."""
+    """Register CLI commands and configure the knowledge cache."""
+    knowledge_cache.configure(
+        app.config.get(
+            "KNOWLEDGE_CACHE_MAX_ENTRIES", DEFAULT_KNOWLEDGE_CACHE_MAX_ENTRIES
+        )
+    )
     app.cli.add_command(add_knowledge)
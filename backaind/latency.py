@@ -0,0 +1,168 @@
+"""Predict how long AIs take to process prompts and generate responses."""
+import atexit
+import json
+import math
+import os
+from threading import Lock
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_PROMPT_TOKENS_PER_SECOND = 3.0
+DEFAULT_GENERATED_TOKENS_PER_SECOND = 3.0
+DEFAULT_GENERATED_TOKENS = 100.0
+DEFAULT_LATENCY_SMOOTHING = 0.3
+DEFAULT_LATENCY_SAVE_INTERVAL = 30
+LATENCY_FILENAME = "latency.json"
+CHARACTERS_PER_TOKEN = 4
+
+
+class LatencyModel:
+    """
+    Exponentially weighted moving averages of the prompt processing and generation speed
+    (tokens per second) and of the number of generated tokens of every AI.
+    The averages are persisted in a JSON file, so they survive restarts. New measurements
+    are written at most every save_interval seconds (and when the interpreter shuts down),
+    so responses don't wait for the file to be written.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        smoothing: float = DEFAULT_LATENCY_SMOOTHING,
+        save_interval: float = DEFAULT_LATENCY_SAVE_INTERVAL,
+    ):
+        self.path = path
+        self.smoothing = smoothing
+        self.save_interval = save_interval
+        self.rates: Dict[str, Dict[str, float]] = {}
+        self.lock = Lock()
+        self.is_dirty = False
+        self.saved_at = time.monotonic()
+        self.load()
+
+    def load(self):
+        """Load the averages from the JSON file (if it exists)."""
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as latency_file:
+                rates = json.load(latency_file)
+        except (OSError, ValueError):
+            return
+        with self.lock:
+            self.rates = rates
+
+    def save(self):
+        """Write the averages to the JSON file (atomically)."""
+        if not self.path:
+            return
+        with self.lock:
+            data = json.dumps(self.rates)
+            self.is_dirty = False
+            self.saved_at = time.monotonic()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as latency_file:
+            latency_file.write(data)
+        os.replace(temp_path, self.path)
+
+    def save_if_due(self, force: bool = False):
+        """Write changed averages if the save interval has passed (or if forced)."""
+        with self.lock:
+            if not self.is_dirty or (
+                not force and time.monotonic() - self.saved_at < self.save_interval
+            ):
+                return
+        self.save()
+
+    def get_rates(self, ai_id: int) -> Dict[str, float]:
+        """Return the averages of the AI (or the defaults if nothing was measured yet)."""
+        with self.lock:
+            return {
+                "prompt_tokens_per_second": DEFAULT_PROMPT_TOKENS_PER_SECOND,
+                "generated_tokens_per_second": DEFAULT_GENERATED_TOKENS_PER_SECOND,
+                "generated_tokens": DEFAULT_GENERATED_TOKENS,
+                **self.rates.get(str(ai_id), {}),
+            }
+
+    def predict(self, ai_id: int, prompt_tokens: int) -> Tuple[float, float]:
+        """Return the expected seconds to process the prompt and to generate the response."""
+        rates = self.get_rates(ai_id)
+        return (
+            prompt_tokens / rates["prompt_tokens_per_second"],
+            rates["generated_tokens"] / rates["generated_tokens_per_second"],
+        )
+
+    # pylint: disable-next=too-many-arguments
+    def record(
+        self,
+        ai_id: int,
+        prompt_tokens: int,
+        prompt_seconds: float,
+        generated_tokens: int,
+        generation_seconds: float,
+    ):
+        """Update the averages of the AI with the measurements of a response."""
+        samples = {}
+        if prompt_tokens and prompt_seconds > 0:
+            samples["prompt_tokens_per_second"] = prompt_tokens / prompt_seconds
+        if generated_tokens > 1 and generation_seconds > 0:
+            # the first token is generated while the prompt is still being processed
+            samples["generated_tokens_per_second"] = (
+                generated_tokens - 1
+            ) / generation_seconds
+        if generated_tokens:
+            samples["generated_tokens"] = generated_tokens
+        if not samples:
+            return
+        with self.lock:
+            rates = self.rates.setdefault(str(ai_id), {})
+            for name, value in samples.items():
+                rates[name] = (
+                    value
+                    if name not in rates
+                    else self.smoothing * value + (1 - self.smoothing) * rates[name]
+                )
+            self.is_dirty = True
+        self.save_if_due()
+
+    def forget(self, ai_id: Optional[int] = None):
+        """Drop the averages of the AI (or of all AIs)."""
+        with self.lock:
+            if ai_id is None:
+                self.rates.clear()
+            else:
+                self.rates.pop(str(ai_id), None)
+        self.save()
+
+
+def approximate_token_count(text: str) -> int:
+    """Approximate the number of tokens of a text if the tokenizer is unknown."""
+    return math.ceil(len(text) / CHARACTERS_PER_TOKEN)
+
+
+latency_model = LatencyModel()
+
+
+def init_app(app):
+    """Load the latency averages from the instance folder."""
+    # pylint: disable=global-statement
+    global latency_model
+    latency_model.save_if_due(force=True)
+    latency_model = LatencyModel(
+        os.path.join(app.instance_path, LATENCY_FILENAME),
+        app.config.get("LATENCY_SMOOTHING", DEFAULT_LATENCY_SMOOTHING),
+        app.config.get("LATENCY_SAVE_INTERVAL", DEFAULT_LATENCY_SAVE_INTERVAL),
+    )
+
+
+def get_latency_model() -> LatencyModel:
+    """Return the latency model of the application."""
+    return latency_model
+
+
+def save_latency_model():
+    """Write measurements not saved yet before the interpreter shuts down."""
+    latency_model.save_if_due(force=True)
+
+
+atexit.register(save_latency_model)
@@ -0,0 +1,298 @@
+"""Record counters and histograms of the hot paths and expose them for Prometheus."""
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from flask import Blueprint, Response, abort, g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+RATE_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+LOCAL_ADDRESSES = ("127.0.0.1", "::1")
+
+bp = Blueprint("metrics", __name__)
+# a single value or the values by their label values
+GaugeValue = Union[None, float, Dict[Tuple[str, ...], float]]
+
+
+class Metric(ABC):
+    """A named metric with labelled values, rendered in the Prometheus text format."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.lock = Lock()
+
+    def get_label_values(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        """Return the values of the labels in the order of the label names."""
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def format_labels(
+        self, label_values: Tuple[str, ...], extra: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Return the labels in the Prometheus text format."""
+        pairs = list(zip(self.label_names, label_values)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        escaped = [
+            (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for name, value in pairs
+        ]
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+    def render(self) -> List[str]:
+        """Return the lines of the metric in the Prometheus text format."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self.render_samples(),
+        ]
+
+    @abstractmethod
+    def render_samples(self) -> List[str]:
+        """Return the sample lines of the metric."""
+
+    @abstractmethod
+    def reset(self):
+        """Drop all recorded values."""
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Increase the counter with the given labels."""
+        label_values = self.get_label_values(labels)
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Return the current value of the counter with the given labels."""
+        with self.lock:
+            return self.values.get(self.get_label_values(labels), 0)
+
+    def render_samples(self) -> List[str]:
+        with self.lock:
+            return [
+                f"{self.name}{self.format_labels(label_values)} {value}"
+                for label_values, value in sorted(self.values.items())
+            ]
+
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+
+class Histogram(Metric):
+    """Observed values counted in buckets (e.g. durations)."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (count per bucket, sum, count)
+        self.values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        """Record an observed value with the given labels."""
+        label_values = self.get_label_values(labels)
+        with self.lock:
+            counts, total, count = self.values.get(
+                label_values, ([0] * len(self.buckets), 0.0, 0)
+            )
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                counts[index] += 1
+            self.values[label_values] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the seconds spent in the context."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def get_count(self, **labels) -> int:
+        """Return the number of observed values with the given labels."""
+        with self.lock:
+            return self.values.get(self.get_label_values(labels), ([], 0.0, 0))[2]
+
+    def render_samples(self) -> List[str]:
+        lines = []
+        with self.lock:
+            for label_values, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bucket, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = self.format_labels(label_values, {"le": str(bucket)})
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = self.format_labels(label_values, {"le": "+Inf"})
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = self.format_labels(label_values)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+
+class Gauge(Metric):
+    """
+    A value read by a function whenever the metrics are rendered (e.g. a cache size).
+    With label names, the function returns the values by their label values instead.
+    """
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.function: Optional[Callable[[], GaugeValue]] = None
+
+    def set_function(self, function: Callable[[], GaugeValue]):
+        """Set the function returning the current value (or None if there is none)."""
+        self.function = function
+
+    def render_samples(self) -> List[str]:
+        value = self.function() if self.function is not None else None
+        if value is None:
+            return []
+        if not isinstance(value, dict):
+            return [f"{self.name} {value}"]
+        return [
+            f"{self.name}{self.format_labels(label_values)} {sample}"
+            for label_values, sample in sorted(value.items())
+        ]
+
+    def reset(self):
+        # the value is read on demand, so nothing is recorded
+        pass
+
+
+chain_load_seconds = Histogram(
+    "ownai_chain_load_seconds", "Time to load an AI chain.", ["ai_id"]
+)
+process_spawn_seconds = Histogram(
+    "ownai_process_spawn_seconds",
+    "Time to start a chain process or to acquire a warm worker.",
+    ["ai_id"],
+)
+queue_wait_seconds = Histogram(
+    "ownai_queue_wait_seconds", "Time messages waited in the queue.", ["ai_id"]
+)
+retrieval_seconds = Histogram(
+    "ownai_retrieval_seconds", "Time to search a knowledge.", ["knowledge_id"]
+)
+time_to_first_token_seconds = Histogram(
+    "ownai_time_to_first_token_seconds",
+    "Time from starting a chain to its first token.",
+    ["ai_id"],
+)
+tokens_per_second = Histogram(
+    "ownai_tokens_per_second",
+    "Generation speed of responses.",
+    ["ai_id"],
+    RATE_BUCKETS,
+)
+response_seconds = Histogram(
+    "ownai_response_seconds",
+    "Time to answer a message (without waiting in the queue).",
+    ["ai_id", "knowledge_id"],
+)
+generated_tokens_total = Counter(
+    "ownai_generated_tokens_total", "Number of generated tokens.", ["ai_id"]
+)
+responses_total = Counter(
+    "ownai_responses_total",
+    "Number of answered messages by status.",
+    ["ai_id", "knowledge_id", "status"],
+)
+response_cache_lookups_total = Counter(
+    "ownai_response_cache_lookups_total",
+    "Number of response cache lookups by result.",
+    ["ai_id", "result"],
+)
+response_cache_entries = Gauge(
+    "ownai_response_cache_entries", "Number of responses in the response cache."
+)
+embedding_cache_lookups_total = Counter(
+    "ownai_embedding_cache_lookups_total",
+    "Number of texts looked up in the embedding cache by result.",
+    ["result"],
+)
+embedding_cache_entries = Gauge(
+    "ownai_embedding_cache_entries", "Number of embeddings in the embedding cache."
+)
+embeddings_load_seconds = Gauge(
+    "ownai_embeddings_load_seconds",
+    "Time it took to load an embeddings model.",
+    ["type", "model"],
+)
+embeddings_memory_bytes = Gauge(
+    "ownai_embeddings_memory_bytes",
+    "Estimated memory footprint of a loaded embeddings model.",
+    ["type", "model"],
+)
+knowledge_chunks_added_total = Counter(
+    "ownai_knowledge_chunks_added_total",
+    "Number of chunks embedded into a knowledge.",
+    ["knowledge_id"],
+)
+registry: List[Metric] = [
+    chain_load_seconds,
+    process_spawn_seconds,
+    queue_wait_seconds,
+    retrieval_seconds,
+    time_to_first_token_seconds,
+    tokens_per_second,
+    response_seconds,
+    generated_tokens_total,
+    responses_total,
+    response_cache_lookups_total,
+    response_cache_entries,
+    embedding_cache_lookups_total,
+    embedding_cache_entries,
+    embeddings_load_seconds,
+    embeddings_memory_bytes,
+    knowledge_chunks_added_total,
+]
+
+
+def render_metrics() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    return "\n".join(line for metric in registry for line in metric.render()) + "\n"
+
+
+def reset_metrics():
+    """Drop all recorded values."""
+    for metric in registry:
+        metric.reset()
+
+
+@bp.route("/metrics")
+def metrics():
+    """Expose the metrics to local scrapers and logged in users."""
+    if g.get("user") is None and request.remote_addr not in LOCAL_ADDRESSES:
+        abort(403)
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
@@ -1,4 +1,6 @@
 """SQLAlchemy models"""
+from datetime import datetime
+
 from .extensions import db
 
 
@@ -12,6 +14,9 @@ class User(db.Model):
     settings = db.relationship(
         "Setting", backref="user", lazy=True, cascade="all, delete-orphan"
     )
+    conversations = db.relationship(
+        "Conversation", backref="user", lazy=True, cascade="all, delete-orphan"
+    )
 
 
 class Ai(db.Model):
@@ -24,6 +29,7 @@ class Ai(db.Model):
     chain = db.Column(db.JSON, nullable=False)
     greeting = db.Column(db.String, nullable=True)
     is_public = db.Column(db.Boolean, nullable=False, default=False)
+    retrieval = db.Column(db.JSON, nullable=True)
 
     def as_dict(self):
         """Return the model as a dictionary"""
@@ -34,6 +40,7 @@ class Ai(db.Model):
             "input_labels": self.input_labels,
             "chain": self.chain,
             "greeting": self.greeting,
+            "retrieval": self.retrieval,
         }
 
 
@@ -46,6 +53,9 @@ class Knowledge(db.Model):
     chunk_size = db.Column(db.Integer, nullable=False)
     persist_directory = db.Column(db.String, nullable=False)
     is_public = db.Column(db.Boolean, nullable=False, default=False)
+    vector_store = db.Column(
+        db.String, nullable=False, default="chroma", server_default="chroma"
+    )
 
     def as_dict(self):
         """Return the model as a dictionary"""
@@ -54,10 +64,48 @@ class Knowledge(db.Model):
             "name": self.name,
             "embeddings": self.embeddings,
             "chunk_size": self.chunk_size,
+            "vector_store": self.vector_store,
             # persist_directory is internal
         }
 
 
+class Conversation(db.Model):
+    """Conversation model"""
+
+    id = db.Column(db.String, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("user.id", onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=True,
+    )
+    summary = db.Column(db.String, nullable=True)
+    summarized_messages = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    updated = db.Column(db.DateTime, nullable=False, default=datetime.now, index=True)
+
+    messages = db.relationship(
+        "ConversationMessage",
+        backref="conversation",
+        lazy=True,
+        cascade="all, delete-orphan",
+    )
+
+
+class ConversationMessage(db.Model):
+    """ConversationMessage model"""
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    conversation_id = db.Column(
+        db.String,
+        db.ForeignKey("conversation.id", onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    author = db.Column(db.String, nullable=False)
+    text = db.Column(db.String, nullable=False)
+
+
 class Setting(db.Model):
     """Setting model"""
 
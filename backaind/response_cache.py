@@ -0,0 +1,190 @@
+"""Cache the responses of AIs to answer repeated questions without running the chain."""
+from collections import OrderedDict
+import hashlib
+import json
+import math
+import re
+import time
+from threading import Lock
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .metrics import response_cache_entries
+
+DEFAULT_RESPONSE_CACHE_MAX_ENTRIES = 0
+DEFAULT_RESPONSE_CACHE_TTL = 3600
+DEFAULT_RESPONSE_CACHE_SIMILARITY_THRESHOLD = 0.0
+
+# (AI ID, chain config hash, knowledge ID, history hash, normalized input)
+ResponseKey = Tuple[int, str, Optional[int], str, str]
+
+
+class CachedResponse(NamedTuple):
+    """A cached response with the embedding of its input and its creation time."""
+
+    response: str
+    embedding: Optional[List[float]]
+    created: float
+
+
+# pylint: disable-next=too-many-instance-attributes
+class ResponseCache:
+    """
+    Thread-safe cache of AI responses, bounded by number of entries and time to live.
+    With a similarity threshold, responses to similar inputs (cosine similarity of the input
+    embeddings) of the same AI, chain config, knowledge and history are returned as well.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: float = DEFAULT_RESPONSE_CACHE_TTL,
+        similarity_threshold: float = DEFAULT_RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[ResponseKey, CachedResponse]" = OrderedDict()
+        self._lock = Lock()
+
+    def configure(
+        self, max_entries: int, ttl: float, similarity_threshold: float = 0.0
+    ):
+        """Change the limits of the cache and drop all cached responses."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self.similarity_threshold = similarity_threshold
+            self._entries.clear()
+
+    @property
+    def enabled(self) -> bool:
+        """Check if responses get cached at all."""
+        return self.max_entries > 0
+
+    def get(
+        self, key: ResponseKey, embedding: Optional[List[float]] = None
+    ) -> Optional[str]:
+        """Return the cached response for the key or the most similar input (or None)."""
+        with self._lock:
+            self._remove_expired()
+            entry = self._entries.get(key)
+            if entry is None and embedding is not None and self.similarity_threshold:
+                entry = self._find_similar(key, embedding)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.response
+
+    def put(
+        self, key: ResponseKey, response: str, embedding: Optional[List[float]] = None
+    ):
+        """Cache the response, dropping the least recently added ones if required."""
+        with self._lock:
+            self._entries[key] = CachedResponse(response, embedding, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def invalidate(
+        self, ai_id: Optional[int] = None, knowledge_id: Optional[int] = None
+    ):
+        """Drop the responses of the AI and/or the knowledge (or all if none is given)."""
+        with self._lock:
+            for key in list(self._entries):
+                if (ai_id is None or key[0] == ai_id) and (
+                    knowledge_id is None or key[2] == knowledge_id
+                ):
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remove_expired(self):
+        """Remove the responses older than the time to live (call with lock)."""
+        if self.ttl <= 0:
+            return
+        expired_before = self.clock() - self.ttl
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.created > expired_before:
+                return
+            del self._entries[key]
+
+    def _find_similar(
+        self, key: ResponseKey, embedding: List[float]
+    ) -> Optional[CachedResponse]:
+        """Return the response with the most similar input in the same scope (call with lock)."""
+        best_entry = None
+        best_similarity = self.similarity_threshold
+        for entry_key, entry in self._entries.items():
+            if entry_key[:4] != key[:4] or entry.embedding is None:
+                continue
+            similarity = cosine_similarity(embedding, entry.embedding)
+            if similarity >= best_similarity:
+                best_entry = entry
+                best_similarity = similarity
+        return best_entry
+
+
+def cosine_similarity(first: List[float], second: List[float]) -> float:
+    """Return the cosine similarity of two vectors."""
+    norm = math.sqrt(sum(x * x for x in first)) * math.sqrt(sum(y * y for y in second))
+    if not norm:
+        return 0.0
+    return sum(x * y for x, y in zip(first, second)) / norm
+
+
+def normalize_input(input_text: str) -> str:
+    """Normalize an input text, so trivially different spellings share a response."""
+    return " ".join(input_text.lower().split()).strip(" ?!.")
+
+
+def get_response_key(
+    ai_id: int,
+    chain_config: dict,
+    knowledge_id: Optional[int],
+    input_text: str,
+    history: str = "",
+) -> ResponseKey:
+    """Return the key of a response in the response cache."""
+    config_hash = hashlib.sha256(
+        json.dumps(chain_config, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    history_hash = hashlib.sha256(history.encode("utf-8")).hexdigest()
+    return (ai_id, config_hash, knowledge_id, history_hash, normalize_input(input_text))
+
+
+def split_into_tokens(text: str) -> Iterator[str]:
+    """Split a cached response into word tokens to stream it like a generated one."""
+    return iter(re.findall(r"\s*\S+\s*", text) or [text])
+
+
+response_cache = ResponseCache()
+response_cache_entries.set_function(lambda: len(response_cache))
+
+
+def invalidate_responses(
+    ai_id: Optional[int] = None, knowledge_id: Optional[int] = None
+):
+    """Drop the cached responses of the AI and/or the knowledge."""
+    response_cache.invalidate(ai_id, knowledge_id)
+
+
+def init_app(app):
+    """Configure the response cache with the application's settings."""
+    response_cache.configure(
+        app.config.get(
+            "RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_RESPONSE_CACHE_MAX_ENTRIES
+        ),
+        app.config.get("RESPONSE_CACHE_TTL", DEFAULT_RESPONSE_CACHE_TTL),
+        app.config.get(
+            "RESPONSE_CACHE_SIMILARITY_THRESHOLD",
+            DEFAULT_RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+        ),
+    )
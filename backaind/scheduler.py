@@ -0,0 +1,139 @@
+"""Queue incoming messages and admit them to the AIs in a fair order."""
+from contextlib import contextmanager
+from itertools import count
+from threading import Condition
+from typing import Callable, Dict, Hashable, Iterator, List, Optional
+
+DEFAULT_MAX_QUEUE_SIZE = 50
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_CONCURRENT_PER_AI = 2
+
+
+class QueueFullError(Exception):
+    """Too many messages are already waiting to be processed."""
+
+
+class Ticket:
+    """A message waiting for admission."""
+
+    def __init__(self, sequence: int, ai_id: int, user_key: Hashable):
+        self.sequence = sequence
+        self.ai_id = ai_id
+        self.user_key = user_key
+
+
+class Scheduler:
+    """
+    Bounded queue in front of the AIs with a global and a per-AI concurrency limit
+    (a limit of 0 means no limit).
+    Waiting messages are ordered round-robin across users, so a single user with many
+    messages can't starve the others.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_concurrent_per_ai: int = DEFAULT_MAX_CONCURRENT_PER_AI,
+    ):
+        self.max_queue_size = max_queue_size
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_ai = max_concurrent_per_ai
+        self.waiting: List[Ticket] = []
+        self.running: Dict[int, int] = {}
+        self.condition = Condition()
+        self.sequence = count()
+
+    def configure(
+        self, max_queue_size: int, max_concurrent: int, max_concurrent_per_ai: int
+    ):
+        """Change the limits of the scheduler."""
+        with self.condition:
+            self.max_queue_size = max_queue_size
+            self.max_concurrent = max_concurrent
+            self.max_concurrent_per_ai = max_concurrent_per_ai
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(
+        self,
+        ai_id: int,
+        user_key: Hashable,
+        on_position: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[None]:
+        """
+        Wait until the message may be processed and keep its slot while in the context.
+        on_position is called with the current queue position whenever it changes.
+        Raises QueueFullError if the queue is full.
+        """
+        with self.condition:
+            if self.max_queue_size and len(self.waiting) >= self.max_queue_size:
+                raise QueueFullError(
+                    "Too many messages are waiting to be answered. Please try again later."
+                )
+            ticket = Ticket(next(self.sequence), ai_id, user_key)
+            self.waiting.append(ticket)
+
+        try:
+            self._wait_for_admission(ticket, on_position)
+        except BaseException:
+            with self.condition:
+                if ticket in self.waiting:
+                    self.waiting.remove(ticket)
+                    self.condition.notify_all()
+            raise
+
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.running[ai_id] -= 1
+                if not self.running[ai_id]:
+                    del self.running[ai_id]
+                self.condition.notify_all()
+
+    def get_position(self, ticket: Ticket) -> int:
+        """Return the 1-based position of a waiting ticket (call with condition)."""
+        return self._ordered_waiting().index(ticket) + 1
+
+    def _wait_for_admission(
+        self, ticket: Ticket, on_position: Optional[Callable[[int], None]]
+    ):
+        """Block until the ticket is admitted, reporting queue position changes."""
+        reported_position = None
+        while True:
+            with self.condition:
+                if self._next_admissible() is ticket:
+                    self.waiting.remove(ticket)
+                    self.running[ticket.ai_id] = self.running.get(ticket.ai_id, 0) + 1
+                    self.condition.notify_all()
+                    return
+                position = self.get_position(ticket)
+                if position == reported_position or not on_position:
+                    self.condition.wait(1)
+                    continue
+            # report outside of the lock, as sending the position may block
+            reported_position = position
+            on_position(position)
+
+    def _ordered_waiting(self) -> List[Ticket]:
+        """Order waiting tickets round-robin across users (call with condition)."""
+        rounds: Dict[Hashable, int] = {}
+        ordered = []
+        for ticket in self.waiting:
+            user_round = rounds.get(ticket.user_key, 0)
+            rounds[ticket.user_key] = user_round + 1
+            ordered.append((user_round, ticket.sequence, ticket))
+        return [ticket for _round, _sequence, ticket in sorted(ordered)]
+
+    def _next_admissible(self) -> Optional[Ticket]:
+        """Return the first waiting ticket that fits the limits (call with condition)."""
+        if self.max_concurrent and sum(self.running.values()) >= self.max_concurrent:
+            return None
+        for ticket in self._ordered_waiting():
+            if (
+                not self.max_concurrent_per_ai
+                or self.running.get(ticket.ai_id, 0) < self.max_concurrent_per_ai
+            ):
+                return ticket
+        return None
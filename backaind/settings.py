@@ -1,4 +1,6 @@
 """Allow users to see and change their settings."""
+from typing import Dict, Optional, Sequence
+
 from flask import Blueprint, request, flash, render_template, g
 
 from .auth import (
@@ -6,11 +8,16 @@ from .auth import (
     is_password_correct,
     set_password,
 )
+from .cache import LruCache
 from .extensions import db
 from .models import Setting
 
 bp = Blueprint("settings", __name__, url_prefix="/settings")
 
+DEFAULT_SETTINGS_CACHE_MAX_ENTRIES = 1000
+# Settings by user ID, read for every message and dropped whenever they are saved.
+settings_cache = LruCache(DEFAULT_SETTINGS_CACHE_MAX_ENTRIES)
+
 EXTERNAL_PROVIDER_ENVVARS = [
     "AI21_API_KEY",
     "ALEPH_ALPHA_API_KEY",
@@ -70,26 +77,16 @@ def password():
 def external_providers():
     """Render the external providers page or save changed external providers settings."""
     if request.method == "POST":
-        for envvar in EXTERNAL_PROVIDER_ENVVARS:
-            setting = (
-                db.session.query(Setting)
-                .filter_by(user_id=g.user.id, domain="external-providers", name=envvar)
-                .first()
-            )
-            if envvar in request.form and request.form[envvar].strip():
-                if setting is None:
-                    setting = Setting(
-                        user_id=g.user.id,
-                        domain="external-providers",
-                        name=envvar,
-                        value=request.form[envvar].strip(),
-                    )
-                    db.session.add(setting)
-                else:
-                    setting.value = request.form[envvar].strip()
-            elif setting is not None:
-                db.session.delete(setting)
-        db.session.commit()
+        set_settings(
+            g.user.id,
+            "external-providers",
+            {
+                envvar: request.form[envvar].strip()
+                for envvar in EXTERNAL_PROVIDER_ENVVARS
+                if envvar in request.form and request.form[envvar].strip()
+            },
+            EXTERNAL_PROVIDER_ENVVARS,
+        )
         flash("Settings saved successfully.", "success")
 
     settings = get_settings(g.user.id)
@@ -100,9 +97,54 @@ def external_providers():
     )
 
 
-def get_settings(user_id: int):
-    """Return the settings for a specified user."""
-    settings = {}
-    for setting in db.session.query(Setting).filter_by(user_id=user_id):
-        settings.setdefault(setting.domain, {})[setting.name] = setting.value
-    return settings
+def get_settings(user_id: int) -> Dict[str, Dict[str, str]]:
+    """Return the settings for a specified user (from the settings cache if possible)."""
+
+    def load_settings():
+        settings: Dict[str, Dict[str, str]] = {}
+        for setting in db.session.query(Setting).filter_by(user_id=user_id):
+            settings.setdefault(setting.domain, {})[setting.name] = setting.value
+        return settings
+
+    settings = settings_cache.get_or_load(user_id, load_settings)
+    # the cached settings are shared, so every caller gets its own copy
+    return {domain: dict(values) for domain, values in settings.items()}
+
+
+def set_settings(
+    user_id: int,
+    domain: str,
+    values: Dict[str, str],
+    names: Optional[Sequence[str]] = None,
+):
+    """
+    Insert, update and delete the settings of a user's domain at once.
+    Settings of the names (or all settings of the domain if names is None) which are not in
+    the values get deleted.
+    """
+    existing_settings = {
+        setting.name: setting
+        for setting in db.session.query(Setting).filter_by(
+            user_id=user_id, domain=domain
+        )
+    }
+    for name, value in values.items():
+        if name in existing_settings:
+            existing_settings[name].value = value
+        else:
+            db.session.add(
+                Setting(user_id=user_id, domain=domain, name=name, value=value)
+            )
+    for name, setting in existing_settings.items():
+        if name not in values and (names is None or name in names):
+            db.session.delete(setting)
+    db.session.commit()
+    settings_cache.invalidate(user_id)
+
+
+def init_app(app):
+    """Configure the settings cache with the application's settings and empty it."""
+    settings_cache.configure(
+        app.config.get("SETTINGS_CACHE_MAX_ENTRIES", DEFAULT_SETTINGS_CACHE_MAX_ENTRIES)
+    )
+    settings_cache.invalidate()
@@ -1 +1 @@
-import{j as D,l as p,p as d,z as x,F as J,s as ae,v as f,x as G,J as R,A as ce,B as he,_ as $,r as T,P as Y,y as Le,Q as et,R as tt,S as st,D as nt,E as it,k as rt,w as ot,f as we,K as be,u as ve,H as ee,L as at,M as ct,N as ht,O as lt}from"./assets/_plugin-vue_export-helper-11cccb1d.js";const E=Object.create(null);E.open="0";E.close="1";E.ping="2";E.pong="3";E.message="4";E.upgrade="5";E.noop="6";const H=Object.create(null);Object.keys(E).forEach(s=>{H[E[s]]=s});const te={type:"error",data:"parser error"},Ie=typeof Blob=="function"||typeof Blob<"u"&&Object.prototype.toString.call(Blob)==="[object BlobConstructor]",Pe=typeof ArrayBuffer=="function",qe=s=>typeof ArrayBuffer.isView=="function"?ArrayBuffer.isView(s):s&&s.buffer instanceof ArrayBuffer,le=({type:s,data:e},t,n)=>Ie&&e instanceof Blob?t?n(e):ke(e,n):Pe&&(e instanceof ArrayBuffer||qe(e))?t?n(e):ke(new Blob([e]),n):n(E[s]+(e||"")),ke=(s,e)=>{const t=new FileReader;return t.onload=function(){const n=t.result.split(",")[1];e("b"+(n||""))},t.readAsDataURL(s)};function Ae(s){return s instanceof Uint8Array?s:s instanceof ArrayBuffer?new Uint8Array(s):new Uint8Array(s.buffer,s.byteOffset,s.byteLength)}let j;function ut(s,e){if(Ie&&s.data instanceof Blob)return s.data.arrayBuffer().then(Ae).then(e);if(Pe&&(s.data instanceof ArrayBuffer||qe(s.data)))return e(Ae(s.data));le(s,!1,t=>{j||(j=new TextEncoder),e(j.encode(t))})}const Ee="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",q=typeof Uint8Array>"u"?[]:new Uint8Array(256);for(let s=0;s<Ee.length;s++)q[Ee.charCodeAt(s)]=s;const ft=s=>{let e=s.length*.75,t=s.length,n,i=0,r,o,a,h;s[s.length-1]==="="&&(e--,s[s.length-2]==="="&&e--);const y=new ArrayBuffer(e),u=new Uint8Array(y);for(n=0;n<t;n+=4)r=q[s.charCodeAt(n)],o=q[s.charCodeAt(n+1)],a=q[s.charCodeAt(n+2)],h=q[s.charCodeAt(n+3)],u[i++]=r<<2|o>>4,u[i++]=(o&15)<<4|a>>2,u[i++]=(a&3)<<6|h&63;return y},dt=typeof ArrayBuffer=="function",ue=(s,e)=>{if(typeof s!="string")return{type:"message",data:De(s,e)};const t=s.charAt(0);return t==="b"?{type:"message",data:pt(s.substring(1),e)}:H[t]?s.length>1?{type:H[t],data:s.substring(1)}:{type:H[t]}:te},pt=(s,e)=>{if(dt){const t=ft(s);return De(t,e)}else return{base64:!0,data:s}},De=(s,e)=>{switch(e){case"blob":return s instanceof Blob?s:new Blob([s]);case"arraybuffer":default:return s instanceof ArrayBuffer?s:s.buffer}},$e=String.fromCharCode(30),gt=(s,e)=>{const t=s.length,n=new Array(t);let i=0;s.forEach((r,o)=>{le(r,!1,a=>{n[o]=a,++i===t&&e(n.join($e))})})},yt=(s,e)=>{const t=s.split($e),n=[];for(let i=0;i<t.length;i++){const r=ue(t[i],e);if(n.push(r),r.type==="error")break}return n};function mt(){return new TransformStream({transform(s,e){ut(s,t=>{const n=t.length;let i;if(n<126)i=new Uint8Array(1),new DataView(i.buffer).setUint8(0,n);else if(n<65536){i=new Uint8Array(3);const r=new DataView(i.buffer);r.setUint8(0,126),r.setUint16(1,n)}else{i=new Uint8Array(9);const r=new DataView(i.buffer);r.setUint8(0,127),r.setBigUint64(1,BigInt(n))}s.data&&typeof s.data!="string"&&(i[0]|=128),e.enqueue(i),e.enqueue(t)})}})}let Z;function U(s){return s.reduce((e,t)=>e+t.length,0)}function V(s,e){if(s[0].length===e)return s.shift();const t=new Uint8Array(e);let n=0;for(let i=0;i<e;i++)t[i]=s[0][n++],n===s[0].length&&(s.shift(),n=0);return s.length&&n<s[0].length&&(s[0]=s[0].slice(n)),t}function _t(s,e){Z||(Z=new TextDecoder);const t=[];let n=0,i=-1,r=!1;return new TransformStream({transform(o,a){for(t.push(o);;){if(n===0){if(U(t)<1)break;const h=V(t,1);r=(h[0]&128)===128,i=h[0]&127,i<126?n=3:i===126?n=1:n=2}else if(n===1){if(U(t)<2)break;const h=V(t,2);i=new DataView(h.buffer,h.byteOffset,h.length).getUint16(0),n=3}else if(n===2){if(U(t)<8)break;const h=V(t,8),y=new DataView(h.buffer,h.byteOffset,h.length),u=y.getUint32(0);if(u>Math.pow(2,53-32)-1){a.enqueue(te);break}i=u*Math.pow(2,32)+y.getUint32(4),n=3}else{if(U(t)<i)break;const h=V(t,i);a.enqueue(ue(r?h:Z.decode(h),e)),n=0}if(i===0||i>s){a.enqueue(te);break}}}})}const Me=4;function g(s){if(s)return wt(s)}function wt(s){for(var e in g.prototype)s[e]=g.prototype[e];return s}g.prototype.on=g.prototype.addEventListener=function(s,e){return this._callbacks=this._callbacks||{},(this._callbacks["$"+s]=this._callbacks["$"+s]||[]).push(e),this};g.prototype.once=function(s,e){function t(){this.off(s,t),e.apply(this,arguments)}return t.fn=e,this.on(s,t),this};g.prototype.off=g.prototype.removeListener=g.prototype.removeAllListeners=g.prototype.removeEventListener=function(s,e){if(this._callbacks=this._callbacks||{},arguments.length==0)return this._callbacks={},this;var t=this._callbacks["$"+s];if(!t)return this;if(arguments.length==1)return delete this._callbacks["$"+s],this;for(var n,i=0;i<t.length;i++)if(n=t[i],n===e||n.fn===e){t.splice(i,1);break}return t.length===0&&delete this._callbacks["$"+s],this};g.prototype.emit=function(s){this._callbacks=this._callbacks||{};for(var e=new Array(arguments.length-1),t=this._callbacks["$"+s],n=1;n<arguments.length;n++)e[n-1]=arguments[n];if(t){t=t.slice(0);for(var n=0,i=t.length;n<i;++n)t[n].apply(this,e)}return this};g.prototype.emitReserved=g.prototype.emit;g.prototype.listeners=function(s){return this._callbacks=this._callbacks||{},this._callbacks["$"+s]||[]};g.prototype.hasListeners=function(s){return!!this.listeners(s).length};const _=(()=>typeof self<"u"?self:typeof window<"u"?window:Function("return this")())();function Ue(s,...e){return e.reduce((t,n)=>(s.hasOwnProperty(n)&&(t[n]=s[n]),t),{})}const bt=_.setTimeout,vt=_.clearTimeout;function X(s,e){e.useNativeTimers?(s.setTimeoutFn=bt.bind(_),s.clearTimeoutFn=vt.bind(_)):(s.setTimeoutFn=_.setTimeout.bind(_),s.clearTimeoutFn=_.clearTimeout.bind(_))}const kt=1.33;function At(s){return typeof s=="string"?Et(s):Math.ceil((s.byteLength||s.size)*kt)}function Et(s){let e=0,t=0;for(let n=0,i=s.length;n<i;n++)e=s.charCodeAt(n),e<128?t+=1:e<2048?t+=2:e<55296||e>=57344?t+=3:(n++,t+=4);return t}function St(s){let e="";for(let t in s)s.hasOwnProperty(t)&&(e.length&&(e+="&"),e+=encodeURIComponent(t)+"="+encodeURIComponent(s[t]));return e}function Tt(s){let e={},t=s.split("&");for(let n=0,i=t.length;n<i;n++){let r=t[n].split("=");e[decodeURIComponent(r[0])]=decodeURIComponent(r[1])}return e}class xt extends Error{constructor(e,t,n){super(e),this.description=t,this.context=n,this.type="TransportError"}}class fe extends g{constructor(e){super(),this.writable=!1,X(this,e),this.opts=e,this.query=e.query,this.socket=e.socket}onError(e,t,n){return super.emitReserved("error",new xt(e,t,n)),this}open(){return this.readyState="opening",this.doOpen(),this}close(){return(this.readyState==="opening"||this.readyState==="open")&&(this.doClose(),this.onClose()),this}send(e){this.readyState==="open"&&this.write(e)}onOpen(){this.readyState="open",this.writable=!0,super.emitReserved("open")}onData(e){const t=ue(e,this.socket.binaryType);this.onPacket(t)}onPacket(e){super.emitReserved("packet",e)}onClose(e){this.readyState="closed",super.emitReserved("close",e)}pause(e){}createUri(e,t={}){return e+"://"+this._hostname()+this._port()+this.opts.path+this._query(t)}_hostname(){const e=this.opts.hostname;return e.indexOf(":")===-1?e:"["+e+"]"}_port(){return this.opts.port&&(this.opts.secure&&+(this.opts.port!==443)||!this.opts.secure&&Number(this.opts.port)!==80)?":"+this.opts.port:""}_query(e){const t=St(e);return t.length?"?"+t:""}}const Ve="0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_".split(""),se=64,Ct={};let Se=0,F=0,Te;function xe(s){let e="";do e=Ve[s%se]+e,s=Math.floor(s/se);while(s>0);return e}function Fe(){const s=xe(+new Date);return s!==Te?(Se=0,Te=s):s+"."+xe(Se++)}for(;F<se;F++)Ct[Ve[F]]=F;let Ke=!1;try{Ke=typeof XMLHttpRequest<"u"&&"withCredentials"in new XMLHttpRequest}catch{}const Rt=Ke;function He(s){const e=s.xdomain;try{if(typeof XMLHttpRequest<"u"&&(!e||Rt))return new XMLHttpRequest}catch{}if(!e)try{return new _[["Active"].concat("Object").join("X")]("Microsoft.XMLHTTP")}catch{}}function Ot(){}const Bt=function(){return new He({xdomain:!1}).responseType!=null}();class Nt extends fe{constructor(e){if(super(e),this.polling=!1,typeof location<"u"){const n=location.protocol==="https:";let i=location.port;i||(i=n?"443":"80"),this.xd=typeof location<"u"&&e.hostname!==location.hostname||i!==e.port}const t=e&&e.forceBase64;this.supportsBinary=Bt&&!t,this.opts.withCredentials&&(this.cookieJar=void 0)}get name(){return"polling"}doOpen(){this.poll()}pause(e){this.readyState="pausing";const t=()=>{this.readyState="paused",e()};if(this.polling||!this.writable){let n=0;this.polling&&(n++,this.once("pollComplete",function(){--n||t()})),this.writable||(n++,this.once("drain",function(){--n||t()}))}else t()}poll(){this.polling=!0,this.doPoll(),this.emitReserved("poll")}onData(e){const t=n=>{if(this.readyState==="opening"&&n.type==="open"&&this.onOpen(),n.type==="close")return this.onClose({description:"transport closed by the server"}),!1;this.onPacket(n)};yt(e,this.socket.binaryType).forEach(t),this.readyState!=="closed"&&(this.polling=!1,this.emitReserved("pollComplete"),this.readyState==="open"&&this.poll())}doClose(){const e=()=>{this.write([{type:"close"}])};this.readyState==="open"?e():this.once("open",e)}write(e){this.writable=!1,gt(e,t=>{this.doWrite(t,()=>{this.writable=!0,this.emitReserved("drain")})})}uri(){const e=this.opts.secure?"https":"http",t=this.query||{};return this.opts.timestampRequests!==!1&&(t[this.opts.timestampParam]=Fe()),!this.supportsBinary&&!t.sid&&(t.b64=1),this.createUri(e,t)}request(e={}){return Object.assign(e,{xd:this.xd,cookieJar:this.cookieJar},this.opts),new A(this.uri(),e)}doWrite(e,t){const n=this.request({method:"POST",data:e});n.on("success",t),n.on("error",(i,r)=>{this.onError("xhr post error",i,r)})}doPoll(){const e=this.request();e.on("data",this.onData.bind(this)),e.on("error",(t,n)=>{this.onError("xhr poll error",t,n)}),this.pollXhr=e}}class A extends g{constructor(e,t){super(),X(this,t),this.opts=t,this.method=t.method||"GET",this.uri=e,this.data=t.data!==void 0?t.data:null,this.create()}create(){var e;const t=Ue(this.opts,"agent","pfx","key","passphrase","cert","ca","ciphers","rejectUnauthorized","autoUnref");t.xdomain=!!this.opts.xd;const n=this.xhr=new He(t);try{n.open(this.method,this.uri,!0);try{if(this.opts.extraHeaders){n.setDisableHeaderCheck&&n.setDisableHeaderCheck(!0);for(let i in this.opts.extraHeaders)this.opts.extraHeaders.hasOwnProperty(i)&&n.setRequestHeader(i,this.opts.extraHeaders[i])}}catch{}if(this.method==="POST")try{n.setRequestHeader("Content-type","text/plain;charset=UTF-8")}catch{}try{n.setRequestHeader("Accept","*/*")}catch{}(e=this.opts.cookieJar)===null||e===void 0||e.addCookies(n),"withCredentials"in n&&(n.withCredentials=this.opts.withCredentials),this.opts.requestTimeout&&(n.timeout=this.opts.requestTimeout),n.onreadystatechange=()=>{var i;n.readyState===3&&((i=this.opts.cookieJar)===null||i===void 0||i.parseCookies(n)),n.readyState===4&&(n.status===200||n.status===1223?this.onLoad():this.setTimeoutFn(()=>{this.onError(typeof n.status=="number"?n.status:0)},0))},n.send(this.data)}catch(i){this.setTimeoutFn(()=>{this.onError(i)},0);return}typeof document<"u"&&(this.index=A.requestsCount++,A.requests[this.index]=this)}onError(e){this.emitReserved("error",e,this.xhr),this.cleanup(!0)}cleanup(e){if(!(typeof this.xhr>"u"||this.xhr===null)){if(this.xhr.onreadystatechange=Ot,e)try{this.xhr.abort()}catch{}typeof document<"u"&&delete A.requests[this.index],this.xhr=null}}onLoad(){const e=this.xhr.responseText;e!==null&&(this.emitReserved("data",e),this.emitReserved("success"),this.cleanup())}abort(){this.cleanup()}}A.requestsCount=0;A.requests={};if(typeof document<"u"){if(typeof attachEvent=="function")attachEvent("onunload",Ce);else if(typeof addEventListener=="function"){const s="onpagehide"in _?"pagehide":"unload";addEventListener(s,Ce,!1)}}function Ce(){for(let s in A.requests)A.requests.hasOwnProperty(s)&&A.requests[s].abort()}const de=(()=>typeof Promise=="function"&&typeof Promise.resolve=="function"?e=>Promise.resolve().then(e):(e,t)=>t(e,0))(),K=_.WebSocket||_.MozWebSocket,Re=!0,Lt="arraybuffer",Oe=typeof navigator<"u"&&typeof navigator.product=="string"&&navigator.product.toLowerCase()==="reactnative";class It extends fe{constructor(e){super(e),this.supportsBinary=!e.forceBase64}get name(){return"websocket"}doOpen(){if(!this.check())return;const e=this.uri(),t=this.opts.protocols,n=Oe?{}:Ue(this.opts,"agent","perMessageDeflate","pfx","key","passphrase","cert","ca","ciphers","rejectUnauthorized","localAddress","protocolVersion","origin","maxPayload","family","checkServerIdentity");this.opts.extraHeaders&&(n.headers=this.opts.extraHeaders);try{this.ws=Re&&!Oe?t?new K(e,t):new K(e):new K(e,t,n)}catch(i){return this.emitReserved("error",i)}this.ws.binaryType=this.socket.binaryType,this.addEventListeners()}addEventListeners(){this.ws.onopen=()=>{this.opts.autoUnref&&this.ws._socket.unref(),this.onOpen()},this.ws.onclose=e=>this.onClose({description:"websocket connection closed",context:e}),this.ws.onmessage=e=>this.onData(e.data),this.ws.onerror=e=>this.onError("websocket error",e)}write(e){this.writable=!1;for(let t=0;t<e.length;t++){const n=e[t],i=t===e.length-1;le(n,this.supportsBinary,r=>{const o={};try{Re&&this.ws.send(r)}catch{}i&&de(()=>{this.writable=!0,this.emitReserved("drain")},this.setTimeoutFn)})}}doClose(){typeof this.ws<"u"&&(this.ws.close(),this.ws=null)}uri(){const e=this.opts.secure?"wss":"ws",t=this.query||{};return this.opts.timestampRequests&&(t[this.opts.timestampParam]=Fe()),this.supportsBinary||(t.b64=1),this.createUri(e,t)}check(){return!!K}}class Pt extends fe{get name(){return"webtransport"}doOpen(){typeof WebTransport=="function"&&(this.transport=new WebTransport(this.createUri("https"),this.opts.transportOptions[this.name]),this.transport.closed.then(()=>{this.onClose()}).catch(e=>{this.onError("webtransport error",e)}),this.transport.ready.then(()=>{this.transport.createBidirectionalStream().then(e=>{const t=_t(Number.MAX_SAFE_INTEGER,this.socket.binaryType),n=e.readable.pipeThrough(t).getReader(),i=mt();i.readable.pipeTo(e.writable),this.writer=i.writable.getWriter();const r=()=>{n.read().then(({done:a,value:h})=>{a||(this.onPacket(h),r())}).catch(a=>{})};r();const o={type:"open"};this.query.sid&&(o.data=`{"sid":"${this.query.sid}"}`),this.writer.write(o).then(()=>this.onOpen())})}))}write(e){this.writable=!1;for(let t=0;t<e.length;t++){const n=e[t],i=t===e.length-1;this.writer.write(n).then(()=>{i&&de(()=>{this.writable=!0,this.emitReserved("drain")},this.setTimeoutFn)})}}doClose(){var e;(e=this.transport)===null||e===void 0||e.close()}}const qt={websocket:It,webtransport:Pt,polling:Nt},Dt=/^(?:(?![^:@\/?#]+:[^:@\/]*@)(http|https|ws|wss):\/\/)?((?:(([^:@\/?#]*)(?::([^:@\/?#]*))?)?@)?((?:[a-f0-9]{0,4}:){2,7}[a-f0-9]{0,4}|[^:\/?#]*)(?::(\d*))?)(((\/(?:[^?#](?![^?#\/]*\.[^?#\/.]+(?:[?#]|$)))*\/?)?([^?#\/]*))(?:\?([^#]*))?(?:#(.*))?)/,$t=["source","protocol","authority","userInfo","user","password","host","port","relative","path","directory","file","query","anchor"];function ne(s){const e=s,t=s.indexOf("["),n=s.indexOf("]");t!=-1&&n!=-1&&(s=s.substring(0,t)+s.substring(t,n).replace(/:/g,";")+s.substring(n,s.length));let i=Dt.exec(s||""),r={},o=14;for(;o--;)r[$t[o]]=i[o]||"";return t!=-1&&n!=-1&&(r.source=e,r.host=r.host.substring(1,r.host.length-1).replace(/;/g,":"),r.authority=r.authority.replace("[","").replace("]","").replace(/;/g,":"),r.ipv6uri=!0),r.pathNames=Mt(r,r.path),r.queryKey=Ut(r,r.query),r}function Mt(s,e){const t=/\/{2,9}/g,n=e.replace(t,"/").split("/");return(e.slice(0,1)=="/"||e.length===0)&&n.splice(0,1),e.slice(-1)=="/"&&n.splice(n.length-1,1),n}function Ut(s,e){const t={};return e.replace(/(?:^|&)([^&=]*)=?([^&]*)/g,function(n,i,r){i&&(t[i]=r)}),t}let We=class O extends g{constructor(e,t={}){super(),this.binaryType=Lt,this.writeBuffer=[],e&&typeof e=="object"&&(t=e,e=null),e?(e=ne(e),t.hostname=e.host,t.secure=e.protocol==="https"||e.protocol==="wss",t.port=e.port,e.query&&(t.query=e.query)):t.host&&(t.hostname=ne(t.host).host),X(this,t),this.secure=t.secure!=null?t.secure:typeof location<"u"&&location.protocol==="https:",t.hostname&&!t.port&&(t.port=this.secure?"443":"80"),this.hostname=t.hostname||(typeof location<"u"?location.hostname:"localhost"),this.port=t.port||(typeof location<"u"&&location.port?location.port:this.secure?"443":"80"),this.transports=t.transports||["polling","websocket","webtransport"],this.writeBuffer=[],this.prevBufferLen=0,this.opts=Object.assign({path:"/engine.io",agent:!1,withCredentials:!1,upgrade:!0,timestampParam:"t",rememberUpgrade:!1,addTrailingSlash:!0,rejectUnauthorized:!0,perMessageDeflate:{threshold:1024},transportOptions:{},closeOnBeforeunload:!1},t),this.opts.path=this.opts.path.replace(/\/$/,"")+(this.opts.addTrailingSlash?"/":""),typeof this.opts.query=="string"&&(this.opts.query=Tt(this.opts.query)),this.id=null,this.upgrades=null,this.pingInterval=null,this.pingTimeout=null,this.pingTimeoutTimer=null,typeof addEventListener=="function"&&(this.opts.closeOnBeforeunload&&(this.beforeunloadEventListener=()=>{this.transport&&(this.transport.removeAllListeners(),this.transport.close())},addEventListener("beforeunload",this.beforeunloadEventListener,!1)),this.hostname!=="localhost"&&(this.offlineEventListener=()=>{this.onClose("transport close",{description:"network connection lost"})},addEventListener("offline",this.offlineEventListener,!1))),this.open()}createTransport(e){const t=Object.assign({},this.opts.query);t.EIO=Me,t.transport=e,this.id&&(t.sid=this.id);const n=Object.assign({},this.opts,{query:t,socket:this,hostname:this.hostname,secure:this.secure,port:this.port},this.opts.transportOptions[e]);return new qt[e](n)}open(){let e;if(this.opts.rememberUpgrade&&O.priorWebsocketSuccess&&this.transports.indexOf("websocket")!==-1)e="websocket";else if(this.transports.length===0){this.setTimeoutFn(()=>{this.emitReserved("error","No transports available")},0);return}else e=this.transports[0];this.readyState="opening";try{e=this.createTransport(e)}catch{this.transports.shift(),this.open();return}e.open(),this.setTransport(e)}setTransport(e){this.transport&&this.transport.removeAllListeners(),this.transport=e,e.on("drain",this.onDrain.bind(this)).on("packet",this.onPacket.bind(this)).on("error",this.onError.bind(this)).on("close",t=>this.onClose("transport close",t))}probe(e){let t=this.createTransport(e),n=!1;O.priorWebsocketSuccess=!1;const i=()=>{n||(t.send([{type:"ping",data:"probe"}]),t.once("packet",w=>{if(!n)if(w.type==="pong"&&w.data==="probe"){if(this.upgrading=!0,this.emitReserved("upgrading",t),!t)return;O.priorWebsocketSuccess=t.name==="websocket",this.transport.pause(()=>{n||this.readyState!=="closed"&&(u(),this.setTransport(t),t.send([{type:"upgrade"}]),this.emitReserved("upgrade",t),t=null,this.upgrading=!1,this.flush())})}else{const b=new Error("probe error");b.transport=t.name,this.emitReserved("upgradeError",b)}}))};function r(){n||(n=!0,u(),t.close(),t=null)}const o=w=>{const b=new Error("probe error: "+w);b.transport=t.name,r(),this.emitReserved("upgradeError",b)};function a(){o("transport closed")}function h(){o("socket closed")}function y(w){t&&w.name!==t.name&&r()}const u=()=>{t.removeListener("open",i),t.removeListener("error",o),t.removeListener("close",a),this.off("close",h),this.off("upgrading",y)};t.once("open",i),t.once("error",o),t.once("close",a),this.once("close",h),this.once("upgrading",y),this.upgrades.indexOf("webtransport")!==-1&&e!=="webtransport"?this.setTimeoutFn(()=>{n||t.open()},200):t.open()}onOpen(){if(this.readyState="open",O.priorWebsocketSuccess=this.transport.name==="websocket",this.emitReserved("open"),this.flush(),this.readyState==="open"&&this.opts.upgrade){let e=0;const t=this.upgrades.length;for(;e<t;e++)this.probe(this.upgrades[e])}}onPacket(e){if(this.readyState==="opening"||this.readyState==="open"||this.readyState==="closing")switch(this.emitReserved("packet",e),this.emitReserved("heartbeat"),this.resetPingTimeout(),e.type){case"open":this.onHandshake(JSON.parse(e.data));break;case"ping":this.sendPacket("pong"),this.emitReserved("ping"),this.emitReserved("pong");break;case"error":const t=new Error("server error");t.code=e.data,this.onError(t);break;case"message":this.emitReserved("data",e.data),this.emitReserved("message",e.data);break}}onHandshake(e){this.emitReserved("handshake",e),this.id=e.sid,this.transport.query.sid=e.sid,this.upgrades=this.filterUpgrades(e.upgrades),this.pingInterval=e.pingInterval,this.pingTimeout=e.pingTimeout,this.maxPayload=e.maxPayload,this.onOpen(),this.readyState!=="closed"&&this.resetPingTimeout()}resetPingTimeout(){this.clearTimeoutFn(this.pingTimeoutTimer),this.pingTimeoutTimer=this.setTimeoutFn(()=>{this.onClose("ping timeout")},this.pingInterval+this.pingTimeout),this.opts.autoUnref&&this.pingTimeoutTimer.unref()}onDrain(){this.writeBuffer.splice(0,this.prevBufferLen),this.prevBufferLen=0,this.writeBuffer.length===0?this.emitReserved("drain"):this.flush()}flush(){if(this.readyState!=="closed"&&this.transport.writable&&!this.upgrading&&this.writeBuffer.length){const e=this.getWritablePackets();this.transport.send(e),this.prevBufferLen=e.length,this.emitReserved("flush")}}getWritablePackets(){if(!(this.maxPayload&&this.transport.name==="polling"&&this.writeBuffer.length>1))return this.writeBuffer;let t=1;for(let n=0;n<this.writeBuffer.length;n++){const i=this.writeBuffer[n].data;if(i&&(t+=At(i)),n>0&&t>this.maxPayload)return this.writeBuffer.slice(0,n);t+=2}return this.writeBuffer}write(e,t,n){return this.sendPacket("message",e,t,n),this}send(e,t,n){return this.sendPacket("message",e,t,n),this}sendPacket(e,t,n,i){if(typeof t=="function"&&(i=t,t=void 0),typeof n=="function"&&(i=n,n=null),this.readyState==="closing"||this.readyState==="closed")return;n=n||{},n.compress=n.compress!==!1;const r={type:e,data:t,options:n};this.emitReserved("packetCreate",r),this.writeBuffer.push(r),i&&this.once("flush",i),this.flush()}close(){const e=()=>{this.onClose("forced close"),this.transport.close()},t=()=>{this.off("upgrade",t),this.off("upgradeError",t),e()},n=()=>{this.once("upgrade",t),this.once("upgradeError",t)};return(this.readyState==="opening"||this.readyState==="open")&&(this.readyState="closing",this.writeBuffer.length?this.once("drain",()=>{this.upgrading?n():e()}):this.upgrading?n():e()),this}onError(e){O.priorWebsocketSuccess=!1,this.emitReserved("error",e),this.onClose("transport error",e)}onClose(e,t){(this.readyState==="opening"||this.readyState==="open"||this.readyState==="closing")&&(this.clearTimeoutFn(this.pingTimeoutTimer),this.transport.removeAllListeners("close"),this.transport.close(),this.transport.removeAllListeners(),typeof removeEventListener=="function"&&(removeEventListener("beforeunload",this.beforeunloadEventListener,!1),removeEventListener("offline",this.offlineEventListener,!1)),this.readyState="closed",this.id=null,this.emitReserved("close",e,t),this.writeBuffer=[],this.prevBufferLen=0)}filterUpgrades(e){const t=[];let n=0;const i=e.length;for(;n<i;n++)~this.transports.indexOf(e[n])&&t.push(e[n]);return t}};We.protocol=Me;function Vt(s,e="",t){let n=s;t=t||typeof location<"u"&&location,s==null&&(s=t.protocol+"//"+t.host),typeof s=="string"&&(s.charAt(0)==="/"&&(s.charAt(1)==="/"?s=t.protocol+s:s=t.host+s),/^(https?|wss?):\/\//.test(s)||(typeof t<"u"?s=t.protocol+"//"+s:s="https://"+s),n=ne(s)),n.port||(/^(http|ws)$/.test(n.protocol)?n.port="80":/^(http|ws)s$/.test(n.protocol)&&(n.port="443")),n.path=n.path||"/";const r=n.host.indexOf(":")!==-1?"["+n.host+"]":n.host;return n.id=n.protocol+"://"+r+":"+n.port+e,n.href=n.protocol+"://"+r+(t&&t.port===n.port?"":":"+n.port),n}const Ft=typeof ArrayBuffer=="function",Kt=s=>typeof ArrayBuffer.isView=="function"?ArrayBuffer.isView(s):s.buffer instanceof ArrayBuffer,ze=Object.prototype.toString,Ht=typeof Blob=="function"||typeof Blob<"u"&&ze.call(Blob)==="[object BlobConstructor]",Wt=typeof File=="function"||typeof File<"u"&&ze.call(File)==="[object FileConstructor]";function pe(s){return Ft&&(s instanceof ArrayBuffer||Kt(s))||Ht&&s instanceof Blob||Wt&&s instanceof File}function W(s,e){if(!s||typeof s!="object")return!1;if(Array.isArray(s)){for(let t=0,n=s.length;t<n;t++)if(W(s[t]))return!0;return!1}if(pe(s))return!0;if(s.toJSON&&typeof s.toJSON=="function"&&arguments.length===1)return W(s.toJSON(),!0);for(const t in s)if(Object.prototype.hasOwnProperty.call(s,t)&&W(s[t]))return!0;return!1}function zt(s){const e=[],t=s.data,n=s;return n.data=ie(t,e),n.attachments=e.length,{packet:n,buffers:e}}function ie(s,e){if(!s)return s;if(pe(s)){const t={_placeholder:!0,num:e.length};return e.push(s),t}else if(Array.isArray(s)){const t=new Array(s.length);for(let n=0;n<s.length;n++)t[n]=ie(s[n],e);return t}else if(typeof s=="object"&&!(s instanceof Date)){const t={};for(const n in s)Object.prototype.hasOwnProperty.call(s,n)&&(t[n]=ie(s[n],e));return t}return s}function Jt(s,e){return s.data=re(s.data,e),delete s.attachments,s}function re(s,e){if(!s)return s;if(s&&s._placeholder===!0){if(typeof s.num=="number"&&s.num>=0&&s.num<e.length)return e[s.num];throw new Error("illegal attachments")}else if(Array.isArray(s))for(let t=0;t<s.length;t++)s[t]=re(s[t],e);else if(typeof s=="object")for(const t in s)Object.prototype.hasOwnProperty.call(s,t)&&(s[t]=re(s[t],e));return s}const Yt=["connect","connect_error","disconnect","disconnecting","newListener","removeListener"],Xt=5;var l;(function(s){s[s.CONNECT=0]="CONNECT",s[s.DISCONNECT=1]="DISCONNECT",s[s.EVENT=2]="EVENT",s[s.ACK=3]="ACK",s[s.CONNECT_ERROR=4]="CONNECT_ERROR",s[s.BINARY_EVENT=5]="BINARY_EVENT",s[s.BINARY_ACK=6]="BINARY_ACK"})(l||(l={}));class Qt{constructor(e){this.replacer=e}encode(e){return(e.type===l.EVENT||e.type===l.ACK)&&W(e)?this.encodeAsBinary({type:e.type===l.EVENT?l.BINARY_EVENT:l.BINARY_ACK,nsp:e.nsp,data:e.data,id:e.id}):[this.encodeAsString(e)]}encodeAsString(e){let t=""+e.type;return(e.type===l.BINARY_EVENT||e.type===l.BINARY_ACK)&&(t+=e.attachments+"-"),e.nsp&&e.nsp!=="/"&&(t+=e.nsp+","),e.id!=null&&(t+=e.id),e.data!=null&&(t+=JSON.stringify(e.data,this.replacer)),t}encodeAsBinary(e){const t=zt(e),n=this.encodeAsString(t.packet),i=t.buffers;return i.unshift(n),i}}function Be(s){return Object.prototype.toString.call(s)==="[object Object]"}class ge extends g{constructor(e){super(),this.reviver=e}add(e){let t;if(typeof e=="string"){if(this.reconstructor)throw new Error("got plaintext data when reconstructing a packet");t=this.decodeString(e);const n=t.type===l.BINARY_EVENT;n||t.type===l.BINARY_ACK?(t.type=n?l.EVENT:l.ACK,this.reconstructor=new jt(t),t.attachments===0&&super.emitReserved("decoded",t)):super.emitReserved("decoded",t)}else if(pe(e)||e.base64)if(this.reconstructor)t=this.reconstructor.takeBinaryData(e),t&&(this.reconstructor=null,super.emitReserved("decoded",t));else throw new Error("got binary data when not reconstructing a packet");else throw new Error("Unknown type: "+e)}decodeString(e){let t=0;const n={type:Number(e.charAt(0))};if(l[n.type]===void 0)throw new Error("unknown packet type "+n.type);if(n.type===l.BINARY_EVENT||n.type===l.BINARY_ACK){const r=t+1;for(;e.charAt(++t)!=="-"&&t!=e.length;);const o=e.substring(r,t);if(o!=Number(o)||e.charAt(t)!=="-")throw new Error("Illegal attachments");n.attachments=Number(o)}if(e.charAt(t+1)==="/"){const r=t+1;for(;++t&&!(e.charAt(t)===","||t===e.length););n.nsp=e.substring(r,t)}else n.nsp="/";const i=e.charAt(t+1);if(i!==""&&Number(i)==i){const r=t+1;for(;++t;){const o=e.charAt(t);if(o==null||Number(o)!=o){--t;break}if(t===e.length)break}n.id=Number(e.substring(r,t+1))}if(e.charAt(++t)){const r=this.tryParse(e.substr(t));if(ge.isPayloadValid(n.type,r))n.data=r;else throw new Error("invalid payload")}return n}tryParse(e){try{return JSON.parse(e,this.reviver)}catch{return!1}}static isPayloadValid(e,t){switch(e){case l.CONNECT:return Be(t);case l.DISCONNECT:return t===void 0;case l.CONNECT_ERROR:return typeof t=="string"||Be(t);case l.EVENT:case l.BINARY_EVENT:return Array.isArray(t)&&(typeof t[0]=="number"||typeof t[0]=="string"&&Yt.indexOf(t[0])===-1);case l.ACK:case l.BINARY_ACK:return Array.isArray(t)}}destroy(){this.reconstructor&&(this.reconstructor.finishedReconstruction(),this.reconstructor=null)}}class jt{constructor(e){this.packet=e,this.buffers=[],this.reconPack=e}takeBinaryData(e){if(this.buffers.push(e),this.buffers.length===this.reconPack.attachments){const t=Jt(this.reconPack,this.buffers);return this.finishedReconstruction(),t}return null}finishedReconstruction(){this.reconPack=null,this.buffers=[]}}const Zt=Object.freeze(Object.defineProperty({__proto__:null,Decoder:ge,Encoder:Qt,get PacketType(){return l},protocol:Xt},Symbol.toStringTag,{value:"Module"}));function v(s,e,t){return s.on(e,t),function(){s.off(e,t)}}const Gt=Object.freeze({connect:1,connect_error:1,disconnect:1,disconnecting:1,newListener:1,removeListener:1});class Je extends g{constructor(e,t,n){super(),this.connected=!1,this.recovered=!1,this.receiveBuffer=[],this.sendBuffer=[],this._queue=[],this._queueSeq=0,this.ids=0,this.acks={},this.flags={},this.io=e,this.nsp=t,n&&n.auth&&(this.auth=n.auth),this._opts=Object.assign({},n),this.io._autoConnect&&this.open()}get disconnected(){return!this.connected}subEvents(){if(this.subs)return;const e=this.io;this.subs=[v(e,"open",this.onopen.bind(this)),v(e,"packet",this.onpacket.bind(this)),v(e,"error",this.onerror.bind(this)),v(e,"close",this.onclose.bind(this))]}get active(){return!!this.subs}connect(){return this.connected?this:(this.subEvents(),this.io._reconnecting||this.io.open(),this.io._readyState==="open"&&this.onopen(),this)}open(){return this.connect()}send(...e){return e.unshift("message"),this.emit.apply(this,e),this}emit(e,...t){if(Gt.hasOwnProperty(e))throw new Error('"'+e.toString()+'" is a reserved event name');if(t.unshift(e),this._opts.retries&&!this.flags.fromQueue&&!this.flags.volatile)return this._addToQueue(t),this;const n={type:l.EVENT,data:t};if(n.options={},n.options.compress=this.flags.compress!==!1,typeof t[t.length-1]=="function"){const o=this.ids++,a=t.pop();this._registerAckCallback(o,a),n.id=o}const i=this.io.engine&&this.io.engine.transport&&this.io.engine.transport.writable;return this.flags.volatile&&(!i||!this.connected)||(this.connected?(this.notifyOutgoingListeners(n),this.packet(n)):this.sendBuffer.push(n)),this.flags={},this}_registerAckCallback(e,t){var n;const i=(n=this.flags.timeout)!==null&&n!==void 0?n:this._opts.ackTimeout;if(i===void 0){this.acks[e]=t;return}const r=this.io.setTimeoutFn(()=>{delete this.acks[e];for(let o=0;o<this.sendBuffer.length;o++)this.sendBuffer[o].id===e&&this.sendBuffer.splice(o,1);t.call(this,new Error("operation has timed out"))},i);this.acks[e]=(...o)=>{this.io.clearTimeoutFn(r),t.apply(this,[null,...o])}}emitWithAck(e,...t){const n=this.flags.timeout!==void 0||this._opts.ackTimeout!==void 0;return new Promise((i,r)=>{t.push((o,a)=>n?o?r(o):i(a):i(o)),this.emit(e,...t)})}_addToQueue(e){let t;typeof e[e.length-1]=="function"&&(t=e.pop());const n={id:this._queueSeq++,tryCount:0,pending:!1,args:e,flags:Object.assign({fromQueue:!0},this.flags)};e.push((i,...r)=>n!==this._queue[0]?void 0:(i!==null?n.tryCount>this._opts.retries&&(this._queue.shift(),t&&t(i)):(this._queue.shift(),t&&t(null,...r)),n.pending=!1,this._drainQueue())),this._queue.push(n),this._drainQueue()}_drainQueue(e=!1){if(!this.connected||this._queue.length===0)return;const t=this._queue[0];t.pending&&!e||(t.pending=!0,t.tryCount++,this.flags=t.flags,this.emit.apply(this,t.args))}packet(e){e.nsp=this.nsp,this.io._packet(e)}onopen(){typeof this.auth=="function"?this.auth(e=>{this._sendConnectPacket(e)}):this._sendConnectPacket(this.auth)}_sendConnectPacket(e){this.packet({type:l.CONNECT,data:this._pid?Object.assign({pid:this._pid,offset:this._lastOffset},e):e})}onerror(e){this.connected||this.emitReserved("connect_error",e)}onclose(e,t){this.connected=!1,delete this.id,this.emitReserved("disconnect",e,t)}onpacket(e){if(e.nsp===this.nsp)switch(e.type){case l.CONNECT:e.data&&e.data.sid?this.onconnect(e.data.sid,e.data.pid):this.emitReserved("connect_error",new Error("It seems you are trying to reach a Socket.IO server in v2.x with a v3.x client, but they are not compatible (more information here: https://socket.io/docs/v3/migrating-from-2-x-to-3-0/)"));break;case l.EVENT:case l.BINARY_EVENT:this.onevent(e);break;case l.ACK:case l.BINARY_ACK:this.onack(e);break;case l.DISCONNECT:this.ondisconnect();break;case l.CONNECT_ERROR:this.destroy();const n=new Error(e.data.message);n.data=e.data.data,this.emitReserved("connect_error",n);break}}onevent(e){const t=e.data||[];e.id!=null&&t.push(this.ack(e.id)),this.connected?this.emitEvent(t):this.receiveBuffer.push(Object.freeze(t))}emitEvent(e){if(this._anyListeners&&this._anyListeners.length){const t=this._anyListeners.slice();for(const n of t)n.apply(this,e)}super.emit.apply(this,e),this._pid&&e.length&&typeof e[e.length-1]=="string"&&(this._lastOffset=e[e.length-1])}ack(e){const t=this;let n=!1;return function(...i){n||(n=!0,t.packet({type:l.ACK,id:e,data:i}))}}onack(e){const t=this.acks[e.id];typeof t=="function"&&(t.apply(this,e.data),delete this.acks[e.id])}onconnect(e,t){this.id=e,this.recovered=t&&this._pid===t,this._pid=t,this.connected=!0,this.emitBuffered(),this.emitReserved("connect"),this._drainQueue(!0)}emitBuffered(){this.receiveBuffer.forEach(e=>this.emitEvent(e)),this.receiveBuffer=[],this.sendBuffer.forEach(e=>{this.notifyOutgoingListeners(e),this.packet(e)}),this.sendBuffer=[]}ondisconnect(){this.destroy(),this.onclose("io server disconnect")}destroy(){this.subs&&(this.subs.forEach(e=>e()),this.subs=void 0),this.io._destroy(this)}disconnect(){return this.connected&&this.packet({type:l.DISCONNECT}),this.destroy(),this.connected&&this.onclose("io client disconnect"),this}close(){return this.disconnect()}compress(e){return this.flags.compress=e,this}get volatile(){return this.flags.volatile=!0,this}timeout(e){return this.flags.timeout=e,this}onAny(e){return this._anyListeners=this._anyListeners||[],this._anyListeners.push(e),this}prependAny(e){return this._anyListeners=this._anyListeners||[],this._anyListeners.unshift(e),this}offAny(e){if(!this._anyListeners)return this;if(e){const t=this._anyListeners;for(let n=0;n<t.length;n++)if(e===t[n])return t.splice(n,1),this}else this._anyListeners=[];return this}listenersAny(){return this._anyListeners||[]}onAnyOutgoing(e){return this._anyOutgoingListeners=this._anyOutgoingListeners||[],this._anyOutgoingListeners.push(e),this}prependAnyOutgoing(e){return this._anyOutgoingListeners=this._anyOutgoingListeners||[],this._anyOutgoingListeners.unshift(e),this}offAnyOutgoing(e){if(!this._anyOutgoingListeners)return this;if(e){const t=this._anyOutgoingListeners;for(let n=0;n<t.length;n++)if(e===t[n])return t.splice(n,1),this}else this._anyOutgoingListeners=[];return this}listenersAnyOutgoing(){return this._anyOutgoingListeners||[]}notifyOutgoingListeners(e){if(this._anyOutgoingListeners&&this._anyOutgoingListeners.length){const t=this._anyOutgoingListeners.slice();for(const n of t)n.apply(this,e.data)}}}function B(s){s=s||{},this.ms=s.min||100,this.max=s.max||1e4,this.factor=s.factor||2,this.jitter=s.jitter>0&&s.jitter<=1?s.jitter:0,this.attempts=0}B.prototype.duration=function(){var s=this.ms*Math.pow(this.factor,this.attempts++);if(this.jitter){var e=Math.random(),t=Math.floor(e*this.jitter*s);s=Math.floor(e*10)&1?s+t:s-t}return Math.min(s,this.max)|0};B.prototype.reset=function(){this.attempts=0};B.prototype.setMin=function(s){this.ms=s};B.prototype.setMax=function(s){this.max=s};B.prototype.setJitter=function(s){this.jitter=s};class oe extends g{constructor(e,t){var n;super(),this.nsps={},this.subs=[],e&&typeof e=="object"&&(t=e,e=void 0),t=t||{},t.path=t.path||"/socket.io",this.opts=t,X(this,t),this.reconnection(t.reconnection!==!1),this.reconnectionAttempts(t.reconnectionAttempts||1/0),this.reconnectionDelay(t.reconnectionDelay||1e3),this.reconnectionDelayMax(t.reconnectionDelayMax||5e3),this.randomizationFactor((n=t.randomizationFactor)!==null&&n!==void 0?n:.5),this.backoff=new B({min:this.reconnectionDelay(),max:this.reconnectionDelayMax(),jitter:this.randomizationFactor()}),this.timeout(t.timeout==null?2e4:t.timeout),this._readyState="closed",this.uri=e;const i=t.parser||Zt;this.encoder=new i.Encoder,this.decoder=new i.Decoder,this._autoConnect=t.autoConnect!==!1,this._autoConnect&&this.open()}reconnection(e){return arguments.length?(this._reconnection=!!e,this):this._reconnection}reconnectionAttempts(e){return e===void 0?this._reconnectionAttempts:(this._reconnectionAttempts=e,this)}reconnectionDelay(e){var t;return e===void 0?this._reconnectionDelay:(this._reconnectionDelay=e,(t=this.backoff)===null||t===void 0||t.setMin(e),this)}randomizationFactor(e){var t;return e===void 0?this._randomizationFactor:(this._randomizationFactor=e,(t=this.backoff)===null||t===void 0||t.setJitter(e),this)}reconnectionDelayMax(e){var t;return e===void 0?this._reconnectionDelayMax:(this._reconnectionDelayMax=e,(t=this.backoff)===null||t===void 0||t.setMax(e),this)}timeout(e){return arguments.length?(this._timeout=e,this):this._timeout}maybeReconnectOnOpen(){!this._reconnecting&&this._reconnection&&this.backoff.attempts===0&&this.reconnect()}open(e){if(~this._readyState.indexOf("open"))return this;this.engine=new We(this.uri,this.opts);const t=this.engine,n=this;this._readyState="opening",this.skipReconnect=!1;const i=v(t,"open",function(){n.onopen(),e&&e()}),r=a=>{this.cleanup(),this._readyState="closed",this.emitReserved("error",a),e?e(a):this.maybeReconnectOnOpen()},o=v(t,"error",r);if(this._timeout!==!1){const a=this._timeout,h=this.setTimeoutFn(()=>{i(),r(new Error("timeout")),t.close()},a);this.opts.autoUnref&&h.unref(),this.subs.push(()=>{this.clearTimeoutFn(h)})}return this.subs.push(i),this.subs.push(o),this}connect(e){return this.open(e)}onopen(){this.cleanup(),this._readyState="open",this.emitReserved("open");const e=this.engine;this.subs.push(v(e,"ping",this.onping.bind(this)),v(e,"data",this.ondata.bind(this)),v(e,"error",this.onerror.bind(this)),v(e,"close",this.onclose.bind(this)),v(this.decoder,"decoded",this.ondecoded.bind(this)))}onping(){this.emitReserved("ping")}ondata(e){try{this.decoder.add(e)}catch(t){this.onclose("parse error",t)}}ondecoded(e){de(()=>{this.emitReserved("packet",e)},this.setTimeoutFn)}onerror(e){this.emitReserved("error",e)}socket(e,t){let n=this.nsps[e];return n?this._autoConnect&&!n.active&&n.connect():(n=new Je(this,e,t),this.nsps[e]=n),n}_destroy(e){const t=Object.keys(this.nsps);for(const n of t)if(this.nsps[n].active)return;this._close()}_packet(e){const t=this.encoder.encode(e);for(let n=0;n<t.length;n++)this.engine.write(t[n],e.options)}cleanup(){this.subs.forEach(e=>e()),this.subs.length=0,this.decoder.destroy()}_close(){this.skipReconnect=!0,this._reconnecting=!1,this.onclose("forced close"),this.engine&&this.engine.close()}disconnect(){return this._close()}onclose(e,t){this.cleanup(),this.backoff.reset(),this._readyState="closed",this.emitReserved("close",e,t),this._reconnection&&!this.skipReconnect&&this.reconnect()}reconnect(){if(this._reconnecting||this.skipReconnect)return this;const e=this;if(this.backoff.attempts>=this._reconnectionAttempts)this.backoff.reset(),this.emitReserved("reconnect_failed"),this._reconnecting=!1;else{const t=this.backoff.duration();this._reconnecting=!0;const n=this.setTimeoutFn(()=>{e.skipReconnect||(this.emitReserved("reconnect_attempt",e.backoff.attempts),!e.skipReconnect&&e.open(i=>{i?(e._reconnecting=!1,e.reconnect(),this.emitReserved("reconnect_error",i)):e.onreconnect()}))},t);this.opts.autoUnref&&n.unref(),this.subs.push(()=>{this.clearTimeoutFn(n)})}}onreconnect(){const e=this.backoff.attempts;this._reconnecting=!1,this.backoff.reset(),this.emitReserved("reconnect",e)}}const P={};function z(s,e){typeof s=="object"&&(e=s,s=void 0),e=e||{};const t=Vt(s,e.path||"/socket.io"),n=t.source,i=t.id,r=t.path,o=P[i]&&r in P[i].nsps,a=e.forceNew||e["force new connection"]||e.multiplex===!1||o;let h;return a?h=new oe(n,e):(P[i]||(P[i]=new oe(n,e)),h=P[i]),t.query&&!e.query&&(e.query=t.queryKey),h.socket(t.path,e)}Object.assign(z,{Manager:oe,Socket:Je,io:z,connect:z});const Ye=s=>(ce("data-v-ac9ee67d"),s=s(),he(),s),es={class:"d-flex align-items-center justify-content-center gap-2 mb-4"},ts=Ye(()=>d("span",{class:"badge rounded-pill text-bg-primary"},"AI",-1)),ss={key:0,class:"flex-grow-1"},ns=Ye(()=>d("strong",null,[R("No AI found. Please "),d("a",{href:"/workshop/ai"},"set up an AI"),R(" first.")],-1)),is=[ns],rs={key:1,class:"flex-grow-1"},os={key:2,class:"dropdown flex-grow-1"},as={class:"btn btn-light border dropdown-toggle d-block w-100 text-start",type:"button","data-bs-toggle":"dropdown","aria-expanded":"false"},cs={class:"dropdown-menu w-100 m-0"},hs=["onClick"],ls=["title"],us=D({__name:"AiSelection",props:{ais:{},disabled:{type:Boolean},selectedAi:{}},emits:["select-ai"],setup(s,{emit:e}){const{ais:t,disabled:n,selectedAi:i}=s,r=e,o=u=>{r("select-ai",u)},a=u=>u.input_keys.includes("input_knowledge"),h=u=>a(u)?"bg-warning":"bg-secondary",y=u=>a(u)?"Understands text input and can access additional knowledge.":"Understands text input.";return t.length&&o(t[0]),(u,w)=>{var b;return f(),p("div",es,[ts,u.ais.length?u.disabled?(f(),p("div",rs,[d("strong",null,x((b=u.selectedAi)==null?void 0:b.name),1)])):(f(),p("div",os,[d("button",as,x(u.selectedAi?u.selectedAi.name:"Select AI"),1),d("ul",cs,[(f(!0),p(J,null,ae(u.ais,C=>(f(),p("li",{key:C.id},[d("a",{class:"dropdown-item d-flex align-items-center gap-2 py-2",onClick:N=>o(C)},[d("span",{class:G(["d-inline-block rounded-circle p-1",h(C)]),title:y(C)},null,10,ls),R(" "+x(C.name),1)],8,hs)]))),128))])])):(f(),p("div",ss,is))])}}});const fs=$(us,[["__scopeId","data-v-ac9ee67d"]]),Xe=s=>(ce("data-v-d86c61ce"),s=s(),he(),s),ds={class:"d-flex align-items-center justify-content-center gap-2 mb-4 mt-n3"},ps=Xe(()=>d("span",{class:"badge rounded-pill text-bg-warning"},"Knowledge",-1)),gs={key:0,class:"flex-grow-1"},ys=Xe(()=>d("strong",null,[R("This AI accesses knowledge. Please "),d("a",{href:"/workshop/knowledge"},"set up knowledge"),R(" first.")],-1)),ms=[ys],_s={key:1,class:"flex-grow-1"},ws={key:2,class:"dropdown flex-grow-1"},bs={class:"btn btn-light border dropdown-toggle d-block w-100 text-start",type:"button","data-bs-toggle":"dropdown","aria-expanded":"false"},vs={class:"dropdown-menu w-100 m-0"},ks=["onClick"],As=D({__name:"KnowledgeSelection",props:{knowledges:{},disabled:{type:Boolean}},emits:["select-knowledge"],setup(s,{emit:e}){const{knowledges:t,disabled:n}=s,i=e,r=T(null),o=a=>{i("select-knowledge",a),r.value=a};return t.length&&o(t[0]),(a,h)=>{var y;return f(),p("div",ds,[ps,a.knowledges.length?a.disabled?(f(),p("div",_s,[d("strong",null,x((y=r.value)==null?void 0:y.name),1)])):(f(),p("div",ws,[d("button",bs,x(r.value?r.value.name:"Select Knowledge"),1),d("ul",vs,[(f(!0),p(J,null,ae(a.knowledges,u=>(f(),p("li",{key:u.id},[d("a",{class:"dropdown-item d-flex align-items-center gap-2 py-2",onClick:w=>o(u)},x(u.name),9,ks)]))),128))])])):(f(),p("div",gs,ms))])}}});const Es=$(As,[["__scopeId","data-v-d86c61ce"]]),Ss=s=>(ce("data-v-eb9e7f61"),s=s(),he(),s),Ts={key:0,class:"card mb-2 bg-light"},xs={class:"card-body"},Cs={key:0,class:"card-body"},Rs=["aria-valuenow"],Os=Ss(()=>d("span",{class:"d-none badge text-bg-danger error-badge me-2"},"Error 😩",-1)),Bs={key:1,class:"text-muted"},Ns=D({__name:"MessageHistory",props:{greeting:{},messages:{},progresses:{}},emits:["clear-messages"],setup(s,{emit:e}){const t=e;return(n,i)=>(f(),p(J,null,[n.greeting?(f(),p("div",Ts,[d("div",xs,x(n.greeting),1)])):Y("",!0),(f(!0),p(J,null,ae(n.messages,r=>(f(),p("div",{class:G(["card mb-2",r.author.species==="ai"&&"bg-light"]),key:r.id},[r.status==="writing"&&!r.text?(f(),p("div",Cs,[d("div",{class:"progress",role:"progressbar","aria-label":"Progress","aria-valuenow":n.progresses[r.id],"aria-valuemin":"0","aria-valuemax":"100"},[d("div",{class:"progress-bar",style:et(`width: ${n.progresses[r.id]}%`)},null,4)],8,Rs)])):(f(),p("div",{key:1,class:G(["card-body",r.status])},[Os,R(x(r.text),1)],2))],2))),128)),n.messages.length?(f(),p("small",Bs,[R(" AI responses may contain inaccurate or inappropriate information. Please check the content carefully before using it. "),d("a",{href:"#",onClick:i[0]||(i[0]=Le(r=>t("clear-messages"),["prevent"]))},"Clear all messages.")])):Y("",!0)],64))}});const Ls=$(Ns,[["__scopeId","data-v-eb9e7f61"]]),Is=["onSubmit"],Ps=["placeholder"],qs=d("button",{type:"submit",class:"btn btn-primary",title:"Send"},[d("svg",{xmlns:"http://www.w3.org/2000/svg",width:"16",height:"16",fill:"currentColor",class:"bi bi-send",viewBox:"0 0 16 16"},[d("path",{d:"M15.854.146a.5.5 0 0 1 .11.54l-5.819 14.547a.75.75 0 0 1-1.329.124l-3.178-4.995L.643 7.184a.75.75 0 0 1 .124-1.33L15.314.037a.5.5 0 0 1 .54.11ZM6.636 10.07l2.761 4.338L14.13 2.576 6.636 10.07Zm6.787-8.201L1.591 6.602l4.339 2.76 7.494-7.493Z"})])],-1),Ds=D({__name:"MessageInput",props:{label:{}},emits:["send-message"],setup(s,{emit:e}){const t=T(""),n=e,i=()=>{n("send-message",t.value),t.value=""},r=o=>{(o.shiftKey||o.ctrlKey||o.metaKey)&&o.code==="Enter"&&i()};return(o,a)=>(f(),p("form",{onSubmit:Le(i,["prevent"]),class:"d-flex my-4 align-items-sm-start flex-column flex-sm-row gap-2"},[tt(d("textarea",{class:"form-control","onUpdate:modelValue":a[0]||(a[0]=h=>t.value=h),placeholder:o.label,required:"",onKeydown:r},null,40,Ps),[[st,t.value]]),qs],40,Is))}});function Ne(s){return s.normalize("NFKD").toLowerCase().trim().replace(/\s+/g,"-").replace(/[^\w\-]+/g,"").replace(/\_/g,"-").replace(/\-\-+/g,"-").replace(/\-$/g,"")}const $s={class:"ainteraction-container"},Ms=D({__name:"Ainteraction",props:{ais:{},knowledges:{}},setup(s){const{ais:e,knowledges:t}=s,n=JSON.parse(e),i=JSON.parse(t),r=T(null),o=T(null),a=nt(),h=it(),y=c=>{r.value=c,h.push({params:{ai:Ne(c.name)}})},u=c=>{o.value=c},w=c=>{if(!c)return;Array.isArray(c)&&(c=c[0]);let m;const S=parseInt(c);Number.isInteger(S)?m=n.find(I=>I.id===S):m=n.find(I=>Ne(I.name)===c),m&&(y(m),ye())};rt(async()=>{w(a.params.ai)}),ot(()=>a.params.ai,w);const b=we(()=>{var c;return!!((c=r.value)!=null&&c.input_keys.includes("input_knowledge"))}),C=we(()=>{var c,m;return((m=(c=r.value)==null?void 0:c.input_labels)==null?void 0:m.input_text)||"Send a message"}),N=T(!1),k=T([]),Q=T(0),L=T([]),M=z();M.on("progress",c=>{L.value.length<=c.messageId||(L.value[c.messageId]=c.progress)}),M.on("token",c=>{if(k.value.length<=c.messageId)return;const m=k.value[c.messageId];k.value[c.messageId]={...m,text:m.text+c.text}}),M.on("message",c=>{k.value.length<=c.id||(c.text||(c.text=k.value[c.id].text),k.value[c.id]=c)});const Ze=c=>{var me,_e;N.value=!0;const m={id:Q.value++,author:{species:"human"},date:new Date,text:c,status:"done"},S={id:Q.value++,author:{species:"ai"},date:new Date,text:"",status:"writing"},I=k.value.filter(Ge=>Ge.status==="done");k.value.push(m,S),L.value.push(100,0),M.emit("message",{message:m,responseId:S.id,aiId:(me=r.value)==null?void 0:me.id,knowledgeId:(_e=o.value)==null?void 0:_e.id,history:I})},ye=()=>{k.value=[],L.value=[],Q.value=0,N.value=!1};return(c,m)=>{var S;return f(),p("div",$s,[be(fs,{ais:ve(n),disabled:N.value,"selected-ai":r.value,onSelectAi:y},null,8,["ais","disabled","selected-ai"]),b.value?(f(),ee(Es,{key:0,knowledges:ve(i),disabled:N.value,onSelectKnowledge:u},null,8,["knowledges","disabled"])):Y("",!0),be(Ls,{greeting:(S=r.value)==null?void 0:S.greeting,messages:k.value,progresses:L.value,onClearMessages:ye},null,8,["greeting","messages","progresses"]),r.value&&(!b.value||o.value)?(f(),ee(Ds,{key:1,label:C.value,onSendMessage:Ze},null,8,["label"])):Y("",!0)])}}});const Us=$(Ms,[["__scopeId","data-v-e9009906"]]),Vs={};function Fs(s,e){const t=at("router-view");return f(),ee(t)}const Ks=$(Vs,[["render",Fs]]),Qe=document.querySelector("#ainteraction"),Hs=Qe.dataset.ais,Ws=Qe.dataset.knowledges,zs=ct({history:ht(),routes:[{path:"/:ai?",component:Us,props:{ais:Hs,knowledges:Ws}}]}),je=lt(Ks);je.use(zs);je.mount("#ainteraction");
+import{j as D,l as p,p as d,z as x,F as J,s as ae,v as f,x as G,J as R,A as ce,B as he,_ as $,r as T,P as Y,y as Le,Q as et,R as tt,S as st,D as nt,E as it,k as rt,w as ot,f as we,K as be,u as ve,H as ee,L as at,M as ct,N as ht,O as lt}from"./assets/_plugin-vue_export-helper-11cccb1d.js";const E=Object.create(null);E.open="0";E.close="1";E.ping="2";E.pong="3";E.message="4";E.upgrade="5";E.noop="6";const H=Object.create(null);Object.keys(E).forEach(s=>{H[E[s]]=s});const te={type:"error",data:"parser error"},Ie=typeof Blob=="function"||typeof Blob<"u"&&Object.prototype.toString.call(Blob)==="[object BlobConstructor]",Pe=typeof ArrayBuffer=="function",qe=s=>typeof ArrayBuffer.isView=="function"?ArrayBuffer.isView(s):s&&s.buffer instanceof ArrayBuffer,le=({type:s,data:e},t,n)=>Ie&&e instanceof Blob?t?n(e):ke(e,n):Pe&&(e instanceof ArrayBuffer||qe(e))?t?n(e):ke(new Blob([e]),n):n(E[s]+(e||"")),ke=(s,e)=>{const t=new FileReader;return t.onload=function(){const n=t.result.split(",")[1];e("b"+(n||""))},t.readAsDataURL(s)};function Ae(s){return s instanceof Uint8Array?s:s instanceof ArrayBuffer?new Uint8Array(s):new Uint8Array(s.buffer,s.byteOffset,s.byteLength)}let j;function ut(s,e){if(Ie&&s.data instanceof Blob)return s.data.arrayBuffer().then(Ae).then(e);if(Pe&&(s.data instanceof ArrayBuffer||qe(s.data)))return e(Ae(s.data));le(s,!1,t=>{j||(j=new TextEncoder),e(j.encode(t))})}const Ee="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",q=typeof Uint8Array>"u"?[]:new Uint8Array(256);for(let s=0;s<Ee.length;s++)q[Ee.charCodeAt(s)]=s;const ft=s=>{let e=s.length*.75,t=s.length,n,i=0,r,o,a,h;s[s.length-1]==="="&&(e--,s[s.length-2]==="="&&e--);const y=new ArrayBuffer(e),u=new Uint8Array(y);for(n=0;n<t;n+=4)r=q[s.charCodeAt(n)],o=q[s.charCodeAt(n+1)],a=q[s.charCodeAt(n+2)],h=q[s.charCodeAt(n+3)],u[i++]=r<<2|o>>4,u[i++]=(o&15)<<4|a>>2,u[i++]=(a&3)<<6|h&63;return y},dt=typeof ArrayBuffer=="function",ue=(s,e)=>{if(typeof s!="string")return{type:"message",data:De(s,e)};const t=s.charAt(0);return t==="b"?{type:"message",data:pt(s.substring(1),e)}:H[t]?s.length>1?{type:H[t],data:s.substring(1)}:{type:H[t]}:te},pt=(s,e)=>{if(dt){const t=ft(s);return De(t,e)}else return{base64:!0,data:s}},De=(s,e)=>{switch(e){case"blob":return s instanceof Blob?s:new Blob([s]);case"arraybuffer":default:return s instanceof ArrayBuffer?s:s.buffer}},$e=String.fromCharCode(30),gt=(s,e)=>{const t=s.length,n=new Array(t);let i=0;s.forEach((r,o)=>{le(r,!1,a=>{n[o]=a,++i===t&&e(n.join($e))})})},yt=(s,e)=>{const t=s.split($e),n=[];for(let i=0;i<t.length;i++){const r=ue(t[i],e);if(n.push(r),r.type==="error")break}return n};function mt(){return new TransformStream({transform(s,e){ut(s,t=>{const n=t.length;let i;if(n<126)i=new Uint8Array(1),new DataView(i.buffer).setUint8(0,n);else if(n<65536){i=new Uint8Array(3);const r=new DataView(i.buffer);r.setUint8(0,126),r.setUint16(1,n)}else{i=new Uint8Array(9);const r=new DataView(i.buffer);r.setUint8(0,127),r.setBigUint64(1,BigInt(n))}s.data&&typeof s.data!="string"&&(i[0]|=128),e.enqueue(i),e.enqueue(t)})}})}let Z;function U(s){return s.reduce((e,t)=>e+t.length,0)}function V(s,e){if(s[0].length===e)return s.shift();const t=new Uint8Array(e);let n=0;for(let i=0;i<e;i++)t[i]=s[0][n++],n===s[0].length&&(s.shift(),n=0);return s.length&&n<s[0].length&&(s[0]=s[0].slice(n)),t}function _t(s,e){Z||(Z=new TextDecoder);const t=[];let n=0,i=-1,r=!1;return new TransformStream({transform(o,a){for(t.push(o);;){if(n===0){if(U(t)<1)break;const h=V(t,1);r=(h[0]&128)===128,i=h[0]&127,i<126?n=3:i===126?n=1:n=2}else if(n===1){if(U(t)<2)break;const h=V(t,2);i=new DataView(h.buffer,h.byteOffset,h.length).getUint16(0),n=3}else if(n===2){if(U(t)<8)break;const h=V(t,8),y=new DataView(h.buffer,h.byteOffset,h.length),u=y.getUint32(0);if(u>Math.pow(2,53-32)-1){a.enqueue(te);break}i=u*Math.pow(2,32)+y.getUint32(4),n=3}else{if(U(t)<i)break;const h=V(t,i);a.enqueue(ue(r?h:Z.decode(h),e)),n=0}if(i===0||i>s){a.enqueue(te);break}}}})}const Me=4;function g(s){if(s)return wt(s)}function wt(s){for(var e in g.prototype)s[e]=g.prototype[e];return s}g.prototype.on=g.prototype.addEventListener=function(s,e){return this._callbacks=this._callbacks||{},(this._callbacks["$"+s]=this._callbacks["$"+s]||[]).push(e),this};g.prototype.once=function(s,e){function t(){this.off(s,t),e.apply(this,arguments)}return t.fn=e,this.on(s,t),this};g.prototype.off=g.prototype.removeListener=g.prototype.removeAllListeners=g.prototype.removeEventListener=function(s,e){if(this._callbacks=this._callbacks||{},arguments.length==0)return this._callbacks={},this;var t=this._callbacks["$"+s];if(!t)return this;if(arguments.length==1)return delete this._callbacks["$"+s],this;for(var n,i=0;i<t.length;i++)if(n=t[i],n===e||n.fn===e){t.splice(i,1);break}return t.length===0&&delete this._callbacks["$"+s],this};g.prototype.emit=function(s){this._callbacks=this._callbacks||{};for(var e=new Array(arguments.length-1),t=this._callbacks["$"+s],n=1;n<arguments.length;n++)e[n-1]=arguments[n];if(t){t=t.slice(0);for(var n=0,i=t.length;n<i;++n)t[n].apply(this,e)}return this};g.prototype.emitReserved=g.prototype.emit;g.prototype.listeners=function(s){return this._callbacks=this._callbacks||{},this._callbacks["$"+s]||[]};g.prototype.hasListeners=function(s){return!!this.listeners(s).length};const _=(()=>typeof self<"u"?self:typeof window<"u"?window:Function("return this")())();function Ue(s,...e){return e.reduce((t,n)=>(s.hasOwnProperty(n)&&(t[n]=s[n]),t),{})}const bt=_.setTimeout,vt=_.clearTimeout;function X(s,e){e.useNativeTimers?(s.setTimeoutFn=bt.bind(_),s.clearTimeoutFn=vt.bind(_)):(s.setTimeoutFn=_.setTimeout.bind(_),s.clearTimeoutFn=_.clearTimeout.bind(_))}const kt=1.33;function At(s){return typeof s=="string"?Et(s):Math.ceil((s.byteLength||s.size)*kt)}function Et(s){let e=0,t=0;for(let n=0,i=s.length;n<i;n++)e=s.charCodeAt(n),e<128?t+=1:e<2048?t+=2:e<55296||e>=57344?t+=3:(n++,t+=4);return t}function St(s){let e="";for(let t in s)s.hasOwnProperty(t)&&(e.length&&(e+="&"),e+=encodeURIComponent(t)+"="+encodeURIComponent(s[t]));return e}function Tt(s){let e={},t=s.split("&");for(let n=0,i=t.length;n<i;n++){let r=t[n].split("=");e[decodeURIComponent(r[0])]=decodeURIComponent(r[1])}return e}class xt extends Error{constructor(e,t,n){super(e),this.description=t,this.context=n,this.type="TransportError"}}class fe extends g{constructor(e){super(),this.writable=!1,X(this,e),this.opts=e,this.query=e.query,this.socket=e.socket}onError(e,t,n){return super.emitReserved("error",new xt(e,t,n)),this}open(){return this.readyState="opening",this.doOpen(),this}close(){return(this.readyState==="opening"||this.readyState==="open")&&(this.doClose(),this.onClose()),this}send(e){this.readyState==="open"&&this.write(e)}onOpen(){this.readyState="open",this.writable=!0,super.emitReserved("open")}onData(e){const t=ue(e,this.socket.binaryType);this.onPacket(t)}onPacket(e){super.emitReserved("packet",e)}onClose(e){this.readyState="closed",super.emitReserved("close",e)}pause(e){}createUri(e,t={}){return e+"://"+this._hostname()+this._port()+this.opts.path+this._query(t)}_hostname(){const e=this.opts.hostname;return e.indexOf(":")===-1?e:"["+e+"]"}_port(){return this.opts.port&&(this.opts.secure&&+(this.opts.port!==443)||!this.opts.secure&&Number(this.opts.port)!==80)?":"+this.opts.port:""}_query(e){const t=St(e);return t.length?"?"+t:""}}const Ve="0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_".split(""),se=64,Ct={};let Se=0,F=0,Te;function xe(s){let e="";do e=Ve[s%se]+e,s=Math.floor(s/se);while(s>0);return e}function Fe(){const s=xe(+new Date);return s!==Te?(Se=0,Te=s):s+"."+xe(Se++)}for(;F<se;F++)Ct[Ve[F]]=F;let Ke=!1;try{Ke=typeof XMLHttpRequest<"u"&&"withCredentials"in new XMLHttpRequest}catch{}const Rt=Ke;function He(s){const e=s.xdomain;try{if(typeof XMLHttpRequest<"u"&&(!e||Rt))return new XMLHttpRequest}catch{}if(!e)try{return new _[["Active"].concat("Object").join("X")]("Microsoft.XMLHTTP")}catch{}}function Ot(){}const Bt=function(){return new He({xdomain:!1}).responseType!=null}();class Nt extends fe{constructor(e){if(super(e),this.polling=!1,typeof location<"u"){const n=location.protocol==="https:";let i=location.port;i||(i=n?"443":"80"),this.xd=typeof location<"u"&&e.hostname!==location.hostname||i!==e.port}const t=e&&e.forceBase64;this.supportsBinary=Bt&&!t,this.opts.withCredentials&&(this.cookieJar=void 0)}get name(){return"polling"}doOpen(){this.poll()}pause(e){this.readyState="pausing";const t=()=>{this.readyState="paused",e()};if(this.polling||!this.writable){let n=0;this.polling&&(n++,this.once("pollComplete",function(){--n||t()})),this.writable||(n++,this.once("drain",function(){--n||t()}))}else t()}poll(){this.polling=!0,this.doPoll(),this.emitReserved("poll")}onData(e){const t=n=>{if(this.readyState==="opening"&&n.type==="open"&&this.onOpen(),n.type==="close")return this.onClose({description:"transport closed by the server"}),!1;this.onPacket(n)};yt(e,this.socket.binaryType).forEach(t),this.readyState!=="closed"&&(this.polling=!1,this.emitReserved("pollComplete"),this.readyState==="open"&&this.poll())}doClose(){const e=()=>{this.write([{type:"close"}])};this.readyState==="open"?e():this.once("open",e)}write(e){this.writable=!1,gt(e,t=>{this.doWrite(t,()=>{this.writable=!0,this.emitReserved("drain")})})}uri(){const e=this.opts.secure?"https":"http",t=this.query||{};return this.opts.timestampRequests!==!1&&(t[this.opts.timestampParam]=Fe()),!this.supportsBinary&&!t.sid&&(t.b64=1),this.createUri(e,t)}request(e={}){return Object.assign(e,{xd:this.xd,cookieJar:this.cookieJar},this.opts),new A(this.uri(),e)}doWrite(e,t){const n=this.request({method:"POST",data:e});n.on("success",t),n.on("error",(i,r)=>{this.onError("xhr post error",i,r)})}doPoll(){const e=this.request();e.on("data",this.onData.bind(this)),e.on("error",(t,n)=>{this.onError("xhr poll error",t,n)}),this.pollXhr=e}}class A extends g{constructor(e,t){super(),X(this,t),this.opts=t,this.method=t.method||"GET",this.uri=e,this.data=t.data!==void 0?t.data:null,this.create()}create(){var e;const t=Ue(this.opts,"agent","pfx","key","passphrase","cert","ca","ciphers","rejectUnauthorized","autoUnref");t.xdomain=!!this.opts.xd;const n=this.xhr=new He(t);try{n.open(this.method,this.uri,!0);try{if(this.opts.extraHeaders){n.setDisableHeaderCheck&&n.setDisableHeaderCheck(!0);for(let i in this.opts.extraHeaders)this.opts.extraHeaders.hasOwnProperty(i)&&n.setRequestHeader(i,this.opts.extraHeaders[i])}}catch{}if(this.method==="POST")try{n.setRequestHeader("Content-type","text/plain;charset=UTF-8")}catch{}try{n.setRequestHeader("Accept","*/*")}catch{}(e=this.opts.cookieJar)===null||e===void 0||e.addCookies(n),"withCredentials"in n&&(n.withCredentials=this.opts.withCredentials),this.opts.requestTimeout&&(n.timeout=this.opts.requestTimeout),n.onreadystatechange=()=>{var i;n.readyState===3&&((i=this.opts.cookieJar)===null||i===void 0||i.parseCookies(n)),n.readyState===4&&(n.status===200||n.status===1223?this.onLoad():this.setTimeoutFn(()=>{this.onError(typeof n.status=="number"?n.status:0)},0))},n.send(this.data)}catch(i){this.setTimeoutFn(()=>{this.onError(i)},0);return}typeof document<"u"&&(this.index=A.requestsCount++,A.requests[this.index]=this)}onError(e){this.emitReserved("error",e,this.xhr),this.cleanup(!0)}cleanup(e){if(!(typeof this.xhr>"u"||this.xhr===null)){if(this.xhr.onreadystatechange=Ot,e)try{this.xhr.abort()}catch{}typeof document<"u"&&delete A.requests[this.index],this.xhr=null}}onLoad(){const e=this.xhr.responseText;e!==null&&(this.emitReserved("data",e),this.emitReserved("success"),this.cleanup())}abort(){this.cleanup()}}A.requestsCount=0;A.requests={};if(typeof document<"u"){if(typeof attachEvent=="function")attachEvent("onunload",Ce);else if(typeof addEventListener=="function"){const s="onpagehide"in _?"pagehide":"unload";addEventListener(s,Ce,!1)}}function Ce(){for(let s in A.requests)A.requests.hasOwnProperty(s)&&A.requests[s].abort()}const de=(()=>typeof Promise=="function"&&typeof Promise.resolve=="function"?e=>Promise.resolve().then(e):(e,t)=>t(e,0))(),K=_.WebSocket||_.MozWebSocket,Re=!0,Lt="arraybuffer",Oe=typeof navigator<"u"&&typeof navigator.product=="string"&&navigator.product.toLowerCase()==="reactnative";class It extends fe{constructor(e){super(e),this.supportsBinary=!e.forceBase64}get name(){return"websocket"}doOpen(){if(!this.check())return;const e=this.uri(),t=this.opts.protocols,n=Oe?{}:Ue(this.opts,"agent","perMessageDeflate","pfx","key","passphrase","cert","ca","ciphers","rejectUnauthorized","localAddress","protocolVersion","origin","maxPayload","family","checkServerIdentity");this.opts.extraHeaders&&(n.headers=this.opts.extraHeaders);try{this.ws=Re&&!Oe?t?new K(e,t):new K(e):new K(e,t,n)}catch(i){return this.emitReserved("error",i)}this.ws.binaryType=this.socket.binaryType,this.addEventListeners()}addEventListeners(){this.ws.onopen=()=>{this.opts.autoUnref&&this.ws._socket.unref(),this.onOpen()},this.ws.onclose=e=>this.onClose({description:"websocket connection closed",context:e}),this.ws.onmessage=e=>this.onData(e.data),this.ws.onerror=e=>this.onError("websocket error",e)}write(e){this.writable=!1;for(let t=0;t<e.length;t++){const n=e[t],i=t===e.length-1;le(n,this.supportsBinary,r=>{const o={};try{Re&&this.ws.send(r)}catch{}i&&de(()=>{this.writable=!0,this.emitReserved("drain")},this.setTimeoutFn)})}}doClose(){typeof this.ws<"u"&&(this.ws.close(),this.ws=null)}uri(){const e=this.opts.secure?"wss":"ws",t=this.query||{};return this.opts.timestampRequests&&(t[this.opts.timestampParam]=Fe()),this.supportsBinary||(t.b64=1),this.createUri(e,t)}check(){return!!K}}class Pt extends fe{get name(){return"webtransport"}doOpen(){typeof WebTransport=="function"&&(this.transport=new WebTransport(this.createUri("https"),this.opts.transportOptions[this.name]),this.transport.closed.then(()=>{this.onClose()}).catch(e=>{this.onError("webtransport error",e)}),this.transport.ready.then(()=>{this.transport.createBidirectionalStream().then(e=>{const t=_t(Number.MAX_SAFE_INTEGER,this.socket.binaryType),n=e.readable.pipeThrough(t).getReader(),i=mt();i.readable.pipeTo(e.writable),this.writer=i.writable.getWriter();const r=()=>{n.read().then(({done:a,value:h})=>{a||(this.onPacket(h),r())}).catch(a=>{})};r();const o={type:"open"};this.query.sid&&(o.data=`{"sid":"${this.query.sid}"}`),this.writer.write(o).then(()=>this.onOpen())})}))}write(e){this.writable=!1;for(let t=0;t<e.length;t++){const n=e[t],i=t===e.length-1;this.writer.write(n).then(()=>{i&&de(()=>{this.writable=!0,this.emitReserved("drain")},this.setTimeoutFn)})}}doClose(){var e;(e=this.transport)===null||e===void 0||e.close()}}const qt={websocket:It,webtransport:Pt,polling:Nt},Dt=/^(?:(?![^:@\/?#]+:[^:@\/]*@)(http|https|ws|wss):\/\/)?((?:(([^:@\/?#]*)(?::([^:@\/?#]*))?)?@)?((?:[a-f0-9]{0,4}:){2,7}[a-f0-9]{0,4}|[^:\/?#]*)(?::(\d*))?)(((\/(?:[^?#](?![^?#\/]*\.[^?#\/.]+(?:[?#]|$)))*\/?)?([^?#\/]*))(?:\?([^#]*))?(?:#(.*))?)/,$t=["source","protocol","authority","userInfo","user","password","host","port","relative","path","directory","file","query","anchor"];function ne(s){const e=s,t=s.indexOf("["),n=s.indexOf("]");t!=-1&&n!=-1&&(s=s.substring(0,t)+s.substring(t,n).replace(/:/g,";")+s.substring(n,s.length));let i=Dt.exec(s||""),r={},o=14;for(;o--;)r[$t[o]]=i[o]||"";return t!=-1&&n!=-1&&(r.source=e,r.host=r.host.substring(1,r.host.length-1).replace(/;/g,":"),r.authority=r.authority.replace("[","").replace("]","").replace(/;/g,":"),r.ipv6uri=!0),r.pathNames=Mt(r,r.path),r.queryKey=Ut(r,r.query),r}function Mt(s,e){const t=/\/{2,9}/g,n=e.replace(t,"/").split("/");return(e.slice(0,1)=="/"||e.length===0)&&n.splice(0,1),e.slice(-1)=="/"&&n.splice(n.length-1,1),n}function Ut(s,e){const t={};return e.replace(/(?:^|&)([^&=]*)=?([^&]*)/g,function(n,i,r){i&&(t[i]=r)}),t}let We=class O extends g{constructor(e,t={}){super(),this.binaryType=Lt,this.writeBuffer=[],e&&typeof e=="object"&&(t=e,e=null),e?(e=ne(e),t.hostname=e.host,t.secure=e.protocol==="https"||e.protocol==="wss",t.port=e.port,e.query&&(t.query=e.query)):t.host&&(t.hostname=ne(t.host).host),X(this,t),this.secure=t.secure!=null?t.secure:typeof location<"u"&&location.protocol==="https:",t.hostname&&!t.port&&(t.port=this.secure?"443":"80"),this.hostname=t.hostname||(typeof location<"u"?location.hostname:"localhost"),this.port=t.port||(typeof location<"u"&&location.port?location.port:this.secure?"443":"80"),this.transports=t.transports||["polling","websocket","webtransport"],this.writeBuffer=[],this.prevBufferLen=0,this.opts=Object.assign({path:"/engine.io",agent:!1,withCredentials:!1,upgrade:!0,timestampParam:"t",rememberUpgrade:!1,addTrailingSlash:!0,rejectUnauthorized:!0,perMessageDeflate:{threshold:1024},transportOptions:{},closeOnBeforeunload:!1},t),this.opts.path=this.opts.path.replace(/\/$/,"")+(this.opts.addTrailingSlash?"/":""),typeof this.opts.query=="string"&&(this.opts.query=Tt(this.opts.query)),this.id=null,this.upgrades=null,this.pingInterval=null,this.pingTimeout=null,this.pingTimeoutTimer=null,typeof addEventListener=="function"&&(this.opts.closeOnBeforeunload&&(this.beforeunloadEventListener=()=>{this.transport&&(this.transport.removeAllListeners(),this.transport.close())},addEventListener("beforeunload",this.beforeunloadEventListener,!1)),this.hostname!=="localhost"&&(this.offlineEventListener=()=>{this.onClose("transport close",{description:"network connection lost"})},addEventListener("offline",this.offlineEventListener,!1))),this.open()}createTransport(e){const t=Object.assign({},this.opts.query);t.EIO=Me,t.transport=e,this.id&&(t.sid=this.id);const n=Object.assign({},this.opts,{query:t,socket:this,hostname:this.hostname,secure:this.secure,port:this.port},this.opts.transportOptions[e]);return new qt[e](n)}open(){let e;if(this.opts.rememberUpgrade&&O.priorWebsocketSuccess&&this.transports.indexOf("websocket")!==-1)e="websocket";else if(this.transports.length===0){this.setTimeoutFn(()=>{this.emitReserved("error","No transports available")},0);return}else e=this.transports[0];this.readyState="opening";try{e=this.createTransport(e)}catch{this.transports.shift(),this.open();return}e.open(),this.setTransport(e)}setTransport(e){this.transport&&this.transport.removeAllListeners(),this.transport=e,e.on("drain",this.onDrain.bind(this)).on("packet",this.onPacket.bind(this)).on("error",this.onError.bind(this)).on("close",t=>this.onClose("transport close",t))}probe(e){let t=this.createTransport(e),n=!1;O.priorWebsocketSuccess=!1;const i=()=>{n||(t.send([{type:"ping",data:"probe"}]),t.once("packet",w=>{if(!n)if(w.type==="pong"&&w.data==="probe"){if(this.upgrading=!0,this.emitReserved("upgrading",t),!t)return;O.priorWebsocketSuccess=t.name==="websocket",this.transport.pause(()=>{n||this.readyState!=="closed"&&(u(),this.setTransport(t),t.send([{type:"upgrade"}]),this.emitReserved("upgrade",t),t=null,this.upgrading=!1,this.flush())})}else{const b=new Error("probe error");b.transport=t.name,this.emitReserved("upgradeError",b)}}))};function r(){n||(n=!0,u(),t.close(),t=null)}const o=w=>{const b=new Error("probe error: "+w);b.transport=t.name,r(),this.emitReserved("upgradeError",b)};function a(){o("transport closed")}function h(){o("socket closed")}function y(w){t&&w.name!==t.name&&r()}const u=()=>{t.removeListener("open",i),t.removeListener("error",o),t.removeListener("close",a),this.off("close",h),this.off("upgrading",y)};t.once("open",i),t.once("error",o),t.once("close",a),this.once("close",h),this.once("upgrading",y),this.upgrades.indexOf("webtransport")!==-1&&e!=="webtransport"?this.setTimeoutFn(()=>{n||t.open()},200):t.open()}onOpen(){if(this.readyState="open",O.priorWebsocketSuccess=this.transport.name==="websocket",this.emitReserved("open"),this.flush(),this.readyState==="open"&&this.opts.upgrade){let e=0;const t=this.upgrades.length;for(;e<t;e++)this.probe(this.upgrades[e])}}onPacket(e){if(this.readyState==="opening"||this.readyState==="open"||this.readyState==="closing")switch(this.emitReserved("packet",e),this.emitReserved("heartbeat"),this.resetPingTimeout(),e.type){case"open":this.onHandshake(JSON.parse(e.data));break;case"ping":this.sendPacket("pong"),this.emitReserved("ping"),this.emitReserved("pong");break;case"error":const t=new Error("server error");t.code=e.data,this.onError(t);break;case"message":this.emitReserved("data",e.data),this.emitReserved("message",e.data);break}}onHandshake(e){this.emitReserved("handshake",e),this.id=e.sid,this.transport.query.sid=e.sid,this.upgrades=this.filterUpgrades(e.upgrades),this.pingInterval=e.pingInterval,this.pingTimeout=e.pingTimeout,this.maxPayload=e.maxPayload,this.onOpen(),this.readyState!=="closed"&&this.resetPingTimeout()}resetPingTimeout(){this.clearTimeoutFn(this.pingTimeoutTimer),this.pingTimeoutTimer=this.setTimeoutFn(()=>{this.onClose("ping timeout")},this.pingInterval+this.pingTimeout),this.opts.autoUnref&&this.pingTimeoutTimer.unref()}onDrain(){this.writeBuffer.splice(0,this.prevBufferLen),this.prevBufferLen=0,this.writeBuffer.length===0?this.emitReserved("drain"):this.flush()}flush(){if(this.readyState!=="closed"&&this.transport.writable&&!this.upgrading&&this.writeBuffer.length){const e=this.getWritablePackets();this.transport.send(e),this.prevBufferLen=e.length,this.emitReserved("flush")}}getWritablePackets(){if(!(this.maxPayload&&this.transport.name==="polling"&&this.writeBuffer.length>1))return this.writeBuffer;let t=1;for(let n=0;n<this.writeBuffer.length;n++){const i=this.writeBuffer[n].data;if(i&&(t+=At(i)),n>0&&t>this.maxPayload)return this.writeBuffer.slice(0,n);t+=2}return this.writeBuffer}write(e,t,n){return this.sendPacket("message",e,t,n),this}send(e,t,n){return this.sendPacket("message",e,t,n),this}sendPacket(e,t,n,i){if(typeof t=="function"&&(i=t,t=void 0),typeof n=="function"&&(i=n,n=null),this.readyState==="closing"||this.readyState==="closed")return;n=n||{},n.compress=n.compress!==!1;const r={type:e,data:t,options:n};this.emitReserved("packetCreate",r),this.writeBuffer.push(r),i&&this.once("flush",i),this.flush()}close(){const e=()=>{this.onClose("forced close"),this.transport.close()},t=()=>{this.off("upgrade",t),this.off("upgradeError",t),e()},n=()=>{this.once("upgrade",t),this.once("upgradeError",t)};return(this.readyState==="opening"||this.readyState==="open")&&(this.readyState="closing",this.writeBuffer.length?this.once("drain",()=>{this.upgrading?n():e()}):this.upgrading?n():e()),this}onError(e){O.priorWebsocketSuccess=!1,this.emitReserved("error",e),this.onClose("transport error",e)}onClose(e,t){(this.readyState==="opening"||this.readyState==="open"||this.readyState==="closing")&&(this.clearTimeoutFn(this.pingTimeoutTimer),this.transport.removeAllListeners("close"),this.transport.close(),this.transport.removeAllListeners(),typeof removeEventListener=="function"&&(removeEventListener("beforeunload",this.beforeunloadEventListener,!1),removeEventListener("offline",this.offlineEventListener,!1)),this.readyState="closed",this.id=null,this.emitReserved("close",e,t),this.writeBuffer=[],this.prevBufferLen=0)}filterUpgrades(e){const t=[];let n=0;const i=e.length;for(;n<i;n++)~this.transports.indexOf(e[n])&&t.push(e[n]);return t}};We.protocol=Me;function Vt(s,e="",t){let n=s;t=t||typeof location<"u"&&location,s==null&&(s=t.protocol+"//"+t.host),typeof s=="string"&&(s.charAt(0)==="/"&&(s.charAt(1)==="/"?s=t.protocol+s:s=t.host+s),/^(https?|wss?):\/\//.test(s)||(typeof t<"u"?s=t.protocol+"//"+s:s="https://"+s),n=ne(s)),n.port||(/^(http|ws)$/.test(n.protocol)?n.port="80":/^(http|ws)s$/.test(n.protocol)&&(n.port="443")),n.path=n.path||"/";const r=n.host.indexOf(":")!==-1?"["+n.host+"]":n.host;return n.id=n.protocol+"://"+r+":"+n.port+e,n.href=n.protocol+"://"+r+(t&&t.port===n.port?"":":"+n.port),n}const Ft=typeof ArrayBuffer=="function",Kt=s=>typeof ArrayBuffer.isView=="function"?ArrayBuffer.isView(s):s.buffer instanceof ArrayBuffer,ze=Object.prototype.toString,Ht=typeof Blob=="function"||typeof Blob<"u"&&ze.call(Blob)==="[object BlobConstructor]",Wt=typeof File=="function"||typeof File<"u"&&ze.call(File)==="[object FileConstructor]";function pe(s){return Ft&&(s instanceof ArrayBuffer||Kt(s))||Ht&&s instanceof Blob||Wt&&s instanceof File}function W(s,e){if(!s||typeof s!="object")return!1;if(Array.isArray(s)){for(let t=0,n=s.length;t<n;t++)if(W(s[t]))return!0;return!1}if(pe(s))return!0;if(s.toJSON&&typeof s.toJSON=="function"&&arguments.length===1)return W(s.toJSON(),!0);for(const t in s)if(Object.prototype.hasOwnProperty.call(s,t)&&W(s[t]))return!0;return!1}function zt(s){const e=[],t=s.data,n=s;return n.data=ie(t,e),n.attachments=e.length,{packet:n,buffers:e}}function ie(s,e){if(!s)return s;if(pe(s)){const t={_placeholder:!0,num:e.length};return e.push(s),t}else if(Array.isArray(s)){const t=new Array(s.length);for(let n=0;n<s.length;n++)t[n]=ie(s[n],e);return t}else if(typeof s=="object"&&!(s instanceof Date)){const t={};for(const n in s)Object.prototype.hasOwnProperty.call(s,n)&&(t[n]=ie(s[n],e));return t}return s}function Jt(s,e){return s.data=re(s.data,e),delete s.attachments,s}function re(s,e){if(!s)return s;if(s&&s._placeholder===!0){if(typeof s.num=="number"&&s.num>=0&&s.num<e.length)return e[s.num];throw new Error("illegal attachments")}else if(Array.isArray(s))for(let t=0;t<s.length;t++)s[t]=re(s[t],e);else if(typeof s=="object")for(const t in s)Object.prototype.hasOwnProperty.call(s,t)&&(s[t]=re(s[t],e));return s}const Yt=["connect","connect_error","disconnect","disconnecting","newListener","removeListener"],Xt=5;var l;(function(s){s[s.CONNECT=0]="CONNECT",s[s.DISCONNECT=1]="DISCONNECT",s[s.EVENT=2]="EVENT",s[s.ACK=3]="ACK",s[s.CONNECT_ERROR=4]="CONNECT_ERROR",s[s.BINARY_EVENT=5]="BINARY_EVENT",s[s.BINARY_ACK=6]="BINARY_ACK"})(l||(l={}));class Qt{constructor(e){this.replacer=e}encode(e){return(e.type===l.EVENT||e.type===l.ACK)&&W(e)?this.encodeAsBinary({type:e.type===l.EVENT?l.BINARY_EVENT:l.BINARY_ACK,nsp:e.nsp,data:e.data,id:e.id}):[this.encodeAsString(e)]}encodeAsString(e){let t=""+e.type;return(e.type===l.BINARY_EVENT||e.type===l.BINARY_ACK)&&(t+=e.attachments+"-"),e.nsp&&e.nsp!=="/"&&(t+=e.nsp+","),e.id!=null&&(t+=e.id),e.data!=null&&(t+=JSON.stringify(e.data,this.replacer)),t}encodeAsBinary(e){const t=zt(e),n=this.encodeAsString(t.packet),i=t.buffers;return i.unshift(n),i}}function Be(s){return Object.prototype.toString.call(s)==="[object Object]"}class ge extends g{constructor(e){super(),this.reviver=e}add(e){let t;if(typeof e=="string"){if(this.reconstructor)throw new Error("got plaintext data when reconstructing a packet");t=this.decodeString(e);const n=t.type===l.BINARY_EVENT;n||t.type===l.BINARY_ACK?(t.type=n?l.EVENT:l.ACK,this.reconstructor=new jt(t),t.attachments===0&&super.emitReserved("decoded",t)):super.emitReserved("decoded",t)}else if(pe(e)||e.base64)if(this.reconstructor)t=this.reconstructor.takeBinaryData(e),t&&(this.reconstructor=null,super.emitReserved("decoded",t));else throw new Error("got binary data when not reconstructing a packet");else throw new Error("Unknown type: "+e)}decodeString(e){let t=0;const n={type:Number(e.charAt(0))};if(l[n.type]===void 0)throw new Error("unknown packet type "+n.type);if(n.type===l.BINARY_EVENT||n.type===l.BINARY_ACK){const r=t+1;for(;e.charAt(++t)!=="-"&&t!=e.length;);const o=e.substring(r,t);if(o!=Number(o)||e.charAt(t)!=="-")throw new Error("Illegal attachments");n.attachments=Number(o)}if(e.charAt(t+1)==="/"){const r=t+1;for(;++t&&!(e.charAt(t)===","||t===e.length););n.nsp=e.substring(r,t)}else n.nsp="/";const i=e.charAt(t+1);if(i!==""&&Number(i)==i){const r=t+1;for(;++t;){const o=e.charAt(t);if(o==null||Number(o)!=o){--t;break}if(t===e.length)break}n.id=Number(e.substring(r,t+1))}if(e.charAt(++t)){const r=this.tryParse(e.substr(t));if(ge.isPayloadValid(n.type,r))n.data=r;else throw new Error("invalid payload")}return n}tryParse(e){try{return JSON.parse(e,this.reviver)}catch{return!1}}static isPayloadValid(e,t){switch(e){case l.CONNECT:return Be(t);case l.DISCONNECT:return t===void 0;case l.CONNECT_ERROR:return typeof t=="string"||Be(t);case l.EVENT:case l.BINARY_EVENT:return Array.isArray(t)&&(typeof t[0]=="number"||typeof t[0]=="string"&&Yt.indexOf(t[0])===-1);case l.ACK:case l.BINARY_ACK:return Array.isArray(t)}}destroy(){this.reconstructor&&(this.reconstructor.finishedReconstruction(),this.reconstructor=null)}}class jt{constructor(e){this.packet=e,this.buffers=[],this.reconPack=e}takeBinaryData(e){if(this.buffers.push(e),this.buffers.length===this.reconPack.attachments){const t=Jt(this.reconPack,this.buffers);return this.finishedReconstruction(),t}return null}finishedReconstruction(){this.reconPack=null,this.buffers=[]}}const Zt=Object.freeze(Object.defineProperty({__proto__:null,Decoder:ge,Encoder:Qt,get PacketType(){return l},protocol:Xt},Symbol.toStringTag,{value:"Module"}));function v(s,e,t){return s.on(e,t),function(){s.off(e,t)}}const Gt=Object.freeze({connect:1,connect_error:1,disconnect:1,disconnecting:1,newListener:1,removeListener:1});class Je extends g{constructor(e,t,n){super(),this.connected=!1,this.recovered=!1,this.receiveBuffer=[],this.sendBuffer=[],this._queue=[],this._queueSeq=0,this.ids=0,this.acks={},this.flags={},this.io=e,this.nsp=t,n&&n.auth&&(this.auth=n.auth),this._opts=Object.assign({},n),this.io._autoConnect&&this.open()}get disconnected(){return!this.connected}subEvents(){if(this.subs)return;const e=this.io;this.subs=[v(e,"open",this.onopen.bind(this)),v(e,"packet",this.onpacket.bind(this)),v(e,"error",this.onerror.bind(this)),v(e,"close",this.onclose.bind(this))]}get active(){return!!this.subs}connect(){return this.connected?this:(this.subEvents(),this.io._reconnecting||this.io.open(),this.io._readyState==="open"&&this.onopen(),this)}open(){return this.connect()}send(...e){return e.unshift("message"),this.emit.apply(this,e),this}emit(e,...t){if(Gt.hasOwnProperty(e))throw new Error('"'+e.toString()+'" is a reserved event name');if(t.unshift(e),this._opts.retries&&!this.flags.fromQueue&&!this.flags.volatile)return this._addToQueue(t),this;const n={type:l.EVENT,data:t};if(n.options={},n.options.compress=this.flags.compress!==!1,typeof t[t.length-1]=="function"){const o=this.ids++,a=t.pop();this._registerAckCallback(o,a),n.id=o}const i=this.io.engine&&this.io.engine.transport&&this.io.engine.transport.writable;return this.flags.volatile&&(!i||!this.connected)||(this.connected?(this.notifyOutgoingListeners(n),this.packet(n)):this.sendBuffer.push(n)),this.flags={},this}_registerAckCallback(e,t){var n;const i=(n=this.flags.timeout)!==null&&n!==void 0?n:this._opts.ackTimeout;if(i===void 0){this.acks[e]=t;return}const r=this.io.setTimeoutFn(()=>{delete this.acks[e];for(let o=0;o<this.sendBuffer.length;o++)this.sendBuffer[o].id===e&&this.sendBuffer.splice(o,1);t.call(this,new Error("operation has timed out"))},i);this.acks[e]=(...o)=>{this.io.clearTimeoutFn(r),t.apply(this,[null,...o])}}emitWithAck(e,...t){const n=this.flags.timeout!==void 0||this._opts.ackTimeout!==void 0;return new Promise((i,r)=>{t.push((o,a)=>n?o?r(o):i(a):i(o)),this.emit(e,...t)})}_addToQueue(e){let t;typeof e[e.length-1]=="function"&&(t=e.pop());const n={id:this._queueSeq++,tryCount:0,pending:!1,args:e,flags:Object.assign({fromQueue:!0},this.flags)};e.push((i,...r)=>n!==this._queue[0]?void 0:(i!==null?n.tryCount>this._opts.retries&&(this._queue.shift(),t&&t(i)):(this._queue.shift(),t&&t(null,...r)),n.pending=!1,this._drainQueue())),this._queue.push(n),this._drainQueue()}_drainQueue(e=!1){if(!this.connected||this._queue.length===0)return;const t=this._queue[0];t.pending&&!e||(t.pending=!0,t.tryCount++,this.flags=t.flags,this.emit.apply(this,t.args))}packet(e){e.nsp=this.nsp,this.io._packet(e)}onopen(){typeof this.auth=="function"?this.auth(e=>{this._sendConnectPacket(e)}):this._sendConnectPacket(this.auth)}_sendConnectPacket(e){this.packet({type:l.CONNECT,data:this._pid?Object.assign({pid:this._pid,offset:this._lastOffset},e):e})}onerror(e){this.connected||this.emitReserved("connect_error",e)}onclose(e,t){this.connected=!1,delete this.id,this.emitReserved("disconnect",e,t)}onpacket(e){if(e.nsp===this.nsp)switch(e.type){case l.CONNECT:e.data&&e.data.sid?this.onconnect(e.data.sid,e.data.pid):this.emitReserved("connect_error",new Error("It seems you are trying to reach a Socket.IO server in v2.x with a v3.x client, but they are not compatible (more information here: https://socket.io/docs/v3/migrating-from-2-x-to-3-0/)"));break;case l.EVENT:case l.BINARY_EVENT:this.onevent(e);break;case l.ACK:case l.BINARY_ACK:this.onack(e);break;case l.DISCONNECT:this.ondisconnect();break;case l.CONNECT_ERROR:this.destroy();const n=new Error(e.data.message);n.data=e.data.data,this.emitReserved("connect_error",n);break}}onevent(e){const t=e.data||[];e.id!=null&&t.push(this.ack(e.id)),this.connected?this.emitEvent(t):this.receiveBuffer.push(Object.freeze(t))}emitEvent(e){if(this._anyListeners&&this._anyListeners.length){const t=this._anyListeners.slice();for(const n of t)n.apply(this,e)}super.emit.apply(this,e),this._pid&&e.length&&typeof e[e.length-1]=="string"&&(this._lastOffset=e[e.length-1])}ack(e){const t=this;let n=!1;return function(...i){n||(n=!0,t.packet({type:l.ACK,id:e,data:i}))}}onack(e){const t=this.acks[e.id];typeof t=="function"&&(t.apply(this,e.data),delete this.acks[e.id])}onconnect(e,t){this.id=e,this.recovered=t&&this._pid===t,this._pid=t,this.connected=!0,this.emitBuffered(),this.emitReserved("connect"),this._drainQueue(!0)}emitBuffered(){this.receiveBuffer.forEach(e=>this.emitEvent(e)),this.receiveBuffer=[],this.sendBuffer.forEach(e=>{this.notifyOutgoingListeners(e),this.packet(e)}),this.sendBuffer=[]}ondisconnect(){this.destroy(),this.onclose("io server disconnect")}destroy(){this.subs&&(this.subs.forEach(e=>e()),this.subs=void 0),this.io._destroy(this)}disconnect(){return this.connected&&this.packet({type:l.DISCONNECT}),this.destroy(),this.connected&&this.onclose("io client disconnect"),this}close(){return this.disconnect()}compress(e){return this.flags.compress=e,this}get volatile(){return this.flags.volatile=!0,this}timeout(e){return this.flags.timeout=e,this}onAny(e){return this._anyListeners=this._anyListeners||[],this._anyListeners.push(e),this}prependAny(e){return this._anyListeners=this._anyListeners||[],this._anyListeners.unshift(e),this}offAny(e){if(!this._anyListeners)return this;if(e){const t=this._anyListeners;for(let n=0;n<t.length;n++)if(e===t[n])return t.splice(n,1),this}else this._anyListeners=[];return this}listenersAny(){return this._anyListeners||[]}onAnyOutgoing(e){return this._anyOutgoingListeners=this._anyOutgoingListeners||[],this._anyOutgoingListeners.push(e),this}prependAnyOutgoing(e){return this._anyOutgoingListeners=this._anyOutgoingListeners||[],this._anyOutgoingListeners.unshift(e),this}offAnyOutgoing(e){if(!this._anyOutgoingListeners)return this;if(e){const t=this._anyOutgoingListeners;for(let n=0;n<t.length;n++)if(e===t[n])return t.splice(n,1),this}else this._anyOutgoingListeners=[];return this}listenersAnyOutgoing(){return this._anyOutgoingListeners||[]}notifyOutgoingListeners(e){if(this._anyOutgoingListeners&&this._anyOutgoingListeners.length){const t=this._anyOutgoingListeners.slice();for(const n of t)n.apply(this,e.data)}}}function B(s){s=s||{},this.ms=s.min||100,this.max=s.max||1e4,this.factor=s.factor||2,this.jitter=s.jitter>0&&s.jitter<=1?s.jitter:0,this.attempts=0}B.prototype.duration=function(){var s=this.ms*Math.pow(this.factor,this.attempts++);if(this.jitter){var e=Math.random(),t=Math.floor(e*this.jitter*s);s=Math.floor(e*10)&1?s+t:s-t}return Math.min(s,this.max)|0};B.prototype.reset=function(){this.attempts=0};B.prototype.setMin=function(s){this.ms=s};B.prototype.setMax=function(s){this.max=s};B.prototype.setJitter=function(s){this.jitter=s};class oe extends g{constructor(e,t){var n;super(),this.nsps={},this.subs=[],e&&typeof e=="object"&&(t=e,e=void 0),t=t||{},t.path=t.path||"/socket.io",this.opts=t,X(this,t),this.reconnection(t.reconnection!==!1),this.reconnectionAttempts(t.reconnectionAttempts||1/0),this.reconnectionDelay(t.reconnectionDelay||1e3),this.reconnectionDelayMax(t.reconnectionDelayMax||5e3),this.randomizationFactor((n=t.randomizationFactor)!==null&&n!==void 0?n:.5),this.backoff=new B({min:this.reconnectionDelay(),max:this.reconnectionDelayMax(),jitter:this.randomizationFactor()}),this.timeout(t.timeout==null?2e4:t.timeout),this._readyState="closed",this.uri=e;const i=t.parser||Zt;this.encoder=new i.Encoder,this.decoder=new i.Decoder,this._autoConnect=t.autoConnect!==!1,this._autoConnect&&this.open()}reconnection(e){return arguments.length?(this._reconnection=!!e,this):this._reconnection}reconnectionAttempts(e){return e===void 0?this._reconnectionAttempts:(this._reconnectionAttempts=e,this)}reconnectionDelay(e){var t;return e===void 0?this._reconnectionDelay:(this._reconnectionDelay=e,(t=this.backoff)===null||t===void 0||t.setMin(e),this)}randomizationFactor(e){var t;return e===void 0?this._randomizationFactor:(this._randomizationFactor=e,(t=this.backoff)===null||t===void 0||t.setJitter(e),this)}reconnectionDelayMax(e){var t;return e===void 0?this._reconnectionDelayMax:(this._reconnectionDelayMax=e,(t=this.backoff)===null||t===void 0||t.setMax(e),this)}timeout(e){return arguments.length?(this._timeout=e,this):this._timeout}maybeReconnectOnOpen(){!this._reconnecting&&this._reconnection&&this.backoff.attempts===0&&this.reconnect()}open(e){if(~this._readyState.indexOf("open"))return this;this.engine=new We(this.uri,this.opts);const t=this.engine,n=this;this._readyState="opening",this.skipReconnect=!1;const i=v(t,"open",function(){n.onopen(),e&&e()}),r=a=>{this.cleanup(),this._readyState="closed",this.emitReserved("error",a),e?e(a):this.maybeReconnectOnOpen()},o=v(t,"error",r);if(this._timeout!==!1){const a=this._timeout,h=this.setTimeoutFn(()=>{i(),r(new Error("timeout")),t.close()},a);this.opts.autoUnref&&h.unref(),this.subs.push(()=>{this.clearTimeoutFn(h)})}return this.subs.push(i),this.subs.push(o),this}connect(e){return this.open(e)}onopen(){this.cleanup(),this._readyState="open",this.emitReserved("open");const e=this.engine;this.subs.push(v(e,"ping",this.onping.bind(this)),v(e,"data",this.ondata.bind(this)),v(e,"error",this.onerror.bind(this)),v(e,"close",this.onclose.bind(this)),v(this.decoder,"decoded",this.ondecoded.bind(this)))}onping(){this.emitReserved("ping")}ondata(e){try{this.decoder.add(e)}catch(t){this.onclose("parse error",t)}}ondecoded(e){de(()=>{this.emitReserved("packet",e)},this.setTimeoutFn)}onerror(e){this.emitReserved("error",e)}socket(e,t){let n=this.nsps[e];return n?this._autoConnect&&!n.active&&n.connect():(n=new Je(this,e,t),this.nsps[e]=n),n}_destroy(e){const t=Object.keys(this.nsps);for(const n of t)if(this.nsps[n].active)return;this._close()}_packet(e){const t=this.encoder.encode(e);for(let n=0;n<t.length;n++)this.engine.write(t[n],e.options)}cleanup(){this.subs.forEach(e=>e()),this.subs.length=0,this.decoder.destroy()}_close(){this.skipReconnect=!0,this._reconnecting=!1,this.onclose("forced close"),this.engine&&this.engine.close()}disconnect(){return this._close()}onclose(e,t){this.cleanup(),this.backoff.reset(),this._readyState="closed",this.emitReserved("close",e,t),this._reconnection&&!this.skipReconnect&&this.reconnect()}reconnect(){if(this._reconnecting||this.skipReconnect)return this;const e=this;if(this.backoff.attempts>=this._reconnectionAttempts)this.backoff.reset(),this.emitReserved("reconnect_failed"),this._reconnecting=!1;else{const t=this.backoff.duration();this._reconnecting=!0;const n=this.setTimeoutFn(()=>{e.skipReconnect||(this.emitReserved("reconnect_attempt",e.backoff.attempts),!e.skipReconnect&&e.open(i=>{i?(e._reconnecting=!1,e.reconnect(),this.emitReserved("reconnect_error",i)):e.onreconnect()}))},t);this.opts.autoUnref&&n.unref(),this.subs.push(()=>{this.clearTimeoutFn(n)})}}onreconnect(){const e=this.backoff.attempts;this._reconnecting=!1,this.backoff.reset(),this.emitReserved("reconnect",e)}}const P={};function z(s,e){typeof s=="object"&&(e=s,s=void 0),e=e||{};const t=Vt(s,e.path||"/socket.io"),n=t.source,i=t.id,r=t.path,o=P[i]&&r in P[i].nsps,a=e.forceNew||e["force new connection"]||e.multiplex===!1||o;let h;return a?h=new oe(n,e):(P[i]||(P[i]=new oe(n,e)),h=P[i]),t.query&&!e.query&&(e.query=t.queryKey),h.socket(t.path,e)}Object.assign(z,{Manager:oe,Socket:Je,io:z,connect:z});const Ye=s=>(ce("data-v-ac9ee67d"),s=s(),he(),s),es={class:"d-flex align-items-center justify-content-center gap-2 mb-4"},ts=Ye(()=>d("span",{class:"badge rounded-pill text-bg-primary"},"AI",-1)),ss={key:0,class:"flex-grow-1"},ns=Ye(()=>d("strong",null,[R("No AI found. Please "),d("a",{href:"/workshop/ai"},"set up an AI"),R(" first.")],-1)),is=[ns],rs={key:1,class:"flex-grow-1"},os={key:2,class:"dropdown flex-grow-1"},as={class:"btn btn-light border dropdown-toggle d-block w-100 text-start",type:"button","data-bs-toggle":"dropdown","aria-expanded":"false"},cs={class:"dropdown-menu w-100 m-0"},hs=["onClick"],ls=["title"],us=D({__name:"AiSelection",props:{ais:{},disabled:{type:Boolean},selectedAi:{}},emits:["select-ai"],setup(s,{emit:e}){const{ais:t,disabled:n,selectedAi:i}=s,r=e,o=u=>{r("select-ai",u)},a=u=>u.input_keys.includes("input_knowledge"),h=u=>a(u)?"bg-warning":"bg-secondary",y=u=>a(u)?"Understands text input and can access additional knowledge.":"Understands text input.";return t.length&&o(t[0]),(u,w)=>{var b;return f(),p("div",es,[ts,u.ais.length?u.disabled?(f(),p("div",rs,[d("strong",null,x((b=u.selectedAi)==null?void 0:b.name),1)])):(f(),p("div",os,[d("button",as,x(u.selectedAi?u.selectedAi.name:"Select AI"),1),d("ul",cs,[(f(!0),p(J,null,ae(u.ais,C=>(f(),p("li",{key:C.id},[d("a",{class:"dropdown-item d-flex align-items-center gap-2 py-2",onClick:N=>o(C)},[d("span",{class:G(["d-inline-block rounded-circle p-1",h(C)]),title:y(C)},null,10,ls),R(" "+x(C.name),1)],8,hs)]))),128))])])):(f(),p("div",ss,is))])}}});const fs=$(us,[["__scopeId","data-v-ac9ee67d"]]),Xe=s=>(ce("data-v-d86c61ce"),s=s(),he(),s),ds={class:"d-flex align-items-center justify-content-center gap-2 mb-4 mt-n3"},ps=Xe(()=>d("span",{class:"badge rounded-pill text-bg-warning"},"Knowledge",-1)),gs={key:0,class:"flex-grow-1"},ys=Xe(()=>d("strong",null,[R("This AI accesses knowledge. Please "),d("a",{href:"/workshop/knowledge"},"set up knowledge"),R(" first.")],-1)),ms=[ys],_s={key:1,class:"flex-grow-1"},ws={key:2,class:"dropdown flex-grow-1"},bs={class:"btn btn-light border dropdown-toggle d-block w-100 text-start",type:"button","data-bs-toggle":"dropdown","aria-expanded":"false"},vs={class:"dropdown-menu w-100 m-0"},ks=["onClick"],As=D({__name:"KnowledgeSelection",props:{knowledges:{},disabled:{type:Boolean}},emits:["select-knowledge"],setup(s,{emit:e}){const{knowledges:t,disabled:n}=s,i=e,r=T(null),o=a=>{i("select-knowledge",a),r.value=a};return t.length&&o(t[0]),(a,h)=>{var y;return f(),p("div",ds,[ps,a.knowledges.length?a.disabled?(f(),p("div",_s,[d("strong",null,x((y=r.value)==null?void 0:y.name),1)])):(f(),p("div",ws,[d("button",bs,x(r.value?r.value.name:"Select Knowledge"),1),d("ul",vs,[(f(!0),p(J,null,ae(a.knowledges,u=>(f(),p("li",{key:u.id},[d("a",{class:"dropdown-item d-flex align-items-center gap-2 py-2",onClick:w=>o(u)},x(u.name),9,ks)]))),128))])])):(f(),p("div",gs,ms))])}}});const Es=$(As,[["__scopeId","data-v-d86c61ce"]]),Ss=s=>(ce("data-v-eb9e7f61"),s=s(),he(),s),Ts={key:0,class:"card mb-2 bg-light"},xs={class:"card-body"},Cs={key:0,class:"card-body"},Rs=["aria-valuenow"],Os=Ss(()=>d("span",{class:"d-none badge text-bg-danger error-badge me-2"},"Error 😩",-1)),Bs={key:1,class:"text-muted"},Ns=D({__name:"MessageHistory",props:{greeting:{},messages:{},progresses:{},queuePositions:{},secondsRemaining:{}},emits:["clear-messages"],setup(s,{emit:e}){const t=e;return(n,i)=>(f(),p(J,null,[n.greeting?(f(),p("div",Ts,[d("div",xs,x(n.greeting),1)])):Y("",!0),(f(!0),p(J,null,ae(n.messages,r=>(f(),p("div",{class:G(["card mb-2",r.author.species==="ai"&&"bg-light"]),key:r.id},[r.status==="writing"&&!r.text?(f(),p("div",Cs,[n.queuePositions[r.id]?(f(),p("small",{key:0,class:"d-block text-muted mb-2"}," Position "+x(n.queuePositions[r.id])+" in queue ",1)):Y("",!0),d("div",{class:"progress",role:"progressbar","aria-label":"Progress","aria-valuenow":n.progresses[r.id],"aria-valuemin":"0","aria-valuemax":"100"},[d("div",{class:"progress-bar",style:et(`width: ${n.progresses[r.id]}%`)},null,4)],8,Rs),n.secondsRemaining[r.id]?(f(),p("small",{key:1,class:"d-block text-muted mt-2"}," About "+x(n.secondsRemaining[r.id])+" seconds left ",1)):Y("",!0)])):(f(),p("div",{key:1,class:G(["card-body",r.status])},[Os,R(x(r.text),1)],2))],2))),128)),n.messages.length?(f(),p("small",Bs,[R(" AI responses may contain inaccurate or inappropriate information. Please check the content carefully before using it. "),d("a",{href:"#",onClick:i[0]||(i[0]=Le(r=>t("clear-messages"),["prevent"]))},"Clear all messages.")])):Y("",!0)],64))}});const Ls=$(Ns,[["__scopeId","data-v-eb9e7f61"]]),Is=["onSubmit"],Ps=["placeholder"],qs=d("button",{type:"submit",class:"btn btn-primary",title:"Send"},[d("svg",{xmlns:"http://www.w3.org/2000/svg",width:"16",height:"16",fill:"currentColor",class:"bi bi-send",viewBox:"0 0 16 16"},[d("path",{d:"M15.854.146a.5.5 0 0 1 .11.54l-5.819 14.547a.75.75 0 0 1-1.329.124l-3.178-4.995L.643 7.184a.75.75 0 0 1 .124-1.33L15.314.037a.5.5 0 0 1 .54.11ZM6.636 10.07l2.761 4.338L14.13 2.576 6.636 10.07Zm6.787-8.201L1.591 6.602l4.339 2.76 7.494-7.493Z"})])],-1),Ds=D({__name:"MessageInput",props:{label:{}},emits:["send-message"],setup(s,{emit:e}){const t=T(""),n=e,i=()=>{n("send-message",t.value),t.value=""},r=o=>{(o.shiftKey||o.ctrlKey||o.metaKey)&&o.code==="Enter"&&i()};return(o,a)=>(f(),p("form",{onSubmit:Le(i,["prevent"]),class:"d-flex my-4 align-items-sm-start flex-column flex-sm-row gap-2"},[tt(d("textarea",{class:"form-control","onUpdate:modelValue":a[0]||(a[0]=h=>t.value=h),placeholder:o.label,required:"",onKeydown:r},null,40,Ps),[[st,t.value]]),qs],40,Is))}});function Ne(s){return s.normalize("NFKD").toLowerCase().trim().replace(/\s+/g,"-").replace(/[^\w\-]+/g,"").replace(/\_/g,"-").replace(/\-\-+/g,"-").replace(/\-$/g,"")}const $s={class:"ainteraction-container"},Ms=D({__name:"Ainteraction",props:{ais:{},knowledges:{}},setup(s){const{ais:e,knowledges:t}=s,n=JSON.parse(e),i=JSON.parse(t),r=T(null),o=T(null),a=nt(),h=it(),y=c=>{r.value=c,h.push({params:{ai:Ne(c.name)}})},u=c=>{o.value=c},w=c=>{if(!c)return;Array.isArray(c)&&(c=c[0]);let m;const S=parseInt(c);Number.isInteger(S)?m=n.find(I=>I.id===S):m=n.find(I=>Ne(I.name)===c),m&&(y(m),ye())};rt(async()=>{w(a.params.ai)}),ot(()=>a.params.ai,w);const b=we(()=>{var c;return!!((c=r.value)!=null&&c.input_keys.includes("input_knowledge"))}),C=we(()=>{var c,m;return((m=(c=r.value)==null?void 0:c.input_labels)==null?void 0:m.input_text)||"Send a message"}),N=T(!1),k=T([]),Q=T(0),L=T([]),qn=T([]),Sn=T([]),Cn=T(null),Dn=()=>Array.from(crypto.getRandomValues(new Uint8Array(16)),c=>c.toString(16).padStart(2,"0")).join(""),M=z();M.on("progress",c=>{L.value.length<=c.messageId||((L.value[c.messageId]=c.progress,qn.value[c.messageId]=c.queuePosition||0,Sn.value[c.messageId]=c.secondsRemaining||0))}),M.on("token",c=>{if(k.value.length<=c.messageId)return;const m=k.value[c.messageId];k.value[c.messageId]={...m,text:m.text+c.text}}),M.on("message",c=>{k.value.length<=c.id||(c.text||(c.text=k.value[c.id].text),k.value[c.id]=c)});const Ze=c=>{var me,_e;N.value=!0;const m={id:Q.value++,author:{species:"human"},date:new Date,text:c,status:"done"},S={id:Q.value++,author:{species:"ai"},date:new Date,text:"",status:"writing"};Cn.value??(Cn.value=Dn());k.value.push(m,S),L.value.push(100,0),qn.value.push(0,0),Sn.value.push(0,0),M.emit("message",{message:m,responseId:S.id,aiId:(me=r.value)==null?void 0:me.id,knowledgeId:(_e=o.value)==null?void 0:_e.id,conversationId:Cn.value})},ye=()=>{Cn.value&&M.emit("clear",{conversationId:Cn.value}),k.value=[],L.value=[],qn.value=[],Sn.value=[],Q.value=0,Cn.value=null,N.value=!1};return(c,m)=>{var S;return f(),p("div",$s,[be(fs,{ais:ve(n),disabled:N.value,"selected-ai":r.value,onSelectAi:y},null,8,["ais","disabled","selected-ai"]),b.value?(f(),ee(Es,{key:0,knowledges:ve(i),disabled:N.value,onSelectKnowledge:u},null,8,["knowledges","disabled"])):Y("",!0),be(Ls,{greeting:(S=r.value)==null?void 0:S.greeting,messages:k.value,progresses:L.value,queuePositions:qn.value,secondsRemaining:Sn.value,onClearMessages:ye},null,8,["greeting","messages","progresses","queuePositions","secondsRemaining"]),r.value&&(!b.value||o.value)?(f(),ee(Ds,{key:1,label:C.value,onSendMessage:Ze},null,8,["label"])):Y("",!0)])}}});const Us=$(Ms,[["__scopeId","data-v-e9009906"]]),Vs={};function Fs(s,e){const t=at("router-view");return f(),ee(t)}const Ks=$(Vs,[["render",Fs]]),Qe=document.querySelector("#ainteraction"),Hs=Qe.dataset.ais,Ws=Qe.dataset.knowledges,zs=ct({history:ht(),routes:[{path:"/:ai?",component:Us,props:{ais:Hs,knowledges:Ws}}]}),je=lt(Ks);je.use(zs);je.mount("#ainteraction");
@@ -13,6 +13,6 @@ We're sorry for that. Please see the server log for more information and contact
 `,s=n.state.doc.line(s.number+(t?1:-1)),r=n.bidiSpans(s),h=v.cursor(t?s.from:s.to)}if(a){if(!a(c))return l}else{if(!i)return h;a=i(c)}l=h}}function dd(n,e,t){let i=n.state.charCategorizer(e),s=i(t);return r=>{let o=i(r);return s==Y.Space&&(s=o),s==o}}function pd(n,e,t,i){let s=e.head,r=t?1:-1;if(s==(t?n.state.doc.length:0))return v.cursor(s,e.assoc);let o=e.goalColumn,l,a=n.contentDOM.getBoundingClientRect(),h=n.coordsAtPos(s,e.assoc||-1),c=n.documentTop;if(h)o==null&&(o=h.left-a.left),l=r<0?h.top:h.bottom;else{let d=n.viewState.lineBlockAt(s);o==null&&(o=Math.min(a.right-a.left,n.defaultCharacterWidth*(s-d.from))),l=(r<0?d.top:d.bottom)+c}let f=a.left+o,u=i??n.viewState.heightOracle.textHeight>>1;for(let d=0;;d+=10){let p=l+(u+d)*r,g=Fh(n,{x:f,y:p},!1,r);if(p<a.top||p>a.bottom||(r<0?g<s:g>s)){let m=n.docView.coordsForChar(g),b=!m||p<m.top?-1:1;return v.cursor(g,b,void 0,o)}}}function Pn(n,e,t){for(;;){let i=0;for(let s of n)s.between(e-1,e+1,(r,o,l)=>{if(e>r&&e<o){let a=i||t||(e-r<o-e?-1:1);e=a<0?r:o,i=a}});if(!i)return e}}function Hs(n,e,t){let i=Pn(n.state.facet(fo).map(s=>s(n)),t.from,e.head>t.from?-1:1);return i==t.from?t:v.cursor(i,i<t.from?1:-1)}class md{setSelectionOrigin(e){this.lastSelectionOrigin=e,this.lastSelectionTime=Date.now()}constructor(e){this.view=e,this.lastKeyCode=0,this.lastKeyTime=0,this.lastTouchTime=0,this.lastFocusTime=0,this.lastScrollTop=0,this.lastScrollLeft=0,this.pendingIOSKey=void 0,this.lastSelectionOrigin=null,this.lastSelectionTime=0,this.lastEscPress=0,this.lastContextMenu=0,this.scrollHandlers=[],this.handlers=Object.create(null),this.composing=-1,this.compositionFirstChange=null,this.compositionEndedAt=0,this.compositionPendingKey=!1,this.compositionPendingChange=!1,this.mouseSelection=null,this.draggedContent=null,this.handleEvent=this.handleEvent.bind(this),this.notifiedFocused=e.hasFocus,B.safari&&e.contentDOM.addEventListener("input",()=>null),B.gecko&&Rd(e.contentDOM.ownerDocument)}handleEvent(e){!Sd(this.view,e)||this.ignoreDuringComposition(e)||e.type=="keydown"&&this.keydown(e)||this.runHandlers(e.type,e)}runHandlers(e,t){let i=this.handlers[e];if(i){for(let s of i.observers)s(this.view,t);for(let s of i.handlers){if(t.defaultPrevented)break;if(s(this.view,t)){t.preventDefault();break}}}}ensureHandlers(e){let t=gd(e),i=this.handlers,s=this.view.contentDOM;for(let r in t)if(r!="scroll"){let o=!t[r].handlers.length,l=i[r];l&&o!=!l.handlers.length&&(s.removeEventListener(r,this.handleEvent),l=null),l||s.addEventListener(r,this.handleEvent,{passive:o})}for(let r in i)r!="scroll"&&!t[r]&&s.removeEventListener(r,this.handleEvent);this.handlers=t}keydown(e){if(this.lastKeyCode=e.keyCode,this.lastKeyTime=Date.now(),e.keyCode==9&&Date.now()<this.lastEscPress+2e3)return!0;if(e.keyCode!=27&&_h.indexOf(e.keyCode)<0&&(this.view.inputState.lastEscPress=0),B.android&&B.chrome&&!e.synthetic&&(e.keyCode==13||e.keyCode==8))return this.view.observer.delayAndroidKey(e.key,e.keyCode),!0;let t;return B.ios&&!e.synthetic&&!e.altKey&&!e.metaKey&&((t=Hh.find(i=>i.keyCode==e.keyCode))&&!e.ctrlKey||yd.indexOf(e.key)>-1&&e.ctrlKey&&!e.shiftKey)?(this.pendingIOSKey=t||e,setTimeout(()=>this.flushIOSKey(),250),!0):(e.keyCode!=229&&this.view.observer.forceFlush(),!1)}flushIOSKey(){let e=this.pendingIOSKey;return e?(this.pendingIOSKey=void 0,ii(this.view.contentDOM,e.key,e.keyCode)):!1}ignoreDuringComposition(e){return/^key/.test(e.type)?this.composing>0?!0:B.safari&&!B.ios&&this.compositionPendingKey&&Date.now()-this.compositionEndedAt<100?(this.compositionPendingKey=!1,!0):!1:!1}startMouseSelection(e){this.mouseSelection&&this.mouseSelection.destroy(),this.mouseSelection=e}update(e){this.mouseSelection&&this.mouseSelection.update(e),this.draggedContent&&e.docChanged&&(this.draggedContent=this.draggedContent.map(e.changes)),e.transactions.length&&(this.lastKeyCode=this.lastSelectionTime=0)}destroy(){this.mouseSelection&&this.mouseSelection.destroy()}}function fl(n,e){return(t,i)=>{try{return e.call(n,i,t)}catch(s){Ie(t.state,s)}}}function gd(n){let e=Object.create(null);function t(i){return e[i]||(e[i]={observers:[],handlers:[]})}for(let i of n){let s=i.spec;if(s&&s.domEventHandlers)for(let r in s.domEventHandlers){let o=s.domEventHandlers[r];o&&t(r).handlers.push(fl(i.value,o))}if(s&&s.domEventObservers)for(let r in s.domEventObservers){let o=s.domEventObservers[r];o&&t(r).observers.push(fl(i.value,o))}}for(let i in je)t(i).handlers.push(je[i]);for(let i in qe)t(i).observers.push(qe[i]);return e}const Hh=[{key:"Backspace",keyCode:8,inputType:"deleteContentBackward"},{key:"Enter",keyCode:13,inputType:"insertParagraph"},{key:"Enter",keyCode:13,inputType:"insertLineBreak"},{key:"Delete",keyCode:46,inputType:"deleteContentForward"}],yd="dthko",_h=[16,17,18,20,91,92,224,225],an=6;function hn(n){return Math.max(0,n)*.7+8}function bd(n,e){return Math.max(Math.abs(n.clientX-e.clientX),Math.abs(n.clientY-e.clientY))}class wd{constructor(e,t,i,s){this.view=e,this.startEvent=t,this.style=i,this.mustSelect=s,this.scrollSpeed={x:0,y:0},this.scrolling=-1,this.lastEvent=t,this.scrollParent=Iu(e.contentDOM),this.atoms=e.state.facet(fo).map(o=>o(e));let r=e.contentDOM.ownerDocument;r.addEventListener("mousemove",this.move=this.move.bind(this)),r.addEventListener("mouseup",this.up=this.up.bind(this)),this.extend=t.shiftKey,this.multiple=e.state.facet(_.allowMultipleSelections)&&vd(e,t),this.dragging=kd(e,t)&&zh(t)==1?null:!1}start(e){this.dragging===!1&&this.select(e)}move(e){var t;if(e.buttons==0)return this.destroy();if(this.dragging||this.dragging==null&&bd(this.startEvent,e)<10)return;this.select(this.lastEvent=e);let i=0,s=0,r=((t=this.scrollParent)===null||t===void 0?void 0:t.getBoundingClientRect())||{left:0,top:0,right:this.view.win.innerWidth,bottom:this.view.win.innerHeight},o=Th(this.view);e.clientX-o.left<=r.left+an?i=-hn(r.left-e.clientX):e.clientX+o.right>=r.right-an&&(i=hn(e.clientX-r.right)),e.clientY-o.top<=r.top+an?s=-hn(r.top-e.clientY):e.clientY+o.bottom>=r.bottom-an&&(s=hn(e.clientY-r.bottom)),this.setScrollSpeed(i,s)}up(e){this.dragging==null&&this.select(this.lastEvent),this.dragging||e.preventDefault(),this.destroy()}destroy(){this.setScrollSpeed(0,0);let e=this.view.contentDOM.ownerDocument;e.removeEventListener("mousemove",this.move),e.removeEventListener("mouseup",this.up),this.view.inputState.mouseSelection=this.view.inputState.draggedContent=null}setScrollSpeed(e,t){this.scrollSpeed={x:e,y:t},e||t?this.scrolling<0&&(this.scrolling=setInterval(()=>this.scroll(),50)):this.scrolling>-1&&(clearInterval(this.scrolling),this.scrolling=-1)}scroll(){this.scrollParent?(this.scrollParent.scrollLeft+=this.scrollSpeed.x,this.scrollParent.scrollTop+=this.scrollSpeed.y):this.view.win.scrollBy(this.scrollSpeed.x,this.scrollSpeed.y),this.dragging===!1&&this.select(this.lastEvent)}skipAtoms(e){let t=null;for(let i=0;i<e.ranges.length;i++){let s=e.ranges[i],r=null;if(s.empty){let o=Pn(this.atoms,s.from,0);o!=s.from&&(r=v.cursor(o,-1))}else{let o=Pn(this.atoms,s.from,-1),l=Pn(this.atoms,s.to,1);(o!=s.from||l!=s.to)&&(r=v.range(s.from==s.anchor?o:l,s.from==s.head?o:l))}r&&(t||(t=e.ranges.slice()),t[i]=r)}return t?v.create(t,e.mainIndex):e}select(e){let{view:t}=this,i=this.skipAtoms(this.style.get(e,this.extend,this.multiple));(this.mustSelect||!i.eq(t.state.selection)||i.main.assoc!=t.state.selection.main.assoc&&this.dragging===!1)&&this.view.dispatch({selection:i,userEvent:"select.pointer"}),this.mustSelect=!1}update(e){this.style.update(e)&&setTimeout(()=>this.select(this.lastEvent),20)}}function vd(n,e){let t=n.state.facet(bh);return t.length?t[0](e):B.mac?e.metaKey:e.ctrlKey}function xd(n,e){let t=n.state.facet(wh);return t.length?t[0](e):B.mac?!e.altKey:!e.ctrlKey}function kd(n,e){let{main:t}=n.state.selection;if(t.empty)return!1;let i=qn(n.root);if(!i||i.rangeCount==0)return!0;let s=i.getRangeAt(0).getClientRects();for(let r=0;r<s.length;r++){let o=s[r];if(o.left<=e.clientX&&o.right>=e.clientX&&o.top<=e.clientY&&o.bottom>=e.clientY)return!0}return!1}function Sd(n,e){if(!e.bubbles)return!0;if(e.defaultPrevented)return!1;for(let t=e.target,i;t!=n.contentDOM;t=t.parentNode)if(!t||t.nodeType==11||(i=U.get(t))&&i.ignoreEvent(e))return!1;return!0}const je=Object.create(null),qe=Object.create(null),Vh=B.ie&&B.ie_version<15||B.ios&&B.webkit_version<604;function Cd(n){let e=n.dom.parentNode;if(!e)return;let t=e.appendChild(document.createElement("textarea"));t.style.cssText="position: fixed; left: -10000px; top: 10px",t.focus(),setTimeout(()=>{n.focus(),t.remove(),Wh(n,t.value)},50)}function Wh(n,e){let{state:t}=n,i,s=1,r=t.toText(e),o=r.lines==t.selection.ranges.length;if(Lr!=null&&t.selection.ranges.every(a=>a.empty)&&Lr==r.toString()){let a=-1;i=t.changeByRange(h=>{let c=t.doc.lineAt(h.from);if(c.from==a)return{range:h};a=c.from;let f=t.toText((o?r.line(s++).text:e)+t.lineBreak);return{changes:{from:c.from,insert:f},range:v.cursor(h.from+f.length)}})}else o?i=t.changeByRange(a=>{let h=r.line(s++);return{changes:{from:a.from,to:a.to,insert:h.text},range:v.cursor(a.from+h.length)}}):i=t.replaceSelection(r);n.dispatch(i,{userEvent:"input.paste",scrollIntoView:!0})}qe.scroll=n=>{n.inputState.lastScrollTop=n.scrollDOM.scrollTop,n.inputState.lastScrollLeft=n.scrollDOM.scrollLeft};je.keydown=(n,e)=>(n.inputState.setSelectionOrigin("select"),e.keyCode==27&&(n.inputState.lastEscPress=Date.now()),!1);qe.touchstart=(n,e)=>{n.inputState.lastTouchTime=Date.now(),n.inputState.setSelectionOrigin("select.pointer")};qe.touchmove=n=>{n.inputState.setSelectionOrigin("select.pointer")};je.mousedown=(n,e)=>{if(n.observer.flush(),n.inputState.lastTouchTime>Date.now()-2e3)return!1;let t=null;for(let i of n.state.facet(vh))if(t=i(n,e),t)break;if(!t&&e.button==0&&(t=Od(n,e)),t){let i=!n.hasFocus;n.inputState.startMouseSelection(new wd(n,e,t,i)),i&&n.observer.ignore(()=>oh(n.contentDOM));let s=n.inputState.mouseSelection;if(s)return s.start(e),s.dragging===!1}return!1};function ul(n,e,t,i){if(i==1)return v.cursor(e,t);if(i==2)return ld(n.state,e,t);{let s=re.find(n.docView,e),r=n.state.doc.lineAt(s?s.posAtEnd:e),o=s?s.posAtStart:r.from,l=s?s.posAtEnd:r.to;return l<n.state.doc.length&&l==r.to&&l++,v.range(o,l)}}let $h=(n,e)=>n>=e.top&&n<=e.bottom,dl=(n,e,t)=>$h(e,t)&&n>=t.left&&n<=t.right;function Ad(n,e,t,i){let s=re.find(n.docView,e);if(!s)return 1;let r=e-s.posAtStart;if(r==0)return 1;if(r==s.length)return-1;let o=s.coordsAt(r,-1);if(o&&dl(t,i,o))return-1;let l=s.coordsAt(r,1);return l&&dl(t,i,l)?1:o&&$h(i,o)?-1:1}function pl(n,e){let t=n.posAtCoords({x:e.clientX,y:e.clientY},!1);return{pos:t,bias:Ad(n,t,e.clientX,e.clientY)}}const Md=B.ie&&B.ie_version<=11;let ml=null,gl=0,yl=0;function zh(n){if(!Md)return n.detail;let e=ml,t=yl;return ml=n,yl=Date.now(),gl=!e||t>Date.now()-400&&Math.abs(e.clientX-n.clientX)<2&&Math.abs(e.clientY-n.clientY)<2?(gl+1)%3:1}function Od(n,e){let t=pl(n,e),i=zh(e),s=n.state.selection;return{update(r){r.docChanged&&(t.pos=r.changes.mapPos(t.pos),s=s.map(r.changes))},get(r,o,l){let a=pl(n,r),h,c=ul(n,a.pos,a.bias,i);if(t.pos!=a.pos&&!o){let f=ul(n,t.pos,t.bias,i),u=Math.min(f.from,c.from),d=Math.max(f.to,c.to);c=u<c.from?v.range(u,d):v.range(d,u)}return o?s.replaceRange(s.main.extend(c.from,c.to)):l&&i==1&&s.ranges.length>1&&(h=Dd(s,a.pos))?h:l?s.addRange(c):v.create([c])}}}function Dd(n,e){for(let t=0;t<n.ranges.length;t++){let{from:i,to:s}=n.ranges[t];if(i<=e&&s>=e)return v.create(n.ranges.slice(0,t).concat(n.ranges.slice(t+1)),n.mainIndex==t?0:n.mainIndex-(n.mainIndex>t?1:0))}return null}je.dragstart=(n,e)=>{let{selection:{main:t}}=n.state;if(e.target.draggable){let s=n.docView.nearest(e.target);if(s&&s.isWidget){let r=s.posAtStart,o=r+s.length;(r>=t.to||o<=t.from)&&(t=v.range(r,o))}}let{inputState:i}=n;return i.mouseSelection&&(i.mouseSelection.dragging=!0),i.draggedContent=t,e.dataTransfer&&(e.dataTransfer.setData("Text",n.state.sliceDoc(t.from,t.to)),e.dataTransfer.effectAllowed="copyMove"),!1};je.dragend=n=>(n.inputState.draggedContent=null,!1);function bl(n,e,t,i){if(!t)return;let s=n.posAtCoords({x:e.clientX,y:e.clientY},!1),{draggedContent:r}=n.inputState,o=i&&r&&xd(n,e)?{from:r.from,to:r.to}:null,l={from:s,insert:t},a=n.state.changes(o?[o,l]:l);n.focus(),n.dispatch({changes:a,selection:{anchor:a.mapPos(s,-1),head:a.mapPos(s,1)},userEvent:o?"move.drop":"input.drop"}),n.inputState.draggedContent=null}je.drop=(n,e)=>{if(!e.dataTransfer)return!1;if(n.state.readOnly)return!0;let t=e.dataTransfer.files;if(t&&t.length){let i=Array(t.length),s=0,r=()=>{++s==t.length&&bl(n,e,i.filter(o=>o!=null).join(n.state.lineBreak),!1)};for(let o=0;o<t.length;o++){let l=new FileReader;l.onerror=r,l.onload=()=>{/[\x00-\x08\x0e-\x1f]{2}/.test(l.result)||(i[o]=l.result),r()},l.readAsText(t[o])}return!0}else{let i=e.dataTransfer.getData("Text");if(i)return bl(n,e,i,!0),!0}return!1};je.paste=(n,e)=>{if(n.state.readOnly)return!0;n.observer.flush();let t=Vh?null:e.clipboardData;return t?(Wh(n,t.getData("text/plain")||t.getData("text/uri-text")),!0):(Cd(n),!1)};function Td(n,e){let t=n.dom.parentNode;if(!t)return;let i=t.appendChild(document.createElement("textarea"));i.style.cssText="position: fixed; left: -10000px; top: 10px",i.value=e,i.focus(),i.selectionEnd=e.length,i.selectionStart=0,setTimeout(()=>{i.remove(),n.focus()},50)}function Pd(n){let e=[],t=[],i=!1;for(let s of n.selection.ranges)s.empty||(e.push(n.sliceDoc(s.from,s.to)),t.push(s));if(!e.length){let s=-1;for(let{from:r}of n.selection.ranges){let o=n.doc.lineAt(r);o.number>s&&(e.push(o.text),t.push({from:o.from,to:Math.min(n.doc.length,o.to+1)})),s=o.number}i=!0}return{text:e.join(n.lineBreak),ranges:t,linewise:i}}let Lr=null;je.copy=je.cut=(n,e)=>{let{text:t,ranges:i,linewise:s}=Pd(n.state);if(!t&&!s)return!1;Lr=s?t:null,e.type=="cut"&&!n.state.readOnly&&n.dispatch({changes:i,scrollIntoView:!0,userEvent:"delete.cut"});let r=Vh?null:e.clipboardData;return r?(r.clearData(),r.setData("text/plain",t),!0):(Td(n,t),!1)};const jh=dt.define();function qh(n,e){let t=[];for(let i of n.facet(Sh)){let s=i(n,e);s&&t.push(s)}return t?n.update({effects:t,annotations:jh.of(!0)}):null}function Kh(n){setTimeout(()=>{let e=n.hasFocus;if(e!=n.inputState.notifiedFocused){let t=qh(n.state,e);t?n.dispatch(t):n.update([])}},10)}qe.focus=n=>{n.inputState.lastFocusTime=Date.now(),!n.scrollDOM.scrollTop&&(n.inputState.lastScrollTop||n.inputState.lastScrollLeft)&&(n.scrollDOM.scrollTop=n.inputState.lastScrollTop,n.scrollDOM.scrollLeft=n.inputState.lastScrollLeft),Kh(n)};qe.blur=n=>{n.observer.clearSelectionRange(),Kh(n)};qe.compositionstart=qe.compositionupdate=n=>{n.inputState.compositionFirstChange==null&&(n.inputState.compositionFirstChange=!0),n.inputState.composing<0&&(n.inputState.composing=0)};qe.compositionend=n=>{n.inputState.composing=-1,n.inputState.compositionEndedAt=Date.now(),n.inputState.compositionPendingKey=!0,n.inputState.compositionPendingChange=n.observer.pendingRecords().length>0,n.inputState.compositionFirstChange=null,B.chrome&&B.android?n.observer.flushSoon():n.inputState.compositionPendingChange?Promise.resolve().then(()=>n.observer.flush()):setTimeout(()=>{n.inputState.composing<0&&n.docView.hasComposition&&n.update([])},50)};qe.contextmenu=n=>{n.inputState.lastContextMenu=Date.now()};je.beforeinput=(n,e)=>{var t;let i;if(B.chrome&&B.android&&(i=Hh.find(s=>s.inputType==e.inputType))&&(n.observer.delayAndroidKey(i.key,i.keyCode),i.key=="Backspace"||i.key=="Delete")){let s=((t=window.visualViewport)===null||t===void 0?void 0:t.height)||0;setTimeout(()=>{var r;(((r=window.visualViewport)===null||r===void 0?void 0:r.height)||0)>s+10&&n.hasFocus&&(n.contentDOM.blur(),n.focus())},100)}return!1};const wl=new Set;function Rd(n){wl.has(n)||(wl.add(n),n.addEventListener("copy",()=>{}),n.addEventListener("cut",()=>{}))}const vl=["pre-wrap","normal","pre-line","break-spaces"];class Bd{constructor(e){this.lineWrapping=e,this.doc=W.empty,this.heightSamples={},this.lineHeight=14,this.charWidth=7,this.textHeight=14,this.lineLength=30,this.heightChanged=!1}heightForGap(e,t){let i=this.doc.lineAt(t).number-this.doc.lineAt(e).number+1;return this.lineWrapping&&(i+=Math.max(0,Math.ceil((t-e-i*this.lineLength*.5)/this.lineLength))),this.lineHeight*i}heightForLine(e){return this.lineWrapping?(1+Math.max(0,Math.ceil((e-this.lineLength)/(this.lineLength-5))))*this.lineHeight:this.lineHeight}setDoc(e){return this.doc=e,this}mustRefreshForWrapping(e){return vl.indexOf(e)>-1!=this.lineWrapping}mustRefreshForHeights(e){let t=!1;for(let i=0;i<e.length;i++){let s=e[i];s<0?i++:this.heightSamples[Math.floor(s*10)]||(t=!0,this.heightSamples[Math.floor(s*10)]=!0)}return t}refresh(e,t,i,s,r,o){let l=vl.indexOf(e)>-1,a=Math.round(t)!=Math.round(this.lineHeight)||this.lineWrapping!=l;if(this.lineWrapping=l,this.lineHeight=t,this.charWidth=i,this.textHeight=s,this.lineLength=r,a){this.heightSamples={};for(let h=0;h<o.length;h++){let c=o[h];c<0?h++:this.heightSamples[Math.floor(c*10)]=!0}}return a}}class Ld{constructor(e,t){this.from=e,this.heights=t,this.index=0}get more(){return this.index<this.heights.length}}class et{constructor(e,t,i,s,r){this.from=e,this.length=t,this.top=i,this.height=s,this._content=r}get type(){return typeof this._content=="number"?Se.Text:Array.isArray(this._content)?this._content:this._content.type}get to(){return this.from+this.length}get bottom(){return this.top+this.height}get widget(){return this._content instanceof Ot?this._content.widget:null}get widgetLineBreaks(){return typeof this._content=="number"?this._content:0}join(e){let t=(Array.isArray(this._content)?this._content:[this]).concat(Array.isArray(e._content)?e._content:[e]);return new et(this.from,this.length+e.length,this.top,this.height+e.height,t)}}var K=function(n){return n[n.ByPos=0]="ByPos",n[n.ByHeight=1]="ByHeight",n[n.ByPosNoHeight=2]="ByPosNoHeight",n}(K||(K={}));const Rn=.001;class Ce{constructor(e,t,i=2){this.length=e,this.height=t,this.flags=i}get outdated(){return(this.flags&2)>0}set outdated(e){this.flags=(e?2:0)|this.flags&-3}setHeight(e,t){this.height!=t&&(Math.abs(this.height-t)>Rn&&(e.heightChanged=!0),this.height=t)}replace(e,t,i){return Ce.of(i)}decomposeLeft(e,t){t.push(this)}decomposeRight(e,t){t.push(this)}applyChanges(e,t,i,s){let r=this,o=i.doc;for(let l=s.length-1;l>=0;l--){let{fromA:a,toA:h,fromB:c,toB:f}=s[l],u=r.lineAt(a,K.ByPosNoHeight,i.setDoc(t),0,0),d=u.to>=h?u:r.lineAt(h,K.ByPosNoHeight,i,0,0);for(f+=d.to-h,h=d.to;l>0&&u.from<=s[l-1].toA;)a=s[l-1].fromA,c=s[l-1].fromB,l--,a<u.from&&(u=r.lineAt(a,K.ByPosNoHeight,i,0,0));c+=u.from-a,a=u.from;let p=uo.build(i.setDoc(o),e,c,f);r=r.replace(a,h,p)}return r.updateHeight(i,0)}static empty(){return new Re(0,0)}static of(e){if(e.length==1)return e[0];let t=0,i=e.length,s=0,r=0;for(;;)if(t==i)if(s>r*2){let l=e[t-1];l.break?e.splice(--t,1,l.left,null,l.right):e.splice(--t,1,l.left,l.right),i+=1+l.break,s-=l.size}else if(r>s*2){let l=e[i];l.break?e.splice(i,1,l.left,null,l.right):e.splice(i,1,l.left,l.right),i+=2+l.break,r-=l.size}else break;else if(s<r){let l=e[t++];l&&(s+=l.size)}else{let l=e[--i];l&&(r+=l.size)}let o=0;return e[t-1]==null?(o=1,t--):e[t]==null&&(o=1,i++),new Ed(Ce.of(e.slice(0,t)),o,Ce.of(e.slice(i)))}}Ce.prototype.size=1;class Uh extends Ce{constructor(e,t,i){super(e,t),this.deco=i}blockAt(e,t,i,s){return new et(s,this.length,i,this.height,this.deco||0)}lineAt(e,t,i,s,r){return this.blockAt(0,i,s,r)}forEachLine(e,t,i,s,r,o){e<=r+this.length&&t>=r&&o(this.blockAt(0,i,s,r))}updateHeight(e,t=0,i=!1,s){return s&&s.from<=t&&s.more&&this.setHeight(e,s.heights[s.index++]),this.outdated=!1,this}toString(){return`block(${this.length})`}}class Re extends Uh{constructor(e,t){super(e,t,null),this.collapsed=0,this.widgetHeight=0,this.breaks=0}blockAt(e,t,i,s){return new et(s,this.length,i,this.height,this.breaks)}replace(e,t,i){let s=i[0];return i.length==1&&(s instanceof Re||s instanceof ce&&s.flags&4)&&Math.abs(this.length-s.length)<10?(s instanceof ce?s=new Re(s.length,this.height):s.height=this.height,this.outdated||(s.outdated=!1),s):Ce.of(i)}updateHeight(e,t=0,i=!1,s){return s&&s.from<=t&&s.more?this.setHeight(e,s.heights[s.index++]):(i||this.outdated)&&this.setHeight(e,Math.max(this.widgetHeight,e.heightForLine(this.length-this.collapsed))+this.breaks*e.lineHeight),this.outdated=!1,this}toString(){return`line(${this.length}${this.collapsed?-this.collapsed:""}${this.widgetHeight?":"+this.widgetHeight:""})`}}class ce extends Ce{constructor(e){super(e,0)}heightMetrics(e,t){let i=e.doc.lineAt(t).number,s=e.doc.lineAt(t+this.length).number,r=s-i+1,o,l=0;if(e.lineWrapping){let a=Math.min(this.height,e.lineHeight*r);o=a/r,this.length>r+1&&(l=(this.height-a)/(this.length-r-1))}else o=this.height/r;return{firstLine:i,lastLine:s,perLine:o,perChar:l}}blockAt(e,t,i,s){let{firstLine:r,lastLine:o,perLine:l,perChar:a}=this.heightMetrics(t,s);if(t.lineWrapping){let h=s+Math.round(Math.max(0,Math.min(1,(e-i)/this.height))*this.length),c=t.doc.lineAt(h),f=l+c.length*a,u=Math.max(i,e-f/2);return new et(c.from,c.length,u,f,0)}else{let h=Math.max(0,Math.min(o-r,Math.floor((e-i)/l))),{from:c,length:f}=t.doc.line(r+h);return new et(c,f,i+l*h,l,0)}}lineAt(e,t,i,s,r){if(t==K.ByHeight)return this.blockAt(e,i,s,r);if(t==K.ByPosNoHeight){let{from:d,to:p}=i.doc.lineAt(e);return new et(d,p-d,0,0,0)}let{firstLine:o,perLine:l,perChar:a}=this.heightMetrics(i,r),h=i.doc.lineAt(e),c=l+h.length*a,f=h.number-o,u=s+l*f+a*(h.from-r-f);return new et(h.from,h.length,Math.max(s,Math.min(u,s+this.height-c)),c,0)}forEachLine(e,t,i,s,r,o){e=Math.max(e,r),t=Math.min(t,r+this.length);let{firstLine:l,perLine:a,perChar:h}=this.heightMetrics(i,r);for(let c=e,f=s;c<=t;){let u=i.doc.lineAt(c);if(c==e){let p=u.number-l;f+=a*p+h*(e-r-p)}let d=a+h*u.length;o(new et(u.from,u.length,f,d,0)),f+=d,c=u.to+1}}replace(e,t,i){let s=this.length-t;if(s>0){let r=i[i.length-1];r instanceof ce?i[i.length-1]=new ce(r.length+s):i.push(null,new ce(s-1))}if(e>0){let r=i[0];r instanceof ce?i[0]=new ce(e+r.length):i.unshift(new ce(e-1),null)}return Ce.of(i)}decomposeLeft(e,t){t.push(new ce(e-1),null)}decomposeRight(e,t){t.push(null,new ce(this.length-e-1))}updateHeight(e,t=0,i=!1,s){let r=t+this.length;if(s&&s.from<=t+this.length&&s.more){let o=[],l=Math.max(t,s.from),a=-1;for(s.from>t&&o.push(new ce(s.from-t-1).updateHeight(e,t));l<=r&&s.more;){let c=e.doc.lineAt(l).length;o.length&&o.push(null);let f=s.heights[s.index++];a==-1?a=f:Math.abs(f-a)>=Rn&&(a=-2);let u=new Re(c,f);u.outdated=!1,o.push(u),l+=c+1}l<=r&&o.push(null,new ce(r-l).updateHeight(e,l));let h=Ce.of(o);return(a<0||Math.abs(h.height-this.height)>=Rn||Math.abs(a-this.heightMetrics(e,t).perLine)>=Rn)&&(e.heightChanged=!0),h}else(i||this.outdated)&&(this.setHeight(e,e.heightForGap(t,t+this.length)),this.outdated=!1);return this}toString(){return`gap(${this.length})`}}class Ed extends Ce{constructor(e,t,i){super(e.length+t+i.length,e.height+i.height,t|(e.outdated||i.outdated?2:0)),this.left=e,this.right=i,this.size=e.size+i.size}get break(){return this.flags&1}blockAt(e,t,i,s){let r=i+this.left.height;return e<r?this.left.blockAt(e,t,i,s):this.right.blockAt(e,t,r,s+this.left.length+this.break)}lineAt(e,t,i,s,r){let o=s+this.left.height,l=r+this.left.length+this.break,a=t==K.ByHeight?e<o:e<l,h=a?this.left.lineAt(e,t,i,s,r):this.right.lineAt(e,t,i,o,l);if(this.break||(a?h.to<l:h.from>l))return h;let c=t==K.ByPosNoHeight?K.ByPosNoHeight:K.ByPos;return a?h.join(this.right.lineAt(l,c,i,o,l)):this.left.lineAt(l,c,i,s,r).join(h)}forEachLine(e,t,i,s,r,o){let l=s+this.left.height,a=r+this.left.length+this.break;if(this.break)e<a&&this.left.forEachLine(e,t,i,s,r,o),t>=a&&this.right.forEachLine(e,t,i,l,a,o);else{let h=this.lineAt(a,K.ByPos,i,s,r);e<h.from&&this.left.forEachLine(e,h.from-1,i,s,r,o),h.to>=e&&h.from<=t&&o(h),t>h.to&&this.right.forEachLine(h.to+1,t,i,l,a,o)}}replace(e,t,i){let s=this.left.length+this.break;if(t<s)return this.balanced(this.left.replace(e,t,i),this.right);if(e>this.left.length)return this.balanced(this.left,this.right.replace(e-s,t-s,i));let r=[];e>0&&this.decomposeLeft(e,r);let o=r.length;for(let l of i)r.push(l);if(e>0&&xl(r,o-1),t<this.length){let l=r.length;this.decomposeRight(t,r),xl(r,l)}return Ce.of(r)}decomposeLeft(e,t){let i=this.left.length;if(e<=i)return this.left.decomposeLeft(e,t);t.push(this.left),this.break&&(i++,e>=i&&t.push(null)),e>i&&this.right.decomposeLeft(e-i,t)}decomposeRight(e,t){let i=this.left.length,s=i+this.break;if(e>=s)return this.right.decomposeRight(e-s,t);e<i&&this.left.decomposeRight(e,t),this.break&&e<s&&t.push(null),t.push(this.right)}balanced(e,t){return e.size>2*t.size||t.size>2*e.size?Ce.of(this.break?[e,null,t]:[e,t]):(this.left=e,this.right=t,this.height=e.height+t.height,this.outdated=e.outdated||t.outdated,this.size=e.size+t.size,this.length=e.length+this.break+t.length,this)}updateHeight(e,t=0,i=!1,s){let{left:r,right:o}=this,l=t+r.length+this.break,a=null;return s&&s.from<=t+r.length&&s.more?a=r=r.updateHeight(e,t,i,s):r.updateHeight(e,t,i),s&&s.from<=l+o.length&&s.more?a=o=o.updateHeight(e,l,i,s):o.updateHeight(e,l,i),a?this.balanced(r,o):(this.height=this.left.height+this.right.height,this.outdated=!1,this)}toString(){return this.left+(this.break?" ":"-")+this.right}}function xl(n,e){let t,i;n[e]==null&&(t=n[e-1])instanceof ce&&(i=n[e+1])instanceof ce&&n.splice(e-1,3,new ce(t.length+1+i.length))}const Id=5;class uo{constructor(e,t){this.pos=e,this.oracle=t,this.nodes=[],this.lineStart=-1,this.lineEnd=-1,this.covering=null,this.writtenTo=e}get isCovered(){return this.covering&&this.nodes[this.nodes.length-1]==this.covering}span(e,t){if(this.lineStart>-1){let i=Math.min(t,this.lineEnd),s=this.nodes[this.nodes.length-1];s instanceof Re?s.length+=i-this.pos:(i>this.pos||!this.isCovered)&&this.nodes.push(new Re(i-this.pos,-1)),this.writtenTo=i,t>i&&(this.nodes.push(null),this.writtenTo++,this.lineStart=-1)}this.pos=t}point(e,t,i){if(e<t||i.heightRelevant){let s=i.widget?i.widget.estimatedHeight:0,r=i.widget?i.widget.lineBreaks:0;s<0&&(s=this.oracle.lineHeight);let o=t-e;i.block?this.addBlock(new Uh(o,s,i)):(o||r||s>=Id)&&this.addLineDeco(s,r,o)}else t>e&&this.span(e,t);this.lineEnd>-1&&this.lineEnd<this.pos&&(this.lineEnd=this.oracle.doc.lineAt(this.pos).to)}enterLine(){if(this.lineStart>-1)return;let{from:e,to:t}=this.oracle.doc.lineAt(this.pos);this.lineStart=e,this.lineEnd=t,this.writtenTo<e&&((this.writtenTo<e-1||this.nodes[this.nodes.length-1]==null)&&this.nodes.push(this.blankContent(this.writtenTo,e-1)),this.nodes.push(null)),this.pos>e&&this.nodes.push(new Re(this.pos-e,-1)),this.writtenTo=this.pos}blankContent(e,t){let i=new ce(t-e);return this.oracle.doc.lineAt(e).to==t&&(i.flags|=4),i}ensureLine(){this.enterLine();let e=this.nodes.length?this.nodes[this.nodes.length-1]:null;if(e instanceof Re)return e;let t=new Re(0,-1);return this.nodes.push(t),t}addBlock(e){this.enterLine();let t=e.deco;t&&t.startSide>0&&!this.isCovered&&this.ensureLine(),this.nodes.push(e),this.writtenTo=this.pos=this.pos+e.length,t&&t.endSide>0&&(this.covering=e)}addLineDeco(e,t,i){let s=this.ensureLine();s.length+=i,s.collapsed+=i,s.widgetHeight=Math.max(s.widgetHeight,e),s.breaks+=t,this.writtenTo=this.pos=this.pos+i}finish(e){let t=this.nodes.length==0?null:this.nodes[this.nodes.length-1];this.lineStart>-1&&!(t instanceof Re)&&!this.isCovered?this.nodes.push(new Re(0,-1)):(this.writtenTo<this.pos||t==null)&&this.nodes.push(this.blankContent(this.writtenTo,this.pos));let i=e;for(let s of this.nodes)s instanceof Re&&s.updateHeight(this.oracle,i),i+=s?s.length:1;return this.nodes}static build(e,t,i,s){let r=new uo(i,e);return V.spans(t,i,s,r,0),r.finish(i)}}function Nd(n,e,t){let i=new Fd;return V.compare(n,e,t,i,0),i.changes}class Fd{constructor(){this.changes=[]}compareRange(){}comparePoint(e,t,i,s){(e<t||i&&i.heightRelevant||s&&s.heightRelevant)&&Mr(e,t,this.changes,5)}}function Hd(n,e){let t=n.getBoundingClientRect(),i=n.ownerDocument,s=i.defaultView||window,r=Math.max(0,t.left),o=Math.min(s.innerWidth,t.right),l=Math.max(0,t.top),a=Math.min(s.innerHeight,t.bottom);for(let h=n.parentNode;h&&h!=i.body;)if(h.nodeType==1){let c=h,f=window.getComputedStyle(c);if((c.scrollHeight>c.clientHeight||c.scrollWidth>c.clientWidth)&&f.overflow!="visible"){let u=c.getBoundingClientRect();r=Math.max(r,u.left),o=Math.min(o,u.right),l=Math.max(l,u.top),a=h==n.parentNode?u.bottom:Math.min(a,u.bottom)}h=f.position=="absolute"||f.position=="fixed"?c.offsetParent:c.parentNode}else if(h.nodeType==11)h=h.host;else break;return{left:r-t.left,right:Math.max(r,o)-t.left,top:l-(t.top+e),bottom:Math.max(l,a)-(t.top+e)}}function _d(n,e){let t=n.getBoundingClientRect();return{left:0,right:t.right-t.left,top:e,bottom:t.bottom-(t.top+e)}}class _s{constructor(e,t,i){this.from=e,this.to=t,this.size=i}static same(e,t){if(e.length!=t.length)return!1;for(let i=0;i<e.length;i++){let s=e[i],r=t[i];if(s.from!=r.from||s.to!=r.to||s.size!=r.size)return!1}return!0}draw(e,t){return E.replace({widget:new Vd(this.size*(t?e.scaleY:e.scaleX),t)}).range(this.from,this.to)}}class Vd extends Tt{constructor(e,t){super(),this.size=e,this.vertical=t}eq(e){return e.size==this.size&&e.vertical==this.vertical}toDOM(){let e=document.createElement("div");return this.vertical?e.style.height=this.size+"px":(e.style.width=this.size+"px",e.style.height="2px",e.style.display="inline-block"),e}get estimatedHeight(){return this.vertical?this.size:-1}}class kl{constructor(e){this.state=e,this.pixelViewport={left:0,right:window.innerWidth,top:0,bottom:0},this.inView=!0,this.paddingTop=0,this.paddingBottom=0,this.contentDOMWidth=0,this.contentDOMHeight=0,this.editorHeight=0,this.editorWidth=0,this.scrollTop=0,this.scrolledToBottom=!0,this.scaleX=1,this.scaleY=1,this.scrollAnchorPos=0,this.scrollAnchorHeight=-1,this.scaler=Sl,this.scrollTarget=null,this.printing=!1,this.mustMeasureContent=!0,this.defaultTextDirection=X.LTR,this.visibleRanges=[],this.mustEnforceCursorAssoc=!1;let t=e.facet(co).some(i=>typeof i!="function"&&i.class=="cm-lineWrapping");this.heightOracle=new Bd(t),this.stateDeco=e.facet(Vi).filter(i=>typeof i!="function"),this.heightMap=Ce.empty().applyChanges(this.stateDeco,W.empty,this.heightOracle.setDoc(e.doc),[new He(0,0,0,e.doc.length)]),this.viewport=this.getViewport(0,null),this.updateViewportLines(),this.updateForViewport(),this.lineGaps=this.ensureLineGaps([]),this.lineGapDeco=E.set(this.lineGaps.map(i=>i.draw(this,!1))),this.computeVisibleRanges()}updateForViewport(){let e=[this.viewport],{main:t}=this.state.selection;for(let i=0;i<=1;i++){let s=i?t.head:t.anchor;if(!e.some(({from:r,to:o})=>s>=r&&s<=o)){let{from:r,to:o}=this.lineBlockAt(s);e.push(new cn(r,o))}}this.viewports=e.sort((i,s)=>i.from-s.from),this.scaler=this.heightMap.height<=7e6?Sl:new zd(this.heightOracle,this.heightMap,this.viewports)}updateViewportLines(){this.viewportLines=[],this.heightMap.forEachLine(this.viewport.from,this.viewport.to,this.heightOracle.setDoc(this.state.doc),0,0,e=>{this.viewportLines.push(this.scaler.scale==1?e:Mi(e,this.scaler))})}update(e,t=null){this.state=e.state;let i=this.stateDeco;this.stateDeco=this.state.facet(Vi).filter(c=>typeof c!="function");let s=e.changedRanges,r=He.extendWithRanges(s,Nd(i,this.stateDeco,e?e.changes:oe.empty(this.state.doc.length))),o=this.heightMap.height,l=this.scrolledToBottom?null:this.scrollAnchorAt(this.scrollTop);this.heightMap=this.heightMap.applyChanges(this.stateDeco,e.startState.doc,this.heightOracle.setDoc(this.state.doc),r),this.heightMap.height!=o&&(e.flags|=2),l?(this.scrollAnchorPos=e.changes.mapPos(l.from,-1),this.scrollAnchorHeight=l.top):(this.scrollAnchorPos=-1,this.scrollAnchorHeight=this.heightMap.height);let a=r.length?this.mapViewport(this.viewport,e.changes):this.viewport;(t&&(t.range.head<a.from||t.range.head>a.to)||!this.viewportIsAppropriate(a))&&(a=this.getViewport(0,t));let h=!e.changes.empty||e.flags&2||a.from!=this.viewport.from||a.to!=this.viewport.to;this.viewport=a,this.updateForViewport(),h&&this.updateViewportLines(),(this.lineGaps.length||this.viewport.to-this.viewport.from>4e3)&&this.updateLineGaps(this.ensureLineGaps(this.mapLineGaps(this.lineGaps,e.changes))),e.flags|=this.computeVisibleRanges(),t&&(this.scrollTarget=t),!this.mustEnforceCursorAssoc&&e.selectionSet&&e.view.lineWrapping&&e.state.selection.main.empty&&e.state.selection.main.assoc&&!e.state.facet(Ah)&&(this.mustEnforceCursorAssoc=!0)}measure(e){let t=e.contentDOM,i=window.getComputedStyle(t),s=this.heightOracle,r=i.whiteSpace;this.defaultTextDirection=i.direction=="rtl"?X.RTL:X.LTR;let o=this.heightOracle.mustRefreshForWrapping(r),l=t.getBoundingClientRect(),a=o||this.mustMeasureContent||this.contentDOMHeight!=l.height;this.contentDOMHeight=l.height,this.mustMeasureContent=!1;let h=0,c=0;if(l.width&&l.height){let x=l.width/t.offsetWidth,y=l.height/t.offsetHeight;(x>.995&&x<1.005||!isFinite(x)||Math.abs(l.width-t.offsetWidth)<1)&&(x=1),(y>.995&&y<1.005||!isFinite(y)||Math.abs(l.height-t.offsetHeight)<1)&&(y=1),(this.scaleX!=x||this.scaleY!=y)&&(this.scaleX=x,this.scaleY=y,h|=8,o=a=!0)}let f=(parseInt(i.paddingTop)||0)*this.scaleY,u=(parseInt(i.paddingBottom)||0)*this.scaleY;(this.paddingTop!=f||this.paddingBottom!=u)&&(this.paddingTop=f,this.paddingBottom=u,h|=10),this.editorWidth!=e.scrollDOM.clientWidth&&(s.lineWrapping&&(a=!0),this.editorWidth=e.scrollDOM.clientWidth,h|=8);let d=e.scrollDOM.scrollTop*this.scaleY;this.scrollTop!=d&&(this.scrollAnchorHeight=-1,this.scrollTop=d),this.scrolledToBottom=ah(e.scrollDOM);let p=(this.printing?_d:Hd)(t,this.paddingTop),g=p.top-this.pixelViewport.top,m=p.bottom-this.pixelViewport.bottom;this.pixelViewport=p;let b=this.pixelViewport.bottom>this.pixelViewport.top&&this.pixelViewport.right>this.pixelViewport.left;if(b!=this.inView&&(this.inView=b,b&&(a=!0)),!this.inView&&!this.scrollTarget)return 0;let k=l.width;if((this.contentDOMWidth!=k||this.editorHeight!=e.scrollDOM.clientHeight)&&(this.contentDOMWidth=l.width,this.editorHeight=e.scrollDOM.clientHeight,h|=8),a){let x=e.docView.measureVisibleLineHeights(this.viewport);if(s.mustRefreshForHeights(x)&&(o=!0),o||s.lineWrapping&&Math.abs(k-this.contentDOMWidth)>s.charWidth){let{lineHeight:y,charWidth:w,textHeight:C}=e.docView.measureTextSize();o=y>0&&s.refresh(r,y,w,C,k/w,x),o&&(e.docView.minWidth=0,h|=8)}g>0&&m>0?c=Math.max(g,m):g<0&&m<0&&(c=Math.min(g,m)),s.heightChanged=!1;for(let y of this.viewports){let w=y.from==this.viewport.from?x:e.docView.measureVisibleLineHeights(y);this.heightMap=(o?Ce.empty().applyChanges(this.stateDeco,W.empty,this.heightOracle,[new He(0,0,0,e.state.doc.length)]):this.heightMap).updateHeight(s,0,o,new Ld(y.from,w))}s.heightChanged&&(h|=2)}let D=!this.viewportIsAppropriate(this.viewport,c)||this.scrollTarget&&(this.scrollTarget.range.head<this.viewport.from||this.scrollTarget.range.head>this.viewport.to);return D&&(this.viewport=this.getViewport(c,this.scrollTarget)),this.updateForViewport(),(h&2||D)&&this.updateViewportLines(),(this.lineGaps.length||this.viewport.to-this.viewport.from>4e3)&&this.updateLineGaps(this.ensureLineGaps(o?[]:this.lineGaps,e)),h|=this.computeVisibleRanges(),this.mustEnforceCursorAssoc&&(this.mustEnforceCursorAssoc=!1,e.docView.enforceCursorAssoc()),h}get visibleTop(){return this.scaler.fromDOM(this.pixelViewport.top)}get visibleBottom(){return this.scaler.fromDOM(this.pixelViewport.bottom)}getViewport(e,t){let i=.5-Math.max(-.5,Math.min(.5,e/1e3/2)),s=this.heightMap,r=this.heightOracle,{visibleTop:o,visibleBottom:l}=this,a=new cn(s.lineAt(o-i*1e3,K.ByHeight,r,0,0).from,s.lineAt(l+(1-i)*1e3,K.ByHeight,r,0,0).to);if(t){let{head:h}=t.range;if(h<a.from||h>a.to){let c=Math.min(this.editorHeight,this.pixelViewport.bottom-this.pixelViewport.top),f=s.lineAt(h,K.ByPos,r,0,0),u;t.y=="center"?u=(f.top+f.bottom)/2-c/2:t.y=="start"||t.y=="nearest"&&h<a.from?u=f.top:u=f.bottom-c,a=new cn(s.lineAt(u-1e3/2,K.ByHeight,r,0,0).from,s.lineAt(u+c+1e3/2,K.ByHeight,r,0,0).to)}}return a}mapViewport(e,t){let i=t.mapPos(e.from,-1),s=t.mapPos(e.to,1);return new cn(this.heightMap.lineAt(i,K.ByPos,this.heightOracle,0,0).from,this.heightMap.lineAt(s,K.ByPos,this.heightOracle,0,0).to)}viewportIsAppropriate({from:e,to:t},i=0){if(!this.inView)return!0;let{top:s}=this.heightMap.lineAt(e,K.ByPos,this.heightOracle,0,0),{bottom:r}=this.heightMap.lineAt(t,K.ByPos,this.heightOracle,0,0),{visibleTop:o,visibleBottom:l}=this;return(e==0||s<=o-Math.max(10,Math.min(-i,250)))&&(t==this.state.doc.length||r>=l+Math.max(10,Math.min(i,250)))&&s>o-2*1e3&&r<l+2*1e3}mapLineGaps(e,t){if(!e.length||t.empty)return e;let i=[];for(let s of e)t.touchesRange(s.from,s.to)||i.push(new _s(t.mapPos(s.from),t.mapPos(s.to),s.size));return i}ensureLineGaps(e,t){let i=this.heightOracle.lineWrapping,s=i?1e4:2e3,r=s>>1,o=s<<1;if(this.defaultTextDirection!=X.LTR&&!i)return[];let l=[],a=(h,c,f,u)=>{if(c-h<r)return;let d=this.state.selection.main,p=[d.from];d.empty||p.push(d.to);for(let m of p)if(m>h&&m<c){a(h,m-10,f,u),a(m+10,c,f,u);return}let g=$d(e,m=>m.from>=f.from&&m.to<=f.to&&Math.abs(m.from-h)<r&&Math.abs(m.to-c)<r&&!p.some(b=>m.from<b&&m.to>b));if(!g){if(c<f.to&&t&&i&&t.visibleRanges.some(m=>m.from<=c&&m.to>=c)){let m=t.moveToLineBoundary(v.cursor(c),!1,!0).head;m>h&&(c=m)}g=new _s(h,c,this.gapSize(f,h,c,u))}l.push(g)};for(let h of this.viewportLines){if(h.length<o)continue;let c=Wd(h.from,h.to,this.stateDeco);if(c.total<o)continue;let f=this.scrollTarget?this.scrollTarget.range.head:null,u,d;if(i){let p=s/this.heightOracle.lineLength*this.heightOracle.lineHeight,g,m;if(f!=null){let b=un(c,f),k=((this.visibleBottom-this.visibleTop)/2+p)/h.height;g=b-k,m=b+k}else g=(this.visibleTop-h.top-p)/h.height,m=(this.visibleBottom-h.top+p)/h.height;u=fn(c,g),d=fn(c,m)}else{let p=c.total*this.heightOracle.charWidth,g=s*this.heightOracle.charWidth,m,b;if(f!=null){let k=un(c,f),D=((this.pixelViewport.right-this.pixelViewport.left)/2+g)/p;m=k-D,b=k+D}else m=(this.pixelViewport.left-g)/p,b=(this.pixelViewport.right+g)/p;u=fn(c,m),d=fn(c,b)}u>h.from&&a(h.from,u,h,c),d<h.to&&a(d,h.to,h,c)}return l}gapSize(e,t,i,s){let r=un(s,i)-un(s,t);return this.heightOracle.lineWrapping?e.height*r:s.total*this.heightOracle.charWidth*r}updateLineGaps(e){_s.same(e,this.lineGaps)||(this.lineGaps=e,this.lineGapDeco=E.set(e.map(t=>t.draw(this,this.heightOracle.lineWrapping))))}computeVisibleRanges(){let e=this.stateDeco;this.lineGaps.length&&(e=e.concat(this.lineGapDeco));let t=[];V.spans(e,this.viewport.from,this.viewport.to,{span(s,r){t.push({from:s,to:r})},point(){}},20);let i=t.length!=this.visibleRanges.length||this.visibleRanges.some((s,r)=>s.from!=t[r].from||s.to!=t[r].to);return this.visibleRanges=t,i?4:0}lineBlockAt(e){return e>=this.viewport.from&&e<=this.viewport.to&&this.viewportLines.find(t=>t.from<=e&&t.to>=e)||Mi(this.heightMap.lineAt(e,K.ByPos,this.heightOracle,0,0),this.scaler)}lineBlockAtHeight(e){return Mi(this.heightMap.lineAt(this.scaler.fromDOM(e),K.ByHeight,this.heightOracle,0,0),this.scaler)}scrollAnchorAt(e){let t=this.lineBlockAtHeight(e+8);return t.from>=this.viewport.from||this.viewportLines[0].top-e>200?t:this.viewportLines[0]}elementAtHeight(e){return Mi(this.heightMap.blockAt(this.scaler.fromDOM(e),this.heightOracle,0,0),this.scaler)}get docHeight(){return this.scaler.toDOM(this.heightMap.height)}get contentHeight(){return this.docHeight+this.paddingTop+this.paddingBottom}}class cn{constructor(e,t){this.from=e,this.to=t}}function Wd(n,e,t){let i=[],s=n,r=0;return V.spans(t,n,e,{span(){},point(o,l){o>s&&(i.push({from:s,to:o}),r+=o-s),s=l}},20),s<e&&(i.push({from:s,to:e}),r+=e-s),{total:r,ranges:i}}function fn({total:n,ranges:e},t){if(t<=0)return e[0].from;if(t>=1)return e[e.length-1].to;let i=Math.floor(n*t);for(let s=0;;s++){let{from:r,to:o}=e[s],l=o-r;if(i<=l)return r+i;i-=l}}function un(n,e){let t=0;for(let{from:i,to:s}of n.ranges){if(e<=s){t+=e-i;break}t+=s-i}return t/n.total}function $d(n,e){for(let t of n)if(e(t))return t}const Sl={toDOM(n){return n},fromDOM(n){return n},scale:1};class zd{constructor(e,t,i){let s=0,r=0,o=0;this.viewports=i.map(({from:l,to:a})=>{let h=t.lineAt(l,K.ByPos,e,0,0).top,c=t.lineAt(a,K.ByPos,e,0,0).bottom;return s+=c-h,{from:l,to:a,top:h,bottom:c,domTop:0,domBottom:0}}),this.scale=(7e6-s)/(t.height-s);for(let l of this.viewports)l.domTop=o+(l.top-r)*this.scale,o=l.domBottom=l.domTop+(l.bottom-l.top),r=l.bottom}toDOM(e){for(let t=0,i=0,s=0;;t++){let r=t<this.viewports.length?this.viewports[t]:null;if(!r||e<r.top)return s+(e-i)*this.scale;if(e<=r.bottom)return r.domTop+(e-r.top);i=r.bottom,s=r.domBottom}}fromDOM(e){for(let t=0,i=0,s=0;;t++){let r=t<this.viewports.length?this.viewports[t]:null;if(!r||e<r.domTop)return i+(e-s)/this.scale;if(e<=r.domBottom)return r.top+(e-r.domTop);i=r.bottom,s=r.domBottom}}}function Mi(n,e){if(e.scale==1)return n;let t=e.toDOM(n.top),i=e.toDOM(n.bottom);return new et(n.from,n.length,t,i-t,Array.isArray(n._content)?n._content.map(s=>Mi(s,e)):n._content)}const dn=R.define({combine:n=>n.join(" ")}),Er=R.define({combine:n=>n.indexOf(!0)>-1}),Ir=At.newName(),Gh=At.newName(),Yh=At.newName(),Qh={"&light":"."+Gh,"&dark":"."+Yh};function Nr(n,e,t){return new At(e,{finish(i){return/&/.test(i)?i.replace(/&\w*/,s=>{if(s=="&")return n;if(!t||!t[s])throw new RangeError(`Unsupported selector: ${s}`);return t[s]}):n+" "+i}})}const jd=Nr("."+Ir,{"&":{position:"relative !important",boxSizing:"border-box","&.cm-focused":{outline:"1px dotted #212121"},display:"flex !important",flexDirection:"column"},".cm-scroller":{display:"flex !important",alignItems:"flex-start !important",fontFamily:"monospace",lineHeight:1.4,height:"100%",overflowX:"auto",position:"relative",zIndex:0},".cm-content":{margin:0,flexGrow:2,flexShrink:0,display:"block",whiteSpace:"pre",wordWrap:"normal",boxSizing:"border-box",minHeight:"100%",padding:"4px 0",outline:"none","&[contenteditable=true]":{WebkitUserModify:"read-write-plaintext-only"}},".cm-lineWrapping":{whiteSpace_fallback:"pre-wrap",whiteSpace:"break-spaces",wordBreak:"break-word",overflowWrap:"anywhere",flexShrink:1},"&light .cm-content":{caretColor:"black"},"&dark .cm-content":{caretColor:"white"},".cm-line":{display:"block",padding:"0 2px 0 6px"},".cm-layer":{position:"absolute",left:0,top:0,contain:"size style","& > *":{position:"absolute"}},"&light .cm-selectionBackground":{background:"#d9d9d9"},"&dark .cm-selectionBackground":{background:"#222"},"&light.cm-focused > .cm-scroller > .cm-selectionLayer .cm-selectionBackground":{background:"#d7d4f0"},"&dark.cm-focused > .cm-scroller > .cm-selectionLayer .cm-selectionBackground":{background:"#233"},".cm-cursorLayer":{pointerEvents:"none"},"&.cm-focused > .cm-scroller > .cm-cursorLayer":{animation:"steps(1) cm-blink 1.2s infinite"},"@keyframes cm-blink":{"0%":{},"50%":{opacity:0},"100%":{}},"@keyframes cm-blink2":{"0%":{},"50%":{opacity:0},"100%":{}},".cm-cursor, .cm-dropCursor":{borderLeft:"1.2px solid black",marginLeft:"-0.6px",pointerEvents:"none"},".cm-cursor":{display:"none"},"&dark .cm-cursor":{borderLeftColor:"#444"},".cm-dropCursor":{position:"absolute"},"&.cm-focused > .cm-scroller > .cm-cursorLayer .cm-cursor":{display:"block"},"&light .cm-activeLine":{backgroundColor:"#cceeff44"},"&dark .cm-activeLine":{backgroundColor:"#99eeff33"},"&light .cm-specialChar":{color:"red"},"&dark .cm-specialChar":{color:"#f78"},".cm-gutters":{flexShrink:0,display:"flex",height:"100%",boxSizing:"border-box",insetInlineStart:0,zIndex:200},"&light .cm-gutters":{backgroundColor:"#f5f5f5",color:"#6c6c6c",borderRight:"1px solid #ddd"},"&dark .cm-gutters":{backgroundColor:"#333338",color:"#ccc"},".cm-gutter":{display:"flex !important",flexDirection:"column",flexShrink:0,boxSizing:"border-box",minHeight:"100%",overflow:"hidden"},".cm-gutterElement":{boxSizing:"border-box"},".cm-lineNumbers .cm-gutterElement":{padding:"0 3px 0 5px",minWidth:"20px",textAlign:"right",whiteSpace:"nowrap"},"&light .cm-activeLineGutter":{backgroundColor:"#e2f2ff"},"&dark .cm-activeLineGutter":{backgroundColor:"#222227"},".cm-panels":{boxSizing:"border-box",position:"sticky",left:0,right:0},"&light .cm-panels":{backgroundColor:"#f5f5f5",color:"black"},"&light .cm-panels-top":{borderBottom:"1px solid #ddd"},"&light .cm-panels-bottom":{borderTop:"1px solid #ddd"},"&dark .cm-panels":{backgroundColor:"#333338",color:"white"},".cm-tab":{display:"inline-block",overflow:"hidden",verticalAlign:"bottom"},".cm-widgetBuffer":{verticalAlign:"text-top",height:"1em",width:0,display:"inline"},".cm-placeholder":{color:"#888",display:"inline-block",verticalAlign:"top"},".cm-highlightSpace:before":{content:"attr(data-display)",position:"absolute",pointerEvents:"none",color:"#888"},".cm-highlightTab":{backgroundImage:`url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" width="200" height="20"><path stroke="%23888" stroke-width="1" fill="none" d="M1 10H196L190 5M190 15L196 10M197 4L197 16"/></svg>')`,backgroundSize:"auto 100%",backgroundPosition:"right 90%",backgroundRepeat:"no-repeat"},".cm-trailingSpace":{backgroundColor:"#ff332255"},".cm-button":{verticalAlign:"middle",color:"inherit",fontSize:"70%",padding:".2em 1em",borderRadius:"1px"},"&light .cm-button":{backgroundImage:"linear-gradient(#eff1f5, #d9d9df)",border:"1px solid #888","&:active":{backgroundImage:"linear-gradient(#b4b4b4, #d0d3d6)"}},"&dark .cm-button":{backgroundImage:"linear-gradient(#393939, #111)",border:"1px solid #888","&:active":{backgroundImage:"linear-gradient(#111, #333)"}},".cm-textfield":{verticalAlign:"middle",color:"inherit",fontSize:"70%",border:"1px solid silver",padding:".2em .5em"},"&light .cm-textfield":{backgroundColor:"white"},"&dark .cm-textfield":{border:"1px solid #555",backgroundColor:"inherit"}},Qh),Oi="￿";class qd{constructor(e,t){this.points=e,this.text="",this.lineSeparator=t.facet(_.lineSeparator)}append(e){this.text+=e}lineBreak(){this.text+=Oi}readRange(e,t){if(!e)return this;let i=e.parentNode;for(let s=e;;){this.findPointBefore(i,s);let r=this.text.length;this.readNode(s);let o=s.nextSibling;if(o==t)break;let l=U.get(s),a=U.get(o);(l&&a?l.breakAfter:(l?l.breakAfter:Cl(s))||Cl(o)&&(s.nodeName!="BR"||s.cmIgnore)&&this.text.length>r)&&this.lineBreak(),s=o}return this.findPointBefore(i,t),this}readTextNode(e){let t=e.nodeValue;for(let i of this.points)i.node==e&&(i.pos=this.text.length+Math.min(i.offset,t.length));for(let i=0,s=this.lineSeparator?null:/\r\n?|\n/g;;){let r=-1,o=1,l;if(this.lineSeparator?(r=t.indexOf(this.lineSeparator,i),o=this.lineSeparator.length):(l=s.exec(t))&&(r=l.index,o=l[0].length),this.append(t.slice(i,r<0?t.length:r)),r<0)break;if(this.lineBreak(),o>1)for(let a of this.points)a.node==e&&a.pos>this.text.length&&(a.pos-=o-1);i=r+o}}readNode(e){if(e.cmIgnore)return;let t=U.get(e),i=t&&t.overrideDOMText;if(i!=null){this.findPointInside(e,i.length);for(let s=i.iter();!s.next().done;)s.lineBreak?this.lineBreak():this.append(s.value)}else e.nodeType==3?this.readTextNode(e):e.nodeName=="BR"?e.nextSibling&&this.lineBreak():e.nodeType==1&&this.readRange(e.firstChild,null)}findPointBefore(e,t){for(let i of this.points)i.node==e&&e.childNodes[i.offset]==t&&(i.pos=this.text.length)}findPointInside(e,t){for(let i of this.points)(e.nodeType==3?i.node==e:e.contains(i.node))&&(i.pos=this.text.length+(Kd(e,i.node,i.offset)?t:0))}}function Kd(n,e,t){for(;;){if(!e||t<ct(e))return!1;if(e==n)return!0;t=_i(e)+1,e=e.parentNode}}function Cl(n){return n.nodeType==1&&/^(DIV|P|LI|UL|OL|BLOCKQUOTE|DD|DT|H\d|SECTION|PRE)$/.test(n.nodeName)}class Al{constructor(e,t){this.node=e,this.offset=t,this.pos=-1}}class Ud{constructor(e,t,i,s){this.typeOver=s,this.bounds=null,this.text="";let{impreciseHead:r,impreciseAnchor:o}=e.docView;if(e.state.readOnly&&t>-1)this.newSel=null;else if(t>-1&&(this.bounds=e.docView.domBoundsAround(t,i,0))){let l=r||o?[]:Qd(e),a=new qd(l,e.state);a.readRange(this.bounds.startDOM,this.bounds.endDOM),this.text=a.text,this.newSel=Jd(l,this.bounds.from)}else{let l=e.observer.selectionRange,a=r&&r.node==l.focusNode&&r.offset==l.focusOffset||!vr(e.contentDOM,l.focusNode)?e.state.selection.main.head:e.docView.posFromDOM(l.focusNode,l.focusOffset),h=o&&o.node==l.anchorNode&&o.offset==l.anchorOffset||!vr(e.contentDOM,l.anchorNode)?e.state.selection.main.anchor:e.docView.posFromDOM(l.anchorNode,l.anchorOffset);this.newSel=v.single(h,a)}}}function Jh(n,e){let t,{newSel:i}=e,s=n.state.selection.main,r=n.inputState.lastKeyTime>Date.now()-100?n.inputState.lastKeyCode:-1;if(e.bounds){let{from:o,to:l}=e.bounds,a=s.from,h=null;(r===8||B.android&&e.text.length<l-o)&&(a=s.to,h="end");let c=Yd(n.state.doc.sliceString(o,l,Oi),e.text,a-o,h);c&&(B.chrome&&r==13&&c.toB==c.from+2&&e.text.slice(c.from,c.toB)==Oi+Oi&&c.toB--,t={from:o+c.from,to:o+c.toA,insert:W.of(e.text.slice(c.from,c.toB).split(Oi))})}else i&&(!n.hasFocus&&n.state.facet(vs)||i.main.eq(s))&&(i=null);if(!t&&!i)return!1;if(!t&&e.typeOver&&!s.empty&&i&&i.main.empty?t={from:s.from,to:s.to,insert:n.state.doc.slice(s.from,s.to)}:t&&t.from>=s.from&&t.to<=s.to&&(t.from!=s.from||t.to!=s.to)&&s.to-s.from-(t.to-t.from)<=4?t={from:s.from,to:s.to,insert:n.state.doc.slice(s.from,t.from).append(t.insert).append(n.state.doc.slice(t.to,s.to))}:(B.mac||B.android)&&t&&t.from==t.to&&t.from==s.head-1&&/^\. ?$/.test(t.insert.toString())&&n.contentDOM.getAttribute("autocorrect")=="off"?(i&&t.insert.length==2&&(i=v.single(i.main.anchor-1,i.main.head-1)),t={from:s.from,to:s.to,insert:W.of([" "])}):B.chrome&&t&&t.from==t.to&&t.from==s.head&&t.insert.toString()==`
  `&&n.lineWrapping&&(i&&(i=v.single(i.main.anchor-1,i.main.head-1)),t={from:s.from,to:s.to,insert:W.of([" "])}),t){if(B.ios&&n.inputState.flushIOSKey()||B.android&&(t.from==s.from&&t.to==s.to&&t.insert.length==1&&t.insert.lines==2&&ii(n.contentDOM,"Enter",13)||(t.from==s.from-1&&t.to==s.to&&t.insert.length==0||r==8&&t.insert.length<t.to-t.from&&t.to>s.head)&&ii(n.contentDOM,"Backspace",8)||t.from==s.from&&t.to==s.to+1&&t.insert.length==0&&ii(n.contentDOM,"Delete",46)))return!0;let o=t.insert.toString();n.inputState.composing>=0&&n.inputState.composing++;let l,a=()=>l||(l=Gd(n,t,i));return n.state.facet(kh).some(h=>h(n,t.from,t.to,o,a))||n.dispatch(a()),!0}else if(i&&!i.main.eq(s)){let o=!1,l="select";return n.inputState.lastSelectionTime>Date.now()-50&&(n.inputState.lastSelectionOrigin=="select"&&(o=!0),l=n.inputState.lastSelectionOrigin),n.dispatch({selection:i,scrollIntoView:o,userEvent:l}),!0}else return!1}function Gd(n,e,t){let i,s=n.state,r=s.selection.main;if(e.from>=r.from&&e.to<=r.to&&e.to-e.from>=(r.to-r.from)/3&&(!t||t.main.empty&&t.main.from==e.from+e.insert.length)&&n.inputState.composing<0){let l=r.from<e.from?s.sliceDoc(r.from,e.from):"",a=r.to>e.to?s.sliceDoc(e.to,r.to):"";i=s.replaceSelection(n.state.toText(l+e.insert.sliceString(0,void 0,n.state.lineBreak)+a))}else{let l=s.changes(e),a=t&&t.main.to<=l.newLength?t.main:void 0;if(s.selection.ranges.length>1&&n.inputState.composing>=0&&e.to<=r.to&&e.to>=r.to-10){let h=n.state.sliceDoc(e.from,e.to),c,f=t&&Ih(n,t.main.head);if(f){let p=e.insert.length-(e.to-e.from);c={from:f.from,to:f.to-p}}else c=n.state.doc.lineAt(r.head);let u=r.to-e.to,d=r.to-r.from;i=s.changeByRange(p=>{if(p.from==r.from&&p.to==r.to)return{changes:l,range:a||p.map(l)};let g=p.to-u,m=g-h.length;if(p.to-p.from!=d||n.state.sliceDoc(m,g)!=h||p.to>=c.from&&p.from<=c.to)return{range:p};let b=s.changes({from:m,to:g,insert:e.insert}),k=p.to-r.to;return{changes:b,range:a?v.range(Math.max(0,a.anchor+k),Math.max(0,a.head+k)):p.map(b)}})}else i={changes:l,selection:a&&s.selection.replaceRange(a)}}let o="input.type";return(n.composing||n.inputState.compositionPendingChange&&n.inputState.compositionEndedAt>Date.now()-50)&&(n.inputState.compositionPendingChange=!1,o+=".compose",n.inputState.compositionFirstChange&&(o+=".start",n.inputState.compositionFirstChange=!1)),s.update(i,{userEvent:o,scrollIntoView:!0})}function Yd(n,e,t,i){let s=Math.min(n.length,e.length),r=0;for(;r<s&&n.charCodeAt(r)==e.charCodeAt(r);)r++;if(r==s&&n.length==e.length)return null;let o=n.length,l=e.length;for(;o>0&&l>0&&n.charCodeAt(o-1)==e.charCodeAt(l-1);)o--,l--;if(i=="end"){let a=Math.max(0,r-Math.min(o,l));t-=o+a-r}if(o<r&&n.length<e.length){let a=t<=r&&t>=o?r-t:0;r-=a,l=r+(l-o),o=r}else if(l<r){let a=t<=r&&t>=l?r-t:0;r-=a,o=r+(o-l),l=r}return{from:r,toA:o,toB:l}}function Qd(n){let e=[];if(n.root.activeElement!=n.contentDOM)return e;let{anchorNode:t,anchorOffset:i,focusNode:s,focusOffset:r}=n.observer.selectionRange;return t&&(e.push(new Al(t,i)),(s!=t||r!=i)&&e.push(new Al(s,r))),e}function Jd(n,e){if(n.length==0)return null;let t=n[0].pos,i=n.length==2?n[1].pos:t;return t>-1&&i>-1?v.single(t+e,i+e):null}const Xd={childList:!0,characterData:!0,subtree:!0,attributes:!0,characterDataOldValue:!0},Vs=B.ie&&B.ie_version<=11;class Zd{constructor(e){this.view=e,this.active=!1,this.selectionRange=new Nu,this.selectionChanged=!1,this.delayedFlush=-1,this.resizeTimeout=-1,this.queue=[],this.delayedAndroidKey=null,this.flushingAndroidKey=-1,this.lastChange=0,this.scrollTargets=[],this.intersection=null,this.resizeScroll=null,this.intersecting=!1,this.gapIntersection=null,this.gaps=[],this.parentCheck=-1,this.dom=e.contentDOM,this.observer=new MutationObserver(t=>{for(let i of t)this.queue.push(i);(B.ie&&B.ie_version<=11||B.ios&&e.composing)&&t.some(i=>i.type=="childList"&&i.removedNodes.length||i.type=="characterData"&&i.oldValue.length>i.target.nodeValue.length)?this.flushSoon():this.flush()}),Vs&&(this.onCharData=t=>{this.queue.push({target:t.target,type:"characterData",oldValue:t.prevValue}),this.flushSoon()}),this.onSelectionChange=this.onSelectionChange.bind(this),this.onResize=this.onResize.bind(this),this.onPrint=this.onPrint.bind(this),this.onScroll=this.onScroll.bind(this),typeof ResizeObserver=="function"&&(this.resizeScroll=new ResizeObserver(()=>{var t;((t=this.view.docView)===null||t===void 0?void 0:t.lastUpdate)<Date.now()-75&&this.onResize()}),this.resizeScroll.observe(e.scrollDOM)),this.addWindowListeners(this.win=e.win),this.start(),typeof IntersectionObserver=="function"&&(this.intersection=new IntersectionObserver(t=>{this.parentCheck<0&&(this.parentCheck=setTimeout(this.listenForScroll.bind(this),1e3)),t.length>0&&t[t.length-1].intersectionRatio>0!=this.intersecting&&(this.intersecting=!this.intersecting,this.intersecting!=this.view.inView&&this.onScrollChanged(document.createEvent("Event")))},{threshold:[0,.001]}),this.intersection.observe(this.dom),this.gapIntersection=new IntersectionObserver(t=>{t.length>0&&t[t.length-1].intersectionRatio>0&&this.onScrollChanged(document.createEvent("Event"))},{})),this.listenForScroll(),this.readSelectionRange()}onScrollChanged(e){this.view.inputState.runHandlers("scroll",e),this.intersecting&&this.view.measure()}onScroll(e){this.intersecting&&this.flush(!1),this.onScrollChanged(e)}onResize(){this.resizeTimeout<0&&(this.resizeTimeout=setTimeout(()=>{this.resizeTimeout=-1,this.view.requestMeasure()},50))}onPrint(){this.view.viewState.printing=!0,this.view.measure(),setTimeout(()=>{this.view.viewState.printing=!1,this.view.requestMeasure()},500)}updateGaps(e){if(this.gapIntersection&&(e.length!=this.gaps.length||this.gaps.some((t,i)=>t!=e[i]))){this.gapIntersection.disconnect();for(let t of e)this.gapIntersection.observe(t);this.gaps=e}}onSelectionChange(e){let t=this.selectionChanged;if(!this.readSelectionRange()||this.delayedAndroidKey)return;let{view:i}=this,s=this.selectionRange;if(i.state.facet(vs)?i.root.activeElement!=this.dom:!Tn(i.dom,s))return;let r=s.anchorNode&&i.docView.nearest(s.anchorNode);if(r&&r.ignoreEvent(e)){t||(this.selectionChanged=!1);return}(B.ie&&B.ie_version<=11||B.android&&B.chrome)&&!i.state.selection.main.empty&&s.focusNode&&Kn(s.focusNode,s.focusOffset,s.anchorNode,s.anchorOffset)?this.flushSoon():this.flush(!1)}readSelectionRange(){let{view:e}=this,t=B.safari&&e.root.nodeType==11&&Bu(this.dom.ownerDocument)==this.dom&&ep(this.view)||qn(e.root);if(!t||this.selectionRange.eq(t))return!1;let i=Tn(this.dom,t);return i&&!this.selectionChanged&&e.inputState.lastFocusTime>Date.now()-200&&e.inputState.lastTouchTime<Date.now()-300&&Hu(this.dom,t)?(this.view.inputState.lastFocusTime=0,e.docView.updateSelection(),!1):(this.selectionRange.setRange(t),i&&(this.selectionChanged=!0),!0)}setSelectionRange(e,t){this.selectionRange.set(e.node,e.offset,t.node,t.offset),this.selectionChanged=!1}clearSelectionRange(){this.selectionRange.set(null,0,null,0)}listenForScroll(){this.parentCheck=-1;let e=0,t=null;for(let i=this.dom;i;)if(i.nodeType==1)!t&&e<this.scrollTargets.length&&this.scrollTargets[e]==i?e++:t||(t=this.scrollTargets.slice(0,e)),t&&t.push(i),i=i.assignedSlot||i.parentNode;else if(i.nodeType==11)i=i.host;else break;if(e<this.scrollTargets.length&&!t&&(t=this.scrollTargets.slice(0,e)),t){for(let i of this.scrollTargets)i.removeEventListener("scroll",this.onScroll);for(let i of this.scrollTargets=t)i.addEventListener("scroll",this.onScroll)}}ignore(e){if(!this.active)return e();try{return this.stop(),e()}finally{this.start(),this.clear()}}start(){this.active||(this.observer.observe(this.dom,Xd),Vs&&this.dom.addEventListener("DOMCharacterDataModified",this.onCharData),this.active=!0)}stop(){this.active&&(this.active=!1,this.observer.disconnect(),Vs&&this.dom.removeEventListener("DOMCharacterDataModified",this.onCharData))}clear(){this.processRecords(),this.queue.length=0,this.selectionChanged=!1}delayAndroidKey(e,t){var i;if(!this.delayedAndroidKey){let s=()=>{let r=this.delayedAndroidKey;r&&(this.clearDelayedAndroidKey(),this.view.inputState.lastKeyCode=r.keyCode,this.view.inputState.lastKeyTime=Date.now(),!this.flush()&&r.force&&ii(this.dom,r.key,r.keyCode))};this.flushingAndroidKey=this.view.win.requestAnimationFrame(s)}(!this.delayedAndroidKey||e=="Enter")&&(this.delayedAndroidKey={key:e,keyCode:t,force:this.lastChange<Date.now()-50||!!(!((i=this.delayedAndroidKey)===null||i===void 0)&&i.force)})}clearDelayedAndroidKey(){this.win.cancelAnimationFrame(this.flushingAndroidKey),this.delayedAndroidKey=null,this.flushingAndroidKey=-1}flushSoon(){this.delayedFlush<0&&(this.delayedFlush=this.view.win.requestAnimationFrame(()=>{this.delayedFlush=-1,this.flush()}))}forceFlush(){this.delayedFlush>=0&&(this.view.win.cancelAnimationFrame(this.delayedFlush),this.delayedFlush=-1),this.flush()}pendingRecords(){for(let e of this.observer.takeRecords())this.queue.push(e);return this.queue}processRecords(){let e=this.pendingRecords();e.length&&(this.queue=[]);let t=-1,i=-1,s=!1;for(let r of e){let o=this.readMutation(r);o&&(o.typeOver&&(s=!0),t==-1?{from:t,to:i}=o:(t=Math.min(o.from,t),i=Math.max(o.to,i)))}return{from:t,to:i,typeOver:s}}readChange(){let{from:e,to:t,typeOver:i}=this.processRecords(),s=this.selectionChanged&&Tn(this.dom,this.selectionRange);if(e<0&&!s)return null;e>-1&&(this.lastChange=Date.now()),this.view.inputState.lastFocusTime=0,this.selectionChanged=!1;let r=new Ud(this.view,e,t,i);return this.view.docView.domChanged={newSel:r.newSel?r.newSel.main:null},r}flush(e=!0){if(this.delayedFlush>=0||this.delayedAndroidKey)return!1;e&&this.readSelectionRange();let t=this.readChange();if(!t)return this.view.requestMeasure(),!1;let i=this.view.state,s=Jh(this.view,t);return this.view.state==i&&this.view.update([]),s}readMutation(e){let t=this.view.docView.nearest(e.target);if(!t||t.ignoreMutation(e))return null;if(t.markDirty(e.type=="attributes"),e.type=="attributes"&&(t.flags|=4),e.type=="childList"){let i=Ml(t,e.previousSibling||e.target.previousSibling,-1),s=Ml(t,e.nextSibling||e.target.nextSibling,1);return{from:i?t.posAfter(i):t.posAtStart,to:s?t.posBefore(s):t.posAtEnd,typeOver:!1}}else return e.type=="characterData"?{from:t.posAtStart,to:t.posAtEnd,typeOver:e.target.nodeValue==e.oldValue}:null}setWindow(e){e!=this.win&&(this.removeWindowListeners(this.win),this.win=e,this.addWindowListeners(this.win))}addWindowListeners(e){e.addEventListener("resize",this.onResize),e.addEventListener("beforeprint",this.onPrint),e.addEventListener("scroll",this.onScroll),e.document.addEventListener("selectionchange",this.onSelectionChange)}removeWindowListeners(e){e.removeEventListener("scroll",this.onScroll),e.removeEventListener("resize",this.onResize),e.removeEventListener("beforeprint",this.onPrint),e.document.removeEventListener("selectionchange",this.onSelectionChange)}destroy(){var e,t,i;this.stop(),(e=this.intersection)===null||e===void 0||e.disconnect(),(t=this.gapIntersection)===null||t===void 0||t.disconnect(),(i=this.resizeScroll)===null||i===void 0||i.disconnect();for(let s of this.scrollTargets)s.removeEventListener("scroll",this.onScroll);this.removeWindowListeners(this.win),clearTimeout(this.parentCheck),clearTimeout(this.resizeTimeout),this.win.cancelAnimationFrame(this.delayedFlush),this.win.cancelAnimationFrame(this.flushingAndroidKey)}}function Ml(n,e,t){for(;e;){let i=U.get(e);if(i&&i.parent==n)return i;let s=e.parentNode;e=s!=n.dom?s:t>0?e.nextSibling:e.previousSibling}return null}function ep(n){let e=null;function t(a){a.preventDefault(),a.stopImmediatePropagation(),e=a.getTargetRanges()[0]}if(n.contentDOM.addEventListener("beforeinput",t,!0),n.dom.ownerDocument.execCommand("indent"),n.contentDOM.removeEventListener("beforeinput",t,!0),!e)return null;let i=e.startContainer,s=e.startOffset,r=e.endContainer,o=e.endOffset,l=n.docView.domAtPos(n.state.selection.main.anchor);return Kn(l.node,l.offset,r,o)&&([i,s,r,o]=[r,o,i,s]),{anchorNode:i,anchorOffset:s,focusNode:r,focusOffset:o}}class P{get state(){return this.viewState.state}get viewport(){return this.viewState.viewport}get visibleRanges(){return this.viewState.visibleRanges}get inView(){return this.viewState.inView}get composing(){return this.inputState.composing>0}get compositionStarted(){return this.inputState.composing>=0}get root(){return this._root}get win(){return this.dom.ownerDocument.defaultView||window}constructor(e={}){this.plugins=[],this.pluginMap=new Map,this.editorAttrs={},this.contentAttrs={},this.bidiCache=[],this.destroyed=!1,this.updateState=2,this.measureScheduled=-1,this.measureRequests=[],this.contentDOM=document.createElement("div"),this.scrollDOM=document.createElement("div"),this.scrollDOM.tabIndex=-1,this.scrollDOM.className="cm-scroller",this.scrollDOM.appendChild(this.contentDOM),this.announceDOM=document.createElement("div"),this.announceDOM.style.cssText="position: fixed; top: -10000px",this.announceDOM.setAttribute("aria-live","polite"),this.dom=document.createElement("div"),this.dom.appendChild(this.announceDOM),this.dom.appendChild(this.scrollDOM);let{dispatch:t}=e;this.dispatchTransactions=e.dispatchTransactions||t&&(i=>i.forEach(s=>t(s,this)))||(i=>this.update(i)),this.dispatch=this.dispatch.bind(this),this._root=e.root||Fu(e.parent)||document,this.viewState=new kl(e.state||_.create(e)),e.scrollTo&&e.scrollTo.is(ln)&&(this.viewState.scrollTarget=e.scrollTo.value.clip(this.viewState.state)),this.plugins=this.state.facet(Ci).map(i=>new Ns(i));for(let i of this.plugins)i.update(this);this.observer=new Zd(this),this.inputState=new md(this),this.inputState.ensureHandlers(this.plugins),this.docView=new sl(this),this.mountStyles(),this.updateAttrs(),this.updateState=0,this.requestMeasure(),e.parent&&e.parent.appendChild(this.dom)}dispatch(...e){let t=e.length==1&&e[0]instanceof le?e:e.length==1&&Array.isArray(e[0])?e[0]:[this.state.update(...e)];this.dispatchTransactions(t,this)}update(e){if(this.updateState!=0)throw new Error("Calls to EditorView.update are not allowed while an update is in progress");let t=!1,i=!1,s,r=this.state;for(let u of e){if(u.startState!=r)throw new RangeError("Trying to update state with a transaction that doesn't start from the previous state.");r=u.state}if(this.destroyed){this.viewState.state=r;return}let o=this.hasFocus,l=0,a=null;e.some(u=>u.annotation(jh))?(this.inputState.notifiedFocused=o,l=1):o!=this.inputState.notifiedFocused&&(this.inputState.notifiedFocused=o,a=qh(r,o),a||(l=1));let h=this.observer.delayedAndroidKey,c=null;if(h?(this.observer.clearDelayedAndroidKey(),c=this.observer.readChange(),(c&&!this.state.doc.eq(r.doc)||!this.state.selection.eq(r.selection))&&(c=null)):this.observer.clear(),r.facet(_.phrases)!=this.state.facet(_.phrases))return this.setState(r);s=Un.create(this,r,e),s.flags|=l;let f=this.viewState.scrollTarget;try{this.updateState=2;for(let u of e){if(f&&(f=f.map(u.changes)),u.scrollIntoView){let{main:d}=u.state.selection;f=new ni(d.empty?d:v.cursor(d.head,d.head>d.anchor?-1:1))}for(let d of u.effects)d.is(ln)&&(f=d.value.clip(this.state))}this.viewState.update(s,f),this.bidiCache=Gn.update(this.bidiCache,s.changes),s.empty||(this.updatePlugins(s),this.inputState.update(s)),t=this.docView.update(s),this.state.facet(Ai)!=this.styleModules&&this.mountStyles(),i=this.updateAttrs(),this.showAnnouncements(e),this.docView.updateSelection(t,e.some(u=>u.isUserEvent("select.pointer")))}finally{this.updateState=0}if(s.startState.facet(dn)!=s.state.facet(dn)&&(this.viewState.mustMeasureContent=!0),(t||i||f||this.viewState.mustEnforceCursorAssoc||this.viewState.mustMeasureContent)&&this.requestMeasure(),!s.empty)for(let u of this.state.facet(Or))try{u(s)}catch(d){Ie(this.state,d,"update listener")}(a||c)&&Promise.resolve().then(()=>{a&&this.state==a.startState&&this.dispatch(a),c&&!Jh(this,c)&&h.force&&ii(this.contentDOM,h.key,h.keyCode)})}setState(e){if(this.updateState!=0)throw new Error("Calls to EditorView.setState are not allowed while an update is in progress");if(this.destroyed){this.viewState.state=e;return}this.updateState=2;let t=this.hasFocus;try{for(let i of this.plugins)i.destroy(this);this.viewState=new kl(e),this.plugins=e.facet(Ci).map(i=>new Ns(i)),this.pluginMap.clear();for(let i of this.plugins)i.update(this);this.docView=new sl(this),this.inputState.ensureHandlers(this.plugins),this.mountStyles(),this.updateAttrs(),this.bidiCache=[]}finally{this.updateState=0}t&&this.focus(),this.requestMeasure()}updatePlugins(e){let t=e.startState.facet(Ci),i=e.state.facet(Ci);if(t!=i){let s=[];for(let r of i){let o=t.indexOf(r);if(o<0)s.push(new Ns(r));else{let l=this.plugins[o];l.mustUpdate=e,s.push(l)}}for(let r of this.plugins)r.mustUpdate!=e&&r.destroy(this);this.plugins=s,this.pluginMap.clear()}else for(let s of this.plugins)s.mustUpdate=e;for(let s=0;s<this.plugins.length;s++)this.plugins[s].update(this);t!=i&&this.inputState.ensureHandlers(this.plugins)}measure(e=!0){if(this.destroyed)return;if(this.measureScheduled>-1&&this.win.cancelAnimationFrame(this.measureScheduled),this.observer.delayedAndroidKey){this.measureScheduled=-1,this.requestMeasure();return}this.measureScheduled=0,e&&this.observer.forceFlush();let t=null,i=this.scrollDOM,s=i.scrollTop*this.scaleY,{scrollAnchorPos:r,scrollAnchorHeight:o}=this.viewState;Math.abs(s-this.viewState.scrollTop)>1&&(o=-1),this.viewState.scrollAnchorHeight=-1;try{for(let l=0;;l++){if(o<0)if(ah(i))r=-1,o=this.viewState.heightMap.height;else{let d=this.viewState.scrollAnchorAt(s);r=d.from,o=d.top}this.updateState=1;let a=this.viewState.measure(this);if(!a&&!this.measureRequests.length&&this.viewState.scrollTarget==null)break;if(l>5){console.warn(this.measureRequests.length?"Measure loop restarted more than 5 times":"Viewport failed to stabilize");break}let h=[];a&4||([this.measureRequests,h]=[h,this.measureRequests]);let c=h.map(d=>{try{return d.read(this)}catch(p){return Ie(this.state,p),Ol}}),f=Un.create(this,this.state,[]),u=!1;f.flags|=a,t?t.flags|=a:t=f,this.updateState=2,f.empty||(this.updatePlugins(f),this.inputState.update(f),this.updateAttrs(),u=this.docView.update(f));for(let d=0;d<h.length;d++)if(c[d]!=Ol)try{let p=h[d];p.write&&p.write(c[d],this)}catch(p){Ie(this.state,p)}if(u&&this.docView.updateSelection(!0),!f.viewportChanged&&this.measureRequests.length==0){if(this.viewState.editorHeight)if(this.viewState.scrollTarget){this.docView.scrollIntoView(this.viewState.scrollTarget),this.viewState.scrollTarget=null;continue}else{let p=(r<0?this.viewState.heightMap.height:this.viewState.lineBlockAt(r).top)-o;if(p>1||p<-1){s=s+p,i.scrollTop=s/this.scaleY,o=-1;continue}}break}}}finally{this.updateState=0,this.measureScheduled=-1}if(t&&!t.empty)for(let l of this.state.facet(Or))l(t)}get themeClasses(){return Ir+" "+(this.state.facet(Er)?Yh:Gh)+" "+this.state.facet(dn)}updateAttrs(){let e=Dl(this,Mh,{class:"cm-editor"+(this.hasFocus?" cm-focused ":" ")+this.themeClasses}),t={spellcheck:"false",autocorrect:"off",autocapitalize:"off",translate:"no",contenteditable:this.state.facet(vs)?"true":"false",class:"cm-content",style:`${B.tabSize}: ${this.state.tabSize}`,role:"textbox","aria-multiline":"true"};this.state.readOnly&&(t["aria-readonly"]="true"),Dl(this,co,t);let i=this.observer.ignore(()=>{let s=Ar(this.contentDOM,this.contentAttrs,t),r=Ar(this.dom,this.editorAttrs,e);return s||r});return this.editorAttrs=e,this.contentAttrs=t,i}showAnnouncements(e){let t=!0;for(let i of e)for(let s of i.effects)if(s.is(P.announce)){t&&(this.announceDOM.textContent=""),t=!1;let r=this.announceDOM.appendChild(document.createElement("div"));r.textContent=s.value}}mountStyles(){this.styleModules=this.state.facet(Ai);let e=this.state.facet(P.cspNonce);At.mount(this.root,this.styleModules.concat(jd).reverse(),e?{nonce:e}:void 0)}readMeasured(){if(this.updateState==2)throw new Error("Reading the editor layout isn't allowed during an update");this.updateState==0&&this.measureScheduled>-1&&this.measure(!1)}requestMeasure(e){if(this.measureScheduled<0&&(this.measureScheduled=this.win.requestAnimationFrame(()=>this.measure())),e){if(this.measureRequests.indexOf(e)>-1)return;if(e.key!=null){for(let t=0;t<this.measureRequests.length;t++)if(this.measureRequests[t].key===e.key){this.measureRequests[t]=e;return}}this.measureRequests.push(e)}}plugin(e){let t=this.pluginMap.get(e);return(t===void 0||t&&t.spec!=e)&&this.pluginMap.set(e,t=this.plugins.find(i=>i.spec==e)||null),t&&t.update(this).value}get documentTop(){return this.contentDOM.getBoundingClientRect().top+this.viewState.paddingTop}get documentPadding(){return{top:this.viewState.paddingTop,bottom:this.viewState.paddingBottom}}get scaleX(){return this.viewState.scaleX}get scaleY(){return this.viewState.scaleY}elementAtHeight(e){return this.readMeasured(),this.viewState.elementAtHeight(e)}lineBlockAtHeight(e){return this.readMeasured(),this.viewState.lineBlockAtHeight(e)}get viewportLineBlocks(){return this.viewState.viewportLines}lineBlockAt(e){return this.viewState.lineBlockAt(e)}get contentHeight(){return this.viewState.contentHeight}moveByChar(e,t,i){return Hs(this,e,cl(this,e,t,i))}moveByGroup(e,t){return Hs(this,e,cl(this,e,t,i=>dd(this,e.head,i)))}moveToLineBoundary(e,t,i=!0){return ud(this,e,t,i)}moveVertically(e,t,i){return Hs(this,e,pd(this,e,t,i))}domAtPos(e){return this.docView.domAtPos(e)}posAtDOM(e,t=0){return this.docView.posFromDOM(e,t)}posAtCoords(e,t=!0){return this.readMeasured(),Fh(this,e,t)}coordsAtPos(e,t=1){this.readMeasured();let i=this.docView.coordsAt(e,t);if(!i||i.left==i.right)return i;let s=this.state.doc.lineAt(e),r=this.bidiSpans(s),o=r[vt.find(r,e-s.from,-1,t)];return lo(i,o.dir==X.LTR==t>0)}coordsForChar(e){return this.readMeasured(),this.docView.coordsForChar(e)}get defaultCharacterWidth(){return this.viewState.heightOracle.charWidth}get defaultLineHeight(){return this.viewState.heightOracle.lineHeight}get textDirection(){return this.viewState.defaultTextDirection}textDirectionAt(e){return!this.state.facet(Ch)||e<this.viewport.from||e>this.viewport.to?this.textDirection:(this.readMeasured(),this.docView.textDirectionAt(e))}get lineWrapping(){return this.viewState.heightOracle.lineWrapping}bidiSpans(e){if(e.length>tp)return Lh(e.length);let t=this.textDirectionAt(e.from),i;for(let r of this.bidiCache)if(r.from==e.from&&r.dir==t&&(r.fresh||Bh(r.isolates,i=nl(this,e.from,e.to))))return r.order;i||(i=nl(this,e.from,e.to));let s=Xu(e.text,t,i);return this.bidiCache.push(new Gn(e.from,e.to,t,i,!0,s)),s}get hasFocus(){var e;return(this.dom.ownerDocument.hasFocus()||B.safari&&((e=this.inputState)===null||e===void 0?void 0:e.lastContextMenu)>Date.now()-3e4)&&this.root.activeElement==this.contentDOM}focus(){this.observer.ignore(()=>{oh(this.contentDOM),this.docView.updateSelection()})}setRoot(e){this._root!=e&&(this._root=e,this.observer.setWindow((e.nodeType==9?e:e.ownerDocument).defaultView||window),this.mountStyles())}destroy(){for(let e of this.plugins)e.destroy(this);this.plugins=[],this.inputState.destroy(),this.dom.remove(),this.observer.destroy(),this.measureScheduled>-1&&this.win.cancelAnimationFrame(this.measureScheduled),this.destroyed=!0}static scrollIntoView(e,t={}){return ln.of(new ni(typeof e=="number"?v.cursor(e):e,t.y,t.x,t.yMargin,t.xMargin))}scrollSnapshot(){let{scrollTop:e,scrollLeft:t}=this.scrollDOM,i=this.viewState.scrollAnchorAt(e);return ln.of(new ni(v.cursor(i.from),"start","start",i.top-e,t,!0))}static domEventHandlers(e){return Z.define(()=>({}),{eventHandlers:e})}static domEventObservers(e){return Z.define(()=>({}),{eventObservers:e})}static theme(e,t){let i=At.newName(),s=[dn.of(i),Ai.of(Nr(`.${i}`,e))];return t&&t.dark&&s.push(Er.of(!0)),s}static baseTheme(e){return di.lowest(Ai.of(Nr("."+Ir,e,Qh)))}static findFromDOM(e){var t;let i=e.querySelector(".cm-content"),s=i&&U.get(i)||U.get(e);return((t=s==null?void 0:s.rootView)===null||t===void 0?void 0:t.view)||null}}P.styleModule=Ai;P.inputHandler=kh;P.focusChangeEffect=Sh;P.perLineTextDirection=Ch;P.exceptionSink=xh;P.updateListener=Or;P.editable=vs;P.mouseSelectionStyle=vh;P.dragMovesSelection=wh;P.clickAddsSelectionRange=bh;P.decorations=Vi;P.atomicRanges=fo;P.bidiIsolatedRanges=Oh;P.scrollMargins=Dh;P.darkTheme=Er;P.cspNonce=R.define({combine:n=>n.length?n[0]:""});P.contentAttributes=co;P.editorAttributes=Mh;P.lineWrapping=P.contentAttributes.of({class:"cm-lineWrapping"});P.announce=I.define();const tp=4096,Ol={};class Gn{constructor(e,t,i,s,r,o){this.from=e,this.to=t,this.dir=i,this.isolates=s,this.fresh=r,this.order=o}static update(e,t){if(t.empty&&!e.some(r=>r.fresh))return e;let i=[],s=e.length?e[e.length-1].dir:X.LTR;for(let r=Math.max(0,e.length-10);r<e.length;r++){let o=e[r];o.dir==s&&!t.touchesRange(o.from,o.to)&&i.push(new Gn(t.mapPos(o.from,1),t.mapPos(o.to,-1),o.dir,o.isolates,!1,o.order))}return i}}function Dl(n,e,t){for(let i=n.state.facet(e),s=i.length-1;s>=0;s--){let r=i[s],o=typeof r=="function"?r(n):r;o&&Cr(o,t)}return t}const ip=B.mac?"mac":B.windows?"win":B.linux?"linux":"key";function np(n,e){const t=n.split(/-(?!$)/);let i=t[t.length-1];i=="Space"&&(i=" ");let s,r,o,l;for(let a=0;a<t.length-1;++a){const h=t[a];if(/^(cmd|meta|m)$/i.test(h))l=!0;else if(/^a(lt)?$/i.test(h))s=!0;else if(/^(c|ctrl|control)$/i.test(h))r=!0;else if(/^s(hift)?$/i.test(h))o=!0;else if(/^mod$/i.test(h))e=="mac"?l=!0:r=!0;else throw new Error("Unrecognized modifier name: "+h)}return s&&(i="Alt-"+i),r&&(i="Ctrl-"+i),l&&(i="Meta-"+i),o&&(i="Shift-"+i),i}function pn(n,e,t){return e.altKey&&(n="Alt-"+n),e.ctrlKey&&(n="Ctrl-"+n),e.metaKey&&(n="Meta-"+n),t!==!1&&e.shiftKey&&(n="Shift-"+n),n}const sp=di.default(P.domEventHandlers({keydown(n,e){return Zh(Xh(e.state),n,e,"editor")}})),po=R.define({enables:sp}),Tl=new WeakMap;function Xh(n){let e=n.facet(po),t=Tl.get(e);return t||Tl.set(e,t=lp(e.reduce((i,s)=>i.concat(s),[]))),t}function rp(n,e,t){return Zh(Xh(n.state),e,n,t)}let yt=null;const op=4e3;function lp(n,e=ip){let t=Object.create(null),i=Object.create(null),s=(o,l)=>{let a=i[o];if(a==null)i[o]=l;else if(a!=l)throw new Error("Key binding "+o+" is used both as a regular binding and as a multi-stroke prefix")},r=(o,l,a,h,c)=>{var f,u;let d=t[o]||(t[o]=Object.create(null)),p=l.split(/ (?!$)/).map(b=>np(b,e));for(let b=1;b<p.length;b++){let k=p.slice(0,b).join(" ");s(k,!0),d[k]||(d[k]={preventDefault:!0,stopPropagation:!1,run:[D=>{let x=yt={view:D,prefix:k,scope:o};return setTimeout(()=>{yt==x&&(yt=null)},op),!0}]})}let g=p.join(" ");s(g,!1);let m=d[g]||(d[g]={preventDefault:!1,stopPropagation:!1,run:((u=(f=d._any)===null||f===void 0?void 0:f.run)===null||u===void 0?void 0:u.slice())||[]});a&&m.run.push(a),h&&(m.preventDefault=!0),c&&(m.stopPropagation=!0)};for(let o of n){let l=o.scope?o.scope.split(" "):["editor"];if(o.any)for(let h of l){let c=t[h]||(t[h]=Object.create(null));c._any||(c._any={preventDefault:!1,stopPropagation:!1,run:[]});for(let f in c)c[f].run.push(o.any)}let a=o[e]||o.key;if(a)for(let h of l)r(h,a,o.run,o.preventDefault,o.stopPropagation),o.shift&&r(h,"Shift-"+a,o.shift,o.preventDefault,o.stopPropagation)}return t}function Zh(n,e,t,i){let s=Ru(e),r=fe(s,0),o=Ne(r)==s.length&&s!=" ",l="",a=!1,h=!1,c=!1;yt&&yt.view==t&&yt.scope==i&&(l=yt.prefix+" ",_h.indexOf(e.keyCode)<0&&(h=!0,yt=null));let f=new Set,u=m=>{if(m){for(let b of m.run)if(!f.has(b)&&(f.add(b),b(t,e)))return m.stopPropagation&&(c=!0),!0;m.preventDefault&&(m.stopPropagation&&(c=!0),h=!0)}return!1},d=n[i],p,g;return d&&(u(d[l+pn(s,e,!o)])?a=!0:o&&(e.altKey||e.metaKey||e.ctrlKey)&&!(B.windows&&e.ctrlKey&&e.altKey)&&(p=Mt[e.keyCode])&&p!=s?(u(d[l+pn(p,e,!0)])||e.shiftKey&&(g=Fi[e.keyCode])!=s&&g!=p&&u(d[l+pn(g,e,!1)]))&&(a=!0):o&&e.shiftKey&&u(d[l+pn(s,e,!0)])&&(a=!0),!a&&u(d._any)&&(a=!0)),h&&(a=!0),a&&c&&e.stopPropagation(),a}class Xi{constructor(e,t,i,s,r){this.className=e,this.left=t,this.top=i,this.width=s,this.height=r}draw(){let e=document.createElement("div");return e.className=this.className,this.adjust(e),e}update(e,t){return t.className!=this.className?!1:(this.adjust(e),!0)}adjust(e){e.style.left=this.left+"px",e.style.top=this.top+"px",this.width!=null&&(e.style.width=this.width+"px"),e.style.height=this.height+"px"}eq(e){return this.left==e.left&&this.top==e.top&&this.width==e.width&&this.height==e.height&&this.className==e.className}static forRange(e,t,i){if(i.empty){let s=e.coordsAtPos(i.head,i.assoc||1);if(!s)return[];let r=ec(e);return[new Xi(t,s.left-r.left,s.top-r.top,null,s.bottom-s.top)]}else return ap(e,t,i)}}function ec(n){let e=n.scrollDOM.getBoundingClientRect();return{left:(n.textDirection==X.LTR?e.left:e.right-n.scrollDOM.clientWidth*n.scaleX)-n.scrollDOM.scrollLeft*n.scaleX,top:e.top-n.scrollDOM.scrollTop*n.scaleY}}function Pl(n,e,t){let i=v.cursor(e);return{from:Math.max(t.from,n.moveToLineBoundary(i,!1,!0).from),to:Math.min(t.to,n.moveToLineBoundary(i,!0,!0).from),type:Se.Text}}function ap(n,e,t){if(t.to<=n.viewport.from||t.from>=n.viewport.to)return[];let i=Math.max(t.from,n.viewport.from),s=Math.min(t.to,n.viewport.to),r=n.textDirection==X.LTR,o=n.contentDOM,l=o.getBoundingClientRect(),a=ec(n),h=o.querySelector(".cm-line"),c=h&&window.getComputedStyle(h),f=l.left+(c?parseInt(c.paddingLeft)+Math.min(0,parseInt(c.textIndent)):0),u=l.right-(c?parseInt(c.paddingRight):0),d=Br(n,i),p=Br(n,s),g=d.type==Se.Text?d:null,m=p.type==Se.Text?p:null;if(g&&(n.lineWrapping||d.widgetLineBreaks)&&(g=Pl(n,i,g)),m&&(n.lineWrapping||p.widgetLineBreaks)&&(m=Pl(n,s,m)),g&&m&&g.from==m.from)return k(D(t.from,t.to,g));{let y=g?D(t.from,null,g):x(d,!1),w=m?D(null,t.to,m):x(p,!0),C=[];return(g||d).to<(m||p).from-(g&&m?1:0)||d.widgetLineBreaks>1&&y.bottom+n.defaultLineHeight/2<w.top?C.push(b(f,y.bottom,u,w.top)):y.bottom<w.top&&n.elementAtHeight((y.bottom+w.top)/2).type==Se.Text&&(y.bottom=w.top=(y.bottom+w.top)/2),k(y).concat(C).concat(k(w))}function b(y,w,C,T){return new Xi(e,y-a.left,w-a.top-.01,C-y,T-w+.01)}function k({top:y,bottom:w,horizontal:C}){let T=[];for(let S=0;S<C.length;S+=2)T.push(b(C[S],y,C[S+1],w));return T}function D(y,w,C){let T=1e9,S=-1e9,L=[];function N(ne,Q,$,Ue,Ae){let ee=n.coordsAtPos(ne,ne==C.to?-2:2),se=n.coordsAtPos($,$==C.from?2:-2);!ee||!se||(T=Math.min(ee.top,se.top,T),S=Math.max(ee.bottom,se.bottom,S),Ae==X.LTR?L.push(r&&Q?f:ee.left,r&&Ue?u:se.right):L.push(!r&&Ue?f:se.left,!r&&Q?u:ee.right))}let F=y??C.from,G=w??C.to;for(let ne of n.visibleRanges)if(ne.to>F&&ne.from<G)for(let Q=Math.max(ne.from,F),$=Math.min(ne.to,G);;){let Ue=n.state.doc.lineAt(Q);for(let Ae of n.bidiSpans(Ue)){let ee=Ae.from+Ue.from,se=Ae.to+Ue.from;if(ee>=$)break;se>Q&&N(Math.max(ee,Q),y==null&&ee<=F,Math.min(se,$),w==null&&se>=G,Ae.dir)}if(Q=Ue.to+1,Q>=$)break}return L.length==0&&N(F,y==null,G,w==null,n.textDirection),{top:T,bottom:S,horizontal:L}}function x(y,w){let C=l.top+(w?y.top:y.bottom);return{top:C,bottom:C,horizontal:[]}}}function hp(n,e){return n.constructor==e.constructor&&n.eq(e)}class cp{constructor(e,t){this.view=e,this.layer=t,this.drawn=[],this.scaleX=1,this.scaleY=1,this.measureReq={read:this.measure.bind(this),write:this.draw.bind(this)},this.dom=e.scrollDOM.appendChild(document.createElement("div")),this.dom.classList.add("cm-layer"),t.above&&this.dom.classList.add("cm-layer-above"),t.class&&this.dom.classList.add(t.class),this.scale(),this.dom.setAttribute("aria-hidden","true"),this.setOrder(e.state),e.requestMeasure(this.measureReq),t.mount&&t.mount(this.dom,e)}update(e){e.startState.facet(Bn)!=e.state.facet(Bn)&&this.setOrder(e.state),(this.layer.update(e,this.dom)||e.geometryChanged)&&(this.scale(),e.view.requestMeasure(this.measureReq))}setOrder(e){let t=0,i=e.facet(Bn);for(;t<i.length&&i[t]!=this.layer;)t++;this.dom.style.zIndex=String((this.layer.above?150:-1)-t)}measure(){return this.layer.markers(this.view)}scale(){let{scaleX:e,scaleY:t}=this.view;(e!=this.scaleX||t!=this.scaleY)&&(this.scaleX=e,this.scaleY=t,this.dom.style.transform=`scale(${1/e}, ${1/t})`)}draw(e){if(e.length!=this.drawn.length||e.some((t,i)=>!hp(t,this.drawn[i]))){let t=this.dom.firstChild,i=0;for(let s of e)s.update&&t&&s.constructor&&this.drawn[i].constructor&&s.update(t,this.drawn[i])?(t=t.nextSibling,i++):this.dom.insertBefore(s.draw(),t);for(;t;){let s=t.nextSibling;t.remove(),t=s}this.drawn=e}}destroy(){this.layer.destroy&&this.layer.destroy(this.dom,this.view),this.dom.remove()}}const Bn=R.define();function tc(n){return[Z.define(e=>new cp(e,n)),Bn.of(n)]}const ic=!B.ios,$i=R.define({combine(n){return Ve(n,{cursorBlinkRate:1200,drawRangeCursor:!0},{cursorBlinkRate:(e,t)=>Math.min(e,t),drawRangeCursor:(e,t)=>e||t})}});function fp(n={}){return[$i.of(n),up,dp,pp,Ah.of(!0)]}function nc(n){return n.startState.facet($i)!=n.state.facet($i)}const up=tc({above:!0,markers(n){let{state:e}=n,t=e.facet($i),i=[];for(let s of e.selection.ranges){let r=s==e.selection.main;if(s.empty?!r||ic:t.drawRangeCursor){let o=r?"cm-cursor cm-cursor-primary":"cm-cursor cm-cursor-secondary",l=s.empty?s:v.cursor(s.head,s.head>s.anchor?-1:1);for(let a of Xi.forRange(n,o,l))i.push(a)}}return i},update(n,e){n.transactions.some(i=>i.selection)&&(e.style.animationName=e.style.animationName=="cm-blink"?"cm-blink2":"cm-blink");let t=nc(n);return t&&Rl(n.state,e),n.docChanged||n.selectionSet||t},mount(n,e){Rl(e.state,n)},class:"cm-cursorLayer"});function Rl(n,e){e.style.animationDuration=n.facet($i).cursorBlinkRate+"ms"}const dp=tc({above:!1,markers(n){return n.state.selection.ranges.map(e=>e.empty?[]:Xi.forRange(n,"cm-selectionBackground",e)).reduce((e,t)=>e.concat(t))},update(n,e){return n.docChanged||n.selectionSet||n.viewportChanged||nc(n)},class:"cm-selectionLayer"}),sc={".cm-line":{"& ::selection":{backgroundColor:"transparent !important"},"&::selection":{backgroundColor:"transparent !important"}}};ic&&(sc[".cm-line"].caretColor="transparent !important");const pp=di.highest(P.theme(sc)),rc=I.define({map(n,e){return n==null?null:e.mapPos(n)}}),Di=ae.define({create(){return null},update(n,e){return n!=null&&(n=e.changes.mapPos(n)),e.effects.reduce((t,i)=>i.is(rc)?i.value:t,n)}}),mp=Z.fromClass(class{constructor(n){this.view=n,this.cursor=null,this.measureReq={read:this.readPos.bind(this),write:this.drawCursor.bind(this)}}update(n){var e;let t=n.state.field(Di);t==null?this.cursor!=null&&((e=this.cursor)===null||e===void 0||e.remove(),this.cursor=null):(this.cursor||(this.cursor=this.view.scrollDOM.appendChild(document.createElement("div")),this.cursor.className="cm-dropCursor"),(n.startState.field(Di)!=t||n.docChanged||n.geometryChanged)&&this.view.requestMeasure(this.measureReq))}readPos(){let{view:n}=this,e=n.state.field(Di),t=e!=null&&n.coordsAtPos(e);if(!t)return null;let i=n.scrollDOM.getBoundingClientRect();return{left:t.left-i.left+n.scrollDOM.scrollLeft*n.scaleX,top:t.top-i.top+n.scrollDOM.scrollTop*n.scaleY,height:t.bottom-t.top}}drawCursor(n){if(this.cursor){let{scaleX:e,scaleY:t}=this.view;n?(this.cursor.style.left=n.left/e+"px",this.cursor.style.top=n.top/t+"px",this.cursor.style.height=n.height/t+"px"):this.cursor.style.left="-100000px"}}destroy(){this.cursor&&this.cursor.remove()}setDropPos(n){this.view.state.field(Di)!=n&&this.view.dispatch({effects:rc.of(n)})}},{eventObservers:{dragover(n){this.setDropPos(this.view.posAtCoords({x:n.clientX,y:n.clientY}))},dragleave(n){(n.target==this.view.contentDOM||!this.view.contentDOM.contains(n.relatedTarget))&&this.setDropPos(null)},dragend(){this.setDropPos(null)},drop(){this.setDropPos(null)}}});function gp(){return[Di,mp]}function Bl(n,e,t,i,s){e.lastIndex=0;for(let r=n.iterRange(t,i),o=t,l;!r.next().done;o+=r.value.length)if(!r.lineBreak)for(;l=e.exec(r.value);)s(o+l.index,l)}function yp(n,e){let t=n.visibleRanges;if(t.length==1&&t[0].from==n.viewport.from&&t[0].to==n.viewport.to)return t;let i=[];for(let{from:s,to:r}of t)s=Math.max(n.state.doc.lineAt(s).from,s-e),r=Math.min(n.state.doc.lineAt(r).to,r+e),i.length&&i[i.length-1].to>=s?i[i.length-1].to=r:i.push({from:s,to:r});return i}class bp{constructor(e){const{regexp:t,decoration:i,decorate:s,boundary:r,maxLength:o=1e3}=e;if(!t.global)throw new RangeError("The regular expression given to MatchDecorator should have its 'g' flag set");if(this.regexp=t,s)this.addMatch=(l,a,h,c)=>s(c,h,h+l[0].length,l,a);else if(typeof i=="function")this.addMatch=(l,a,h,c)=>{let f=i(l,a,h);f&&c(h,h+l[0].length,f)};else if(i)this.addMatch=(l,a,h,c)=>c(h,h+l[0].length,i);else throw new RangeError("Either 'decorate' or 'decoration' should be provided to MatchDecorator");this.boundary=r,this.maxLength=o}createDeco(e){let t=new ht,i=t.add.bind(t);for(let{from:s,to:r}of yp(e,this.maxLength))Bl(e.state.doc,this.regexp,s,r,(o,l)=>this.addMatch(l,e,o,i));return t.finish()}updateDeco(e,t){let i=1e9,s=-1;return e.docChanged&&e.changes.iterChanges((r,o,l,a)=>{a>e.view.viewport.from&&l<e.view.viewport.to&&(i=Math.min(l,i),s=Math.max(a,s))}),e.viewportChanged||s-i>1e3?this.createDeco(e.view):s>-1?this.updateRange(e.view,t.map(e.changes),i,s):t}updateRange(e,t,i,s){for(let r of e.visibleRanges){let o=Math.max(r.from,i),l=Math.min(r.to,s);if(l>o){let a=e.state.doc.lineAt(o),h=a.to<l?e.state.doc.lineAt(l):a,c=Math.max(r.from,a.from),f=Math.min(r.to,h.to);if(this.boundary){for(;o>a.from;o--)if(this.boundary.test(a.text[o-1-a.from])){c=o;break}for(;l<h.to;l++)if(this.boundary.test(h.text[l-h.from])){f=l;break}}let u=[],d,p=(g,m,b)=>u.push(b.range(g,m));if(a==h)for(this.regexp.lastIndex=c-a.from;(d=this.regexp.exec(a.text))&&d.index<f-a.from;)this.addMatch(d,e,d.index+a.from,p);else Bl(e.state.doc,this.regexp,c,f,(g,m)=>this.addMatch(m,e,g,p));t=t.update({filterFrom:c,filterTo:f,filter:(g,m)=>g<c||m>f,add:u})}}return t}}const Fr=/x/.unicode!=null?"gu":"g",wp=new RegExp(`[\0-\b
 --­؜​‎‏\u2028\u2029‭‮⁦⁧⁩\uFEFF￹-￼]`,Fr),vp={0:"null",7:"bell",8:"backspace",10:"newline",11:"vertical tab",13:"carriage return",27:"escape",8203:"zero width space",8204:"zero width non-joiner",8205:"zero width joiner",8206:"left-to-right mark",8207:"right-to-left mark",8232:"line separator",8237:"left-to-right override",8238:"right-to-left override",8294:"left-to-right isolate",8295:"right-to-left isolate",8297:"pop directional isolate",8233:"paragraph separator",65279:"zero width no-break space",65532:"object replacement"};let Ws=null;function xp(){var n;if(Ws==null&&typeof document<"u"&&document.body){let e=document.body.style;Ws=((n=e.tabSize)!==null&&n!==void 0?n:e.MozTabSize)!=null}return Ws||!1}const Ln=R.define({combine(n){let e=Ve(n,{render:null,specialChars:wp,addSpecialChars:null});return(e.replaceTabs=!xp())&&(e.specialChars=new RegExp("	|"+e.specialChars.source,Fr)),e.addSpecialChars&&(e.specialChars=new RegExp(e.specialChars.source+"|"+e.addSpecialChars.source,Fr)),e}});function kp(n={}){return[Ln.of(n),Sp()]}let Ll=null;function Sp(){return Ll||(Ll=Z.fromClass(class{constructor(n){this.view=n,this.decorations=E.none,this.decorationCache=Object.create(null),this.decorator=this.makeDecorator(n.state.facet(Ln)),this.decorations=this.decorator.createDeco(n)}makeDecorator(n){return new bp({regexp:n.specialChars,decoration:(e,t,i)=>{let{doc:s}=t.state,r=fe(e[0],0);if(r==9){let o=s.lineAt(i),l=t.state.tabSize,a=pi(o.text,l,i-o.from);return E.replace({widget:new Op((l-a%l)*this.view.defaultCharacterWidth/this.view.scaleX)})}return this.decorationCache[r]||(this.decorationCache[r]=E.replace({widget:new Mp(n,r)}))},boundary:n.replaceTabs?void 0:/[^]/})}update(n){let e=n.state.facet(Ln);n.startState.facet(Ln)!=e?(this.decorator=this.makeDecorator(e),this.decorations=this.decorator.createDeco(n.view)):this.decorations=this.decorator.updateDeco(n,this.decorations)}},{decorations:n=>n.decorations}))}const Cp="•";function Ap(n){return n>=32?Cp:n==10?"␤":String.fromCharCode(9216+n)}class Mp extends Tt{constructor(e,t){super(),this.options=e,this.code=t}eq(e){return e.code==this.code}toDOM(e){let t=Ap(this.code),i=e.state.phrase("Control character")+" "+(vp[this.code]||"0x"+this.code.toString(16)),s=this.options.render&&this.options.render(this.code,i,t);if(s)return s;let r=document.createElement("span");return r.textContent=t,r.title=i,r.setAttribute("aria-label",i),r.className="cm-specialChar",r}ignoreEvent(){return!1}}class Op extends Tt{constructor(e){super(),this.width=e}eq(e){return e.width==this.width}toDOM(){let e=document.createElement("span");return e.textContent="	",e.className="cm-tab",e.style.width=this.width+"px",e}ignoreEvent(){return!1}}function Dp(){return Pp}const Tp=E.line({class:"cm-activeLine"}),Pp=Z.fromClass(class{constructor(n){this.decorations=this.getDeco(n)}update(n){(n.docChanged||n.selectionSet)&&(this.decorations=this.getDeco(n.view))}getDeco(n){let e=-1,t=[];for(let i of n.state.selection.ranges){let s=n.lineBlockAt(i.head);s.from>e&&(t.push(Tp.range(s.from)),e=s.from)}return E.set(t)}},{decorations:n=>n.decorations}),Hr=2e3;function Rp(n,e,t){let i=Math.min(e.line,t.line),s=Math.max(e.line,t.line),r=[];if(e.off>Hr||t.off>Hr||e.col<0||t.col<0){let o=Math.min(e.off,t.off),l=Math.max(e.off,t.off);for(let a=i;a<=s;a++){let h=n.doc.line(a);h.length<=l&&r.push(v.range(h.from+o,h.to+l))}}else{let o=Math.min(e.col,t.col),l=Math.max(e.col,t.col);for(let a=i;a<=s;a++){let h=n.doc.line(a),c=yr(h.text,o,n.tabSize,!0);if(c<0)r.push(v.cursor(h.to));else{let f=yr(h.text,l,n.tabSize);r.push(v.range(h.from+c,h.from+f))}}}return r}function Bp(n,e){let t=n.coordsAtPos(n.viewport.from);return t?Math.round(Math.abs((t.left-e)/n.defaultCharacterWidth)):-1}function El(n,e){let t=n.posAtCoords({x:e.clientX,y:e.clientY},!1),i=n.state.doc.lineAt(t),s=t-i.from,r=s>Hr?-1:s==i.length?Bp(n,e.clientX):pi(i.text,n.state.tabSize,t-i.from);return{line:i.number,col:r,off:s}}function Lp(n,e){let t=El(n,e),i=n.state.selection;return t?{update(s){if(s.docChanged){let r=s.changes.mapPos(s.startState.doc.line(t.line).from),o=s.state.doc.lineAt(r);t={line:o.number,col:t.col,off:Math.min(t.off,o.length)},i=i.map(s.changes)}},get(s,r,o){let l=El(n,s);if(!l)return i;let a=Rp(n.state,t,l);return a.length?o?v.create(a.concat(i.ranges)):v.create(a):i}}:null}function Ep(n){let e=(n==null?void 0:n.eventFilter)||(t=>t.altKey&&t.button==0);return P.mouseSelectionStyle.of((t,i)=>e(i)?Lp(t,i):null)}const Ip={Alt:[18,n=>!!n.altKey],Control:[17,n=>!!n.ctrlKey],Shift:[16,n=>!!n.shiftKey],Meta:[91,n=>!!n.metaKey]},Np={style:"cursor: crosshair"};function Fp(n={}){let[e,t]=Ip[n.key||"Alt"],i=Z.fromClass(class{constructor(s){this.view=s,this.isDown=!1}set(s){this.isDown!=s&&(this.isDown=s,this.view.update([]))}},{eventObservers:{keydown(s){this.set(s.keyCode==e||t(s))},keyup(s){(s.keyCode==e||!t(s))&&this.set(!1)},mousemove(s){this.set(t(s))}}});return[i,P.contentAttributes.of(s=>{var r;return!((r=s.plugin(i))===null||r===void 0)&&r.isDown?Np:null})]}const vi="-10000px";class oc{constructor(e,t,i){this.facet=t,this.createTooltipView=i,this.input=e.state.facet(t),this.tooltips=this.input.filter(s=>s),this.tooltipViews=this.tooltips.map(i)}update(e,t){var i;let s=e.state.facet(this.facet),r=s.filter(a=>a);if(s===this.input){for(let a of this.tooltipViews)a.update&&a.update(e);return!1}let o=[],l=t?[]:null;for(let a=0;a<r.length;a++){let h=r[a],c=-1;if(h){for(let f=0;f<this.tooltips.length;f++){let u=this.tooltips[f];u&&u.create==h.create&&(c=f)}if(c<0)o[a]=this.createTooltipView(h),l&&(l[a]=!!h.above);else{let f=o[a]=this.tooltipViews[c];l&&(l[a]=t[c]),f.update&&f.update(e)}}}for(let a of this.tooltipViews)o.indexOf(a)<0&&(a.dom.remove(),(i=a.destroy)===null||i===void 0||i.call(a));return t&&(l.forEach((a,h)=>t[h]=a),t.length=l.length),this.input=s,this.tooltips=r,this.tooltipViews=o,!0}}function Hp(n){let{win:e}=n;return{top:0,left:0,bottom:e.innerHeight,right:e.innerWidth}}const $s=R.define({combine:n=>{var e,t,i;return{position:B.ios?"absolute":((e=n.find(s=>s.position))===null||e===void 0?void 0:e.position)||"fixed",parent:((t=n.find(s=>s.parent))===null||t===void 0?void 0:t.parent)||null,tooltipSpace:((i=n.find(s=>s.tooltipSpace))===null||i===void 0?void 0:i.tooltipSpace)||Hp}}}),Il=new WeakMap,lc=Z.fromClass(class{constructor(n){this.view=n,this.above=[],this.inView=!0,this.madeAbsolute=!1,this.lastTransaction=0,this.measureTimeout=-1;let e=n.state.facet($s);this.position=e.position,this.parent=e.parent,this.classes=n.themeClasses,this.createContainer(),this.measureReq={read:this.readMeasure.bind(this),write:this.writeMeasure.bind(this),key:this},this.manager=new oc(n,xs,t=>this.createTooltip(t)),this.intersectionObserver=typeof IntersectionObserver=="function"?new IntersectionObserver(t=>{Date.now()>this.lastTransaction-50&&t.length>0&&t[t.length-1].intersectionRatio<1&&this.measureSoon()},{threshold:[1]}):null,this.observeIntersection(),n.win.addEventListener("resize",this.measureSoon=this.measureSoon.bind(this)),this.maybeMeasure()}createContainer(){this.parent?(this.container=document.createElement("div"),this.container.style.position="relative",this.container.className=this.view.themeClasses,this.parent.appendChild(this.container)):this.container=this.view.dom}observeIntersection(){if(this.intersectionObserver){this.intersectionObserver.disconnect();for(let n of this.manager.tooltipViews)this.intersectionObserver.observe(n.dom)}}measureSoon(){this.measureTimeout<0&&(this.measureTimeout=setTimeout(()=>{this.measureTimeout=-1,this.maybeMeasure()},50))}update(n){n.transactions.length&&(this.lastTransaction=Date.now());let e=this.manager.update(n,this.above);e&&this.observeIntersection();let t=e||n.geometryChanged,i=n.state.facet($s);if(i.position!=this.position&&!this.madeAbsolute){this.position=i.position;for(let s of this.manager.tooltipViews)s.dom.style.position=this.position;t=!0}if(i.parent!=this.parent){this.parent&&this.container.remove(),this.parent=i.parent,this.createContainer();for(let s of this.manager.tooltipViews)this.container.appendChild(s.dom);t=!0}else this.parent&&this.view.themeClasses!=this.classes&&(this.classes=this.container.className=this.view.themeClasses);t&&this.maybeMeasure()}createTooltip(n){let e=n.create(this.view);if(e.dom.classList.add("cm-tooltip"),n.arrow&&!e.dom.querySelector(".cm-tooltip > .cm-tooltip-arrow")){let t=document.createElement("div");t.className="cm-tooltip-arrow",e.dom.appendChild(t)}return e.dom.style.position=this.position,e.dom.style.top=vi,e.dom.style.left="0px",this.container.appendChild(e.dom),e.mount&&e.mount(this.view),e}destroy(){var n,e;this.view.win.removeEventListener("resize",this.measureSoon);for(let t of this.manager.tooltipViews)t.dom.remove(),(n=t.destroy)===null||n===void 0||n.call(t);this.parent&&this.container.remove(),(e=this.intersectionObserver)===null||e===void 0||e.disconnect(),clearTimeout(this.measureTimeout)}readMeasure(){let n=this.view.dom.getBoundingClientRect(),e=1,t=1,i=!1;if(this.position=="fixed"&&this.manager.tooltipViews.length){let{dom:s}=this.manager.tooltipViews[0];if(B.gecko)i=s.offsetParent!=this.container.ownerDocument.body;else if(this.view.scaleX!=1||this.view.scaleY!=1)i=!0;else if(s.style.top==vi&&s.style.left=="0px"){let r=s.getBoundingClientRect();i=Math.abs(r.top+1e4)>1||Math.abs(r.left)>1}}if(i||this.position=="absolute")if(this.parent){let s=this.parent.getBoundingClientRect();s.width&&s.height&&(e=s.width/this.parent.offsetWidth,t=s.height/this.parent.offsetHeight)}else({scaleX:e,scaleY:t}=this.view.viewState);return{editor:n,parent:this.parent?this.container.getBoundingClientRect():n,pos:this.manager.tooltips.map((s,r)=>{let o=this.manager.tooltipViews[r];return o.getCoords?o.getCoords(s.pos):this.view.coordsAtPos(s.pos)}),size:this.manager.tooltipViews.map(({dom:s})=>s.getBoundingClientRect()),space:this.view.state.facet($s).tooltipSpace(this.view),scaleX:e,scaleY:t,makeAbsolute:i}}writeMeasure(n){var e;if(n.makeAbsolute){this.madeAbsolute=!0,this.position="absolute";for(let l of this.manager.tooltipViews)l.dom.style.position="absolute"}let{editor:t,space:i,scaleX:s,scaleY:r}=n,o=[];for(let l=0;l<this.manager.tooltips.length;l++){let a=this.manager.tooltips[l],h=this.manager.tooltipViews[l],{dom:c}=h,f=n.pos[l],u=n.size[l];if(!f||f.bottom<=Math.max(t.top,i.top)||f.top>=Math.min(t.bottom,i.bottom)||f.right<Math.max(t.left,i.left)-.1||f.left>Math.min(t.right,i.right)+.1){c.style.top=vi;continue}let d=a.arrow?h.dom.querySelector(".cm-tooltip-arrow"):null,p=d?7:0,g=u.right-u.left,m=(e=Il.get(h))!==null&&e!==void 0?e:u.bottom-u.top,b=h.offset||Vp,k=this.view.textDirection==X.LTR,D=u.width>i.right-i.left?k?i.left:i.right-u.width:k?Math.min(f.left-(d?14:0)+b.x,i.right-g):Math.max(i.left,f.left-g+(d?14:0)-b.x),x=this.above[l];!a.strictSide&&(x?f.top-(u.bottom-u.top)-b.y<i.top:f.bottom+(u.bottom-u.top)+b.y>i.bottom)&&x==i.bottom-f.bottom>f.top-i.top&&(x=this.above[l]=!x);let y=(x?f.top-i.top:i.bottom-f.bottom)-p;if(y<m&&h.resize!==!1){if(y<this.view.defaultLineHeight){c.style.top=vi;continue}Il.set(h,m),c.style.height=(m=y)/r+"px"}else c.style.height&&(c.style.height="");let w=x?f.top-m-p-b.y:f.bottom+p+b.y,C=D+g;if(h.overlap!==!0)for(let T of o)T.left<C&&T.right>D&&T.top<w+m&&T.bottom>w&&(w=x?T.top-m-2-p:T.bottom+p+2);if(this.position=="absolute"?(c.style.top=(w-n.parent.top)/r+"px",c.style.left=(D-n.parent.left)/s+"px"):(c.style.top=w/r+"px",c.style.left=D/s+"px"),d){let T=f.left+(k?b.x:-b.x)-(D+14-7);d.style.left=T/s+"px"}h.overlap!==!0&&o.push({left:D,top:w,right:C,bottom:w+m}),c.classList.toggle("cm-tooltip-above",x),c.classList.toggle("cm-tooltip-below",!x),h.positioned&&h.positioned(n.space)}}maybeMeasure(){if(this.manager.tooltips.length&&(this.view.inView&&this.view.requestMeasure(this.measureReq),this.inView!=this.view.inView&&(this.inView=this.view.inView,!this.inView)))for(let n of this.manager.tooltipViews)n.dom.style.top=vi}},{eventObservers:{scroll(){this.maybeMeasure()}}}),_p=P.baseTheme({".cm-tooltip":{zIndex:100,boxSizing:"border-box"},"&light .cm-tooltip":{border:"1px solid #bbb",backgroundColor:"#f5f5f5"},"&light .cm-tooltip-section:not(:first-child)":{borderTop:"1px solid #bbb"},"&dark .cm-tooltip":{backgroundColor:"#333338",color:"white"},".cm-tooltip-arrow":{height:"7px",width:`${7*2}px`,position:"absolute",zIndex:-1,overflow:"hidden","&:before, &:after":{content:"''",position:"absolute",width:0,height:0,borderLeft:"7px solid transparent",borderRight:"7px solid transparent"},".cm-tooltip-above &":{bottom:"-7px","&:before":{borderTop:"7px solid #bbb"},"&:after":{borderTop:"7px solid #f5f5f5",bottom:"1px"}},".cm-tooltip-below &":{top:"-7px","&:before":{borderBottom:"7px solid #bbb"},"&:after":{borderBottom:"7px solid #f5f5f5",top:"1px"}}},"&dark .cm-tooltip .cm-tooltip-arrow":{"&:before":{borderTopColor:"#333338",borderBottomColor:"#333338"},"&:after":{borderTopColor:"transparent",borderBottomColor:"transparent"}}}),Vp={x:0,y:0},xs=R.define({enables:[lc,_p]}),Yn=R.define();class mo{static create(e){return new mo(e)}constructor(e){this.view=e,this.mounted=!1,this.dom=document.createElement("div"),this.dom.classList.add("cm-tooltip-hover"),this.manager=new oc(e,Yn,t=>this.createHostedView(t))}createHostedView(e){let t=e.create(this.view);return t.dom.classList.add("cm-tooltip-section"),this.dom.appendChild(t.dom),this.mounted&&t.mount&&t.mount(this.view),t}mount(e){for(let t of this.manager.tooltipViews)t.mount&&t.mount(e);this.mounted=!0}positioned(e){for(let t of this.manager.tooltipViews)t.positioned&&t.positioned(e)}update(e){this.manager.update(e)}destroy(){var e;for(let t of this.manager.tooltipViews)(e=t.destroy)===null||e===void 0||e.call(t)}passProp(e){let t;for(let i of this.manager.tooltipViews){let s=i[e];if(s!==void 0){if(t===void 0)t=s;else if(t!==s)return}}return t}get offset(){return this.passProp("offset")}get getCoords(){return this.passProp("getCoords")}get overlap(){return this.passProp("overlap")}get resize(){return this.passProp("resize")}}const Wp=xs.compute([Yn],n=>{let e=n.facet(Yn).filter(t=>t);return e.length===0?null:{pos:Math.min(...e.map(t=>t.pos)),end:Math.max(...e.filter(t=>t.end!=null).map(t=>t.end)),create:mo.create,above:e[0].above,arrow:e.some(t=>t.arrow)}});class $p{constructor(e,t,i,s,r){this.view=e,this.source=t,this.field=i,this.setHover=s,this.hoverTime=r,this.hoverTimeout=-1,this.restartTimeout=-1,this.pending=null,this.lastMove={x:0,y:0,target:e.dom,time:0},this.checkHover=this.checkHover.bind(this),e.dom.addEventListener("mouseleave",this.mouseleave=this.mouseleave.bind(this)),e.dom.addEventListener("mousemove",this.mousemove=this.mousemove.bind(this))}update(){this.pending&&(this.pending=null,clearTimeout(this.restartTimeout),this.restartTimeout=setTimeout(()=>this.startHover(),20))}get active(){return this.view.state.field(this.field)}checkHover(){if(this.hoverTimeout=-1,this.active)return;let e=Date.now()-this.lastMove.time;e<this.hoverTime?this.hoverTimeout=setTimeout(this.checkHover,this.hoverTime-e):this.startHover()}startHover(){clearTimeout(this.restartTimeout);let{view:e,lastMove:t}=this,i=e.docView.nearest(t.target);if(!i)return;let s,r=1;if(i instanceof wt)s=i.posAtStart;else{if(s=e.posAtCoords(t),s==null)return;let l=e.coordsAtPos(s);if(!l||t.y<l.top||t.y>l.bottom||t.x<l.left-e.defaultCharacterWidth||t.x>l.right+e.defaultCharacterWidth)return;let a=e.bidiSpans(e.state.doc.lineAt(s)).find(c=>c.from<=s&&c.to>=s),h=a&&a.dir==X.RTL?-1:1;r=t.x<l.left?-h:h}let o=this.source(e,s,r);if(o!=null&&o.then){let l=this.pending={pos:s};o.then(a=>{this.pending==l&&(this.pending=null,a&&e.dispatch({effects:this.setHover.of(a)}))},a=>Ie(e.state,a,"hover tooltip"))}else o&&e.dispatch({effects:this.setHover.of(o)})}mousemove(e){var t;this.lastMove={x:e.clientX,y:e.clientY,target:e.target,time:Date.now()},this.hoverTimeout<0&&(this.hoverTimeout=setTimeout(this.checkHover,this.hoverTime));let i=this.active;if(i&&!Nl(this.lastMove.target)||this.pending){let{pos:s}=i||this.pending,r=(t=i==null?void 0:i.end)!==null&&t!==void 0?t:s;(s==r?this.view.posAtCoords(this.lastMove)!=s:!zp(this.view,s,r,e.clientX,e.clientY))&&(this.view.dispatch({effects:this.setHover.of(null)}),this.pending=null)}}mouseleave(e){clearTimeout(this.hoverTimeout),this.hoverTimeout=-1,this.active&&!Nl(e.relatedTarget)&&this.view.dispatch({effects:this.setHover.of(null)})}destroy(){clearTimeout(this.hoverTimeout),this.view.dom.removeEventListener("mouseleave",this.mouseleave),this.view.dom.removeEventListener("mousemove",this.mousemove)}}function Nl(n){for(let e=n;e;e=e.parentNode)if(e.nodeType==1&&e.classList.contains("cm-tooltip"))return!0;return!1}function zp(n,e,t,i,s,r){let o=n.scrollDOM.getBoundingClientRect(),l=n.documentTop+n.documentPadding.top+n.contentHeight;if(o.left>i||o.right<i||o.top>s||Math.min(o.bottom,l)<s)return!1;let a=n.posAtCoords({x:i,y:s},!1);return a>=e&&a<=t}function jp(n,e={}){let t=I.define(),i=ae.define({create(){return null},update(s,r){if(s&&(e.hideOnChange&&(r.docChanged||r.selection)||e.hideOn&&e.hideOn(r,s)))return null;if(s&&r.docChanged){let o=r.changes.mapPos(s.pos,-1,ke.TrackDel);if(o==null)return null;let l=Object.assign(Object.create(null),s);l.pos=o,s.end!=null&&(l.end=r.changes.mapPos(s.end)),s=l}for(let o of r.effects)o.is(t)&&(s=o.value),o.is(qp)&&(s=null);return s},provide:s=>Yn.from(s)});return[i,Z.define(s=>new $p(s,n,i,t,e.hoverTime||300)),Wp]}function ac(n,e){let t=n.plugin(lc);if(!t)return null;let i=t.manager.tooltips.indexOf(e);return i<0?null:t.manager.tooltipViews[i]}const qp=I.define(),Fl=R.define({combine(n){let e,t;for(let i of n)e=e||i.topContainer,t=t||i.bottomContainer;return{topContainer:e,bottomContainer:t}}});function zi(n,e){let t=n.plugin(hc),i=t?t.specs.indexOf(e):-1;return i>-1?t.panels[i]:null}const hc=Z.fromClass(class{constructor(n){this.input=n.state.facet(ji),this.specs=this.input.filter(t=>t),this.panels=this.specs.map(t=>t(n));let e=n.state.facet(Fl);this.top=new mn(n,!0,e.topContainer),this.bottom=new mn(n,!1,e.bottomContainer),this.top.sync(this.panels.filter(t=>t.top)),this.bottom.sync(this.panels.filter(t=>!t.top));for(let t of this.panels)t.dom.classList.add("cm-panel"),t.mount&&t.mount()}update(n){let e=n.state.facet(Fl);this.top.container!=e.topContainer&&(this.top.sync([]),this.top=new mn(n.view,!0,e.topContainer)),this.bottom.container!=e.bottomContainer&&(this.bottom.sync([]),this.bottom=new mn(n.view,!1,e.bottomContainer)),this.top.syncClasses(),this.bottom.syncClasses();let t=n.state.facet(ji);if(t!=this.input){let i=t.filter(a=>a),s=[],r=[],o=[],l=[];for(let a of i){let h=this.specs.indexOf(a),c;h<0?(c=a(n.view),l.push(c)):(c=this.panels[h],c.update&&c.update(n)),s.push(c),(c.top?r:o).push(c)}this.specs=i,this.panels=s,this.top.sync(r),this.bottom.sync(o);for(let a of l)a.dom.classList.add("cm-panel"),a.mount&&a.mount()}else for(let i of this.panels)i.update&&i.update(n)}destroy(){this.top.sync([]),this.bottom.sync([])}},{provide:n=>P.scrollMargins.of(e=>{let t=e.plugin(n);return t&&{top:t.top.scrollMargin(),bottom:t.bottom.scrollMargin()}})});class mn{constructor(e,t,i){this.view=e,this.top=t,this.container=i,this.dom=void 0,this.classes="",this.panels=[],this.syncClasses()}sync(e){for(let t of this.panels)t.destroy&&e.indexOf(t)<0&&t.destroy();this.panels=e,this.syncDOM()}syncDOM(){if(this.panels.length==0){this.dom&&(this.dom.remove(),this.dom=void 0);return}if(!this.dom){this.dom=document.createElement("div"),this.dom.className=this.top?"cm-panels cm-panels-top":"cm-panels cm-panels-bottom",this.dom.style[this.top?"top":"bottom"]="0";let t=this.container||this.view.dom;t.insertBefore(this.dom,this.top?t.firstChild:null)}let e=this.dom.firstChild;for(let t of this.panels)if(t.dom.parentNode==this.dom){for(;e!=t.dom;)e=Hl(e);e=e.nextSibling}else this.dom.insertBefore(t.dom,e);for(;e;)e=Hl(e)}scrollMargin(){return!this.dom||this.container?0:Math.max(0,this.top?this.dom.getBoundingClientRect().bottom-Math.max(0,this.view.scrollDOM.getBoundingClientRect().top):Math.min(innerHeight,this.view.scrollDOM.getBoundingClientRect().bottom)-this.dom.getBoundingClientRect().top)}syncClasses(){if(!(!this.container||this.classes==this.view.themeClasses)){for(let e of this.classes.split(" "))e&&this.container.classList.remove(e);for(let e of(this.classes=this.view.themeClasses).split(" "))e&&this.container.classList.add(e)}}}function Hl(n){let e=n.nextSibling;return n.remove(),e}const ji=R.define({enables:hc});class st extends Wt{compare(e){return this==e||this.constructor==e.constructor&&this.eq(e)}eq(e){return!1}destroy(e){}}st.prototype.elementClass="";st.prototype.toDOM=void 0;st.prototype.mapMode=ke.TrackBefore;st.prototype.startSide=st.prototype.endSide=-1;st.prototype.point=!0;const En=R.define(),Kp={class:"",renderEmptyElements:!1,elementStyle:"",markers:()=>V.empty,lineMarker:()=>null,widgetMarker:()=>null,lineMarkerChange:null,initialSpacer:null,updateSpacer:null,domEventHandlers:{}},Ei=R.define();function cc(n){return[fc(),Ei.of(Object.assign(Object.assign({},Kp),n))]}const _r=R.define({combine:n=>n.some(e=>e)});function fc(n){let e=[Up];return n&&n.fixed===!1&&e.push(_r.of(!0)),e}const Up=Z.fromClass(class{constructor(n){this.view=n,this.prevViewport=n.viewport,this.dom=document.createElement("div"),this.dom.className="cm-gutters",this.dom.setAttribute("aria-hidden","true"),this.dom.style.minHeight=this.view.contentHeight/this.view.scaleY+"px",this.gutters=n.state.facet(Ei).map(e=>new Vl(n,e));for(let e of this.gutters)this.dom.appendChild(e.dom);this.fixed=!n.state.facet(_r),this.fixed&&(this.dom.style.position="sticky"),this.syncGutters(!1),n.scrollDOM.insertBefore(this.dom,n.contentDOM)}update(n){if(this.updateGutters(n)){let e=this.prevViewport,t=n.view.viewport,i=Math.min(e.to,t.to)-Math.max(e.from,t.from);this.syncGutters(i<(t.to-t.from)*.8)}n.geometryChanged&&(this.dom.style.minHeight=this.view.contentHeight+"px"),this.view.state.facet(_r)!=!this.fixed&&(this.fixed=!this.fixed,this.dom.style.position=this.fixed?"sticky":""),this.prevViewport=n.view.viewport}syncGutters(n){let e=this.dom.nextSibling;n&&this.dom.remove();let t=V.iter(this.view.state.facet(En),this.view.viewport.from),i=[],s=this.gutters.map(r=>new Gp(r,this.view.viewport,-this.view.documentPadding.top));for(let r of this.view.viewportLineBlocks)if(i.length&&(i=[]),Array.isArray(r.type)){let o=!0;for(let l of r.type)if(l.type==Se.Text&&o){Vr(t,i,l.from);for(let a of s)a.line(this.view,l,i);o=!1}else if(l.widget)for(let a of s)a.widget(this.view,l)}else if(r.type==Se.Text){Vr(t,i,r.from);for(let o of s)o.line(this.view,r,i)}else if(r.widget)for(let o of s)o.widget(this.view,r);for(let r of s)r.finish();n&&this.view.scrollDOM.insertBefore(this.dom,e)}updateGutters(n){let e=n.startState.facet(Ei),t=n.state.facet(Ei),i=n.docChanged||n.heightChanged||n.viewportChanged||!V.eq(n.startState.facet(En),n.state.facet(En),n.view.viewport.from,n.view.viewport.to);if(e==t)for(let s of this.gutters)s.update(n)&&(i=!0);else{i=!0;let s=[];for(let r of t){let o=e.indexOf(r);o<0?s.push(new Vl(this.view,r)):(this.gutters[o].update(n),s.push(this.gutters[o]))}for(let r of this.gutters)r.dom.remove(),s.indexOf(r)<0&&r.destroy();for(let r of s)this.dom.appendChild(r.dom);this.gutters=s}return i}destroy(){for(let n of this.gutters)n.destroy();this.dom.remove()}},{provide:n=>P.scrollMargins.of(e=>{let t=e.plugin(n);return!t||t.gutters.length==0||!t.fixed?null:e.textDirection==X.LTR?{left:t.dom.offsetWidth*e.scaleX}:{right:t.dom.offsetWidth*e.scaleX}})});function _l(n){return Array.isArray(n)?n:[n]}function Vr(n,e,t){for(;n.value&&n.from<=t;)n.from==t&&e.push(n.value),n.next()}class Gp{constructor(e,t,i){this.gutter=e,this.height=i,this.i=0,this.cursor=V.iter(e.markers,t.from)}addElement(e,t,i){let{gutter:s}=this,r=(t.top-this.height)/e.scaleY,o=t.height/e.scaleY;if(this.i==s.elements.length){let l=new uc(e,o,r,i);s.elements.push(l),s.dom.appendChild(l.dom)}else s.elements[this.i].update(e,o,r,i);this.height=t.bottom,this.i++}line(e,t,i){let s=[];Vr(this.cursor,s,t.from),i.length&&(s=s.concat(i));let r=this.gutter.config.lineMarker(e,t,s);r&&s.unshift(r);let o=this.gutter;s.length==0&&!o.config.renderEmptyElements||this.addElement(e,t,s)}widget(e,t){let i=this.gutter.config.widgetMarker(e,t.widget,t);i&&this.addElement(e,t,[i])}finish(){let e=this.gutter;for(;e.elements.length>this.i;){let t=e.elements.pop();e.dom.removeChild(t.dom),t.destroy()}}}class Vl{constructor(e,t){this.view=e,this.config=t,this.elements=[],this.spacer=null,this.dom=document.createElement("div"),this.dom.className="cm-gutter"+(this.config.class?" "+this.config.class:"");for(let i in t.domEventHandlers)this.dom.addEventListener(i,s=>{let r=s.target,o;if(r!=this.dom&&this.dom.contains(r)){for(;r.parentNode!=this.dom;)r=r.parentNode;let a=r.getBoundingClientRect();o=(a.top+a.bottom)/2}else o=s.clientY;let l=e.lineBlockAtHeight(o-e.documentTop);t.domEventHandlers[i](e,l,s)&&s.preventDefault()});this.markers=_l(t.markers(e)),t.initialSpacer&&(this.spacer=new uc(e,0,0,[t.initialSpacer(e)]),this.dom.appendChild(this.spacer.dom),this.spacer.dom.style.cssText+="visibility: hidden; pointer-events: none")}update(e){let t=this.markers;if(this.markers=_l(this.config.markers(e.view)),this.spacer&&this.config.updateSpacer){let s=this.config.updateSpacer(this.spacer.markers[0],e);s!=this.spacer.markers[0]&&this.spacer.update(e.view,0,0,[s])}let i=e.view.viewport;return!V.eq(this.markers,t,i.from,i.to)||(this.config.lineMarkerChange?this.config.lineMarkerChange(e):!1)}destroy(){for(let e of this.elements)e.destroy()}}class uc{constructor(e,t,i,s){this.height=-1,this.above=0,this.markers=[],this.dom=document.createElement("div"),this.dom.className="cm-gutterElement",this.update(e,t,i,s)}update(e,t,i,s){this.height!=t&&(this.height=t,this.dom.style.height=t+"px"),this.above!=i&&(this.dom.style.marginTop=(this.above=i)?i+"px":""),Yp(this.markers,s)||this.setMarkers(e,s)}setMarkers(e,t){let i="cm-gutterElement",s=this.dom.firstChild;for(let r=0,o=0;;){let l=o,a=r<t.length?t[r++]:null,h=!1;if(a){let c=a.elementClass;c&&(i+=" "+c);for(let f=o;f<this.markers.length;f++)if(this.markers[f].compare(a)){l=f,h=!0;break}}else l=this.markers.length;for(;o<l;){let c=this.markers[o++];if(c.toDOM){c.destroy(s);let f=s.nextSibling;s.remove(),s=f}}if(!a)break;a.toDOM&&(h?s=s.nextSibling:this.dom.insertBefore(a.toDOM(e),s)),h&&o++}this.dom.className=i,this.markers=t}destroy(){this.setMarkers(null,[])}}function Yp(n,e){if(n.length!=e.length)return!1;for(let t=0;t<n.length;t++)if(!n[t].compare(e[t]))return!1;return!0}const Qp=R.define(),Jt=R.define({combine(n){return Ve(n,{formatNumber:String,domEventHandlers:{}},{domEventHandlers(e,t){let i=Object.assign({},e);for(let s in t){let r=i[s],o=t[s];i[s]=r?(l,a,h)=>r(l,a,h)||o(l,a,h):o}return i}})}});class zs extends st{constructor(e){super(),this.number=e}eq(e){return this.number==e.number}toDOM(){return document.createTextNode(this.number)}}function js(n,e){return n.state.facet(Jt).formatNumber(e,n.state)}const Jp=Ei.compute([Jt],n=>({class:"cm-lineNumbers",renderEmptyElements:!1,markers(e){return e.state.facet(Qp)},lineMarker(e,t,i){return i.some(s=>s.toDOM)?null:new zs(js(e,e.state.doc.lineAt(t.from).number))},widgetMarker:()=>null,lineMarkerChange:e=>e.startState.facet(Jt)!=e.state.facet(Jt),initialSpacer(e){return new zs(js(e,Wl(e.state.doc.lines)))},updateSpacer(e,t){let i=js(t.view,Wl(t.view.state.doc.lines));return i==e.number?e:new zs(i)},domEventHandlers:n.facet(Jt).domEventHandlers}));function Xp(n={}){return[Jt.of(n),fc(),Jp]}function Wl(n){let e=9;for(;e<n;)e=e*10+9;return e}const Zp=new class extends st{constructor(){super(...arguments),this.elementClass="cm-activeLineGutter"}},em=En.compute(["selection"],n=>{let e=[],t=-1;for(let i of n.selection.ranges){let s=n.doc.lineAt(i.head).from;s>t&&(t=s,e.push(Zp.range(s)))}return V.of(e)});function tm(){return em}const dc=1024;let im=0;class qs{constructor(e,t){this.from=e,this.to=t}}class H{constructor(e={}){this.id=im++,this.perNode=!!e.perNode,this.deserialize=e.deserialize||(()=>{throw new Error("This node type doesn't define a deserialize function")})}add(e){if(this.perNode)throw new RangeError("Can't add per-node props to node types");return typeof e!="function"&&(e=De.match(e)),t=>{let i=e(t);return i===void 0?null:[this,i]}}}H.closedBy=new H({deserialize:n=>n.split(" ")});H.openedBy=new H({deserialize:n=>n.split(" ")});H.group=new H({deserialize:n=>n.split(" ")});H.contextHash=new H({perNode:!0});H.lookAhead=new H({perNode:!0});H.mounted=new H({perNode:!0});class Qn{constructor(e,t,i){this.tree=e,this.overlay=t,this.parser=i}static get(e){return e&&e.props&&e.props[H.mounted.id]}}const nm=Object.create(null);class De{constructor(e,t,i,s=0){this.name=e,this.props=t,this.id=i,this.flags=s}static define(e){let t=e.props&&e.props.length?Object.create(null):nm,i=(e.top?1:0)|(e.skipped?2:0)|(e.error?4:0)|(e.name==null?8:0),s=new De(e.name||"",t,e.id,i);if(e.props){for(let r of e.props)if(Array.isArray(r)||(r=r(s)),r){if(r[0].perNode)throw new RangeError("Can't store a per-node prop on a node type");t[r[0].id]=r[1]}}return s}prop(e){return this.props[e.id]}get isTop(){return(this.flags&1)>0}get isSkipped(){return(this.flags&2)>0}get isError(){return(this.flags&4)>0}get isAnonymous(){return(this.flags&8)>0}is(e){if(typeof e=="string"){if(this.name==e)return!0;let t=this.prop(H.group);return t?t.indexOf(e)>-1:!1}return this.id==e}static match(e){let t=Object.create(null);for(let i in e)for(let s of i.split(" "))t[s]=e[i];return i=>{for(let s=i.prop(H.group),r=-1;r<(s?s.length:0);r++){let o=t[r<0?i.name:s[r]];if(o)return o}}}}De.none=new De("",Object.create(null),0,8);class go{constructor(e){this.types=e;for(let t=0;t<e.length;t++)if(e[t].id!=t)throw new RangeError("Node type ids should correspond to array positions when creating a node set")}extend(...e){let t=[];for(let i of this.types){let s=null;for(let r of e){let o=r(i);o&&(s||(s=Object.assign({},i.props)),s[o[0].id]=o[1])}t.push(s?new De(i.name,s,i.id,i.flags):i)}return new go(t)}}const gn=new WeakMap,$l=new WeakMap;var he;(function(n){n[n.ExcludeBuffers=1]="ExcludeBuffers",n[n.IncludeAnonymous=2]="IncludeAnonymous",n[n.IgnoreMounts=4]="IgnoreMounts",n[n.IgnoreOverlays=8]="IgnoreOverlays"})(he||(he={}));class ie{constructor(e,t,i,s,r){if(this.type=e,this.children=t,this.positions=i,this.length=s,this.props=null,r&&r.length){this.props=Object.create(null);for(let[o,l]of r)this.props[typeof o=="number"?o:o.id]=l}}toString(){let e=Qn.get(this);if(e&&!e.overlay)return e.tree.toString();let t="";for(let i of this.children){let s=i.toString();s&&(t&&(t+=","),t+=s)}return this.type.name?(/\W/.test(this.type.name)&&!this.type.isError?JSON.stringify(this.type.name):this.type.name)+(t.length?"("+t+")":""):t}cursor(e=0){return new $r(this.topNode,e)}cursorAt(e,t=0,i=0){let s=gn.get(this)||this.topNode,r=new $r(s);return r.moveTo(e,t),gn.set(this,r._tree),r}get topNode(){return new _e(this,0,0,null)}resolve(e,t=0){let i=qi(gn.get(this)||this.topNode,e,t,!1);return gn.set(this,i),i}resolveInner(e,t=0){let i=qi($l.get(this)||this.topNode,e,t,!0);return $l.set(this,i),i}resolveStack(e,t=0){return om(this,e,t)}iterate(e){let{enter:t,leave:i,from:s=0,to:r=this.length}=e,o=e.mode||0,l=(o&he.IncludeAnonymous)>0;for(let a=this.cursor(o|he.IncludeAnonymous);;){let h=!1;if(a.from<=r&&a.to>=s&&(!l&&a.type.isAnonymous||t(a)!==!1)){if(a.firstChild())continue;h=!0}for(;h&&i&&(l||!a.type.isAnonymous)&&i(a),!a.nextSibling();){if(!a.parent())return;h=!0}}}prop(e){return e.perNode?this.props?this.props[e.id]:void 0:this.type.prop(e)}get propValues(){let e=[];if(this.props)for(let t in this.props)e.push([+t,this.props[t]]);return e}balance(e={}){return this.children.length<=8?this:wo(De.none,this.children,this.positions,0,this.children.length,0,this.length,(t,i,s)=>new ie(this.type,t,i,s,this.propValues),e.makeTree||((t,i,s)=>new ie(De.none,t,i,s)))}static build(e){return lm(e)}}ie.empty=new ie(De.none,[],[],0);class yo{constructor(e,t){this.buffer=e,this.index=t}get id(){return this.buffer[this.index-4]}get start(){return this.buffer[this.index-3]}get end(){return this.buffer[this.index-2]}get size(){return this.buffer[this.index-1]}get pos(){return this.index}next(){this.index-=4}fork(){return new yo(this.buffer,this.index)}}class qt{constructor(e,t,i){this.buffer=e,this.length=t,this.set=i}get type(){return De.none}toString(){let e=[];for(let t=0;t<this.buffer.length;)e.push(this.childString(t)),t=this.buffer[t+3];return e.join(",")}childString(e){let t=this.buffer[e],i=this.buffer[e+3],s=this.set.types[t],r=s.name;if(/\W/.test(r)&&!s.isError&&(r=JSON.stringify(r)),e+=4,i==e)return r;let o=[];for(;e<i;)o.push(this.childString(e)),e=this.buffer[e+3];return r+"("+o.join(",")+")"}findChild(e,t,i,s,r){let{buffer:o}=this,l=-1;for(let a=e;a!=t&&!(pc(r,s,o[a+1],o[a+2])&&(l=a,i>0));a=o[a+3]);return l}slice(e,t,i){let s=this.buffer,r=new Uint16Array(t-e),o=0;for(let l=e,a=0;l<t;){r[a++]=s[l++],r[a++]=s[l++]-i;let h=r[a++]=s[l++]-i;r[a++]=s[l++]-e,o=Math.max(o,h)}return new qt(r,o,this.set)}}function pc(n,e,t,i){switch(n){case-2:return t<e;case-1:return i>=e&&t<e;case 0:return t<e&&i>e;case 1:return t<=e&&i>e;case 2:return i>e;case 4:return!0}}function qi(n,e,t,i){for(var s;n.from==n.to||(t<1?n.from>=e:n.from>e)||(t>-1?n.to<=e:n.to<e);){let o=!i&&n instanceof _e&&n.index<0?null:n.parent;if(!o)return n;n=o}let r=i?0:he.IgnoreOverlays;if(i)for(let o=n,l=o.parent;l;o=l,l=o.parent)o instanceof _e&&o.index<0&&((s=l.enter(e,t,r))===null||s===void 0?void 0:s.from)!=o.from&&(n=l);for(;;){let o=n.enter(e,t,r);if(!o)return n;n=o}}class mc{cursor(e=0){return new $r(this,e)}getChild(e,t=null,i=null){let s=zl(this,e,t,i);return s.length?s[0]:null}getChildren(e,t=null,i=null){return zl(this,e,t,i)}resolve(e,t=0){return qi(this,e,t,!1)}resolveInner(e,t=0){return qi(this,e,t,!0)}matchContext(e){return Wr(this,e)}enterUnfinishedNodesBefore(e){let t=this.childBefore(e),i=this;for(;t;){let s=t.lastChild;if(!s||s.to!=t.to)break;s.type.isError&&s.from==s.to?(i=t,t=s.prevSibling):t=s}return i}get node(){return this}get next(){return this.parent}}class _e extends mc{constructor(e,t,i,s){super(),this._tree=e,this.from=t,this.index=i,this._parent=s}get type(){return this._tree.type}get name(){return this._tree.type.name}get to(){return this.from+this._tree.length}nextChild(e,t,i,s,r=0){for(let o=this;;){for(let{children:l,positions:a}=o._tree,h=t>0?l.length:-1;e!=h;e+=t){let c=l[e],f=a[e]+o.from;if(pc(s,i,f,f+c.length)){if(c instanceof qt){if(r&he.ExcludeBuffers)continue;let u=c.findChild(0,c.buffer.length,t,i-f,s);if(u>-1)return new xt(new sm(o,c,e,f),null,u)}else if(r&he.IncludeAnonymous||!c.type.isAnonymous||bo(c)){let u;if(!(r&he.IgnoreMounts)&&(u=Qn.get(c))&&!u.overlay)return new _e(u.tree,f,e,o);let d=new _e(c,f,e,o);return r&he.IncludeAnonymous||!d.type.isAnonymous?d:d.nextChild(t<0?c.children.length-1:0,t,i,s)}}}if(r&he.IncludeAnonymous||!o.type.isAnonymous||(o.index>=0?e=o.index+t:e=t<0?-1:o._parent._tree.children.length,o=o._parent,!o))return null}}get firstChild(){return this.nextChild(0,1,0,4)}get lastChild(){return this.nextChild(this._tree.children.length-1,-1,0,4)}childAfter(e){return this.nextChild(0,1,e,2)}childBefore(e){return this.nextChild(this._tree.children.length-1,-1,e,-2)}enter(e,t,i=0){let s;if(!(i&he.IgnoreOverlays)&&(s=Qn.get(this._tree))&&s.overlay){let r=e-this.from;for(let{from:o,to:l}of s.overlay)if((t>0?o<=r:o<r)&&(t<0?l>=r:l>r))return new _e(s.tree,s.overlay[0].from+this.from,-1,this)}return this.nextChild(0,1,e,t,i)}nextSignificantParent(){let e=this;for(;e.type.isAnonymous&&e._parent;)e=e._parent;return e}get parent(){return this._parent?this._parent.nextSignificantParent():null}get nextSibling(){return this._parent&&this.index>=0?this._parent.nextChild(this.index+1,1,0,4):null}get prevSibling(){return this._parent&&this.index>=0?this._parent.nextChild(this.index-1,-1,0,4):null}get tree(){return this._tree}toTree(){return this._tree}toString(){return this._tree.toString()}}function zl(n,e,t,i){let s=n.cursor(),r=[];if(!s.firstChild())return r;if(t!=null){for(;!s.type.is(t);)if(!s.nextSibling())return r}for(;;){if(i!=null&&s.type.is(i))return r;if(s.type.is(e)&&r.push(s.node),!s.nextSibling())return i==null?r:[]}}function Wr(n,e,t=e.length-1){for(let i=n.parent;t>=0;i=i.parent){if(!i)return!1;if(!i.type.isAnonymous){if(e[t]&&e[t]!=i.name)return!1;t--}}return!0}class sm{constructor(e,t,i,s){this.parent=e,this.buffer=t,this.index=i,this.start=s}}class xt extends mc{get name(){return this.type.name}get from(){return this.context.start+this.context.buffer.buffer[this.index+1]}get to(){return this.context.start+this.context.buffer.buffer[this.index+2]}constructor(e,t,i){super(),this.context=e,this._parent=t,this.index=i,this.type=e.buffer.set.types[e.buffer.buffer[i]]}child(e,t,i){let{buffer:s}=this.context,r=s.findChild(this.index+4,s.buffer[this.index+3],e,t-this.context.start,i);return r<0?null:new xt(this.context,this,r)}get firstChild(){return this.child(1,0,4)}get lastChild(){return this.child(-1,0,4)}childAfter(e){return this.child(1,e,2)}childBefore(e){return this.child(-1,e,-2)}enter(e,t,i=0){if(i&he.ExcludeBuffers)return null;let{buffer:s}=this.context,r=s.findChild(this.index+4,s.buffer[this.index+3],t>0?1:-1,e-this.context.start,t);return r<0?null:new xt(this.context,this,r)}get parent(){return this._parent||this.context.parent.nextSignificantParent()}externalSibling(e){return this._parent?null:this.context.parent.nextChild(this.context.index+e,e,0,4)}get nextSibling(){let{buffer:e}=this.context,t=e.buffer[this.index+3];return t<(this._parent?e.buffer[this._parent.index+3]:e.buffer.length)?new xt(this.context,this._parent,t):this.externalSibling(1)}get prevSibling(){let{buffer:e}=this.context,t=this._parent?this._parent.index+4:0;return this.index==t?this.externalSibling(-1):new xt(this.context,this._parent,e.findChild(t,this.index,-1,0,4))}get tree(){return null}toTree(){let e=[],t=[],{buffer:i}=this.context,s=this.index+4,r=i.buffer[this.index+3];if(r>s){let o=i.buffer[this.index+1];e.push(i.slice(s,r,o)),t.push(0)}return new ie(this.type,e,t,this.to-this.from)}toString(){return this.context.buffer.childString(this.index)}}function gc(n){if(!n.length)return null;if(n.length==1)return n[0];let e=0,t=n[0];for(let r=1;r<n.length;r++){let o=n[r];(o.from>t.from||o.to<t.to)&&(t=o,e=r)}let i=t instanceof _e&&t.index<0?null:t.parent,s=n.slice();return i?s[e]=i:s.splice(e,1),new rm(s,t)}class rm{constructor(e,t){this.heads=e,this.node=t}get next(){return gc(this.heads)}}function om(n,e,t){let i=n.resolveInner(e,t),s=null;for(let r=i instanceof _e?i:i.context.parent;r;r=r.parent)if(r.index<0){let o=r.parent;(s||(s=[i])).push(o.resolve(e,t)),r=o}else{let o=Qn.get(r.tree);if(o&&o.overlay&&o.overlay[0].from<=e&&o.overlay[o.overlay.length-1].to>=e){let l=new _e(o.tree,o.overlay[0].from+r.from,0,null);(s||(s=[i])).push(qi(l,e,t,!1))}}return s?gc(s):i}class $r{get name(){return this.type.name}constructor(e,t=0){if(this.mode=t,this.buffer=null,this.stack=[],this.index=0,this.bufferNode=null,e instanceof _e)this.yieldNode(e);else{this._tree=e.context.parent,this.buffer=e.context;for(let i=e._parent;i;i=i._parent)this.stack.unshift(i.index);this.bufferNode=e,this.yieldBuf(e.index)}}yieldNode(e){return e?(this._tree=e,this.type=e.type,this.from=e.from,this.to=e.to,!0):!1}yieldBuf(e,t){this.index=e;let{start:i,buffer:s}=this.buffer;return this.type=t||s.set.types[s.buffer[e]],this.from=i+s.buffer[e+1],this.to=i+s.buffer[e+2],!0}yield(e){return e?e instanceof _e?(this.buffer=null,this.yieldNode(e)):(this.buffer=e.context,this.yieldBuf(e.index,e.type)):!1}toString(){return this.buffer?this.buffer.buffer.childString(this.index):this._tree.toString()}enterChild(e,t,i){if(!this.buffer)return this.yield(this._tree.nextChild(e<0?this._tree._tree.children.length-1:0,e,t,i,this.mode));let{buffer:s}=this.buffer,r=s.findChild(this.index+4,s.buffer[this.index+3],e,t-this.buffer.start,i);return r<0?!1:(this.stack.push(this.index),this.yieldBuf(r))}firstChild(){return this.enterChild(1,0,4)}lastChild(){return this.enterChild(-1,0,4)}childAfter(e){return this.enterChild(1,e,2)}childBefore(e){return this.enterChild(-1,e,-2)}enter(e,t,i=this.mode){return this.buffer?i&he.ExcludeBuffers?!1:this.enterChild(1,e,t):this.yield(this._tree.enter(e,t,i))}parent(){if(!this.buffer)return this.yieldNode(this.mode&he.IncludeAnonymous?this._tree._parent:this._tree.parent);if(this.stack.length)return this.yieldBuf(this.stack.pop());let e=this.mode&he.IncludeAnonymous?this.buffer.parent:this.buffer.parent.nextSignificantParent();return this.buffer=null,this.yieldNode(e)}sibling(e){if(!this.buffer)return this._tree._parent?this.yield(this._tree.index<0?null:this._tree._parent.nextChild(this._tree.index+e,e,0,4,this.mode)):!1;let{buffer:t}=this.buffer,i=this.stack.length-1;if(e<0){let s=i<0?0:this.stack[i]+4;if(this.index!=s)return this.yieldBuf(t.findChild(s,this.index,-1,0,4))}else{let s=t.buffer[this.index+3];if(s<(i<0?t.buffer.length:t.buffer[this.stack[i]+3]))return this.yieldBuf(s)}return i<0?this.yield(this.buffer.parent.nextChild(this.buffer.index+e,e,0,4,this.mode)):!1}nextSibling(){return this.sibling(1)}prevSibling(){return this.sibling(-1)}atLastNode(e){let t,i,{buffer:s}=this;if(s){if(e>0){if(this.index<s.buffer.buffer.length)return!1}else for(let r=0;r<this.index;r++)if(s.buffer.buffer[r+3]<this.index)return!1;({index:t,parent:i}=s)}else({index:t,_parent:i}=this._tree);for(;i;{index:t,_parent:i}=i)if(t>-1)for(let r=t+e,o=e<0?-1:i._tree.children.length;r!=o;r+=e){let l=i._tree.children[r];if(this.mode&he.IncludeAnonymous||l instanceof qt||!l.type.isAnonymous||bo(l))return!1}return!0}move(e,t){if(t&&this.enterChild(e,0,4))return!0;for(;;){if(this.sibling(e))return!0;if(this.atLastNode(e)||!this.parent())return!1}}next(e=!0){return this.move(1,e)}prev(e=!0){return this.move(-1,e)}moveTo(e,t=0){for(;(this.from==this.to||(t<1?this.from>=e:this.from>e)||(t>-1?this.to<=e:this.to<e))&&this.parent(););for(;this.enterChild(1,e,t););return this}get node(){if(!this.buffer)return this._tree;let e=this.bufferNode,t=null,i=0;if(e&&e.context==this.buffer)e:for(let s=this.index,r=this.stack.length;r>=0;){for(let o=e;o;o=o._parent)if(o.index==s){if(s==this.index)return o;t=o,i=r+1;break e}s=this.stack[--r]}for(let s=i;s<this.stack.length;s++)t=new xt(this.buffer,t,this.stack[s]);return this.bufferNode=new xt(this.buffer,t,this.index)}get tree(){return this.buffer?null:this._tree._tree}iterate(e,t){for(let i=0;;){let s=!1;if(this.type.isAnonymous||e(this)!==!1){if(this.firstChild()){i++;continue}this.type.isAnonymous||(s=!0)}for(;s&&t&&t(this),s=this.type.isAnonymous,!this.nextSibling();){if(!i)return;this.parent(),i--,s=!0}}}matchContext(e){if(!this.buffer)return Wr(this.node,e);let{buffer:t}=this.buffer,{types:i}=t.set;for(let s=e.length-1,r=this.stack.length-1;s>=0;r--){if(r<0)return Wr(this.node,e,s);let o=i[t.buffer[this.stack[r]]];if(!o.isAnonymous){if(e[s]&&e[s]!=o.name)return!1;s--}}return!0}}function bo(n){return n.children.some(e=>e instanceof qt||!e.type.isAnonymous||bo(e))}function lm(n){var e;let{buffer:t,nodeSet:i,maxBufferLength:s=dc,reused:r=[],minRepeatType:o=i.types.length}=n,l=Array.isArray(t)?new yo(t,t.length):t,a=i.types,h=0,c=0;function f(x,y,w,C,T){let{id:S,start:L,end:N,size:F}=l,G=c;for(;F<0;)if(l.next(),F==-1){let Ae=r[S];w.push(Ae),C.push(L-x);return}else if(F==-3){h=S;return}else if(F==-4){c=S;return}else throw new RangeError(`Unrecognized record size: ${F}`);let ne=a[S],Q,$,Ue=L-x;if(N-L<=s&&($=g(l.pos-y,T))){let Ae=new Uint16Array($.size-$.skip),ee=l.pos-$.size,se=Ae.length;for(;l.pos>ee;)se=m($.start,Ae,se);Q=new qt(Ae,N-$.start,i),Ue=$.start-x}else{let Ae=l.pos-F;l.next();let ee=[],se=[],Rt=S>=o?S:-1,Kt=0,nn=N;for(;l.pos>Ae;)Rt>=0&&l.id==Rt&&l.size>=0?(l.end<=nn-s&&(d(ee,se,L,Kt,l.end,nn,Rt,G),Kt=ee.length,nn=l.end),l.next()):f(L,Ae,ee,se,Rt);if(Rt>=0&&Kt>0&&Kt<ee.length&&d(ee,se,L,Kt,L,nn,Rt,G),ee.reverse(),se.reverse(),Rt>-1&&Kt>0){let No=u(ne);Q=wo(ne,ee,se,0,ee.length,0,N-L,No,No)}else Q=p(ne,ee,se,N-L,G-N)}w.push(Q),C.push(Ue)}function u(x){return(y,w,C)=>{let T=0,S=y.length-1,L,N;if(S>=0&&(L=y[S])instanceof ie){if(!S&&L.type==x&&L.length==C)return L;(N=L.prop(H.lookAhead))&&(T=w[S]+L.length+N)}return p(x,y,w,C,T)}}function d(x,y,w,C,T,S,L,N){let F=[],G=[];for(;x.length>C;)F.push(x.pop()),G.push(y.pop()+w-T);x.push(p(i.types[L],F,G,S-T,N-S)),y.push(T-w)}function p(x,y,w,C,T=0,S){if(h){let L=[H.contextHash,h];S=S?[L].concat(S):[L]}if(T>25){let L=[H.lookAhead,T];S=S?[L].concat(S):[L]}return new ie(x,y,w,C,S)}function g(x,y){let w=l.fork(),C=0,T=0,S=0,L=w.end-s,N={size:0,start:0,skip:0};e:for(let F=w.pos-x;w.pos>F;){let G=w.size;if(w.id==y&&G>=0){N.size=C,N.start=T,N.skip=S,S+=4,C+=4,w.next();continue}let ne=w.pos-G;if(G<0||ne<F||w.start<L)break;let Q=w.id>=o?4:0,$=w.start;for(w.next();w.pos>ne;){if(w.size<0)if(w.size==-3)Q+=4;else break e;else w.id>=o&&(Q+=4);w.next()}T=$,C+=G,S+=Q}return(y<0||C==x)&&(N.size=C,N.start=T,N.skip=S),N.size>4?N:void 0}function m(x,y,w){let{id:C,start:T,end:S,size:L}=l;if(l.next(),L>=0&&C<o){let N=w;if(L>4){let F=l.pos-(L-4);for(;l.pos>F;)w=m(x,y,w)}y[--w]=N,y[--w]=S-x,y[--w]=T-x,y[--w]=C}else L==-3?h=C:L==-4&&(c=C);return w}let b=[],k=[];for(;l.pos>0;)f(n.start||0,n.bufferStart||0,b,k,-1);let D=(e=n.length)!==null&&e!==void 0?e:b.length?k[0]+b[0].length:0;return new ie(a[n.topID],b.reverse(),k.reverse(),D)}const jl=new WeakMap;function In(n,e){if(!n.isAnonymous||e instanceof qt||e.type!=n)return 1;let t=jl.get(e);if(t==null){t=1;for(let i of e.children){if(i.type!=n||!(i instanceof ie)){t=1;break}t+=In(n,i)}jl.set(e,t)}return t}function wo(n,e,t,i,s,r,o,l,a){let h=0;for(let p=i;p<s;p++)h+=In(n,e[p]);let c=Math.ceil(h*1.5/8),f=[],u=[];function d(p,g,m,b,k){for(let D=m;D<b;){let x=D,y=g[D],w=In(n,p[D]);for(D++;D<b;D++){let C=In(n,p[D]);if(w+C>=c)break;w+=C}if(D==x+1){if(w>c){let C=p[x];d(C.children,C.positions,0,C.children.length,g[x]+k);continue}f.push(p[x])}else{let C=g[D-1]+p[D-1].length-y;f.push(wo(n,p,g,x,D,y,C,null,a))}u.push(y+k-r)}}return d(e,t,i,s,0),(l||a)(f,u,o)}class _t{constructor(e,t,i,s,r=!1,o=!1){this.from=e,this.to=t,this.tree=i,this.offset=s,this.open=(r?1:0)|(o?2:0)}get openStart(){return(this.open&1)>0}get openEnd(){return(this.open&2)>0}static addTree(e,t=[],i=!1){let s=[new _t(0,e.length,e,0,!1,i)];for(let r of t)r.to>e.length&&s.push(r);return s}static applyChanges(e,t,i=128){if(!t.length)return e;let s=[],r=1,o=e.length?e[0]:null;for(let l=0,a=0,h=0;;l++){let c=l<t.length?t[l]:null,f=c?c.fromA:1e9;if(f-a>=i)for(;o&&o.from<f;){let u=o;if(a>=u.from||f<=u.to||h){let d=Math.max(u.from,a)-h,p=Math.min(u.to,f)-h;u=d>=p?null:new _t(d,p,u.tree,u.offset+h,l>0,!!c)}if(u&&s.push(u),o.to>f)break;o=r<e.length?e[r++]:null}if(!c)break;a=c.toA,h=c.toA-c.toB}return s}}class yc{startParse(e,t,i){return typeof e=="string"&&(e=new am(e)),i=i?i.length?i.map(s=>new qs(s.from,s.to)):[new qs(0,0)]:[new qs(0,e.length)],this.createParse(e,t||[],i)}parse(e,t,i){let s=this.startParse(e,t,i);for(;;){let r=s.advance();if(r)return r}}}class am{constructor(e){this.string=e}get length(){return this.string.length}chunk(e){return this.string.slice(e)}get lineChunks(){return!1}read(e,t){return this.string.slice(e,t)}}new H({perNode:!0});let hm=0;class Xe{constructor(e,t,i){this.set=e,this.base=t,this.modified=i,this.id=hm++}static define(e){if(e!=null&&e.base)throw new Error("Can not derive from a modified tag");let t=new Xe([],null,[]);if(t.set.push(t),e)for(let i of e.set)t.set.push(i);return t}static defineModifier(){let e=new Jn;return t=>t.modified.indexOf(e)>-1?t:Jn.get(t.base||t,t.modified.concat(e).sort((i,s)=>i.id-s.id))}}let cm=0;class Jn{constructor(){this.instances=[],this.id=cm++}static get(e,t){if(!t.length)return e;let i=t[0].instances.find(l=>l.base==e&&fm(t,l.modified));if(i)return i;let s=[],r=new Xe(s,e,t);for(let l of t)l.instances.push(r);let o=um(t);for(let l of e.set)if(!l.modified.length)for(let a of o)s.push(Jn.get(l,a));return r}}function fm(n,e){return n.length==e.length&&n.every((t,i)=>t==e[i])}function um(n){let e=[[]];for(let t=0;t<n.length;t++)for(let i=0,s=e.length;i<s;i++)e.push(e[i].concat(n[t]));return e.sort((t,i)=>i.length-t.length)}function bc(n){let e=Object.create(null);for(let t in n){let i=n[t];Array.isArray(i)||(i=[i]);for(let s of t.split(" "))if(s){let r=[],o=2,l=s;for(let f=0;;){if(l=="..."&&f>0&&f+3==s.length){o=1;break}let u=/^"(?:[^"\\]|\\.)*?"|[^\/!]+/.exec(l);if(!u)throw new RangeError("Invalid path: "+s);if(r.push(u[0]=="*"?"":u[0][0]=='"'?JSON.parse(u[0]):u[0]),f+=u[0].length,f==s.length)break;let d=s[f++];if(f==s.length&&d=="!"){o=0;break}if(d!="/")throw new RangeError("Invalid path: "+s);l=s.slice(f)}let a=r.length-1,h=r[a];if(!h)throw new RangeError("Invalid path: "+s);let c=new Xn(i,o,a>0?r.slice(0,a):null);e[h]=c.sort(e[h])}}return wc.add(e)}const wc=new H;class Xn{constructor(e,t,i,s){this.tags=e,this.mode=t,this.context=i,this.next=s}get opaque(){return this.mode==0}get inherit(){return this.mode==1}sort(e){return!e||e.depth<this.depth?(this.next=e,this):(e.next=this.sort(e.next),e)}get depth(){return this.context?this.context.length:0}}Xn.empty=new Xn([],2,null);function vc(n,e){let t=Object.create(null);for(let r of n)if(!Array.isArray(r.tag))t[r.tag.id]=r.class;else for(let o of r.tag)t[o.id]=r.class;let{scope:i,all:s=null}=e||{};return{style:r=>{let o=s;for(let l of r)for(let a of l.set){let h=t[a.id];if(h){o=o?o+" "+h:h;break}}return o},scope:i}}function dm(n,e){let t=null;for(let i of n){let s=i.style(e);s&&(t=t?t+" "+s:s)}return t}function pm(n,e,t,i=0,s=n.length){let r=new mm(i,Array.isArray(e)?e:[e],t);r.highlightRange(n.cursor(),i,s,"",r.highlighters),r.flush(s)}class mm{constructor(e,t,i){this.at=e,this.highlighters=t,this.span=i,this.class=""}startSpan(e,t){t!=this.class&&(this.flush(e),e>this.at&&(this.at=e),this.class=t)}flush(e){e>this.at&&this.class&&this.span(this.at,e,this.class)}highlightRange(e,t,i,s,r){let{type:o,from:l,to:a}=e;if(l>=i||a<=t)return;o.isTop&&(r=this.highlighters.filter(d=>!d.scope||d.scope(o)));let h=s,c=gm(e)||Xn.empty,f=dm(r,c.tags);if(f&&(h&&(h+=" "),h+=f,c.mode==1&&(s+=(s?" ":"")+f)),this.startSpan(Math.max(t,l),h),c.opaque)return;let u=e.tree&&e.tree.prop(H.mounted);if(u&&u.overlay){let d=e.node.enter(u.overlay[0].from+l,1),p=this.highlighters.filter(m=>!m.scope||m.scope(u.tree.type)),g=e.firstChild();for(let m=0,b=l;;m++){let k=m<u.overlay.length?u.overlay[m]:null,D=k?k.from+l:a,x=Math.max(t,b),y=Math.min(i,D);if(x<y&&g)for(;e.from<y&&(this.highlightRange(e,x,y,s,r),this.startSpan(Math.min(y,e.to),h),!(e.to>=D||!e.nextSibling())););if(!k||D>i)break;b=k.to+l,b>t&&(this.highlightRange(d.cursor(),Math.max(t,k.from+l),Math.min(i,b),"",p),this.startSpan(Math.min(i,b),h))}g&&e.parent()}else if(e.firstChild()){u&&(s="");do if(!(e.to<=t)){if(e.from>=i)break;this.highlightRange(e,t,i,s,r),this.startSpan(Math.min(i,e.to),h)}while(e.nextSibling());e.parent()}}}function gm(n){let e=n.type.prop(wc);for(;e&&e.context&&!n.matchContext(e.context);)e=e.next;return e||null}const O=Xe.define,yn=O(),mt=O(),ql=O(mt),Kl=O(mt),gt=O(),bn=O(gt),Ks=O(gt),Je=O(),Bt=O(Je),Ye=O(),Qe=O(),zr=O(),xi=O(zr),wn=O(),M={comment:yn,lineComment:O(yn),blockComment:O(yn),docComment:O(yn),name:mt,variableName:O(mt),typeName:ql,tagName:O(ql),propertyName:Kl,attributeName:O(Kl),className:O(mt),labelName:O(mt),namespace:O(mt),macroName:O(mt),literal:gt,string:bn,docString:O(bn),character:O(bn),attributeValue:O(bn),number:Ks,integer:O(Ks),float:O(Ks),bool:O(gt),regexp:O(gt),escape:O(gt),color:O(gt),url:O(gt),keyword:Ye,self:O(Ye),null:O(Ye),atom:O(Ye),unit:O(Ye),modifier:O(Ye),operatorKeyword:O(Ye),controlKeyword:O(Ye),definitionKeyword:O(Ye),moduleKeyword:O(Ye),operator:Qe,derefOperator:O(Qe),arithmeticOperator:O(Qe),logicOperator:O(Qe),bitwiseOperator:O(Qe),compareOperator:O(Qe),updateOperator:O(Qe),definitionOperator:O(Qe),typeOperator:O(Qe),controlOperator:O(Qe),punctuation:zr,separator:O(zr),bracket:xi,angleBracket:O(xi),squareBracket:O(xi),paren:O(xi),brace:O(xi),content:Je,heading:Bt,heading1:O(Bt),heading2:O(Bt),heading3:O(Bt),heading4:O(Bt),heading5:O(Bt),heading6:O(Bt),contentSeparator:O(Je),list:O(Je),quote:O(Je),emphasis:O(Je),strong:O(Je),link:O(Je),monospace:O(Je),strikethrough:O(Je),inserted:O(),deleted:O(),changed:O(),invalid:O(),meta:wn,documentMeta:O(wn),annotation:O(wn),processingInstruction:O(wn),definition:Xe.defineModifier(),constant:Xe.defineModifier(),function:Xe.defineModifier(),standard:Xe.defineModifier(),local:Xe.defineModifier(),special:Xe.defineModifier()};vc([{tag:M.link,class:"tok-link"},{tag:M.heading,class:"tok-heading"},{tag:M.emphasis,class:"tok-emphasis"},{tag:M.strong,class:"tok-strong"},{tag:M.keyword,class:"tok-keyword"},{tag:M.atom,class:"tok-atom"},{tag:M.bool,class:"tok-bool"},{tag:M.url,class:"tok-url"},{tag:M.labelName,class:"tok-labelName"},{tag:M.inserted,class:"tok-inserted"},{tag:M.deleted,class:"tok-deleted"},{tag:M.literal,class:"tok-literal"},{tag:M.string,class:"tok-string"},{tag:M.number,class:"tok-number"},{tag:[M.regexp,M.escape,M.special(M.string)],class:"tok-string2"},{tag:M.variableName,class:"tok-variableName"},{tag:M.local(M.variableName),class:"tok-variableName tok-local"},{tag:M.definition(M.variableName),class:"tok-variableName tok-definition"},{tag:M.special(M.variableName),class:"tok-variableName2"},{tag:M.definition(M.propertyName),class:"tok-propertyName tok-definition"},{tag:M.typeName,class:"tok-typeName"},{tag:M.namespace,class:"tok-namespace"},{tag:M.className,class:"tok-className"},{tag:M.macroName,class:"tok-macroName"},{tag:M.propertyName,class:"tok-propertyName"},{tag:M.operator,class:"tok-operator"},{tag:M.comment,class:"tok-comment"},{tag:M.meta,class:"tok-meta"},{tag:M.invalid,class:"tok-invalid"},{tag:M.punctuation,class:"tok-punctuation"}]);var Us;const Xt=new H;function ym(n){return R.define({combine:n?e=>e.concat(n):void 0})}const bm=new H;class ze{constructor(e,t,i=[],s=""){this.data=e,this.name=s,_.prototype.hasOwnProperty("tree")||Object.defineProperty(_.prototype,"tree",{get(){return ve(this)}}),this.parser=t,this.extension=[Dt.of(this),_.languageData.of((r,o,l)=>{let a=Ul(r,o,l),h=a.type.prop(Xt);if(!h)return[];let c=r.facet(h),f=a.type.prop(bm);if(f){let u=a.resolve(o-a.from,l);for(let d of f)if(d.test(u,r)){let p=r.facet(d.facet);return d.type=="replace"?p:p.concat(c)}}return c})].concat(i)}isActiveAt(e,t,i=-1){return Ul(e,t,i).type.prop(Xt)==this.data}findRegions(e){let t=e.facet(Dt);if((t==null?void 0:t.data)==this.data)return[{from:0,to:e.doc.length}];if(!t||!t.allowsNesting)return[];let i=[],s=(r,o)=>{if(r.prop(Xt)==this.data){i.push({from:o,to:o+r.length});return}let l=r.prop(H.mounted);if(l){if(l.tree.prop(Xt)==this.data){if(l.overlay)for(let a of l.overlay)i.push({from:a.from+o,to:a.to+o});else i.push({from:o,to:o+r.length});return}else if(l.overlay){let a=i.length;if(s(l.tree,l.overlay[0].from+o),i.length>a)return}}for(let a=0;a<r.children.length;a++){let h=r.children[a];h instanceof ie&&s(h,r.positions[a]+o)}};return s(ve(e),0),i}get allowsNesting(){return!0}}ze.setState=I.define();function Ul(n,e,t){let i=n.facet(Dt),s=ve(n).topNode;if(!i||i.allowsNesting)for(let r=s;r;r=r.enter(e,t,he.ExcludeBuffers))r.type.isTop&&(s=r);return s}class Zn extends ze{constructor(e,t,i){super(e,t,[],i),this.parser=t}static define(e){let t=ym(e.languageData);return new Zn(t,e.parser.configure({props:[Xt.add(i=>i.isTop?t:void 0)]}),e.name)}configure(e,t){return new Zn(this.data,this.parser.configure(e),t||this.name)}get allowsNesting(){return this.parser.hasWrappers()}}function ve(n){let e=n.field(ze.state,!1);return e?e.tree:ie.empty}class wm{constructor(e){this.doc=e,this.cursorPos=0,this.string="",this.cursor=e.iter()}get length(){return this.doc.length}syncTo(e){return this.string=this.cursor.next(e-this.cursorPos).value,this.cursorPos=e+this.string.length,this.cursorPos-this.string.length}chunk(e){return this.syncTo(e),this.string}get lineChunks(){return!0}read(e,t){let i=this.cursorPos-this.string.length;return e<i||t>=this.cursorPos?this.doc.sliceString(e,t):this.string.slice(e-i,t-i)}}let ki=null;class es{constructor(e,t,i=[],s,r,o,l,a){this.parser=e,this.state=t,this.fragments=i,this.tree=s,this.treeLen=r,this.viewport=o,this.skipped=l,this.scheduleOn=a,this.parse=null,this.tempSkipped=[]}static create(e,t,i){return new es(e,t,[],ie.empty,0,i,[],null)}startParse(){return this.parser.startParse(new wm(this.state.doc),this.fragments)}work(e,t){return t!=null&&t>=this.state.doc.length&&(t=void 0),this.tree!=ie.empty&&this.isDone(t??this.state.doc.length)?(this.takeTree(),!0):this.withContext(()=>{var i;if(typeof e=="number"){let s=Date.now()+e;e=()=>Date.now()>s}for(this.parse||(this.parse=this.startParse()),t!=null&&(this.parse.stoppedAt==null||this.parse.stoppedAt>t)&&t<this.state.doc.length&&this.parse.stopAt(t);;){let s=this.parse.advance();if(s)if(this.fragments=this.withoutTempSkipped(_t.addTree(s,this.fragments,this.parse.stoppedAt!=null)),this.treeLen=(i=this.parse.stoppedAt)!==null&&i!==void 0?i:this.state.doc.length,this.tree=s,this.parse=null,this.treeLen<(t??this.state.doc.length))this.parse=this.startParse();else return!0;if(e())return!1}})}takeTree(){let e,t;this.parse&&(e=this.parse.parsedPos)>=this.treeLen&&((this.parse.stoppedAt==null||this.parse.stoppedAt>e)&&this.parse.stopAt(e),this.withContext(()=>{for(;!(t=this.parse.advance()););}),this.treeLen=e,this.tree=t,this.fragments=this.withoutTempSkipped(_t.addTree(this.tree,this.fragments,!0)),this.parse=null)}withContext(e){let t=ki;ki=this;try{return e()}finally{ki=t}}withoutTempSkipped(e){for(let t;t=this.tempSkipped.pop();)e=Gl(e,t.from,t.to);return e}changes(e,t){let{fragments:i,tree:s,treeLen:r,viewport:o,skipped:l}=this;if(this.takeTree(),!e.empty){let a=[];if(e.iterChangedRanges((h,c,f,u)=>a.push({fromA:h,toA:c,fromB:f,toB:u})),i=_t.applyChanges(i,a),s=ie.empty,r=0,o={from:e.mapPos(o.from,-1),to:e.mapPos(o.to,1)},this.skipped.length){l=[];for(let h of this.skipped){let c=e.mapPos(h.from,1),f=e.mapPos(h.to,-1);c<f&&l.push({from:c,to:f})}}}return new es(this.parser,t,i,s,r,o,l,this.scheduleOn)}updateViewport(e){if(this.viewport.from==e.from&&this.viewport.to==e.to)return!1;this.viewport=e;let t=this.skipped.length;for(let i=0;i<this.skipped.length;i++){let{from:s,to:r}=this.skipped[i];s<e.to&&r>e.from&&(this.fragments=Gl(this.fragments,s,r),this.skipped.splice(i--,1))}return this.skipped.length>=t?!1:(this.reset(),!0)}reset(){this.parse&&(this.takeTree(),this.parse=null)}skipUntilInView(e,t){this.skipped.push({from:e,to:t})}static getSkippingParser(e){return new class extends yc{createParse(t,i,s){let r=s[0].from,o=s[s.length-1].to;return{parsedPos:r,advance(){let a=ki;if(a){for(let h of s)a.tempSkipped.push(h);e&&(a.scheduleOn=a.scheduleOn?Promise.all([a.scheduleOn,e]):e)}return this.parsedPos=o,new ie(De.none,[],[],o-r)},stoppedAt:null,stopAt(){}}}}}isDone(e){e=Math.min(e,this.state.doc.length);let t=this.fragments;return this.treeLen>=e&&t.length&&t[0].from==0&&t[0].to>=e}static get(){return ki}}function Gl(n,e,t){return _t.applyChanges(n,[{fromA:e,toA:t,fromB:e,toB:t}])}class hi{constructor(e){this.context=e,this.tree=e.tree}apply(e){if(!e.docChanged&&this.tree==this.context.tree)return this;let t=this.context.changes(e.changes,e.state),i=this.context.treeLen==e.startState.doc.length?void 0:Math.max(e.changes.mapPos(this.context.treeLen),t.viewport.to);return t.work(20,i)||t.takeTree(),new hi(t)}static init(e){let t=Math.min(3e3,e.doc.length),i=es.create(e.facet(Dt).parser,e,{from:0,to:t});return i.work(20,t)||i.takeTree(),new hi(i)}}ze.state=ae.define({create:hi.init,update(n,e){for(let t of e.effects)if(t.is(ze.setState))return t.value;return e.startState.facet(Dt)!=e.state.facet(Dt)?hi.init(e.state):n.apply(e)}});let xc=n=>{let e=setTimeout(()=>n(),500);return()=>clearTimeout(e)};typeof requestIdleCallback<"u"&&(xc=n=>{let e=-1,t=setTimeout(()=>{e=requestIdleCallback(n,{timeout:500-100})},100);return()=>e<0?clearTimeout(t):cancelIdleCallback(e)});const Gs=typeof navigator<"u"&&(!((Us=navigator.scheduling)===null||Us===void 0)&&Us.isInputPending)?()=>navigator.scheduling.isInputPending():null,vm=Z.fromClass(class{constructor(e){this.view=e,this.working=null,this.workScheduled=0,this.chunkEnd=-1,this.chunkBudget=-1,this.work=this.work.bind(this),this.scheduleWork()}update(e){let t=this.view.state.field(ze.state).context;(t.updateViewport(e.view.viewport)||this.view.viewport.to>t.treeLen)&&this.scheduleWork(),(e.docChanged||e.selectionSet)&&(this.view.hasFocus&&(this.chunkBudget+=50),this.scheduleWork()),this.checkAsyncSchedule(t)}scheduleWork(){if(this.working)return;let{state:e}=this.view,t=e.field(ze.state);(t.tree!=t.context.tree||!t.context.isDone(e.doc.length))&&(this.working=xc(this.work))}work(e){this.working=null;let t=Date.now();if(this.chunkEnd<t&&(this.chunkEnd<0||this.view.hasFocus)&&(this.chunkEnd=t+3e4,this.chunkBudget=3e3),this.chunkBudget<=0)return;let{state:i,viewport:{to:s}}=this.view,r=i.field(ze.state);if(r.tree==r.context.tree&&r.context.isDone(s+1e5))return;let o=Date.now()+Math.min(this.chunkBudget,100,e&&!Gs?Math.max(25,e.timeRemaining()-5):1e9),l=r.context.treeLen<s&&i.doc.length>s+1e3,a=r.context.work(()=>Gs&&Gs()||Date.now()>o,s+(l?0:1e5));this.chunkBudget-=Date.now()-t,(a||this.chunkBudget<=0)&&(r.context.takeTree(),this.view.dispatch({effects:ze.setState.of(new hi(r.context))})),this.chunkBudget>0&&!(a&&!l)&&this.scheduleWork(),this.checkAsyncSchedule(r.context)}checkAsyncSchedule(e){e.scheduleOn&&(this.workScheduled++,e.scheduleOn.then(()=>this.scheduleWork()).catch(t=>Ie(this.view.state,t)).then(()=>this.workScheduled--),e.scheduleOn=null)}destroy(){this.working&&this.working()}isWorking(){return!!(this.working||this.workScheduled>0)}},{eventHandlers:{focus(){this.scheduleWork()}}}),Dt=R.define({combine(n){return n.length?n[0]:null},enables:n=>[ze.state,vm,P.contentAttributes.compute([n],e=>{let t=e.facet(n);return t&&t.name?{"data-language":t.name}:{}})]});class xm{constructor(e,t=[]){this.language=e,this.support=t,this.extension=[e,t]}}const km=R.define(),vo=R.define({combine:n=>{if(!n.length)return"  ";let e=n[0];if(!e||/\S/.test(e)||Array.from(e).some(t=>t!=e[0]))throw new Error("Invalid indent unit: "+JSON.stringify(n[0]));return e}});function ci(n){let e=n.facet(vo);return e.charCodeAt(0)==9?n.tabSize*e.length:e.length}function Ki(n,e){let t="",i=n.tabSize,s=n.facet(vo)[0];if(s=="	"){for(;e>=i;)t+="	",e-=i;s=" "}for(let r=0;r<e;r++)t+=s;return t}function xo(n,e){n instanceof _&&(n=new ks(n));for(let i of n.state.facet(km)){let s=i(n,e);if(s!==void 0)return s}let t=ve(n.state);return t.length>=e?Sm(n,t,e):null}class ks{constructor(e,t={}){this.state=e,this.options=t,this.unit=ci(e)}lineAt(e,t=1){let i=this.state.doc.lineAt(e),{simulateBreak:s,simulateDoubleBreak:r}=this.options;return s!=null&&s>=i.from&&s<=i.to?r&&s==e?{text:"",from:e}:(t<0?s<e:s<=e)?{text:i.text.slice(s-i.from),from:s}:{text:i.text.slice(0,s-i.from),from:i.from}:i}textAfterPos(e,t=1){if(this.options.simulateDoubleBreak&&e==this.options.simulateBreak)return"";let{text:i,from:s}=this.lineAt(e,t);return i.slice(e-s,Math.min(i.length,e+100-s))}column(e,t=1){let{text:i,from:s}=this.lineAt(e,t),r=this.countColumn(i,e-s),o=this.options.overrideIndentation?this.options.overrideIndentation(s):-1;return o>-1&&(r+=o-this.countColumn(i,i.search(/\S|$/))),r}countColumn(e,t=e.length){return pi(e,this.state.tabSize,t)}lineIndent(e,t=1){let{text:i,from:s}=this.lineAt(e,t),r=this.options.overrideIndentation;if(r){let o=r(s);if(o>-1)return o}return this.countColumn(i,i.search(/\S|$/))}get simulatedBreak(){return this.options.simulateBreak||null}}const kc=new H;function Sm(n,e,t){let i=e.resolveStack(t),s=i.node.enterUnfinishedNodesBefore(t);if(s!=i.node){let r=[];for(let o=s;o!=i.node;o=o.parent)r.push(o);for(let o=r.length-1;o>=0;o--)i={node:r[o],next:i}}return Sc(i,n,t)}function Sc(n,e,t){for(let i=n;i;i=i.next){let s=Am(i.node);if(s)return s(ko.create(e,t,i))}return 0}function Cm(n){return n.pos==n.options.simulateBreak&&n.options.simulateDoubleBreak}function Am(n){let e=n.type.prop(kc);if(e)return e;let t=n.firstChild,i;if(t&&(i=t.type.prop(H.closedBy))){let s=n.lastChild,r=s&&i.indexOf(s.name)>-1;return o=>Tm(o,!0,1,void 0,r&&!Cm(o)?s.from:void 0)}return n.parent==null?Mm:null}function Mm(){return 0}class ko extends ks{constructor(e,t,i){super(e.state,e.options),this.base=e,this.pos=t,this.context=i}get node(){return this.context.node}static create(e,t,i){return new ko(e,t,i)}get textAfter(){return this.textAfterPos(this.pos)}get baseIndent(){return this.baseIndentFor(this.node)}baseIndentFor(e){let t=this.state.doc.lineAt(e.from);for(;;){let i=e.resolve(t.from);for(;i.parent&&i.parent.from==i.from;)i=i.parent;if(Om(i,e))break;t=this.state.doc.lineAt(i.from)}return this.lineIndent(t.from)}continue(){return Sc(this.context.next,this.base,this.pos)}}function Om(n,e){for(let t=e;t;t=t.parent)if(n==t)return!0;return!1}function Dm(n){let e=n.node,t=e.childAfter(e.from),i=e.lastChild;if(!t)return null;let s=n.options.simulateBreak,r=n.state.doc.lineAt(t.from),o=s==null||s<=r.from?r.to:Math.min(r.to,s);for(let l=t.to;;){let a=e.childAfter(l);if(!a||a==i)return null;if(!a.type.isSkipped)return a.from<o?t:null;l=a.to}}function Tm(n,e,t,i,s){let r=n.textAfter,o=r.match(/^\s*/)[0].length,l=i&&r.slice(o,o+i.length)==i||s==n.pos+o,a=e?Dm(n):null;return a?l?n.column(a.from):n.column(a.to):n.baseIndent+(l?0:n.unit*t)}function Yl({except:n,units:e=1}={}){return t=>{let i=n&&n.test(t.textAfter);return t.baseIndent+(i?0:e*t.unit)}}const Pm=200;function Rm(){return _.transactionFilter.of(n=>{if(!n.docChanged||!n.isUserEvent("input.type")&&!n.isUserEvent("input.complete"))return n;let e=n.startState.languageDataAt("indentOnInput",n.startState.selection.main.head);if(!e.length)return n;let t=n.newDoc,{head:i}=n.newSelection.main,s=t.lineAt(i);if(i>s.from+Pm)return n;let r=t.sliceString(s.from,i);if(!e.some(h=>h.test(r)))return n;let{state:o}=n,l=-1,a=[];for(let{head:h}of o.selection.ranges){let c=o.doc.lineAt(h);if(c.from==l)continue;l=c.from;let f=xo(o,c.from);if(f==null)continue;let u=/^\s*/.exec(c.text)[0],d=Ki(o,f);u!=d&&a.push({from:c.from,to:c.from+u.length,insert:d})}return a.length?[n,{changes:a,sequential:!0}]:n})}const Bm=R.define(),Cc=new H;function Lm(n){let e=n.firstChild,t=n.lastChild;return e&&e.to<t.from?{from:e.to,to:t.type.isError?n.to:t.from}:null}function Em(n,e,t){let i=ve(n);if(i.length<t)return null;let s=i.resolveStack(t,1),r=null;for(let o=s;o;o=o.next){let l=o.node;if(l.to<=t||l.from>t)continue;if(r&&l.from<e)break;let a=l.type.prop(Cc);if(a&&(l.to<i.length-50||i.length==n.doc.length||!Im(l))){let h=a(l,n);h&&h.from<=t&&h.from>=e&&h.to>t&&(r=h)}}return r}function Im(n){let e=n.lastChild;return e&&e.to==n.to&&e.type.isError}function ts(n,e,t){for(let i of n.facet(Bm)){let s=i(n,e,t);if(s)return s}return Em(n,e,t)}function Ac(n,e){let t=e.mapPos(n.from,1),i=e.mapPos(n.to,-1);return t>=i?void 0:{from:t,to:i}}const Ss=I.define({map:Ac}),Zi=I.define({map:Ac});function Mc(n){let e=[];for(let{head:t}of n.state.selection.ranges)e.some(i=>i.from<=t&&i.to>=t)||e.push(n.lineBlockAt(t));return e}const zt=ae.define({create(){return E.none},update(n,e){n=n.map(e.changes);for(let t of e.effects)if(t.is(Ss)&&!Nm(n,t.value.from,t.value.to)){let{preparePlaceholder:i}=e.state.facet(So),s=i?E.replace({widget:new zm(i(e.state,t.value))}):Ql;n=n.update({add:[s.range(t.value.from,t.value.to)]})}else t.is(Zi)&&(n=n.update({filter:(i,s)=>t.value.from!=i||t.value.to!=s,filterFrom:t.value.from,filterTo:t.value.to}));if(e.selection){let t=!1,{head:i}=e.selection.main;n.between(i,i,(s,r)=>{s<i&&r>i&&(t=!0)}),t&&(n=n.update({filterFrom:i,filterTo:i,filter:(s,r)=>r<=i||s>=i}))}return n},provide:n=>P.decorations.from(n),toJSON(n,e){let t=[];return n.between(0,e.doc.length,(i,s)=>{t.push(i,s)}),t},fromJSON(n){if(!Array.isArray(n)||n.length%2)throw new RangeError("Invalid JSON for fold state");let e=[];for(let t=0;t<n.length;){let i=n[t++],s=n[t++];if(typeof i!="number"||typeof s!="number")throw new RangeError("Invalid JSON for fold state");e.push(Ql.range(i,s))}return E.set(e,!0)}});function is(n,e,t){var i;let s=null;return(i=n.field(zt,!1))===null||i===void 0||i.between(e,t,(r,o)=>{(!s||s.from>r)&&(s={from:r,to:o})}),s}function Nm(n,e,t){let i=!1;return n.between(e,e,(s,r)=>{s==e&&r==t&&(i=!0)}),i}function Oc(n,e){return n.field(zt,!1)?e:e.concat(I.appendConfig.of(Tc()))}const Fm=n=>{for(let e of Mc(n)){let t=ts(n.state,e.from,e.to);if(t)return n.dispatch({effects:Oc(n.state,[Ss.of(t),Dc(n,t)])}),!0}return!1},Hm=n=>{if(!n.state.field(zt,!1))return!1;let e=[];for(let t of Mc(n)){let i=is(n.state,t.from,t.to);i&&e.push(Zi.of(i),Dc(n,i,!1))}return e.length&&n.dispatch({effects:e}),e.length>0};function Dc(n,e,t=!0){let i=n.state.doc.lineAt(e.from).number,s=n.state.doc.lineAt(e.to).number;return P.announce.of(`${n.state.phrase(t?"Folded lines":"Unfolded lines")} ${i} ${n.state.phrase("to")} ${s}.`)}const _m=n=>{let{state:e}=n,t=[];for(let i=0;i<e.doc.length;){let s=n.lineBlockAt(i),r=ts(e,s.from,s.to);r&&t.push(Ss.of(r)),i=(r?n.lineBlockAt(r.to):s).to+1}return t.length&&n.dispatch({effects:Oc(n.state,t)}),!!t.length},Vm=n=>{let e=n.state.field(zt,!1);if(!e||!e.size)return!1;let t=[];return e.between(0,n.state.doc.length,(i,s)=>{t.push(Zi.of({from:i,to:s}))}),n.dispatch({effects:t}),!0},Wm=[{key:"Ctrl-Shift-[",mac:"Cmd-Alt-[",run:Fm},{key:"Ctrl-Shift-]",mac:"Cmd-Alt-]",run:Hm},{key:"Ctrl-Alt-[",run:_m},{key:"Ctrl-Alt-]",run:Vm}],$m={placeholderDOM:null,preparePlaceholder:null,placeholderText:"…"},So=R.define({combine(n){return Ve(n,$m)}});function Tc(n){let e=[zt,Km];return n&&e.push(So.of(n)),e}function Pc(n,e){let{state:t}=n,i=t.facet(So),s=o=>{let l=n.lineBlockAt(n.posAtDOM(o.target)),a=is(n.state,l.from,l.to);a&&n.dispatch({effects:Zi.of(a)}),o.preventDefault()};if(i.placeholderDOM)return i.placeholderDOM(n,s,e);let r=document.createElement("span");return r.textContent=i.placeholderText,r.setAttribute("aria-label",t.phrase("folded code")),r.title=t.phrase("unfold"),r.className="cm-foldPlaceholder",r.onclick=s,r}const Ql=E.replace({widget:new class extends Tt{toDOM(n){return Pc(n,null)}}});class zm extends Tt{constructor(e){super(),this.value=e}eq(e){return this.value==e.value}toDOM(e){return Pc(e,this.value)}}const jm={openText:"⌄",closedText:"›",markerDOM:null,domEventHandlers:{},foldingChanged:()=>!1};class Ys extends st{constructor(e,t){super(),this.config=e,this.open=t}eq(e){return this.config==e.config&&this.open==e.open}toDOM(e){if(this.config.markerDOM)return this.config.markerDOM(this.open);let t=document.createElement("span");return t.textContent=this.open?this.config.openText:this.config.closedText,t.title=e.state.phrase(this.open?"Fold line":"Unfold line"),t}}function qm(n={}){let e=Object.assign(Object.assign({},jm),n),t=new Ys(e,!0),i=new Ys(e,!1),s=Z.fromClass(class{constructor(o){this.from=o.viewport.from,this.markers=this.buildMarkers(o)}update(o){(o.docChanged||o.viewportChanged||o.startState.facet(Dt)!=o.state.facet(Dt)||o.startState.field(zt,!1)!=o.state.field(zt,!1)||ve(o.startState)!=ve(o.state)||e.foldingChanged(o))&&(this.markers=this.buildMarkers(o.view))}buildMarkers(o){let l=new ht;for(let a of o.viewportLineBlocks){let h=is(o.state,a.from,a.to)?i:ts(o.state,a.from,a.to)?t:null;h&&l.add(a.from,a.from,h)}return l.finish()}}),{domEventHandlers:r}=e;return[s,cc({class:"cm-foldGutter",markers(o){var l;return((l=o.plugin(s))===null||l===void 0?void 0:l.markers)||V.empty},initialSpacer(){return new Ys(e,!1)},domEventHandlers:Object.assign(Object.assign({},r),{click:(o,l,a)=>{if(r.click&&r.click(o,l,a))return!0;let h=is(o.state,l.from,l.to);if(h)return o.dispatch({effects:Zi.of(h)}),!0;let c=ts(o.state,l.from,l.to);return c?(o.dispatch({effects:Ss.of(c)}),!0):!1}})}),Tc()]}const Km=P.baseTheme({".cm-foldPlaceholder":{backgroundColor:"#eee",border:"1px solid #ddd",color:"#888",borderRadius:".2em",margin:"0 1px",padding:"0 1px",cursor:"pointer"},".cm-foldGutter span":{padding:"0 1px",cursor:"pointer"}});class Cs{constructor(e,t){this.specs=e;let i;function s(l){let a=At.newName();return(i||(i=Object.create(null)))["."+a]=l,a}const r=typeof t.all=="string"?t.all:t.all?s(t.all):void 0,o=t.scope;this.scope=o instanceof ze?l=>l.prop(Xt)==o.data:o?l=>l==o:void 0,this.style=vc(e.map(l=>({tag:l.tag,class:l.class||s(Object.assign({},l,{tag:null}))})),{all:r}).style,this.module=i?new At(i):null,this.themeType=t.themeType}static define(e,t){return new Cs(e,t||{})}}const jr=R.define(),Rc=R.define({combine(n){return n.length?[n[0]]:null}});function Qs(n){let e=n.facet(jr);return e.length?e:n.facet(Rc)}function Um(n,e){let t=[Ym],i;return n instanceof Cs&&(n.module&&t.push(P.styleModule.of(n.module)),i=n.themeType),e!=null&&e.fallback?t.push(Rc.of(n)):i?t.push(jr.computeN([P.darkTheme],s=>s.facet(P.darkTheme)==(i=="dark")?[n]:[])):t.push(jr.of(n)),t}class Gm{constructor(e){this.markCache=Object.create(null),this.tree=ve(e.state),this.decorations=this.buildDeco(e,Qs(e.state))}update(e){let t=ve(e.state),i=Qs(e.state),s=i!=Qs(e.startState);t.length<e.view.viewport.to&&!s&&t.type==this.tree.type?this.decorations=this.decorations.map(e.changes):(t!=this.tree||e.viewportChanged||s)&&(this.tree=t,this.decorations=this.buildDeco(e.view,i))}buildDeco(e,t){if(!t||!this.tree.length)return E.none;let i=new ht;for(let{from:s,to:r}of e.visibleRanges)pm(this.tree,t,(o,l,a)=>{i.add(o,l,this.markCache[a]||(this.markCache[a]=E.mark({class:a})))},s,r);return i.finish()}}const Ym=di.high(Z.fromClass(Gm,{decorations:n=>n.decorations})),Qm=Cs.define([{tag:M.meta,color:"#404740"},{tag:M.link,textDecoration:"underline"},{tag:M.heading,textDecoration:"underline",fontWeight:"bold"},{tag:M.emphasis,fontStyle:"italic"},{tag:M.strong,fontWeight:"bold"},{tag:M.strikethrough,textDecoration:"line-through"},{tag:M.keyword,color:"#708"},{tag:[M.atom,M.bool,M.url,M.contentSeparator,M.labelName],color:"#219"},{tag:[M.literal,M.inserted],color:"#164"},{tag:[M.string,M.deleted],color:"#a11"},{tag:[M.regexp,M.escape,M.special(M.string)],color:"#e40"},{tag:M.definition(M.variableName),color:"#00f"},{tag:M.local(M.variableName),color:"#30a"},{tag:[M.typeName,M.namespace],color:"#085"},{tag:M.className,color:"#167"},{tag:[M.special(M.variableName),M.macroName],color:"#256"},{tag:M.definition(M.propertyName),color:"#00c"},{tag:M.comment,color:"#940"},{tag:M.invalid,color:"#f00"}]),Jm=P.baseTheme({"&.cm-focused .cm-matchingBracket":{backgroundColor:"#328c8252"},"&.cm-focused .cm-nonmatchingBracket":{backgroundColor:"#bb555544"}}),Bc=1e4,Lc="()[]{}",Ec=R.define({combine(n){return Ve(n,{afterCursor:!0,brackets:Lc,maxScanDistance:Bc,renderMatch:eg})}}),Xm=E.mark({class:"cm-matchingBracket"}),Zm=E.mark({class:"cm-nonmatchingBracket"});function eg(n){let e=[],t=n.matched?Xm:Zm;return e.push(t.range(n.start.from,n.start.to)),n.end&&e.push(t.range(n.end.from,n.end.to)),e}const tg=ae.define({create(){return E.none},update(n,e){if(!e.docChanged&&!e.selection)return n;let t=[],i=e.state.facet(Ec);for(let s of e.state.selection.ranges){if(!s.empty)continue;let r=tt(e.state,s.head,-1,i)||s.head>0&&tt(e.state,s.head-1,1,i)||i.afterCursor&&(tt(e.state,s.head,1,i)||s.head<e.state.doc.length&&tt(e.state,s.head+1,-1,i));r&&(t=t.concat(i.renderMatch(r,e.state)))}return E.set(t,!0)},provide:n=>P.decorations.from(n)}),ig=[tg,Jm];function ng(n={}){return[Ec.of(n),ig]}const sg=new H;function qr(n,e,t){let i=n.prop(e<0?H.openedBy:H.closedBy);if(i)return i;if(n.name.length==1){let s=t.indexOf(n.name);if(s>-1&&s%2==(e<0?1:0))return[t[s+e]]}return null}function Kr(n){let e=n.type.prop(sg);return e?e(n.node):n}function tt(n,e,t,i={}){let s=i.maxScanDistance||Bc,r=i.brackets||Lc,o=ve(n),l=o.resolveInner(e,t);for(let a=l;a;a=a.parent){let h=qr(a.type,t,r);if(h&&a.from<a.to){let c=Kr(a);if(c&&(t>0?e>=c.from&&e<c.to:e>c.from&&e<=c.to))return rg(n,e,t,a,c,h,r)}}return og(n,e,t,o,l.type,s,r)}function rg(n,e,t,i,s,r,o){let l=i.parent,a={from:s.from,to:s.to},h=0,c=l==null?void 0:l.cursor();if(c&&(t<0?c.childBefore(i.from):c.childAfter(i.to)))do if(t<0?c.to<=i.from:c.from>=i.to){if(h==0&&r.indexOf(c.type.name)>-1&&c.from<c.to){let f=Kr(c);return{start:a,end:f?{from:f.from,to:f.to}:void 0,matched:!0}}else if(qr(c.type,t,o))h++;else if(qr(c.type,-t,o)){if(h==0){let f=Kr(c);return{start:a,end:f&&f.from<f.to?{from:f.from,to:f.to}:void 0,matched:!1}}h--}}while(t<0?c.prevSibling():c.nextSibling());return{start:a,matched:!1}}function og(n,e,t,i,s,r,o){let l=t<0?n.sliceDoc(e-1,e):n.sliceDoc(e,e+1),a=o.indexOf(l);if(a<0||a%2==0!=t>0)return null;let h={from:t<0?e-1:e,to:t>0?e+1:e},c=n.doc.iterRange(e,t>0?n.doc.length:0),f=0;for(let u=0;!c.next().done&&u<=r;){let d=c.value;t<0&&(u+=d.length);let p=e+u*t;for(let g=t>0?0:d.length-1,m=t>0?d.length:-1;g!=m;g+=t){let b=o.indexOf(d[g]);if(!(b<0||i.resolveInner(p+g,1).type!=s))if(b%2==0==t>0)f++;else{if(f==1)return{start:h,end:{from:p+g,to:p+g+1},matched:b>>1==a>>1};f--}}t>0&&(u+=d.length)}return c.done?{start:h,matched:!1}:null}const lg=Object.create(null),Jl=[De.none],Xl=[],ag=Object.create(null);for(let[n,e]of[["variable","variableName"],["variable-2","variableName.special"],["string-2","string.special"],["def","variableName.definition"],["tag","tagName"],["attribute","attributeName"],["type","typeName"],["builtin","variableName.standard"],["qualifier","modifier"],["error","invalid"],["header","heading"],["property","propertyName"]])ag[n]=hg(lg,e);function Js(n,e){Xl.indexOf(n)>-1||(Xl.push(n),console.warn(e))}function hg(n,e){let t=[];for(let r of e.split(" ")){let o=[];for(let l of r.split(".")){let a=n[l]||M[l];a?typeof a=="function"?o.length?o=o.map(a):Js(l,`Modifier ${l} used at start of tag`):o.length?Js(l,`Tag ${l} used as modifier`):o=Array.isArray(a)?a:[a]:Js(l,`Unknown highlighting tag ${l}`)}for(let l of o)t.push(l)}if(!t.length)return 0;let i=e.replace(/ /g,"_"),s=De.define({id:Jl.length,name:i,props:[bc({[i]:t})]});return Jl.push(s),s.id}const cg=n=>{let{state:e}=n,t=e.doc.lineAt(e.selection.main.from),i=Ao(n.state,t.from);return i.line?fg(n):i.block?dg(n):!1};function Co(n,e){return({state:t,dispatch:i})=>{if(t.readOnly)return!1;let s=n(e,t);return s?(i(t.update(s)),!0):!1}}const fg=Co(gg,0),ug=Co(Ic,0),dg=Co((n,e)=>Ic(n,e,mg(e)),0);function Ao(n,e){let t=n.languageDataAt("commentTokens",e);return t.length?t[0]:{}}const Si=50;function pg(n,{open:e,close:t},i,s){let r=n.sliceDoc(i-Si,i),o=n.sliceDoc(s,s+Si),l=/\s*$/.exec(r)[0].length,a=/^\s*/.exec(o)[0].length,h=r.length-l;if(r.slice(h-e.length,h)==e&&o.slice(a,a+t.length)==t)return{open:{pos:i-l,margin:l&&1},close:{pos:s+a,margin:a&&1}};let c,f;s-i<=2*Si?c=f=n.sliceDoc(i,s):(c=n.sliceDoc(i,i+Si),f=n.sliceDoc(s-Si,s));let u=/^\s*/.exec(c)[0].length,d=/\s*$/.exec(f)[0].length,p=f.length-d-t.length;return c.slice(u,u+e.length)==e&&f.slice(p,p+t.length)==t?{open:{pos:i+u+e.length,margin:/\s/.test(c.charAt(u+e.length))?1:0},close:{pos:s-d-t.length,margin:/\s/.test(f.charAt(p-1))?1:0}}:null}function mg(n){let e=[];for(let t of n.selection.ranges){let i=n.doc.lineAt(t.from),s=t.to<=i.to?i:n.doc.lineAt(t.to),r=e.length-1;r>=0&&e[r].to>i.from?e[r].to=s.to:e.push({from:i.from+/^\s*/.exec(i.text)[0].length,to:s.to})}return e}function Ic(n,e,t=e.selection.ranges){let i=t.map(r=>Ao(e,r.from).block);if(!i.every(r=>r))return null;let s=t.map((r,o)=>pg(e,i[o],r.from,r.to));if(n!=2&&!s.every(r=>r))return{changes:e.changes(t.map((r,o)=>s[o]?[]:[{from:r.from,insert:i[o].open+" "},{from:r.to,insert:" "+i[o].close}]))};if(n!=1&&s.some(r=>r)){let r=[];for(let o=0,l;o<s.length;o++)if(l=s[o]){let a=i[o],{open:h,close:c}=l;r.push({from:h.pos-a.open.length,to:h.pos+h.margin},{from:c.pos-c.margin,to:c.pos+a.close.length})}return{changes:r}}return null}function gg(n,e,t=e.selection.ranges){let i=[],s=-1;for(let{from:r,to:o}of t){let l=i.length,a=1e9,h=Ao(e,r).line;if(h){for(let c=r;c<=o;){let f=e.doc.lineAt(c);if(f.from>s&&(r==o||o>f.from)){s=f.from;let u=/^\s*/.exec(f.text)[0].length,d=u==f.length,p=f.text.slice(u,u+h.length)==h?u:-1;u<f.text.length&&u<a&&(a=u),i.push({line:f,comment:p,token:h,indent:u,empty:d,single:!1})}c=f.to+1}if(a<1e9)for(let c=l;c<i.length;c++)i[c].indent<i[c].line.text.length&&(i[c].indent=a);i.length==l+1&&(i[l].single=!0)}}if(n!=2&&i.some(r=>r.comment<0&&(!r.empty||r.single))){let r=[];for(let{line:l,token:a,indent:h,empty:c,single:f}of i)(f||!c)&&r.push({from:l.from+h,insert:a+" "});let o=e.changes(r);return{changes:o,selection:e.selection.map(o,1)}}else if(n!=1&&i.some(r=>r.comment>=0)){let r=[];for(let{line:o,comment:l,token:a}of i)if(l>=0){let h=o.from+l,c=h+a.length;o.text[c-o.from]==" "&&c++,r.push({from:h,to:c})}return{changes:r}}return null}const Ur=dt.define(),yg=dt.define(),bg=R.define(),Nc=R.define({combine(n){return Ve(n,{minDepth:100,newGroupDelay:500,joinToEvent:(e,t)=>t},{minDepth:Math.max,newGroupDelay:Math.min,joinToEvent:(e,t)=>(i,s)=>e(i,s)||t(i,s)})}});function wg(n){let e=0;return n.iterChangedRanges((t,i)=>e=i),e}const Fc=ae.define({create(){return it.empty},update(n,e){let t=e.state.facet(Nc),i=e.annotation(Ur);if(i){let a=e.docChanged?v.single(wg(e.changes)):void 0,h=Oe.fromTransaction(e,a),c=i.side,f=c==0?n.undone:n.done;return h?f=ns(f,f.length,t.minDepth,h):f=Vc(f,e.startState.selection),new it(c==0?i.rest:f,c==0?f:i.rest)}let s=e.annotation(yg);if((s=="full"||s=="before")&&(n=n.isolate()),e.annotation(le.addToHistory)===!1)return e.changes.empty?n:n.addMapping(e.changes.desc);let r=Oe.fromTransaction(e),o=e.annotation(le.time),l=e.annotation(le.userEvent);return r?n=n.addChanges(r,o,l,t,e):e.selection&&(n=n.addSelection(e.startState.selection,o,l,t.newGroupDelay)),(s=="full"||s=="after")&&(n=n.isolate()),n},toJSON(n){return{done:n.done.map(e=>e.toJSON()),undone:n.undone.map(e=>e.toJSON())}},fromJSON(n){return new it(n.done.map(Oe.fromJSON),n.undone.map(Oe.fromJSON))}});function vg(n={}){return[Fc,Nc.of(n),P.domEventHandlers({beforeinput(e,t){let i=e.inputType=="historyUndo"?Hc:e.inputType=="historyRedo"?Gr:null;return i?(e.preventDefault(),i(t)):!1}})]}function As(n,e){return function({state:t,dispatch:i}){if(!e&&t.readOnly)return!1;let s=t.field(Fc,!1);if(!s)return!1;let r=s.pop(n,t,e);return r?(i(r),!0):!1}}const Hc=As(0,!1),Gr=As(1,!1),xg=As(0,!0),kg=As(1,!0);class Oe{constructor(e,t,i,s,r){this.changes=e,this.effects=t,this.mapped=i,this.startSelection=s,this.selectionsAfter=r}setSelAfter(e){return new Oe(this.changes,this.effects,this.mapped,this.startSelection,e)}toJSON(){var e,t,i;return{changes:(e=this.changes)===null||e===void 0?void 0:e.toJSON(),mapped:(t=this.mapped)===null||t===void 0?void 0:t.toJSON(),startSelection:(i=this.startSelection)===null||i===void 0?void 0:i.toJSON(),selectionsAfter:this.selectionsAfter.map(s=>s.toJSON())}}static fromJSON(e){return new Oe(e.changes&&oe.fromJSON(e.changes),[],e.mapped&&nt.fromJSON(e.mapped),e.startSelection&&v.fromJSON(e.startSelection),e.selectionsAfter.map(v.fromJSON))}static fromTransaction(e,t){let i=Fe;for(let s of e.startState.facet(bg)){let r=s(e);r.length&&(i=i.concat(r))}return!i.length&&e.changes.empty?null:new Oe(e.changes.invert(e.startState.doc),i,void 0,t||e.startState.selection,Fe)}static selection(e){return new Oe(void 0,Fe,void 0,void 0,e)}}function ns(n,e,t,i){let s=e+1>t+20?e-t-1:0,r=n.slice(s,e);return r.push(i),r}function Sg(n,e){let t=[],i=!1;return n.iterChangedRanges((s,r)=>t.push(s,r)),e.iterChangedRanges((s,r,o,l)=>{for(let a=0;a<t.length;){let h=t[a++],c=t[a++];l>=h&&o<=c&&(i=!0)}}),i}function Cg(n,e){return n.ranges.length==e.ranges.length&&n.ranges.filter((t,i)=>t.empty!=e.ranges[i].empty).length===0}function _c(n,e){return n.length?e.length?n.concat(e):n:e}const Fe=[],Ag=200;function Vc(n,e){if(n.length){let t=n[n.length-1],i=t.selectionsAfter.slice(Math.max(0,t.selectionsAfter.length-Ag));return i.length&&i[i.length-1].eq(e)?n:(i.push(e),ns(n,n.length-1,1e9,t.setSelAfter(i)))}else return[Oe.selection([e])]}function Mg(n){let e=n[n.length-1],t=n.slice();return t[n.length-1]=e.setSelAfter(e.selectionsAfter.slice(0,e.selectionsAfter.length-1)),t}function Xs(n,e){if(!n.length)return n;let t=n.length,i=Fe;for(;t;){let s=Og(n[t-1],e,i);if(s.changes&&!s.changes.empty||s.effects.length){let r=n.slice(0,t);return r[t-1]=s,r}else e=s.mapped,t--,i=s.selectionsAfter}return i.length?[Oe.selection(i)]:Fe}function Og(n,e,t){let i=_c(n.selectionsAfter.length?n.selectionsAfter.map(l=>l.map(e)):Fe,t);if(!n.changes)return Oe.selection(i);let s=n.changes.map(e),r=e.mapDesc(n.changes,!0),o=n.mapped?n.mapped.composeDesc(r):r;return new Oe(s,I.mapEffects(n.effects,e),o,n.startSelection.map(r),i)}const Dg=/^(input\.type|delete)($|\.)/;class it{constructor(e,t,i=0,s=void 0){this.done=e,this.undone=t,this.prevTime=i,this.prevUserEvent=s}isolate(){return this.prevTime?new it(this.done,this.undone):this}addChanges(e,t,i,s,r){let o=this.done,l=o[o.length-1];return l&&l.changes&&!l.changes.empty&&e.changes&&(!i||Dg.test(i))&&(!l.selectionsAfter.length&&t-this.prevTime<s.newGroupDelay&&s.joinToEvent(r,Sg(l.changes,e.changes))||i=="input.type.compose")?o=ns(o,o.length-1,s.minDepth,new Oe(e.changes.compose(l.changes),_c(e.effects,l.effects),l.mapped,l.startSelection,Fe)):o=ns(o,o.length,s.minDepth,e),new it(o,Fe,t,i)}addSelection(e,t,i,s){let r=this.done.length?this.done[this.done.length-1].selectionsAfter:Fe;return r.length>0&&t-this.prevTime<s&&i==this.prevUserEvent&&i&&/^select($|\.)/.test(i)&&Cg(r[r.length-1],e)?this:new it(Vc(this.done,e),this.undone,t,i)}addMapping(e){return new it(Xs(this.done,e),Xs(this.undone,e),this.prevTime,this.prevUserEvent)}pop(e,t,i){let s=e==0?this.done:this.undone;if(s.length==0)return null;let r=s[s.length-1];if(i&&r.selectionsAfter.length)return t.update({selection:r.selectionsAfter[r.selectionsAfter.length-1],annotations:Ur.of({side:e,rest:Mg(s)}),userEvent:e==0?"select.undo":"select.redo",scrollIntoView:!0});if(r.changes){let o=s.length==1?Fe:s.slice(0,s.length-1);return r.mapped&&(o=Xs(o,r.mapped)),t.update({changes:r.changes,selection:r.startSelection,effects:r.effects,annotations:Ur.of({side:e,rest:o}),filter:!1,userEvent:e==0?"undo":"redo",scrollIntoView:!0})}else return null}}it.empty=new it(Fe,Fe);const Tg=[{key:"Mod-z",run:Hc,preventDefault:!0},{key:"Mod-y",mac:"Mod-Shift-z",run:Gr,preventDefault:!0},{linux:"Ctrl-Shift-z",run:Gr,preventDefault:!0},{key:"Mod-u",run:xg,preventDefault:!0},{key:"Alt-u",mac:"Mod-Shift-u",run:kg,preventDefault:!0}];function mi(n,e){return v.create(n.ranges.map(e),n.mainIndex)}function rt(n,e){return n.update({selection:e,scrollIntoView:!0,userEvent:"select"})}function Ke({state:n,dispatch:e},t){let i=mi(n.selection,t);return i.eq(n.selection)?!1:(e(rt(n,i)),!0)}function Ms(n,e){return v.cursor(e?n.to:n.from)}function Wc(n,e){return Ke(n,t=>t.empty?n.moveByChar(t,e):Ms(t,e))}function xe(n){return n.textDirectionAt(n.state.selection.main.head)==X.LTR}const $c=n=>Wc(n,!xe(n)),zc=n=>Wc(n,xe(n));function jc(n,e){return Ke(n,t=>t.empty?n.moveByGroup(t,e):Ms(t,e))}const Pg=n=>jc(n,!xe(n)),Rg=n=>jc(n,xe(n));function Bg(n,e,t){if(e.type.prop(t))return!0;let i=e.to-e.from;return i&&(i>2||/[^\s,.;:]/.test(n.sliceDoc(e.from,e.to)))||e.firstChild}function Os(n,e,t){let i=ve(n).resolveInner(e.head),s=t?H.closedBy:H.openedBy;for(let a=e.head;;){let h=t?i.childAfter(a):i.childBefore(a);if(!h)break;Bg(n,h,s)?i=h:a=t?h.to:h.from}let r=i.type.prop(s),o,l;return r&&(o=t?tt(n,i.from,1):tt(n,i.to,-1))&&o.matched?l=t?o.end.to:o.end.from:l=t?i.to:i.from,v.cursor(l,t?-1:1)}const Lg=n=>Ke(n,e=>Os(n.state,e,!xe(n))),Eg=n=>Ke(n,e=>Os(n.state,e,xe(n)));function qc(n,e){return Ke(n,t=>{if(!t.empty)return Ms(t,e);let i=n.moveVertically(t,e);return i.head!=t.head?i:n.moveToLineBoundary(t,e)})}const Kc=n=>qc(n,!1),Uc=n=>qc(n,!0);function Gc(n){let e=n.scrollDOM.clientHeight<n.scrollDOM.scrollHeight-2,t=0,i=0,s;if(e){for(let r of n.state.facet(P.scrollMargins)){let o=r(n);o!=null&&o.top&&(t=Math.max(o==null?void 0:o.top,t)),o!=null&&o.bottom&&(i=Math.max(o==null?void 0:o.bottom,i))}s=n.scrollDOM.clientHeight-t-i}else s=(n.dom.ownerDocument.defaultView||window).innerHeight;return{marginTop:t,marginBottom:i,selfScroll:e,height:Math.max(n.defaultLineHeight,s-5)}}function Yc(n,e){let t=Gc(n),{state:i}=n,s=mi(i.selection,o=>o.empty?n.moveVertically(o,e,t.height):Ms(o,e));if(s.eq(i.selection))return!1;let r;if(t.selfScroll){let o=n.coordsAtPos(i.selection.main.head),l=n.scrollDOM.getBoundingClientRect(),a=l.top+t.marginTop,h=l.bottom-t.marginBottom;o&&o.top>a&&o.bottom<h&&(r=P.scrollIntoView(s.main.head,{y:"start",yMargin:o.top-a}))}return n.dispatch(rt(i,s),{effects:r}),!0}const Zl=n=>Yc(n,!1),Yr=n=>Yc(n,!0);function Pt(n,e,t){let i=n.lineBlockAt(e.head),s=n.moveToLineBoundary(e,t);if(s.head==e.head&&s.head!=(t?i.to:i.from)&&(s=n.moveToLineBoundary(e,t,!1)),!t&&s.head==i.from&&i.length){let r=/^\s*/.exec(n.state.sliceDoc(i.from,Math.min(i.from+100,i.to)))[0].length;r&&e.head!=i.from+r&&(s=v.cursor(i.from+r))}return s}const Ig=n=>Ke(n,e=>Pt(n,e,!0)),Ng=n=>Ke(n,e=>Pt(n,e,!1)),Fg=n=>Ke(n,e=>Pt(n,e,!xe(n))),Hg=n=>Ke(n,e=>Pt(n,e,xe(n))),_g=n=>Ke(n,e=>v.cursor(n.lineBlockAt(e.head).from,1)),Vg=n=>Ke(n,e=>v.cursor(n.lineBlockAt(e.head).to,-1));function Wg(n,e,t){let i=!1,s=mi(n.selection,r=>{let o=tt(n,r.head,-1)||tt(n,r.head,1)||r.head>0&&tt(n,r.head-1,1)||r.head<n.doc.length&&tt(n,r.head+1,-1);if(!o||!o.end)return r;i=!0;let l=o.start.from==r.head?o.end.to:o.end.from;return t?v.range(r.anchor,l):v.cursor(l)});return i?(e(rt(n,s)),!0):!1}const $g=({state:n,dispatch:e})=>Wg(n,e,!1);function We(n,e){let t=mi(n.state.selection,i=>{let s=e(i);return v.range(i.anchor,s.head,s.goalColumn,s.bidiLevel||void 0)});return t.eq(n.state.selection)?!1:(n.dispatch(rt(n.state,t)),!0)}function Qc(n,e){return We(n,t=>n.moveByChar(t,e))}const Jc=n=>Qc(n,!xe(n)),Xc=n=>Qc(n,xe(n));function Zc(n,e){return We(n,t=>n.moveByGroup(t,e))}const zg=n=>Zc(n,!xe(n)),jg=n=>Zc(n,xe(n)),qg=n=>We(n,e=>Os(n.state,e,!xe(n))),Kg=n=>We(n,e=>Os(n.state,e,xe(n)));function ef(n,e){return We(n,t=>n.moveVertically(t,e))}const tf=n=>ef(n,!1),nf=n=>ef(n,!0);function sf(n,e){return We(n,t=>n.moveVertically(t,e,Gc(n).height))}const ea=n=>sf(n,!1),ta=n=>sf(n,!0),Ug=n=>We(n,e=>Pt(n,e,!0)),Gg=n=>We(n,e=>Pt(n,e,!1)),Yg=n=>We(n,e=>Pt(n,e,!xe(n))),Qg=n=>We(n,e=>Pt(n,e,xe(n))),Jg=n=>We(n,e=>v.cursor(n.lineBlockAt(e.head).from)),Xg=n=>We(n,e=>v.cursor(n.lineBlockAt(e.head).to)),ia=({state:n,dispatch:e})=>(e(rt(n,{anchor:0})),!0),na=({state:n,dispatch:e})=>(e(rt(n,{anchor:n.doc.length})),!0),sa=({state:n,dispatch:e})=>(e(rt(n,{anchor:n.selection.main.anchor,head:0})),!0),ra=({state:n,dispatch:e})=>(e(rt(n,{anchor:n.selection.main.anchor,head:n.doc.length})),!0),Zg=({state:n,dispatch:e})=>(e(n.update({selection:{anchor:0,head:n.doc.length},userEvent:"select"})),!0),e0=({state:n,dispatch:e})=>{let t=Ds(n).map(({from:i,to:s})=>v.range(i,Math.min(s+1,n.doc.length)));return e(n.update({selection:v.create(t),userEvent:"select"})),!0},t0=({state:n,dispatch:e})=>{let t=mi(n.selection,i=>{var s;let r=ve(n).resolveStack(i.from,1);for(let o=r;o;o=o.next){let{node:l}=o;if((l.from<i.from&&l.to>=i.to||l.to>i.to&&l.from<=i.from)&&(!((s=l.parent)===null||s===void 0)&&s.parent))return v.range(l.to,l.from)}return i});return e(rt(n,t)),!0},i0=({state:n,dispatch:e})=>{let t=n.selection,i=null;return t.ranges.length>1?i=v.create([t.main]):t.main.empty||(i=v.create([v.cursor(t.main.head)])),i?(e(rt(n,i)),!0):!1};function en(n,e){if(n.state.readOnly)return!1;let t="delete.selection",{state:i}=n,s=i.changeByRange(r=>{let{from:o,to:l}=r;if(o==l){let a=e(r);a<o?(t="delete.backward",a=vn(n,a,!1)):a>o&&(t="delete.forward",a=vn(n,a,!0)),o=Math.min(o,a),l=Math.max(l,a)}else o=vn(n,o,!1),l=vn(n,l,!0);return o==l?{range:r}:{changes:{from:o,to:l},range:v.cursor(o,o<r.head?-1:1)}});return s.changes.empty?!1:(n.dispatch(i.update(s,{scrollIntoView:!0,userEvent:t,effects:t=="delete.selection"?P.announce.of(i.phrase("Selection deleted")):void 0})),!0)}function vn(n,e,t){if(n instanceof P)for(let i of n.state.facet(P.atomicRanges).map(s=>s(n)))i.between(e,e,(s,r)=>{s<e&&r>e&&(e=t?r:s)});return e}const rf=(n,e)=>en(n,t=>{let i=t.from,{state:s}=n,r=s.doc.lineAt(i),o,l;if(!e&&i>r.from&&i<r.from+200&&!/[^ \t]/.test(o=r.text.slice(0,i-r.from))){if(o[o.length-1]=="	")return i-1;let a=pi(o,s.tabSize),h=a%ci(s)||ci(s);for(let c=0;c<h&&o[o.length-1-c]==" ";c++)i--;l=i}else l=we(r.text,i-r.from,e,e)+r.from,l==i&&r.number!=(e?s.doc.lines:1)&&(l+=e?1:-1);return l}),Qr=n=>rf(n,!1),of=n=>rf(n,!0),lf=(n,e)=>en(n,t=>{let i=t.head,{state:s}=n,r=s.doc.lineAt(i),o=s.charCategorizer(i);for(let l=null;;){if(i==(e?r.to:r.from)){i==t.head&&r.number!=(e?s.doc.lines:1)&&(i+=e?1:-1);break}let a=we(r.text,i-r.from,e)+r.from,h=r.text.slice(Math.min(i,a)-r.from,Math.max(i,a)-r.from),c=o(h);if(l!=null&&c!=l)break;(h!=" "||i!=t.head)&&(l=c),i=a}return i}),af=n=>lf(n,!1),n0=n=>lf(n,!0),s0=n=>en(n,e=>{let t=n.lineBlockAt(e.head).to;return e.head<t?t:Math.min(n.state.doc.length,e.head+1)}),r0=n=>en(n,e=>{let t=n.moveToLineBoundary(e,!1).head;return e.head>t?t:Math.max(0,e.head-1)}),o0=n=>en(n,e=>{let t=n.moveToLineBoundary(e,!0).head;return e.head<t?t:Math.min(n.state.doc.length,e.head+1)}),l0=({state:n,dispatch:e})=>{if(n.readOnly)return!1;let t=n.changeByRange(i=>({changes:{from:i.from,to:i.to,insert:W.of(["",""])},range:v.cursor(i.from)}));return e(n.update(t,{scrollIntoView:!0,userEvent:"input"})),!0},a0=({state:n,dispatch:e})=>{if(n.readOnly)return!1;let t=n.changeByRange(i=>{if(!i.empty||i.from==0||i.from==n.doc.length)return{range:i};let s=i.from,r=n.doc.lineAt(s),o=s==r.from?s-1:we(r.text,s-r.from,!1)+r.from,l=s==r.to?s+1:we(r.text,s-r.from,!0)+r.from;return{changes:{from:o,to:l,insert:n.doc.slice(s,l).append(n.doc.slice(o,s))},range:v.cursor(l)}});return t.changes.empty?!1:(e(n.update(t,{scrollIntoView:!0,userEvent:"move.character"})),!0)};function Ds(n){let e=[],t=-1;for(let i of n.selection.ranges){let s=n.doc.lineAt(i.from),r=n.doc.lineAt(i.to);if(!i.empty&&i.to==r.from&&(r=n.doc.lineAt(i.to-1)),t>=s.number){let o=e[e.length-1];o.to=r.to,o.ranges.push(i)}else e.push({from:s.from,to:r.to,ranges:[i]});t=r.number+1}return e}function hf(n,e,t){if(n.readOnly)return!1;let i=[],s=[];for(let r of Ds(n)){if(t?r.to==n.doc.length:r.from==0)continue;let o=n.doc.lineAt(t?r.to+1:r.from-1),l=o.length+1;if(t){i.push({from:r.to,to:o.to},{from:r.from,insert:o.text+n.lineBreak});for(let a of r.ranges)s.push(v.range(Math.min(n.doc.length,a.anchor+l),Math.min(n.doc.length,a.head+l)))}else{i.push({from:o.from,to:r.from},{from:r.to,insert:n.lineBreak+o.text});for(let a of r.ranges)s.push(v.range(a.anchor-l,a.head-l))}}return i.length?(e(n.update({changes:i,scrollIntoView:!0,selection:v.create(s,n.selection.mainIndex),userEvent:"move.line"})),!0):!1}const h0=({state:n,dispatch:e})=>hf(n,e,!1),c0=({state:n,dispatch:e})=>hf(n,e,!0);function cf(n,e,t){if(n.readOnly)return!1;let i=[];for(let s of Ds(n))t?i.push({from:s.from,insert:n.doc.slice(s.from,s.to)+n.lineBreak}):i.push({from:s.to,insert:n.lineBreak+n.doc.slice(s.from,s.to)});return e(n.update({changes:i,scrollIntoView:!0,userEvent:"input.copyline"})),!0}const f0=({state:n,dispatch:e})=>cf(n,e,!1),u0=({state:n,dispatch:e})=>cf(n,e,!0),d0=n=>{if(n.state.readOnly)return!1;let{state:e}=n,t=e.changes(Ds(e).map(({from:s,to:r})=>(s>0?s--:r<e.doc.length&&r++,{from:s,to:r}))),i=mi(e.selection,s=>n.moveVertically(s,!0)).map(t);return n.dispatch({changes:t,selection:i,scrollIntoView:!0,userEvent:"delete.line"}),!0};function p0(n,e){if(/\(\)|\[\]|\{\}/.test(n.sliceDoc(e-1,e+1)))return{from:e,to:e};let t=ve(n).resolveInner(e),i=t.childBefore(e),s=t.childAfter(e),r;return i&&s&&i.to<=e&&s.from>=e&&(r=i.type.prop(H.closedBy))&&r.indexOf(s.name)>-1&&n.doc.lineAt(i.to).from==n.doc.lineAt(s.from).from&&!/\S/.test(n.sliceDoc(i.to,s.from))?{from:i.to,to:s.from}:null}const m0=ff(!1),g0=ff(!0);function ff(n){return({state:e,dispatch:t})=>{if(e.readOnly)return!1;let i=e.changeByRange(s=>{let{from:r,to:o}=s,l=e.doc.lineAt(r),a=!n&&r==o&&p0(e,r);n&&(r=o=(o<=l.to?l:e.doc.lineAt(o)).to);let h=new ks(e,{simulateBreak:r,simulateDoubleBreak:!!a}),c=xo(h,r);for(c==null&&(c=pi(/^\s*/.exec(e.doc.lineAt(r).text)[0],e.tabSize));o<l.to&&/\s/.test(l.text[o-l.from]);)o++;a?{from:r,to:o}=a:r>l.from&&r<l.from+100&&!/\S/.test(l.text.slice(0,r))&&(r=l.from);let f=["",Ki(e,c)];return a&&f.push(Ki(e,h.lineIndent(l.from,-1))),{changes:{from:r,to:o,insert:W.of(f)},range:v.cursor(r+1+f[1].length)}});return t(e.update(i,{scrollIntoView:!0,userEvent:"input"})),!0}}function Mo(n,e){let t=-1;return n.changeByRange(i=>{let s=[];for(let o=i.from;o<=i.to;){let l=n.doc.lineAt(o);l.number>t&&(i.empty||i.to>l.from)&&(e(l,s,i),t=l.number),o=l.to+1}let r=n.changes(s);return{changes:s,range:v.range(r.mapPos(i.anchor,1),r.mapPos(i.head,1))}})}const y0=({state:n,dispatch:e})=>{if(n.readOnly)return!1;let t=Object.create(null),i=new ks(n,{overrideIndentation:r=>{let o=t[r];return o??-1}}),s=Mo(n,(r,o,l)=>{let a=xo(i,r.from);if(a==null)return;/\S/.test(r.text)||(a=0);let h=/^\s*/.exec(r.text)[0],c=Ki(n,a);(h!=c||l.from<r.from+h.length)&&(t[r.from]=a,o.push({from:r.from,to:r.from+h.length,insert:c}))});return s.changes.empty||e(n.update(s,{userEvent:"indent"})),!0},b0=({state:n,dispatch:e})=>n.readOnly?!1:(e(n.update(Mo(n,(t,i)=>{i.push({from:t.from,insert:n.facet(vo)})}),{userEvent:"input.indent"})),!0),w0=({state:n,dispatch:e})=>n.readOnly?!1:(e(n.update(Mo(n,(t,i)=>{let s=/^\s*/.exec(t.text)[0];if(!s)return;let r=pi(s,n.tabSize),o=0,l=Ki(n,Math.max(0,r-ci(n)));for(;o<s.length&&o<l.length&&s.charCodeAt(o)==l.charCodeAt(o);)o++;i.push({from:t.from+o,to:t.from+s.length,insert:l.slice(o)})}),{userEvent:"delete.dedent"})),!0),v0=[{key:"Ctrl-b",run:$c,shift:Jc,preventDefault:!0},{key:"Ctrl-f",run:zc,shift:Xc},{key:"Ctrl-p",run:Kc,shift:tf},{key:"Ctrl-n",run:Uc,shift:nf},{key:"Ctrl-a",run:_g,shift:Jg},{key:"Ctrl-e",run:Vg,shift:Xg},{key:"Ctrl-d",run:of},{key:"Ctrl-h",run:Qr},{key:"Ctrl-k",run:s0},{key:"Ctrl-Alt-h",run:af},{key:"Ctrl-o",run:l0},{key:"Ctrl-t",run:a0},{key:"Ctrl-v",run:Yr}],x0=[{key:"ArrowLeft",run:$c,shift:Jc,preventDefault:!0},{key:"Mod-ArrowLeft",mac:"Alt-ArrowLeft",run:Pg,shift:zg,preventDefault:!0},{mac:"Cmd-ArrowLeft",run:Fg,shift:Yg,preventDefault:!0},{key:"ArrowRight",run:zc,shift:Xc,preventDefault:!0},{key:"Mod-ArrowRight",mac:"Alt-ArrowRight",run:Rg,shift:jg,preventDefault:!0},{mac:"Cmd-ArrowRight",run:Hg,shift:Qg,preventDefault:!0},{key:"ArrowUp",run:Kc,shift:tf,preventDefault:!0},{mac:"Cmd-ArrowUp",run:ia,shift:sa},{mac:"Ctrl-ArrowUp",run:Zl,shift:ea},{key:"ArrowDown",run:Uc,shift:nf,preventDefault:!0},{mac:"Cmd-ArrowDown",run:na,shift:ra},{mac:"Ctrl-ArrowDown",run:Yr,shift:ta},{key:"PageUp",run:Zl,shift:ea},{key:"PageDown",run:Yr,shift:ta},{key:"Home",run:Ng,shift:Gg,preventDefault:!0},{key:"Mod-Home",run:ia,shift:sa},{key:"End",run:Ig,shift:Ug,preventDefault:!0},{key:"Mod-End",run:na,shift:ra},{key:"Enter",run:m0},{key:"Mod-a",run:Zg},{key:"Backspace",run:Qr,shift:Qr},{key:"Delete",run:of},{key:"Mod-Backspace",mac:"Alt-Backspace",run:af},{key:"Mod-Delete",mac:"Alt-Delete",run:n0},{mac:"Mod-Backspace",run:r0},{mac:"Mod-Delete",run:o0}].concat(v0.map(n=>({mac:n.key,run:n.run,shift:n.shift}))),k0=[{key:"Alt-ArrowLeft",mac:"Ctrl-ArrowLeft",run:Lg,shift:qg},{key:"Alt-ArrowRight",mac:"Ctrl-ArrowRight",run:Eg,shift:Kg},{key:"Alt-ArrowUp",run:h0},{key:"Shift-Alt-ArrowUp",run:f0},{key:"Alt-ArrowDown",run:c0},{key:"Shift-Alt-ArrowDown",run:u0},{key:"Escape",run:i0},{key:"Mod-Enter",run:g0},{key:"Alt-l",mac:"Ctrl-l",run:e0},{key:"Mod-i",run:t0,preventDefault:!0},{key:"Mod-[",run:w0},{key:"Mod-]",run:b0},{key:"Mod-Alt-\\",run:y0},{key:"Shift-Mod-k",run:d0},{key:"Shift-Mod-\\",run:$g},{key:"Mod-/",run:cg},{key:"Alt-A",run:ug}].concat(x0);function q(){var n=arguments[0];typeof n=="string"&&(n=document.createElement(n));var e=1,t=arguments[1];if(t&&typeof t=="object"&&t.nodeType==null&&!Array.isArray(t)){for(var i in t)if(Object.prototype.hasOwnProperty.call(t,i)){var s=t[i];typeof s=="string"?n.setAttribute(i,s):s!=null&&(n[i]=s)}e++}for(;e<arguments.length;e++)uf(n,arguments[e]);return n}function uf(n,e){if(typeof e=="string")n.appendChild(document.createTextNode(e));else if(e!=null)if(e.nodeType!=null)n.appendChild(e);else if(Array.isArray(e))for(var t=0;t<e.length;t++)uf(n,e[t]);else throw new RangeError("Unsupported child node: "+e)}const oa=typeof String.prototype.normalize=="function"?n=>n.normalize("NFKD"):n=>n;class fi{constructor(e,t,i=0,s=e.length,r,o){this.test=o,this.value={from:0,to:0},this.done=!1,this.matches=[],this.buffer="",this.bufferPos=0,this.iter=e.iterRange(i,s),this.bufferStart=i,this.normalize=r?l=>r(oa(l)):oa,this.query=this.normalize(t)}peek(){if(this.bufferPos==this.buffer.length){if(this.bufferStart+=this.buffer.length,this.iter.next(),this.iter.done)return-1;this.bufferPos=0,this.buffer=this.iter.value}return fe(this.buffer,this.bufferPos)}next(){for(;this.matches.length;)this.matches.pop();return this.nextOverlapping()}nextOverlapping(){for(;;){let e=this.peek();if(e<0)return this.done=!0,this;let t=no(e),i=this.bufferStart+this.bufferPos;this.bufferPos+=Ne(e);let s=this.normalize(t);for(let r=0,o=i;;r++){let l=s.charCodeAt(r),a=this.match(l,o);if(r==s.length-1){if(a)return this.value=a,this;break}o==i&&r<t.length&&t.charCodeAt(r)==l&&o++}}}match(e,t){let i=null;for(let s=0;s<this.matches.length;s+=2){let r=this.matches[s],o=!1;this.query.charCodeAt(r)==e&&(r==this.query.length-1?i={from:this.matches[s+1],to:t+1}:(this.matches[s]++,o=!0)),o||(this.matches.splice(s,2),s-=2)}return this.query.charCodeAt(0)==e&&(this.query.length==1?i={from:t,to:t+1}:this.matches.push(1,t)),i&&this.test&&!this.test(i.from,i.to,this.buffer,this.bufferStart)&&(i=null),i}}typeof Symbol<"u"&&(fi.prototype[Symbol.iterator]=function(){return this});const df={from:-1,to:-1,match:/.*/.exec("")},Oo="gm"+(/x/.unicode==null?"":"u");class pf{constructor(e,t,i,s=0,r=e.length){if(this.text=e,this.to=r,this.curLine="",this.done=!1,this.value=df,/\\[sWDnr]|\n|\r|\[\^/.test(t))return new mf(e,t,i,s,r);this.re=new RegExp(t,Oo+(i!=null&&i.ignoreCase?"i":"")),this.test=i==null?void 0:i.test,this.iter=e.iter();let o=e.lineAt(s);this.curLineStart=o.from,this.matchPos=ss(e,s),this.getLine(this.curLineStart)}getLine(e){this.iter.next(e),this.iter.lineBreak?this.curLine="":(this.curLine=this.iter.value,this.curLineStart+this.curLine.length>this.to&&(this.curLine=this.curLine.slice(0,this.to-this.curLineStart)),this.iter.next())}nextLine(){this.curLineStart=this.curLineStart+this.curLine.length+1,this.curLineStart>this.to?this.curLine="":this.getLine(0)}next(){for(let e=this.matchPos-this.curLineStart;;){this.re.lastIndex=e;let t=this.matchPos<=this.to&&this.re.exec(this.curLine);if(t){let i=this.curLineStart+t.index,s=i+t[0].length;if(this.matchPos=ss(this.text,s+(i==s?1:0)),i==this.curLineStart+this.curLine.length&&this.nextLine(),(i<s||i>this.value.to)&&(!this.test||this.test(i,s,t)))return this.value={from:i,to:s,match:t},this;e=this.matchPos-this.curLineStart}else if(this.curLineStart+this.curLine.length<this.to)this.nextLine(),e=0;else return this.done=!0,this}}}const Zs=new WeakMap;class si{constructor(e,t){this.from=e,this.text=t}get to(){return this.from+this.text.length}static get(e,t,i){let s=Zs.get(e);if(!s||s.from>=i||s.to<=t){let l=new si(t,e.sliceString(t,i));return Zs.set(e,l),l}if(s.from==t&&s.to==i)return s;let{text:r,from:o}=s;return o>t&&(r=e.sliceString(t,o)+r,o=t),s.to<i&&(r+=e.sliceString(s.to,i)),Zs.set(e,new si(o,r)),new si(t,r.slice(t-o,i-o))}}class mf{constructor(e,t,i,s,r){this.text=e,this.to=r,this.done=!1,this.value=df,this.matchPos=ss(e,s),this.re=new RegExp(t,Oo+(i!=null&&i.ignoreCase?"i":"")),this.test=i==null?void 0:i.test,this.flat=si.get(e,s,this.chunkEnd(s+5e3))}chunkEnd(e){return e>=this.to?this.to:this.text.lineAt(e).to}next(){for(;;){let e=this.re.lastIndex=this.matchPos-this.flat.from,t=this.re.exec(this.flat.text);if(t&&!t[0]&&t.index==e&&(this.re.lastIndex=e+1,t=this.re.exec(this.flat.text)),t){let i=this.flat.from+t.index,s=i+t[0].length;if((this.flat.to>=this.to||t.index+t[0].length<=this.flat.text.length-10)&&(!this.test||this.test(i,s,t)))return this.value={from:i,to:s,match:t},this.matchPos=ss(this.text,s+(i==s?1:0)),this}if(this.flat.to==this.to)return this.done=!0,this;this.flat=si.get(this.text,this.flat.from,this.chunkEnd(this.flat.from+this.flat.text.length*2))}}}typeof Symbol<"u"&&(pf.prototype[Symbol.iterator]=mf.prototype[Symbol.iterator]=function(){return this});function S0(n){try{return new RegExp(n,Oo),!0}catch{return!1}}function ss(n,e){if(e>=n.length)return e;let t=n.lineAt(e),i;for(;e<t.to&&(i=t.text.charCodeAt(e-t.from))>=56320&&i<57344;)e++;return e}function Jr(n){let e=String(n.state.doc.lineAt(n.state.selection.main.head).number),t=q("input",{class:"cm-textfield",name:"line",value:e}),i=q("form",{class:"cm-gotoLine",onkeydown:r=>{r.keyCode==27?(r.preventDefault(),n.dispatch({effects:rs.of(!1)}),n.focus()):r.keyCode==13&&(r.preventDefault(),s())},onsubmit:r=>{r.preventDefault(),s()}},q("label",n.state.phrase("Go to line"),": ",t)," ",q("button",{class:"cm-button",type:"submit"},n.state.phrase("go")));function s(){let r=/^([+-])?(\d+)?(:\d+)?(%)?$/.exec(t.value);if(!r)return;let{state:o}=n,l=o.doc.lineAt(o.selection.main.head),[,a,h,c,f]=r,u=c?+c.slice(1):0,d=h?+h:l.number;if(h&&f){let m=d/100;a&&(m=m*(a=="-"?-1:1)+l.number/o.doc.lines),d=Math.round(o.doc.lines*m)}else h&&a&&(d=d*(a=="-"?-1:1)+l.number);let p=o.doc.line(Math.max(1,Math.min(o.doc.lines,d))),g=v.cursor(p.from+Math.max(0,Math.min(u,p.length)));n.dispatch({effects:[rs.of(!1),P.scrollIntoView(g.from,{y:"center"})],selection:g}),n.focus()}return{dom:i}}const rs=I.define(),la=ae.define({create(){return!0},update(n,e){for(let t of e.effects)t.is(rs)&&(n=t.value);return n},provide:n=>ji.from(n,e=>e?Jr:null)}),C0=n=>{let e=zi(n,Jr);if(!e){let t=[rs.of(!0)];n.state.field(la,!1)==null&&t.push(I.appendConfig.of([la,A0])),n.dispatch({effects:t}),e=zi(n,Jr)}return e&&e.dom.querySelector("input").select(),!0},A0=P.baseTheme({".cm-panel.cm-gotoLine":{padding:"2px 6px 4px","& label":{fontSize:"80%"}}}),M0={highlightWordAroundCursor:!1,minSelectionLength:1,maxMatches:100,wholeWords:!1},gf=R.define({combine(n){return Ve(n,M0,{highlightWordAroundCursor:(e,t)=>e||t,minSelectionLength:Math.min,maxMatches:Math.min})}});function O0(n){let e=[B0,R0];return n&&e.push(gf.of(n)),e}const D0=E.mark({class:"cm-selectionMatch"}),T0=E.mark({class:"cm-selectionMatch cm-selectionMatch-main"});function aa(n,e,t,i){return(t==0||n(e.sliceDoc(t-1,t))!=Y.Word)&&(i==e.doc.length||n(e.sliceDoc(i,i+1))!=Y.Word)}function P0(n,e,t,i){return n(e.sliceDoc(t,t+1))==Y.Word&&n(e.sliceDoc(i-1,i))==Y.Word}const R0=Z.fromClass(class{constructor(n){this.decorations=this.getDeco(n)}update(n){(n.selectionSet||n.docChanged||n.viewportChanged)&&(this.decorations=this.getDeco(n.view))}getDeco(n){let e=n.state.facet(gf),{state:t}=n,i=t.selection;if(i.ranges.length>1)return E.none;let s=i.main,r,o=null;if(s.empty){if(!e.highlightWordAroundCursor)return E.none;let a=t.wordAt(s.head);if(!a)return E.none;o=t.charCategorizer(s.head),r=t.sliceDoc(a.from,a.to)}else{let a=s.to-s.from;if(a<e.minSelectionLength||a>200)return E.none;if(e.wholeWords){if(r=t.sliceDoc(s.from,s.to),o=t.charCategorizer(s.head),!(aa(o,t,s.from,s.to)&&P0(o,t,s.from,s.to)))return E.none}else if(r=t.sliceDoc(s.from,s.to).trim(),!r)return E.none}let l=[];for(let a of n.visibleRanges){let h=new fi(t.doc,r,a.from,a.to);for(;!h.next().done;){let{from:c,to:f}=h.value;if((!o||aa(o,t,c,f))&&(s.empty&&c<=s.from&&f>=s.to?l.push(T0.range(c,f)):(c>=s.to||f<=s.from)&&l.push(D0.range(c,f)),l.length>e.maxMatches))return E.none}}return E.set(l)}},{decorations:n=>n.decorations}),B0=P.baseTheme({".cm-selectionMatch":{backgroundColor:"#99ff7780"},".cm-searchMatch .cm-selectionMatch":{backgroundColor:"transparent"}}),L0=({state:n,dispatch:e})=>{let{selection:t}=n,i=v.create(t.ranges.map(s=>n.wordAt(s.head)||v.cursor(s.head)),t.mainIndex);return i.eq(t)?!1:(e(n.update({selection:i})),!0)};function E0(n,e){let{main:t,ranges:i}=n.selection,s=n.wordAt(t.head),r=s&&s.from==t.from&&s.to==t.to;for(let o=!1,l=new fi(n.doc,e,i[i.length-1].to);;)if(l.next(),l.done){if(o)return null;l=new fi(n.doc,e,0,Math.max(0,i[i.length-1].from-1)),o=!0}else{if(o&&i.some(a=>a.from==l.value.from))continue;if(r){let a=n.wordAt(l.value.from);if(!a||a.from!=l.value.from||a.to!=l.value.to)continue}return l.value}}const I0=({state:n,dispatch:e})=>{let{ranges:t}=n.selection;if(t.some(r=>r.from===r.to))return L0({state:n,dispatch:e});let i=n.sliceDoc(t[0].from,t[0].to);if(n.selection.ranges.some(r=>n.sliceDoc(r.from,r.to)!=i))return!1;let s=E0(n,i);return s?(e(n.update({selection:n.selection.addRange(v.range(s.from,s.to),!1),effects:P.scrollIntoView(s.to)})),!0):!1},gi=R.define({combine(n){return Ve(n,{top:!1,caseSensitive:!1,literal:!1,regexp:!1,wholeWord:!1,createPanel:e=>new U0(e),scrollToMatch:e=>P.scrollIntoView(e)})}});class yf{constructor(e){this.search=e.search,this.caseSensitive=!!e.caseSensitive,this.literal=!!e.literal,this.regexp=!!e.regexp,this.replace=e.replace||"",this.valid=!!this.search&&(!this.regexp||S0(this.search)),this.unquoted=this.unquote(this.search),this.wholeWord=!!e.wholeWord}unquote(e){return this.literal?e:e.replace(/\\([nrt\\])/g,(t,i)=>i=="n"?`
-`:i=="r"?"\r":i=="t"?"	":"\\")}eq(e){return this.search==e.search&&this.replace==e.replace&&this.caseSensitive==e.caseSensitive&&this.regexp==e.regexp&&this.wholeWord==e.wholeWord}create(){return this.regexp?new _0(this):new F0(this)}getCursor(e,t=0,i){let s=e.doc?e:_.create({doc:e});return i==null&&(i=s.doc.length),this.regexp?Qt(this,s,t,i):Yt(this,s,t,i)}}class bf{constructor(e){this.spec=e}}function Yt(n,e,t,i){return new fi(e.doc,n.unquoted,t,i,n.caseSensitive?void 0:s=>s.toLowerCase(),n.wholeWord?N0(e.doc,e.charCategorizer(e.selection.main.head)):void 0)}function N0(n,e){return(t,i,s,r)=>((r>t||r+s.length<i)&&(r=Math.max(0,t-2),s=n.sliceString(r,Math.min(n.length,i+2))),(e(os(s,t-r))!=Y.Word||e(ls(s,t-r))!=Y.Word)&&(e(ls(s,i-r))!=Y.Word||e(os(s,i-r))!=Y.Word))}class F0 extends bf{constructor(e){super(e)}nextMatch(e,t,i){let s=Yt(this.spec,e,i,e.doc.length).nextOverlapping();return s.done&&(s=Yt(this.spec,e,0,t).nextOverlapping()),s.done?null:s.value}prevMatchInRange(e,t,i){for(let s=i;;){let r=Math.max(t,s-1e4-this.spec.unquoted.length),o=Yt(this.spec,e,r,s),l=null;for(;!o.nextOverlapping().done;)l=o.value;if(l)return l;if(r==t)return null;s-=1e4}}prevMatch(e,t,i){return this.prevMatchInRange(e,0,t)||this.prevMatchInRange(e,i,e.doc.length)}getReplacement(e){return this.spec.unquote(this.spec.replace)}matchAll(e,t){let i=Yt(this.spec,e,0,e.doc.length),s=[];for(;!i.next().done;){if(s.length>=t)return null;s.push(i.value)}return s}highlight(e,t,i,s){let r=Yt(this.spec,e,Math.max(0,t-this.spec.unquoted.length),Math.min(i+this.spec.unquoted.length,e.doc.length));for(;!r.next().done;)s(r.value.from,r.value.to)}}function Qt(n,e,t,i){return new pf(e.doc,n.search,{ignoreCase:!n.caseSensitive,test:n.wholeWord?H0(e.charCategorizer(e.selection.main.head)):void 0},t,i)}function os(n,e){return n.slice(we(n,e,!1),e)}function ls(n,e){return n.slice(e,we(n,e))}function H0(n){return(e,t,i)=>!i[0].length||(n(os(i.input,i.index))!=Y.Word||n(ls(i.input,i.index))!=Y.Word)&&(n(ls(i.input,i.index+i[0].length))!=Y.Word||n(os(i.input,i.index+i[0].length))!=Y.Word)}class _0 extends bf{nextMatch(e,t,i){let s=Qt(this.spec,e,i,e.doc.length).next();return s.done&&(s=Qt(this.spec,e,0,t).next()),s.done?null:s.value}prevMatchInRange(e,t,i){for(let s=1;;s++){let r=Math.max(t,i-s*1e4),o=Qt(this.spec,e,r,i),l=null;for(;!o.next().done;)l=o.value;if(l&&(r==t||l.from>r+10))return l;if(r==t)return null}}prevMatch(e,t,i){return this.prevMatchInRange(e,0,t)||this.prevMatchInRange(e,i,e.doc.length)}getReplacement(e){return this.spec.unquote(this.spec.replace.replace(/\$([$&\d+])/g,(t,i)=>i=="$"?"$":i=="&"?e.match[0]:i!="0"&&+i<e.match.length?e.match[i]:t))}matchAll(e,t){let i=Qt(this.spec,e,0,e.doc.length),s=[];for(;!i.next().done;){if(s.length>=t)return null;s.push(i.value)}return s}highlight(e,t,i,s){let r=Qt(this.spec,e,Math.max(0,t-250),Math.min(i+250,e.doc.length));for(;!r.next().done;)s(r.value.from,r.value.to)}}const Ui=I.define(),Do=I.define(),St=ae.define({create(n){return new er(Xr(n).create(),null)},update(n,e){for(let t of e.effects)t.is(Ui)?n=new er(t.value.create(),n.panel):t.is(Do)&&(n=new er(n.query,t.value?To:null));return n},provide:n=>ji.from(n,e=>e.panel)});class er{constructor(e,t){this.query=e,this.panel=t}}const V0=E.mark({class:"cm-searchMatch"}),W0=E.mark({class:"cm-searchMatch cm-searchMatch-selected"}),$0=Z.fromClass(class{constructor(n){this.view=n,this.decorations=this.highlight(n.state.field(St))}update(n){let e=n.state.field(St);(e!=n.startState.field(St)||n.docChanged||n.selectionSet||n.viewportChanged)&&(this.decorations=this.highlight(e))}highlight({query:n,panel:e}){if(!e||!n.spec.valid)return E.none;let{view:t}=this,i=new ht;for(let s=0,r=t.visibleRanges,o=r.length;s<o;s++){let{from:l,to:a}=r[s];for(;s<o-1&&a>r[s+1].from-2*250;)a=r[++s].to;n.highlight(t.state,l,a,(h,c)=>{let f=t.state.selection.ranges.some(u=>u.from==h&&u.to==c);i.add(h,c,f?W0:V0)})}return i.finish()}},{decorations:n=>n.decorations});function tn(n){return e=>{let t=e.state.field(St,!1);return t&&t.query.spec.valid?n(e,t):xf(e)}}const as=tn((n,{query:e})=>{let{to:t}=n.state.selection.main,i=e.nextMatch(n.state,t,t);if(!i)return!1;let s=v.single(i.from,i.to),r=n.state.facet(gi);return n.dispatch({selection:s,effects:[Po(n,i),r.scrollToMatch(s.main,n)],userEvent:"select.search"}),vf(n),!0}),hs=tn((n,{query:e})=>{let{state:t}=n,{from:i}=t.selection.main,s=e.prevMatch(t,i,i);if(!s)return!1;let r=v.single(s.from,s.to),o=n.state.facet(gi);return n.dispatch({selection:r,effects:[Po(n,s),o.scrollToMatch(r.main,n)],userEvent:"select.search"}),vf(n),!0}),z0=tn((n,{query:e})=>{let t=e.matchAll(n.state,1e3);return!t||!t.length?!1:(n.dispatch({selection:v.create(t.map(i=>v.range(i.from,i.to))),userEvent:"select.search.matches"}),!0)}),j0=({state:n,dispatch:e})=>{let t=n.selection;if(t.ranges.length>1||t.main.empty)return!1;let{from:i,to:s}=t.main,r=[],o=0;for(let l=new fi(n.doc,n.sliceDoc(i,s));!l.next().done;){if(r.length>1e3)return!1;l.value.from==i&&(o=r.length),r.push(v.range(l.value.from,l.value.to))}return e(n.update({selection:v.create(r,o),userEvent:"select.search.matches"})),!0},ha=tn((n,{query:e})=>{let{state:t}=n,{from:i,to:s}=t.selection.main;if(t.readOnly)return!1;let r=e.nextMatch(t,i,i);if(!r)return!1;let o=[],l,a,h=[];if(r.from==i&&r.to==s&&(a=t.toText(e.getReplacement(r)),o.push({from:r.from,to:r.to,insert:a}),r=e.nextMatch(t,r.from,r.to),h.push(P.announce.of(t.phrase("replaced match on line $",t.doc.lineAt(i).number)+"."))),r){let c=o.length==0||o[0].from>=r.to?0:r.to-r.from-a.length;l=v.single(r.from-c,r.to-c),h.push(Po(n,r)),h.push(t.facet(gi).scrollToMatch(l.main,n))}return n.dispatch({changes:o,selection:l,effects:h,userEvent:"input.replace"}),!0}),q0=tn((n,{query:e})=>{if(n.state.readOnly)return!1;let t=e.matchAll(n.state,1e9).map(s=>{let{from:r,to:o}=s;return{from:r,to:o,insert:e.getReplacement(s)}});if(!t.length)return!1;let i=n.state.phrase("replaced $ matches",t.length)+".";return n.dispatch({changes:t,effects:P.announce.of(i),userEvent:"input.replace.all"}),!0});function To(n){return n.state.facet(gi).createPanel(n)}function Xr(n,e){var t,i,s,r,o;let l=n.selection.main,a=l.empty||l.to>l.from+100?"":n.sliceDoc(l.from,l.to);if(e&&!a)return e;let h=n.facet(gi);return new yf({search:((t=e==null?void 0:e.literal)!==null&&t!==void 0?t:h.literal)?a:a.replace(/\n/g,"\\n"),caseSensitive:(i=e==null?void 0:e.caseSensitive)!==null&&i!==void 0?i:h.caseSensitive,literal:(s=e==null?void 0:e.literal)!==null&&s!==void 0?s:h.literal,regexp:(r=e==null?void 0:e.regexp)!==null&&r!==void 0?r:h.regexp,wholeWord:(o=e==null?void 0:e.wholeWord)!==null&&o!==void 0?o:h.wholeWord})}function wf(n){let e=zi(n,To);return e&&e.dom.querySelector("[main-field]")}function vf(n){let e=wf(n);e&&e==n.root.activeElement&&e.select()}const xf=n=>{let e=n.state.field(St,!1);if(e&&e.panel){let t=wf(n);if(t&&t!=n.root.activeElement){let i=Xr(n.state,e.query.spec);i.valid&&n.dispatch({effects:Ui.of(i)}),t.focus(),t.select()}}else n.dispatch({effects:[Do.of(!0),e?Ui.of(Xr(n.state,e.query.spec)):I.appendConfig.of(Y0)]});return!0},kf=n=>{let e=n.state.field(St,!1);if(!e||!e.panel)return!1;let t=zi(n,To);return t&&t.dom.contains(n.root.activeElement)&&n.focus(),n.dispatch({effects:Do.of(!1)}),!0},K0=[{key:"Mod-f",run:xf,scope:"editor search-panel"},{key:"F3",run:as,shift:hs,scope:"editor search-panel",preventDefault:!0},{key:"Mod-g",run:as,shift:hs,scope:"editor search-panel",preventDefault:!0},{key:"Escape",run:kf,scope:"editor search-panel"},{key:"Mod-Shift-l",run:j0},{key:"Alt-g",run:C0},{key:"Mod-d",run:I0,preventDefault:!0}];class U0{constructor(e){this.view=e;let t=this.query=e.state.field(St).query.spec;this.commit=this.commit.bind(this),this.searchField=q("input",{value:t.search,placeholder:Te(e,"Find"),"aria-label":Te(e,"Find"),class:"cm-textfield",name:"search",form:"","main-field":"true",onchange:this.commit,onkeyup:this.commit}),this.replaceField=q("input",{value:t.replace,placeholder:Te(e,"Replace"),"aria-label":Te(e,"Replace"),class:"cm-textfield",name:"replace",form:"",onchange:this.commit,onkeyup:this.commit}),this.caseField=q("input",{type:"checkbox",name:"case",form:"",checked:t.caseSensitive,onchange:this.commit}),this.reField=q("input",{type:"checkbox",name:"re",form:"",checked:t.regexp,onchange:this.commit}),this.wordField=q("input",{type:"checkbox",name:"word",form:"",checked:t.wholeWord,onchange:this.commit});function i(s,r,o){return q("button",{class:"cm-button",name:s,onclick:r,type:"button"},o)}this.dom=q("div",{onkeydown:s=>this.keydown(s),class:"cm-search"},[this.searchField,i("next",()=>as(e),[Te(e,"next")]),i("prev",()=>hs(e),[Te(e,"previous")]),i("select",()=>z0(e),[Te(e,"all")]),q("label",null,[this.caseField,Te(e,"match case")]),q("label",null,[this.reField,Te(e,"regexp")]),q("label",null,[this.wordField,Te(e,"by word")]),...e.state.readOnly?[]:[q("br"),this.replaceField,i("replace",()=>ha(e),[Te(e,"replace")]),i("replaceAll",()=>q0(e),[Te(e,"replace all")])],q("button",{name:"close",onclick:()=>kf(e),"aria-label":Te(e,"close"),type:"button"},["×"])])}commit(){let e=new yf({search:this.searchField.value,caseSensitive:this.caseField.checked,regexp:this.reField.checked,wholeWord:this.wordField.checked,replace:this.replaceField.value});e.eq(this.query)||(this.query=e,this.view.dispatch({effects:Ui.of(e)}))}keydown(e){rp(this.view,e,"search-panel")?e.preventDefault():e.keyCode==13&&e.target==this.searchField?(e.preventDefault(),(e.shiftKey?hs:as)(this.view)):e.keyCode==13&&e.target==this.replaceField&&(e.preventDefault(),ha(this.view))}update(e){for(let t of e.transactions)for(let i of t.effects)i.is(Ui)&&!i.value.eq(this.query)&&this.setQuery(i.value)}setQuery(e){this.query=e,this.searchField.value=e.search,this.replaceField.value=e.replace,this.caseField.checked=e.caseSensitive,this.reField.checked=e.regexp,this.wordField.checked=e.wholeWord}mount(){this.searchField.select()}get pos(){return 80}get top(){return this.view.state.facet(gi).top}}function Te(n,e){return n.state.phrase(e)}const xn=30,kn=/[\s\.,:;?!]/;function Po(n,{from:e,to:t}){let i=n.state.doc.lineAt(e),s=n.state.doc.lineAt(t).to,r=Math.max(i.from,e-xn),o=Math.min(s,t+xn),l=n.state.sliceDoc(r,o);if(r!=i.from){for(let a=0;a<xn;a++)if(!kn.test(l[a+1])&&kn.test(l[a])){l=l.slice(a);break}}if(o!=s){for(let a=l.length-1;a>l.length-xn;a--)if(!kn.test(l[a-1])&&kn.test(l[a])){l=l.slice(0,a);break}}return P.announce.of(`${n.state.phrase("current match")}. ${l} ${n.state.phrase("on line")} ${i.number}.`)}const G0=P.baseTheme({".cm-panel.cm-search":{padding:"2px 6px 4px",position:"relative","& [name=close]":{position:"absolute",top:"0",right:"4px",backgroundColor:"inherit",border:"none",font:"inherit",padding:0,margin:0},"& input, & button, & label":{margin:".2em .6em .2em 0"},"& input[type=checkbox]":{marginRight:".2em"},"& label":{fontSize:"80%",whiteSpace:"pre"}},"&light .cm-searchMatch":{backgroundColor:"#ffff0054"},"&dark .cm-searchMatch":{backgroundColor:"#00ffff8a"},"&light .cm-searchMatch-selected":{backgroundColor:"#ff6a0054"},"&dark .cm-searchMatch-selected":{backgroundColor:"#ff00ff8a"}}),Y0=[St,di.low($0),G0];class Sf{constructor(e,t,i){this.state=e,this.pos=t,this.explicit=i,this.abortListeners=[]}tokenBefore(e){let t=ve(this.state).resolveInner(this.pos,-1);for(;t&&e.indexOf(t.name)<0;)t=t.parent;return t?{from:t.from,to:this.pos,text:this.state.sliceDoc(t.from,this.pos),type:t.type}:null}matchBefore(e){let t=this.state.doc.lineAt(this.pos),i=Math.max(t.from,this.pos-250),s=t.text.slice(i-t.from,this.pos-t.from),r=s.search(Cf(e,!1));return r<0?null:{from:i+r,to:this.pos,text:s.slice(r)}}get aborted(){return this.abortListeners==null}addEventListener(e,t){e=="abort"&&this.abortListeners&&this.abortListeners.push(t)}}function ca(n){let e=Object.keys(n).join(""),t=/\w/.test(e);return t&&(e=e.replace(/\w/g,"")),`[${t?"\\w":""}${e.replace(/[^\w\s]/g,"\\$&")}]`}function Q0(n){let e=Object.create(null),t=Object.create(null);for(let{label:s}of n){e[s[0]]=!0;for(let r=1;r<s.length;r++)t[s[r]]=!0}let i=ca(e)+ca(t)+"*$";return[new RegExp("^"+i),new RegExp(i)]}function J0(n){let e=n.map(s=>typeof s=="string"?{label:s}:s),[t,i]=e.every(s=>/^\w+$/.test(s.label))?[/\w*$/,/\w+$/]:Q0(e);return s=>{let r=s.matchBefore(i);return r||s.explicit?{from:r?r.from:s.pos,options:e,validFor:t}:null}}class fa{constructor(e,t,i,s){this.completion=e,this.source=t,this.match=i,this.score=s}}function Ct(n){return n.selection.main.from}function Cf(n,e){var t;let{source:i}=n,s=e&&i[0]!="^",r=i[i.length-1]!="$";return!s&&!r?n:new RegExp(`${s?"^":""}(?:${i})${r?"$":""}`,(t=n.flags)!==null&&t!==void 0?t:n.ignoreCase?"i":"")}const X0=dt.define();function Z0(n,e,t,i){let{main:s}=n.selection,r=t-s.from,o=i-s.from;return Object.assign(Object.assign({},n.changeByRange(l=>l!=s&&t!=i&&n.sliceDoc(l.from+r,l.from+o)!=n.sliceDoc(t,i)?{range:l}:{changes:{from:l.from+r,to:i==s.from?l.to:l.from+o,insert:e},range:v.cursor(l.from+r+e.length)})),{scrollIntoView:!0,userEvent:"input.complete"})}const ua=new WeakMap;function e1(n){if(!Array.isArray(n))return n;let e=ua.get(n);return e||ua.set(n,e=J0(n)),e}const Ro=I.define(),Gi=I.define();class t1{constructor(e){this.pattern=e,this.chars=[],this.folded=[],this.any=[],this.precise=[],this.byWord=[],this.score=0,this.matched=[];for(let t=0;t<e.length;){let i=fe(e,t),s=Ne(i);this.chars.push(i);let r=e.slice(t,t+s),o=r.toUpperCase();this.folded.push(fe(o==r?r.toLowerCase():o,0)),t+=s}this.astral=e.length!=this.chars.length}ret(e,t){return this.score=e,this.matched=t,!0}match(e){if(this.pattern.length==0)return this.ret(-100,[]);if(e.length<this.pattern.length)return!1;let{chars:t,folded:i,any:s,precise:r,byWord:o}=this;if(t.length==1){let k=fe(e,0),D=Ne(k),x=D==e.length?0:-100;if(k!=t[0])if(k==i[0])x+=-200;else return!1;return this.ret(x,[0,D])}let l=e.indexOf(this.pattern);if(l==0)return this.ret(e.length==this.pattern.length?0:-100,[0,this.pattern.length]);let a=t.length,h=0;if(l<0){for(let k=0,D=Math.min(e.length,200);k<D&&h<a;){let x=fe(e,k);(x==t[h]||x==i[h])&&(s[h++]=k),k+=Ne(x)}if(h<a)return!1}let c=0,f=0,u=!1,d=0,p=-1,g=-1,m=/[a-z]/.test(e),b=!0;for(let k=0,D=Math.min(e.length,200),x=0;k<D&&f<a;){let y=fe(e,k);l<0&&(c<a&&y==t[c]&&(r[c++]=k),d<a&&(y==t[d]||y==i[d]?(d==0&&(p=k),g=k+1,d++):d=0));let w,C=y<255?y>=48&&y<=57||y>=97&&y<=122?2:y>=65&&y<=90?1:0:(w=no(y))!=w.toLowerCase()?1:w!=w.toUpperCase()?2:0;(!k||C==1&&m||x==0&&C!=0)&&(t[f]==y||i[f]==y&&(u=!0)?o[f++]=k:o.length&&(b=!1)),x=C,k+=Ne(y)}return f==a&&o[0]==0&&b?this.result(-100+(u?-200:0),o,e):d==a&&p==0?this.ret(-200-e.length+(g==e.length?0:-100),[0,g]):l>-1?this.ret(-700-e.length,[l,l+this.pattern.length]):d==a?this.ret(-200+-700-e.length,[p,g]):f==a?this.result(-100+(u?-200:0)+-700+(b?0:-1100),o,e):t.length==2?!1:this.result((s[0]?-700:0)+-200+-1100,s,e)}result(e,t,i){let s=[],r=0;for(let o of t){let l=o+(this.astral?Ne(fe(i,o)):1);r&&s[r-1]==o?s[r-1]=l:(s[r++]=o,s[r++]=l)}return this.ret(e-i.length,s)}}const be=R.define({combine(n){return Ve(n,{activateOnTyping:!0,selectOnOpen:!0,override:null,closeOnBlur:!0,maxRenderedOptions:100,defaultKeymap:!0,tooltipClass:()=>"",optionClass:()=>"",aboveCursor:!1,icons:!0,addToOptions:[],positionInfo:i1,compareCompletions:(e,t)=>e.label.localeCompare(t.label),interactionDelay:75,updateSyncTime:100},{defaultKeymap:(e,t)=>e&&t,closeOnBlur:(e,t)=>e&&t,icons:(e,t)=>e&&t,tooltipClass:(e,t)=>i=>da(e(i),t(i)),optionClass:(e,t)=>i=>da(e(i),t(i)),addToOptions:(e,t)=>e.concat(t)})}});function da(n,e){return n?e?n+" "+e:n:e}function i1(n,e,t,i,s,r){let o=n.textDirection==X.RTL,l=o,a=!1,h="top",c,f,u=e.left-s.left,d=s.right-e.right,p=i.right-i.left,g=i.bottom-i.top;if(l&&u<Math.min(p,d)?l=!1:!l&&d<Math.min(p,u)&&(l=!0),p<=(l?u:d))c=Math.max(s.top,Math.min(t.top,s.bottom-g))-e.top,f=Math.min(400,l?u:d);else{a=!0,f=Math.min(400,(o?e.right:s.right-e.left)-30);let k=s.bottom-e.bottom;k>=g||k>e.top?c=t.bottom-e.top:(h="bottom",c=e.bottom-t.top)}let m=(e.bottom-e.top)/r.offsetHeight,b=(e.right-e.left)/r.offsetWidth;return{style:`${h}: ${c/m}px; max-width: ${f/b}px`,class:"cm-completionInfo-"+(a?o?"left-narrow":"right-narrow":l?"left":"right")}}function n1(n){let e=n.addToOptions.slice();return n.icons&&e.push({render(t){let i=document.createElement("div");return i.classList.add("cm-completionIcon"),t.type&&i.classList.add(...t.type.split(/\s+/g).map(s=>"cm-completionIcon-"+s)),i.setAttribute("aria-hidden","true"),i},position:20}),e.push({render(t,i,s){let r=document.createElement("span");r.className="cm-completionLabel";let o=t.displayLabel||t.label,l=0;for(let a=0;a<s.length;){let h=s[a++],c=s[a++];h>l&&r.appendChild(document.createTextNode(o.slice(l,h)));let f=r.appendChild(document.createElement("span"));f.appendChild(document.createTextNode(o.slice(h,c))),f.className="cm-completionMatchedText",l=c}return l<o.length&&r.appendChild(document.createTextNode(o.slice(l))),r},position:50},{render(t){if(!t.detail)return null;let i=document.createElement("span");return i.className="cm-completionDetail",i.textContent=t.detail,i},position:80}),e.sort((t,i)=>t.position-i.position).map(t=>t.render)}function tr(n,e,t){if(n<=t)return{from:0,to:n};if(e<0&&(e=0),e<=n>>1){let s=Math.floor(e/t);return{from:s*t,to:(s+1)*t}}let i=Math.floor((n-e)/t);return{from:n-(i+1)*t,to:n-i*t}}class s1{constructor(e,t,i){this.view=e,this.stateField=t,this.applyCompletion=i,this.info=null,this.infoDestroy=null,this.placeInfoReq={read:()=>this.measureInfo(),write:a=>this.placeInfo(a),key:this},this.space=null,this.currentClass="";let s=e.state.field(t),{options:r,selected:o}=s.open,l=e.state.facet(be);this.optionContent=n1(l),this.optionClass=l.optionClass,this.tooltipClass=l.tooltipClass,this.range=tr(r.length,o,l.maxRenderedOptions),this.dom=document.createElement("div"),this.dom.className="cm-tooltip-autocomplete",this.updateTooltipClass(e.state),this.dom.addEventListener("mousedown",a=>{let{options:h}=e.state.field(t).open;for(let c=a.target,f;c&&c!=this.dom;c=c.parentNode)if(c.nodeName=="LI"&&(f=/-(\d+)$/.exec(c.id))&&+f[1]<h.length){this.applyCompletion(e,h[+f[1]]),a.preventDefault();return}}),this.dom.addEventListener("focusout",a=>{let h=e.state.field(this.stateField,!1);h&&h.tooltip&&e.state.facet(be).closeOnBlur&&a.relatedTarget!=e.contentDOM&&e.dispatch({effects:Gi.of(null)})}),this.showOptions(r,s.id)}mount(){this.updateSel()}showOptions(e,t){this.list&&this.list.remove(),this.list=this.dom.appendChild(this.createListBox(e,t,this.range)),this.list.addEventListener("scroll",()=>{this.info&&this.view.requestMeasure(this.placeInfoReq)})}update(e){var t;let i=e.state.field(this.stateField),s=e.startState.field(this.stateField);if(this.updateTooltipClass(e.state),i!=s){let{options:r,selected:o,disabled:l}=i.open;(!s.open||s.open.options!=r)&&(this.range=tr(r.length,o,e.state.facet(be).maxRenderedOptions),this.showOptions(r,i.id)),this.updateSel(),l!=((t=s.open)===null||t===void 0?void 0:t.disabled)&&this.dom.classList.toggle("cm-tooltip-autocomplete-disabled",!!l)}}updateTooltipClass(e){let t=this.tooltipClass(e);if(t!=this.currentClass){for(let i of this.currentClass.split(" "))i&&this.dom.classList.remove(i);for(let i of t.split(" "))i&&this.dom.classList.add(i);this.currentClass=t}}positioned(e){this.space=e,this.info&&this.view.requestMeasure(this.placeInfoReq)}updateSel(){let e=this.view.state.field(this.stateField),t=e.open;if((t.selected>-1&&t.selected<this.range.from||t.selected>=this.range.to)&&(this.range=tr(t.options.length,t.selected,this.view.state.facet(be).maxRenderedOptions),this.showOptions(t.options,e.id)),this.updateSelectedOption(t.selected)){this.destroyInfo();let{completion:i}=t.options[t.selected],{info:s}=i;if(!s)return;let r=typeof s=="string"?document.createTextNode(s):s(i);if(!r)return;"then"in r?r.then(o=>{o&&this.view.state.field(this.stateField,!1)==e&&this.addInfoPane(o,i)}).catch(o=>Ie(this.view.state,o,"completion info")):this.addInfoPane(r,i)}}addInfoPane(e,t){this.destroyInfo();let i=this.info=document.createElement("div");if(i.className="cm-tooltip cm-completionInfo",e.nodeType!=null)i.appendChild(e),this.infoDestroy=null;else{let{dom:s,destroy:r}=e;i.appendChild(s),this.infoDestroy=r||null}this.dom.appendChild(i),this.view.requestMeasure(this.placeInfoReq)}updateSelectedOption(e){let t=null;for(let i=this.list.firstChild,s=this.range.from;i;i=i.nextSibling,s++)i.nodeName!="LI"||!i.id?s--:s==e?i.hasAttribute("aria-selected")||(i.setAttribute("aria-selected","true"),t=i):i.hasAttribute("aria-selected")&&i.removeAttribute("aria-selected");return t&&o1(this.list,t),t}measureInfo(){let e=this.dom.querySelector("[aria-selected]");if(!e||!this.info)return null;let t=this.dom.getBoundingClientRect(),i=this.info.getBoundingClientRect(),s=e.getBoundingClientRect(),r=this.space;if(!r){let o=this.dom.ownerDocument.defaultView||window;r={left:0,top:0,right:o.innerWidth,bottom:o.innerHeight}}return s.top>Math.min(r.bottom,t.bottom)-10||s.bottom<Math.max(r.top,t.top)+10?null:this.view.state.facet(be).positionInfo(this.view,t,s,i,r,this.dom)}placeInfo(e){this.info&&(e?(e.style&&(this.info.style.cssText=e.style),this.info.className="cm-tooltip cm-completionInfo "+(e.class||"")):this.info.style.cssText="top: -1e6px")}createListBox(e,t,i){const s=document.createElement("ul");s.id=t,s.setAttribute("role","listbox"),s.setAttribute("aria-expanded","true"),s.setAttribute("aria-label",this.view.state.phrase("Completions"));let r=null;for(let o=i.from;o<i.to;o++){let{completion:l,match:a}=e[o],{section:h}=l;if(h){let u=typeof h=="string"?h:h.name;if(u!=r&&(o>i.from||i.from==0))if(r=u,typeof h!="string"&&h.header)s.appendChild(h.header(h));else{let d=s.appendChild(document.createElement("completion-section"));d.textContent=u}}const c=s.appendChild(document.createElement("li"));c.id=t+"-"+o,c.setAttribute("role","option");let f=this.optionClass(l);f&&(c.className=f);for(let u of this.optionContent){let d=u(l,this.view.state,a);d&&c.appendChild(d)}}return i.from&&s.classList.add("cm-completionListIncompleteTop"),i.to<e.length&&s.classList.add("cm-completionListIncompleteBottom"),s}destroyInfo(){this.info&&(this.infoDestroy&&this.infoDestroy(),this.info.remove(),this.info=null)}destroy(){this.destroyInfo()}}function r1(n,e){return t=>new s1(t,n,e)}function o1(n,e){let t=n.getBoundingClientRect(),i=e.getBoundingClientRect(),s=t.height/n.offsetHeight;i.top<t.top?n.scrollTop-=(t.top-i.top)/s:i.bottom>t.bottom&&(n.scrollTop+=(i.bottom-t.bottom)/s)}function pa(n){return(n.boost||0)*100+(n.apply?10:0)+(n.info?5:0)+(n.type?1:0)}function l1(n,e){let t=[],i=null,s=a=>{t.push(a);let{section:h}=a.completion;if(h){i||(i=[]);let c=typeof h=="string"?h:h.name;i.some(f=>f.name==c)||i.push(typeof h=="string"?{name:c}:h)}};for(let a of n)if(a.hasResult()){let h=a.result.getMatch;if(a.result.filter===!1)for(let c of a.result.options)s(new fa(c,a.source,h?h(c):[],1e9-t.length));else{let c=new t1(e.sliceDoc(a.from,a.to));for(let f of a.result.options)if(c.match(f.label)){let u=f.displayLabel?h?h(f,c.matched):[]:c.matched;s(new fa(f,a.source,u,c.score+(f.boost||0)))}}}if(i){let a=Object.create(null),h=0,c=(f,u)=>{var d,p;return((d=f.rank)!==null&&d!==void 0?d:1e9)-((p=u.rank)!==null&&p!==void 0?p:1e9)||(f.name<u.name?-1:1)};for(let f of i.sort(c))h-=1e5,a[f.name]=h;for(let f of t){let{section:u}=f.completion;u&&(f.score+=a[typeof u=="string"?u:u.name])}}let r=[],o=null,l=e.facet(be).compareCompletions;for(let a of t.sort((h,c)=>c.score-h.score||l(h.completion,c.completion))){let h=a.completion;!o||o.label!=h.label||o.detail!=h.detail||o.type!=null&&h.type!=null&&o.type!=h.type||o.apply!=h.apply||o.boost!=h.boost?r.push(a):pa(a.completion)>pa(o)&&(r[r.length-1]=a),o=a.completion}return r}class Zt{constructor(e,t,i,s,r,o){this.options=e,this.attrs=t,this.tooltip=i,this.timestamp=s,this.selected=r,this.disabled=o}setSelected(e,t){return e==this.selected||e>=this.options.length?this:new Zt(this.options,ma(t,e),this.tooltip,this.timestamp,e,this.disabled)}static build(e,t,i,s,r){let o=l1(e,t);if(!o.length)return s&&e.some(a=>a.state==1)?new Zt(s.options,s.attrs,s.tooltip,s.timestamp,s.selected,!0):null;let l=t.facet(be).selectOnOpen?0:-1;if(s&&s.selected!=l&&s.selected!=-1){let a=s.options[s.selected].completion;for(let h=0;h<o.length;h++)if(o[h].completion==a){l=h;break}}return new Zt(o,ma(i,l),{pos:e.reduce((a,h)=>h.hasResult()?Math.min(a,h.from):a,1e8),create:u1,above:r.aboveCursor},s?s.timestamp:Date.now(),l,!1)}map(e){return new Zt(this.options,this.attrs,Object.assign(Object.assign({},this.tooltip),{pos:e.mapPos(this.tooltip.pos)}),this.timestamp,this.selected,this.disabled)}}class cs{constructor(e,t,i){this.active=e,this.id=t,this.open=i}static start(){return new cs(c1,"cm-ac-"+Math.floor(Math.random()*2e6).toString(36),null)}update(e){let{state:t}=e,i=t.facet(be),r=(i.override||t.languageDataAt("autocomplete",Ct(t)).map(e1)).map(l=>(this.active.find(h=>h.source==l)||new Me(l,this.active.some(h=>h.state!=0)?1:0)).update(e,i));r.length==this.active.length&&r.every((l,a)=>l==this.active[a])&&(r=this.active);let o=this.open;o&&e.docChanged&&(o=o.map(e.changes)),e.selection||r.some(l=>l.hasResult()&&e.changes.touchesRange(l.from,l.to))||!a1(r,this.active)?o=Zt.build(r,t,this.id,o,i):o&&o.disabled&&!r.some(l=>l.state==1)&&(o=null),!o&&r.every(l=>l.state!=1)&&r.some(l=>l.hasResult())&&(r=r.map(l=>l.hasResult()?new Me(l.source,0):l));for(let l of e.effects)l.is(Mf)&&(o=o&&o.setSelected(l.value,this.id));return r==this.active&&o==this.open?this:new cs(r,this.id,o)}get tooltip(){return this.open?this.open.tooltip:null}get attrs(){return this.open?this.open.attrs:h1}}function a1(n,e){if(n==e)return!0;for(let t=0,i=0;;){for(;t<n.length&&!n[t].hasResult;)t++;for(;i<e.length&&!e[i].hasResult;)i++;let s=t==n.length,r=i==e.length;if(s||r)return s==r;if(n[t++].result!=e[i++].result)return!1}}const h1={"aria-autocomplete":"list"};function ma(n,e){let t={"aria-autocomplete":"list","aria-haspopup":"listbox","aria-controls":n};return e>-1&&(t["aria-activedescendant"]=n+"-"+e),t}const c1=[];function Zr(n){return n.isUserEvent("input.type")?"input":n.isUserEvent("delete.backward")?"delete":null}class Me{constructor(e,t,i=-1){this.source=e,this.state=t,this.explicitPos=i}hasResult(){return!1}update(e,t){let i=Zr(e),s=this;i?s=s.handleUserEvent(e,i,t):e.docChanged?s=s.handleChange(e):e.selection&&s.state!=0&&(s=new Me(s.source,0));for(let r of e.effects)if(r.is(Ro))s=new Me(s.source,1,r.value?Ct(e.state):-1);else if(r.is(Gi))s=new Me(s.source,0);else if(r.is(Af))for(let o of r.value)o.source==s.source&&(s=o);return s}handleUserEvent(e,t,i){return t=="delete"||!i.activateOnTyping?this.map(e.changes):new Me(this.source,1)}handleChange(e){return e.changes.touchesRange(Ct(e.startState))?new Me(this.source,0):this.map(e.changes)}map(e){return e.empty||this.explicitPos<0?this:new Me(this.source,this.state,e.mapPos(this.explicitPos))}}class ri extends Me{constructor(e,t,i,s,r){super(e,2,t),this.result=i,this.from=s,this.to=r}hasResult(){return!0}handleUserEvent(e,t,i){var s;let r=e.changes.mapPos(this.from),o=e.changes.mapPos(this.to,1),l=Ct(e.state);if((this.explicitPos<0?l<=r:l<this.from)||l>o||t=="delete"&&Ct(e.startState)==this.from)return new Me(this.source,t=="input"&&i.activateOnTyping?1:0);let a=this.explicitPos<0?-1:e.changes.mapPos(this.explicitPos),h;return f1(this.result.validFor,e.state,r,o)?new ri(this.source,a,this.result,r,o):this.result.update&&(h=this.result.update(this.result,r,o,new Sf(e.state,l,a>=0)))?new ri(this.source,a,h,h.from,(s=h.to)!==null&&s!==void 0?s:Ct(e.state)):new Me(this.source,1,a)}handleChange(e){return e.changes.touchesRange(this.from,this.to)?new Me(this.source,0):this.map(e.changes)}map(e){return e.empty?this:new ri(this.source,this.explicitPos<0?-1:e.mapPos(this.explicitPos),this.result,e.mapPos(this.from),e.mapPos(this.to,1))}}function f1(n,e,t,i){if(!n)return!1;let s=e.sliceDoc(t,i);return typeof n=="function"?n(s,t,i,e):Cf(n,!0).test(s)}const Af=I.define({map(n,e){return n.map(t=>t.map(e))}}),Mf=I.define(),Be=ae.define({create(){return cs.start()},update(n,e){return n.update(e)},provide:n=>[xs.from(n,e=>e.tooltip),P.contentAttributes.from(n,e=>e.attrs)]});function Of(n,e){const t=e.completion.apply||e.completion.label;let i=n.state.field(Be).active.find(s=>s.source==e.source);return i instanceof ri?(typeof t=="string"?n.dispatch(Object.assign(Object.assign({},Z0(n.state,t,i.from,i.to)),{annotations:X0.of(e.completion)})):t(n,e.completion,i.from,i.to),!0):!1}const u1=r1(Be,Of);function Sn(n,e="option"){return t=>{let i=t.state.field(Be,!1);if(!i||!i.open||i.open.disabled||Date.now()-i.open.timestamp<t.state.facet(be).interactionDelay)return!1;let s=1,r;e=="page"&&(r=ac(t,i.open.tooltip))&&(s=Math.max(2,Math.floor(r.dom.offsetHeight/r.dom.querySelector("li").offsetHeight)-1));let{length:o}=i.open.options,l=i.open.selected>-1?i.open.selected+s*(n?1:-1):n?0:o-1;return l<0?l=e=="page"?0:o-1:l>=o&&(l=e=="page"?o-1:0),t.dispatch({effects:Mf.of(l)}),!0}}const d1=n=>{let e=n.state.field(Be,!1);return n.state.readOnly||!e||!e.open||e.open.selected<0||e.open.disabled||Date.now()-e.open.timestamp<n.state.facet(be).interactionDelay?!1:Of(n,e.open.options[e.open.selected])},p1=n=>n.state.field(Be,!1)?(n.dispatch({effects:Ro.of(!0)}),!0):!1,m1=n=>{let e=n.state.field(Be,!1);return!e||!e.active.some(t=>t.state!=0)?!1:(n.dispatch({effects:Gi.of(null)}),!0)};class g1{constructor(e,t){this.active=e,this.context=t,this.time=Date.now(),this.updates=[],this.done=void 0}}const y1=50,b1=1e3,w1=Z.fromClass(class{constructor(n){this.view=n,this.debounceUpdate=-1,this.running=[],this.debounceAccept=-1,this.composing=0;for(let e of n.state.field(Be).active)e.state==1&&this.startQuery(e)}update(n){let e=n.state.field(Be);if(!n.selectionSet&&!n.docChanged&&n.startState.field(Be)==e)return;let t=n.transactions.some(i=>(i.selection||i.docChanged)&&!Zr(i));for(let i=0;i<this.running.length;i++){let s=this.running[i];if(t||s.updates.length+n.transactions.length>y1&&Date.now()-s.time>b1){for(let r of s.context.abortListeners)try{r()}catch(o){Ie(this.view.state,o)}s.context.abortListeners=null,this.running.splice(i--,1)}else s.updates.push(...n.transactions)}if(this.debounceUpdate>-1&&clearTimeout(this.debounceUpdate),this.debounceUpdate=e.active.some(i=>i.state==1&&!this.running.some(s=>s.active.source==i.source))?setTimeout(()=>this.startUpdate(),50):-1,this.composing!=0)for(let i of n.transactions)Zr(i)=="input"?this.composing=2:this.composing==2&&i.selection&&(this.composing=3)}startUpdate(){this.debounceUpdate=-1;let{state:n}=this.view,e=n.field(Be);for(let t of e.active)t.state==1&&!this.running.some(i=>i.active.source==t.source)&&this.startQuery(t)}startQuery(n){let{state:e}=this.view,t=Ct(e),i=new Sf(e,t,n.explicitPos==t),s=new g1(n,i);this.running.push(s),Promise.resolve(n.source(i)).then(r=>{s.context.aborted||(s.done=r||null,this.scheduleAccept())},r=>{this.view.dispatch({effects:Gi.of(null)}),Ie(this.view.state,r)})}scheduleAccept(){this.running.every(n=>n.done!==void 0)?this.accept():this.debounceAccept<0&&(this.debounceAccept=setTimeout(()=>this.accept(),this.view.state.facet(be).updateSyncTime))}accept(){var n;this.debounceAccept>-1&&clearTimeout(this.debounceAccept),this.debounceAccept=-1;let e=[],t=this.view.state.facet(be);for(let i=0;i<this.running.length;i++){let s=this.running[i];if(s.done===void 0)continue;if(this.running.splice(i--,1),s.done){let o=new ri(s.active.source,s.active.explicitPos,s.done,s.done.from,(n=s.done.to)!==null&&n!==void 0?n:Ct(s.updates.length?s.updates[0].startState:this.view.state));for(let l of s.updates)o=o.update(l,t);if(o.hasResult()){e.push(o);continue}}let r=this.view.state.field(Be).active.find(o=>o.source==s.active.source);if(r&&r.state==1)if(s.done==null){let o=new Me(s.active.source,0);for(let l of s.updates)o=o.update(l,t);o.state!=1&&e.push(o)}else this.startQuery(r)}e.length&&this.view.dispatch({effects:Af.of(e)})}},{eventHandlers:{blur(n){let e=this.view.state.field(Be,!1);if(e&&e.tooltip&&this.view.state.facet(be).closeOnBlur){let t=e.open&&ac(this.view,e.open.tooltip);(!t||!t.dom.contains(n.relatedTarget))&&this.view.dispatch({effects:Gi.of(null)})}},compositionstart(){this.composing=1},compositionend(){this.composing==3&&setTimeout(()=>this.view.dispatch({effects:Ro.of(!1)}),20),this.composing=0}}}),v1=P.baseTheme({".cm-tooltip.cm-tooltip-autocomplete":{"& > ul":{fontFamily:"monospace",whiteSpace:"nowrap",overflow:"hidden auto",maxWidth_fallback:"700px",maxWidth:"min(700px, 95vw)",minWidth:"250px",maxHeight:"10em",height:"100%",listStyle:"none",margin:0,padding:0,"& > li, & > completion-section":{padding:"1px 3px",lineHeight:1.2},"& > li":{overflowX:"hidden",textOverflow:"ellipsis",cursor:"pointer"},"& > completion-section":{display:"list-item",borderBottom:"1px solid silver",paddingLeft:"0.5em",opacity:.7}}},"&light .cm-tooltip-autocomplete ul li[aria-selected]":{background:"#17c",color:"white"},"&light .cm-tooltip-autocomplete-disabled ul li[aria-selected]":{background:"#777"},"&dark .cm-tooltip-autocomplete ul li[aria-selected]":{background:"#347",color:"white"},"&dark .cm-tooltip-autocomplete-disabled ul li[aria-selected]":{background:"#444"},".cm-completionListIncompleteTop:before, .cm-completionListIncompleteBottom:after":{content:'"···"',opacity:.5,display:"block",textAlign:"center"},".cm-tooltip.cm-completionInfo":{position:"absolute",padding:"3px 9px",width:"max-content",maxWidth:"400px",boxSizing:"border-box"},".cm-completionInfo.cm-completionInfo-left":{right:"100%"},".cm-completionInfo.cm-completionInfo-right":{left:"100%"},".cm-completionInfo.cm-completionInfo-left-narrow":{right:"30px"},".cm-completionInfo.cm-completionInfo-right-narrow":{left:"30px"},"&light .cm-snippetField":{backgroundColor:"#00000022"},"&dark .cm-snippetField":{backgroundColor:"#ffffff22"},".cm-snippetFieldPosition":{verticalAlign:"text-top",width:0,height:"1.15em",display:"inline-block",margin:"0 -0.7px -.7em",borderLeft:"1.4px dotted #888"},".cm-completionMatchedText":{textDecoration:"underline"},".cm-completionDetail":{marginLeft:"0.5em",fontStyle:"italic"},".cm-completionIcon":{fontSize:"90%",width:".8em",display:"inline-block",textAlign:"center",paddingRight:".6em",opacity:"0.6",boxSizing:"content-box"},".cm-completionIcon-function, .cm-completionIcon-method":{"&:after":{content:"'ƒ'"}},".cm-completionIcon-class":{"&:after":{content:"'○'"}},".cm-completionIcon-interface":{"&:after":{content:"'◌'"}},".cm-completionIcon-variable":{"&:after":{content:"'𝑥'"}},".cm-completionIcon-constant":{"&:after":{content:"'𝐶'"}},".cm-completionIcon-type":{"&:after":{content:"'𝑡'"}},".cm-completionIcon-enum":{"&:after":{content:"'∪'"}},".cm-completionIcon-property":{"&:after":{content:"'□'"}},".cm-completionIcon-keyword":{"&:after":{content:"'🔑︎'"}},".cm-completionIcon-namespace":{"&:after":{content:"'▢'"}},".cm-completionIcon-text":{"&:after":{content:"'abc'",fontSize:"50%",verticalAlign:"middle"}}}),Yi={brackets:["(","[","{","'",'"'],before:")]}:;>",stringPrefixes:[]},Nt=I.define({map(n,e){let t=e.mapPos(n,-1,ke.TrackAfter);return t??void 0}}),Bo=new class extends Wt{};Bo.startSide=1;Bo.endSide=-1;const Df=ae.define({create(){return V.empty},update(n,e){if(e.selection){let t=e.state.doc.lineAt(e.selection.main.head).from,i=e.startState.doc.lineAt(e.startState.selection.main.head).from;t!=e.changes.mapPos(i,-1)&&(n=V.empty)}n=n.map(e.changes);for(let t of e.effects)t.is(Nt)&&(n=n.update({add:[Bo.range(t.value,t.value+1)]}));return n}});function x1(){return[S1,Df]}const ir="()[]{}<>";function Tf(n){for(let e=0;e<ir.length;e+=2)if(ir.charCodeAt(e)==n)return ir.charAt(e+1);return no(n<128?n:n+1)}function Pf(n,e){return n.languageDataAt("closeBrackets",e)[0]||Yi}const k1=typeof navigator=="object"&&/Android\b/.test(navigator.userAgent),S1=P.inputHandler.of((n,e,t,i)=>{if((k1?n.composing:n.compositionStarted)||n.state.readOnly)return!1;let s=n.state.selection.main;if(i.length>2||i.length==2&&Ne(fe(i,0))==1||e!=s.from||t!=s.to)return!1;let r=M1(n.state,i);return r?(n.dispatch(r),!0):!1}),C1=({state:n,dispatch:e})=>{if(n.readOnly)return!1;let i=Pf(n,n.selection.main.head).brackets||Yi.brackets,s=null,r=n.changeByRange(o=>{if(o.empty){let l=O1(n.doc,o.head);for(let a of i)if(a==l&&Ts(n.doc,o.head)==Tf(fe(a,0)))return{changes:{from:o.head-a.length,to:o.head+a.length},range:v.cursor(o.head-a.length)}}return{range:s=o}});return s||e(n.update(r,{scrollIntoView:!0,userEvent:"delete.backward"})),!s},A1=[{key:"Backspace",run:C1}];function M1(n,e){let t=Pf(n,n.selection.main.head),i=t.brackets||Yi.brackets;for(let s of i){let r=Tf(fe(s,0));if(e==s)return r==s?P1(n,s,i.indexOf(s+s+s)>-1,t):D1(n,s,r,t.before||Yi.before);if(e==r&&Rf(n,n.selection.main.from))return T1(n,s,r)}return null}function Rf(n,e){let t=!1;return n.field(Df).between(0,n.doc.length,i=>{i==e&&(t=!0)}),t}function Ts(n,e){let t=n.sliceString(e,e+2);return t.slice(0,Ne(fe(t,0)))}function O1(n,e){let t=n.sliceString(e-2,e);return Ne(fe(t,0))==t.length?t:t.slice(1)}function D1(n,e,t,i){let s=null,r=n.changeByRange(o=>{if(!o.empty)return{changes:[{insert:e,from:o.from},{insert:t,from:o.to}],effects:Nt.of(o.to+e.length),range:v.range(o.anchor+e.length,o.head+e.length)};let l=Ts(n.doc,o.head);return!l||/\s/.test(l)||i.indexOf(l)>-1?{changes:{insert:e+t,from:o.head},effects:Nt.of(o.head+e.length),range:v.cursor(o.head+e.length)}:{range:s=o}});return s?null:n.update(r,{scrollIntoView:!0,userEvent:"input.type"})}function T1(n,e,t){let i=null,s=n.changeByRange(r=>r.empty&&Ts(n.doc,r.head)==t?{changes:{from:r.head,to:r.head+t.length,insert:t},range:v.cursor(r.head+t.length)}:i={range:r});return i?null:n.update(s,{scrollIntoView:!0,userEvent:"input.type"})}function P1(n,e,t,i){let s=i.stringPrefixes||Yi.stringPrefixes,r=null,o=n.changeByRange(l=>{if(!l.empty)return{changes:[{insert:e,from:l.from},{insert:e,from:l.to}],effects:Nt.of(l.to+e.length),range:v.range(l.anchor+e.length,l.head+e.length)};let a=l.head,h=Ts(n.doc,a),c;if(h==e){if(ga(n,a))return{changes:{insert:e+e,from:a},effects:Nt.of(a+e.length),range:v.cursor(a+e.length)};if(Rf(n,a)){let u=t&&n.sliceDoc(a,a+e.length*3)==e+e+e?e+e+e:e;return{changes:{from:a,to:a+u.length,insert:u},range:v.cursor(a+u.length)}}}else{if(t&&n.sliceDoc(a-2*e.length,a)==e+e&&(c=ya(n,a-2*e.length,s))>-1&&ga(n,c))return{changes:{insert:e+e+e+e,from:a},effects:Nt.of(a+e.length),range:v.cursor(a+e.length)};if(n.charCategorizer(a)(h)!=Y.Word&&ya(n,a,s)>-1&&!R1(n,a,e,s))return{changes:{insert:e+e,from:a},effects:Nt.of(a+e.length),range:v.cursor(a+e.length)}}return{range:r=l}});return r?null:n.update(o,{scrollIntoView:!0,userEvent:"input.type"})}function ga(n,e){let t=ve(n).resolveInner(e+1);return t.parent&&t.from==e}function R1(n,e,t,i){let s=ve(n).resolveInner(e,-1),r=i.reduce((o,l)=>Math.max(o,l.length),0);for(let o=0;o<5;o++){let l=n.sliceDoc(s.from,Math.min(s.to,s.from+t.length+r)),a=l.indexOf(t);if(!a||a>-1&&i.indexOf(l.slice(0,a))>-1){let c=s.firstChild;for(;c&&c.from==s.from&&c.to-c.from>t.length+a;){if(n.sliceDoc(c.to-t.length,c.to)==t)return!1;c=c.firstChild}return!0}let h=s.to==e&&s.parent;if(!h)break;s=h}return!1}function ya(n,e,t){let i=n.charCategorizer(e);if(i(n.sliceDoc(e-1,e))!=Y.Word)return e;for(let s of t){let r=e-s.length;if(n.sliceDoc(r,e)==s&&i(n.sliceDoc(r-1,r))!=Y.Word)return r}return-1}function B1(n={}){return[Be,be.of(n),w1,L1,v1]}const Bf=[{key:"Ctrl-Space",run:p1},{key:"Escape",run:m1},{key:"ArrowDown",run:Sn(!0)},{key:"ArrowUp",run:Sn(!1)},{key:"PageDown",run:Sn(!0,"page")},{key:"PageUp",run:Sn(!1,"page")},{key:"Enter",run:d1}],L1=di.highest(po.computeN([be],n=>n.facet(be).defaultKeymap?[Bf]:[]));class E1{constructor(e,t,i){this.from=e,this.to=t,this.diagnostic=i}}class Et{constructor(e,t,i){this.diagnostics=e,this.panel=t,this.selected=i}static init(e,t,i){let s=e,r=i.facet(Ft).markerFilter;r&&(s=r(s));let o=E.set(s.map(l=>l.from==l.to||l.from==l.to-1&&i.doc.lineAt(l.from).to==l.from?E.widget({widget:new z1(l),diagnostic:l}).range(l.from):E.mark({attributes:{class:"cm-lintRange cm-lintRange-"+l.severity+(l.markClass?" "+l.markClass:"")},diagnostic:l}).range(l.from,l.to)),!0);return new Et(o,t,ui(o))}}function ui(n,e=null,t=0){let i=null;return n.between(t,1e9,(s,r,{spec:o})=>{if(!(e&&o.diagnostic!=e))return i=new E1(s,r,o.diagnostic),!1}),i}function Lf(n,e){let t=n.startState.doc.lineAt(e.pos);return!!(n.effects.some(i=>i.is(Ps))||n.changes.touchesRange(t.from,t.to))}function Ef(n,e){return n.field(Ee,!1)?e:e.concat(I.appendConfig.of(Wf))}function I1(n,e){return{effects:Ef(n,[Ps.of(e)])}}const Ps=I.define(),Lo=I.define(),If=I.define(),Ee=ae.define({create(){return new Et(E.none,null,null)},update(n,e){if(e.docChanged){let t=n.diagnostics.map(e.changes),i=null;if(n.selected){let s=e.changes.mapPos(n.selected.from,1);i=ui(t,n.selected.diagnostic,s)||ui(t,null,s)}n=new Et(t,n.panel,i)}for(let t of e.effects)t.is(Ps)?n=Et.init(t.value,n.panel,e.state):t.is(Lo)?n=new Et(n.diagnostics,t.value?Rs.open:null,n.selected):t.is(If)&&(n=new Et(n.diagnostics,n.panel,t.value));return n},provide:n=>[ji.from(n,e=>e.panel),P.decorations.from(n,e=>e.diagnostics)]}),N1=E.mark({class:"cm-lintRange cm-lintRange-active"});function F1(n,e,t){let{diagnostics:i}=n.state.field(Ee),s=[],r=2e8,o=0;i.between(e-(t<0?1:0),e+(t>0?1:0),(a,h,{spec:c})=>{e>=a&&e<=h&&(a==h||(e>a||t>0)&&(e<h||t<0))&&(s.push(c.diagnostic),r=Math.min(a,r),o=Math.max(h,o))});let l=n.state.facet(Ft).tooltipFilter;return l&&(s=l(s)),s.length?{pos:r,end:o,above:n.state.doc.lineAt(r).to<o,create(){return{dom:Nf(n,s)}}}:null}function Nf(n,e){return q("ul",{class:"cm-tooltip-lint"},e.map(t=>Hf(n,t,!1)))}const H1=n=>{let e=n.state.field(Ee,!1);(!e||!e.panel)&&n.dispatch({effects:Ef(n.state,[Lo.of(!0)])});let t=zi(n,Rs.open);return t&&t.dom.querySelector(".cm-panel-lint ul").focus(),!0},ba=n=>{let e=n.state.field(Ee,!1);return!e||!e.panel?!1:(n.dispatch({effects:Lo.of(!1)}),!0)},_1=n=>{let e=n.state.field(Ee,!1);if(!e)return!1;let t=n.state.selection.main,i=e.diagnostics.iter(t.to+1);return!i.value&&(i=e.diagnostics.iter(0),!i.value||i.from==t.from&&i.to==t.to)?!1:(n.dispatch({selection:{anchor:i.from,head:i.to},scrollIntoView:!0}),!0)},V1=[{key:"Mod-Shift-m",run:H1,preventDefault:!0},{key:"F8",run:_1}],W1=Z.fromClass(class{constructor(n){this.view=n,this.timeout=-1,this.set=!0;let{delay:e}=n.state.facet(Ft);this.lintTime=Date.now()+e,this.run=this.run.bind(this),this.timeout=setTimeout(this.run,e)}run(){let n=Date.now();if(n<this.lintTime-10)this.timeout=setTimeout(this.run,this.lintTime-n);else{this.set=!1;let{state:e}=this.view,{sources:t}=e.facet(Ft);Promise.all(t.map(i=>Promise.resolve(i(this.view)))).then(i=>{let s=i.reduce((r,o)=>r.concat(o));this.view.state.doc==e.doc&&this.view.dispatch(I1(this.view.state,s))},i=>{Ie(this.view.state,i)})}}update(n){let e=n.state.facet(Ft);(n.docChanged||e!=n.startState.facet(Ft)||e.needsRefresh&&e.needsRefresh(n))&&(this.lintTime=Date.now()+e.delay,this.set||(this.set=!0,this.timeout=setTimeout(this.run,e.delay)))}force(){this.set&&(this.lintTime=Date.now(),this.run())}destroy(){clearTimeout(this.timeout)}}),Ft=R.define({combine(n){return Object.assign({sources:n.map(e=>e.source)},Ve(n.map(e=>e.config),{delay:750,markerFilter:null,tooltipFilter:null,needsRefresh:null},{needsRefresh:(e,t)=>e?t?i=>e(i)||t(i):e:t}))}});function $1(n,e={}){return[Ft.of({source:n,config:e}),W1,Wf]}function Ff(n){let e=[];if(n)e:for(let{name:t}of n){for(let i=0;i<t.length;i++){let s=t[i];if(/[a-zA-Z]/.test(s)&&!e.some(r=>r.toLowerCase()==s.toLowerCase())){e.push(s);continue e}}e.push("")}return e}function Hf(n,e,t){var i;let s=t?Ff(e.actions):[];return q("li",{class:"cm-diagnostic cm-diagnostic-"+e.severity},q("span",{class:"cm-diagnosticText"},e.renderMessage?e.renderMessage():e.message),(i=e.actions)===null||i===void 0?void 0:i.map((r,o)=>{let l=!1,a=u=>{if(u.preventDefault(),l)return;l=!0;let d=ui(n.state.field(Ee).diagnostics,e);d&&r.apply(n,d.from,d.to)},{name:h}=r,c=s[o]?h.indexOf(s[o]):-1,f=c<0?h:[h.slice(0,c),q("u",h.slice(c,c+1)),h.slice(c+1)];return q("button",{type:"button",class:"cm-diagnosticAction",onclick:a,onmousedown:a,"aria-label":` Action: ${h}${c<0?"":` (access key "${s[o]})"`}.`},f)}),e.source&&q("div",{class:"cm-diagnosticSource"},e.source))}class z1 extends Tt{constructor(e){super(),this.diagnostic=e}eq(e){return e.diagnostic==this.diagnostic}toDOM(){return q("span",{class:"cm-lintPoint cm-lintPoint-"+this.diagnostic.severity})}}class wa{constructor(e,t){this.diagnostic=t,this.id="item_"+Math.floor(Math.random()*4294967295).toString(16),this.dom=Hf(e,t,!0),this.dom.id=this.id,this.dom.setAttribute("role","option")}}class Rs{constructor(e){this.view=e,this.items=[];let t=s=>{if(s.keyCode==27)ba(this.view),this.view.focus();else if(s.keyCode==38||s.keyCode==33)this.moveSelection((this.selectedIndex-1+this.items.length)%this.items.length);else if(s.keyCode==40||s.keyCode==34)this.moveSelection((this.selectedIndex+1)%this.items.length);else if(s.keyCode==36)this.moveSelection(0);else if(s.keyCode==35)this.moveSelection(this.items.length-1);else if(s.keyCode==13)this.view.focus();else if(s.keyCode>=65&&s.keyCode<=90&&this.selectedIndex>=0){let{diagnostic:r}=this.items[this.selectedIndex],o=Ff(r.actions);for(let l=0;l<o.length;l++)if(o[l].toUpperCase().charCodeAt(0)==s.keyCode){let a=ui(this.view.state.field(Ee).diagnostics,r);a&&r.actions[l].apply(e,a.from,a.to)}}else return;s.preventDefault()},i=s=>{for(let r=0;r<this.items.length;r++)this.items[r].dom.contains(s.target)&&this.moveSelection(r)};this.list=q("ul",{tabIndex:0,role:"listbox","aria-label":this.view.state.phrase("Diagnostics"),onkeydown:t,onclick:i}),this.dom=q("div",{class:"cm-panel-lint"},this.list,q("button",{type:"button",name:"close","aria-label":this.view.state.phrase("close"),onclick:()=>ba(this.view)},"×")),this.update()}get selectedIndex(){let e=this.view.state.field(Ee).selected;if(!e)return-1;for(let t=0;t<this.items.length;t++)if(this.items[t].diagnostic==e.diagnostic)return t;return-1}update(){let{diagnostics:e,selected:t}=this.view.state.field(Ee),i=0,s=!1,r=null;for(e.between(0,this.view.state.doc.length,(o,l,{spec:a})=>{let h=-1,c;for(let f=i;f<this.items.length;f++)if(this.items[f].diagnostic==a.diagnostic){h=f;break}h<0?(c=new wa(this.view,a.diagnostic),this.items.splice(i,0,c),s=!0):(c=this.items[h],h>i&&(this.items.splice(i,h-i),s=!0)),t&&c.diagnostic==t.diagnostic?c.dom.hasAttribute("aria-selected")||(c.dom.setAttribute("aria-selected","true"),r=c):c.dom.hasAttribute("aria-selected")&&c.dom.removeAttribute("aria-selected"),i++});i<this.items.length&&!(this.items.length==1&&this.items[0].diagnostic.from<0);)s=!0,this.items.pop();this.items.length==0&&(this.items.push(new wa(this.view,{from:-1,to:-1,severity:"info",message:this.view.state.phrase("No diagnostics")})),s=!0),r?(this.list.setAttribute("aria-activedescendant",r.id),this.view.requestMeasure({key:this,read:()=>({sel:r.dom.getBoundingClientRect(),panel:this.list.getBoundingClientRect()}),write:({sel:o,panel:l})=>{let a=l.height/this.list.offsetHeight;o.top<l.top?this.list.scrollTop-=(l.top-o.top)/a:o.bottom>l.bottom&&(this.list.scrollTop+=(o.bottom-l.bottom)/a)}})):this.selectedIndex<0&&this.list.removeAttribute("aria-activedescendant"),s&&this.sync()}sync(){let e=this.list.firstChild;function t(){let i=e;e=i.nextSibling,i.remove()}for(let i of this.items)if(i.dom.parentNode==this.list){for(;e!=i.dom;)t();e=i.dom.nextSibling}else this.list.insertBefore(i.dom,e);for(;e;)t()}moveSelection(e){if(this.selectedIndex<0)return;let t=this.view.state.field(Ee),i=ui(t.diagnostics,this.items[e].diagnostic);i&&this.view.dispatch({selection:{anchor:i.from,head:i.to},scrollIntoView:!0,effects:If.of(i)})}static open(e){return new Rs(e)}}function Nn(n,e='viewBox="0 0 40 40"'){return`url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" ${e}>${encodeURIComponent(n)}</svg>')`}function Cn(n){return Nn(`<path d="m0 2.5 l2 -1.5 l1 0 l2 1.5 l1 0" stroke="${n}" fill="none" stroke-width=".7"/>`,'width="6" height="3"')}const j1=P.baseTheme({".cm-diagnostic":{padding:"3px 6px 3px 8px",marginLeft:"-1px",display:"block",whiteSpace:"pre-wrap"},".cm-diagnostic-error":{borderLeft:"5px solid #d11"},".cm-diagnostic-warning":{borderLeft:"5px solid orange"},".cm-diagnostic-info":{borderLeft:"5px solid #999"},".cm-diagnostic-hint":{borderLeft:"5px solid #66d"},".cm-diagnosticAction":{font:"inherit",border:"none",padding:"2px 4px",backgroundColor:"#444",color:"white",borderRadius:"3px",marginLeft:"8px",cursor:"pointer"},".cm-diagnosticSource":{fontSize:"70%",opacity:.7},".cm-lintRange":{backgroundPosition:"left bottom",backgroundRepeat:"repeat-x",paddingBottom:"0.7px"},".cm-lintRange-error":{backgroundImage:Cn("#d11")},".cm-lintRange-warning":{backgroundImage:Cn("orange")},".cm-lintRange-info":{backgroundImage:Cn("#999")},".cm-lintRange-hint":{backgroundImage:Cn("#66d")},".cm-lintRange-active":{backgroundColor:"#ffdd9980"},".cm-tooltip-lint":{padding:0,margin:0},".cm-lintPoint":{position:"relative","&:after":{content:'""',position:"absolute",bottom:0,left:"-2px",borderLeft:"3px solid transparent",borderRight:"3px solid transparent",borderBottom:"4px solid #d11"}},".cm-lintPoint-warning":{"&:after":{borderBottomColor:"orange"}},".cm-lintPoint-info":{"&:after":{borderBottomColor:"#999"}},".cm-lintPoint-hint":{"&:after":{borderBottomColor:"#66d"}},".cm-panel.cm-panel-lint":{position:"relative","& ul":{maxHeight:"100px",overflowY:"auto","& [aria-selected]":{backgroundColor:"#ddd","& u":{textDecoration:"underline"}},"&:focus [aria-selected]":{background_fallback:"#bdf",backgroundColor:"Highlight",color_fallback:"white",color:"HighlightText"},"& u":{textDecoration:"none"},padding:0,margin:0},"& [name=close]":{position:"absolute",top:"0",right:"2px",background:"inherit",border:"none",font:"inherit",padding:0,margin:0}}});function va(n){return n=="error"?4:n=="warning"?3:n=="info"?2:1}class q1 extends st{constructor(e){super(),this.diagnostics=e,this.severity=e.reduce((t,i)=>va(t)<va(i.severity)?i.severity:t,"hint")}toDOM(e){let t=document.createElement("div");t.className="cm-lint-marker cm-lint-marker-"+this.severity;let i=this.diagnostics,s=e.state.facet(Bs).tooltipFilter;return s&&(i=s(i)),i.length&&(t.onmouseover=()=>U1(e,t,i)),t}}function K1(n,e){let t=i=>{let s=e.getBoundingClientRect();if(!(i.clientX>s.left-10&&i.clientX<s.right+10&&i.clientY>s.top-10&&i.clientY<s.bottom+10)){for(let r=i.target;r;r=r.parentNode)if(r.nodeType==1&&r.classList.contains("cm-tooltip-lint"))return;window.removeEventListener("mousemove",t),n.state.field(Vf)&&n.dispatch({effects:Eo.of(null)})}};window.addEventListener("mousemove",t)}function U1(n,e,t){function i(){let o=n.elementAtHeight(e.getBoundingClientRect().top+5-n.documentTop);n.coordsAtPos(o.from)&&n.dispatch({effects:Eo.of({pos:o.from,above:!1,create(){return{dom:Nf(n,t),getCoords:()=>e.getBoundingClientRect()}}})}),e.onmouseout=e.onmousemove=null,K1(n,e)}let{hoverTime:s}=n.state.facet(Bs),r=setTimeout(i,s);e.onmouseout=()=>{clearTimeout(r),e.onmouseout=e.onmousemove=null},e.onmousemove=()=>{clearTimeout(r),r=setTimeout(i,s)}}function G1(n,e){let t=Object.create(null);for(let s of e){let r=n.lineAt(s.from);(t[r.from]||(t[r.from]=[])).push(s)}let i=[];for(let s in t)i.push(new q1(t[s]).range(+s));return V.of(i,!0)}const Y1=cc({class:"cm-gutter-lint",markers:n=>n.state.field(_f)}),_f=ae.define({create(){return V.empty},update(n,e){n=n.map(e.changes);let t=e.state.facet(Bs).markerFilter;for(let i of e.effects)if(i.is(Ps)){let s=i.value;t&&(s=t(s||[])),n=G1(e.state.doc,s.slice(0))}return n}}),Eo=I.define(),Vf=ae.define({create(){return null},update(n,e){return n&&e.docChanged&&(n=Lf(e,n)?null:Object.assign(Object.assign({},n),{pos:e.changes.mapPos(n.pos)})),e.effects.reduce((t,i)=>i.is(Eo)?i.value:t,n)},provide:n=>xs.from(n)}),Q1=P.baseTheme({".cm-gutter-lint":{width:"1.4em","& .cm-gutterElement":{padding:".2em"}},".cm-lint-marker":{width:"1em",height:"1em"},".cm-lint-marker-info":{content:Nn('<path fill="#aaf" stroke="#77e" stroke-width="6" stroke-linejoin="round" d="M5 5L35 5L35 35L5 35Z"/>')},".cm-lint-marker-warning":{content:Nn('<path fill="#fe8" stroke="#fd7" stroke-width="6" stroke-linejoin="round" d="M20 6L37 35L3 35Z"/>')},".cm-lint-marker-error":{content:Nn('<circle cx="20" cy="20" r="15" fill="#f87" stroke="#f43" stroke-width="6"/>')}}),Wf=[Ee,P.decorations.compute([Ee],n=>{let{selected:e,panel:t}=n.field(Ee);return!e||!t||e.from==e.to?E.none:E.set([N1.range(e.from,e.to)])}),jp(F1,{hideOn:Lf}),j1],Bs=R.define({combine(n){return Ve(n,{hoverTime:300,markerFilter:null,tooltipFilter:null})}});function J1(n={}){return[Bs.of(n),_f,Y1,Q1,Vf]}const X1=(()=>[Xp(),tm(),kp(),vg(),qm(),fp(),gp(),_.allowMultipleSelections.of(!0),Rm(),Um(Qm,{fallback:!0}),ng(),x1(),B1(),Ep(),Fp(),Dp(),O0(),po.of([...A1,...k0,...K0,...Tg,...Wm,...Bf,...V1])])();class fs{constructor(e,t,i,s,r,o,l,a,h,c=0,f){this.p=e,this.stack=t,this.state=i,this.reducePos=s,this.pos=r,this.score=o,this.buffer=l,this.bufferBase=a,this.curContext=h,this.lookAhead=c,this.parent=f}toString(){return`[${this.stack.filter((e,t)=>t%3==0).concat(this.state)}]@${this.pos}${this.score?"!"+this.score:""}`}static start(e,t,i=0){let s=e.parser.context;return new fs(e,[],t,i,i,0,[],0,s?new xa(s,s.start):null,0,null)}get context(){return this.curContext?this.curContext.context:null}pushState(e,t){this.stack.push(this.state,t,this.bufferBase+this.buffer.length),this.state=e}reduce(e){var t;let i=e>>19,s=e&65535,{parser:r}=this.p,o=r.dynamicPrecedence(s);if(o&&(this.score+=o),i==0){this.pushState(r.getGoto(this.state,s,!0),this.reducePos),s<r.minRepeatTerm&&this.storeNode(s,this.reducePos,this.reducePos,4,!0),this.reduceContext(s,this.reducePos);return}let l=this.stack.length-(i-1)*3-(e&262144?6:0),a=l?this.stack[l-2]:this.p.ranges[0].from,h=this.reducePos-a;h>=2e3&&!(!((t=this.p.parser.nodeSet.types[s])===null||t===void 0)&&t.isAnonymous)&&(a==this.p.lastBigReductionStart?(this.p.bigReductionCount++,this.p.lastBigReductionSize=h):this.p.lastBigReductionSize<h&&(this.p.bigReductionCount=1,this.p.lastBigReductionStart=a,this.p.lastBigReductionSize=h));let c=l?this.stack[l-1]:0,f=this.bufferBase+this.buffer.length-c;if(s<r.minRepeatTerm||e&131072){let u=r.stateFlag(this.state,1)?this.pos:this.reducePos;this.storeNode(s,a,u,f+4,!0)}if(e&262144)this.state=this.stack[l];else{let u=this.stack[l-3];this.state=r.getGoto(u,s,!0)}for(;this.stack.length>l;)this.stack.pop();this.reduceContext(s,a)}storeNode(e,t,i,s=4,r=!1){if(e==0&&(!this.stack.length||this.stack[this.stack.length-1]<this.buffer.length+this.bufferBase)){let o=this,l=this.buffer.length;if(l==0&&o.parent&&(l=o.bufferBase-o.parent.bufferBase,o=o.parent),l>0&&o.buffer[l-4]==0&&o.buffer[l-1]>-1){if(t==i)return;if(o.buffer[l-2]>=t){o.buffer[l-2]=i;return}}}if(!r||this.pos==i)this.buffer.push(e,t,i,s);else{let o=this.buffer.length;if(o>0&&this.buffer[o-4]!=0)for(;o>0&&this.buffer[o-2]>i;)this.buffer[o]=this.buffer[o-4],this.buffer[o+1]=this.buffer[o-3],this.buffer[o+2]=this.buffer[o-2],this.buffer[o+3]=this.buffer[o-1],o-=4,s>4&&(s-=4);this.buffer[o]=e,this.buffer[o+1]=t,this.buffer[o+2]=i,this.buffer[o+3]=s}}shift(e,t,i,s){if(e&131072)this.pushState(e&65535,this.pos);else if(e&262144)this.pos=s,this.shiftContext(t,i),t<=this.p.parser.maxNode&&this.buffer.push(t,i,s,4);else{let r=e,{parser:o}=this.p;(s>this.pos||t<=o.maxNode)&&(this.pos=s,o.stateFlag(r,1)||(this.reducePos=s)),this.pushState(r,i),this.shiftContext(t,i),t<=o.maxNode&&this.buffer.push(t,i,s,4)}}apply(e,t,i,s){e&65536?this.reduce(e):this.shift(e,t,i,s)}useNode(e,t){let i=this.p.reused.length-1;(i<0||this.p.reused[i]!=e)&&(this.p.reused.push(e),i++);let s=this.pos;this.reducePos=this.pos=s+e.length,this.pushState(t,s),this.buffer.push(i,s,this.reducePos,-1),this.curContext&&this.updateContext(this.curContext.tracker.reuse(this.curContext.context,e,this,this.p.stream.reset(this.pos-e.length)))}split(){let e=this,t=e.buffer.length;for(;t>0&&e.buffer[t-2]>e.reducePos;)t-=4;let i=e.buffer.slice(t),s=e.bufferBase+t;for(;e&&s==e.bufferBase;)e=e.parent;return new fs(this.p,this.stack.slice(),this.state,this.reducePos,this.pos,this.score,i,s,this.curContext,this.lookAhead,e)}recoverByDelete(e,t){let i=e<=this.p.parser.maxNode;i&&this.storeNode(e,this.pos,t,4),this.storeNode(0,this.pos,t,i?8:4),this.pos=this.reducePos=t,this.score-=190}canShift(e){for(let t=new Z1(this);;){let i=this.p.parser.stateSlot(t.state,4)||this.p.parser.hasAction(t.state,e);if(i==0)return!1;if(!(i&65536))return!0;t.reduce(i)}}recoverByInsert(e){if(this.stack.length>=300)return[];let t=this.p.parser.nextStates(this.state);if(t.length>8||this.stack.length>=120){let s=[];for(let r=0,o;r<t.length;r+=2)(o=t[r+1])!=this.state&&this.p.parser.hasAction(o,e)&&s.push(t[r],o);if(this.stack.length<120)for(let r=0;s.length<8&&r<t.length;r+=2){let o=t[r+1];s.some((l,a)=>a&1&&l==o)||s.push(t[r],o)}t=s}let i=[];for(let s=0;s<t.length&&i.length<4;s+=2){let r=t[s+1];if(r==this.state)continue;let o=this.split();o.pushState(r,this.pos),o.storeNode(0,o.pos,o.pos,4,!0),o.shiftContext(t[s],this.pos),o.reducePos=this.pos,o.score-=200,i.push(o)}return i}forceReduce(){let{parser:e}=this.p,t=e.stateSlot(this.state,5);if(!(t&65536))return!1;if(!e.validAction(this.state,t)){let i=t>>19,s=t&65535,r=this.stack.length-i*3;if(r<0||e.getGoto(this.stack[r],s,!1)<0){let o=this.findForcedReduction();if(o==null)return!1;t=o}this.storeNode(0,this.pos,this.pos,4,!0),this.score-=100}return this.reducePos=this.pos,this.reduce(t),!0}findForcedReduction(){let{parser:e}=this.p,t=[],i=(s,r)=>{if(!t.includes(s))return t.push(s),e.allActions(s,o=>{if(!(o&393216))if(o&65536){let l=(o>>19)-r;if(l>1){let a=o&65535,h=this.stack.length-l*3;if(h>=0&&e.getGoto(this.stack[h],a,!1)>=0)return l<<19|65536|a}}else{let l=i(o,r+1);if(l!=null)return l}})};return i(this.state,0)}forceAll(){for(;!this.p.parser.stateFlag(this.state,2);)if(!this.forceReduce()){this.storeNode(0,this.pos,this.pos,4,!0);break}return this}get deadEnd(){if(this.stack.length!=3)return!1;let{parser:e}=this.p;return e.data[e.stateSlot(this.state,1)]==65535&&!e.stateSlot(this.state,4)}restart(){this.storeNode(0,this.pos,this.pos,4,!0),this.state=this.stack[0],this.stack.length=0}sameState(e){if(this.state!=e.state||this.stack.length!=e.stack.length)return!1;for(let t=0;t<this.stack.length;t+=3)if(this.stack[t]!=e.stack[t])return!1;return!0}get parser(){return this.p.parser}dialectEnabled(e){return this.p.parser.dialect.flags[e]}shiftContext(e,t){this.curContext&&this.updateContext(this.curContext.tracker.shift(this.curContext.context,e,this,this.p.stream.reset(t)))}reduceContext(e,t){this.curContext&&this.updateContext(this.curContext.tracker.reduce(this.curContext.context,e,this,this.p.stream.reset(t)))}emitContext(){let e=this.buffer.length-1;(e<0||this.buffer[e]!=-3)&&this.buffer.push(this.curContext.hash,this.pos,this.pos,-3)}emitLookAhead(){let e=this.buffer.length-1;(e<0||this.buffer[e]!=-4)&&this.buffer.push(this.lookAhead,this.pos,this.pos,-4)}updateContext(e){if(e!=this.curContext.context){let t=new xa(this.curContext.tracker,e);t.hash!=this.curContext.hash&&this.emitContext(),this.curContext=t}}setLookAhead(e){e>this.lookAhead&&(this.emitLookAhead(),this.lookAhead=e)}close(){this.curContext&&this.curContext.tracker.strict&&this.emitContext(),this.lookAhead>0&&this.emitLookAhead()}}class xa{constructor(e,t){this.tracker=e,this.context=t,this.hash=e.strict?e.hash(t):0}}class Z1{constructor(e){this.start=e,this.state=e.state,this.stack=e.stack,this.base=this.stack.length}reduce(e){let t=e&65535,i=e>>19;i==0?(this.stack==this.start.stack&&(this.stack=this.stack.slice()),this.stack.push(this.state,0,0),this.base+=3):this.base-=(i-1)*3;let s=this.start.p.parser.getGoto(this.stack[this.base-3],t,!0);this.state=s}}class us{constructor(e,t,i){this.stack=e,this.pos=t,this.index=i,this.buffer=e.buffer,this.index==0&&this.maybeNext()}static create(e,t=e.bufferBase+e.buffer.length){return new us(e,t,t-e.bufferBase)}maybeNext(){let e=this.stack.parent;e!=null&&(this.index=this.stack.bufferBase-e.bufferBase,this.stack=e,this.buffer=e.buffer)}get id(){return this.buffer[this.index-4]}get start(){return this.buffer[this.index-3]}get end(){return this.buffer[this.index-2]}get size(){return this.buffer[this.index-1]}next(){this.index-=4,this.pos-=4,this.index==0&&this.maybeNext()}fork(){return new us(this.stack,this.pos,this.index)}}function An(n,e=Uint16Array){if(typeof n!="string")return n;let t=null;for(let i=0,s=0;i<n.length;){let r=0;for(;;){let o=n.charCodeAt(i++),l=!1;if(o==126){r=65535;break}o>=92&&o--,o>=34&&o--;let a=o-32;if(a>=46&&(a-=46,l=!0),r+=a,l)break;r*=46}t?t[s++]=r:t=new e(r)}return t}class Fn{constructor(){this.start=-1,this.value=-1,this.end=-1,this.extended=-1,this.lookAhead=0,this.mask=0,this.context=0}}const ka=new Fn;class ey{constructor(e,t){this.input=e,this.ranges=t,this.chunk="",this.chunkOff=0,this.chunk2="",this.chunk2Pos=0,this.next=-1,this.token=ka,this.rangeIndex=0,this.pos=this.chunkPos=t[0].from,this.range=t[0],this.end=t[t.length-1].to,this.readNext()}resolveOffset(e,t){let i=this.range,s=this.rangeIndex,r=this.pos+e;for(;r<i.from;){if(!s)return null;let o=this.ranges[--s];r-=i.from-o.to,i=o}for(;t<0?r>i.to:r>=i.to;){if(s==this.ranges.length-1)return null;let o=this.ranges[++s];r+=o.from-i.to,i=o}return r}clipPos(e){if(e>=this.range.from&&e<this.range.to)return e;for(let t of this.ranges)if(t.to>e)return Math.max(e,t.from);return this.end}peek(e){let t=this.chunkOff+e,i,s;if(t>=0&&t<this.chunk.length)i=this.pos+e,s=this.chunk.charCodeAt(t);else{let r=this.resolveOffset(e,1);if(r==null)return-1;if(i=r,i>=this.chunk2Pos&&i<this.chunk2Pos+this.chunk2.length)s=this.chunk2.charCodeAt(i-this.chunk2Pos);else{let o=this.rangeIndex,l=this.range;for(;l.to<=i;)l=this.ranges[++o];this.chunk2=this.input.chunk(this.chunk2Pos=i),i+this.chunk2.length>l.to&&(this.chunk2=this.chunk2.slice(0,l.to-i)),s=this.chunk2.charCodeAt(0)}}return i>=this.token.lookAhead&&(this.token.lookAhead=i+1),s}acceptToken(e,t=0){let i=t?this.resolveOffset(t,-1):this.pos;if(i==null||i<this.token.start)throw new RangeError("Token end out of bounds");this.token.value=e,this.token.end=i}getChunk(){if(this.pos>=this.chunk2Pos&&this.pos<this.chunk2Pos+this.chunk2.length){let{chunk:e,chunkPos:t}=this;this.chunk=this.chunk2,this.chunkPos=this.chunk2Pos,this.chunk2=e,this.chunk2Pos=t,this.chunkOff=this.pos-this.chunkPos}else{this.chunk2=this.chunk,this.chunk2Pos=this.chunkPos;let e=this.input.chunk(this.pos),t=this.pos+e.length;this.chunk=t>this.range.to?e.slice(0,this.range.to-this.pos):e,this.chunkPos=this.pos,this.chunkOff=0}}readNext(){return this.chunkOff>=this.chunk.length&&(this.getChunk(),this.chunkOff==this.chunk.length)?this.next=-1:this.next=this.chunk.charCodeAt(this.chunkOff)}advance(e=1){for(this.chunkOff+=e;this.pos+e>=this.range.to;){if(this.rangeIndex==this.ranges.length-1)return this.setDone();e-=this.range.to-this.pos,this.range=this.ranges[++this.rangeIndex],this.pos=this.range.from}return this.pos+=e,this.pos>=this.token.lookAhead&&(this.token.lookAhead=this.pos+1),this.readNext()}setDone(){return this.pos=this.chunkPos=this.end,this.range=this.ranges[this.rangeIndex=this.ranges.length-1],this.chunk="",this.next=-1}reset(e,t){if(t?(this.token=t,t.start=e,t.lookAhead=e+1,t.value=t.extended=-1):this.token=ka,this.pos!=e){if(this.pos=e,e==this.end)return this.setDone(),this;for(;e<this.range.from;)this.range=this.ranges[--this.rangeIndex];for(;e>=this.range.to;)this.range=this.ranges[++this.rangeIndex];e>=this.chunkPos&&e<this.chunkPos+this.chunk.length?this.chunkOff=e-this.chunkPos:(this.chunk="",this.chunkOff=0),this.readNext()}return this}read(e,t){if(e>=this.chunkPos&&t<=this.chunkPos+this.chunk.length)return this.chunk.slice(e-this.chunkPos,t-this.chunkPos);if(e>=this.chunk2Pos&&t<=this.chunk2Pos+this.chunk2.length)return this.chunk2.slice(e-this.chunk2Pos,t-this.chunk2Pos);if(e>=this.range.from&&t<=this.range.to)return this.input.read(e,t);let i="";for(let s of this.ranges){if(s.from>=t)break;s.to>e&&(i+=this.input.read(Math.max(s.from,e),Math.min(s.to,t)))}return i}}class oi{constructor(e,t){this.data=e,this.id=t}token(e,t){let{parser:i}=t.p;ty(this.data,e,t,this.id,i.data,i.tokenPrecTable)}}oi.prototype.contextual=oi.prototype.fallback=oi.prototype.extend=!1;oi.prototype.fallback=oi.prototype.extend=!1;function ty(n,e,t,i,s,r){let o=0,l=1<<i,{dialect:a}=t.p.parser;e:for(;l&n[o];){let h=n[o+1];for(let d=o+3;d<h;d+=2)if((n[d+1]&l)>0){let p=n[d];if(a.allows(p)&&(e.token.value==-1||e.token.value==p||iy(p,e.token.value,s,r))){e.acceptToken(p);break}}let c=e.next,f=0,u=n[o+2];if(e.next<0&&u>f&&n[h+u*3-3]==65535){o=n[h+u*3-1];continue e}for(;f<u;){let d=f+u>>1,p=h+d+(d<<1),g=n[p],m=n[p+1]||65536;if(c<g)u=d;else if(c>=m)f=d+1;else{o=n[p+2],e.advance();continue e}}break}}function Sa(n,e,t){for(let i=e,s;(s=n[i])!=65535;i++)if(s==t)return i-e;return-1}function iy(n,e,t,i){let s=Sa(t,i,e);return s<0||Sa(t,i,n)<s}const Pe=typeof process<"u"&&process.env&&/\bparse\b/.test({}.LOG);let nr=null;function Ca(n,e,t){let i=n.cursor(he.IncludeAnonymous);for(i.moveTo(e);;)if(!(t<0?i.childBefore(e):i.childAfter(e)))for(;;){if((t<0?i.to<e:i.from>e)&&!i.type.isError)return t<0?Math.max(0,Math.min(i.to-1,e-25)):Math.min(n.length,Math.max(i.from+1,e+25));if(t<0?i.prevSibling():i.nextSibling())break;if(!i.parent())return t<0?0:n.length}}class ny{constructor(e,t){this.fragments=e,this.nodeSet=t,this.i=0,this.fragment=null,this.safeFrom=-1,this.safeTo=-1,this.trees=[],this.start=[],this.index=[],this.nextFragment()}nextFragment(){let e=this.fragment=this.i==this.fragments.length?null:this.fragments[this.i++];if(e){for(this.safeFrom=e.openStart?Ca(e.tree,e.from+e.offset,1)-e.offset:e.from,this.safeTo=e.openEnd?Ca(e.tree,e.to+e.offset,-1)-e.offset:e.to;this.trees.length;)this.trees.pop(),this.start.pop(),this.index.pop();this.trees.push(e.tree),this.start.push(-e.offset),this.index.push(0),this.nextStart=this.safeFrom}else this.nextStart=1e9}nodeAt(e){if(e<this.nextStart)return null;for(;this.fragment&&this.safeTo<=e;)this.nextFragment();if(!this.fragment)return null;for(;;){let t=this.trees.length-1;if(t<0)return this.nextFragment(),null;let i=this.trees[t],s=this.index[t];if(s==i.children.length){this.trees.pop(),this.start.pop(),this.index.pop();continue}let r=i.children[s],o=this.start[t]+i.positions[s];if(o>e)return this.nextStart=o,null;if(r instanceof ie){if(o==e){if(o<this.safeFrom)return null;let l=o+r.length;if(l<=this.safeTo){let a=r.prop(H.lookAhead);if(!a||l+a<this.fragment.to)return r}}this.index[t]++,o+r.length>=Math.max(this.safeFrom,e)&&(this.trees.push(r),this.start.push(o),this.index.push(0))}else this.index[t]++,this.nextStart=o+r.length}}}class sy{constructor(e,t){this.stream=t,this.tokens=[],this.mainToken=null,this.actions=[],this.tokens=e.tokenizers.map(i=>new Fn)}getActions(e){let t=0,i=null,{parser:s}=e.p,{tokenizers:r}=s,o=s.stateSlot(e.state,3),l=e.curContext?e.curContext.hash:0,a=0;for(let h=0;h<r.length;h++){if(!(1<<h&o))continue;let c=r[h],f=this.tokens[h];if(!(i&&!c.fallback)&&((c.contextual||f.start!=e.pos||f.mask!=o||f.context!=l)&&(this.updateCachedToken(f,c,e),f.mask=o,f.context=l),f.lookAhead>f.end+25&&(a=Math.max(f.lookAhead,a)),f.value!=0)){let u=t;if(f.extended>-1&&(t=this.addActions(e,f.extended,f.end,t)),t=this.addActions(e,f.value,f.end,t),!c.extend&&(i=f,t>u))break}}for(;this.actions.length>t;)this.actions.pop();return a&&e.setLookAhead(a),!i&&e.pos==this.stream.end&&(i=new Fn,i.value=e.p.parser.eofTerm,i.start=i.end=e.pos,t=this.addActions(e,i.value,i.end,t)),this.mainToken=i,this.actions}getMainToken(e){if(this.mainToken)return this.mainToken;let t=new Fn,{pos:i,p:s}=e;return t.start=i,t.end=Math.min(i+1,s.stream.end),t.value=i==s.stream.end?s.parser.eofTerm:0,t}updateCachedToken(e,t,i){let s=this.stream.clipPos(i.pos);if(t.token(this.stream.reset(s,e),i),e.value>-1){let{parser:r}=i.p;for(let o=0;o<r.specialized.length;o++)if(r.specialized[o]==e.value){let l=r.specializers[o](this.stream.read(e.start,e.end),i);if(l>=0&&i.p.parser.dialect.allows(l>>1)){l&1?e.extended=l>>1:e.value=l>>1;break}}}else e.value=0,e.end=this.stream.clipPos(s+1)}putAction(e,t,i,s){for(let r=0;r<s;r+=3)if(this.actions[r]==e)return s;return this.actions[s++]=e,this.actions[s++]=t,this.actions[s++]=i,s}addActions(e,t,i,s){let{state:r}=e,{parser:o}=e.p,{data:l}=o;for(let a=0;a<2;a++)for(let h=o.stateSlot(r,a?2:1);;h+=3){if(l[h]==65535)if(l[h+1]==1)h=lt(l,h+2);else{s==0&&l[h+1]==2&&(s=this.putAction(lt(l,h+2),t,i,s));break}l[h]==t&&(s=this.putAction(lt(l,h+1),t,i,s))}return s}}class ry{constructor(e,t,i,s){this.parser=e,this.input=t,this.ranges=s,this.recovering=0,this.nextStackID=9812,this.minStackPos=0,this.reused=[],this.stoppedAt=null,this.lastBigReductionStart=-1,this.lastBigReductionSize=0,this.bigReductionCount=0,this.stream=new ey(t,s),this.tokens=new sy(e,this.stream),this.topTerm=e.top[1];let{from:r}=s[0];this.stacks=[fs.start(this,e.top[0],r)],this.fragments=i.length&&this.stream.end-r>e.bufferLength*4?new ny(i,e.nodeSet):null}get parsedPos(){return this.minStackPos}advance(){let e=this.stacks,t=this.minStackPos,i=this.stacks=[],s,r;if(this.bigReductionCount>300&&e.length==1){let[o]=e;for(;o.forceReduce()&&o.stack.length&&o.stack[o.stack.length-2]>=this.lastBigReductionStart;);this.bigReductionCount=this.lastBigReductionSize=0}for(let o=0;o<e.length;o++){let l=e[o];for(;;){if(this.tokens.mainToken=null,l.pos>t)i.push(l);else{if(this.advanceStack(l,i,e))continue;{s||(s=[],r=[]),s.push(l);let a=this.tokens.getMainToken(l);r.push(a.value,a.end)}}break}}if(!i.length){let o=s&&ly(s);if(o)return Pe&&console.log("Finish with "+this.stackID(o)),this.stackToTree(o);if(this.parser.strict)throw Pe&&s&&console.log("Stuck with token "+(this.tokens.mainToken?this.parser.getName(this.tokens.mainToken.value):"none")),new SyntaxError("No parse at "+t);this.recovering||(this.recovering=5)}if(this.recovering&&s){let o=this.stoppedAt!=null&&s[0].pos>this.stoppedAt?s[0]:this.runRecovery(s,r,i);if(o)return Pe&&console.log("Force-finish "+this.stackID(o)),this.stackToTree(o.forceAll())}if(this.recovering){let o=this.recovering==1?1:this.recovering*3;if(i.length>o)for(i.sort((l,a)=>a.score-l.score);i.length>o;)i.pop();i.some(l=>l.reducePos>t)&&this.recovering--}else if(i.length>1){e:for(let o=0;o<i.length-1;o++){let l=i[o];for(let a=o+1;a<i.length;a++){let h=i[a];if(l.sameState(h)||l.buffer.length>500&&h.buffer.length>500)if((l.score-h.score||l.buffer.length-h.buffer.length)>0)i.splice(a--,1);else{i.splice(o--,1);continue e}}}i.length>12&&i.splice(12,i.length-12)}this.minStackPos=i[0].pos;for(let o=1;o<i.length;o++)i[o].pos<this.minStackPos&&(this.minStackPos=i[o].pos);return null}stopAt(e){if(this.stoppedAt!=null&&this.stoppedAt<e)throw new RangeError("Can't move stoppedAt forward");this.stoppedAt=e}advanceStack(e,t,i){let s=e.pos,{parser:r}=this,o=Pe?this.stackID(e)+" -> ":"";if(this.stoppedAt!=null&&s>this.stoppedAt)return e.forceReduce()?e:null;if(this.fragments){let h=e.curContext&&e.curContext.tracker.strict,c=h?e.curContext.hash:0;for(let f=this.fragments.nodeAt(s);f;){let u=this.parser.nodeSet.types[f.type.id]==f.type?r.getGoto(e.state,f.type.id):-1;if(u>-1&&f.length&&(!h||(f.prop(H.contextHash)||0)==c))return e.useNode(f,u),Pe&&console.log(o+this.stackID(e)+` (via reuse of ${r.getName(f.type.id)})`),!0;if(!(f instanceof ie)||f.children.length==0||f.positions[0]>0)break;let d=f.children[0];if(d instanceof ie&&f.positions[0]==0)f=d;else break}}let l=r.stateSlot(e.state,4);if(l>0)return e.reduce(l),Pe&&console.log(o+this.stackID(e)+` (via always-reduce ${r.getName(l&65535)})`),!0;if(e.stack.length>=8400)for(;e.stack.length>6e3&&e.forceReduce(););let a=this.tokens.getActions(e);for(let h=0;h<a.length;){let c=a[h++],f=a[h++],u=a[h++],d=h==a.length||!i,p=d?e:e.split(),g=this.tokens.mainToken;if(p.apply(c,f,g?g.start:p.pos,u),Pe&&console.log(o+this.stackID(p)+` (via ${c&65536?`reduce of ${r.getName(c&65535)}`:"shift"} for ${r.getName(f)} @ ${s}${p==e?"":", split"})`),d)return!0;p.pos>s?t.push(p):i.push(p)}return!1}advanceFully(e,t){let i=e.pos;for(;;){if(!this.advanceStack(e,null,null))return!1;if(e.pos>i)return Aa(e,t),!0}}runRecovery(e,t,i){let s=null,r=!1;for(let o=0;o<e.length;o++){let l=e[o],a=t[o<<1],h=t[(o<<1)+1],c=Pe?this.stackID(l)+" -> ":"";if(l.deadEnd&&(r||(r=!0,l.restart(),Pe&&console.log(c+this.stackID(l)+" (restarted)"),this.advanceFully(l,i))))continue;let f=l.split(),u=c;for(let d=0;f.forceReduce()&&d<10&&(Pe&&console.log(u+this.stackID(f)+" (via force-reduce)"),!this.advanceFully(f,i));d++)Pe&&(u=this.stackID(f)+" -> ");for(let d of l.recoverByInsert(a))Pe&&console.log(c+this.stackID(d)+" (via recover-insert)"),this.advanceFully(d,i);this.stream.end>l.pos?(h==l.pos&&(h++,a=0),l.recoverByDelete(a,h),Pe&&console.log(c+this.stackID(l)+` (via recover-delete ${this.parser.getName(a)})`),Aa(l,i)):(!s||s.score<l.score)&&(s=l)}return s}stackToTree(e){return e.close(),ie.build({buffer:us.create(e),nodeSet:this.parser.nodeSet,topID:this.topTerm,maxBufferLength:this.parser.bufferLength,reused:this.reused,start:this.ranges[0].from,length:e.pos-this.ranges[0].from,minRepeatType:this.parser.minRepeatTerm})}stackID(e){let t=(nr||(nr=new WeakMap)).get(e);return t||nr.set(e,t=String.fromCodePoint(this.nextStackID++)),t+e}}function Aa(n,e){for(let t=0;t<e.length;t++){let i=e[t];if(i.pos==n.pos&&i.sameState(n)){e[t].score<n.score&&(e[t]=n);return}}e.push(n)}class oy{constructor(e,t,i){this.source=e,this.flags=t,this.disabled=i}allows(e){return!this.disabled||this.disabled[e]==0}}class ds extends yc{constructor(e){if(super(),this.wrappers=[],e.version!=14)throw new RangeError(`Parser version (${e.version}) doesn't match runtime version (14)`);let t=e.nodeNames.split(" ");this.minRepeatTerm=t.length;for(let l=0;l<e.repeatNodeCount;l++)t.push("");let i=Object.keys(e.topRules).map(l=>e.topRules[l][1]),s=[];for(let l=0;l<t.length;l++)s.push([]);function r(l,a,h){s[l].push([a,a.deserialize(String(h))])}if(e.nodeProps)for(let l of e.nodeProps){let a=l[0];typeof a=="string"&&(a=H[a]);for(let h=1;h<l.length;){let c=l[h++];if(c>=0)r(c,a,l[h++]);else{let f=l[h+-c];for(let u=-c;u>0;u--)r(l[h++],a,f);h++}}}this.nodeSet=new go(t.map((l,a)=>De.define({name:a>=this.minRepeatTerm?void 0:l,id:a,props:s[a],top:i.indexOf(a)>-1,error:a==0,skipped:e.skippedNodes&&e.skippedNodes.indexOf(a)>-1}))),e.propSources&&(this.nodeSet=this.nodeSet.extend(...e.propSources)),this.strict=!1,this.bufferLength=dc;let o=An(e.tokenData);this.context=e.context,this.specializerSpecs=e.specialized||[],this.specialized=new Uint16Array(this.specializerSpecs.length);for(let l=0;l<this.specializerSpecs.length;l++)this.specialized[l]=this.specializerSpecs[l].term;this.specializers=this.specializerSpecs.map(Ma),this.states=An(e.states,Uint32Array),this.data=An(e.stateData),this.goto=An(e.goto),this.maxTerm=e.maxTerm,this.tokenizers=e.tokenizers.map(l=>typeof l=="number"?new oi(o,l):l),this.topRules=e.topRules,this.dialects=e.dialects||{},this.dynamicPrecedences=e.dynamicPrecedences||null,this.tokenPrecTable=e.tokenPrec,this.termNames=e.termNames||null,this.maxNode=this.nodeSet.types.length-1,this.dialect=this.parseDialect(),this.top=this.topRules[Object.keys(this.topRules)[0]]}createParse(e,t,i){let s=new ry(this,e,t,i);for(let r of this.wrappers)s=r(s,e,t,i);return s}getGoto(e,t,i=!1){let s=this.goto;if(t>=s[0])return-1;for(let r=s[t+1];;){let o=s[r++],l=o&1,a=s[r++];if(l&&i)return a;for(let h=r+(o>>1);r<h;r++)if(s[r]==e)return a;if(l)return-1}}hasAction(e,t){let i=this.data;for(let s=0;s<2;s++)for(let r=this.stateSlot(e,s?2:1),o;;r+=3){if((o=i[r])==65535)if(i[r+1]==1)o=i[r=lt(i,r+2)];else{if(i[r+1]==2)return lt(i,r+2);break}if(o==t||o==0)return lt(i,r+1)}return 0}stateSlot(e,t){return this.states[e*6+t]}stateFlag(e,t){return(this.stateSlot(e,0)&t)>0}validAction(e,t){return!!this.allActions(e,i=>i==t?!0:null)}allActions(e,t){let i=this.stateSlot(e,4),s=i?t(i):void 0;for(let r=this.stateSlot(e,1);s==null;r+=3){if(this.data[r]==65535)if(this.data[r+1]==1)r=lt(this.data,r+2);else break;s=t(lt(this.data,r+1))}return s}nextStates(e){let t=[];for(let i=this.stateSlot(e,1);;i+=3){if(this.data[i]==65535)if(this.data[i+1]==1)i=lt(this.data,i+2);else break;if(!(this.data[i+2]&1)){let s=this.data[i+1];t.some((r,o)=>o&1&&r==s)||t.push(this.data[i],s)}}return t}configure(e){let t=Object.assign(Object.create(ds.prototype),this);if(e.props&&(t.nodeSet=this.nodeSet.extend(...e.props)),e.top){let i=this.topRules[e.top];if(!i)throw new RangeError(`Invalid top rule name ${e.top}`);t.top=i}return e.tokenizers&&(t.tokenizers=this.tokenizers.map(i=>{let s=e.tokenizers.find(r=>r.from==i);return s?s.to:i})),e.specializers&&(t.specializers=this.specializers.slice(),t.specializerSpecs=this.specializerSpecs.map((i,s)=>{let r=e.specializers.find(l=>l.from==i.external);if(!r)return i;let o=Object.assign(Object.assign({},i),{external:r.to});return t.specializers[s]=Ma(o),o})),e.contextTracker&&(t.context=e.contextTracker),e.dialect&&(t.dialect=this.parseDialect(e.dialect)),e.strict!=null&&(t.strict=e.strict),e.wrap&&(t.wrappers=t.wrappers.concat(e.wrap)),e.bufferLength!=null&&(t.bufferLength=e.bufferLength),t}hasWrappers(){return this.wrappers.length>0}getName(e){return this.termNames?this.termNames[e]:String(e<=this.maxNode&&this.nodeSet.types[e].name||e)}get eofTerm(){return this.maxNode+1}get topNode(){return this.nodeSet.types[this.top[1]]}dynamicPrecedence(e){let t=this.dynamicPrecedences;return t==null?0:t[e]||0}parseDialect(e){let t=Object.keys(this.dialects),i=t.map(()=>!1);if(e)for(let r of e.split(" ")){let o=t.indexOf(r);o>=0&&(i[o]=!0)}let s=null;for(let r=0;r<t.length;r++)if(!i[r])for(let o=this.dialects[t[r]],l;(l=this.data[o++])!=65535;)(s||(s=new Uint8Array(this.maxTerm+1)))[l]=1;return new oy(e,i,s)}static deserialize(e){return new ds(e)}}function lt(n,e){return n[e]|n[e+1]<<16}function ly(n){let e=null;for(let t of n){let i=t.p.stoppedAt;(t.pos==t.p.stream.end||i!=null&&t.pos>i)&&t.p.parser.stateFlag(t.state,2)&&(!e||e.score<t.score)&&(e=t)}return e}function Ma(n){if(n.external){let e=n.extend?1:0;return(t,i)=>n.external(t,i)<<1|e}return n.get}const ay=bc({String:M.string,Number:M.number,"True False":M.bool,PropertyName:M.propertyName,Null:M.null,",":M.separator,"[ ]":M.squareBracket,"{ }":M.brace}),hy=ds.deserialize({version:14,states:"$bOVQPOOOOQO'#Cb'#CbOnQPO'#CeOvQPO'#CjOOQO'#Cp'#CpQOQPOOOOQO'#Cg'#CgO}QPO'#CfO!SQPO'#CrOOQO,59P,59PO![QPO,59PO!aQPO'#CuOOQO,59U,59UO!iQPO,59UOVQPO,59QOqQPO'#CkO!nQPO,59^OOQO1G.k1G.kOVQPO'#ClO!vQPO,59aOOQO1G.p1G.pOOQO1G.l1G.lOOQO,59V,59VOOQO-E6i-E6iOOQO,59W,59WOOQO-E6j-E6j",stateData:"#O~OcOS~OQSORSOSSOTSOWQO]ROePO~OVXOeUO~O[[O~PVOg^O~Oh_OVfX~OVaO~OhbO[iX~O[dO~Oh_OVfa~OhbO[ia~O",goto:"!kjPPPPPPkPPkqwPPk{!RPPP!XP!ePP!hXSOR^bQWQRf_TVQ_Q`WRg`QcZRicQTOQZRQe^RhbRYQR]R",nodeNames:"⚠ JsonText True False Null Number String } { Object Property PropertyName ] [ Array",maxTerm:25,nodeProps:[["openedBy",7,"{",12,"["],["closedBy",8,"}",13,"]"]],propSources:[ay],skippedNodes:[0],repeatNodeCount:2,tokenData:"(|~RaXY!WYZ!W]^!Wpq!Wrs!]|}$u}!O$z!Q!R%T!R![&c![!]&t!}#O&y#P#Q'O#Y#Z'T#b#c'r#h#i(Z#o#p(r#q#r(w~!]Oc~~!`Wpq!]qr!]rs!xs#O!]#O#P!}#P;'S!];'S;=`$o<%lO!]~!}Oe~~#QXrs!]!P!Q!]#O#P!]#U#V!]#Y#Z!]#b#c!]#f#g!]#h#i!]#i#j#m~#pR!Q![#y!c!i#y#T#Z#y~#|R!Q![$V!c!i$V#T#Z$V~$YR!Q![$c!c!i$c#T#Z$c~$fR!Q![!]!c!i!]#T#Z!]~$rP;=`<%l!]~$zOh~~$}Q!Q!R%T!R![&c~%YRT~!O!P%c!g!h%w#X#Y%w~%fP!Q![%i~%nRT~!Q![%i!g!h%w#X#Y%w~%zR{|&T}!O&T!Q![&Z~&WP!Q![&Z~&`PT~!Q![&Z~&hST~!O!P%c!Q![&c!g!h%w#X#Y%w~&yOg~~'OO]~~'TO[~~'WP#T#U'Z~'^P#`#a'a~'dP#g#h'g~'jP#X#Y'm~'rOR~~'uP#i#j'x~'{P#`#a(O~(RP#`#a(U~(ZOS~~(^P#f#g(a~(dP#i#j(g~(jP#X#Y(m~(rOQ~~(wOW~~(|OV~",tokenizers:[0],topRules:{JsonText:[0,1]},tokenPrec:0}),cy=()=>n=>{try{JSON.parse(n.state.doc.toString())}catch(e){if(!(e instanceof SyntaxError))throw e;const t=fy(e,n.state.doc);return[{from:t,message:e.message,severity:"error",to:t}]}return[]};function fy(n,e){let t;return(t=n.message.match(/at position (\d+)/))?Math.min(+t[1],e.length):(t=n.message.match(/at line (\d+) column (\d+)/))?Math.min(e.line(+t[1]).from+ +t[2]-1,e.length):0}const uy=Zn.define({name:"json",parser:hy.configure({props:[kc.add({Object:Yl({except:/^\s*\}/}),Array:Yl({except:/^\s*\]/})}),Cc.add({"Object Array":Lm})]}),languageData:{closeBrackets:{brackets:["[","{",'"']},indentOnInput:/^\s*[\}\]]$/}});function dy(){return new xm(uy)}function py(n,e=n.state){const t=new Set;for(const{from:i,to:s}of n.visibleRanges){let r=i;for(;r<=s;){const o=e.doc.lineAt(r);t.has(o)||t.add(o),r=o.to+1}}return t}function eo(n){const e=n.selection.main.head;return n.doc.lineAt(e)}function Oa(n,e){let t=0;e:for(let i=0;i<n.length;i++)switch(n[i]){case" ":{t+=1;continue e}case"	":{t+=e-t%e;continue e}case"\r":continue e;default:break e}return t}const ps=R.define({combine(n){return Ve(n,{highlightActiveBlock:!0,hideFirstIndent:!1,markerType:"fullScope",thickness:1})}});class my{constructor(e,t,i,s){this.lines=e,this.state=t,this.map=new Map,this.unitWidth=i,this.markerType=s;for(const r of this.lines)this.add(r);this.state.facet(ps).highlightActiveBlock&&this.findAndSetActiveLines()}has(e){return this.map.has(typeof e=="number"?e:e.number)}get(e){const t=this.map.get(typeof e=="number"?e:e.number);if(!t)throw new Error("Line not found in indentation map");return t}set(e,t,i){const s=!e.text.trim().length,r={line:e,col:t,level:i,empty:s};return this.map.set(r.line.number,r),r}add(e){if(this.has(e))return this.get(e);if(!e.length||!e.text.trim().length){if(e.number===1)return this.set(e,0,0);if(e.number===this.state.doc.lines){const o=this.closestNonEmpty(e,-1);return this.set(e,0,o.level)}const s=this.closestNonEmpty(e,-1),r=this.closestNonEmpty(e,1);return s.level>=r.level&&this.markerType!=="codeOnly"?this.set(e,0,s.level):s.empty&&s.level===0&&r.level!==0?this.set(e,0,0):r.level>s.level?this.set(e,0,s.level+1):this.set(e,0,r.level)}const t=Oa(e.text,this.state.tabSize),i=Math.floor(t/this.unitWidth);return this.set(e,t,i)}closestNonEmpty(e,t){let i=e.number+t;for(;t===-1?i>=1:i<=this.state.doc.lines;){if(this.has(i)){const o=this.get(i);if(!o.empty)return o}const r=this.state.doc.line(i);if(r.text.trim().length){const o=Oa(r.text,this.state.tabSize),l=Math.floor(o/this.unitWidth);return this.set(r,o,l)}i+=t}const s=this.state.doc.line(t===-1?1:this.state.doc.lines);return this.set(s,0,0)}findAndSetActiveLines(){const e=eo(this.state);if(!this.has(e))return;let t=this.get(e);if(this.has(t.line.number+1)){const r=this.get(t.line.number+1);r.level>t.level&&(t=r)}if(this.has(t.line.number-1)){const r=this.get(t.line.number-1);r.level>t.level&&(t=r)}if(t.level===0)return;t.active=t.level;let i,s;for(i=t.line.number;i>1;i--){if(!this.has(i-1))continue;const r=this.get(i-1);if(r.level<t.level)break;r.active=t.level}for(s=t.line.number;s<this.state.doc.lines;s++){if(!this.has(s+1))continue;const r=this.get(s+1);if(r.level<t.level)break;r.active=t.level}}}function gy(n){const e={light:"#F0F1F2",dark:"#2B3245",activeLight:"#E4E5E6",activeDark:"#3C445C"};let t=e;return n&&(t=Object.assign(Object.assign({},e),n)),P.baseTheme({"&light":{"--indent-marker-bg-color":t.light,"--indent-marker-active-bg-color":t.activeLight},"&dark":{"--indent-marker-bg-color":t.dark,"--indent-marker-active-bg-color":t.activeDark},".cm-line":{position:"relative"},".cm-indent-markers::before":{content:'""',position:"absolute",top:0,left:0,right:0,bottom:0,background:"var(--indent-markers)",pointerEvents:"none",zIndex:"-1"}})}function Mn(n,e,t,i,s){return`${`repeating-linear-gradient(to right, var(${n}) 0 ${e}px, transparent ${e}px ${t}ch)`} ${i*t}.5ch/calc(${t*s}ch - 1px) no-repeat`}function yy(n,e,t,i){const{level:s,active:r}=n;if(t&&s===0)return[];const o=t?1:0,l=[];if(r!==void 0){const a=r-o-1;a>0&&l.push(Mn("--indent-marker-bg-color",i,e,o,a)),l.push(Mn("--indent-marker-active-bg-color",i,e,r-1,1)),r!==s&&l.push(Mn("--indent-marker-bg-color",i,e,r,s-r))}else l.push(Mn("--indent-marker-bg-color",i,e,o,s-o));return l.join(",")}class by{constructor(e){this.view=e,this.unitWidth=ci(e.state),this.currentLineNumber=eo(e.state).number,this.generate(e.state)}update(e){const t=ci(e.state),i=t!==this.unitWidth;i&&(this.unitWidth=t);const s=eo(e.state).number,r=s!==this.currentLineNumber;this.currentLineNumber=s;const o=e.state.facet(ps).highlightActiveBlock&&r;(e.docChanged||e.viewportChanged||i||o)&&this.generate(e.state)}generate(e){const t=new ht,i=py(this.view,e),{hideFirstIndent:s,markerType:r,thickness:o}=e.facet(ps),l=new my(i,e,this.unitWidth,r);for(const a of i){const h=l.get(a.number);if(!(h!=null&&h.level))continue;const c=yy(h,this.unitWidth,s,o);t.add(a.from,a.from,E.line({class:"cm-indent-markers",attributes:{style:`--indent-markers: ${c}`}}))}this.decorations=t.finish()}}function wy(n={}){return[ps.of(n),gy(n.colors),Z.fromClass(by,{decorations:e=>e.decorations})]}const $f=n=>(Ba("data-v-26b92757"),n=n(),La(),n),vy={class:"actionbar d-flex flex-grow-0 flex-shrink-0 align-items-center justify-content-between border-bottom"},xy=$f(()=>A("svg",{xmlns:"http://www.w3.org/2000/svg",width:"16",height:"16",fill:"currentColor",class:"bi bi-list",viewBox:"0 0 16 16"},[A("path",{"fill-rule":"evenodd",d:"M2.5 12a.5.5 0 0 1 .5-.5h10a.5.5 0 0 1 0 1H3a.5.5 0 0 1-.5-.5zm0-4a.5.5 0 0 1 .5-.5h10a.5.5 0 0 1 0 1H3a.5.5 0 0 1-.5-.5zm0-4a.5.5 0 0 1 .5-.5h10a.5.5 0 0 1 0 1H3a.5.5 0 0 1-.5-.5z"})],-1)),ky={class:"ms-1"},Sy={class:"d-flex flex-nowrap h-100"},Cy={class:"offcanvas-header"},Ay={class:"offcanvas-body p-0 border-top h-100 overflow-auto"},My={class:"d-flex flex-column align-items-stretch flex-shrink-0 bg-body-tertiary overflow-auto h-100 w-100"},Oy={key:0,class:"list-group list-group-flush border-bottom scrollarea"},Dy=["aria-current","onClick"],Ty={class:"d-flex w-100 align-items-center justify-content-between"},Py=["title"],Ry={class:"dropdown"},By=["onClick"],Ly={class:"dropdown-menu shadow m-0"},Ey={key:1,class:"d-flex flex-column h-100 w-100 align-items-center justify-content-center mt-3"},Iy=$f(()=>A("div",{class:"vr"},null,-1)),Ny=jt({__name:"Workshop",props:{items:{},selectedItemId:{}},emits:["select-item"],setup(n,{emit:e}){const t=e,i=ge();let s;gs(()=>{s=new nu(i.value)});const r=o=>{t("select-item",o),s.hide()};return(o,l)=>{var a;return j(),J(Vt,null,[A("div",vy,[A("button",{class:"btn btn-outline-primary d-lg-none mx-2",type:"button","aria-controls":"offcanvasResponsive",onClick:l[0]||(l[0]=h=>Vn(s).toggle())},[xy,A("span",ky,[ot(o.$slots,"offcanvas-toggle-label",{},void 0,!0)])]),ot(o.$slots,"actionbar",{},void 0,!0)]),A("div",Sy,[A("div",{ref_key:"offcanvasRef",ref:i,class:"offcanvas-lg offcanvas-start h-100",tabindex:"-1",id:"offcanvasResponsive"},[A("div",Cy,[ot(o.$slots,"offcanvas-header",{},void 0,!0),A("button",{type:"button",class:"btn-close","aria-label":"Close",onClick:l[1]||(l[1]=h=>Vn(s).hide())})]),A("div",Ay,[A("div",My,[(a=o.items)!=null&&a.length?(j(),J("div",Oy,[(j(!0),J(Vt,null,Wn(o.items,h=>(j(),J("a",{key:h.id,class:Ht(["list-group-item list-group-item-action py-3 lh-sm",h.id===o.selectedItemId?"active":null]),href:"#","aria-current":h.id===o.selectedItemId,onClick:de(c=>r(h),["prevent"])},[A("div",Ty,[A("strong",{class:"me-1 list-group-item-title",title:h.name},li(h.name),9,Py),A("div",Ry,[A("button",{class:Ht(["btn dropdown-toggle",h.id===o.selectedItemId?"btn-primary":"btn-light"]),type:"button","data-bs-toggle":"dropdown","aria-expanded":"false",onClick:de(()=>{},["stop"])},null,10,By),A("ul",Ly,[ot(o.$slots,"list-item-dropdown-items",{item:h},void 0,!0)])])])],10,Dy))),128))])):(j(),J("div",Ey,[ot(o.$slots,"list-empty",{},void 0,!0)]))])])],512),Iy,ot(o.$slots,"default",{},void 0,!0)])],64)}}});const zf=to(Ny,[["__scopeId","data-v-26b92757"]]),Fy={class:"dropdown"},Hy=A("button",{class:"btn btn-outline-primary dropdown-toggle",type:"button","data-bs-toggle":"dropdown","aria-expanded":"false"}," New AI ",-1),_y={class:"dropdown-menu shadow"},Vy=Xf('<li><hr class="dropdown-divider"></li><li><a href="http://aifiles.ownai.org/?aifileversion=1" target="_blank" rel="noopener noreferrer" class="dropdown-item d-flex gap-2"> Find Examples <div class="text-secondary"><svg xmlns="http://www.w3.org/2000/svg" width="12" height="12" fill="currentColor" class="bi bi-box-arrow-up-right align-baseline" viewBox="0 0 16 16"><path fill-rule="evenodd" d="M8.636 3.5a.5.5 0 0 0-.5-.5H1.5A1.5 1.5 0 0 0 0 4.5v10A1.5 1.5 0 0 0 1.5 16h10a1.5 1.5 0 0 0 1.5-1.5V7.864a.5.5 0 0 0-1 0V14.5a.5.5 0 0 1-.5.5h-10a.5.5 0 0 1-.5-.5v-10a.5.5 0 0 1 .5-.5h6.636a.5.5 0 0 0 .5-.5z"></path><path fill-rule="evenodd" d="M16 .5a.5.5 0 0 0-.5-.5h-5a.5.5 0 0 0 0 1h3.793L6.146 9.146a.5.5 0 1 0 .708.708L15 1.707V5.5a.5.5 0 0 0 1 0v-5z"></path></svg></div></a></li>',2),sr=jt({__name:"NewAiDropdown",emits:["load","create"],setup(n,{emit:e}){const t=e;return(i,s)=>(j(),J("div",Fy,[Hy,A("ul",_y,[A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:s[0]||(s[0]=de(r=>t("load"),["prevent"]))}," Load Aifile ")]),A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:s[1]||(s[1]=de(r=>t("create"),["prevent"]))}," Create Empty ")]),Vy])]))}}),Wy={key:1,class:"text-secondary mx-2"},$y=["onClick"],zy=["onClick"],jy=jt({__name:"AiWorkshop",setup(n){const e=fu(),t=ge(!1),i=ge(!0),s=ge(),r=ge();let o;const l=Ea(),a=Ia(),h=ge(),c=y=>{if(!y)return"";const w={name:y.name,aifileversion:1,chain:y.chain};return y.input_labels&&(w.input_labels=y.input_labels),y.greeting&&(w.greeting=y.greeting),JSON.stringify(w,null,2)},f=(y,w)=>{const C=new Set,S=JSON.parse(w,function(N,F){if(N==="input_key"&&typeof F=="string"&&F.startsWith("input_")&&C.add(F),N==="input_variables"&&(F!=null&&F[Symbol.iterator]))for(const G of F)typeof G=="string"&&G.startsWith("input_")&&C.add(G);return F}),L={name:S.name,input_keys:Array.from(C),chain:S.chain};return S.input_labels&&(L.input_labels=S.input_labels),S.greeting&&(L.greeting=S.greeting),y!==void 0&&(L.id=y),L},u=()=>t.value?confirm("Unsaved changes will be lost. Really discard your changes?"):!0,d=y=>{u()&&(h.value=y.id,a.push({params:{id:y.id}}))},p=async()=>{try{const y=f(h.value||void 0,o.state.doc.toString());y.id!==void 0?await e.updateAi({...y,id:y.id}):await e.createAi(y),t.value=!1}catch(y){y instanceof SyntaxError?alert(`Cannot save the AI because its code is invalid. Please fix the code and try again.
+`:i=="r"?"\r":i=="t"?"	":"\\")}eq(e){return this.search==e.search&&this.replace==e.replace&&this.caseSensitive==e.caseSensitive&&this.regexp==e.regexp&&this.wholeWord==e.wholeWord}create(){return this.regexp?new _0(this):new F0(this)}getCursor(e,t=0,i){let s=e.doc?e:_.create({doc:e});return i==null&&(i=s.doc.length),this.regexp?Qt(this,s,t,i):Yt(this,s,t,i)}}class bf{constructor(e){this.spec=e}}function Yt(n,e,t,i){return new fi(e.doc,n.unquoted,t,i,n.caseSensitive?void 0:s=>s.toLowerCase(),n.wholeWord?N0(e.doc,e.charCategorizer(e.selection.main.head)):void 0)}function N0(n,e){return(t,i,s,r)=>((r>t||r+s.length<i)&&(r=Math.max(0,t-2),s=n.sliceString(r,Math.min(n.length,i+2))),(e(os(s,t-r))!=Y.Word||e(ls(s,t-r))!=Y.Word)&&(e(ls(s,i-r))!=Y.Word||e(os(s,i-r))!=Y.Word))}class F0 extends bf{constructor(e){super(e)}nextMatch(e,t,i){let s=Yt(this.spec,e,i,e.doc.length).nextOverlapping();return s.done&&(s=Yt(this.spec,e,0,t).nextOverlapping()),s.done?null:s.value}prevMatchInRange(e,t,i){for(let s=i;;){let r=Math.max(t,s-1e4-this.spec.unquoted.length),o=Yt(this.spec,e,r,s),l=null;for(;!o.nextOverlapping().done;)l=o.value;if(l)return l;if(r==t)return null;s-=1e4}}prevMatch(e,t,i){return this.prevMatchInRange(e,0,t)||this.prevMatchInRange(e,i,e.doc.length)}getReplacement(e){return this.spec.unquote(this.spec.replace)}matchAll(e,t){let i=Yt(this.spec,e,0,e.doc.length),s=[];for(;!i.next().done;){if(s.length>=t)return null;s.push(i.value)}return s}highlight(e,t,i,s){let r=Yt(this.spec,e,Math.max(0,t-this.spec.unquoted.length),Math.min(i+this.spec.unquoted.length,e.doc.length));for(;!r.next().done;)s(r.value.from,r.value.to)}}function Qt(n,e,t,i){return new pf(e.doc,n.search,{ignoreCase:!n.caseSensitive,test:n.wholeWord?H0(e.charCategorizer(e.selection.main.head)):void 0},t,i)}function os(n,e){return n.slice(we(n,e,!1),e)}function ls(n,e){return n.slice(e,we(n,e))}function H0(n){return(e,t,i)=>!i[0].length||(n(os(i.input,i.index))!=Y.Word||n(ls(i.input,i.index))!=Y.Word)&&(n(ls(i.input,i.index+i[0].length))!=Y.Word||n(os(i.input,i.index+i[0].length))!=Y.Word)}class _0 extends bf{nextMatch(e,t,i){let s=Qt(this.spec,e,i,e.doc.length).next();return s.done&&(s=Qt(this.spec,e,0,t).next()),s.done?null:s.value}prevMatchInRange(e,t,i){for(let s=1;;s++){let r=Math.max(t,i-s*1e4),o=Qt(this.spec,e,r,i),l=null;for(;!o.next().done;)l=o.value;if(l&&(r==t||l.from>r+10))return l;if(r==t)return null}}prevMatch(e,t,i){return this.prevMatchInRange(e,0,t)||this.prevMatchInRange(e,i,e.doc.length)}getReplacement(e){return this.spec.unquote(this.spec.replace.replace(/\$([$&\d+])/g,(t,i)=>i=="$"?"$":i=="&"?e.match[0]:i!="0"&&+i<e.match.length?e.match[i]:t))}matchAll(e,t){let i=Qt(this.spec,e,0,e.doc.length),s=[];for(;!i.next().done;){if(s.length>=t)return null;s.push(i.value)}return s}highlight(e,t,i,s){let r=Qt(this.spec,e,Math.max(0,t-250),Math.min(i+250,e.doc.length));for(;!r.next().done;)s(r.value.from,r.value.to)}}const Ui=I.define(),Do=I.define(),St=ae.define({create(n){return new er(Xr(n).create(),null)},update(n,e){for(let t of e.effects)t.is(Ui)?n=new er(t.value.create(),n.panel):t.is(Do)&&(n=new er(n.query,t.value?To:null));return n},provide:n=>ji.from(n,e=>e.panel)});class er{constructor(e,t){this.query=e,this.panel=t}}const V0=E.mark({class:"cm-searchMatch"}),W0=E.mark({class:"cm-searchMatch cm-searchMatch-selected"}),$0=Z.fromClass(class{constructor(n){this.view=n,this.decorations=this.highlight(n.state.field(St))}update(n){let e=n.state.field(St);(e!=n.startState.field(St)||n.docChanged||n.selectionSet||n.viewportChanged)&&(this.decorations=this.highlight(e))}highlight({query:n,panel:e}){if(!e||!n.spec.valid)return E.none;let{view:t}=this,i=new ht;for(let s=0,r=t.visibleRanges,o=r.length;s<o;s++){let{from:l,to:a}=r[s];for(;s<o-1&&a>r[s+1].from-2*250;)a=r[++s].to;n.highlight(t.state,l,a,(h,c)=>{let f=t.state.selection.ranges.some(u=>u.from==h&&u.to==c);i.add(h,c,f?W0:V0)})}return i.finish()}},{decorations:n=>n.decorations});function tn(n){return e=>{let t=e.state.field(St,!1);return t&&t.query.spec.valid?n(e,t):xf(e)}}const as=tn((n,{query:e})=>{let{to:t}=n.state.selection.main,i=e.nextMatch(n.state,t,t);if(!i)return!1;let s=v.single(i.from,i.to),r=n.state.facet(gi);return n.dispatch({selection:s,effects:[Po(n,i),r.scrollToMatch(s.main,n)],userEvent:"select.search"}),vf(n),!0}),hs=tn((n,{query:e})=>{let{state:t}=n,{from:i}=t.selection.main,s=e.prevMatch(t,i,i);if(!s)return!1;let r=v.single(s.from,s.to),o=n.state.facet(gi);return n.dispatch({selection:r,effects:[Po(n,s),o.scrollToMatch(r.main,n)],userEvent:"select.search"}),vf(n),!0}),z0=tn((n,{query:e})=>{let t=e.matchAll(n.state,1e3);return!t||!t.length?!1:(n.dispatch({selection:v.create(t.map(i=>v.range(i.from,i.to))),userEvent:"select.search.matches"}),!0)}),j0=({state:n,dispatch:e})=>{let t=n.selection;if(t.ranges.length>1||t.main.empty)return!1;let{from:i,to:s}=t.main,r=[],o=0;for(let l=new fi(n.doc,n.sliceDoc(i,s));!l.next().done;){if(r.length>1e3)return!1;l.value.from==i&&(o=r.length),r.push(v.range(l.value.from,l.value.to))}return e(n.update({selection:v.create(r,o),userEvent:"select.search.matches"})),!0},ha=tn((n,{query:e})=>{let{state:t}=n,{from:i,to:s}=t.selection.main;if(t.readOnly)return!1;let r=e.nextMatch(t,i,i);if(!r)return!1;let o=[],l,a,h=[];if(r.from==i&&r.to==s&&(a=t.toText(e.getReplacement(r)),o.push({from:r.from,to:r.to,insert:a}),r=e.nextMatch(t,r.from,r.to),h.push(P.announce.of(t.phrase("replaced match on line $",t.doc.lineAt(i).number)+"."))),r){let c=o.length==0||o[0].from>=r.to?0:r.to-r.from-a.length;l=v.single(r.from-c,r.to-c),h.push(Po(n,r)),h.push(t.facet(gi).scrollToMatch(l.main,n))}return n.dispatch({changes:o,selection:l,effects:h,userEvent:"input.replace"}),!0}),q0=tn((n,{query:e})=>{if(n.state.readOnly)return!1;let t=e.matchAll(n.state,1e9).map(s=>{let{from:r,to:o}=s;return{from:r,to:o,insert:e.getReplacement(s)}});if(!t.length)return!1;let i=n.state.phrase("replaced $ matches",t.length)+".";return n.dispatch({changes:t,effects:P.announce.of(i),userEvent:"input.replace.all"}),!0});function To(n){return n.state.facet(gi).createPanel(n)}function Xr(n,e){var t,i,s,r,o;let l=n.selection.main,a=l.empty||l.to>l.from+100?"":n.sliceDoc(l.from,l.to);if(e&&!a)return e;let h=n.facet(gi);return new yf({search:((t=e==null?void 0:e.literal)!==null&&t!==void 0?t:h.literal)?a:a.replace(/\n/g,"\\n"),caseSensitive:(i=e==null?void 0:e.caseSensitive)!==null&&i!==void 0?i:h.caseSensitive,literal:(s=e==null?void 0:e.literal)!==null&&s!==void 0?s:h.literal,regexp:(r=e==null?void 0:e.regexp)!==null&&r!==void 0?r:h.regexp,wholeWord:(o=e==null?void 0:e.wholeWord)!==null&&o!==void 0?o:h.wholeWord})}function wf(n){let e=zi(n,To);return e&&e.dom.querySelector("[main-field]")}function vf(n){let e=wf(n);e&&e==n.root.activeElement&&e.select()}const xf=n=>{let e=n.state.field(St,!1);if(e&&e.panel){let t=wf(n);if(t&&t!=n.root.activeElement){let i=Xr(n.state,e.query.spec);i.valid&&n.dispatch({effects:Ui.of(i)}),t.focus(),t.select()}}else n.dispatch({effects:[Do.of(!0),e?Ui.of(Xr(n.state,e.query.spec)):I.appendConfig.of(Y0)]});return!0},kf=n=>{let e=n.state.field(St,!1);if(!e||!e.panel)return!1;let t=zi(n,To);return t&&t.dom.contains(n.root.activeElement)&&n.focus(),n.dispatch({effects:Do.of(!1)}),!0},K0=[{key:"Mod-f",run:xf,scope:"editor search-panel"},{key:"F3",run:as,shift:hs,scope:"editor search-panel",preventDefault:!0},{key:"Mod-g",run:as,shift:hs,scope:"editor search-panel",preventDefault:!0},{key:"Escape",run:kf,scope:"editor search-panel"},{key:"Mod-Shift-l",run:j0},{key:"Alt-g",run:C0},{key:"Mod-d",run:I0,preventDefault:!0}];class U0{constructor(e){this.view=e;let t=this.query=e.state.field(St).query.spec;this.commit=this.commit.bind(this),this.searchField=q("input",{value:t.search,placeholder:Te(e,"Find"),"aria-label":Te(e,"Find"),class:"cm-textfield",name:"search",form:"","main-field":"true",onchange:this.commit,onkeyup:this.commit}),this.replaceField=q("input",{value:t.replace,placeholder:Te(e,"Replace"),"aria-label":Te(e,"Replace"),class:"cm-textfield",name:"replace",form:"",onchange:this.commit,onkeyup:this.commit}),this.caseField=q("input",{type:"checkbox",name:"case",form:"",checked:t.caseSensitive,onchange:this.commit}),this.reField=q("input",{type:"checkbox",name:"re",form:"",checked:t.regexp,onchange:this.commit}),this.wordField=q("input",{type:"checkbox",name:"word",form:"",checked:t.wholeWord,onchange:this.commit});function i(s,r,o){return q("button",{class:"cm-button",name:s,onclick:r,type:"button"},o)}this.dom=q("div",{onkeydown:s=>this.keydown(s),class:"cm-search"},[this.searchField,i("next",()=>as(e),[Te(e,"next")]),i("prev",()=>hs(e),[Te(e,"previous")]),i("select",()=>z0(e),[Te(e,"all")]),q("label",null,[this.caseField,Te(e,"match case")]),q("label",null,[this.reField,Te(e,"regexp")]),q("label",null,[this.wordField,Te(e,"by word")]),...e.state.readOnly?[]:[q("br"),this.replaceField,i("replace",()=>ha(e),[Te(e,"replace")]),i("replaceAll",()=>q0(e),[Te(e,"replace all")])],q("button",{name:"close",onclick:()=>kf(e),"aria-label":Te(e,"close"),type:"button"},["×"])])}commit(){let e=new yf({search:this.searchField.value,caseSensitive:this.caseField.checked,regexp:this.reField.checked,wholeWord:this.wordField.checked,replace:this.replaceField.value});e.eq(this.query)||(this.query=e,this.view.dispatch({effects:Ui.of(e)}))}keydown(e){rp(this.view,e,"search-panel")?e.preventDefault():e.keyCode==13&&e.target==this.searchField?(e.preventDefault(),(e.shiftKey?hs:as)(this.view)):e.keyCode==13&&e.target==this.replaceField&&(e.preventDefault(),ha(this.view))}update(e){for(let t of e.transactions)for(let i of t.effects)i.is(Ui)&&!i.value.eq(this.query)&&this.setQuery(i.value)}setQuery(e){this.query=e,this.searchField.value=e.search,this.replaceField.value=e.replace,this.caseField.checked=e.caseSensitive,this.reField.checked=e.regexp,this.wordField.checked=e.wholeWord}mount(){this.searchField.select()}get pos(){return 80}get top(){return this.view.state.facet(gi).top}}function Te(n,e){return n.state.phrase(e)}const xn=30,kn=/[\s\.,:;?!]/;function Po(n,{from:e,to:t}){let i=n.state.doc.lineAt(e),s=n.state.doc.lineAt(t).to,r=Math.max(i.from,e-xn),o=Math.min(s,t+xn),l=n.state.sliceDoc(r,o);if(r!=i.from){for(let a=0;a<xn;a++)if(!kn.test(l[a+1])&&kn.test(l[a])){l=l.slice(a);break}}if(o!=s){for(let a=l.length-1;a>l.length-xn;a--)if(!kn.test(l[a-1])&&kn.test(l[a])){l=l.slice(0,a);break}}return P.announce.of(`${n.state.phrase("current match")}. ${l} ${n.state.phrase("on line")} ${i.number}.`)}const G0=P.baseTheme({".cm-panel.cm-search":{padding:"2px 6px 4px",position:"relative","& [name=close]":{position:"absolute",top:"0",right:"4px",backgroundColor:"inherit",border:"none",font:"inherit",padding:0,margin:0},"& input, & button, & label":{margin:".2em .6em .2em 0"},"& input[type=checkbox]":{marginRight:".2em"},"& label":{fontSize:"80%",whiteSpace:"pre"}},"&light .cm-searchMatch":{backgroundColor:"#ffff0054"},"&dark .cm-searchMatch":{backgroundColor:"#00ffff8a"},"&light .cm-searchMatch-selected":{backgroundColor:"#ff6a0054"},"&dark .cm-searchMatch-selected":{backgroundColor:"#ff00ff8a"}}),Y0=[St,di.low($0),G0];class Sf{constructor(e,t,i){this.state=e,this.pos=t,this.explicit=i,this.abortListeners=[]}tokenBefore(e){let t=ve(this.state).resolveInner(this.pos,-1);for(;t&&e.indexOf(t.name)<0;)t=t.parent;return t?{from:t.from,to:this.pos,text:this.state.sliceDoc(t.from,this.pos),type:t.type}:null}matchBefore(e){let t=this.state.doc.lineAt(this.pos),i=Math.max(t.from,this.pos-250),s=t.text.slice(i-t.from,this.pos-t.from),r=s.search(Cf(e,!1));return r<0?null:{from:i+r,to:this.pos,text:s.slice(r)}}get aborted(){return this.abortListeners==null}addEventListener(e,t){e=="abort"&&this.abortListeners&&this.abortListeners.push(t)}}function ca(n){let e=Object.keys(n).join(""),t=/\w/.test(e);return t&&(e=e.replace(/\w/g,"")),`[${t?"\\w":""}${e.replace(/[^\w\s]/g,"\\$&")}]`}function Q0(n){let e=Object.create(null),t=Object.create(null);for(let{label:s}of n){e[s[0]]=!0;for(let r=1;r<s.length;r++)t[s[r]]=!0}let i=ca(e)+ca(t)+"*$";return[new RegExp("^"+i),new RegExp(i)]}function J0(n){let e=n.map(s=>typeof s=="string"?{label:s}:s),[t,i]=e.every(s=>/^\w+$/.test(s.label))?[/\w*$/,/\w+$/]:Q0(e);return s=>{let r=s.matchBefore(i);return r||s.explicit?{from:r?r.from:s.pos,options:e,validFor:t}:null}}class fa{constructor(e,t,i,s){this.completion=e,this.source=t,this.match=i,this.score=s}}function Ct(n){return n.selection.main.from}function Cf(n,e){var t;let{source:i}=n,s=e&&i[0]!="^",r=i[i.length-1]!="$";return!s&&!r?n:new RegExp(`${s?"^":""}(?:${i})${r?"$":""}`,(t=n.flags)!==null&&t!==void 0?t:n.ignoreCase?"i":"")}const X0=dt.define();function Z0(n,e,t,i){let{main:s}=n.selection,r=t-s.from,o=i-s.from;return Object.assign(Object.assign({},n.changeByRange(l=>l!=s&&t!=i&&n.sliceDoc(l.from+r,l.from+o)!=n.sliceDoc(t,i)?{range:l}:{changes:{from:l.from+r,to:i==s.from?l.to:l.from+o,insert:e},range:v.cursor(l.from+r+e.length)})),{scrollIntoView:!0,userEvent:"input.complete"})}const ua=new WeakMap;function e1(n){if(!Array.isArray(n))return n;let e=ua.get(n);return e||ua.set(n,e=J0(n)),e}const Ro=I.define(),Gi=I.define();class t1{constructor(e){this.pattern=e,this.chars=[],this.folded=[],this.any=[],this.precise=[],this.byWord=[],this.score=0,this.matched=[];for(let t=0;t<e.length;){let i=fe(e,t),s=Ne(i);this.chars.push(i);let r=e.slice(t,t+s),o=r.toUpperCase();this.folded.push(fe(o==r?r.toLowerCase():o,0)),t+=s}this.astral=e.length!=this.chars.length}ret(e,t){return this.score=e,this.matched=t,!0}match(e){if(this.pattern.length==0)return this.ret(-100,[]);if(e.length<this.pattern.length)return!1;let{chars:t,folded:i,any:s,precise:r,byWord:o}=this;if(t.length==1){let k=fe(e,0),D=Ne(k),x=D==e.length?0:-100;if(k!=t[0])if(k==i[0])x+=-200;else return!1;return this.ret(x,[0,D])}let l=e.indexOf(this.pattern);if(l==0)return this.ret(e.length==this.pattern.length?0:-100,[0,this.pattern.length]);let a=t.length,h=0;if(l<0){for(let k=0,D=Math.min(e.length,200);k<D&&h<a;){let x=fe(e,k);(x==t[h]||x==i[h])&&(s[h++]=k),k+=Ne(x)}if(h<a)return!1}let c=0,f=0,u=!1,d=0,p=-1,g=-1,m=/[a-z]/.test(e),b=!0;for(let k=0,D=Math.min(e.length,200),x=0;k<D&&f<a;){let y=fe(e,k);l<0&&(c<a&&y==t[c]&&(r[c++]=k),d<a&&(y==t[d]||y==i[d]?(d==0&&(p=k),g=k+1,d++):d=0));let w,C=y<255?y>=48&&y<=57||y>=97&&y<=122?2:y>=65&&y<=90?1:0:(w=no(y))!=w.toLowerCase()?1:w!=w.toUpperCase()?2:0;(!k||C==1&&m||x==0&&C!=0)&&(t[f]==y||i[f]==y&&(u=!0)?o[f++]=k:o.length&&(b=!1)),x=C,k+=Ne(y)}return f==a&&o[0]==0&&b?this.result(-100+(u?-200:0),o,e):d==a&&p==0?this.ret(-200-e.length+(g==e.length?0:-100),[0,g]):l>-1?this.ret(-700-e.length,[l,l+this.pattern.length]):d==a?this.ret(-200+-700-e.length,[p,g]):f==a?this.result(-100+(u?-200:0)+-700+(b?0:-1100),o,e):t.length==2?!1:this.result((s[0]?-700:0)+-200+-1100,s,e)}result(e,t,i){let s=[],r=0;for(let o of t){let l=o+(this.astral?Ne(fe(i,o)):1);r&&s[r-1]==o?s[r-1]=l:(s[r++]=o,s[r++]=l)}return this.ret(e-i.length,s)}}const be=R.define({combine(n){return Ve(n,{activateOnTyping:!0,selectOnOpen:!0,override:null,closeOnBlur:!0,maxRenderedOptions:100,defaultKeymap:!0,tooltipClass:()=>"",optionClass:()=>"",aboveCursor:!1,icons:!0,addToOptions:[],positionInfo:i1,compareCompletions:(e,t)=>e.label.localeCompare(t.label),interactionDelay:75,updateSyncTime:100},{defaultKeymap:(e,t)=>e&&t,closeOnBlur:(e,t)=>e&&t,icons:(e,t)=>e&&t,tooltipClass:(e,t)=>i=>da(e(i),t(i)),optionClass:(e,t)=>i=>da(e(i),t(i)),addToOptions:(e,t)=>e.concat(t)})}});function da(n,e){return n?e?n+" "+e:n:e}function i1(n,e,t,i,s,r){let o=n.textDirection==X.RTL,l=o,a=!1,h="top",c,f,u=e.left-s.left,d=s.right-e.right,p=i.right-i.left,g=i.bottom-i.top;if(l&&u<Math.min(p,d)?l=!1:!l&&d<Math.min(p,u)&&(l=!0),p<=(l?u:d))c=Math.max(s.top,Math.min(t.top,s.bottom-g))-e.top,f=Math.min(400,l?u:d);else{a=!0,f=Math.min(400,(o?e.right:s.right-e.left)-30);let k=s.bottom-e.bottom;k>=g||k>e.top?c=t.bottom-e.top:(h="bottom",c=e.bottom-t.top)}let m=(e.bottom-e.top)/r.offsetHeight,b=(e.right-e.left)/r.offsetWidth;return{style:`${h}: ${c/m}px; max-width: ${f/b}px`,class:"cm-completionInfo-"+(a?o?"left-narrow":"right-narrow":l?"left":"right")}}function n1(n){let e=n.addToOptions.slice();return n.icons&&e.push({render(t){let i=document.createElement("div");return i.classList.add("cm-completionIcon"),t.type&&i.classList.add(...t.type.split(/\s+/g).map(s=>"cm-completionIcon-"+s)),i.setAttribute("aria-hidden","true"),i},position:20}),e.push({render(t,i,s){let r=document.createElement("span");r.className="cm-completionLabel";let o=t.displayLabel||t.label,l=0;for(let a=0;a<s.length;){let h=s[a++],c=s[a++];h>l&&r.appendChild(document.createTextNode(o.slice(l,h)));let f=r.appendChild(document.createElement("span"));f.appendChild(document.createTextNode(o.slice(h,c))),f.className="cm-completionMatchedText",l=c}return l<o.length&&r.appendChild(document.createTextNode(o.slice(l))),r},position:50},{render(t){if(!t.detail)return null;let i=document.createElement("span");return i.className="cm-completionDetail",i.textContent=t.detail,i},position:80}),e.sort((t,i)=>t.position-i.position).map(t=>t.render)}function tr(n,e,t){if(n<=t)return{from:0,to:n};if(e<0&&(e=0),e<=n>>1){let s=Math.floor(e/t);return{from:s*t,to:(s+1)*t}}let i=Math.floor((n-e)/t);return{from:n-(i+1)*t,to:n-i*t}}class s1{constructor(e,t,i){this.view=e,this.stateField=t,this.applyCompletion=i,this.info=null,this.infoDestroy=null,this.placeInfoReq={read:()=>this.measureInfo(),write:a=>this.placeInfo(a),key:this},this.space=null,this.currentClass="";let s=e.state.field(t),{options:r,selected:o}=s.open,l=e.state.facet(be);this.optionContent=n1(l),this.optionClass=l.optionClass,this.tooltipClass=l.tooltipClass,this.range=tr(r.length,o,l.maxRenderedOptions),this.dom=document.createElement("div"),this.dom.className="cm-tooltip-autocomplete",this.updateTooltipClass(e.state),this.dom.addEventListener("mousedown",a=>{let{options:h}=e.state.field(t).open;for(let c=a.target,f;c&&c!=this.dom;c=c.parentNode)if(c.nodeName=="LI"&&(f=/-(\d+)$/.exec(c.id))&&+f[1]<h.length){this.applyCompletion(e,h[+f[1]]),a.preventDefault();return}}),this.dom.addEventListener("focusout",a=>{let h=e.state.field(this.stateField,!1);h&&h.tooltip&&e.state.facet(be).closeOnBlur&&a.relatedTarget!=e.contentDOM&&e.dispatch({effects:Gi.of(null)})}),this.showOptions(r,s.id)}mount(){this.updateSel()}showOptions(e,t){this.list&&this.list.remove(),this.list=this.dom.appendChild(this.createListBox(e,t,this.range)),this.list.addEventListener("scroll",()=>{this.info&&this.view.requestMeasure(this.placeInfoReq)})}update(e){var t;let i=e.state.field(this.stateField),s=e.startState.field(this.stateField);if(this.updateTooltipClass(e.state),i!=s){let{options:r,selected:o,disabled:l}=i.open;(!s.open||s.open.options!=r)&&(this.range=tr(r.length,o,e.state.facet(be).maxRenderedOptions),this.showOptions(r,i.id)),this.updateSel(),l!=((t=s.open)===null||t===void 0?void 0:t.disabled)&&this.dom.classList.toggle("cm-tooltip-autocomplete-disabled",!!l)}}updateTooltipClass(e){let t=this.tooltipClass(e);if(t!=this.currentClass){for(let i of this.currentClass.split(" "))i&&this.dom.classList.remove(i);for(let i of t.split(" "))i&&this.dom.classList.add(i);this.currentClass=t}}positioned(e){this.space=e,this.info&&this.view.requestMeasure(this.placeInfoReq)}updateSel(){let e=this.view.state.field(this.stateField),t=e.open;if((t.selected>-1&&t.selected<this.range.from||t.selected>=this.range.to)&&(this.range=tr(t.options.length,t.selected,this.view.state.facet(be).maxRenderedOptions),this.showOptions(t.options,e.id)),this.updateSelectedOption(t.selected)){this.destroyInfo();let{completion:i}=t.options[t.selected],{info:s}=i;if(!s)return;let r=typeof s=="string"?document.createTextNode(s):s(i);if(!r)return;"then"in r?r.then(o=>{o&&this.view.state.field(this.stateField,!1)==e&&this.addInfoPane(o,i)}).catch(o=>Ie(this.view.state,o,"completion info")):this.addInfoPane(r,i)}}addInfoPane(e,t){this.destroyInfo();let i=this.info=document.createElement("div");if(i.className="cm-tooltip cm-completionInfo",e.nodeType!=null)i.appendChild(e),this.infoDestroy=null;else{let{dom:s,destroy:r}=e;i.appendChild(s),this.infoDestroy=r||null}this.dom.appendChild(i),this.view.requestMeasure(this.placeInfoReq)}updateSelectedOption(e){let t=null;for(let i=this.list.firstChild,s=this.range.from;i;i=i.nextSibling,s++)i.nodeName!="LI"||!i.id?s--:s==e?i.hasAttribute("aria-selected")||(i.setAttribute("aria-selected","true"),t=i):i.hasAttribute("aria-selected")&&i.removeAttribute("aria-selected");return t&&o1(this.list,t),t}measureInfo(){let e=this.dom.querySelector("[aria-selected]");if(!e||!this.info)return null;let t=this.dom.getBoundingClientRect(),i=this.info.getBoundingClientRect(),s=e.getBoundingClientRect(),r=this.space;if(!r){let o=this.dom.ownerDocument.defaultView||window;r={left:0,top:0,right:o.innerWidth,bottom:o.innerHeight}}return s.top>Math.min(r.bottom,t.bottom)-10||s.bottom<Math.max(r.top,t.top)+10?null:this.view.state.facet(be).positionInfo(this.view,t,s,i,r,this.dom)}placeInfo(e){this.info&&(e?(e.style&&(this.info.style.cssText=e.style),this.info.className="cm-tooltip cm-completionInfo "+(e.class||"")):this.info.style.cssText="top: -1e6px")}createListBox(e,t,i){const s=document.createElement("ul");s.id=t,s.setAttribute("role","listbox"),s.setAttribute("aria-expanded","true"),s.setAttribute("aria-label",this.view.state.phrase("Completions"));let r=null;for(let o=i.from;o<i.to;o++){let{completion:l,match:a}=e[o],{section:h}=l;if(h){let u=typeof h=="string"?h:h.name;if(u!=r&&(o>i.from||i.from==0))if(r=u,typeof h!="string"&&h.header)s.appendChild(h.header(h));else{let d=s.appendChild(document.createElement("completion-section"));d.textContent=u}}const c=s.appendChild(document.createElement("li"));c.id=t+"-"+o,c.setAttribute("role","option");let f=this.optionClass(l);f&&(c.className=f);for(let u of this.optionContent){let d=u(l,this.view.state,a);d&&c.appendChild(d)}}return i.from&&s.classList.add("cm-completionListIncompleteTop"),i.to<e.length&&s.classList.add("cm-completionListIncompleteBottom"),s}destroyInfo(){this.info&&(this.infoDestroy&&this.infoDestroy(),this.info.remove(),this.info=null)}destroy(){this.destroyInfo()}}function r1(n,e){return t=>new s1(t,n,e)}function o1(n,e){let t=n.getBoundingClientRect(),i=e.getBoundingClientRect(),s=t.height/n.offsetHeight;i.top<t.top?n.scrollTop-=(t.top-i.top)/s:i.bottom>t.bottom&&(n.scrollTop+=(i.bottom-t.bottom)/s)}function pa(n){return(n.boost||0)*100+(n.apply?10:0)+(n.info?5:0)+(n.type?1:0)}function l1(n,e){let t=[],i=null,s=a=>{t.push(a);let{section:h}=a.completion;if(h){i||(i=[]);let c=typeof h=="string"?h:h.name;i.some(f=>f.name==c)||i.push(typeof h=="string"?{name:c}:h)}};for(let a of n)if(a.hasResult()){let h=a.result.getMatch;if(a.result.filter===!1)for(let c of a.result.options)s(new fa(c,a.source,h?h(c):[],1e9-t.length));else{let c=new t1(e.sliceDoc(a.from,a.to));for(let f of a.result.options)if(c.match(f.label)){let u=f.displayLabel?h?h(f,c.matched):[]:c.matched;s(new fa(f,a.source,u,c.score+(f.boost||0)))}}}if(i){let a=Object.create(null),h=0,c=(f,u)=>{var d,p;return((d=f.rank)!==null&&d!==void 0?d:1e9)-((p=u.rank)!==null&&p!==void 0?p:1e9)||(f.name<u.name?-1:1)};for(let f of i.sort(c))h-=1e5,a[f.name]=h;for(let f of t){let{section:u}=f.completion;u&&(f.score+=a[typeof u=="string"?u:u.name])}}let r=[],o=null,l=e.facet(be).compareCompletions;for(let a of t.sort((h,c)=>c.score-h.score||l(h.completion,c.completion))){let h=a.completion;!o||o.label!=h.label||o.detail!=h.detail||o.type!=null&&h.type!=null&&o.type!=h.type||o.apply!=h.apply||o.boost!=h.boost?r.push(a):pa(a.completion)>pa(o)&&(r[r.length-1]=a),o=a.completion}return r}class Zt{constructor(e,t,i,s,r,o){this.options=e,this.attrs=t,this.tooltip=i,this.timestamp=s,this.selected=r,this.disabled=o}setSelected(e,t){return e==this.selected||e>=this.options.length?this:new Zt(this.options,ma(t,e),this.tooltip,this.timestamp,e,this.disabled)}static build(e,t,i,s,r){let o=l1(e,t);if(!o.length)return s&&e.some(a=>a.state==1)?new Zt(s.options,s.attrs,s.tooltip,s.timestamp,s.selected,!0):null;let l=t.facet(be).selectOnOpen?0:-1;if(s&&s.selected!=l&&s.selected!=-1){let a=s.options[s.selected].completion;for(let h=0;h<o.length;h++)if(o[h].completion==a){l=h;break}}return new Zt(o,ma(i,l),{pos:e.reduce((a,h)=>h.hasResult()?Math.min(a,h.from):a,1e8),create:u1,above:r.aboveCursor},s?s.timestamp:Date.now(),l,!1)}map(e){return new Zt(this.options,this.attrs,Object.assign(Object.assign({},this.tooltip),{pos:e.mapPos(this.tooltip.pos)}),this.timestamp,this.selected,this.disabled)}}class cs{constructor(e,t,i){this.active=e,this.id=t,this.open=i}static start(){return new cs(c1,"cm-ac-"+Math.floor(Math.random()*2e6).toString(36),null)}update(e){let{state:t}=e,i=t.facet(be),r=(i.override||t.languageDataAt("autocomplete",Ct(t)).map(e1)).map(l=>(this.active.find(h=>h.source==l)||new Me(l,this.active.some(h=>h.state!=0)?1:0)).update(e,i));r.length==this.active.length&&r.every((l,a)=>l==this.active[a])&&(r=this.active);let o=this.open;o&&e.docChanged&&(o=o.map(e.changes)),e.selection||r.some(l=>l.hasResult()&&e.changes.touchesRange(l.from,l.to))||!a1(r,this.active)?o=Zt.build(r,t,this.id,o,i):o&&o.disabled&&!r.some(l=>l.state==1)&&(o=null),!o&&r.every(l=>l.state!=1)&&r.some(l=>l.hasResult())&&(r=r.map(l=>l.hasResult()?new Me(l.source,0):l));for(let l of e.effects)l.is(Mf)&&(o=o&&o.setSelected(l.value,this.id));return r==this.active&&o==this.open?this:new cs(r,this.id,o)}get tooltip(){return this.open?this.open.tooltip:null}get attrs(){return this.open?this.open.attrs:h1}}function a1(n,e){if(n==e)return!0;for(let t=0,i=0;;){for(;t<n.length&&!n[t].hasResult;)t++;for(;i<e.length&&!e[i].hasResult;)i++;let s=t==n.length,r=i==e.length;if(s||r)return s==r;if(n[t++].result!=e[i++].result)return!1}}const h1={"aria-autocomplete":"list"};function ma(n,e){let t={"aria-autocomplete":"list","aria-haspopup":"listbox","aria-controls":n};return e>-1&&(t["aria-activedescendant"]=n+"-"+e),t}const c1=[];function Zr(n){return n.isUserEvent("input.type")?"input":n.isUserEvent("delete.backward")?"delete":null}class Me{constructor(e,t,i=-1){this.source=e,this.state=t,this.explicitPos=i}hasResult(){return!1}update(e,t){let i=Zr(e),s=this;i?s=s.handleUserEvent(e,i,t):e.docChanged?s=s.handleChange(e):e.selection&&s.state!=0&&(s=new Me(s.source,0));for(let r of e.effects)if(r.is(Ro))s=new Me(s.source,1,r.value?Ct(e.state):-1);else if(r.is(Gi))s=new Me(s.source,0);else if(r.is(Af))for(let o of r.value)o.source==s.source&&(s=o);return s}handleUserEvent(e,t,i){return t=="delete"||!i.activateOnTyping?this.map(e.changes):new Me(this.source,1)}handleChange(e){return e.changes.touchesRange(Ct(e.startState))?new Me(this.source,0):this.map(e.changes)}map(e){return e.empty||this.explicitPos<0?this:new Me(this.source,this.state,e.mapPos(this.explicitPos))}}class ri extends Me{constructor(e,t,i,s,r){super(e,2,t),this.result=i,this.from=s,this.to=r}hasResult(){return!0}handleUserEvent(e,t,i){var s;let r=e.changes.mapPos(this.from),o=e.changes.mapPos(this.to,1),l=Ct(e.state);if((this.explicitPos<0?l<=r:l<this.from)||l>o||t=="delete"&&Ct(e.startState)==this.from)return new Me(this.source,t=="input"&&i.activateOnTyping?1:0);let a=this.explicitPos<0?-1:e.changes.mapPos(this.explicitPos),h;return f1(this.result.validFor,e.state,r,o)?new ri(this.source,a,this.result,r,o):this.result.update&&(h=this.result.update(this.result,r,o,new Sf(e.state,l,a>=0)))?new ri(this.source,a,h,h.from,(s=h.to)!==null&&s!==void 0?s:Ct(e.state)):new Me(this.source,1,a)}handleChange(e){return e.changes.touchesRange(this.from,this.to)?new Me(this.source,0):this.map(e.changes)}map(e){return e.empty?this:new ri(this.source,this.explicitPos<0?-1:e.mapPos(this.explicitPos),this.result,e.mapPos(this.from),e.mapPos(this.to,1))}}function f1(n,e,t,i){if(!n)return!1;let s=e.sliceDoc(t,i);return typeof n=="function"?n(s,t,i,e):Cf(n,!0).test(s)}const Af=I.define({map(n,e){return n.map(t=>t.map(e))}}),Mf=I.define(),Be=ae.define({create(){return cs.start()},update(n,e){return n.update(e)},provide:n=>[xs.from(n,e=>e.tooltip),P.contentAttributes.from(n,e=>e.attrs)]});function Of(n,e){const t=e.completion.apply||e.completion.label;let i=n.state.field(Be).active.find(s=>s.source==e.source);return i instanceof ri?(typeof t=="string"?n.dispatch(Object.assign(Object.assign({},Z0(n.state,t,i.from,i.to)),{annotations:X0.of(e.completion)})):t(n,e.completion,i.from,i.to),!0):!1}const u1=r1(Be,Of);function Sn(n,e="option"){return t=>{let i=t.state.field(Be,!1);if(!i||!i.open||i.open.disabled||Date.now()-i.open.timestamp<t.state.facet(be).interactionDelay)return!1;let s=1,r;e=="page"&&(r=ac(t,i.open.tooltip))&&(s=Math.max(2,Math.floor(r.dom.offsetHeight/r.dom.querySelector("li").offsetHeight)-1));let{length:o}=i.open.options,l=i.open.selected>-1?i.open.selected+s*(n?1:-1):n?0:o-1;return l<0?l=e=="page"?0:o-1:l>=o&&(l=e=="page"?o-1:0),t.dispatch({effects:Mf.of(l)}),!0}}const d1=n=>{let e=n.state.field(Be,!1);return n.state.readOnly||!e||!e.open||e.open.selected<0||e.open.disabled||Date.now()-e.open.timestamp<n.state.facet(be).interactionDelay?!1:Of(n,e.open.options[e.open.selected])},p1=n=>n.state.field(Be,!1)?(n.dispatch({effects:Ro.of(!0)}),!0):!1,m1=n=>{let e=n.state.field(Be,!1);return!e||!e.active.some(t=>t.state!=0)?!1:(n.dispatch({effects:Gi.of(null)}),!0)};class g1{constructor(e,t){this.active=e,this.context=t,this.time=Date.now(),this.updates=[],this.done=void 0}}const y1=50,b1=1e3,w1=Z.fromClass(class{constructor(n){this.view=n,this.debounceUpdate=-1,this.running=[],this.debounceAccept=-1,this.composing=0;for(let e of n.state.field(Be).active)e.state==1&&this.startQuery(e)}update(n){let e=n.state.field(Be);if(!n.selectionSet&&!n.docChanged&&n.startState.field(Be)==e)return;let t=n.transactions.some(i=>(i.selection||i.docChanged)&&!Zr(i));for(let i=0;i<this.running.length;i++){let s=this.running[i];if(t||s.updates.length+n.transactions.length>y1&&Date.now()-s.time>b1){for(let r of s.context.abortListeners)try{r()}catch(o){Ie(this.view.state,o)}s.context.abortListeners=null,this.running.splice(i--,1)}else s.updates.push(...n.transactions)}if(this.debounceUpdate>-1&&clearTimeout(this.debounceUpdate),this.debounceUpdate=e.active.some(i=>i.state==1&&!this.running.some(s=>s.active.source==i.source))?setTimeout(()=>this.startUpdate(),50):-1,this.composing!=0)for(let i of n.transactions)Zr(i)=="input"?this.composing=2:this.composing==2&&i.selection&&(this.composing=3)}startUpdate(){this.debounceUpdate=-1;let{state:n}=this.view,e=n.field(Be);for(let t of e.active)t.state==1&&!this.running.some(i=>i.active.source==t.source)&&this.startQuery(t)}startQuery(n){let{state:e}=this.view,t=Ct(e),i=new Sf(e,t,n.explicitPos==t),s=new g1(n,i);this.running.push(s),Promise.resolve(n.source(i)).then(r=>{s.context.aborted||(s.done=r||null,this.scheduleAccept())},r=>{this.view.dispatch({effects:Gi.of(null)}),Ie(this.view.state,r)})}scheduleAccept(){this.running.every(n=>n.done!==void 0)?this.accept():this.debounceAccept<0&&(this.debounceAccept=setTimeout(()=>this.accept(),this.view.state.facet(be).updateSyncTime))}accept(){var n;this.debounceAccept>-1&&clearTimeout(this.debounceAccept),this.debounceAccept=-1;let e=[],t=this.view.state.facet(be);for(let i=0;i<this.running.length;i++){let s=this.running[i];if(s.done===void 0)continue;if(this.running.splice(i--,1),s.done){let o=new ri(s.active.source,s.active.explicitPos,s.done,s.done.from,(n=s.done.to)!==null&&n!==void 0?n:Ct(s.updates.length?s.updates[0].startState:this.view.state));for(let l of s.updates)o=o.update(l,t);if(o.hasResult()){e.push(o);continue}}let r=this.view.state.field(Be).active.find(o=>o.source==s.active.source);if(r&&r.state==1)if(s.done==null){let o=new Me(s.active.source,0);for(let l of s.updates)o=o.update(l,t);o.state!=1&&e.push(o)}else this.startQuery(r)}e.length&&this.view.dispatch({effects:Af.of(e)})}},{eventHandlers:{blur(n){let e=this.view.state.field(Be,!1);if(e&&e.tooltip&&this.view.state.facet(be).closeOnBlur){let t=e.open&&ac(this.view,e.open.tooltip);(!t||!t.dom.contains(n.relatedTarget))&&this.view.dispatch({effects:Gi.of(null)})}},compositionstart(){this.composing=1},compositionend(){this.composing==3&&setTimeout(()=>this.view.dispatch({effects:Ro.of(!1)}),20),this.composing=0}}}),v1=P.baseTheme({".cm-tooltip.cm-tooltip-autocomplete":{"& > ul":{fontFamily:"monospace",whiteSpace:"nowrap",overflow:"hidden auto",maxWidth_fallback:"700px",maxWidth:"min(700px, 95vw)",minWidth:"250px",maxHeight:"10em",height:"100%",listStyle:"none",margin:0,padding:0,"& > li, & > completion-section":{padding:"1px 3px",lineHeight:1.2},"& > li":{overflowX:"hidden",textOverflow:"ellipsis",cursor:"pointer"},"& > completion-section":{display:"list-item",borderBottom:"1px solid silver",paddingLeft:"0.5em",opacity:.7}}},"&light .cm-tooltip-autocomplete ul li[aria-selected]":{background:"#17c",color:"white"},"&light .cm-tooltip-autocomplete-disabled ul li[aria-selected]":{background:"#777"},"&dark .cm-tooltip-autocomplete ul li[aria-selected]":{background:"#347",color:"white"},"&dark .cm-tooltip-autocomplete-disabled ul li[aria-selected]":{background:"#444"},".cm-completionListIncompleteTop:before, .cm-completionListIncompleteBottom:after":{content:'"···"',opacity:.5,display:"block",textAlign:"center"},".cm-tooltip.cm-completionInfo":{position:"absolute",padding:"3px 9px",width:"max-content",maxWidth:"400px",boxSizing:"border-box"},".cm-completionInfo.cm-completionInfo-left":{right:"100%"},".cm-completionInfo.cm-completionInfo-right":{left:"100%"},".cm-completionInfo.cm-completionInfo-left-narrow":{right:"30px"},".cm-completionInfo.cm-completionInfo-right-narrow":{left:"30px"},"&light .cm-snippetField":{backgroundColor:"#00000022"},"&dark .cm-snippetField":{backgroundColor:"#ffffff22"},".cm-snippetFieldPosition":{verticalAlign:"text-top",width:0,height:"1.15em",display:"inline-block",margin:"0 -0.7px -.7em",borderLeft:"1.4px dotted #888"},".cm-completionMatchedText":{textDecoration:"underline"},".cm-completionDetail":{marginLeft:"0.5em",fontStyle:"italic"},".cm-completionIcon":{fontSize:"90%",width:".8em",display:"inline-block",textAlign:"center",paddingRight:".6em",opacity:"0.6",boxSizing:"content-box"},".cm-completionIcon-function, .cm-completionIcon-method":{"&:after":{content:"'ƒ'"}},".cm-completionIcon-class":{"&:after":{content:"'○'"}},".cm-completionIcon-interface":{"&:after":{content:"'◌'"}},".cm-completionIcon-variable":{"&:after":{content:"'𝑥'"}},".cm-completionIcon-constant":{"&:after":{content:"'𝐶'"}},".cm-completionIcon-type":{"&:after":{content:"'𝑡'"}},".cm-completionIcon-enum":{"&:after":{content:"'∪'"}},".cm-completionIcon-property":{"&:after":{content:"'□'"}},".cm-completionIcon-keyword":{"&:after":{content:"'🔑︎'"}},".cm-completionIcon-namespace":{"&:after":{content:"'▢'"}},".cm-completionIcon-text":{"&:after":{content:"'abc'",fontSize:"50%",verticalAlign:"middle"}}}),Yi={brackets:["(","[","{","'",'"'],before:")]}:;>",stringPrefixes:[]},Nt=I.define({map(n,e){let t=e.mapPos(n,-1,ke.TrackAfter);return t??void 0}}),Bo=new class extends Wt{};Bo.startSide=1;Bo.endSide=-1;const Df=ae.define({create(){return V.empty},update(n,e){if(e.selection){let t=e.state.doc.lineAt(e.selection.main.head).from,i=e.startState.doc.lineAt(e.startState.selection.main.head).from;t!=e.changes.mapPos(i,-1)&&(n=V.empty)}n=n.map(e.changes);for(let t of e.effects)t.is(Nt)&&(n=n.update({add:[Bo.range(t.value,t.value+1)]}));return n}});function x1(){return[S1,Df]}const ir="()[]{}<>";function Tf(n){for(let e=0;e<ir.length;e+=2)if(ir.charCodeAt(e)==n)return ir.charAt(e+1);return no(n<128?n:n+1)}function Pf(n,e){return n.languageDataAt("closeBrackets",e)[0]||Yi}const k1=typeof navigator=="object"&&/Android\b/.test(navigator.userAgent),S1=P.inputHandler.of((n,e,t,i)=>{if((k1?n.composing:n.compositionStarted)||n.state.readOnly)return!1;let s=n.state.selection.main;if(i.length>2||i.length==2&&Ne(fe(i,0))==1||e!=s.from||t!=s.to)return!1;let r=M1(n.state,i);return r?(n.dispatch(r),!0):!1}),C1=({state:n,dispatch:e})=>{if(n.readOnly)return!1;let i=Pf(n,n.selection.main.head).brackets||Yi.brackets,s=null,r=n.changeByRange(o=>{if(o.empty){let l=O1(n.doc,o.head);for(let a of i)if(a==l&&Ts(n.doc,o.head)==Tf(fe(a,0)))return{changes:{from:o.head-a.length,to:o.head+a.length},range:v.cursor(o.head-a.length)}}return{range:s=o}});return s||e(n.update(r,{scrollIntoView:!0,userEvent:"delete.backward"})),!s},A1=[{key:"Backspace",run:C1}];function M1(n,e){let t=Pf(n,n.selection.main.head),i=t.brackets||Yi.brackets;for(let s of i){let r=Tf(fe(s,0));if(e==s)return r==s?P1(n,s,i.indexOf(s+s+s)>-1,t):D1(n,s,r,t.before||Yi.before);if(e==r&&Rf(n,n.selection.main.from))return T1(n,s,r)}return null}function Rf(n,e){let t=!1;return n.field(Df).between(0,n.doc.length,i=>{i==e&&(t=!0)}),t}function Ts(n,e){let t=n.sliceString(e,e+2);return t.slice(0,Ne(fe(t,0)))}function O1(n,e){let t=n.sliceString(e-2,e);return Ne(fe(t,0))==t.length?t:t.slice(1)}function D1(n,e,t,i){let s=null,r=n.changeByRange(o=>{if(!o.empty)return{changes:[{insert:e,from:o.from},{insert:t,from:o.to}],effects:Nt.of(o.to+e.length),range:v.range(o.anchor+e.length,o.head+e.length)};let l=Ts(n.doc,o.head);return!l||/\s/.test(l)||i.indexOf(l)>-1?{changes:{insert:e+t,from:o.head},effects:Nt.of(o.head+e.length),range:v.cursor(o.head+e.length)}:{range:s=o}});return s?null:n.update(r,{scrollIntoView:!0,userEvent:"input.type"})}function T1(n,e,t){let i=null,s=n.changeByRange(r=>r.empty&&Ts(n.doc,r.head)==t?{changes:{from:r.head,to:r.head+t.length,insert:t},range:v.cursor(r.head+t.length)}:i={range:r});return i?null:n.update(s,{scrollIntoView:!0,userEvent:"input.type"})}function P1(n,e,t,i){let s=i.stringPrefixes||Yi.stringPrefixes,r=null,o=n.changeByRange(l=>{if(!l.empty)return{changes:[{insert:e,from:l.from},{insert:e,from:l.to}],effects:Nt.of(l.to+e.length),range:v.range(l.anchor+e.length,l.head+e.length)};let a=l.head,h=Ts(n.doc,a),c;if(h==e){if(ga(n,a))return{changes:{insert:e+e,from:a},effects:Nt.of(a+e.length),range:v.cursor(a+e.length)};if(Rf(n,a)){let u=t&&n.sliceDoc(a,a+e.length*3)==e+e+e?e+e+e:e;return{changes:{from:a,to:a+u.length,insert:u},range:v.cursor(a+u.length)}}}else{if(t&&n.sliceDoc(a-2*e.length,a)==e+e&&(c=ya(n,a-2*e.length,s))>-1&&ga(n,c))return{changes:{insert:e+e+e+e,from:a},effects:Nt.of(a+e.length),range:v.cursor(a+e.length)};if(n.charCategorizer(a)(h)!=Y.Word&&ya(n,a,s)>-1&&!R1(n,a,e,s))return{changes:{insert:e+e,from:a},effects:Nt.of(a+e.length),range:v.cursor(a+e.length)}}return{range:r=l}});return r?null:n.update(o,{scrollIntoView:!0,userEvent:"input.type"})}function ga(n,e){let t=ve(n).resolveInner(e+1);return t.parent&&t.from==e}function R1(n,e,t,i){let s=ve(n).resolveInner(e,-1),r=i.reduce((o,l)=>Math.max(o,l.length),0);for(let o=0;o<5;o++){let l=n.sliceDoc(s.from,Math.min(s.to,s.from+t.length+r)),a=l.indexOf(t);if(!a||a>-1&&i.indexOf(l.slice(0,a))>-1){let c=s.firstChild;for(;c&&c.from==s.from&&c.to-c.from>t.length+a;){if(n.sliceDoc(c.to-t.length,c.to)==t)return!1;c=c.firstChild}return!0}let h=s.to==e&&s.parent;if(!h)break;s=h}return!1}function ya(n,e,t){let i=n.charCategorizer(e);if(i(n.sliceDoc(e-1,e))!=Y.Word)return e;for(let s of t){let r=e-s.length;if(n.sliceDoc(r,e)==s&&i(n.sliceDoc(r-1,r))!=Y.Word)return r}return-1}function B1(n={}){return[Be,be.of(n),w1,L1,v1]}const Bf=[{key:"Ctrl-Space",run:p1},{key:"Escape",run:m1},{key:"ArrowDown",run:Sn(!0)},{key:"ArrowUp",run:Sn(!1)},{key:"PageDown",run:Sn(!0,"page")},{key:"PageUp",run:Sn(!1,"page")},{key:"Enter",run:d1}],L1=di.highest(po.computeN([be],n=>n.facet(be).defaultKeymap?[Bf]:[]));class E1{constructor(e,t,i){this.from=e,this.to=t,this.diagnostic=i}}class Et{constructor(e,t,i){this.diagnostics=e,this.panel=t,this.selected=i}static init(e,t,i){let s=e,r=i.facet(Ft).markerFilter;r&&(s=r(s));let o=E.set(s.map(l=>l.from==l.to||l.from==l.to-1&&i.doc.lineAt(l.from).to==l.from?E.widget({widget:new z1(l),diagnostic:l}).range(l.from):E.mark({attributes:{class:"cm-lintRange cm-lintRange-"+l.severity+(l.markClass?" "+l.markClass:"")},diagnostic:l}).range(l.from,l.to)),!0);return new Et(o,t,ui(o))}}function ui(n,e=null,t=0){let i=null;return n.between(t,1e9,(s,r,{spec:o})=>{if(!(e&&o.diagnostic!=e))return i=new E1(s,r,o.diagnostic),!1}),i}function Lf(n,e){let t=n.startState.doc.lineAt(e.pos);return!!(n.effects.some(i=>i.is(Ps))||n.changes.touchesRange(t.from,t.to))}function Ef(n,e){return n.field(Ee,!1)?e:e.concat(I.appendConfig.of(Wf))}function I1(n,e){return{effects:Ef(n,[Ps.of(e)])}}const Ps=I.define(),Lo=I.define(),If=I.define(),Ee=ae.define({create(){return new Et(E.none,null,null)},update(n,e){if(e.docChanged){let t=n.diagnostics.map(e.changes),i=null;if(n.selected){let s=e.changes.mapPos(n.selected.from,1);i=ui(t,n.selected.diagnostic,s)||ui(t,null,s)}n=new Et(t,n.panel,i)}for(let t of e.effects)t.is(Ps)?n=Et.init(t.value,n.panel,e.state):t.is(Lo)?n=new Et(n.diagnostics,t.value?Rs.open:null,n.selected):t.is(If)&&(n=new Et(n.diagnostics,n.panel,t.value));return n},provide:n=>[ji.from(n,e=>e.panel),P.decorations.from(n,e=>e.diagnostics)]}),N1=E.mark({class:"cm-lintRange cm-lintRange-active"});function F1(n,e,t){let{diagnostics:i}=n.state.field(Ee),s=[],r=2e8,o=0;i.between(e-(t<0?1:0),e+(t>0?1:0),(a,h,{spec:c})=>{e>=a&&e<=h&&(a==h||(e>a||t>0)&&(e<h||t<0))&&(s.push(c.diagnostic),r=Math.min(a,r),o=Math.max(h,o))});let l=n.state.facet(Ft).tooltipFilter;return l&&(s=l(s)),s.length?{pos:r,end:o,above:n.state.doc.lineAt(r).to<o,create(){return{dom:Nf(n,s)}}}:null}function Nf(n,e){return q("ul",{class:"cm-tooltip-lint"},e.map(t=>Hf(n,t,!1)))}const H1=n=>{let e=n.state.field(Ee,!1);(!e||!e.panel)&&n.dispatch({effects:Ef(n.state,[Lo.of(!0)])});let t=zi(n,Rs.open);return t&&t.dom.querySelector(".cm-panel-lint ul").focus(),!0},ba=n=>{let e=n.state.field(Ee,!1);return!e||!e.panel?!1:(n.dispatch({effects:Lo.of(!1)}),!0)},_1=n=>{let e=n.state.field(Ee,!1);if(!e)return!1;let t=n.state.selection.main,i=e.diagnostics.iter(t.to+1);return!i.value&&(i=e.diagnostics.iter(0),!i.value||i.from==t.from&&i.to==t.to)?!1:(n.dispatch({selection:{anchor:i.from,head:i.to},scrollIntoView:!0}),!0)},V1=[{key:"Mod-Shift-m",run:H1,preventDefault:!0},{key:"F8",run:_1}],W1=Z.fromClass(class{constructor(n){this.view=n,this.timeout=-1,this.set=!0;let{delay:e}=n.state.facet(Ft);this.lintTime=Date.now()+e,this.run=this.run.bind(this),this.timeout=setTimeout(this.run,e)}run(){let n=Date.now();if(n<this.lintTime-10)this.timeout=setTimeout(this.run,this.lintTime-n);else{this.set=!1;let{state:e}=this.view,{sources:t}=e.facet(Ft);Promise.all(t.map(i=>Promise.resolve(i(this.view)))).then(i=>{let s=i.reduce((r,o)=>r.concat(o));this.view.state.doc==e.doc&&this.view.dispatch(I1(this.view.state,s))},i=>{Ie(this.view.state,i)})}}update(n){let e=n.state.facet(Ft);(n.docChanged||e!=n.startState.facet(Ft)||e.needsRefresh&&e.needsRefresh(n))&&(this.lintTime=Date.now()+e.delay,this.set||(this.set=!0,this.timeout=setTimeout(this.run,e.delay)))}force(){this.set&&(this.lintTime=Date.now(),this.run())}destroy(){clearTimeout(this.timeout)}}),Ft=R.define({combine(n){return Object.assign({sources:n.map(e=>e.source)},Ve(n.map(e=>e.config),{delay:750,markerFilter:null,tooltipFilter:null,needsRefresh:null},{needsRefresh:(e,t)=>e?t?i=>e(i)||t(i):e:t}))}});function $1(n,e={}){return[Ft.of({source:n,config:e}),W1,Wf]}function Ff(n){let e=[];if(n)e:for(let{name:t}of n){for(let i=0;i<t.length;i++){let s=t[i];if(/[a-zA-Z]/.test(s)&&!e.some(r=>r.toLowerCase()==s.toLowerCase())){e.push(s);continue e}}e.push("")}return e}function Hf(n,e,t){var i;let s=t?Ff(e.actions):[];return q("li",{class:"cm-diagnostic cm-diagnostic-"+e.severity},q("span",{class:"cm-diagnosticText"},e.renderMessage?e.renderMessage():e.message),(i=e.actions)===null||i===void 0?void 0:i.map((r,o)=>{let l=!1,a=u=>{if(u.preventDefault(),l)return;l=!0;let d=ui(n.state.field(Ee).diagnostics,e);d&&r.apply(n,d.from,d.to)},{name:h}=r,c=s[o]?h.indexOf(s[o]):-1,f=c<0?h:[h.slice(0,c),q("u",h.slice(c,c+1)),h.slice(c+1)];return q("button",{type:"button",class:"cm-diagnosticAction",onclick:a,onmousedown:a,"aria-label":` Action: ${h}${c<0?"":` (access key "${s[o]})"`}.`},f)}),e.source&&q("div",{class:"cm-diagnosticSource"},e.source))}class z1 extends Tt{constructor(e){super(),this.diagnostic=e}eq(e){return e.diagnostic==this.diagnostic}toDOM(){return q("span",{class:"cm-lintPoint cm-lintPoint-"+this.diagnostic.severity})}}class wa{constructor(e,t){this.diagnostic=t,this.id="item_"+Math.floor(Math.random()*4294967295).toString(16),this.dom=Hf(e,t,!0),this.dom.id=this.id,this.dom.setAttribute("role","option")}}class Rs{constructor(e){this.view=e,this.items=[];let t=s=>{if(s.keyCode==27)ba(this.view),this.view.focus();else if(s.keyCode==38||s.keyCode==33)this.moveSelection((this.selectedIndex-1+this.items.length)%this.items.length);else if(s.keyCode==40||s.keyCode==34)this.moveSelection((this.selectedIndex+1)%this.items.length);else if(s.keyCode==36)this.moveSelection(0);else if(s.keyCode==35)this.moveSelection(this.items.length-1);else if(s.keyCode==13)this.view.focus();else if(s.keyCode>=65&&s.keyCode<=90&&this.selectedIndex>=0){let{diagnostic:r}=this.items[this.selectedIndex],o=Ff(r.actions);for(let l=0;l<o.length;l++)if(o[l].toUpperCase().charCodeAt(0)==s.keyCode){let a=ui(this.view.state.field(Ee).diagnostics,r);a&&r.actions[l].apply(e,a.from,a.to)}}else return;s.preventDefault()},i=s=>{for(let r=0;r<this.items.length;r++)this.items[r].dom.contains(s.target)&&this.moveSelection(r)};this.list=q("ul",{tabIndex:0,role:"listbox","aria-label":this.view.state.phrase("Diagnostics"),onkeydown:t,onclick:i}),this.dom=q("div",{class:"cm-panel-lint"},this.list,q("button",{type:"button",name:"close","aria-label":this.view.state.phrase("close"),onclick:()=>ba(this.view)},"×")),this.update()}get selectedIndex(){let e=this.view.state.field(Ee).selected;if(!e)return-1;for(let t=0;t<this.items.length;t++)if(this.items[t].diagnostic==e.diagnostic)return t;return-1}update(){let{diagnostics:e,selected:t}=this.view.state.field(Ee),i=0,s=!1,r=null;for(e.between(0,this.view.state.doc.length,(o,l,{spec:a})=>{let h=-1,c;for(let f=i;f<this.items.length;f++)if(this.items[f].diagnostic==a.diagnostic){h=f;break}h<0?(c=new wa(this.view,a.diagnostic),this.items.splice(i,0,c),s=!0):(c=this.items[h],h>i&&(this.items.splice(i,h-i),s=!0)),t&&c.diagnostic==t.diagnostic?c.dom.hasAttribute("aria-selected")||(c.dom.setAttribute("aria-selected","true"),r=c):c.dom.hasAttribute("aria-selected")&&c.dom.removeAttribute("aria-selected"),i++});i<this.items.length&&!(this.items.length==1&&this.items[0].diagnostic.from<0);)s=!0,this.items.pop();this.items.length==0&&(this.items.push(new wa(this.view,{from:-1,to:-1,severity:"info",message:this.view.state.phrase("No diagnostics")})),s=!0),r?(this.list.setAttribute("aria-activedescendant",r.id),this.view.requestMeasure({key:this,read:()=>({sel:r.dom.getBoundingClientRect(),panel:this.list.getBoundingClientRect()}),write:({sel:o,panel:l})=>{let a=l.height/this.list.offsetHeight;o.top<l.top?this.list.scrollTop-=(l.top-o.top)/a:o.bottom>l.bottom&&(this.list.scrollTop+=(o.bottom-l.bottom)/a)}})):this.selectedIndex<0&&this.list.removeAttribute("aria-activedescendant"),s&&this.sync()}sync(){let e=this.list.firstChild;function t(){let i=e;e=i.nextSibling,i.remove()}for(let i of this.items)if(i.dom.parentNode==this.list){for(;e!=i.dom;)t();e=i.dom.nextSibling}else this.list.insertBefore(i.dom,e);for(;e;)t()}moveSelection(e){if(this.selectedIndex<0)return;let t=this.view.state.field(Ee),i=ui(t.diagnostics,this.items[e].diagnostic);i&&this.view.dispatch({selection:{anchor:i.from,head:i.to},scrollIntoView:!0,effects:If.of(i)})}static open(e){return new Rs(e)}}function Nn(n,e='viewBox="0 0 40 40"'){return`url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" ${e}>${encodeURIComponent(n)}</svg>')`}function Cn(n){return Nn(`<path d="m0 2.5 l2 -1.5 l1 0 l2 1.5 l1 0" stroke="${n}" fill="none" stroke-width=".7"/>`,'width="6" height="3"')}const j1=P.baseTheme({".cm-diagnostic":{padding:"3px 6px 3px 8px",marginLeft:"-1px",display:"block",whiteSpace:"pre-wrap"},".cm-diagnostic-error":{borderLeft:"5px solid #d11"},".cm-diagnostic-warning":{borderLeft:"5px solid orange"},".cm-diagnostic-info":{borderLeft:"5px solid #999"},".cm-diagnostic-hint":{borderLeft:"5px solid #66d"},".cm-diagnosticAction":{font:"inherit",border:"none",padding:"2px 4px",backgroundColor:"#444",color:"white",borderRadius:"3px",marginLeft:"8px",cursor:"pointer"},".cm-diagnosticSource":{fontSize:"70%",opacity:.7},".cm-lintRange":{backgroundPosition:"left bottom",backgroundRepeat:"repeat-x",paddingBottom:"0.7px"},".cm-lintRange-error":{backgroundImage:Cn("#d11")},".cm-lintRange-warning":{backgroundImage:Cn("orange")},".cm-lintRange-info":{backgroundImage:Cn("#999")},".cm-lintRange-hint":{backgroundImage:Cn("#66d")},".cm-lintRange-active":{backgroundColor:"#ffdd9980"},".cm-tooltip-lint":{padding:0,margin:0},".cm-lintPoint":{position:"relative","&:after":{content:'""',position:"absolute",bottom:0,left:"-2px",borderLeft:"3px solid transparent",borderRight:"3px solid transparent",borderBottom:"4px solid #d11"}},".cm-lintPoint-warning":{"&:after":{borderBottomColor:"orange"}},".cm-lintPoint-info":{"&:after":{borderBottomColor:"#999"}},".cm-lintPoint-hint":{"&:after":{borderBottomColor:"#66d"}},".cm-panel.cm-panel-lint":{position:"relative","& ul":{maxHeight:"100px",overflowY:"auto","& [aria-selected]":{backgroundColor:"#ddd","& u":{textDecoration:"underline"}},"&:focus [aria-selected]":{background_fallback:"#bdf",backgroundColor:"Highlight",color_fallback:"white",color:"HighlightText"},"& u":{textDecoration:"none"},padding:0,margin:0},"& [name=close]":{position:"absolute",top:"0",right:"2px",background:"inherit",border:"none",font:"inherit",padding:0,margin:0}}});function va(n){return n=="error"?4:n=="warning"?3:n=="info"?2:1}class q1 extends st{constructor(e){super(),this.diagnostics=e,this.severity=e.reduce((t,i)=>va(t)<va(i.severity)?i.severity:t,"hint")}toDOM(e){let t=document.createElement("div");t.className="cm-lint-marker cm-lint-marker-"+this.severity;let i=this.diagnostics,s=e.state.facet(Bs).tooltipFilter;return s&&(i=s(i)),i.length&&(t.onmouseover=()=>U1(e,t,i)),t}}function K1(n,e){let t=i=>{let s=e.getBoundingClientRect();if(!(i.clientX>s.left-10&&i.clientX<s.right+10&&i.clientY>s.top-10&&i.clientY<s.bottom+10)){for(let r=i.target;r;r=r.parentNode)if(r.nodeType==1&&r.classList.contains("cm-tooltip-lint"))return;window.removeEventListener("mousemove",t),n.state.field(Vf)&&n.dispatch({effects:Eo.of(null)})}};window.addEventListener("mousemove",t)}function U1(n,e,t){function i(){let o=n.elementAtHeight(e.getBoundingClientRect().top+5-n.documentTop);n.coordsAtPos(o.from)&&n.dispatch({effects:Eo.of({pos:o.from,above:!1,create(){return{dom:Nf(n,t),getCoords:()=>e.getBoundingClientRect()}}})}),e.onmouseout=e.onmousemove=null,K1(n,e)}let{hoverTime:s}=n.state.facet(Bs),r=setTimeout(i,s);e.onmouseout=()=>{clearTimeout(r),e.onmouseout=e.onmousemove=null},e.onmousemove=()=>{clearTimeout(r),r=setTimeout(i,s)}}function G1(n,e){let t=Object.create(null);for(let s of e){let r=n.lineAt(s.from);(t[r.from]||(t[r.from]=[])).push(s)}let i=[];for(let s in t)i.push(new q1(t[s]).range(+s));return V.of(i,!0)}const Y1=cc({class:"cm-gutter-lint",markers:n=>n.state.field(_f)}),_f=ae.define({create(){return V.empty},update(n,e){n=n.map(e.changes);let t=e.state.facet(Bs).markerFilter;for(let i of e.effects)if(i.is(Ps)){let s=i.value;t&&(s=t(s||[])),n=G1(e.state.doc,s.slice(0))}return n}}),Eo=I.define(),Vf=ae.define({create(){return null},update(n,e){return n&&e.docChanged&&(n=Lf(e,n)?null:Object.assign(Object.assign({},n),{pos:e.changes.mapPos(n.pos)})),e.effects.reduce((t,i)=>i.is(Eo)?i.value:t,n)},provide:n=>xs.from(n)}),Q1=P.baseTheme({".cm-gutter-lint":{width:"1.4em","& .cm-gutterElement":{padding:".2em"}},".cm-lint-marker":{width:"1em",height:"1em"},".cm-lint-marker-info":{content:Nn('<path fill="#aaf" stroke="#77e" stroke-width="6" stroke-linejoin="round" d="M5 5L35 5L35 35L5 35Z"/>')},".cm-lint-marker-warning":{content:Nn('<path fill="#fe8" stroke="#fd7" stroke-width="6" stroke-linejoin="round" d="M20 6L37 35L3 35Z"/>')},".cm-lint-marker-error":{content:Nn('<circle cx="20" cy="20" r="15" fill="#f87" stroke="#f43" stroke-width="6"/>')}}),Wf=[Ee,P.decorations.compute([Ee],n=>{let{selected:e,panel:t}=n.field(Ee);return!e||!t||e.from==e.to?E.none:E.set([N1.range(e.from,e.to)])}),jp(F1,{hideOn:Lf}),j1],Bs=R.define({combine(n){return Ve(n,{hoverTime:300,markerFilter:null,tooltipFilter:null})}});function J1(n={}){return[Bs.of(n),_f,Y1,Q1,Vf]}const X1=(()=>[Xp(),tm(),kp(),vg(),qm(),fp(),gp(),_.allowMultipleSelections.of(!0),Rm(),Um(Qm,{fallback:!0}),ng(),x1(),B1(),Ep(),Fp(),Dp(),O0(),po.of([...A1,...k0,...K0,...Tg,...Wm,...Bf,...V1])])();class fs{constructor(e,t,i,s,r,o,l,a,h,c=0,f){this.p=e,this.stack=t,this.state=i,this.reducePos=s,this.pos=r,this.score=o,this.buffer=l,this.bufferBase=a,this.curContext=h,this.lookAhead=c,this.parent=f}toString(){return`[${this.stack.filter((e,t)=>t%3==0).concat(this.state)}]@${this.pos}${this.score?"!"+this.score:""}`}static start(e,t,i=0){let s=e.parser.context;return new fs(e,[],t,i,i,0,[],0,s?new xa(s,s.start):null,0,null)}get context(){return this.curContext?this.curContext.context:null}pushState(e,t){this.stack.push(this.state,t,this.bufferBase+this.buffer.length),this.state=e}reduce(e){var t;let i=e>>19,s=e&65535,{parser:r}=this.p,o=r.dynamicPrecedence(s);if(o&&(this.score+=o),i==0){this.pushState(r.getGoto(this.state,s,!0),this.reducePos),s<r.minRepeatTerm&&this.storeNode(s,this.reducePos,this.reducePos,4,!0),this.reduceContext(s,this.reducePos);return}let l=this.stack.length-(i-1)*3-(e&262144?6:0),a=l?this.stack[l-2]:this.p.ranges[0].from,h=this.reducePos-a;h>=2e3&&!(!((t=this.p.parser.nodeSet.types[s])===null||t===void 0)&&t.isAnonymous)&&(a==this.p.lastBigReductionStart?(this.p.bigReductionCount++,this.p.lastBigReductionSize=h):this.p.lastBigReductionSize<h&&(this.p.bigReductionCount=1,this.p.lastBigReductionStart=a,this.p.lastBigReductionSize=h));let c=l?this.stack[l-1]:0,f=this.bufferBase+this.buffer.length-c;if(s<r.minRepeatTerm||e&131072){let u=r.stateFlag(this.state,1)?this.pos:this.reducePos;this.storeNode(s,a,u,f+4,!0)}if(e&262144)this.state=this.stack[l];else{let u=this.stack[l-3];this.state=r.getGoto(u,s,!0)}for(;this.stack.length>l;)this.stack.pop();this.reduceContext(s,a)}storeNode(e,t,i,s=4,r=!1){if(e==0&&(!this.stack.length||this.stack[this.stack.length-1]<this.buffer.length+this.bufferBase)){let o=this,l=this.buffer.length;if(l==0&&o.parent&&(l=o.bufferBase-o.parent.bufferBase,o=o.parent),l>0&&o.buffer[l-4]==0&&o.buffer[l-1]>-1){if(t==i)return;if(o.buffer[l-2]>=t){o.buffer[l-2]=i;return}}}if(!r||this.pos==i)this.buffer.push(e,t,i,s);else{let o=this.buffer.length;if(o>0&&this.buffer[o-4]!=0)for(;o>0&&this.buffer[o-2]>i;)this.buffer[o]=this.buffer[o-4],this.buffer[o+1]=this.buffer[o-3],this.buffer[o+2]=this.buffer[o-2],this.buffer[o+3]=this.buffer[o-1],o-=4,s>4&&(s-=4);this.buffer[o]=e,this.buffer[o+1]=t,this.buffer[o+2]=i,this.buffer[o+3]=s}}shift(e,t,i,s){if(e&131072)this.pushState(e&65535,this.pos);else if(e&262144)this.pos=s,this.shiftContext(t,i),t<=this.p.parser.maxNode&&this.buffer.push(t,i,s,4);else{let r=e,{parser:o}=this.p;(s>this.pos||t<=o.maxNode)&&(this.pos=s,o.stateFlag(r,1)||(this.reducePos=s)),this.pushState(r,i),this.shiftContext(t,i),t<=o.maxNode&&this.buffer.push(t,i,s,4)}}apply(e,t,i,s){e&65536?this.reduce(e):this.shift(e,t,i,s)}useNode(e,t){let i=this.p.reused.length-1;(i<0||this.p.reused[i]!=e)&&(this.p.reused.push(e),i++);let s=this.pos;this.reducePos=this.pos=s+e.length,this.pushState(t,s),this.buffer.push(i,s,this.reducePos,-1),this.curContext&&this.updateContext(this.curContext.tracker.reuse(this.curContext.context,e,this,this.p.stream.reset(this.pos-e.length)))}split(){let e=this,t=e.buffer.length;for(;t>0&&e.buffer[t-2]>e.reducePos;)t-=4;let i=e.buffer.slice(t),s=e.bufferBase+t;for(;e&&s==e.bufferBase;)e=e.parent;return new fs(this.p,this.stack.slice(),this.state,this.reducePos,this.pos,this.score,i,s,this.curContext,this.lookAhead,e)}recoverByDelete(e,t){let i=e<=this.p.parser.maxNode;i&&this.storeNode(e,this.pos,t,4),this.storeNode(0,this.pos,t,i?8:4),this.pos=this.reducePos=t,this.score-=190}canShift(e){for(let t=new Z1(this);;){let i=this.p.parser.stateSlot(t.state,4)||this.p.parser.hasAction(t.state,e);if(i==0)return!1;if(!(i&65536))return!0;t.reduce(i)}}recoverByInsert(e){if(this.stack.length>=300)return[];let t=this.p.parser.nextStates(this.state);if(t.length>8||this.stack.length>=120){let s=[];for(let r=0,o;r<t.length;r+=2)(o=t[r+1])!=this.state&&this.p.parser.hasAction(o,e)&&s.push(t[r],o);if(this.stack.length<120)for(let r=0;s.length<8&&r<t.length;r+=2){let o=t[r+1];s.some((l,a)=>a&1&&l==o)||s.push(t[r],o)}t=s}let i=[];for(let s=0;s<t.length&&i.length<4;s+=2){let r=t[s+1];if(r==this.state)continue;let o=this.split();o.pushState(r,this.pos),o.storeNode(0,o.pos,o.pos,4,!0),o.shiftContext(t[s],this.pos),o.reducePos=this.pos,o.score-=200,i.push(o)}return i}forceReduce(){let{parser:e}=this.p,t=e.stateSlot(this.state,5);if(!(t&65536))return!1;if(!e.validAction(this.state,t)){let i=t>>19,s=t&65535,r=this.stack.length-i*3;if(r<0||e.getGoto(this.stack[r],s,!1)<0){let o=this.findForcedReduction();if(o==null)return!1;t=o}this.storeNode(0,this.pos,this.pos,4,!0),this.score-=100}return this.reducePos=this.pos,this.reduce(t),!0}findForcedReduction(){let{parser:e}=this.p,t=[],i=(s,r)=>{if(!t.includes(s))return t.push(s),e.allActions(s,o=>{if(!(o&393216))if(o&65536){let l=(o>>19)-r;if(l>1){let a=o&65535,h=this.stack.length-l*3;if(h>=0&&e.getGoto(this.stack[h],a,!1)>=0)return l<<19|65536|a}}else{let l=i(o,r+1);if(l!=null)return l}})};return i(this.state,0)}forceAll(){for(;!this.p.parser.stateFlag(this.state,2);)if(!this.forceReduce()){this.storeNode(0,this.pos,this.pos,4,!0);break}return this}get deadEnd(){if(this.stack.length!=3)return!1;let{parser:e}=this.p;return e.data[e.stateSlot(this.state,1)]==65535&&!e.stateSlot(this.state,4)}restart(){this.storeNode(0,this.pos,this.pos,4,!0),this.state=this.stack[0],this.stack.length=0}sameState(e){if(this.state!=e.state||this.stack.length!=e.stack.length)return!1;for(let t=0;t<this.stack.length;t+=3)if(this.stack[t]!=e.stack[t])return!1;return!0}get parser(){return this.p.parser}dialectEnabled(e){return this.p.parser.dialect.flags[e]}shiftContext(e,t){this.curContext&&this.updateContext(this.curContext.tracker.shift(this.curContext.context,e,this,this.p.stream.reset(t)))}reduceContext(e,t){this.curContext&&this.updateContext(this.curContext.tracker.reduce(this.curContext.context,e,this,this.p.stream.reset(t)))}emitContext(){let e=this.buffer.length-1;(e<0||this.buffer[e]!=-3)&&this.buffer.push(this.curContext.hash,this.pos,this.pos,-3)}emitLookAhead(){let e=this.buffer.length-1;(e<0||this.buffer[e]!=-4)&&this.buffer.push(this.lookAhead,this.pos,this.pos,-4)}updateContext(e){if(e!=this.curContext.context){let t=new xa(this.curContext.tracker,e);t.hash!=this.curContext.hash&&this.emitContext(),this.curContext=t}}setLookAhead(e){e>this.lookAhead&&(this.emitLookAhead(),this.lookAhead=e)}close(){this.curContext&&this.curContext.tracker.strict&&this.emitContext(),this.lookAhead>0&&this.emitLookAhead()}}class xa{constructor(e,t){this.tracker=e,this.context=t,this.hash=e.strict?e.hash(t):0}}class Z1{constructor(e){this.start=e,this.state=e.state,this.stack=e.stack,this.base=this.stack.length}reduce(e){let t=e&65535,i=e>>19;i==0?(this.stack==this.start.stack&&(this.stack=this.stack.slice()),this.stack.push(this.state,0,0),this.base+=3):this.base-=(i-1)*3;let s=this.start.p.parser.getGoto(this.stack[this.base-3],t,!0);this.state=s}}class us{constructor(e,t,i){this.stack=e,this.pos=t,this.index=i,this.buffer=e.buffer,this.index==0&&this.maybeNext()}static create(e,t=e.bufferBase+e.buffer.length){return new us(e,t,t-e.bufferBase)}maybeNext(){let e=this.stack.parent;e!=null&&(this.index=this.stack.bufferBase-e.bufferBase,this.stack=e,this.buffer=e.buffer)}get id(){return this.buffer[this.index-4]}get start(){return this.buffer[this.index-3]}get end(){return this.buffer[this.index-2]}get size(){return this.buffer[this.index-1]}next(){this.index-=4,this.pos-=4,this.index==0&&this.maybeNext()}fork(){return new us(this.stack,this.pos,this.index)}}function An(n,e=Uint16Array){if(typeof n!="string")return n;let t=null;for(let i=0,s=0;i<n.length;){let r=0;for(;;){let o=n.charCodeAt(i++),l=!1;if(o==126){r=65535;break}o>=92&&o--,o>=34&&o--;let a=o-32;if(a>=46&&(a-=46,l=!0),r+=a,l)break;r*=46}t?t[s++]=r:t=new e(r)}return t}class Fn{constructor(){this.start=-1,this.value=-1,this.end=-1,this.extended=-1,this.lookAhead=0,this.mask=0,this.context=0}}const ka=new Fn;class ey{constructor(e,t){this.input=e,this.ranges=t,this.chunk="",this.chunkOff=0,this.chunk2="",this.chunk2Pos=0,this.next=-1,this.token=ka,this.rangeIndex=0,this.pos=this.chunkPos=t[0].from,this.range=t[0],this.end=t[t.length-1].to,this.readNext()}resolveOffset(e,t){let i=this.range,s=this.rangeIndex,r=this.pos+e;for(;r<i.from;){if(!s)return null;let o=this.ranges[--s];r-=i.from-o.to,i=o}for(;t<0?r>i.to:r>=i.to;){if(s==this.ranges.length-1)return null;let o=this.ranges[++s];r+=o.from-i.to,i=o}return r}clipPos(e){if(e>=this.range.from&&e<this.range.to)return e;for(let t of this.ranges)if(t.to>e)return Math.max(e,t.from);return this.end}peek(e){let t=this.chunkOff+e,i,s;if(t>=0&&t<this.chunk.length)i=this.pos+e,s=this.chunk.charCodeAt(t);else{let r=this.resolveOffset(e,1);if(r==null)return-1;if(i=r,i>=this.chunk2Pos&&i<this.chunk2Pos+this.chunk2.length)s=this.chunk2.charCodeAt(i-this.chunk2Pos);else{let o=this.rangeIndex,l=this.range;for(;l.to<=i;)l=this.ranges[++o];this.chunk2=this.input.chunk(this.chunk2Pos=i),i+this.chunk2.length>l.to&&(this.chunk2=this.chunk2.slice(0,l.to-i)),s=this.chunk2.charCodeAt(0)}}return i>=this.token.lookAhead&&(this.token.lookAhead=i+1),s}acceptToken(e,t=0){let i=t?this.resolveOffset(t,-1):this.pos;if(i==null||i<this.token.start)throw new RangeError("Token end out of bounds");this.token.value=e,this.token.end=i}getChunk(){if(this.pos>=this.chunk2Pos&&this.pos<this.chunk2Pos+this.chunk2.length){let{chunk:e,chunkPos:t}=this;this.chunk=this.chunk2,this.chunkPos=this.chunk2Pos,this.chunk2=e,this.chunk2Pos=t,this.chunkOff=this.pos-this.chunkPos}else{this.chunk2=this.chunk,this.chunk2Pos=this.chunkPos;let e=this.input.chunk(this.pos),t=this.pos+e.length;this.chunk=t>this.range.to?e.slice(0,this.range.to-this.pos):e,this.chunkPos=this.pos,this.chunkOff=0}}readNext(){return this.chunkOff>=this.chunk.length&&(this.getChunk(),this.chunkOff==this.chunk.length)?this.next=-1:this.next=this.chunk.charCodeAt(this.chunkOff)}advance(e=1){for(this.chunkOff+=e;this.pos+e>=this.range.to;){if(this.rangeIndex==this.ranges.length-1)return this.setDone();e-=this.range.to-this.pos,this.range=this.ranges[++this.rangeIndex],this.pos=this.range.from}return this.pos+=e,this.pos>=this.token.lookAhead&&(this.token.lookAhead=this.pos+1),this.readNext()}setDone(){return this.pos=this.chunkPos=this.end,this.range=this.ranges[this.rangeIndex=this.ranges.length-1],this.chunk="",this.next=-1}reset(e,t){if(t?(this.token=t,t.start=e,t.lookAhead=e+1,t.value=t.extended=-1):this.token=ka,this.pos!=e){if(this.pos=e,e==this.end)return this.setDone(),this;for(;e<this.range.from;)this.range=this.ranges[--this.rangeIndex];for(;e>=this.range.to;)this.range=this.ranges[++this.rangeIndex];e>=this.chunkPos&&e<this.chunkPos+this.chunk.length?this.chunkOff=e-this.chunkPos:(this.chunk="",this.chunkOff=0),this.readNext()}return this}read(e,t){if(e>=this.chunkPos&&t<=this.chunkPos+this.chunk.length)return this.chunk.slice(e-this.chunkPos,t-this.chunkPos);if(e>=this.chunk2Pos&&t<=this.chunk2Pos+this.chunk2.length)return this.chunk2.slice(e-this.chunk2Pos,t-this.chunk2Pos);if(e>=this.range.from&&t<=this.range.to)return this.input.read(e,t);let i="";for(let s of this.ranges){if(s.from>=t)break;s.to>e&&(i+=this.input.read(Math.max(s.from,e),Math.min(s.to,t)))}return i}}class oi{constructor(e,t){this.data=e,this.id=t}token(e,t){let{parser:i}=t.p;ty(this.data,e,t,this.id,i.data,i.tokenPrecTable)}}oi.prototype.contextual=oi.prototype.fallback=oi.prototype.extend=!1;oi.prototype.fallback=oi.prototype.extend=!1;function ty(n,e,t,i,s,r){let o=0,l=1<<i,{dialect:a}=t.p.parser;e:for(;l&n[o];){let h=n[o+1];for(let d=o+3;d<h;d+=2)if((n[d+1]&l)>0){let p=n[d];if(a.allows(p)&&(e.token.value==-1||e.token.value==p||iy(p,e.token.value,s,r))){e.acceptToken(p);break}}let c=e.next,f=0,u=n[o+2];if(e.next<0&&u>f&&n[h+u*3-3]==65535){o=n[h+u*3-1];continue e}for(;f<u;){let d=f+u>>1,p=h+d+(d<<1),g=n[p],m=n[p+1]||65536;if(c<g)u=d;else if(c>=m)f=d+1;else{o=n[p+2],e.advance();continue e}}break}}function Sa(n,e,t){for(let i=e,s;(s=n[i])!=65535;i++)if(s==t)return i-e;return-1}function iy(n,e,t,i){let s=Sa(t,i,e);return s<0||Sa(t,i,n)<s}const Pe=typeof process<"u"&&process.env&&/\bparse\b/.test({}.LOG);let nr=null;function Ca(n,e,t){let i=n.cursor(he.IncludeAnonymous);for(i.moveTo(e);;)if(!(t<0?i.childBefore(e):i.childAfter(e)))for(;;){if((t<0?i.to<e:i.from>e)&&!i.type.isError)return t<0?Math.max(0,Math.min(i.to-1,e-25)):Math.min(n.length,Math.max(i.from+1,e+25));if(t<0?i.prevSibling():i.nextSibling())break;if(!i.parent())return t<0?0:n.length}}class ny{constructor(e,t){this.fragments=e,this.nodeSet=t,this.i=0,this.fragment=null,this.safeFrom=-1,this.safeTo=-1,this.trees=[],this.start=[],this.index=[],this.nextFragment()}nextFragment(){let e=this.fragment=this.i==this.fragments.length?null:this.fragments[this.i++];if(e){for(this.safeFrom=e.openStart?Ca(e.tree,e.from+e.offset,1)-e.offset:e.from,this.safeTo=e.openEnd?Ca(e.tree,e.to+e.offset,-1)-e.offset:e.to;this.trees.length;)this.trees.pop(),this.start.pop(),this.index.pop();this.trees.push(e.tree),this.start.push(-e.offset),this.index.push(0),this.nextStart=this.safeFrom}else this.nextStart=1e9}nodeAt(e){if(e<this.nextStart)return null;for(;this.fragment&&this.safeTo<=e;)this.nextFragment();if(!this.fragment)return null;for(;;){let t=this.trees.length-1;if(t<0)return this.nextFragment(),null;let i=this.trees[t],s=this.index[t];if(s==i.children.length){this.trees.pop(),this.start.pop(),this.index.pop();continue}let r=i.children[s],o=this.start[t]+i.positions[s];if(o>e)return this.nextStart=o,null;if(r instanceof ie){if(o==e){if(o<this.safeFrom)return null;let l=o+r.length;if(l<=this.safeTo){let a=r.prop(H.lookAhead);if(!a||l+a<this.fragment.to)return r}}this.index[t]++,o+r.length>=Math.max(this.safeFrom,e)&&(this.trees.push(r),this.start.push(o),this.index.push(0))}else this.index[t]++,this.nextStart=o+r.length}}}class sy{constructor(e,t){this.stream=t,this.tokens=[],this.mainToken=null,this.actions=[],this.tokens=e.tokenizers.map(i=>new Fn)}getActions(e){let t=0,i=null,{parser:s}=e.p,{tokenizers:r}=s,o=s.stateSlot(e.state,3),l=e.curContext?e.curContext.hash:0,a=0;for(let h=0;h<r.length;h++){if(!(1<<h&o))continue;let c=r[h],f=this.tokens[h];if(!(i&&!c.fallback)&&((c.contextual||f.start!=e.pos||f.mask!=o||f.context!=l)&&(this.updateCachedToken(f,c,e),f.mask=o,f.context=l),f.lookAhead>f.end+25&&(a=Math.max(f.lookAhead,a)),f.value!=0)){let u=t;if(f.extended>-1&&(t=this.addActions(e,f.extended,f.end,t)),t=this.addActions(e,f.value,f.end,t),!c.extend&&(i=f,t>u))break}}for(;this.actions.length>t;)this.actions.pop();return a&&e.setLookAhead(a),!i&&e.pos==this.stream.end&&(i=new Fn,i.value=e.p.parser.eofTerm,i.start=i.end=e.pos,t=this.addActions(e,i.value,i.end,t)),this.mainToken=i,this.actions}getMainToken(e){if(this.mainToken)return this.mainToken;let t=new Fn,{pos:i,p:s}=e;return t.start=i,t.end=Math.min(i+1,s.stream.end),t.value=i==s.stream.end?s.parser.eofTerm:0,t}updateCachedToken(e,t,i){let s=this.stream.clipPos(i.pos);if(t.token(this.stream.reset(s,e),i),e.value>-1){let{parser:r}=i.p;for(let o=0;o<r.specialized.length;o++)if(r.specialized[o]==e.value){let l=r.specializers[o](this.stream.read(e.start,e.end),i);if(l>=0&&i.p.parser.dialect.allows(l>>1)){l&1?e.extended=l>>1:e.value=l>>1;break}}}else e.value=0,e.end=this.stream.clipPos(s+1)}putAction(e,t,i,s){for(let r=0;r<s;r+=3)if(this.actions[r]==e)return s;return this.actions[s++]=e,this.actions[s++]=t,this.actions[s++]=i,s}addActions(e,t,i,s){let{state:r}=e,{parser:o}=e.p,{data:l}=o;for(let a=0;a<2;a++)for(let h=o.stateSlot(r,a?2:1);;h+=3){if(l[h]==65535)if(l[h+1]==1)h=lt(l,h+2);else{s==0&&l[h+1]==2&&(s=this.putAction(lt(l,h+2),t,i,s));break}l[h]==t&&(s=this.putAction(lt(l,h+1),t,i,s))}return s}}class ry{constructor(e,t,i,s){this.parser=e,this.input=t,this.ranges=s,this.recovering=0,this.nextStackID=9812,this.minStackPos=0,this.reused=[],this.stoppedAt=null,this.lastBigReductionStart=-1,this.lastBigReductionSize=0,this.bigReductionCount=0,this.stream=new ey(t,s),this.tokens=new sy(e,this.stream),this.topTerm=e.top[1];let{from:r}=s[0];this.stacks=[fs.start(this,e.top[0],r)],this.fragments=i.length&&this.stream.end-r>e.bufferLength*4?new ny(i,e.nodeSet):null}get parsedPos(){return this.minStackPos}advance(){let e=this.stacks,t=this.minStackPos,i=this.stacks=[],s,r;if(this.bigReductionCount>300&&e.length==1){let[o]=e;for(;o.forceReduce()&&o.stack.length&&o.stack[o.stack.length-2]>=this.lastBigReductionStart;);this.bigReductionCount=this.lastBigReductionSize=0}for(let o=0;o<e.length;o++){let l=e[o];for(;;){if(this.tokens.mainToken=null,l.pos>t)i.push(l);else{if(this.advanceStack(l,i,e))continue;{s||(s=[],r=[]),s.push(l);let a=this.tokens.getMainToken(l);r.push(a.value,a.end)}}break}}if(!i.length){let o=s&&ly(s);if(o)return Pe&&console.log("Finish with "+this.stackID(o)),this.stackToTree(o);if(this.parser.strict)throw Pe&&s&&console.log("Stuck with token "+(this.tokens.mainToken?this.parser.getName(this.tokens.mainToken.value):"none")),new SyntaxError("No parse at "+t);this.recovering||(this.recovering=5)}if(this.recovering&&s){let o=this.stoppedAt!=null&&s[0].pos>this.stoppedAt?s[0]:this.runRecovery(s,r,i);if(o)return Pe&&console.log("Force-finish "+this.stackID(o)),this.stackToTree(o.forceAll())}if(this.recovering){let o=this.recovering==1?1:this.recovering*3;if(i.length>o)for(i.sort((l,a)=>a.score-l.score);i.length>o;)i.pop();i.some(l=>l.reducePos>t)&&this.recovering--}else if(i.length>1){e:for(let o=0;o<i.length-1;o++){let l=i[o];for(let a=o+1;a<i.length;a++){let h=i[a];if(l.sameState(h)||l.buffer.length>500&&h.buffer.length>500)if((l.score-h.score||l.buffer.length-h.buffer.length)>0)i.splice(a--,1);else{i.splice(o--,1);continue e}}}i.length>12&&i.splice(12,i.length-12)}this.minStackPos=i[0].pos;for(let o=1;o<i.length;o++)i[o].pos<this.minStackPos&&(this.minStackPos=i[o].pos);return null}stopAt(e){if(this.stoppedAt!=null&&this.stoppedAt<e)throw new RangeError("Can't move stoppedAt forward");this.stoppedAt=e}advanceStack(e,t,i){let s=e.pos,{parser:r}=this,o=Pe?this.stackID(e)+" -> ":"";if(this.stoppedAt!=null&&s>this.stoppedAt)return e.forceReduce()?e:null;if(this.fragments){let h=e.curContext&&e.curContext.tracker.strict,c=h?e.curContext.hash:0;for(let f=this.fragments.nodeAt(s);f;){let u=this.parser.nodeSet.types[f.type.id]==f.type?r.getGoto(e.state,f.type.id):-1;if(u>-1&&f.length&&(!h||(f.prop(H.contextHash)||0)==c))return e.useNode(f,u),Pe&&console.log(o+this.stackID(e)+` (via reuse of ${r.getName(f.type.id)})`),!0;if(!(f instanceof ie)||f.children.length==0||f.positions[0]>0)break;let d=f.children[0];if(d instanceof ie&&f.positions[0]==0)f=d;else break}}let l=r.stateSlot(e.state,4);if(l>0)return e.reduce(l),Pe&&console.log(o+this.stackID(e)+` (via always-reduce ${r.getName(l&65535)})`),!0;if(e.stack.length>=8400)for(;e.stack.length>6e3&&e.forceReduce(););let a=this.tokens.getActions(e);for(let h=0;h<a.length;){let c=a[h++],f=a[h++],u=a[h++],d=h==a.length||!i,p=d?e:e.split(),g=this.tokens.mainToken;if(p.apply(c,f,g?g.start:p.pos,u),Pe&&console.log(o+this.stackID(p)+` (via ${c&65536?`reduce of ${r.getName(c&65535)}`:"shift"} for ${r.getName(f)} @ ${s}${p==e?"":", split"})`),d)return!0;p.pos>s?t.push(p):i.push(p)}return!1}advanceFully(e,t){let i=e.pos;for(;;){if(!this.advanceStack(e,null,null))return!1;if(e.pos>i)return Aa(e,t),!0}}runRecovery(e,t,i){let s=null,r=!1;for(let o=0;o<e.length;o++){let l=e[o],a=t[o<<1],h=t[(o<<1)+1],c=Pe?this.stackID(l)+" -> ":"";if(l.deadEnd&&(r||(r=!0,l.restart(),Pe&&console.log(c+this.stackID(l)+" (restarted)"),this.advanceFully(l,i))))continue;let f=l.split(),u=c;for(let d=0;f.forceReduce()&&d<10&&(Pe&&console.log(u+this.stackID(f)+" (via force-reduce)"),!this.advanceFully(f,i));d++)Pe&&(u=this.stackID(f)+" -> ");for(let d of l.recoverByInsert(a))Pe&&console.log(c+this.stackID(d)+" (via recover-insert)"),this.advanceFully(d,i);this.stream.end>l.pos?(h==l.pos&&(h++,a=0),l.recoverByDelete(a,h),Pe&&console.log(c+this.stackID(l)+` (via recover-delete ${this.parser.getName(a)})`),Aa(l,i)):(!s||s.score<l.score)&&(s=l)}return s}stackToTree(e){return e.close(),ie.build({buffer:us.create(e),nodeSet:this.parser.nodeSet,topID:this.topTerm,maxBufferLength:this.parser.bufferLength,reused:this.reused,start:this.ranges[0].from,length:e.pos-this.ranges[0].from,minRepeatType:this.parser.minRepeatTerm})}stackID(e){let t=(nr||(nr=new WeakMap)).get(e);return t||nr.set(e,t=String.fromCodePoint(this.nextStackID++)),t+e}}function Aa(n,e){for(let t=0;t<e.length;t++){let i=e[t];if(i.pos==n.pos&&i.sameState(n)){e[t].score<n.score&&(e[t]=n);return}}e.push(n)}class oy{constructor(e,t,i){this.source=e,this.flags=t,this.disabled=i}allows(e){return!this.disabled||this.disabled[e]==0}}class ds extends yc{constructor(e){if(super(),this.wrappers=[],e.version!=14)throw new RangeError(`Parser version (${e.version}) doesn't match runtime version (14)`);let t=e.nodeNames.split(" ");this.minRepeatTerm=t.length;for(let l=0;l<e.repeatNodeCount;l++)t.push("");let i=Object.keys(e.topRules).map(l=>e.topRules[l][1]),s=[];for(let l=0;l<t.length;l++)s.push([]);function r(l,a,h){s[l].push([a,a.deserialize(String(h))])}if(e.nodeProps)for(let l of e.nodeProps){let a=l[0];typeof a=="string"&&(a=H[a]);for(let h=1;h<l.length;){let c=l[h++];if(c>=0)r(c,a,l[h++]);else{let f=l[h+-c];for(let u=-c;u>0;u--)r(l[h++],a,f);h++}}}this.nodeSet=new go(t.map((l,a)=>De.define({name:a>=this.minRepeatTerm?void 0:l,id:a,props:s[a],top:i.indexOf(a)>-1,error:a==0,skipped:e.skippedNodes&&e.skippedNodes.indexOf(a)>-1}))),e.propSources&&(this.nodeSet=this.nodeSet.extend(...e.propSources)),this.strict=!1,this.bufferLength=dc;let o=An(e.tokenData);this.context=e.context,this.specializerSpecs=e.specialized||[],this.specialized=new Uint16Array(this.specializerSpecs.length);for(let l=0;l<this.specializerSpecs.length;l++)this.specialized[l]=this.specializerSpecs[l].term;this.specializers=this.specializerSpecs.map(Ma),this.states=An(e.states,Uint32Array),this.data=An(e.stateData),this.goto=An(e.goto),this.maxTerm=e.maxTerm,this.tokenizers=e.tokenizers.map(l=>typeof l=="number"?new oi(o,l):l),this.topRules=e.topRules,this.dialects=e.dialects||{},this.dynamicPrecedences=e.dynamicPrecedences||null,this.tokenPrecTable=e.tokenPrec,this.termNames=e.termNames||null,this.maxNode=this.nodeSet.types.length-1,this.dialect=this.parseDialect(),this.top=this.topRules[Object.keys(this.topRules)[0]]}createParse(e,t,i){let s=new ry(this,e,t,i);for(let r of this.wrappers)s=r(s,e,t,i);return s}getGoto(e,t,i=!1){let s=this.goto;if(t>=s[0])return-1;for(let r=s[t+1];;){let o=s[r++],l=o&1,a=s[r++];if(l&&i)return a;for(let h=r+(o>>1);r<h;r++)if(s[r]==e)return a;if(l)return-1}}hasAction(e,t){let i=this.data;for(let s=0;s<2;s++)for(let r=this.stateSlot(e,s?2:1),o;;r+=3){if((o=i[r])==65535)if(i[r+1]==1)o=i[r=lt(i,r+2)];else{if(i[r+1]==2)return lt(i,r+2);break}if(o==t||o==0)return lt(i,r+1)}return 0}stateSlot(e,t){return this.states[e*6+t]}stateFlag(e,t){return(this.stateSlot(e,0)&t)>0}validAction(e,t){return!!this.allActions(e,i=>i==t?!0:null)}allActions(e,t){let i=this.stateSlot(e,4),s=i?t(i):void 0;for(let r=this.stateSlot(e,1);s==null;r+=3){if(this.data[r]==65535)if(this.data[r+1]==1)r=lt(this.data,r+2);else break;s=t(lt(this.data,r+1))}return s}nextStates(e){let t=[];for(let i=this.stateSlot(e,1);;i+=3){if(this.data[i]==65535)if(this.data[i+1]==1)i=lt(this.data,i+2);else break;if(!(this.data[i+2]&1)){let s=this.data[i+1];t.some((r,o)=>o&1&&r==s)||t.push(this.data[i],s)}}return t}configure(e){let t=Object.assign(Object.create(ds.prototype),this);if(e.props&&(t.nodeSet=this.nodeSet.extend(...e.props)),e.top){let i=this.topRules[e.top];if(!i)throw new RangeError(`Invalid top rule name ${e.top}`);t.top=i}return e.tokenizers&&(t.tokenizers=this.tokenizers.map(i=>{let s=e.tokenizers.find(r=>r.from==i);return s?s.to:i})),e.specializers&&(t.specializers=this.specializers.slice(),t.specializerSpecs=this.specializerSpecs.map((i,s)=>{let r=e.specializers.find(l=>l.from==i.external);if(!r)return i;let o=Object.assign(Object.assign({},i),{external:r.to});return t.specializers[s]=Ma(o),o})),e.contextTracker&&(t.context=e.contextTracker),e.dialect&&(t.dialect=this.parseDialect(e.dialect)),e.strict!=null&&(t.strict=e.strict),e.wrap&&(t.wrappers=t.wrappers.concat(e.wrap)),e.bufferLength!=null&&(t.bufferLength=e.bufferLength),t}hasWrappers(){return this.wrappers.length>0}getName(e){return this.termNames?this.termNames[e]:String(e<=this.maxNode&&this.nodeSet.types[e].name||e)}get eofTerm(){return this.maxNode+1}get topNode(){return this.nodeSet.types[this.top[1]]}dynamicPrecedence(e){let t=this.dynamicPrecedences;return t==null?0:t[e]||0}parseDialect(e){let t=Object.keys(this.dialects),i=t.map(()=>!1);if(e)for(let r of e.split(" ")){let o=t.indexOf(r);o>=0&&(i[o]=!0)}let s=null;for(let r=0;r<t.length;r++)if(!i[r])for(let o=this.dialects[t[r]],l;(l=this.data[o++])!=65535;)(s||(s=new Uint8Array(this.maxTerm+1)))[l]=1;return new oy(e,i,s)}static deserialize(e){return new ds(e)}}function lt(n,e){return n[e]|n[e+1]<<16}function ly(n){let e=null;for(let t of n){let i=t.p.stoppedAt;(t.pos==t.p.stream.end||i!=null&&t.pos>i)&&t.p.parser.stateFlag(t.state,2)&&(!e||e.score<t.score)&&(e=t)}return e}function Ma(n){if(n.external){let e=n.extend?1:0;return(t,i)=>n.external(t,i)<<1|e}return n.get}const ay=bc({String:M.string,Number:M.number,"True False":M.bool,PropertyName:M.propertyName,Null:M.null,",":M.separator,"[ ]":M.squareBracket,"{ }":M.brace}),hy=ds.deserialize({version:14,states:"$bOVQPOOOOQO'#Cb'#CbOnQPO'#CeOvQPO'#CjOOQO'#Cp'#CpQOQPOOOOQO'#Cg'#CgO}QPO'#CfO!SQPO'#CrOOQO,59P,59PO![QPO,59PO!aQPO'#CuOOQO,59U,59UO!iQPO,59UOVQPO,59QOqQPO'#CkO!nQPO,59^OOQO1G.k1G.kOVQPO'#ClO!vQPO,59aOOQO1G.p1G.pOOQO1G.l1G.lOOQO,59V,59VOOQO-E6i-E6iOOQO,59W,59WOOQO-E6j-E6j",stateData:"#O~OcOS~OQSORSOSSOTSOWQO]ROePO~OVXOeUO~O[[O~PVOg^O~Oh_OVfX~OVaO~OhbO[iX~O[dO~Oh_OVfa~OhbO[ia~O",goto:"!kjPPPPPPkPPkqwPPk{!RPPP!XP!ePP!hXSOR^bQWQRf_TVQ_Q`WRg`QcZRicQTOQZRQe^RhbRYQR]R",nodeNames:"⚠ JsonText True False Null Number String } { Object Property PropertyName ] [ Array",maxTerm:25,nodeProps:[["openedBy",7,"{",12,"["],["closedBy",8,"}",13,"]"]],propSources:[ay],skippedNodes:[0],repeatNodeCount:2,tokenData:"(|~RaXY!WYZ!W]^!Wpq!Wrs!]|}$u}!O$z!Q!R%T!R![&c![!]&t!}#O&y#P#Q'O#Y#Z'T#b#c'r#h#i(Z#o#p(r#q#r(w~!]Oc~~!`Wpq!]qr!]rs!xs#O!]#O#P!}#P;'S!];'S;=`$o<%lO!]~!}Oe~~#QXrs!]!P!Q!]#O#P!]#U#V!]#Y#Z!]#b#c!]#f#g!]#h#i!]#i#j#m~#pR!Q![#y!c!i#y#T#Z#y~#|R!Q![$V!c!i$V#T#Z$V~$YR!Q![$c!c!i$c#T#Z$c~$fR!Q![!]!c!i!]#T#Z!]~$rP;=`<%l!]~$zOh~~$}Q!Q!R%T!R![&c~%YRT~!O!P%c!g!h%w#X#Y%w~%fP!Q![%i~%nRT~!Q![%i!g!h%w#X#Y%w~%zR{|&T}!O&T!Q![&Z~&WP!Q![&Z~&`PT~!Q![&Z~&hST~!O!P%c!Q![&c!g!h%w#X#Y%w~&yOg~~'OO]~~'TO[~~'WP#T#U'Z~'^P#`#a'a~'dP#g#h'g~'jP#X#Y'm~'rOR~~'uP#i#j'x~'{P#`#a(O~(RP#`#a(U~(ZOS~~(^P#f#g(a~(dP#i#j(g~(jP#X#Y(m~(rOQ~~(wOW~~(|OV~",tokenizers:[0],topRules:{JsonText:[0,1]},tokenPrec:0}),cy=()=>n=>{try{JSON.parse(n.state.doc.toString())}catch(e){if(!(e instanceof SyntaxError))throw e;const t=fy(e,n.state.doc);return[{from:t,message:e.message,severity:"error",to:t}]}return[]};function fy(n,e){let t;return(t=n.message.match(/at position (\d+)/))?Math.min(+t[1],e.length):(t=n.message.match(/at line (\d+) column (\d+)/))?Math.min(e.line(+t[1]).from+ +t[2]-1,e.length):0}const uy=Zn.define({name:"json",parser:hy.configure({props:[kc.add({Object:Yl({except:/^\s*\}/}),Array:Yl({except:/^\s*\]/})}),Cc.add({"Object Array":Lm})]}),languageData:{closeBrackets:{brackets:["[","{",'"']},indentOnInput:/^\s*[\}\]]$/}});function dy(){return new xm(uy)}function py(n,e=n.state){const t=new Set;for(const{from:i,to:s}of n.visibleRanges){let r=i;for(;r<=s;){const o=e.doc.lineAt(r);t.has(o)||t.add(o),r=o.to+1}}return t}function eo(n){const e=n.selection.main.head;return n.doc.lineAt(e)}function Oa(n,e){let t=0;e:for(let i=0;i<n.length;i++)switch(n[i]){case" ":{t+=1;continue e}case"	":{t+=e-t%e;continue e}case"\r":continue e;default:break e}return t}const ps=R.define({combine(n){return Ve(n,{highlightActiveBlock:!0,hideFirstIndent:!1,markerType:"fullScope",thickness:1})}});class my{constructor(e,t,i,s){this.lines=e,this.state=t,this.map=new Map,this.unitWidth=i,this.markerType=s;for(const r of this.lines)this.add(r);this.state.facet(ps).highlightActiveBlock&&this.findAndSetActiveLines()}has(e){return this.map.has(typeof e=="number"?e:e.number)}get(e){const t=this.map.get(typeof e=="number"?e:e.number);if(!t)throw new Error("Line not found in indentation map");return t}set(e,t,i){const s=!e.text.trim().length,r={line:e,col:t,level:i,empty:s};return this.map.set(r.line.number,r),r}add(e){if(this.has(e))return this.get(e);if(!e.length||!e.text.trim().length){if(e.number===1)return this.set(e,0,0);if(e.number===this.state.doc.lines){const o=this.closestNonEmpty(e,-1);return this.set(e,0,o.level)}const s=this.closestNonEmpty(e,-1),r=this.closestNonEmpty(e,1);return s.level>=r.level&&this.markerType!=="codeOnly"?this.set(e,0,s.level):s.empty&&s.level===0&&r.level!==0?this.set(e,0,0):r.level>s.level?this.set(e,0,s.level+1):this.set(e,0,r.level)}const t=Oa(e.text,this.state.tabSize),i=Math.floor(t/this.unitWidth);return this.set(e,t,i)}closestNonEmpty(e,t){let i=e.number+t;for(;t===-1?i>=1:i<=this.state.doc.lines;){if(this.has(i)){const o=this.get(i);if(!o.empty)return o}const r=this.state.doc.line(i);if(r.text.trim().length){const o=Oa(r.text,this.state.tabSize),l=Math.floor(o/this.unitWidth);return this.set(r,o,l)}i+=t}const s=this.state.doc.line(t===-1?1:this.state.doc.lines);return this.set(s,0,0)}findAndSetActiveLines(){const e=eo(this.state);if(!this.has(e))return;let t=this.get(e);if(this.has(t.line.number+1)){const r=this.get(t.line.number+1);r.level>t.level&&(t=r)}if(this.has(t.line.number-1)){const r=this.get(t.line.number-1);r.level>t.level&&(t=r)}if(t.level===0)return;t.active=t.level;let i,s;for(i=t.line.number;i>1;i--){if(!this.has(i-1))continue;const r=this.get(i-1);if(r.level<t.level)break;r.active=t.level}for(s=t.line.number;s<this.state.doc.lines;s++){if(!this.has(s+1))continue;const r=this.get(s+1);if(r.level<t.level)break;r.active=t.level}}}function gy(n){const e={light:"#F0F1F2",dark:"#2B3245",activeLight:"#E4E5E6",activeDark:"#3C445C"};let t=e;return n&&(t=Object.assign(Object.assign({},e),n)),P.baseTheme({"&light":{"--indent-marker-bg-color":t.light,"--indent-marker-active-bg-color":t.activeLight},"&dark":{"--indent-marker-bg-color":t.dark,"--indent-marker-active-bg-color":t.activeDark},".cm-line":{position:"relative"},".cm-indent-markers::before":{content:'""',position:"absolute",top:0,left:0,right:0,bottom:0,background:"var(--indent-markers)",pointerEvents:"none",zIndex:"-1"}})}function Mn(n,e,t,i,s){return`${`repeating-linear-gradient(to right, var(${n}) 0 ${e}px, transparent ${e}px ${t}ch)`} ${i*t}.5ch/calc(${t*s}ch - 1px) no-repeat`}function yy(n,e,t,i){const{level:s,active:r}=n;if(t&&s===0)return[];const o=t?1:0,l=[];if(r!==void 0){const a=r-o-1;a>0&&l.push(Mn("--indent-marker-bg-color",i,e,o,a)),l.push(Mn("--indent-marker-active-bg-color",i,e,r-1,1)),r!==s&&l.push(Mn("--indent-marker-bg-color",i,e,r,s-r))}else l.push(Mn("--indent-marker-bg-color",i,e,o,s-o));return l.join(",")}class by{constructor(e){this.view=e,this.unitWidth=ci(e.state),this.currentLineNumber=eo(e.state).number,this.generate(e.state)}update(e){const t=ci(e.state),i=t!==this.unitWidth;i&&(this.unitWidth=t);const s=eo(e.state).number,r=s!==this.currentLineNumber;this.currentLineNumber=s;const o=e.state.facet(ps).highlightActiveBlock&&r;(e.docChanged||e.viewportChanged||i||o)&&this.generate(e.state)}generate(e){const t=new ht,i=py(this.view,e),{hideFirstIndent:s,markerType:r,thickness:o}=e.facet(ps),l=new my(i,e,this.unitWidth,r);for(const a of i){const h=l.get(a.number);if(!(h!=null&&h.level))continue;const c=yy(h,this.unitWidth,s,o);t.add(a.from,a.from,E.line({class:"cm-indent-markers",attributes:{style:`--indent-markers: ${c}`}}))}this.decorations=t.finish()}}function wy(n={}){return[ps.of(n),gy(n.colors),Z.fromClass(by,{decorations:e=>e.decorations})]}const $f=n=>(Ba("data-v-26b92757"),n=n(),La(),n),vy={class:"actionbar d-flex flex-grow-0 flex-shrink-0 align-items-center justify-content-between border-bottom"},xy=$f(()=>A("svg",{xmlns:"http://www.w3.org/2000/svg",width:"16",height:"16",fill:"currentColor",class:"bi bi-list",viewBox:"0 0 16 16"},[A("path",{"fill-rule":"evenodd",d:"M2.5 12a.5.5 0 0 1 .5-.5h10a.5.5 0 0 1 0 1H3a.5.5 0 0 1-.5-.5zm0-4a.5.5 0 0 1 .5-.5h10a.5.5 0 0 1 0 1H3a.5.5 0 0 1-.5-.5zm0-4a.5.5 0 0 1 .5-.5h10a.5.5 0 0 1 0 1H3a.5.5 0 0 1-.5-.5z"})],-1)),ky={class:"ms-1"},Sy={class:"d-flex flex-nowrap h-100"},Cy={class:"offcanvas-header"},Ay={class:"offcanvas-body p-0 border-top h-100 overflow-auto"},My={class:"d-flex flex-column align-items-stretch flex-shrink-0 bg-body-tertiary overflow-auto h-100 w-100"},Oy={key:0,class:"list-group list-group-flush border-bottom scrollarea"},Dy=["aria-current","onClick"],Ty={class:"d-flex w-100 align-items-center justify-content-between"},Py=["title"],Ry={class:"dropdown"},By=["onClick"],Ly={class:"dropdown-menu shadow m-0"},Ey={key:1,class:"d-flex flex-column h-100 w-100 align-items-center justify-content-center mt-3"},Iy=$f(()=>A("div",{class:"vr"},null,-1)),Ny=jt({__name:"Workshop",props:{items:{},selectedItemId:{}},emits:["select-item"],setup(n,{emit:e}){const t=e,i=ge();let s;gs(()=>{s=new nu(i.value)});const r=o=>{t("select-item",o),s.hide()};return(o,l)=>{var a;return j(),J(Vt,null,[A("div",vy,[A("button",{class:"btn btn-outline-primary d-lg-none mx-2",type:"button","aria-controls":"offcanvasResponsive",onClick:l[0]||(l[0]=h=>Vn(s).toggle())},[xy,A("span",ky,[ot(o.$slots,"offcanvas-toggle-label",{},void 0,!0)])]),ot(o.$slots,"actionbar",{},void 0,!0)]),A("div",Sy,[A("div",{ref_key:"offcanvasRef",ref:i,class:"offcanvas-lg offcanvas-start h-100",tabindex:"-1",id:"offcanvasResponsive"},[A("div",Cy,[ot(o.$slots,"offcanvas-header",{},void 0,!0),A("button",{type:"button",class:"btn-close","aria-label":"Close",onClick:l[1]||(l[1]=h=>Vn(s).hide())})]),A("div",Ay,[A("div",My,[(a=o.items)!=null&&a.length?(j(),J("div",Oy,[(j(!0),J(Vt,null,Wn(o.items,h=>(j(),J("a",{key:h.id,class:Ht(["list-group-item list-group-item-action py-3 lh-sm",h.id===o.selectedItemId?"active":null]),href:"#","aria-current":h.id===o.selectedItemId,onClick:de(c=>r(h),["prevent"])},[A("div",Ty,[A("strong",{class:"me-1 list-group-item-title",title:h.name},li(h.name),9,Py),A("div",Ry,[A("button",{class:Ht(["btn dropdown-toggle",h.id===o.selectedItemId?"btn-primary":"btn-light"]),type:"button","data-bs-toggle":"dropdown","aria-expanded":"false",onClick:de(()=>{},["stop"])},null,10,By),A("ul",Ly,[ot(o.$slots,"list-item-dropdown-items",{item:h},void 0,!0)])])])],10,Dy))),128))])):(j(),J("div",Ey,[ot(o.$slots,"list-empty",{},void 0,!0)]))])])],512),Iy,ot(o.$slots,"default",{},void 0,!0)])],64)}}});const zf=to(Ny,[["__scopeId","data-v-26b92757"]]),Fy={class:"dropdown"},Hy=A("button",{class:"btn btn-outline-primary dropdown-toggle",type:"button","data-bs-toggle":"dropdown","aria-expanded":"false"}," New AI ",-1),_y={class:"dropdown-menu shadow"},Vy=Xf('<li><hr class="dropdown-divider"></li><li><a href="http://aifiles.ownai.org/?aifileversion=1" target="_blank" rel="noopener noreferrer" class="dropdown-item d-flex gap-2"> Find Examples <div class="text-secondary"><svg xmlns="http://www.w3.org/2000/svg" width="12" height="12" fill="currentColor" class="bi bi-box-arrow-up-right align-baseline" viewBox="0 0 16 16"><path fill-rule="evenodd" d="M8.636 3.5a.5.5 0 0 0-.5-.5H1.5A1.5 1.5 0 0 0 0 4.5v10A1.5 1.5 0 0 0 1.5 16h10a1.5 1.5 0 0 0 1.5-1.5V7.864a.5.5 0 0 0-1 0V14.5a.5.5 0 0 1-.5.5h-10a.5.5 0 0 1-.5-.5v-10a.5.5 0 0 1 .5-.5h6.636a.5.5 0 0 0 .5-.5z"></path><path fill-rule="evenodd" d="M16 .5a.5.5 0 0 0-.5-.5h-5a.5.5 0 0 0 0 1h3.793L6.146 9.146a.5.5 0 1 0 .708.708L15 1.707V5.5a.5.5 0 0 0 1 0v-5z"></path></svg></div></a></li>',2),sr=jt({__name:"NewAiDropdown",emits:["load","create"],setup(n,{emit:e}){const t=e;return(i,s)=>(j(),J("div",Fy,[Hy,A("ul",_y,[A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:s[0]||(s[0]=de(r=>t("load"),["prevent"]))}," Load Aifile ")]),A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:s[1]||(s[1]=de(r=>t("create"),["prevent"]))}," Create Empty ")]),Vy])]))}}),Wy={key:1,class:"text-secondary mx-2"},$y=["onClick"],zy=["onClick"],jy=jt({__name:"AiWorkshop",setup(n){const e=fu(),t=ge(!1),i=ge(!0),s=ge(),r=ge();let o;const l=Ea(),a=Ia(),h=ge(),c=y=>{if(!y)return"";const w={name:y.name,aifileversion:1,chain:y.chain};return y.input_labels&&(w.input_labels=y.input_labels),y.greeting&&(w.greeting=y.greeting),y.retrieval&&(w.retrieval=y.retrieval),JSON.stringify(w,null,2)},f=(y,w)=>{const C=new Set,S=JSON.parse(w,function(N,F){if(N==="input_key"&&typeof F=="string"&&F.startsWith("input_")&&C.add(F),N==="input_variables"&&(F!=null&&F[Symbol.iterator]))for(const G of F)typeof G=="string"&&G.startsWith("input_")&&C.add(G);return F}),L={name:S.name,input_keys:Array.from(C),chain:S.chain};return S.input_labels&&(L.input_labels=S.input_labels),S.greeting&&(L.greeting=S.greeting),S.retrieval&&(L.retrieval=S.retrieval),y!==void 0&&(L.id=y),L},u=()=>t.value?confirm("Unsaved changes will be lost. Really discard your changes?"):!0,d=y=>{u()&&(h.value=y.id,a.push({params:{id:y.id}}))},p=async()=>{try{const y=f(h.value||void 0,o.state.doc.toString());y.id!==void 0?await e.updateAi({...y,id:y.id}):await e.createAi(y),t.value=!1}catch(y){y instanceof SyntaxError?alert(`Cannot save the AI because its code is invalid. Please fix the code and try again.
 
-Error message: `+y.message):alert(y)}},g=y=>{i.value=!0,t.value=!1,o==null||o.dispatch({changes:{from:0,to:o==null?void 0:o.state.doc.length,insert:y}})},m=()=>{u()&&(h.value=null,a.push({params:{id:"new"}}),g(""),t.value=!0)},b=async y=>{const w=e.ais.find(S=>S.id===y);if(!w||!u())return;const{id:C,...T}={...w,name:`${w.name} copy`};try{const S=await e.createAi(T);h.value=S.id,a.push({params:{id:S.id}})}catch(S){alert(S)}},k=async y=>{const w=e.ais.find(C=>C.id===y);if(w&&confirm(`Really delete ${w.name}?`))try{await e.deleteAi(w.id),w.id===h.value&&m()}catch(C){alert(C)}},D=()=>{s.value.click()},x=y=>{var S;const w=y.target;if(!((S=w.files)!=null&&S.length))return;const C=w.files[0],T=new FileReader;T.onload=async L=>{var F;const N=(F=L.target)==null?void 0:F.result;if(typeof N=="string"){const G=f(void 0,N),ne=await e.createAi(G);h.value=ne.id,a.push({params:{id:ne.id}})}},T.readAsText(C)};return gs(async()=>{var C;await e.fetchAis();const y=l.params.id;let w;y==="new"||!((C=e.ais)!=null&&C.length)?(h.value=null,w=""):typeof y=="string"&&!isNaN(parseInt(y))?(h.value=parseInt(y),w=c(e.ais.find(T=>T.id===h.value))):(h.value=e.ais[0].id,a.push({params:{id:e.ais[0].id}}),w=c(e.ais[0])),o=new P({state:_.create({doc:w,extensions:[X1,dy(),$1(cy()),J1(),wy(),P.updateListener.of(T=>{T.docChanged&&(i.value?i.value=!1:t.value=!0)})]}),parent:r.value}),addEventListener("beforeunload",function(T){if(t.value){const S="Unsaved changes will be lost. Really discard your changes?";return T.returnValue=S,S}})}),ms(h,y=>{y&&g(c(e.ais.find(w=>w.id===y)))}),Na((y,w)=>{if(y.params.id!==w.params.id){if(y.params.id==="new"){if(h.value!==null){if(!u())return!1;h.value=null,g("")}}else if(typeof y.params.id=="string"&&!isNaN(parseInt(y.params.id))){const C=parseInt(y.params.id);if(h.value!==C){if(!u())return!1;h.value=C,g(c(e.ais.find(T=>T.id===C)))}}}}),(y,w)=>(j(),$n(zf,{items:Vn(e).ais,"selected-item-id":h.value,onSelectItem:d},{"offcanvas-toggle-label":pe(()=>[at("Select AI")]),"offcanvas-header":pe(()=>[Ti(sr,{onLoad:D,onCreate:m})]),actionbar:pe(()=>[A("input",{type:"file",ref_key:"fileInputRef",ref:s,class:"d-none",accept:".aifile",onChange:x},null,544),Ti(sr,{class:"mx-2 d-none d-lg-block",onLoad:D,onCreate:m}),t.value?(j(),J("button",{key:0,type:"button",class:"btn btn-primary mx-2",onClick:p}," Save ")):(j(),J("div",Wy,"Saved"))]),"list-item-dropdown-items":pe(C=>[A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:de(T=>b(C.item.id),["prevent","stop"])}," Duplicate ",8,$y)]),A("li",null,[A("a",{class:"dropdown-item dropdown-item-danger",href:"#",onClick:de(T=>k(C.item.id),["prevent","stop"])}," Delete ",8,zy)])]),"list-empty":pe(()=>[at(" No AI set up yet. "),Ti(sr,{class:"m-3",onLoad:D,onCreate:m})]),default:pe(()=>[A("div",{ref_key:"codemirrorRef",ref:r,class:"overflow-auto w-100"},null,512)]),_:1},8,["items","selected-item-id"]))}});const qy=io({id:"knowledge",state:()=>({knowledges:[]}),actions:{async fetchKnowledges(){const n=await fetch("/api/knowledge/");await $e(n);const e=await n.json();this.knowledges=e},async createKnowledge(n){const e=await fetch("/api/knowledge/",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(n)});await $e(e);const t=await e.json();return this.knowledges.push(t),t},async updateKnowledge(n){const e=await fetch(`/api/knowledge/${n.id}`,{method:"PUT",headers:{"Content-Type":"application/json"},body:JSON.stringify(n)});await $e(e);const t=await e.json(),i=this.knowledges.findIndex(s=>s.id===n.id);return i!==-1&&(this.knowledges[i]=t),t},async deleteKnowledge(n){const e=await fetch(`/api/knowledge/${n}`,{method:"DELETE"});await $e(e),this.knowledges=this.knowledges.filter(t=>t.id!==n)}}}),Ky={class:"w-100"},Uy={class:"nav nav-tabs ps-2"},Gy=["onClick"],Yy={class:"tab-content m-3"},Qy=jt({__name:"Tabs",props:{tabs:{}},setup(n){const e=ge(0),t=i=>{e.value=i};return(i,s)=>(j(),J("div",Ky,[A("ul",Uy,[(j(!0),J(Vt,null,Wn(i.tabs,(r,o)=>(j(),J("li",{class:"nav-item",key:r},[A("a",{class:Ht(["nav-link",{active:e.value===o}]),href:"#",onClick:de(l=>t(o),["prevent"])},li(r),11,Gy)]))),128))]),A("div",Yy,[ot(i.$slots,`tab${e.value}`)])]))}}),yi=n=>(Ba("data-v-716db95d"),n=n(),La(),n),Jy={key:0,class:"d-flex justify-content-center align-items-center mt-5"},Xy=yi(()=>A("div",{class:"spinner-border text-primary",role:"status"},[A("span",{class:"visually-hidden"},"Uploading...")],-1)),Zy=[Xy],eb=["onDrop"],tb=yi(()=>A("svg",{xmlns:"http://www.w3.org/2000/svg",width:"64",height:"64",fill:"currentColor",class:"bi bi-check-lg text-success mb-3",viewBox:"0 0 16 16"},[A("path",{d:"M12.736 3.97a.733.733 0 0 1 1.047 0c.286.289.29.756.01 1.05L7.88 12.01a.733.733 0 0 1-1.065.02L3.217 8.384a.757.757 0 0 1 0-1.06.733.733 0 0 1 1.047 0l3.052 3.093 5.4-6.425a.247.247 0 0 1 .02-.022Z"})],-1)),ib=yi(()=>A("p",{class:"mt-4"},"Drop files here (txt, pdf, docx)",-1)),nb=yi(()=>A("p",null,"or",-1)),sb=yi(()=>A("label",{for:"file-input",class:"btn btn-primary"},"Select files",-1)),rb=yi(()=>A("div",{class:"alert alert-light mt-5",role:"alert"},[at(" Knowledge added here is only accessible to AIs with an "),A("code",null,"input_knowledge"),at(" input key in their "),A("a",{href:"/workshop/ai"},"aifile"),at(". You can recognize these AIs by a yellow dot "),A("span",{class:"d-inline-block rounded-circle p-1 bg-warning"}),at(" in the AI list on the "),A("a",{href:"/"},"interaction view"),at(". ")],-1)),ob=jt({__name:"FileDragDrop",props:{knowledgeId:{}},setup(n){const e=n,t=ge(e.knowledgeId);ms(()=>e.knowledgeId,c=>{t.value=c});const i=ge(!1),s=ge(!1),r=ge(!1),o=c=>{var u;i.value=!1;const f=(u=c.dataTransfer)==null?void 0:u.files;f!=null&&f.length&&a(f)},l=c=>{var u;const f=c.target;(u=f.files)!=null&&u.length&&a(f.files)},a=async c=>{s.value=!0,r.value=!0;for(const f of Array.from(c)){const u=f.name.split(".").pop();switch(u){case"txt":await h(f,`/api/knowledge/${t.value}/document/txt`);break;case"pdf":await h(f,`/api/knowledge/${t.value}/document/pdf`);break;case"docx":await h(f,`/api/knowledge/${t.value}/document/docx`);break;default:r.value=!1,alert(`The file format .${u} is not supported yet.`)}}s.value=!1},h=async(c,f)=>{const u=new FormData;u.append("file",c);try{const d=await fetch(f,{method:"POST",body:u});await $e(d)}catch(d){r.value=!1,alert(d)}};return(c,f)=>s.value?(j(),J("div",Jy,Zy)):(j(),J("div",{key:1,class:Ht(["d-flex flex-column justify-content-center align-items-center border-primary p-5",{"bg-light":i.value}]),onDragover:f[1]||(f[1]=de(u=>i.value=!0,["prevent"])),onDragenter:f[2]||(f[2]=de(u=>i.value=!0,["prevent"])),onDragleave:f[3]||(f[3]=de(u=>i.value=!1,["prevent"])),onDrop:de(o,["prevent"])},[r.value?(j(),J(Vt,{key:0},[tb,ot(c.$slots,"success",{},void 0,!0),A("button",{type:"button",class:"btn btn-primary mt-3",onClick:f[0]||(f[0]=u=>r.value=!1)}," Add more ")],64)):(j(),J(Vt,{key:1},[ot(c.$slots,"default",{},void 0,!0),ib,nb,A("div",null,[sb,A("input",{id:"file-input",class:"d-none",type:"file",accept:".txt,.pdf,.docx",multiple:"",onChange:l},null,32)]),rb],64))],42,eb))}});const lb=to(ob,[["__scopeId","data-v-716db95d"]]),Da=n=>io({id:`document-${n}`,state:()=>({documentPages:{},totalDocuments:0,currentPage:1,itemsPerPage:10,knowledgeId:n}),getters:{currentDocuments(){return this.documentPages[this.currentPage]||[]},totalPages(){return Math.ceil(this.totalDocuments/this.itemsPerPage)}},actions:{async fetchDocumentsForPage(e){const t=(e-1)*this.itemsPerPage,i=this.itemsPerPage;if(this.documentPages[e])return;const s=await fetch(`/api/knowledge/${n}/document?offset=${t}&limit=${i}`);await $e(s);const r=await s.json();this.documentPages[e]=r.items,this.totalDocuments=r.total},async goToPage(e){this.currentPage=e,await this.fetchDocumentsForPage(e)},async deleteDocument(e){const t=await fetch(`/api/knowledge/${n}/document/${e}`,{method:"DELETE"});await $e(t),this.documentPages[this.currentPage]=this.documentPages[this.currentPage].filter(i=>i.id!==e)}}}),ab={key:0,class:"d-flex justify-content-center align-items-center mt-5"},hb=A("div",{class:"spinner-border text-primary",role:"status"},[A("span",{class:"visually-hidden"},"Loading...")],-1),cb=[hb],fb={key:1},ub=A("svg",{xmlns:"http://www.w3.org/2000/svg",class:"d-none"},[A("symbol",{id:"trash",viewBox:"0 0 16 16"},[A("path",{d:"M5.5 5.5A.5.5 0 0 1 6 6v6a.5.5 0 0 1-1 0V6a.5.5 0 0 1 .5-.5Zm2.5 0a.5.5 0 0 1 .5.5v6a.5.5 0 0 1-1 0V6a.5.5 0 0 1 .5-.5Zm3 .5a.5.5 0 0 0-1 0v6a.5.5 0 0 0 1 0V6Z"}),A("path",{d:"M14.5 3a1 1 0 0 1-1 1H13v9a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V4h-.5a1 1 0 0 1-1-1V2a1 1 0 0 1 1-1H6a1 1 0 0 1 1-1h2a1 1 0 0 1 1 1h3.5a1 1 0 0 1 1 1v1ZM4.118 4 4 4.059V13a1 1 0 0 0 1 1h6a1 1 0 0 0 1-1V4.059L11.882 4H4.118ZM2.5 3h11V2h-11v1Z"})])],-1),db={class:"table"},pb=["onClick"],mb=A("svg",{width:"16",height:"16"},[A("use",{href:"#trash"})],-1),gb=[mb],yb={class:"pagination flex-wrap"},bb={class:"page-item mt-2"},wb=A("span",{"aria-hidden":"true"},"«",-1),vb=[wb],xb=["onClick"],kb={class:"page-item mt-2"},Sb=A("span",{"aria-hidden":"true"},"»",-1),Cb=[Sb],Ab={key:2},Mb=A("p",{class:"my-4"}," Nothing there yet. Please add something to this knowledge first. ",-1),Ob=[Mb],Db=jt({__name:"DocumentsTable",props:{knowledgeId:{}},setup(n){const e=n,t=ge(Da(e.knowledgeId)()),i=ge(!0),s=async()=>{i.value=!0,await t.value.fetchDocumentsForPage(t.value.currentPage),i.value=!1};gs(s),ms(()=>e.knowledgeId,a=>{t.value=Da(a)(),s()});const r=async a=>{await t.value.deleteDocument(a),await t.value.fetchDocumentsForPage(t.value.currentPage)},o=_n(()=>t.value.currentPage>1),l=_n(()=>t.value.currentPage<t.value.totalPages);return(a,h)=>i.value?(j(),J("div",ab,cb)):t.value.currentDocuments.length?(j(),J("div",fb,[ub,A("table",db,[A("tbody",null,[(j(!0),J(Vt,null,Wn(t.value.currentDocuments,c=>(j(),J("tr",{key:c.id},[A("td",null,li(c.text),1),A("td",null,[A("button",{type:"button",class:"btn btn-light",onClick:f=>r(c.id)},gb,8,pb)])]))),128))])]),A("nav",null,[A("ul",yb,[A("li",bb,[A("a",{class:Ht(["page-link",{disabled:!o.value}]),href:"#","aria-label":"Previous",onClick:h[0]||(h[0]=de(c=>t.value.goToPage(t.value.currentPage-1),["prevent"]))},vb,2)]),(j(!0),J(Vt,null,Wn(t.value.totalPages,c=>(j(),J("li",{class:Ht(["page-item mt-2",{active:c===t.value.currentPage}]),key:c},[A("a",{class:"page-link",href:"#",onClick:de(f=>t.value.goToPage(c),["prevent"])},li(c),9,xb)],2))),128)),A("li",kb,[A("a",{class:Ht(["page-link",{disabled:!l.value}]),href:"#","aria-label":"Next",onClick:h[1]||(h[1]=de(c=>t.value.goToPage(t.value.currentPage+1),["prevent"]))},Cb,2)])])])])):(j(),J("div",Ab,Ob))}}),Tb=["onClick"],Pb=["onClick"],Rb=["onClick"],Bb={key:1,class:"d-flex h-100 w-100 align-items-center justify-content-center"},Lb=A("svg",{xmlns:"http://www.w3.org/2000/svg",width:"48",height:"48",fill:"currentColor",class:"bi bi-lightbulb",viewBox:"0 0 16 16"},[A("path",{d:"M2 6a6 6 0 1 1 10.174 4.31c-.203.196-.359.4-.453.619l-.762 1.769A.5.5 0 0 1 10.5 13a.5.5 0 0 1 0 1 .5.5 0 0 1 0 1l-.224.447a1 1 0 0 1-.894.553H6.618a1 1 0 0 1-.894-.553L5.5 15a.5.5 0 0 1 0-1 .5.5 0 0 1 0-1 .5.5 0 0 1-.46-.302l-.761-1.77a1.964 1.964 0 0 0-.453-.618A5.984 5.984 0 0 1 2 6zm6-5a5 5 0 0 0-3.479 8.592c.263.254.514.564.676.941L5.83 12h4.342l.632-1.467c.162-.377.413-.687.676-.941A5 5 0 0 0 8 1z"})],-1),Eb=[Lb],Ib=jt({__name:"KnowledgeWorkshop",setup(n){const e=qy(),t=Ea(),i=Ia(),s=ge(),r=_n(()=>e.knowledges.find(c=>c.id===s.value)),o=c=>{s.value=c.id,i.push({params:{id:c.id}})},l=async()=>{const c=prompt("Name of the new knowledge collection");if(c)try{await e.createKnowledge({name:c,embeddings:"huggingface",chunk_size:500})}catch(f){alert(f)}},a=async c=>{const f=e.knowledges.find(d=>d.id===c),u=prompt("New name of the knowledge collection",f==null?void 0:f.name);if(u)try{await e.updateKnowledge({...f,name:u})}catch(d){alert(d)}},h=async c=>{const f=e.knowledges.find(u=>u.id===c);if(confirm(`Really delete knowledge collection "${f==null?void 0:f.name}"?`))try{await e.deleteKnowledge(c),c===s.value&&(s.value=null)}catch(u){alert(u)}};return gs(async()=>{var f;await e.fetchKnowledges();const c=t.params.id;typeof c=="string"&&!isNaN(parseInt(c))?s.value=parseInt(c):(f=e.knowledges)!=null&&f.length&&(s.value=e.knowledges[0].id,i.push({params:{id:e.knowledges[0].id}}))}),Na((c,f)=>{if(c.params.id!==f.params.id&&typeof c.params.id=="string"&&!isNaN(parseInt(c.params.id))){const u=parseInt(c.params.id);s.value!==u&&(s.value=u)}}),(c,f)=>(j(),$n(zf,{items:Vn(e).knowledges,"selected-item-id":s.value,onSelectItem:o},{"offcanvas-toggle-label":pe(()=>[at("Select Knowledge")]),"offcanvas-header":pe(()=>[A("button",{type:"button",class:"btn btn-outline-primary",onClick:l}," Create ")]),actionbar:pe(()=>[A("button",{type:"button",class:"btn btn-outline-primary mx-2 d-none d-lg-block",onClick:l}," Create ")]),"list-item-dropdown-items":pe(u=>[A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:de(d=>a(u.item.id),["prevent","stop"])}," Rename ",8,Tb)]),A("li",null,[A("a",{class:"dropdown-item dropdown-item-danger",href:"#",onClick:de(d=>h(u.item.id),["prevent","stop"])}," Delete ",8,Pb)])]),"list-empty":pe(()=>[at(" No knowledge set up yet. "),A("a",{href:"#",onClick:de(l,["prevent"])},"Create knowledge",8,Rb)]),default:pe(()=>[s.value?(j(),$n(Qy,{key:0,tabs:["Add to knowledge","Inspect knowledge"],class:"mt-3"},{tab0:pe(()=>[Ti(lb,{"knowledge-id":s.value},{success:pe(()=>{var u;return[A("h4",null," Successfully added to "+li((u=r.value)==null?void 0:u.name),1)]}),default:pe(()=>{var u;return[A("h4",null,"Add knowledge to "+li((u=r.value)==null?void 0:u.name),1)]}),_:1},8,["knowledge-id"])]),tab1:pe(()=>[Ti(Db,{"knowledge-id":s.value},null,8,["knowledge-id"])]),_:1})):(j(),J("div",Bb,Eb))]),_:1},8,["items","selected-item-id"]))}}),Nb={};function Fb(n,e){const t=Zf("router-view");return j(),$n(t)}const Hb=to(Nb,[["render",Fb]]),_b=ru(),Vb=eu({history:tu(),routes:[{path:"/workshop",redirect:"/workshop/ai"},{path:"/workshop/ai/:id?",component:jy},{path:"/workshop/knowledge/:id?",component:Ib}]}),Io=iu(Hb);Io.use(_b);Io.use(Vb);Io.mount("#workshop");
+Error message: `+y.message):alert(y)}},g=y=>{i.value=!0,t.value=!1,o==null||o.dispatch({changes:{from:0,to:o==null?void 0:o.state.doc.length,insert:y}})},m=()=>{u()&&(h.value=null,a.push({params:{id:"new"}}),g(""),t.value=!0)},b=async y=>{const w=e.ais.find(S=>S.id===y);if(!w||!u())return;const{id:C,...T}={...w,name:`${w.name} copy`};try{const S=await e.createAi(T);h.value=S.id,a.push({params:{id:S.id}})}catch(S){alert(S)}},k=async y=>{const w=e.ais.find(C=>C.id===y);if(w&&confirm(`Really delete ${w.name}?`))try{await e.deleteAi(w.id),w.id===h.value&&m()}catch(C){alert(C)}},D=()=>{s.value.click()},x=y=>{var S;const w=y.target;if(!((S=w.files)!=null&&S.length))return;const C=w.files[0],T=new FileReader;T.onload=async L=>{var F;const N=(F=L.target)==null?void 0:F.result;if(typeof N=="string"){const G=f(void 0,N),ne=await e.createAi(G);h.value=ne.id,a.push({params:{id:ne.id}})}},T.readAsText(C)};return gs(async()=>{var C;await e.fetchAis();const y=l.params.id;let w;y==="new"||!((C=e.ais)!=null&&C.length)?(h.value=null,w=""):typeof y=="string"&&!isNaN(parseInt(y))?(h.value=parseInt(y),w=c(e.ais.find(T=>T.id===h.value))):(h.value=e.ais[0].id,a.push({params:{id:e.ais[0].id}}),w=c(e.ais[0])),o=new P({state:_.create({doc:w,extensions:[X1,dy(),$1(cy()),J1(),wy(),P.updateListener.of(T=>{T.docChanged&&(i.value?i.value=!1:t.value=!0)})]}),parent:r.value}),addEventListener("beforeunload",function(T){if(t.value){const S="Unsaved changes will be lost. Really discard your changes?";return T.returnValue=S,S}})}),ms(h,y=>{y&&g(c(e.ais.find(w=>w.id===y)))}),Na((y,w)=>{if(y.params.id!==w.params.id){if(y.params.id==="new"){if(h.value!==null){if(!u())return!1;h.value=null,g("")}}else if(typeof y.params.id=="string"&&!isNaN(parseInt(y.params.id))){const C=parseInt(y.params.id);if(h.value!==C){if(!u())return!1;h.value=C,g(c(e.ais.find(T=>T.id===C)))}}}}),(y,w)=>(j(),$n(zf,{items:Vn(e).ais,"selected-item-id":h.value,onSelectItem:d},{"offcanvas-toggle-label":pe(()=>[at("Select AI")]),"offcanvas-header":pe(()=>[Ti(sr,{onLoad:D,onCreate:m})]),actionbar:pe(()=>[A("input",{type:"file",ref_key:"fileInputRef",ref:s,class:"d-none",accept:".aifile",onChange:x},null,544),Ti(sr,{class:"mx-2 d-none d-lg-block",onLoad:D,onCreate:m}),t.value?(j(),J("button",{key:0,type:"button",class:"btn btn-primary mx-2",onClick:p}," Save ")):(j(),J("div",Wy,"Saved"))]),"list-item-dropdown-items":pe(C=>[A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:de(T=>b(C.item.id),["prevent","stop"])}," Duplicate ",8,$y)]),A("li",null,[A("a",{class:"dropdown-item dropdown-item-danger",href:"#",onClick:de(T=>k(C.item.id),["prevent","stop"])}," Delete ",8,zy)])]),"list-empty":pe(()=>[at(" No AI set up yet. "),Ti(sr,{class:"m-3",onLoad:D,onCreate:m})]),default:pe(()=>[A("div",{ref_key:"codemirrorRef",ref:r,class:"overflow-auto w-100"},null,512)]),_:1},8,["items","selected-item-id"]))}});const qy=io({id:"knowledge",state:()=>({knowledges:[]}),actions:{async fetchKnowledges(){const n=await fetch("/api/knowledge/");await $e(n);const e=await n.json();this.knowledges=e},async createKnowledge(n){const e=await fetch("/api/knowledge/",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(n)});await $e(e);const t=await e.json();return this.knowledges.push(t),t},async updateKnowledge(n){const e=await fetch(`/api/knowledge/${n.id}`,{method:"PUT",headers:{"Content-Type":"application/json"},body:JSON.stringify(n)});await $e(e);const t=await e.json(),i=this.knowledges.findIndex(s=>s.id===n.id);return i!==-1&&(this.knowledges[i]=t),t},async deleteKnowledge(n){const e=await fetch(`/api/knowledge/${n}`,{method:"DELETE"});await $e(e),this.knowledges=this.knowledges.filter(t=>t.id!==n)}}}),Ky={class:"w-100"},Uy={class:"nav nav-tabs ps-2"},Gy=["onClick"],Yy={class:"tab-content m-3"},Qy=jt({__name:"Tabs",props:{tabs:{}},setup(n){const e=ge(0),t=i=>{e.value=i};return(i,s)=>(j(),J("div",Ky,[A("ul",Uy,[(j(!0),J(Vt,null,Wn(i.tabs,(r,o)=>(j(),J("li",{class:"nav-item",key:r},[A("a",{class:Ht(["nav-link",{active:e.value===o}]),href:"#",onClick:de(l=>t(o),["prevent"])},li(r),11,Gy)]))),128))]),A("div",Yy,[ot(i.$slots,`tab${e.value}`)])]))}}),yi=n=>(Ba("data-v-716db95d"),n=n(),La(),n),Jy={key:0,class:"d-flex justify-content-center align-items-center mt-5"},Xy=yi(()=>A("div",{class:"spinner-border text-primary",role:"status"},[A("span",{class:"visually-hidden"},"Uploading...")],-1)),eb=["onDrop"],tb=yi(()=>A("svg",{xmlns:"http://www.w3.org/2000/svg",width:"64",height:"64",fill:"currentColor",class:"bi bi-check-lg text-success mb-3",viewBox:"0 0 16 16"},[A("path",{d:"M12.736 3.97a.733.733 0 0 1 1.047 0c.286.289.29.756.01 1.05L7.88 12.01a.733.733 0 0 1-1.065.02L3.217 8.384a.757.757 0 0 1 0-1.06.733.733 0 0 1 1.047 0l3.052 3.093 5.4-6.425a.247.247 0 0 1 .02-.022Z"})],-1)),ib=yi(()=>A("p",{class:"mt-4"},"Drop files here (txt, pdf, docx)",-1)),nb=yi(()=>A("p",null,"or",-1)),sb=yi(()=>A("label",{for:"file-input",class:"btn btn-primary"},"Select files",-1)),rb=yi(()=>A("div",{class:"alert alert-light mt-5",role:"alert"},[at(" Knowledge added here is only accessible to AIs with an "),A("code",null,"input_knowledge"),at(" input key in their "),A("a",{href:"/workshop/ai"},"aifile"),at(". You can recognize these AIs by a yellow dot "),A("span",{class:"d-inline-block rounded-circle p-1 bg-warning"}),at(" in the AI list on the "),A("a",{href:"/"},"interaction view"),at(". ")],-1)),ob=jt({__name:"FileDragDrop",props:{knowledgeId:{}},setup(n){const e=n,t=ge(e.knowledgeId);ms(()=>e.knowledgeId,c=>{t.value=c});const i=ge(!1),s=ge(!1),r=ge(!1),p=ge(""),o=c=>{var u;i.value=!1;const f=(u=c.dataTransfer)==null?void 0:u.files;f!=null&&f.length&&a(f)},l=c=>{var u;const f=c.target;(u=f.files)!=null&&u.length&&a(f.files)},a=async c=>{s.value=!0,r.value=!0;for(const f of Array.from(c)){const u=f.name.split(".").pop();switch(u){case"txt":await h(f,`/api/knowledge/${t.value}/document/txt`);break;case"pdf":await h(f,`/api/knowledge/${t.value}/document/pdf`);break;case"docx":await h(f,`/api/knowledge/${t.value}/document/docx`);break;default:r.value=!1,alert(`The file format .${u} is not supported yet.`)}}s.value=!1},h=async(c,f)=>{const u=new FormData;u.append("file",c);try{const d=await fetch(f,{method:"POST",body:u});await $e(d);const y=await d.json();await m(y.id)}catch(d){r.value=!1,alert(d)}p.value=""},m=async c=>{for(;;){const f=await fetch(`/api/knowledge/${t.value}/job/${c}`);await $e(f);const u=await f.json();if(u.status==="done")return;if(u.status==="failed"||u.status==="cancelled")throw new Error(u.error||`The upload has been ${u.status}.`);p.value=u.chunks_total?`${u.chunks_embedded+u.chunks_skipped} / ${u.chunks_total} chunks added`:"",await new Promise(d=>setTimeout(d,1e3))}};return(c,f)=>s.value?(j(),J("div",Jy,[Xy,A("small",{class:"ms-3 text-muted"},li(p.value),1)])):(j(),J("div",{key:1,class:Ht(["d-flex flex-column justify-content-center align-items-center border-primary p-5",{"bg-light":i.value}]),onDragover:f[1]||(f[1]=de(u=>i.value=!0,["prevent"])),onDragenter:f[2]||(f[2]=de(u=>i.value=!0,["prevent"])),onDragleave:f[3]||(f[3]=de(u=>i.value=!1,["prevent"])),onDrop:de(o,["prevent"])},[r.value?(j(),J(Vt,{key:0},[tb,ot(c.$slots,"success",{},void 0,!0),A("button",{type:"button",class:"btn btn-primary mt-3",onClick:f[0]||(f[0]=u=>r.value=!1)}," Add more ")],64)):(j(),J(Vt,{key:1},[ot(c.$slots,"default",{},void 0,!0),ib,nb,A("div",null,[sb,A("input",{id:"file-input",class:"d-none",type:"file",accept:".txt,.pdf,.docx",multiple:"",onChange:l},null,32)]),rb],64))],42,eb))}});const lb=to(ob,[["__scopeId","data-v-716db95d"]]),Da=n=>io({id:`document-${n}`,state:()=>({documentPages:{},totalDocuments:0,currentPage:1,itemsPerPage:10,knowledgeId:n}),getters:{currentDocuments(){return this.documentPages[this.currentPage]||[]},totalPages(){return Math.ceil(this.totalDocuments/this.itemsPerPage)}},actions:{async fetchDocumentsForPage(e){const t=(e-1)*this.itemsPerPage,i=this.itemsPerPage;if(this.documentPages[e])return;const s=await fetch(`/api/knowledge/${n}/document?offset=${t}&limit=${i}`);await $e(s);const r=await s.json();this.documentPages[e]=r.items,this.totalDocuments=r.total},async goToPage(e){this.currentPage=e,await this.fetchDocumentsForPage(e)},async deleteDocument(e){const t=await fetch(`/api/knowledge/${n}/document/${e}`,{method:"DELETE"});await $e(t),this.documentPages[this.currentPage]=this.documentPages[this.currentPage].filter(i=>i.id!==e)}}}),ab={key:0,class:"d-flex justify-content-center align-items-center mt-5"},hb=A("div",{class:"spinner-border text-primary",role:"status"},[A("span",{class:"visually-hidden"},"Loading...")],-1),cb=[hb],fb={key:1},ub=A("svg",{xmlns:"http://www.w3.org/2000/svg",class:"d-none"},[A("symbol",{id:"trash",viewBox:"0 0 16 16"},[A("path",{d:"M5.5 5.5A.5.5 0 0 1 6 6v6a.5.5 0 0 1-1 0V6a.5.5 0 0 1 .5-.5Zm2.5 0a.5.5 0 0 1 .5.5v6a.5.5 0 0 1-1 0V6a.5.5 0 0 1 .5-.5Zm3 .5a.5.5 0 0 0-1 0v6a.5.5 0 0 0 1 0V6Z"}),A("path",{d:"M14.5 3a1 1 0 0 1-1 1H13v9a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V4h-.5a1 1 0 0 1-1-1V2a1 1 0 0 1 1-1H6a1 1 0 0 1 1-1h2a1 1 0 0 1 1 1h3.5a1 1 0 0 1 1 1v1ZM4.118 4 4 4.059V13a1 1 0 0 0 1 1h6a1 1 0 0 0 1-1V4.059L11.882 4H4.118ZM2.5 3h11V2h-11v1Z"})])],-1),db={class:"table"},pb=["onClick"],mb=A("svg",{width:"16",height:"16"},[A("use",{href:"#trash"})],-1),gb=[mb],yb={class:"pagination flex-wrap"},bb={class:"page-item mt-2"},wb=A("span",{"aria-hidden":"true"},"«",-1),vb=[wb],xb=["onClick"],kb={class:"page-item mt-2"},Sb=A("span",{"aria-hidden":"true"},"»",-1),Cb=[Sb],Ab={key:2},Mb=A("p",{class:"my-4"}," Nothing there yet. Please add something to this knowledge first. ",-1),Ob=[Mb],Db=jt({__name:"DocumentsTable",props:{knowledgeId:{}},setup(n){const e=n,t=ge(Da(e.knowledgeId)()),i=ge(!0),s=async()=>{i.value=!0,await t.value.fetchDocumentsForPage(t.value.currentPage),i.value=!1};gs(s),ms(()=>e.knowledgeId,a=>{t.value=Da(a)(),s()});const r=async a=>{await t.value.deleteDocument(a),await t.value.fetchDocumentsForPage(t.value.currentPage)},o=_n(()=>t.value.currentPage>1),l=_n(()=>t.value.currentPage<t.value.totalPages);return(a,h)=>i.value?(j(),J("div",ab,cb)):t.value.currentDocuments.length?(j(),J("div",fb,[ub,A("table",db,[A("tbody",null,[(j(!0),J(Vt,null,Wn(t.value.currentDocuments,c=>(j(),J("tr",{key:c.id},[A("td",null,li(c.text),1),A("td",null,[A("button",{type:"button",class:"btn btn-light",onClick:f=>r(c.id)},gb,8,pb)])]))),128))])]),A("nav",null,[A("ul",yb,[A("li",bb,[A("a",{class:Ht(["page-link",{disabled:!o.value}]),href:"#","aria-label":"Previous",onClick:h[0]||(h[0]=de(c=>t.value.goToPage(t.value.currentPage-1),["prevent"]))},vb,2)]),(j(!0),J(Vt,null,Wn(t.value.totalPages,c=>(j(),J("li",{class:Ht(["page-item mt-2",{active:c===t.value.currentPage}]),key:c},[A("a",{class:"page-link",href:"#",onClick:de(f=>t.value.goToPage(c),["prevent"])},li(c),9,xb)],2))),128)),A("li",kb,[A("a",{class:Ht(["page-link",{disabled:!l.value}]),href:"#","aria-label":"Next",onClick:h[1]||(h[1]=de(c=>t.value.goToPage(t.value.currentPage+1),["prevent"]))},Cb,2)])])])])):(j(),J("div",Ab,Ob))}}),Tb=["onClick"],Pb=["onClick"],Rb=["onClick"],Bb={key:1,class:"d-flex h-100 w-100 align-items-center justify-content-center"},Lb=A("svg",{xmlns:"http://www.w3.org/2000/svg",width:"48",height:"48",fill:"currentColor",class:"bi bi-lightbulb",viewBox:"0 0 16 16"},[A("path",{d:"M2 6a6 6 0 1 1 10.174 4.31c-.203.196-.359.4-.453.619l-.762 1.769A.5.5 0 0 1 10.5 13a.5.5 0 0 1 0 1 .5.5 0 0 1 0 1l-.224.447a1 1 0 0 1-.894.553H6.618a1 1 0 0 1-.894-.553L5.5 15a.5.5 0 0 1 0-1 .5.5 0 0 1 0-1 .5.5 0 0 1-.46-.302l-.761-1.77a1.964 1.964 0 0 0-.453-.618A5.984 5.984 0 0 1 2 6zm6-5a5 5 0 0 0-3.479 8.592c.263.254.514.564.676.941L5.83 12h4.342l.632-1.467c.162-.377.413-.687.676-.941A5 5 0 0 0 8 1z"})],-1),Eb=[Lb],Ib=jt({__name:"KnowledgeWorkshop",setup(n){const e=qy(),t=Ea(),i=Ia(),s=ge(),r=_n(()=>e.knowledges.find(c=>c.id===s.value)),o=c=>{s.value=c.id,i.push({params:{id:c.id}})},l=async()=>{const c=prompt("Name of the new knowledge collection");if(c)try{await e.createKnowledge({name:c,embeddings:"huggingface",chunk_size:500})}catch(f){alert(f)}},a=async c=>{const f=e.knowledges.find(d=>d.id===c),u=prompt("New name of the knowledge collection",f==null?void 0:f.name);if(u)try{await e.updateKnowledge({...f,name:u})}catch(d){alert(d)}},h=async c=>{const f=e.knowledges.find(u=>u.id===c);if(confirm(`Really delete knowledge collection "${f==null?void 0:f.name}"?`))try{await e.deleteKnowledge(c),c===s.value&&(s.value=null)}catch(u){alert(u)}};return gs(async()=>{var f;await e.fetchKnowledges();const c=t.params.id;typeof c=="string"&&!isNaN(parseInt(c))?s.value=parseInt(c):(f=e.knowledges)!=null&&f.length&&(s.value=e.knowledges[0].id,i.push({params:{id:e.knowledges[0].id}}))}),Na((c,f)=>{if(c.params.id!==f.params.id&&typeof c.params.id=="string"&&!isNaN(parseInt(c.params.id))){const u=parseInt(c.params.id);s.value!==u&&(s.value=u)}}),(c,f)=>(j(),$n(zf,{items:Vn(e).knowledges,"selected-item-id":s.value,onSelectItem:o},{"offcanvas-toggle-label":pe(()=>[at("Select Knowledge")]),"offcanvas-header":pe(()=>[A("button",{type:"button",class:"btn btn-outline-primary",onClick:l}," Create ")]),actionbar:pe(()=>[A("button",{type:"button",class:"btn btn-outline-primary mx-2 d-none d-lg-block",onClick:l}," Create ")]),"list-item-dropdown-items":pe(u=>[A("li",null,[A("a",{class:"dropdown-item",href:"#",onClick:de(d=>a(u.item.id),["prevent","stop"])}," Rename ",8,Tb)]),A("li",null,[A("a",{class:"dropdown-item dropdown-item-danger",href:"#",onClick:de(d=>h(u.item.id),["prevent","stop"])}," Delete ",8,Pb)])]),"list-empty":pe(()=>[at(" No knowledge set up yet. "),A("a",{href:"#",onClick:de(l,["prevent"])},"Create knowledge",8,Rb)]),default:pe(()=>[s.value?(j(),$n(Qy,{key:0,tabs:["Add to knowledge","Inspect knowledge"],class:"mt-3"},{tab0:pe(()=>[Ti(lb,{"knowledge-id":s.value},{success:pe(()=>{var u;return[A("h4",null," Successfully added to "+li((u=r.value)==null?void 0:u.name),1)]}),default:pe(()=>{var u;return[A("h4",null,"Add knowledge to "+li((u=r.value)==null?void 0:u.name),1)]}),_:1},8,["knowledge-id"])]),tab1:pe(()=>[Ti(Db,{"knowledge-id":s.value},null,8,["knowledge-id"])]),_:1})):(j(),J("div",Bb,Eb))]),_:1},8,["items","selected-item-id"]))}}),Nb={};function Fb(n,e){const t=Zf("router-view");return j(),$n(t)}const Hb=to(Nb,[["render",Fb]]),_b=ru(),Vb=eu({history:tu(),routes:[{path:"/workshop",redirect:"/workshop/ai"},{path:"/workshop/ai/:id?",component:jy},{path:"/workshop/knowledge/:id?",component:Ib}]}),Io=iu(Hb);Io.use(_b);Io.use(Vb);Io.mount("#workshop");
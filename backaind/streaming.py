@@ -0,0 +1,74 @@
+"""Coalesce generated tokens to reduce the number of messages and events while streaming."""
+from threading import Lock, Timer
+import time
+from typing import Callable, List, Optional
+
+DEFAULT_TOKEN_FLUSH_INTERVAL_MS = 50
+DEFAULT_TOKEN_FLUSH_BYTES = 256
+
+
+# pylint: disable-next=too-many-instance-attributes
+class TokenBuffer:
+    """
+    Collect tokens and pass them on as one text every interval_ms milliseconds or as soon as
+    max_bytes are collected. The first token is passed on immediately for a low latency.
+    An interval of 0 passes on every single token.
+    With background_flush, a timer passes on collected tokens even if no further token
+    arrives (e.g. while the model pauses).
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        flush: Callable[[str], None],
+        interval_ms: float = DEFAULT_TOKEN_FLUSH_INTERVAL_MS,
+        max_bytes: int = DEFAULT_TOKEN_FLUSH_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+        background_flush: bool = False,
+    ):
+        self._flush = flush
+        self.interval_ms = interval_ms
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.background_flush = background_flush
+        self.pending: List[str] = []
+        self.pending_bytes = 0
+        self.last_flush: Optional[float] = None
+        self.timer: Optional[Timer] = None
+        self.lock = Lock()
+
+    def add(self, token: str):
+        """Add a token and flush the collected tokens if the interval or size is reached."""
+        with self.lock:
+            self.pending.append(token)
+            self.pending_bytes += len(token.encode("utf-8"))
+            if self.last_flush is None or self.interval_ms <= 0:
+                self._flush_pending()
+                return
+            waited_ms = (self.clock() - self.last_flush) * 1000
+            if waited_ms >= self.interval_ms or (
+                self.max_bytes > 0 and self.pending_bytes >= self.max_bytes
+            ):
+                self._flush_pending()
+            elif self.background_flush and self.timer is None:
+                self.timer = Timer((self.interval_ms - waited_ms) / 1000, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Pass on all collected tokens as one text."""
+        with self.lock:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        """Pass on the collected tokens and cancel the timer (call with lock)."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending = []
+        self.pending_bytes = 0
+        self.last_flush = self.clock()
+        self._flush(text)
@@ -0,0 +1,194 @@
+"""Trace where the time of every answered message is spent and show the recent traces."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+import json
+import os
+import time
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+import uuid
+
+from flask import Blueprint, Response, render_template
+
+from .auth import login_required
+
+DEFAULT_TRACE_LOG_MAX_BYTES = 10 * 1024 * 1024
+TRACE_LOG_FILENAME = "traces.jsonl"
+MAX_SHOWN_TRACES = 100
+
+bp = Blueprint("tracing", __name__, url_prefix="/traces")
+current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+# pylint: disable-next=too-many-instance-attributes
+class Trace:
+    """The timed spans of handling a single message."""
+
+    def __init__(self, name: str, **attributes):
+        self.id = uuid.uuid4().hex  # pylint: disable=invalid-name
+        self.name = name
+        self.attributes: Dict[str, Any] = attributes
+        self.started = datetime.now()
+        self.started_monotonic = time.monotonic()
+        self.duration = 0.0
+        self.status = "ok"
+        self.spans: List[Dict[str, Any]] = []
+
+    def add_span(self, name: str, start: float, end: float, **attributes):
+        """Add a span by its start and end time (time.monotonic())."""
+        self.spans.append(
+            {
+                "name": name,
+                "start_ms": round((start - self.started_monotonic) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3),
+                **({"attributes": attributes} if attributes else {}),
+            }
+        )
+
+    def as_dict(self):
+        """Return the trace as dictionary."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started": self.started.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "spans": self.spans,
+        }
+
+
+class TraceLog:
+    """
+    JSON lines file of finished traces, bounded in size.
+    When max_bytes is exceeded, the file is rotated (keeping a single previous file).
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_TRACE_LOG_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+
+    def write(self, trace_data: dict):
+        """Append a trace to the file."""
+        line = json.dumps(trace_data, default=str) + "\n"
+        with self.lock:
+            if (
+                os.path.isfile(self.path)
+                and os.path.getsize(self.path) + len(line) > self.max_bytes
+            ):
+                os.replace(self.path, f"{self.path}.1")
+            with open(self.path, "a", encoding="utf-8") as trace_file:
+                trace_file.write(line)
+
+    def read(self, limit: int = MAX_SHOWN_TRACES) -> List[dict]:
+        """Return the most recent traces (newest first)."""
+        recent_traces: List[dict] = []
+        with self.lock:
+            for path in (self.path, f"{self.path}.1"):
+                if len(recent_traces) >= limit or not os.path.isfile(path):
+                    continue
+                with open(path, "r", encoding="utf-8") as trace_file:
+                    lines = trace_file.readlines()
+                for line in reversed(lines[-(limit - len(recent_traces)) :]):
+                    try:
+                        recent_traces.append(json.loads(line))
+                    except ValueError:
+                        continue
+        return recent_traces
+
+
+# pylint: disable=invalid-name
+global_trace_log: Optional[TraceLog] = None
+# pylint: enable=invalid-name
+
+
+@contextmanager
+def trace(name: str, **attributes) -> Iterator[Optional[Trace]]:
+    """Trace the context and write the trace to the trace log (if tracing is enabled)."""
+    trace_log = global_trace_log
+    if trace_log is None:
+        yield None
+        return
+    new_trace = Trace(name, **attributes)
+    token = current_trace.set(new_trace)
+    try:
+        yield new_trace
+    except BaseException:
+        new_trace.status = "error"
+        raise
+    finally:
+        current_trace.reset(token)
+        new_trace.duration = time.monotonic() - new_trace.started_monotonic
+        trace_log.write(new_trace.as_dict())
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """Add the time spent in the context as span to the current trace (if any)."""
+    active_trace = current_trace.get()
+    if active_trace is None:
+        yield
+        return
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        active_trace.add_span(name, start, time.monotonic(), **attributes)
+
+
+def add_span(name: str, start: float, end: float, **attributes):
+    """Add a span by its start and end time (time.monotonic()) to the current trace."""
+    active_trace = current_trace.get()
+    if active_trace is not None:
+        active_trace.add_span(name, start, end, **attributes)
+
+
+def set_trace_attributes(**attributes):
+    """Add attributes to the current trace (if any)."""
+    active_trace = current_trace.get()
+    if active_trace is not None:
+        active_trace.attributes.update(attributes)
+
+
+def get_trace_log() -> Optional[TraceLog]:
+    """Return the trace log of the application (or None if tracing is disabled)."""
+    return global_trace_log
+
+
+def init_app(app):
+    """Open the trace log in the instance folder (unless tracing is disabled)."""
+    # pylint: disable=global-statement
+    global global_trace_log
+    max_bytes = int(app.config.get("TRACE_LOG_MAX_BYTES", DEFAULT_TRACE_LOG_MAX_BYTES))
+    global_trace_log = (
+        TraceLog(os.path.join(app.instance_path, TRACE_LOG_FILENAME), max_bytes)
+        if max_bytes > 0
+        else None
+    )
+
+
+@bp.route("/")
+@login_required
+def traces():
+    """Render the most recent traces."""
+    trace_log = get_trace_log()
+    return render_template(
+        "tracing/traces.html",
+        traces=trace_log.read() if trace_log else [],
+        is_enabled=trace_log is not None,
+    )
+
+
+@bp.route("/traces.jsonl")
+@login_required
+def export_traces():
+    """Download the most recent traces as JSON lines (oldest first)."""
+    trace_log = get_trace_log()
+    recent_traces = reversed(trace_log.read()) if trace_log else []
+    return Response(
+        "".join(json.dumps(entry) + "\n" for entry in recent_traces),
+        mimetype="application/jsonl",
+        headers={"Content-Disposition": "attachment; filename=traces.jsonl"},
+    )
@@ -0,0 +1,552 @@
+"""Vector store backends keeping the chunks of knowledge."""
+from abc import ABC, abstractmethod
+from array import array
+import json
+import os
+import re
+import sqlite3
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+import uuid
+
+from langchain.docstore.document import Document
+from langchain.embeddings.base import Embeddings
+from langchain.vectorstores.base import VectorStore
+from langchain.vectorstores.chroma import Chroma
+import numpy as np
+
+from .keyword_index import KEYWORD_INDEX_FILENAME, KeywordIndex
+
+HNSW_INDEX_FILENAME = "hnsw-index.bin"
+HNSW_INDEX_STATE_FILENAME = "hnsw-index.json"
+HNSW_CHUNKS_FILENAME = "chunks.sqlite3"
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+HNSW_MIN_CAPACITY = 1024
+# Chunk texts, metadata and vectors are read through a memory map of the SQLite file.
+HNSW_MMAP_BYTES = 1 << 30
+# Metadata keys with an index in the chunk table (used to find duplicates and documents).
+HNSW_INDEXED_METADATA_KEYS = ("content_hash", "document")
+SQLITE_MAX_PARAMETERS = 500
+KEYWORD_INDEX_BUILD_BATCH_SIZE = 256
+keyword_index_lock = Lock()
+
+
+class KnowledgeStore(ABC):
+    """
+    Chunk operations every vector store backend of a knowledge has to support.
+    Every store keeps a keyword index of its chunks next to the vectors.
+    """
+
+    persist_directory: str
+    keyword_index: Optional[KeywordIndex] = None
+
+    @abstractmethod
+    def upsert_chunks(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+    ):
+        """Add (or replace) chunks with their already computed embeddings."""
+
+    @abstractmethod
+    def get_chunks(self, limit: int, offset: int = 0) -> List[Tuple[str, str]]:
+        """Return the IDs and texts of a page of chunks."""
+
+    @abstractmethod
+    def find_chunks(self, key: str, values: Iterable[str]) -> Dict[str, dict]:
+        """Return the metadata by ID of all chunks with one of the values for the key."""
+
+    @abstractmethod
+    def count_chunks(self) -> int:
+        """Return the number of chunks."""
+
+    @abstractmethod
+    def search_chunks(self, query: str, k: int) -> List[Tuple[str, Document]]:
+        """Return the IDs and documents of the k chunks most similar to the query."""
+
+    @abstractmethod
+    def get_documents(self, ids: List[str]) -> Dict[str, Document]:
+        """Return the documents of the chunks by ID."""
+
+    @abstractmethod
+    def delete_chunks(self, ids: List[str]):
+        """Delete the chunks with the given IDs."""
+
+    def get_keyword_index(self) -> KeywordIndex:
+        """
+        Return the keyword index of the chunks (opened on first use).
+        A missing or incomplete index (e.g. of knowledge added before) is built from all chunks.
+        """
+        with keyword_index_lock:
+            if self.keyword_index is None:
+                keyword_index = KeywordIndex(
+                    os.path.join(self.persist_directory, KEYWORD_INDEX_FILENAME)
+                )
+                if keyword_index.count() != self.count_chunks():
+                    keyword_index.clear()
+                    offset = 0
+                    while chunks := self.get_chunks(
+                        KEYWORD_INDEX_BUILD_BATCH_SIZE, offset
+                    ):
+                        keyword_index.add(
+                            [chunk_id for chunk_id, _ in chunks],
+                            [text for _, text in chunks],
+                        )
+                        offset += len(chunks)
+                self.keyword_index = keyword_index
+            return self.keyword_index
+
+    def persist(self):
+        """Write pending changes to disk (if the backend doesn't do it by itself)."""
+
+    def close(self):
+        """Release the resources of the store."""
+        with keyword_index_lock:
+            if self.keyword_index is not None:
+                self.keyword_index.close()
+                self.keyword_index = None
+
+
+class ChromaKnowledgeStore(Chroma, KnowledgeStore):
+    """Knowledge stored in a Chroma collection."""
+
+    @property
+    def persist_directory(self) -> str:  # type: ignore[override]
+        """Return the directory of the Chroma database."""
+        return self._persist_directory or ""
+
+    def upsert_chunks(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+    ):
+        self._collection.upsert(
+            ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas
+        )
+
+    def get_chunks(self, limit: int, offset: int = 0) -> List[Tuple[str, str]]:
+        collection = self.get(limit=limit, offset=offset, include=["documents"])
+        return list(zip(collection["ids"], collection["documents"]))
+
+    def find_chunks(self, key: str, values: Iterable[str]) -> Dict[str, dict]:
+        values = list(set(values))
+        if not values:
+            return {}
+        collection = self.get(where={key: {"$in": values}}, include=["metadatas"])
+        return {
+            chunk_id: metadata or {}
+            for chunk_id, metadata in zip(collection["ids"], collection["metadatas"])
+        }
+
+    def count_chunks(self) -> int:
+        return self._collection.count()
+
+    def search_chunks(self, query: str, k: int) -> List[Tuple[str, Document]]:
+        k = min(k, self._collection.count())
+        if k <= 0:
+            return []
+        results = self._collection.query(
+            query_embeddings=[self._embedding_function.embed_query(query)],
+            n_results=k,
+            include=["documents", "metadatas"],
+        )
+        return [
+            (chunk_id, Document(page_content=text, metadata=metadata or {}))
+            for chunk_id, text, metadata in zip(
+                results["ids"][0], results["documents"][0], results["metadatas"][0]
+            )
+        ]
+
+    def get_documents(self, ids: List[str]) -> Dict[str, Document]:
+        if not ids:
+            return {}
+        collection = self.get(ids=ids, include=["documents", "metadatas"])
+        return {
+            chunk_id: Document(page_content=text, metadata=metadata or {})
+            for chunk_id, text, metadata in zip(
+                collection["ids"], collection["documents"], collection["metadatas"]
+            )
+        }
+
+    def delete_chunks(self, ids: List[str]):
+        if ids:
+            self.delete(ids)
+
+
+class HnswKnowledgeStore(VectorStore, KnowledgeStore):
+    """
+    Knowledge stored in a local hnswlib index with the chunks in a memory-mapped SQLite file.
+    The vectors are kept in the SQLite file as well, so the index gets rebuilt if it is
+    missing or outdated (e.g. after a crash before the index was persisted).
+    """
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings):
+        self.persist_directory = persist_directory
+        self._embedding_function = embedding_function
+        self.lock = Lock()
+        self.index: Any = None
+        self.revision = 0
+        self.saved_revision = 0
+        os.makedirs(persist_directory, exist_ok=True)
+        self.connection = sqlite3.connect(
+            os.path.join(persist_directory, HNSW_CHUNKS_FILENAME),
+            timeout=30,
+            check_same_thread=False,
+        )
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(f"PRAGMA mmap_size={HNSW_MMAP_BYTES}")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS chunk ("
+                "label INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+                "text TEXT NOT NULL, metadata TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value INTEGER)"
+            )
+            for key in HNSW_INDEXED_METADATA_KEYS:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_chunk_{key} "
+                    f"ON chunk (json_extract(metadata, '$.{key}'))"
+                )
+            row = self.connection.execute(
+                "SELECT value FROM state WHERE name = 'revision'"
+            ).fetchone()
+            self.revision = row[0] if row else 0
+            self._load_index()
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self._embedding_function
+
+    def _load_index(self):
+        """Load the persisted index or rebuild it from the stored vectors (call with lock)."""
+        index_path = os.path.join(self.persist_directory, HNSW_INDEX_FILENAME)
+        state_path = os.path.join(self.persist_directory, HNSW_INDEX_STATE_FILENAME)
+        row = self.connection.execute(
+            "SELECT COUNT(*), MAX(length(vector)) FROM chunk"
+        ).fetchone()
+        count, vector_bytes = row
+        self.saved_revision = self.revision
+        if not count:
+            self.index = None
+            return
+        # pylint: disable-next=import-outside-toplevel
+        import hnswlib
+
+        # pylint: disable-next=c-extension-no-member
+        self.index = hnswlib.Index(space="l2", dim=vector_bytes // 4)
+        try:
+            with open(state_path, "r", encoding="utf-8") as state_file:
+                saved_revision = json.load(state_file)["revision"]
+        except (OSError, ValueError, KeyError):
+            saved_revision = None
+        if saved_revision == self.revision and os.path.isfile(index_path):
+            self.index.load_index(index_path, allow_replace_deleted=True)
+        else:
+            self._rebuild_index(count)
+        self.index.set_ef(HNSW_EF_SEARCH)
+
+    def _rebuild_index(self, count: int):
+        """Add all stored vectors to a new index (call with lock)."""
+        self.index.init_index(
+            max_elements=max(count, HNSW_MIN_CAPACITY),
+            M=HNSW_M,
+            ef_construction=HNSW_EF_CONSTRUCTION,
+            allow_replace_deleted=True,
+        )
+        cursor = self.connection.execute("SELECT label, vector FROM chunk")
+        while True:
+            rows = cursor.fetchmany(HNSW_MIN_CAPACITY)
+            if not rows:
+                break
+            self.index.add_items(
+                np.array([array("f", vector).tolist() for _, vector in rows]),
+                [label for label, _ in rows],
+            )
+        # the stored chunks and the rebuilt index differ from the saved index
+        self.saved_revision = -1
+
+    def _increase_revision(self):
+        """Mark the index as changed since it was persisted (call with lock)."""
+        self.revision += 1
+        self.connection.execute(
+            "INSERT OR REPLACE INTO state VALUES ('revision', ?)", (self.revision,)
+        )
+
+    def upsert_chunks(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+    ):
+        if not ids:
+            return
+        with self.lock, self.connection:
+            self._delete_rows(ids)
+            self.connection.executemany(
+                "INSERT INTO chunk (id, text, metadata, vector) VALUES (?, ?, ?, ?)",
+                [
+                    (chunk_id, text, json.dumps(metadata), array("f", vector).tobytes())
+                    for chunk_id, text, metadata, vector in zip(
+                        ids, texts, metadatas, vectors
+                    )
+                ],
+            )
+            labels = self._get_labels(ids)
+            if self.index is None:
+                self._load_index()
+            else:
+                if self.index.element_count + len(ids) > self.index.get_max_elements():
+                    self.index.resize_index(
+                        max(
+                            2 * self.index.get_max_elements(),
+                            self.index.element_count + len(ids),
+                        )
+                    )
+                self.index.add_items(
+                    np.array(vectors, dtype=np.float32),
+                    [labels[chunk_id] for chunk_id in ids],
+                    replace_deleted=True,
+                )
+            self._increase_revision()
+
+    def _get_labels(self, ids: List[str]) -> Dict[str, int]:
+        """Return the index labels of the chunks by ID (call with lock)."""
+        labels = {}
+        for start in range(0, len(ids), SQLITE_MAX_PARAMETERS):
+            chunk_ids = ids[start : start + SQLITE_MAX_PARAMETERS]
+            placeholders = ",".join("?" * len(chunk_ids))
+            labels.update(
+                (chunk_id, label)
+                for label, chunk_id in self.connection.execute(
+                    f"SELECT label, id FROM chunk WHERE id IN ({placeholders})",
+                    chunk_ids,
+                )
+            )
+        return labels
+
+    def _delete_rows(self, ids: List[str]):
+        """Delete the chunks from the table and mark them deleted in the index (call with lock)."""
+        labels = self._get_labels(ids)
+        if not labels:
+            return
+        for label in labels.values():
+            if self.index is not None:
+                self.index.mark_deleted(label)
+        self.connection.executemany(
+            "DELETE FROM chunk WHERE label = ?", [(label,) for label in labels.values()]
+        )
+
+    def get_chunks(self, limit: int, offset: int = 0) -> List[Tuple[str, str]]:
+        with self.lock:
+            return self.connection.execute(
+                "SELECT id, text FROM chunk ORDER BY label LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+
+    def find_chunks(self, key: str, values: Iterable[str]) -> Dict[str, dict]:
+        if not re.fullmatch(r"\w+", key):
+            raise ValueError(f"Invalid metadata key: {key}")
+        values = list(set(values))
+        found = {}
+        with self.lock:
+            for start in range(0, len(values), SQLITE_MAX_PARAMETERS):
+                chunk_values = values[start : start + SQLITE_MAX_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk_values))
+                found.update(
+                    (chunk_id, json.loads(metadata))
+                    for chunk_id, metadata in self.connection.execute(
+                        "SELECT id, metadata FROM chunk "
+                        f"WHERE json_extract(metadata, '$.{key}') IN ({placeholders})",
+                        chunk_values,
+                    )
+                )
+        return found
+
+    def count_chunks(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM chunk").fetchone()[0]
+
+    def delete_chunks(self, ids: List[str]):
+        if not ids:
+            return
+        with self.lock, self.connection:
+            self._delete_rows(ids)
+            self._increase_revision()
+
+    def persist(self):
+        with self.lock:
+            if self.saved_revision == self.revision:
+                return
+            index_path = os.path.join(self.persist_directory, HNSW_INDEX_FILENAME)
+            state_path = os.path.join(self.persist_directory, HNSW_INDEX_STATE_FILENAME)
+            if self.index is None:
+                for path in (index_path, state_path):
+                    if os.path.isfile(path):
+                        os.remove(path)
+            else:
+                self.index.save_index(f"{index_path}.tmp")
+                os.replace(f"{index_path}.tmp", index_path)
+                with open(f"{state_path}.tmp", "w", encoding="utf-8") as state_file:
+                    json.dump({"revision": self.revision}, state_file)
+                os.replace(f"{state_path}.tmp", state_path)
+            self.saved_revision = self.revision
+
+    def close(self):
+        self.persist()
+        with self.lock:
+            self.connection.close()
+        super().close()
+
+    def search_chunks_by_vector(
+        self, embedding: List[float], k: int
+    ) -> List[Tuple[str, Document, float]]:
+        """Return the IDs, documents and L2 distances of the k chunks closest to the embedding."""
+        with self.lock:
+            count = self.connection.execute("SELECT COUNT(*) FROM chunk").fetchone()[0]
+            k = min(k, count)
+            if self.index is None or k <= 0:
+                return []
+            self.index.set_ef(max(HNSW_EF_SEARCH, k))
+            try:
+                labels, distances = self.index.knn_query(
+                    np.array([embedding], dtype=np.float32), k=k
+                )
+            except RuntimeError:
+                # too many deleted elements around the query to find k neighbors
+                self.index.set_ef(max(HNSW_EF_SEARCH, k) * 10)
+                labels, distances = self.index.knn_query(
+                    np.array([embedding], dtype=np.float32), k=k
+                )
+            label_list = [int(label) for label in labels[0]]
+            placeholders = ",".join("?" * len(label_list))
+            rows = {
+                label: (chunk_id, text, metadata)
+                for label, chunk_id, text, metadata in self.connection.execute(
+                    "SELECT label, id, text, metadata FROM chunk "
+                    f"WHERE label IN ({placeholders})",
+                    label_list,
+                )
+            }
+        return [
+            (
+                rows[label][0],
+                Document(
+                    page_content=rows[label][1], metadata=json.loads(rows[label][2])
+                ),
+                float(distance),
+            )
+            for label, distance in zip(label_list, distances[0])
+            if label in rows
+        ]
+
+    def search_chunks(self, query: str, k: int) -> List[Tuple[str, Document]]:
+        return [
+            (chunk_id, document)
+            for chunk_id, document, _ in self.search_chunks_by_vector(
+                self._embedding_function.embed_query(query), k
+            )
+        ]
+
+    def get_documents(self, ids: List[str]) -> Dict[str, Document]:
+        documents = {}
+        with self.lock:
+            for start in range(0, len(ids), SQLITE_MAX_PARAMETERS):
+                chunk_ids = ids[start : start + SQLITE_MAX_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk_ids))
+                documents.update(
+                    (
+                        chunk_id,
+                        Document(page_content=text, metadata=json.loads(metadata)),
+                    )
+                    for chunk_id, text, metadata in self.connection.execute(
+                        "SELECT id, text, metadata FROM chunk "
+                        f"WHERE id IN ({placeholders})",
+                        chunk_ids,
+                    )
+                )
+        return documents
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """Return the chunks most similar to the embedding with their L2 distance."""
+        return [
+            (document, distance)
+            for _, document, distance in self.search_chunks_by_vector(embedding, k)
+        ]
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [
+            document
+            for document, _ in self.similarity_search_by_vector_with_score(embedding, k)
+        ]
+
+    # pylint: disable-next=arguments-differ
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Return the chunks most similar to the query with their L2 distance."""
+        return self.similarity_search_by_vector_with_score(
+            self._embedding_function.embed_query(query), k
+        )
+
+    def similarity_search(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return self.similarity_search_by_vector(
+            self._embedding_function.embed_query(query), k
+        )
+
+    def _select_relevance_score_fn(self):
+        return self._euclidean_relevance_score_fn
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        ids = kwargs.get("ids") or [str(uuid.uuid4()) for _ in texts]
+        self.upsert_chunks(
+            ids,
+            self._embedding_function.embed_documents(texts),
+            texts,
+            metadatas or [{} for _ in texts],
+        )
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        self.delete_chunks(ids or [])
+        self.persist()
+        return True
+
+    @classmethod
+    def from_texts(
+        cls: Type["HnswKnowledgeStore"],
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> "HnswKnowledgeStore":
+        store = cls(kwargs["persist_directory"], embedding)
+        store.add_texts(texts, metadatas, ids=kwargs.get("ids"))
+        store.persist()
+        return store
+
+
+VECTOR_STORE_CLASSES: Dict[str, Type[KnowledgeStore]] = {
+    "chroma": ChromaKnowledgeStore,
+    "hnswlib": HnswKnowledgeStore,
+}
@@ -0,0 +1,708 @@
+"""
+    Run AI chains in a pool of long-lived worker processes.
+    Each worker loads a chain once and afterwards only receives the inputs for every reply.
+"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import copy
+import hashlib
+import json
+import os
+import time
+from threading import Condition
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.chains import LLMChain
+from langchain.chains.base import Chain
+from langchain.chains.loading import load_chain_from_config
+from langchain.llms.huggingface_text_gen_inference import HuggingFaceTextGenInference
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain.schema.language_model import BaseLanguageModel
+
+from backaind.cache import LruCache
+from backaind.context import find_config_values
+from backaind.metrics import process_spawn_seconds
+from backaind.streaming import TokenBuffer
+from backaind.tracing import span
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 60
+DEFAULT_LLAMACPP_STATE_CACHE_BYTES = 0
+HEALTH_CHECK_TIMEOUT = 5
+MODEL_FILE_KEYS = ("model_path", "model", "model_file")
+# Environment variables of external providers read by the models (by their type in the chain
+# config), so chains only get the API keys of a user they actually use.
+LLM_TYPE_ENVVARS: Dict[str, Tuple[str, ...]] = {
+    "ai21": ("AI21_API_KEY",),
+    "aleph_alpha": ("ALEPH_ALPHA_API_KEY",),
+    "anyscale": (
+        "ANYSCALE_SERVICE_URL",
+        "ANYSCALE_SERVICE_ROUTE",
+        "ANYSCALE_SERVICE_TOKEN",
+    ),
+    "aviary": ("AVIARY_URL", "AVIARY_TOKEN"),
+    "azure": ("OPENAI_API_KEY",),
+    "bananadev": ("BANANA_API_KEY",),
+    "beam": ("BEAM_CLIENT_ID", "BEAM_CLIENT_SECRET"),
+    "cohere": ("COHERE_API_KEY",),
+    "databricks": ("DATABRICKS_HOST", "DATABRICKS_API_TOKEN"),
+    "deepinfra": ("DEEPINFRA_API_TOKEN",),
+    "forefrontai": ("FOREFRONTAI_API_KEY",),
+    "google_palm": ("GOOGLE_API_KEY",),
+    "gooseai": ("GOOSEAI_API_KEY",),
+    "huggingface_endpoint": ("HUGGINGFACEHUB_API_TOKEN",),
+    "huggingface_hub": ("HUGGINGFACEHUB_API_TOKEN",),
+    "huggingface_textgen_inference": ("TEXT_GENERATION_INFERENCE_TOKEN",),
+    "modal": (),
+    "mosaic": ("MOSAICML_API_TOKEN",),
+    "nlpcloud": ("NLPCLOUD_API_KEY",),
+    "openai": ("OPENAI_API_KEY",),
+    "openai-chat": ("OPENAI_API_KEY",),
+    "petals": ("HUGGINGFACE_API_KEY",),
+    "replicate": ("REPLICATE_API_TOKEN",),
+    "stochasticai": ("STOCHASTICAI_API_KEY",),
+    "vertexai": ("GOOGLE_APPLICATION_CREDENTIALS",),
+    "writer": ("WRITER_API_KEY", "WRITER_ORG_ID"),
+    # local models
+    "ctransformers": (),
+    "fake-list": (),
+    "gpt4all": (),
+    "huggingface_pipeline": (),
+    "llamacpp": (),
+    "rwkv": (),
+}
+# Models reading their API keys only from the environment (or changing the environment)
+ENVIRONMENT_ONLY_LLM_TYPES = (
+    "anyscale",
+    "aviary",
+    "databricks",
+    "huggingface_textgen_inference",
+    "vertexai",
+)
+
+
+class WorkerCrashedError(Exception):
+    """The worker process died while running a chain."""
+
+
+class ChainRequest(NamedTuple):
+    """A chain to be loaded by the process running it, with the environment of a user."""
+
+    chain_config: dict
+    environment: Dict[str, str]
+    task: str = "reply"
+
+
+@contextmanager
+def worker_environment(environment: Dict[str, str]) -> Iterator[None]:
+    """
+    Set environment variables (e.g. the API keys of a user) while a chain is loaded or run
+    and restore the previous values afterwards.
+    Only use it in the processes running chains: they run a single chain at a time, while
+    the environment of the server process is shared by all concurrent requests.
+    """
+    previous_values = {key: os.environ.get(key) for key in environment}
+    os.environ.update(environment)
+    try:
+        yield
+    finally:
+        for key, value in previous_values.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_chain_process(
+    chain: Union[Chain, ChainRequest],
+    inputs: dict,
+    putable,
+    token_flush: Tuple[float, int] = (0, 0),
+):
+    """
+    Run the chain in a separate process and put the results in the putable.
+    Tokens are coalesced according to token_flush (interval in ms, max bytes).
+    Besides the prompts, the number of prompt tokens (if the tokenizer of the model is
+    known) and of generated tokens are put in the putable for the latency estimation.
+    A chain request is loaded (and run) with its environment in this process.
+    """
+    if isinstance(chain, ChainRequest):
+        with worker_environment(chain.environment):
+            try:
+                loaded_chain = load_chain_from_config(copy.deepcopy(chain.chain_config))
+                set_text_generation_inference_token(loaded_chain)
+                if chain.task == "summarize":
+                    loaded_chain = get_summary_chain(loaded_chain)
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exception:
+                putable.put(("error", str(exception)))
+                return
+            run_chain_process(loaded_chain, inputs, putable, token_flush)
+        return
+
+    count_tokens = get_token_counter(chain)
+    generated_tokens = 0
+    token_buffer = TokenBuffer(
+        lambda text: putable.put(("token", text)),
+        token_flush[0],
+        token_flush[1],
+        background_flush=True,
+    )
+
+    class CallbackHandler(BaseCallbackHandler):
+        """Callback handler that puts tokens in the putable as they are generated."""
+
+        def on_chat_model_start(self, serialized, messages, **kwargs):
+            pass
+
+        def on_llm_start(
+            self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any
+        ) -> Any:
+            token_buffer.flush()
+            putable.put(("prompts", prompts))
+            if count_tokens:
+                try:
+                    putable.put(("prompt_tokens", count_tokens("\n".join(prompts))))
+                # pylint: disable-next=broad-exception-caught
+                except Exception:
+                    pass
+
+        def on_llm_new_token(self, token: str, **kwargs) -> None:
+            nonlocal generated_tokens
+            generated_tokens += 1
+            token_buffer.add(token)
+
+    try:
+        output_text = chain(inputs, callbacks=[CallbackHandler()])["output_text"]
+    # pylint: disable-next=broad-exception-caught
+    except Exception as exception:
+        token_buffer.flush()
+        putable.put(("error", str(exception)))
+        return
+    token_buffer.flush()
+    putable.put(("generated_tokens", generated_tokens))
+    putable.put(("done", output_text))
+
+
+def get_token_counter(chain) -> Optional[Callable[[str], int]]:
+    """Return the token counter of the chain's model if it uses its real tokenizer."""
+    for llm in find_instances(chain, BaseLanguageModel):
+        # the default implementation would download the GPT-2 tokenizer
+        if type(llm).get_num_tokens is not BaseLanguageModel.get_num_tokens:
+            return llm.get_num_tokens
+    return None
+
+
+def get_summary_chain(chain: Chain) -> Chain:
+    """
+    Return a chain progressively summarizing a conversation with the model of the chain.
+    It expects the current summary and the new lines of the conversation as inputs.
+    """
+    llm = next(iter(find_instances(chain, BaseLanguageModel)), None)
+    if llm is None:
+        raise ValueError("The AI has no language model to summarize the conversation.")
+    return LLMChain(llm=llm, prompt=SUMMARY_PROMPT, output_key="output_text")
+
+
+def find_instances(obj, cls, seen: Optional[Set[int]] = None):
+    """Find all instances of a class in an object."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return []
+    seen.add(id(obj))
+    instances = []
+    if isinstance(obj, cls):
+        instances.append(obj)
+    if isinstance(obj, list):
+        for item in obj:
+            instances.extend(find_instances(item, cls, seen))
+    elif hasattr(obj, "__dict__"):
+        for prop in vars(obj).values():
+            instances.extend(find_instances(prop, cls, seen))
+    return instances
+
+
+def set_text_generation_inference_token(chain: Chain):
+    """Set the token for all HuggingFaceTextGenInference instances in the chain."""
+    token = os.environ.get("TEXT_GENERATION_INFERENCE_TOKEN", None)
+    if not token:
+        return
+    all_huggingface_instances = find_instances(chain, HuggingFaceTextGenInference)
+    for instance in all_huggingface_instances:
+        instance.client.headers = {"Authorization": f"Bearer {token}"}
+
+
+def estimate_chain_size(chain_config: dict) -> int:
+    """Estimate the resident bytes of a chain by the size of the model files it references."""
+    size = 0
+    if isinstance(chain_config, dict):
+        for key, value in chain_config.items():
+            if key in MODEL_FILE_KEYS and isinstance(value, str):
+                if os.path.isfile(value):
+                    size += os.path.getsize(value)
+            else:
+                size += estimate_chain_size(value)
+    elif isinstance(chain_config, list):
+        for item in chain_config:
+            size += estimate_chain_size(item)
+    return size
+
+
+def enable_llamacpp_state_cache(chain: Chain, capacity_bytes: int):
+    """
+    Let all llama.cpp models of the chain keep the evaluated state of recent prompts in RAM,
+    so a prompt starting with a cached prefix (e.g. the system prompt and the previous turns
+    of a conversation) only needs its new tokens to be processed.
+    The least recently used states are dropped when capacity_bytes is exceeded.
+    """
+    if capacity_bytes <= 0:
+        return
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from llama_cpp import LlamaRAMCache
+    except ImportError:
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from langchain.llms.llamacpp import LlamaCpp
+
+    for llm in find_instances(chain, LlamaCpp):
+        llm.client.set_cache(LlamaRAMCache(capacity_bytes=capacity_bytes))
+
+
+def get_chain_environment(
+    chain_config: dict, environment: Dict[str, str]
+) -> Dict[str, str]:
+    """
+    Return the part of the environment (e.g. the API keys of a user) read by the models of
+    the chain. Chains of local models get an empty environment, so they are loaded once for
+    all users. Chains with models of unknown types get the whole environment.
+    """
+    if not environment:
+        return {}
+    llm_configs = [
+        llm_config
+        for llm_config in find_config_values(chain_config, ("llm",))
+        if isinstance(llm_config, dict)
+    ]
+    if not llm_configs:
+        return dict(environment)
+    envvars: Set[str] = set()
+    for llm_config in llm_configs:
+        llm_type = llm_config.get("_type")
+        if llm_type not in LLM_TYPE_ENVVARS:
+            return dict(environment)
+        envvars.update(LLM_TYPE_ENVVARS[llm_type])
+    return {key: value for key, value in environment.items() if key in envvars}
+
+
+def inject_environment(
+    chain_config: dict, environment: Dict[str, str]
+) -> Optional[dict]:
+    """
+    Return a copy of the chain config with the environment variables (e.g. the API keys of a
+    user) set as fields of its models (e.g. OPENAI_API_KEY as openai_api_key), so the chain
+    can be loaded without changing the environment.
+    Return None if a model can only read them from the environment.
+    """
+    chain_config = copy.deepcopy(chain_config)
+    llm_configs = list(find_config_values(chain_config, ("llm",)))
+    if environment and not llm_configs:
+        return None
+    for llm_config in llm_configs:
+        if not isinstance(llm_config, dict):
+            return None
+        llm_type = llm_config.get("_type")
+        envvars = [
+            envvar
+            for envvar in LLM_TYPE_ENVVARS.get(llm_type, ())
+            if envvar in environment
+        ]
+        if llm_type not in LLM_TYPE_ENVVARS or (
+            envvars and llm_type in ENVIRONMENT_ONLY_LLM_TYPES
+        ):
+            return None
+        for envvar in envvars:
+            llm_config[envvar.lower()] = environment[envvar]
+    return chain_config
+
+
+def get_chain_key(
+    ai_id: int, chain_config: dict, environment: Optional[Dict[str, str]] = None
+) -> Tuple[int, str]:
+    """
+    Return the key identifying a specific version of a chain in the workers.
+    Chains loaded with the environment of a user (see get_chain_environment) get their own
+    key, so they are never used for other users.
+    """
+    config = [chain_config, environment] if environment else chain_config
+    config_hash = hashlib.sha256(
+        json.dumps(config, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return (ai_id, config_hash)
+
+
+def run_worker(
+    channel,
+    max_chains: int,
+    max_chain_bytes: int,
+    state_cache_bytes: int = DEFAULT_LLAMACPP_STATE_CACHE_BYTES,
+):
+    """
+    Main loop of a worker process: load chains on demand, keep them and run them.
+    The channel has to provide get() and put() to exchange messages with the parent.
+    Every llama.cpp model keeps up to state_cache_bytes of evaluated prompt states.
+    """
+    chains = LruCache(max_chains, max_chain_bytes)
+    while True:
+        message = channel.get()
+        if message is None:
+            return
+        message_type, payload = message
+        if message_type == "ping":
+            channel.put(("pong", None))
+        elif message_type == "invalidate":
+            for chain_key in chains.keys():
+                if payload is None or chain_key[0] == payload:
+                    chains.invalidate(chain_key)
+        elif message_type == "run":
+            chain_key = tuple(payload["chain_key"])
+            environment = payload["environment"]
+            chain = chains.get(chain_key)
+            if chain is None:
+                if payload["chain_config"] is None:
+                    channel.put(("missing_chain", None))
+                    continue
+                try:
+                    with worker_environment(environment):
+                        chain = load_chain_from_config(
+                            copy.deepcopy(payload["chain_config"])
+                        )
+                        set_text_generation_inference_token(chain)
+                        enable_llamacpp_state_cache(chain, state_cache_bytes)
+                # pylint: disable-next=broad-exception-caught
+                except Exception as exception:
+                    channel.put(("error", str(exception)))
+                    continue
+                chains.put(
+                    chain_key, chain, estimate_chain_size(payload["chain_config"])
+                )
+            if payload.get("task") == "summarize":
+                try:
+                    chain = get_summary_chain(chain)
+                # pylint: disable-next=broad-exception-caught
+                except Exception as exception:
+                    channel.put(("error", str(exception)))
+                    continue
+            with worker_environment(environment):
+                run_chain_process(
+                    chain,
+                    payload["inputs"],
+                    channel,
+                    payload.get("token_flush", (0, 0)),
+                )
+
+
+class ConnectionChannel:
+    """Provide get() and put() for a multiprocessing connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get(self):
+        """Receive the next message."""
+        return self.connection.recv()
+
+    def put(self, message):
+        """Send a message."""
+        self.connection.send(message)
+
+
+class Worker(ABC):
+    """A long-lived worker process as seen from the parent process."""
+
+    def __init__(
+        self,
+        max_chains: int,
+        max_chain_bytes: int,
+        state_cache_bytes: int = DEFAULT_LLAMACPP_STATE_CACHE_BYTES,
+    ):
+        self.max_chains = max_chains
+        self.max_chain_bytes = max_chain_bytes
+        self.state_cache_bytes = state_cache_bytes
+        self.process: Any = None
+        self.loaded_chains: Set[Hashable] = set()
+        self.pending_invalidations: List[Optional[int]] = []
+        self.last_used = 0.0
+
+    @abstractmethod
+    def start(self):
+        """Start the worker process."""
+
+    @abstractmethod
+    def send(self, message):
+        """Send a message to the worker process."""
+
+    @abstractmethod
+    def receive(self, timeout: float):
+        """
+        Return the next message of the worker process or None if the timeout expired.
+        Raises EOFError if the worker process died.
+        """
+
+    def is_alive(self) -> bool:
+        """Check if the worker process is running."""
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self):
+        """Stop the worker process."""
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(HEALTH_CHECK_TIMEOUT)
+        self.process = None
+        self.loaded_chains.clear()
+        self.pending_invalidations.clear()
+
+    def restart(self):
+        """Replace the worker process with a fresh one."""
+        self.stop()
+        self.start()
+
+    def ping(self) -> bool:
+        """Check if the worker process responds to messages."""
+        try:
+            self.send(("ping", None))
+            deadline = time.monotonic() + HEALTH_CHECK_TIMEOUT
+            while time.monotonic() < deadline:
+                message = self.receive(1)
+                if message is not None:
+                    return message[0] == "pong"
+        except (EOFError, OSError):
+            pass
+        return False
+
+
+class MultiprocessingWorker(Worker):
+    """Worker process started with multiprocessing (won't work with gevent)."""
+
+    def __init__(
+        self,
+        max_chains: int,
+        max_chain_bytes: int,
+        state_cache_bytes: int = DEFAULT_LLAMACPP_STATE_CACHE_BYTES,
+    ):
+        super().__init__(max_chains, max_chain_bytes, state_cache_bytes)
+        self.connection: Any = None
+
+    def start(self):
+        # pylint: disable-next=import-outside-toplevel
+        import multiprocessing
+
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=run_worker,
+            args=(
+                ConnectionChannel(child_connection),
+                self.max_chains,
+                self.max_chain_bytes,
+                self.state_cache_bytes,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+
+    def send(self, message):
+        self.connection.send(message)
+
+    def receive(self, timeout: float):
+        if self.connection.poll(timeout):
+            return self.connection.recv()
+        if not self.is_alive():
+            raise EOFError("The worker process died.")
+        return None
+
+    def stop(self):
+        super().stop()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class GeventWorker(Worker):
+    """Worker process started with gipc in the context of gevent."""
+
+    def __init__(
+        self,
+        max_chains: int,
+        max_chain_bytes: int,
+        state_cache_bytes: int = DEFAULT_LLAMACPP_STATE_CACHE_BYTES,
+    ):
+        super().__init__(max_chains, max_chain_bytes, state_cache_bytes)
+        self.handle: Any = None
+
+    def start(self):
+        # pylint: disable-next=import-outside-toplevel
+        import gipc
+
+        self.handle, child_handle = gipc.pipe(duplex=True)
+        self.process = gipc.start_process(
+            target=run_worker,
+            args=(
+                child_handle,
+                self.max_chains,
+                self.max_chain_bytes,
+                self.state_cache_bytes,
+            ),
+            daemon=True,
+        )
+
+    def send(self, message):
+        self.handle.put(message)
+
+    def receive(self, timeout: float):
+        # pylint: disable-next=import-outside-toplevel
+        import gevent
+
+        message = None
+        with gevent.Timeout(timeout, False) as gevent_timeout:
+            message = self.handle.get(timeout=gevent_timeout)
+        if message is None and not self.is_alive():
+            raise EOFError("The worker process died.")
+        return message
+
+    def stop(self):
+        super().stop()
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class WorkerPool:
+    """A fixed number of warm worker processes to run chains."""
+
+    def __init__(
+        self,
+        workers: List[Worker],
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+    ):
+        self.workers = workers
+        self.idle_workers = list(workers)
+        self.health_check_interval = health_check_interval
+        self.condition = Condition()
+        self.stopped = False
+
+    def acquire(self, chain_key: Hashable) -> Worker:
+        """Wait for an idle worker, preferring one that has already loaded the chain."""
+        with self.condition:
+            while not self.idle_workers:
+                self.condition.wait()
+            worker = next(
+                (w for w in self.idle_workers if chain_key in w.loaded_chains),
+                self.idle_workers[0],
+            )
+            self.idle_workers.remove(worker)
+        try:
+            self.ensure_healthy(worker)
+        except Exception:
+            self.release(worker)
+            raise
+        return worker
+
+    def release(self, worker: Worker):
+        """Return a worker to the pool of idle workers."""
+        worker.last_used = time.monotonic()
+        with self.condition:
+            self.idle_workers.append(worker)
+            self.condition.notify()
+
+    def ensure_healthy(self, worker: Worker):
+        """(Re)start the worker if it is not running or doesn't respond anymore."""
+        if not worker.is_alive():
+            worker.restart()
+        elif time.monotonic() - worker.last_used > self.health_check_interval:
+            if not worker.ping():
+                worker.restart()
+        while worker.pending_invalidations:
+            worker.send(("invalidate", worker.pending_invalidations.pop(0)))
+
+    def invalidate(self, ai_id: Optional[int] = None):
+        """Make all workers drop the chains of the AI (or all chains if ai_id is None)."""
+        for worker in self.workers:
+            worker.loaded_chains = {
+                chain_key
+                for chain_key in worker.loaded_chains
+                if ai_id is not None and chain_key[0] != ai_id
+            }
+            worker.pending_invalidations.append(ai_id)
+
+    def run_chain(
+        self,
+        ai_id: int,
+        chain_config: dict,
+        inputs: dict,
+        environment: Dict[str, str],
+        token_flush: Tuple[float, int] = (0, 0),
+        task: str = "reply",
+    ) -> Iterator[Optional[Tuple[str, Any]]]:
+        """
+        Run the chain in a worker and yield its messages (or None for every second without).
+        The chain config is only sent if the worker hasn't loaded the chain yet.
+        With the task "summarize", the model of the chain summarizes a conversation instead.
+        """
+        chain_key = get_chain_key(ai_id, chain_config, environment)
+        with process_spawn_seconds.time(ai_id=ai_id), span("process_spawn", warm=True):
+            worker = self.acquire(chain_key)
+        finished = False
+        try:
+            payload = {
+                "chain_key": chain_key,
+                "chain_config": None
+                if chain_key in worker.loaded_chains
+                else chain_config,
+                "inputs": inputs,
+                "environment": environment,
+                "token_flush": token_flush,
+                "task": task,
+            }
+            worker.send(("run", payload))
+            while True:
+                message = worker.receive(1)
+                if message is not None and message[0] == "missing_chain":
+                    worker.loaded_chains.discard(chain_key)
+                    worker.send(("run", {**payload, "chain_config": chain_config}))
+                    continue
+                if message is not None and message[0] in ("done", "error"):
+                    if message[0] == "done":
+                        worker.loaded_chains.add(chain_key)
+                    finished = True
+                    break
+                yield message
+        except (EOFError, OSError) as exception:
+            raise WorkerCrashedError(
+                "The AI worker process crashed. Please try again."
+            ) from exception
+        finally:
+            # A crashed worker or a worker that is still running an abandoned chain is replaced
+            # (unless the pool has been stopped, e.g. at interpreter shutdown).
+            if not finished and not self.stopped:
+                worker.restart()
+            self.release(worker)
+        yield message
+
+    def stop(self):
+        """Stop all worker processes."""
+        self.stopped = True
+        for worker in self.workers:
+            worker.stop()
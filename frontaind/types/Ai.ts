@@ -5,4 +5,5 @@ export interface Ai extends IdName {
   input_labels?: { [key: string]: string };
   chain: object;
   greeting?: string;
+  retrieval?: object;
 }
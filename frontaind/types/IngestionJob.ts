@@ -0,0 +1,14 @@
+export interface IngestionJob {
+  id: string;
+  knowledge_id: number;
+  document_name: string | null;
+  replace: boolean;
+  status: "queued" | "running" | "done" | "failed" | "cancelled";
+  chunks_total: number;
+  chunks_embedded: number;
+  chunks_skipped: number;
+  chunks_removed: number;
+  chunks_per_second: number;
+  error: string | null;
+  created: string;
+}
@@ -1,4 +1,6 @@
 export interface ProgressUpdate {
   messageId: number;
   progress: number;
+  queuePosition?: number;
+  secondsRemaining?: number;
 }
@@ -0,0 +1,30 @@
+"""Add vector store backend of knowledge
+
+Revision ID: 8a5c0e7d2f41
+Revises: 3dba1ccfa13d
+Create Date: 2026-10-18 10:12:45.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8a5c0e7d2f41"
+down_revision = "3dba1ccfa13d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("knowledge", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "vector_store", sa.String(), nullable=False, server_default="chroma"
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("knowledge", schema=None) as batch_op:
+        batch_op.drop_column("vector_store")
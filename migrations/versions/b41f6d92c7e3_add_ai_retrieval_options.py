@@ -0,0 +1,26 @@
+"""Add retrieval options of AIs
+
+Revision ID: b41f6d92c7e3
+Revises: 8a5c0e7d2f41
+Create Date: 2026-10-18 11:03:27.641902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b41f6d92c7e3"
+down_revision = "8a5c0e7d2f41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("ai", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("retrieval", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("ai", schema=None) as batch_op:
+        batch_op.drop_column("retrieval")
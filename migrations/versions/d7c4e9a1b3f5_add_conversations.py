@@ -0,0 +1,56 @@
+"""Add conversations
+
+Revision ID: d7c4e9a1b3f5
+Revises: b41f6d92c7e3
+Create Date: 2026-10-18 14:21:09.318264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d7c4e9a1b3f5"
+down_revision = "b41f6d92c7e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "conversation",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["user.id"], onupdate="CASCADE", ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "conversation_message",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("conversation_id", sa.String(), nullable=False),
+        sa.Column("author", sa.String(), nullable=False),
+        sa.Column("text", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["conversation_id"],
+            ["conversation.id"],
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("conversation_message", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_conversation_message_conversation_id"),
+            ["conversation_id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("conversation_message", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_conversation_message_conversation_id"))
+
+    op.drop_table("conversation_message")
+    op.drop_table("conversation")
@@ -0,0 +1,35 @@
+"""Add summaries of conversations
+
+Revision ID: e2a8f6c0d914
+Revises: d7c4e9a1b3f5
+Create Date: 2026-10-18 15:42:51.907316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e2a8f6c0d914"
+down_revision = "d7c4e9a1b3f5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("conversation", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("summary", sa.String(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                "summarized_messages",
+                sa.Integer(),
+                nullable=False,
+                server_default="0",
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("conversation", schema=None) as batch_op:
+        batch_op.drop_column("summarized_messages")
+        batch_op.drop_column("summary")
@@ -0,0 +1,36 @@
+"""Add last update of conversations
+
+Revision ID: f4b9d3e7a2c6
+Revises: e2a8f6c0d914
+Create Date: 2026-10-18 17:08:34.562190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f4b9d3e7a2c6"
+down_revision = "e2a8f6c0d914"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("conversation", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("updated", sa.DateTime(), nullable=True))
+
+    # existing conversations are kept for a full retention period
+    op.execute("UPDATE conversation SET updated = CURRENT_TIMESTAMP")
+
+    with op.batch_alter_table("conversation", schema=None) as batch_op:
+        batch_op.alter_column("updated", existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index(
+            batch_op.f("ix_conversation_updated"), ["updated"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("conversation", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_conversation_updated"))
+        batch_op.drop_column("updated")
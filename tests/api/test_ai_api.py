@@ -108,6 +108,19 @@ def test_delete_ai(client, auth, app):
             {"name": "Test", "input_keys": [], "chain": {}, "greeting": True},
             'The property "greeting" has to be a string.',
         ),
+        (
+            {"name": "Test", "input_keys": [], "chain": {}, "retrieval": {"k": 0}},
+            "The retrieval option k has to be a positive number.",
+        ),
+        (
+            {
+                "name": "Test",
+                "input_keys": [],
+                "chain": {},
+                "retrieval": {"mode": "keywords"},
+            },
+            "Unknown retrieval mode: keywords",
+        ),
     ),
 )
 def test_validation(client, auth, data, message):
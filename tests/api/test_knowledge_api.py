@@ -2,6 +2,7 @@
 import os
 import json
 import shutil
+import time
 
 from langchain.vectorstores.chroma import Chroma
 import pytest
@@ -11,6 +12,23 @@ from backaind.knowledge import get_knowledge
 from backaind.models import Knowledge
 
 
+def upload_and_wait(client, url, data):
+    """Upload a document and wait for its ingestion job to finish."""
+    response = client.post(
+        url, data=data, buffered=True, content_type="multipart/form-data"
+    )
+    assert response.status_code == 202
+    job = json.loads(response.data)
+    deadline = time.monotonic() + 60
+    while job["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline, "Timed out waiting for the upload job."
+        time.sleep(0.05)
+        job = json.loads(
+            client.get(f"/api/knowledge/1/job/{job['id']}").data  # type: ignore
+        )
+    return job
+
+
 def test_auth_required(client):
     """Test whether authorization is required to access the API."""
     assert client.get("/api/knowledge/").status_code == 401
@@ -23,6 +41,9 @@ def test_auth_required(client):
     assert client.delete("/api/knowledge/1").status_code == 401
     assert client.get("/api/knowledge/1/document").status_code == 401
     assert client.delete("/api/knowledge/1/document/test").status_code == 401
+    assert client.get("/api/knowledge/1/job").status_code == 401
+    assert client.get("/api/knowledge/1/job/test").status_code == 401
+    assert client.delete("/api/knowledge/1/job/test").status_code == 401
 
 
 def test_get_all_knowledge(client, auth):
@@ -93,6 +114,25 @@ def test_update_knowledge_does_not_update_embeddings(client, auth, app):
         )
 
 
+def test_update_knowledge_does_not_update_vector_store(client, auth):
+    """Test if the vector store cannot be changed afterwards."""
+    auth.login()
+    response = client.put(
+        "/api/knowledge/1",
+        json={
+            "name": "Test",
+            "embeddings": "huggingface",
+            "chunk_size": 500,
+            "vector_store": "hnswlib",
+        },
+    )
+    assert response.status_code == 400
+    assert (
+        json.loads(response.data)["error"]
+        == "Cannot change the vector store afterwards."
+    )
+
+
 def test_delete_knowledge(client, auth, app):
     """Test if DELETE /api/knowledge/1 deletes the entry."""
     os.makedirs("instance/test-knowledge-2")
@@ -108,12 +148,10 @@ def test_get_documents(client, auth):
     """Test if GET /api/knowledge/1/document returns all documents from the knowledge."""
     with client, open("tests/test_documents/test.txt", "rb") as file:
         auth.login()
-        client.post(
-            "/api/knowledge/1/document/txt",
-            data={"file": (file, "test.txt")},
-            buffered=True,
-            content_type="multipart/form-data",
+        job = upload_and_wait(
+            client, "/api/knowledge/1/document/txt", {"file": (file, "test.txt")}
         )
+        assert job["status"] == "done"
         response = client.get("/api/knowledge/1/document")
         assert 1 == len(json.loads(response.data)["items"])
 
@@ -127,12 +165,10 @@ def test_delete_document(client, auth):
     """Test if DELETE /api/knowledge/1/document/<id> deletes the document."""
     with client, open("tests/test_documents/test.txt", "rb") as file:
         auth.login()
-        client.post(
-            "/api/knowledge/1/document/txt",
-            data={"file": (file, "test.txt")},
-            buffered=True,
-            content_type="multipart/form-data",
+        job = upload_and_wait(
+            client, "/api/knowledge/1/document/txt", {"file": (file, "test.txt")}
         )
+        assert job["status"] == "done"
         response = client.get("/api/knowledge/1/document")
         document_id = json.loads(response.data)["items"][0]["id"]
         response = client.delete("/api/knowledge/1/document/" + document_id)
@@ -150,12 +186,10 @@ def test_upload_txt(client, auth):
     """Test uploading a txt document into knowledge."""
     with client, open("tests/test_documents/test.txt", "rb") as file:
         auth.login()
-        client.post(
-            "/api/knowledge/1/document/txt",
-            data={"file": (file, "test.txt")},
-            buffered=True,
-            content_type="multipart/form-data",
+        job = upload_and_wait(
+            client, "/api/knowledge/1/document/txt", {"file": (file, "test.txt")}
         )
+        assert job["status"] == "done"
         knowledge = get_knowledge(1)
         results = knowledge.similarity_search("txt")
         assert results.pop().page_content == "This is a txt test file."
@@ -169,12 +203,10 @@ def test_upload_pdf(client, auth):
     """Test uploading a pdf document into knowledge."""
     with client, open("tests/test_documents/test.pdf", "rb") as file:
         auth.login()
-        client.post(
-            "/api/knowledge/1/document/pdf",
-            data={"file": (file, "test.pdf")},
-            buffered=True,
-            content_type="multipart/form-data",
+        job = upload_and_wait(
+            client, "/api/knowledge/1/document/pdf", {"file": (file, "test.pdf")}
         )
+        assert job["status"] == "done"
         knowledge = get_knowledge(1)
         results = knowledge.similarity_search("pdf")
         assert results.pop().page_content == "This is a pdf test file."
@@ -188,12 +220,10 @@ def test_upload_docx(client, auth):
     """Test uploading a docx document into knowledge."""
     with client, open("tests/test_documents/test.docx", "rb") as file:
         auth.login()
-        client.post(
-            "/api/knowledge/1/document/docx",
-            data={"file": (file, "test.docx")},
-            buffered=True,
-            content_type="multipart/form-data",
+        job = upload_and_wait(
+            client, "/api/knowledge/1/document/docx", {"file": (file, "test.docx")}
         )
+        assert job["status"] == "done"
         knowledge = get_knowledge(1)
         results = knowledge.similarity_search("docx")
         assert results.pop().page_content == "This is a docx test file."
@@ -203,6 +233,40 @@ def test_upload_docx(client, auth):
         knowledge._collection.delete(where_document={"$contains": "test"})
 
 
+def test_upload_job_reports_progress(client, auth, monkeypatch):
+    """Test if an upload job embeds all chunks and exposes its progress."""
+    added = []
+
+    def fake_add_to_knowledge(_knowledge_id, chunks, _batch_size, on_batch):
+        added.extend(chunks)
+        on_batch(["id"] * len(added), 0, 0.1)
+        return ["id"] * len(added)
+
+    monkeypatch.setattr("backaind.ingestion.add_to_knowledge", fake_add_to_knowledge)
+    with client, open("tests/test_documents/test.txt", "rb") as file:
+        auth.login()
+        job = upload_and_wait(
+            client, "/api/knowledge/1/document/txt", {"file": (file, "test.txt")}
+        )
+        assert job["status"] == "done"
+        assert job["chunks_total"] == job["chunks_embedded"] == 1
+        assert job["chunks_per_second"] == 10
+        assert job["document_name"] == "test.txt"
+        assert not job["replace"]
+        assert added[0].metadata["document"] == "test.txt"
+        assert added[0].page_content == "This is a txt test file."
+
+        jobs = json.loads(client.get("/api/knowledge/1/job").data)
+        assert [entry["id"] for entry in jobs] == [job["id"]]
+        assert client.get(f"/api/knowledge/2/job/{job['id']}").status_code == 404
+
+
+def test_cancel_unknown_job_fails(client, auth):
+    """Test if cancelling a job that doesn't exist returns 404."""
+    auth.login()
+    assert client.delete("/api/knowledge/1/job/unknown").status_code == 404
+
+
 def test_upload_no_file_fails(client, auth):
     """Test if uploading no file fails."""
     with client:
@@ -240,6 +304,15 @@ def test_upload_no_file_fails(client, auth):
             {"name": "Test", "embeddings": "doesnotexist", "chunk_size": 500},
             "Unknown embeddings type.",
         ),
+        (
+            {
+                "name": "Test",
+                "embeddings": "huggingface",
+                "chunk_size": 500,
+                "vector_store": "doesnotexist",
+            },
+            "Unknown vector store.",
+        ),
         (
             {"name": "Test", "embeddings": "huggingface"},
             'The property "chunk_size" is required.',
@@ -5,18 +5,21 @@ import pytest
 
 from backaind import create_app
 from backaind.extensions import db
+from backaind.ingestion import reset_ingestion
 from backaind.models import User, Ai, Knowledge
 
 
 @pytest.fixture(name="app")
-def fixture_app():
+def fixture_app(tmp_path):
     """Factory function for the Flask server app fixture."""
+    # caches and logs are written to the instance folder, so every test gets its own
     app = create_app(
         {
             "TESTING": True,
             "SQLALCHEMY_DATABASE_URI": "sqlite:///testing.db",
             "SECRET_KEY": "Only4Testing",
-        }
+        },
+        str(tmp_path / "instance"),
     )
 
     with app.app_context():
@@ -26,6 +29,8 @@ def fixture_app():
 
     yield app
 
+    reset_ingestion()
+
 
 @pytest.fixture(name="client")
 def fixture_client(app):
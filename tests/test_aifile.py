@@ -51,6 +51,21 @@ def test_validate_aifile_raises_on_unknown_input_keys():
     assert "Unknown input key" in str(error.value)
 
 
+def test_validate_aifile_raises_on_unknown_retrieval_options():
+    """Test if the validation complains on unknown retrieval options."""
+    with pytest.raises(InvalidAifileError) as error:
+        validate_aifile(
+            {
+                "name": "test",
+                "aifileversion": 1,
+                "chain": {},
+                "retrieval": {"mode": "hybrid", "top_k": 3},
+            }
+        )
+
+    assert "Unknown retrieval option: top_k" in str(error.value)
+
+
 def test_get_input_keys_always_returns_set():
     """Test if get_input_keys always returns a (possibly empty) set."""
     assert get_input_keys(None) == set()
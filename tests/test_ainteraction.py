@@ -2,15 +2,21 @@
 import pytest
 
 from backaind.ainteraction import (
+    handle_clear_conversation,
     handle_incoming_message,
     get_ai_data,
     get_knowledge_data,
     is_ai_public,
     is_knowledge_public,
+    run_summary,
     send_progress,
     send_next_token,
     send_response,
 )
+from backaind.conversations import ActiveConversation
+from backaind.extensions import db
+from backaind.models import Conversation
+from backaind.scheduler import Scheduler, Ticket
 
 
 def test_no_public_ai_redirects_to_login(client, monkeypatch):
@@ -213,6 +219,40 @@ def test_handle_incoming_message_sends_error_message(client, auth, monkeypatch):
     assert EmitRecorder.status == "error"
 
 
+def test_handle_incoming_message_sends_error_if_queue_is_full(
+    client, auth, monkeypatch
+):
+    """Test whether a full queue is reported to the user without running the AI."""
+
+    class EmitRecorder:
+        """Helper class to record function call to emit()."""
+
+        text = None
+        status = None
+
+    def fake_emit(_event, _arg):
+        EmitRecorder.text = _arg["text"]
+        EmitRecorder.status = _arg["status"]
+
+    def fake_reply(*_args):
+        raise AssertionError("The AI should not be called if the queue is full.")
+
+    monkeypatch.setattr("backaind.ainteraction.emit", fake_emit)
+    monkeypatch.setattr("backaind.ainteraction.reply", fake_reply)
+    full_scheduler = Scheduler(max_queue_size=1)
+    full_scheduler.waiting.append(Ticket(0, 1, "other"))
+    monkeypatch.setattr("backaind.ainteraction.scheduler", full_scheduler)
+
+    auth.login()
+    with client:
+        client.get("/")
+        test_incoming_message["aiId"] = 1
+        handle_incoming_message(test_incoming_message)
+
+    assert str(EmitRecorder.text).startswith("Too many messages")
+    assert EmitRecorder.status == "error"
+
+
 def test_get_ai_data_returns_all_ais(app):
     """Test whether get_ai_data returns all AIs if only_public is false."""
     with app.app_context():
@@ -268,6 +308,34 @@ def test_send_progress_emits_progress(monkeypatch):
     assert EmitRecorder.event == "progress"
 
 
+def test_send_progress_emits_queue_position(monkeypatch):
+    """Test if a call to send_progress with a queue position includes it in the event."""
+
+    class EmitRecorder:
+        """Helper class to record function call to emit()."""
+
+        data = None
+
+    def fake_emit(_event, data):
+        EmitRecorder.data = data
+
+    monkeypatch.setattr("backaind.ainteraction.emit", fake_emit)
+    send_progress(1, 0, 3)
+
+    assert EmitRecorder.data == {"messageId": 1, "progress": 0, "queuePosition": 3}
+
+
+def test_send_progress_emits_seconds_remaining(monkeypatch):
+    """Test if the estimated seconds until the response is complete are rounded."""
+    emitted = []
+    monkeypatch.setattr(
+        "backaind.ainteraction.emit", lambda _event, data: emitted.append(data)
+    )
+    send_progress(1, 40, seconds_remaining=12.6)
+
+    assert emitted == [{"messageId": 1, "progress": 40, "secondsRemaining": 13}]
+
+
 def test_send_next_token_emits_token(monkeypatch):
     """Test if a call to send_next_token emits the 'token' event."""
 
@@ -300,3 +368,204 @@ def test_send_response_emits_message(monkeypatch):
     send_response(1, "message_text")
 
     assert EmitRecorder.event == "message"
+
+
+def test_handle_incoming_message_keeps_conversation(client, auth, monkeypatch):
+    """Test whether messages of a conversation reuse the memory kept on the server."""
+    memories = []
+
+    def fake_reply(
+        _ai_id,
+        input_text,
+        _knowledge_id,
+        memory,
+        _on_token,
+        _on_progress,
+        _updated_environment,
+    ):
+        memories.append((memory, len(memory.chat_memory.messages)))
+        return f"Answer to {input_text}"
+
+    monkeypatch.setattr("backaind.ainteraction.emit", lambda _event, _arg: None)
+    monkeypatch.setattr("backaind.ainteraction.reply", fake_reply)
+
+    auth.login()
+    with client:
+        client.get("/")
+        for text in ("Hi!", "How are you?"):
+            handle_incoming_message(
+                {
+                    "responseId": 1,
+                    "message": {"text": text},
+                    "aiId": 1,
+                    "conversationId": "0123456789abcdef0123456789abcdef",
+                }
+            )
+
+    assert memories[0][0] is memories[1][0]
+    assert [count for _memory, count in memories] == [0, 2]
+
+
+def test_handle_clear_conversation_deletes_conversation(client, auth, monkeypatch):
+    """Test whether a conversation cleared by the user is deleted on the server."""
+    monkeypatch.setattr("backaind.ainteraction.emit", lambda _event, _arg: None)
+    monkeypatch.setattr("backaind.ainteraction.reply", lambda *_args: "Hello!")
+    conversation_id = "0123456789abcdef0123456789abcdef"
+
+    auth.login()
+    with client:
+        client.get("/")
+        handle_incoming_message(
+            {
+                "responseId": 1,
+                "message": {"text": "Hi!"},
+                "aiId": 1,
+                "conversationId": conversation_id,
+            }
+        )
+        assert db.session.get(Conversation, conversation_id) is not None
+        handle_clear_conversation({"conversationId": conversation_id})
+        assert db.session.get(Conversation, conversation_id) is None
+        # invalid or unknown conversations are ignored
+        handle_clear_conversation({"conversationId": None})
+
+
+def test_handle_incoming_message_rejects_foreign_conversation(
+    client, auth, monkeypatch
+):
+    """Test whether a conversation of another user is answered with an error."""
+
+    class EmitRecorder:
+        """Helper class to record function call to emit()."""
+
+        text = None
+        status = None
+
+    def fake_emit(_event, _arg):
+        EmitRecorder.text = _arg["text"]
+        EmitRecorder.status = _arg["status"]
+
+    def fake_reply(*_args):
+        return "Fake response"
+
+    monkeypatch.setattr("backaind.ainteraction.emit", fake_emit)
+    monkeypatch.setattr("backaind.ainteraction.reply", fake_reply)
+    message = {
+        "responseId": 1,
+        "message": {"text": "Hi!"},
+        "aiId": 1,
+        "conversationId": "0123456789abcdef0123456789abcdef",
+    }
+
+    with client:
+        auth.login()
+        client.get("/")
+        handle_incoming_message(message)
+        assert EmitRecorder.status == "done"
+        auth.logout()
+        client.get("/")
+        handle_incoming_message(message)
+
+    assert EmitRecorder.text == "Unknown conversation."
+    assert EmitRecorder.status == "error"
+
+
+def test_handle_incoming_message_summarizes_in_background(client, auth, monkeypatch):
+    """Test whether older messages are summarized after the response has been sent."""
+    events = []
+
+    def fake_reply(_ai_id, input_text, _knowledge_id, memory, *_args):
+        events.append(("reply", memory.load_memory_variables({})["history"]))
+        return f"Answer to {input_text}"
+
+    def fake_summarize(_ai_id, summary, messages, _updated_environment):
+        events.append(("summarize", len(messages)))
+        return summary + "Summary"
+
+    def fake_start_background_task(target, *args):
+        events.append(("background", None))
+        target(*args)
+
+    monkeypatch.setattr("backaind.ainteraction.emit", lambda _event, _arg: None)
+    monkeypatch.setattr("backaind.ainteraction.reply", fake_reply)
+    monkeypatch.setattr("backaind.ainteraction.summarize", fake_summarize)
+    monkeypatch.setattr(
+        "backaind.ainteraction.socketio.start_background_task",
+        fake_start_background_task,
+    )
+    monkeypatch.setattr("backaind.conversations.conversation_memory", "summary")
+    monkeypatch.setattr("backaind.conversations.conversation_summary_tokens", 10)
+
+    auth.login()
+    with client:
+        client.get("/")
+        for text in ("one two three", "four five six", "seven"):
+            handle_incoming_message(
+                {
+                    "responseId": 1,
+                    "message": {"text": text},
+                    "aiId": 1,
+                    "conversationId": "0123456789abcdef0123456789abcdef",
+                }
+            )
+
+    assert events[:4] == [
+        ("reply", ""),
+        ("reply", "Human: one two three\nAI: Answer to one two three"),
+        ("background", None),
+        ("summarize", 2),
+    ]
+    assert events[4] == (
+        "reply",
+        "System: Summary\nHuman: four five six\nAI: Answer to four five six",
+    )
+
+
+def test_run_summary_waits_for_scheduler_slot(app, monkeypatch):
+    """Test whether summaries count towards the limits of the scheduler."""
+    scheduler = Scheduler()
+    conversation = ActiveConversation(
+        "0123456789abcdef0123456789abcdef", 1, 10, "summary"
+    )
+    conversation.is_summarizing = True
+    running = []
+
+    def fake_summarize(ai_id, summary, _messages, _updated_environment):
+        running.append(scheduler.running.get(ai_id))
+        return summary
+
+    monkeypatch.setattr("backaind.ainteraction.scheduler", scheduler)
+    monkeypatch.setattr("backaind.ainteraction.summarize", fake_summarize)
+    run_summary(app, conversation, [], 1, "user", {})
+    assert running == [1]
+    assert not scheduler.running
+    assert not conversation.is_summarizing
+
+
+def test_run_summary_is_postponed_if_queue_is_full(app, monkeypatch):
+    """Test whether summaries are skipped (until the next turn) if the queue is full."""
+    scheduler = Scheduler(max_queue_size=1)
+    scheduler.waiting.append(Ticket(0, 2, "other user"))
+    conversation = ActiveConversation(
+        "0123456789abcdef0123456789abcdef", 1, 10, "summary"
+    )
+    conversation.is_summarizing = True
+
+    def fake_summarize(*_args):
+        raise AssertionError("The summary should not run without a slot.")
+
+    monkeypatch.setattr("backaind.ainteraction.scheduler", scheduler)
+    monkeypatch.setattr("backaind.ainteraction.summarize", fake_summarize)
+    run_summary(app, conversation, [], 1, "user", {})
+    assert not conversation.is_summarizing
+
+
+def test_index_supports_conditional_requests(client):
+    """Test whether an unchanged ainteraction page is answered with 304 Not Modified."""
+    response = client.get("/")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert not response.data
@@ -0,0 +1,137 @@
+"""Test the benchmarks of the chat and knowledge paths."""
+import json
+
+from langchain.embeddings import fake
+import numpy as np
+
+from backaind.bench import (
+    bench,
+    generate_synthetic_documents,
+    get_benchmark_aifile,
+    get_exact_neighbors,
+    get_max_concurrent_sessions,
+)
+from backaind.extensions import db
+from backaind.models import Ai, Knowledge
+
+
+def test_synthetic_documents_are_reproducible():
+    """Test if the synthetic knowledge is the same for the same seed."""
+    documents = generate_synthetic_documents(3, words=5, seed=1)
+    assert len(documents) == 3
+    assert len(documents[0].page_content.split()) == 5
+    assert documents == generate_synthetic_documents(3, words=5, seed=1)
+
+
+def test_benchmark_aifile_uses_knowledge_if_requested():
+    """Test if the benchmark AI only asks for knowledge if it has any."""
+    with_knowledge = get_benchmark_aifile(3, True)
+    without_knowledge = get_benchmark_aifile(3, False)
+    assert with_knowledge["chain"]["input_key"] == "input_knowledge"
+    assert without_knowledge["chain"]["llm"] == {
+        "_type": "fake-list",
+        "responses": ["token token token"],
+    }
+
+
+def test_max_concurrent_sessions_respects_latency_and_errors():
+    """Test if the max concurrent sessions are the most sessions within the limits."""
+    levels = [
+        {"sessions": 1, "errors": 0, "latency_ms": {"p95": 10}},
+        {"sessions": 2, "errors": 0, "latency_ms": {"p95": 20}},
+        {"sessions": 4, "errors": 1, "latency_ms": {"p95": 30}},
+        {"sessions": 8, "errors": 0, "latency_ms": {"p95": 500}},
+    ]
+    assert get_max_concurrent_sessions(levels, 100) == 2
+    assert get_max_concurrent_sessions(levels, 5) == 0
+
+
+def test_bench_chat_command_measures_both_paths(app, runner, tmp_path, monkeypatch):
+    """Test if the chat benchmark answers all messages and removes its AI and knowledge."""
+    monkeypatch.setattr(
+        "backaind.knowledge.get_embeddings", lambda _type: fake.FakeEmbeddings(size=8)
+    )
+    with app.app_context():
+        output = tmp_path / "results.json"
+        result = runner.invoke(
+            bench,
+            [
+                "chat",
+                "--sessions",
+                "1,2",
+                "--messages",
+                "2",
+                "--response-tokens",
+                "5",
+                "--knowledge-documents",
+                "5",
+                "--output",
+                str(output),
+            ],
+        )
+    assert result.exit_code == 0, result.output
+    assert "reply with 2 sessions: 4 messages, 0 errors" in result.output
+    assert "socketio with 2 sessions: 4 messages, 0 errors" in result.output
+
+    results = json.loads(output.read_text(encoding="utf-8"))
+    for path in ("reply", "socketio"):
+        assert results["paths"][path]["max_concurrent_sessions"] == 2
+        assert set(results["paths"][path]["levels"][0]["ttft_ms"]) == {
+            "p50",
+            "p95",
+            "p99",
+            "max",
+        }
+
+    with app.app_context():
+        assert db.session.query(Ai).filter_by(name="ownAI Benchmark").count() == 0
+        assert (
+            db.session.query(Knowledge).filter_by(name="ownAI Benchmark").count() == 0
+        )
+
+
+def test_exact_neighbors_are_the_closest_vectors():
+    """Test if the brute force ground truth returns the k nearest vectors."""
+    corpus = np.array([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0], [0.0, 1.5]])
+    assert get_exact_neighbors(corpus, np.array([0.1, 0.0]), 2) == {0, 1}
+    assert get_exact_neighbors(corpus, np.array([0.1, 0.0]), 10) == {0, 1, 2, 3}
+
+
+def test_bench_retrieval_command_reports_recall(app, runner, tmp_path):
+    """Test if the retrieval benchmark reports latency, size and recall per store size."""
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("apples\n\nrivers\nrockets\ngardens\n", encoding="utf-8")
+    output = tmp_path / "results.json"
+    with app.app_context():
+        result = runner.invoke(
+            bench,
+            [
+                "retrieval",
+                "--corpus",
+                str(corpus),
+                "--chunks",
+                "2,10",
+                "--queries",
+                "3",
+                "-k",
+                "2",
+                "--dimensions",
+                "8",
+                "--output",
+                str(output),
+            ],
+        )
+    assert result.exit_code == 0, result.output
+    assert "chroma with 2 chunks" in result.output
+    assert "chroma with 4 chunks" in result.output
+    assert "hnswlib with 4 chunks" in result.output
+
+    results = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert [(entry["backend"], entry["chunks"]) for entry in results] == [
+        ("chroma", 2),
+        ("chroma", 4),
+        ("hnswlib", 2),
+        ("hnswlib", 4),
+    ]
+    assert all(entry["recall_at_k"] == 1.0 for entry in results)
+    assert all(entry["disk_bytes"] > 0 for entry in results)
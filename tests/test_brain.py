@@ -3,25 +3,39 @@ import os
 import queue
 
 from langchain.chains.loading import load_chain_from_config
+from langchain.docstore.document import Document
 from langchain.llms.huggingface_text_gen_inference import HuggingFaceTextGenInference
 from langchain.memory import ConversationBufferWindowMemory
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain.schema import AIMessage, HumanMessage
 import pytest
 
 from backaind.aifile import read_aifile_from_path
+from backaind.context import ContextPacker
 from backaind.brain import (
-    find_instances,
+    ChainError,
+    process_chain_messages,
     get_chain,
+    get_chain_inputs,
+    get_worker_pool,
     reply,
     reset_global_chain,
+    reset_worker_pool,
     run_chain_on_gunicorn,
     run_chain_on_multiprocessing,
-    run_chain_process,
-    set_text_generation_inference_token,
-    estimate_processing_time,
-    UpdatedEnvironment,
+    summarize,
 )
 import backaind.brain
+from backaind.conversations import SummaryBufferMemory
+from backaind.latency import LatencyModel
 from backaind.models import Ai
+from backaind.workers import (
+    estimate_chain_size,
+    find_instances,
+    run_chain_process,
+    set_text_generation_inference_token,
+    ChainRequest,
+)
 
 
 class FakeChain:
@@ -38,11 +52,9 @@ class FakeChain:
         return {"output_text": output}
 
 
-def test_get_chain_loads_from_global_chain():
-    """Test if the chain is loaded from the global chain instance."""
-    backaind.brain.global_chain = "NotARealChain"
-    backaind.brain.global_chain_id = 1
-    backaind.brain.global_chain_input_keys = set("text_input")
+def test_get_chain_loads_from_chain_cache():
+    """Test if the chain is loaded from the chain cache."""
+    backaind.brain.chain_cache.put(1, ("NotARealChain", set("text_input"), 0))
     (chain, chain_input_keys) = get_chain(1)
     assert chain == "NotARealChain"
     assert chain_input_keys == set("text_input")
@@ -62,17 +74,64 @@ def test_get_chain_creates_new_chain(monkeypatch):
     monkeypatch.setattr("backaind.brain.load_chain_from_config", lambda chain: chain)
     (chain, _chain_input_keys) = get_chain(1)
     assert chain == {"name": "NotARealChain"}
-    assert backaind.brain.global_chain == {"name": "NotARealChain"}
+    assert 1 in backaind.brain.chain_cache
     reset_global_chain()
 
 
+def test_get_chain_keeps_multiple_chains(monkeypatch):
+    """Test if multiple chains are kept in the chain cache at the same time."""
+    reset_global_chain()
+
+    class LoadRecorder:
+        """Helper class to record the calls to load_chain_from_config."""
+
+        loaded = 0
+
+    def fake_load_chain_from_config(chain):
+        LoadRecorder.loaded += 1
+        return chain
+
+    monkeypatch.setattr(
+        "backaind.extensions.db.get_or_404",
+        lambda _model, model_id: Ai(
+            input_keys=["input_text"],
+            chain={"name": f"Chain {model_id}"},
+        ),
+    )
+    monkeypatch.setattr(
+        "backaind.brain.load_chain_from_config", fake_load_chain_from_config
+    )
+    backaind.brain.chain_cache.configure(max_entries=2)
+    assert get_chain(1)[0] == {"name": "Chain 1"}
+    assert get_chain(2)[0] == {"name": "Chain 2"}
+    assert get_chain(1)[0] == {"name": "Chain 1"}
+    assert LoadRecorder.loaded == 2
+
+    reset_global_chain(2)
+    assert 1 in backaind.brain.chain_cache
+    assert 2 not in backaind.brain.chain_cache
+    reset_global_chain()
+
+
+def test_estimate_chain_size(tmp_path):
+    """Test if the chain size is estimated by the size of referenced model files."""
+    model_file = tmp_path / "model.gguf"
+    model_file.write_bytes(b"0" * 100)
+    chain_config = {
+        "llm": {"_type": "llamacpp", "model_path": str(model_file)},
+        "prompt": {"template": "{input_text}"},
+        "chains": [{"llm": {"model": str(model_file)}}, {"llm": {"model": "gpt"}}],
+    }
+    assert estimate_chain_size(chain_config) == 200
+
+
 def test_reply_runs_the_chain(monkeypatch):
     """Test if the reply function runs the chain."""
 
-    def fake_get_chain(_ai_id, _updated_environment):
+    def fake_get_chain(_ai_id, _environment=None):
         return (FakeChain(), set(("input_text", "input_knowledge", "input_history")))
 
-    def fake_run(chain, inputs, _on_token, _on_progress):
+    def fake_run(chain, inputs, _on_token, _on_progress, _ai_id):
         return chain(inputs)["output_text"]
 
     monkeypatch.setattr("backaind.brain.get_chain", fake_get_chain)
@@ -85,7 +144,7 @@ def test_reply_runs_the_chain(monkeypatch):
 def test_reply_sets_inputs(monkeypatch):
     """Test if the reply function correctly sets the inputs for the chain."""
 
-    def fake_get_chain(_ai_id, _updated_environment):
+    def fake_get_chain(_ai_id, _environment=None):
         return (
             FakeChain(),
             {"input_text", "input_knowledge", "input_history", "input_unknown"},
@@ -101,11 +160,11 @@ def test_reply_sets_inputs(monkeypatch):
     def fake_get_knowledge(_knowledge_id):
         return FakeKnowledge()
 
-    def fake_run(chain, inputs, _on_token, _on_progress):
+    def fake_run(chain, inputs, _on_token, _on_progress, _ai_id):
         return chain(inputs)["output_text"]
 
     monkeypatch.setattr("backaind.brain.get_chain", fake_get_chain)
-    monkeypatch.setattr("backaind.brain.get_knowledge", fake_get_knowledge)
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", fake_get_knowledge)
     monkeypatch.setattr("backaind.brain.run_chain_on_multiprocessing", fake_run)
 
     response = reply(1, "Hi", 1)
@@ -121,6 +180,151 @@ def test_reply_sets_inputs(monkeypatch):
     assert response == "Hi,['Hi'],AI: Hi user\nHuman: Hi AI"
 
 
+def test_get_chain_inputs_uses_retrieval_options(monkeypatch):
+    """Test if the knowledge is searched with the retrieval options of the AI."""
+    searches = []
+
+    def fake_search_knowledge(_knowledge_id, _query, **kwargs):
+        searches.append(kwargs)
+        return []
+
+    monkeypatch.setattr("backaind.brain.search_knowledge", fake_search_knowledge)
+    retrieval = {"mode": "hybrid", "k": 3, "k_with_history": 2, "candidates": 10}
+    memory = ConversationBufferWindowMemory(k=3)
+    memory.chat_memory.add_user_message("Hi AI")
+    input_keys = {"input_knowledge", "input_history"}
+    get_chain_inputs(input_keys, "Hi", 1, None, retrieval)
+    get_chain_inputs(input_keys, "Hi", 1, memory, retrieval)
+    get_chain_inputs(input_keys, "Hi", 1)
+    assert searches == [
+        {"k": 3, "mode": "hybrid", "candidates": 10, "reranker": None},
+        {"k": 2, "mode": "hybrid", "candidates": 10, "reranker": None},
+        {"k": 4, "mode": "vector", "candidates": 20, "reranker": None},
+    ]
+
+
+def test_get_chain_inputs_packs_context(monkeypatch):
+    """Test if a context packer chooses the chunks and history fitting into the prompt."""
+    documents = [Document(page_content="chunk " * 20), Document(page_content="chunk")]
+    monkeypatch.setattr(
+        "backaind.brain.search_knowledge", lambda *_args, **_kwargs: documents
+    )
+    memory = ConversationBufferWindowMemory(k=1)
+    for number in range(3):
+        memory.chat_memory.add_user_message(f"Question {number}")
+        memory.chat_memory.add_ai_message(f"Answer {number}")
+    packer = ContextPacker(100, 10, count_tokens=lambda text: len(text.split()))
+
+    inputs = get_chain_inputs(
+        {"input_text", "input_knowledge", "input_history"},
+        "Hi",
+        1,
+        memory,
+        None,
+        packer,
+    )
+    assert inputs["input_knowledge"] == documents
+    # the packer uses more turns than the window of the memory if they fit
+    assert inputs["input_history"].count("Question") == 3
+
+    # 16 tokens are left for the smaller chunk and the two most recent turns
+    packer = ContextPacker(30, 10, count_tokens=lambda text: len(text.split()))
+    inputs = get_chain_inputs(
+        {"input_text", "input_knowledge", "input_history"},
+        "Hi",
+        1,
+        memory,
+        None,
+        packer,
+    )
+    assert inputs["input_knowledge"] == [documents[1]]
+    assert inputs["input_history"] == (
+        "Human: Question 1\nAI: Answer 1\nHuman: Question 2\nAI: Answer 2"
+    )
+
+
+def test_get_chain_inputs_starts_history_with_summary():
+    """Test if the summary of a summarizing memory precedes the recent messages."""
+    memory = SummaryBufferMemory(moving_summary_buffer="They said hello.")
+    memory.chat_memory.add_user_message("How are you?")
+    memory.chat_memory.add_ai_message("Fine.")
+    expected = "System: They said hello.\nHuman: How are you?\nAI: Fine."
+
+    inputs = get_chain_inputs(["input_text", "input_history"], "Hi", None, memory)
+    assert inputs["input_history"] == expected
+
+    inputs = get_chain_inputs(
+        ["input_text", "input_history"],
+        "Hi",
+        None,
+        memory,
+        None,
+        ContextPacker(1000, 10),
+    )
+    assert inputs["input_history"] == expected
+
+
+def test_summarize_uses_model_of_the_ai(monkeypatch):
+    """Test if conversations are summarized by the model of the AI in a separate process."""
+    aifile = read_aifile_from_path("examples/fake-list/fake-ai.aifile")
+    chain = load_chain_from_config(aifile["chain"])
+    runs = []
+
+    def fake_run_chain_on_multiprocessing(summary_chain, inputs, *_args):
+        runs.append((summary_chain, inputs))
+        return summary_chain(inputs)["output_text"] + " "
+
+    monkeypatch.setattr(
+        "backaind.brain.get_chain",
+        lambda _ai_id, _environment=None: (chain, ["input_text"]),
+    )
+    monkeypatch.setattr(
+        "backaind.brain.run_chain_on_multiprocessing",
+        fake_run_chain_on_multiprocessing,
+    )
+
+    summary = summarize(
+        1, "Old summary", [HumanMessage(content="Hi"), AIMessage(content="Hello")]
+    )
+    assert summary == "Hello"
+    (summary_chain, inputs) = runs[0]
+    assert summary_chain.llm is chain.llm
+    assert summary_chain.prompt == SUMMARY_PROMPT
+    assert inputs == {"summary": "Old summary", "new_lines": "Human: Hi\nAI: Hello"}
+
+
+def test_reply_uses_response_cache(monkeypatch):
+    """Test if cached responses are streamed without running the chain again."""
+    runs = []
+
+    def fake_get_chain(_ai_id, _environment=None):
+        return (FakeChain(), {"input_text", "input_knowledge"})
+
+    def fake_run(chain, inputs, _on_token, _on_progress, _ai_id):
+        runs.append(inputs)
+        return chain({**inputs, "input_history": ""})["output_text"]
+
+    monkeypatch.setattr("backaind.brain.get_chain", fake_get_chain)
+    monkeypatch.setattr("backaind.brain.run_chain_on_multiprocessing", fake_run)
+    monkeypatch.setattr(
+        "backaind.extensions.db.get_or_404",
+        lambda _model, _model_id: Ai(chain={"name": "Chain"}),
+    )
+    backaind.brain.response_cache.configure(max_entries=10, ttl=0)
+    tokens = []
+    try:
+        assert reply(1, "Hi there", None) == "Hi there,[],"
+        assert reply(1, "hi there?", None, on_token=tokens.append) == "Hi there,[],"
+        assert len(runs) == 1
+        assert "".join(tokens) == "Hi there,[],"
+
+        reset_global_chain(1)
+        reply(1, "Hi there", None)
+        assert len(runs) == 2
+    finally:
+        backaind.brain.response_cache.configure(max_entries=0, ttl=0)
+
+
 def test_reply_chooses_the_right_way_of_processing(monkeypatch):
     """Test if the reply function chooses between gipc and multiprocessing."""
 
@@ -130,14 +334,16 @@ def test_reply_chooses_the_right_way_of_processing(monkeypatch):
         run_on_gunicorn = False
         run_on_multiprocessing = False
 
-    def fake_get_chain(_ai_id, _updated_environment):
+    def fake_get_chain(_ai_id, _environment=None):
         return (FakeChain(), set(("input_text", "input_knowledge", "input_history")))
 
-    def fake_run_chain_on_multiprocessing(chain, inputs, _on_token, _on_progress):
+    def fake_run_chain_on_multiprocessing(
+        chain, inputs, _on_token, _on_progress, _ai_id
+    ):
         RunRecorder.run_on_multiprocessing = True
         return chain(inputs)["output_text"]
 
-    def fake_run_chain_on_gunicorn(chain, inputs, _on_token, _on_progress):
+    def fake_run_chain_on_gunicorn(chain, inputs, _on_token, _on_progress, _ai_id):
         RunRecorder.run_on_gunicorn = True
         return chain(inputs)["output_text"]
 
@@ -157,11 +363,148 @@ def test_reply_chooses_the_right_way_of_processing(monkeypatch):
     RunRecorder.run_on_multiprocessing = False
     RunRecorder.run_on_gunicorn = False
 
-    with UpdatedEnvironment({"SERVER_SOFTWARE": "gunicorn"}):
-        response = reply(1, "Hi", None)
-        assert response == "Hi,[],"
-        assert not RunRecorder.run_on_multiprocessing
-        assert RunRecorder.run_on_gunicorn
+    monkeypatch.setenv("SERVER_SOFTWARE", "gunicorn")
+    response = reply(1, "Hi", None)
+    assert response == "Hi,[],"
+    assert not RunRecorder.run_on_multiprocessing
+    assert RunRecorder.run_on_gunicorn
+
+
+def test_reply_loads_chain_with_environment_in_child_process(monkeypatch):
+    """Test if chains only reading API keys from the environment are loaded by the child."""
+    runs = []
+    chain_config = {"llm": {"_type": "vertexai"}}
+
+    def fake_get_chain(_ai_id, _environment=None):
+        raise AssertionError("The chain should not be loaded in the parent process.")
+
+    def fake_run(chain, inputs, _on_token, _on_progress, _ai_id):
+        runs.append(chain)
+        return inputs["input_text"]
+
+    monkeypatch.setattr("backaind.brain.get_chain", fake_get_chain)
+    monkeypatch.setattr("backaind.brain.run_chain_on_multiprocessing", fake_run)
+    monkeypatch.setattr(
+        "backaind.extensions.db.get_or_404",
+        lambda _model, _model_id: Ai(chain=chain_config, input_keys=["input_text"]),
+    )
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+    environment = {
+        "GOOGLE_APPLICATION_CREDENTIALS": "key.json",
+        "OPENAI_API_KEY": "key",
+    }
+
+    assert reply(1, "Hi", None, updated_environment=environment) == "Hi"
+    assert runs == [
+        ChainRequest(chain_config, {"GOOGLE_APPLICATION_CREDENTIALS": "key.json"})
+    ]
+    assert os.getenv("GOOGLE_APPLICATION_CREDENTIALS") is None
+
+
+@pytest.mark.parametrize(
+    "llm_type,expected_environment",
+    (("llamacpp", None), ("openai", {"OPENAI_API_KEY": "key"})),
+)
+def test_reply_loads_chain_with_used_api_keys_only(
+    monkeypatch, llm_type, expected_environment
+):
+    """Test if chains only get the API keys their models use (and local models none)."""
+    environments = []
+
+    def fake_get_chain(_ai_id, environment=None):
+        environments.append(environment or None)
+        return (FakeChain(), {"input_text", "input_knowledge", "input_history"})
+
+    monkeypatch.setattr("backaind.brain.get_chain", fake_get_chain)
+    monkeypatch.setattr(
+        "backaind.brain.run_chain_on_multiprocessing",
+        lambda chain, inputs, _on_token, _on_progress, _ai_id: chain(inputs)[
+            "output_text"
+        ],
+    )
+    monkeypatch.setattr(
+        "backaind.extensions.db.get_or_404",
+        lambda _model, _model_id: Ai(chain={"llm": {"_type": llm_type}}),
+    )
+    environment = {"OPENAI_API_KEY": "key", "COHERE_API_KEY": "other key"}
+    assert reply(1, "Hi", None, updated_environment=environment) == "Hi,[],"
+    assert environments == [expected_environment]
+
+
+def test_get_chain_caches_chains_per_environment(monkeypatch):
+    """Test if chains with API keys are loaded with them as fields and cached per user."""
+    reset_global_chain()
+    loaded = []
+
+    def fake_load_chain_from_config(chain_config):
+        loaded.append(chain_config)
+        return chain_config
+
+    monkeypatch.setattr(
+        "backaind.extensions.db.get_or_404",
+        lambda _model, _model_id: Ai(
+            input_keys=["input_text"], chain={"llm": {"_type": "openai"}}
+        ),
+    )
+    monkeypatch.setattr(
+        "backaind.brain.load_chain_from_config", fake_load_chain_from_config
+    )
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    for _ in range(2):
+        get_chain(1, {"OPENAI_API_KEY": "key 1"})
+        get_chain(1, {"OPENAI_API_KEY": "key 2"})
+    assert loaded == [
+        {"llm": {"_type": "openai", "openai_api_key": "key 1"}},
+        {"llm": {"_type": "openai", "openai_api_key": "key 2"}},
+    ]
+    assert os.getenv("OPENAI_API_KEY") is None
+    assert 1 not in backaind.brain.chain_cache
+
+    reset_global_chain(1)
+    assert not backaind.brain.user_chain_cache.keys()
+
+
+def test_reply_uses_worker_pool_if_configured(app, monkeypatch):
+    """Test if the reply function runs the chain in the worker pool if it's enabled."""
+
+    def fake_get_chain(_ai_id, _environment=None):
+        raise AssertionError("The chain should not be loaded in the parent process.")
+
+    def fake_run_chain_on_worker_pool(
+        ai_id, chain_config, inputs, _on_token, _on_progress, _updated_environment
+    ):
+        return f"{ai_id},{chain_config['_type']},{inputs['input_text']}"
+
+    monkeypatch.setattr("backaind.brain.get_chain", fake_get_chain)
+    monkeypatch.setattr(
+        "backaind.brain.run_chain_on_worker_pool", fake_run_chain_on_worker_pool
+    )
+    app.config["WORKER_POOL_SIZE"] = 1
+    with app.app_context():
+        assert reply(1, "Hi", None) == "1,llm_chain,Hi"
+
+
+def test_get_worker_pool_uses_configured_size(app):
+    """Test if the worker pool is created with the configured number of workers."""
+    reset_worker_pool()
+    app.config["WORKER_POOL_SIZE"] = 3
+    with app.app_context():
+        assert len(get_worker_pool().workers) == 3
+        assert get_worker_pool() is get_worker_pool()
+    reset_global_chain(1)
+    reset_worker_pool()
+
+
+def test_process_chain_messages_raises_chain_errors():
+    """Test if errors reported by the chain process are raised as ChainError."""
+    with pytest.raises(ChainError) as error:
+        process_chain_messages(
+            iter([None, ("prompts", ["testprompt"]), ("error", "Test Error")]),
+            None,
+            None,
+        )
+    assert str(error.value) == "Test Error"
 
 
 def test_run_chain_on_gunicorn(monkeypatch):
@@ -197,7 +540,7 @@ def test_run_chain_on_gunicorn(monkeypatch):
     def fake_on_token(token):
         OnTokenRecorder.token = token
 
-    def fake_on_progress(_progress):
+    def fake_on_progress(_progress, _seconds_remaining):
         pass
 
     monkeypatch.setattr("gipc.start_process", fake_start_process)
@@ -268,10 +611,9 @@ def test_run_chain_on_multiprocessing(monkeypatch):
     def fake_on_token(token):
         OnTokenRecorder.token = token
 
-    def fake_on_progress(_progress):
+    def fake_on_progress(_progress, _seconds_remaining):
         pass
 
-    monkeypatch.setattr("backaind.brain.global_chain_ppwps", 1)
     monkeypatch.setattr("multiprocessing.Process", fake_process)
     monkeypatch.setattr("multiprocessing.Queue", fake_queue)
 
@@ -308,11 +650,26 @@ def test_run_chain_process():
     result_type, result = result_queue.get()
     assert result_type == "token"
     assert result == "testtoken"
+    assert result_queue.get() == ("generated_tokens", 1)
     result_type, result = result_queue.get()
     assert result_type == "done"
     assert result == "Hi,,"
 
 
+def test_run_chain_process_puts_errors():
+    """Test if run_chain_process puts exceptions of the chain in the queue."""
+
+    class FailingChain:
+        """Helper class to mock a failing chain."""
+
+        def __call__(self, inputs, **kwargs):
+            raise RuntimeError("Test Error")
+
+    result_queue = queue.Queue()
+    run_chain_process(FailingChain(), {"input_text": "Hi"}, result_queue)
+    assert result_queue.get() == ("error", "Test Error")
+
+
 def test_set_text_generation_inference_token():
     """Test if the text generation inference token is set correctly."""
     aifile = read_aifile_from_path(
@@ -328,40 +685,33 @@ def test_set_text_generation_inference_token():
     }
 
 
-def test_estimate_processing_time(monkeypatch):
-    """Test if the processing time is estimated correctly."""
-    monkeypatch.setattr("backaind.brain.global_chain_ppwps", 2)
-    assert estimate_processing_time("Hi") == 1
-    assert estimate_processing_time("Hi Hi") == 1
-    assert estimate_processing_time("Hi Hi Hi") == 1
-    assert estimate_processing_time("Hi Hi Hi Hi") == 2
-
-
-def test_updated_environment_resets_values():
-    """Test if the environment is reset after the context manager."""
-    os.environ["EXISTING_VAR"] = "old_value"
-    if "NEW_VAR" in os.environ:
-        del os.environ["NEW_VAR"]
-
-    with UpdatedEnvironment({"NEW_VAR": "new_value", "EXISTING_VAR": "new_value"}):
-        assert os.getenv("NEW_VAR") == "new_value"
-        assert os.getenv("EXISTING_VAR") == "new_value"
-
-    assert os.getenv("NEW_VAR") is None
-    assert os.getenv("EXISTING_VAR") == "old_value"
-
-
-def test_updated_environment_handles_exceptions():
-    """Test if the environment is reset even if an exception is raised."""
-    os.environ["EXISTING_VAR"] = "old_value"
-    if "NEW_VAR" in os.environ:
-        del os.environ["NEW_VAR"]
-
-    with pytest.raises(RuntimeError):
-        with UpdatedEnvironment({"NEW_VAR": "new_value", "EXISTING_VAR": "new_value"}):
-            assert os.getenv("NEW_VAR") == "new_value"
-            assert os.getenv("EXISTING_VAR") == "new_value"
-            raise RuntimeError("Test")
-
-    assert os.getenv("NEW_VAR") is None
-    assert os.getenv("EXISTING_VAR") == "old_value"
+def test_process_chain_messages_measures_latency(monkeypatch):
+    """Test if the prompt processing and generation speed of the AI are measured."""
+    latency_model = LatencyModel()
+    monkeypatch.setattr("backaind.brain.get_latency_model", lambda: latency_model)
+    now = [0.0]
+    monkeypatch.setattr("backaind.brain.time.monotonic", lambda: now[0])
+    progress = []
+
+    def messages():
+        yield ("prompts", ["Hi"])
+        yield ("prompt_tokens", 30)
+        now[0] = 5.0
+        yield None
+        now[0] = 10.0
+        yield ("token", "a")
+        now[0] = 12.0
+        yield ("generated_tokens", 5)
+        yield ("done", "a")
+
+    assert (
+        process_chain_messages(messages(), None, lambda *args: progress.append(args), 1)
+        == "a"
+    )
+    # half of the prompt is processed, the generation of 100 tokens is still ahead
+    assert progress == [(50, 5.0 + 100 / 3)]
+    assert latency_model.get_rates(1) == {
+        "prompt_tokens_per_second": 3.0,
+        "generated_tokens_per_second": 2.0,
+        "generated_tokens": 5,
+    }
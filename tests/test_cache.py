@@ -0,0 +1,81 @@
+"""Test the least-recently-used cache."""
+import pytest
+
+from backaind.cache import LruCache
+
+
+def test_get_or_load_loads_only_once():
+    """Test if the loader is only called if the key is not cached yet."""
+    cache = LruCache(max_entries=2)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_load("key", loader) == "value"
+    assert cache.get_or_load("key", loader) == "value"
+    assert len(calls) == 1
+
+
+def test_evicts_least_recently_used_entry():
+    """Test if the least recently used entry is evicted when max_entries is exceeded."""
+    evicted = []
+    cache = LruCache(max_entries=2, on_evict=lambda key, _value: evicted.append(key))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.keys() == ["a", "c"]
+    assert evicted == ["b"]
+
+
+def test_evicts_entries_exceeding_max_bytes():
+    """Test if entries are evicted when the resident bytes exceed max_bytes."""
+    cache = LruCache(max_entries=0, max_bytes=100)
+    cache.get_or_load("a", lambda: "a", lambda _value: 60)
+    cache.get_or_load("b", lambda: "b", lambda _value: 60)
+    assert cache.keys() == ["b"]
+    assert cache.resident_bytes == 60
+
+    # a single entry is kept even if it exceeds max_bytes alone
+    cache.get_or_load("c", lambda: "c", lambda _value: 200)
+    assert cache.keys() == ["c"]
+
+
+def test_invalidate_drops_entries():
+    """Test if invalidate drops a single entry or all entries."""
+    cache = LruCache(max_entries=3)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    cache.invalidate("b")
+    assert cache.keys() == ["a", "c"]
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_invalidate_while_loading_does_not_cache_stale_value():
+    """Test if a value is not cached if its key gets invalidated during loading."""
+    cache = LruCache(max_entries=2)
+
+    def loader():
+        cache.invalidate("a")
+        return "stale"
+
+    assert cache.get_or_load("a", loader) == "stale"
+    assert "a" not in cache
+
+
+def test_failing_loader_releases_load_lock():
+    """Test if the load lock of a key is removed if the loader raises."""
+    cache = LruCache(max_entries=2)
+
+    def loader():
+        raise RuntimeError("Loading failed.")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("a", loader)
+    # pylint: disable-next=protected-access
+    assert not cache._load_locks
+    assert cache.get_or_load("a", lambda: 1) == 1
@@ -0,0 +1,62 @@
+"""Test the cached catalog of AIs and knowledge."""
+from backaind.catalog import CatalogCache, get_catalog, invalidate_catalog
+from backaind.extensions import db
+from backaind.models import Ai, Knowledge
+
+
+def test_catalog_contains_ais_and_knowledge(app):
+    """Test if the catalog knows all AIs and knowledge and which ones are public."""
+    with app.app_context():
+        catalog = get_catalog()
+        assert [ai["id"] for ai in catalog.get_ais(only_public=False)] == [1, 2]
+        assert [ai["id"] for ai in catalog.get_ais()] == [1]
+        assert "chain" not in catalog.get_ais()[0]
+        assert catalog.public_ai_ids == {1}
+        assert catalog.public_knowledge_ids == {1}
+        assert [knowledge["id"] for knowledge in catalog.get_knowledges()] == [1]
+
+
+def test_catalog_is_cached_until_invalidated(app):
+    """Test if changes are only loaded after the catalog has been invalidated."""
+    with app.app_context():
+        catalog = get_catalog()
+        assert get_catalog() is catalog
+
+        db.session.get(Ai, 2).is_public = True
+        db.session.get(Knowledge, 2).is_public = True
+        db.session.commit()
+        assert get_catalog().public_ai_ids == {1}
+
+        invalidate_catalog()
+        assert get_catalog().public_ai_ids == {1, 2}
+        assert get_catalog().public_knowledge_ids == {1, 2}
+
+
+def test_catalog_expires_after_ttl(app):
+    """Test if the catalog is loaded again after its time to live."""
+    now = [0.0]
+    cache = CatalogCache(ttl=10, clock=lambda: now[0])
+    with app.app_context():
+        catalog = cache.get()
+        now[0] = 10.0
+        assert cache.get() is catalog
+        now[0] = 10.5
+        assert cache.get() is not catalog
+
+
+def test_api_changes_invalidate_catalog(client, auth, app):
+    """Test if creating, updating and deleting AIs updates the catalog immediately."""
+    auth.login()
+    with app.app_context():
+        get_catalog()
+    client.post(
+        "/api/ai/", json={"name": "New", "input_keys": ["input_text"], "chain": {}}
+    )
+    client.put(
+        "/api/ai/1", json={"name": "Renamed", "input_keys": ["input_text"], "chain": {}}
+    )
+    client.delete("/api/ai/2")
+    with app.app_context():
+        assert [
+            (ai["id"], ai["name"]) for ai in get_catalog().get_ais(only_public=False)
+        ] == [(1, "Renamed"), (3, "New")]
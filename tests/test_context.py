@@ -0,0 +1,73 @@
+"""Test packing knowledge and history into the context window."""
+from langchain.docstore.document import Document
+from langchain.schema import AIMessage, HumanMessage
+
+from backaind.aifile import read_aifile_from_path
+from backaind.context import get_context_packer, ContextPacker
+
+
+def count_words(text: str) -> int:
+    """Count the words of a text as tokens."""
+    return len(text.split())
+
+
+def test_context_packer_reads_chain_config():
+    """Test if the context window, response length and prompt templates are read."""
+    aifile = read_aifile_from_path(
+        "examples/llamacpp/helpful_assistant_with_knowledge.aifile"
+    )
+    packer = get_context_packer(aifile["chain"], count_words)
+    assert packer is not None
+    assert packer.context_window == 4096
+    assert packer.response_tokens == 2000
+    assert packer.prompt_tokens == count_words(
+        "<s>[INST] <<SYS>>You are a helpful assistant for question-answering tasks. "
+        "Use the following context to answer the question. If you don't know the answer, "
+        "just say that you don't know.\n\n<context>\n\n</context>\n<</SYS>>\n\n"
+        "</s>\n<s>[INST] [/INST]\n"
+    )
+    assert packer.document_tokens == 0
+
+
+def test_context_packer_needs_context_window():
+    """Test if chains without a known context window aren't packed."""
+    assert get_context_packer({"llm": {"_type": "openai", "max_tokens": 100}}) is None
+
+
+def test_context_packer_caps_response_tokens():
+    """Test if at least half of the context window is left for the prompt."""
+    assert (
+        get_context_packer({"llm": {"n_ctx": 512, "max_tokens": 2000}}).response_tokens
+        == 256
+    )
+    assert get_context_packer({"llm": {"n_ctx": 4096}}).response_tokens == 256
+
+
+def test_pack_fills_budget_with_best_chunks_and_recent_turns():
+    """Test if the best fitting chunks and the most recent complete turns are chosen."""
+    # budget: 90% of 40 tokens - 10 response tokens - 2 input tokens = 24 tokens
+    packer = ContextPacker(40, 10, count_tokens=count_words)
+    documents = [
+        Document(page_content="best chunk " * 4),
+        Document(page_content="too large " * 20),
+        Document(page_content="third chunk"),
+    ]
+    messages = [
+        HumanMessage(content="first question " * 5),
+        AIMessage(content="first answer"),
+        HumanMessage(content="second question"),
+        AIMessage(content="second answer"),
+    ]
+    (packed_documents, packed_messages) = packer.pack(
+        "new question", documents, messages
+    )
+    assert packed_documents == [documents[0], documents[2]]
+    assert packed_messages == messages[2:]
+
+
+def test_pack_without_budget_returns_nothing():
+    """Test if nothing is packed if the input already fills the context window."""
+    packer = ContextPacker(10, 5, count_tokens=count_words)
+    documents = [Document(page_content="chunk")]
+    messages = [HumanMessage(content="question")]
+    assert packer.pack("a long input " * 5, documents, messages) == ([], [])
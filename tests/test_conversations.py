@@ -0,0 +1,210 @@
+"""Test the server-side conversations."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backaind.conversations import (
+    ConversationError,
+    SummaryBufferMemory,
+    conversation_cache,
+    delete_conversation,
+    delete_expired_conversations,
+    get_conversation,
+    get_messages_to_summarize,
+    save_turn,
+    summarize_conversation,
+)
+from backaind.extensions import db
+from backaind.models import Conversation, ConversationMessage
+
+CONVERSATION_ID = "0123456789abcdef0123456789abcdef"
+
+
+def test_get_conversation_reuses_memory(app):
+    """Test if the same memory object is returned for every turn of a conversation."""
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        save_turn(conversation, "Hi!", "Hello!")
+        again = get_conversation(CONVERSATION_ID, 1)
+        assert again is conversation
+        assert [message.content for message in again.memory.chat_memory.messages] == [
+            "Hi!",
+            "Hello!",
+        ]
+
+
+def test_save_turn_writes_through(app):
+    """Test if the turns are stored in the database."""
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        save_turn(conversation, "Hi!", "Hello!")
+        save_turn(conversation, "How are you?", "Fine.")
+        assert db.session.get(Conversation, CONVERSATION_ID).user_id == 1
+        assert [
+            (message.author, message.text)
+            for message in db.session.query(ConversationMessage).order_by(
+                ConversationMessage.id
+            )
+        ] == [
+            ("human", "Hi!"),
+            ("ai", "Hello!"),
+            ("human", "How are you?"),
+            ("ai", "Fine."),
+        ]
+
+
+def test_save_turn_keeps_anonymous_conversations_in_memory(app):
+    """Test if conversations of anonymous users are not stored in the database."""
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, None)
+        save_turn(conversation, "Hi!", "Hello!")
+        assert db.session.get(Conversation, CONVERSATION_ID) is None
+        assert db.session.query(ConversationMessage).count() == 0
+        assert (
+            len(get_conversation(CONVERSATION_ID, None).memory.chat_memory.messages)
+            == 2
+        )
+
+
+def test_delete_conversation_removes_conversation(app):
+    """Test if a deleted conversation is removed from the database and the memory."""
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        save_turn(conversation, "Hi!", "Hello!")
+        delete_conversation(CONVERSATION_ID, 1)
+        assert db.session.get(Conversation, CONVERSATION_ID) is None
+        assert db.session.query(ConversationMessage).count() == 0
+        assert get_conversation(CONVERSATION_ID, 1) is not conversation
+
+
+def test_delete_conversation_rejects_other_users(app):
+    """Test if a conversation can only be deleted by the user who started it."""
+    with app.app_context():
+        save_turn(get_conversation(CONVERSATION_ID, 1), "Hi!", "Hello!")
+        with pytest.raises(ConversationError):
+            delete_conversation(CONVERSATION_ID, 2)
+        assert db.session.get(Conversation, CONVERSATION_ID) is not None
+
+
+def test_delete_expired_conversations(app, monkeypatch):
+    """Test if only conversations not continued within the retention period are deleted."""
+    monkeypatch.setattr("backaind.conversations.conversation_retention_days", 30)
+    other_id = "fedcba9876543210fedcba9876543210"
+    with app.app_context():
+        expired = get_conversation(CONVERSATION_ID, 1)
+        save_turn(expired, "Hi!", "Hello!")
+        save_turn(get_conversation(other_id, 1), "Hi!", "Hello!")
+        db.session.get(
+            Conversation, CONVERSATION_ID
+        ).updated = datetime.now() - timedelta(days=31)
+        db.session.commit()
+
+        assert delete_expired_conversations() == 1
+        assert db.session.get(Conversation, CONVERSATION_ID) is None
+        assert db.session.get(Conversation, other_id) is not None
+        assert db.session.query(ConversationMessage).count() == 2
+
+        # a conversation deleted while it is being answered is stored again
+        save_turn(expired, "Still there?", "Yes.")
+        assert db.session.get(Conversation, CONVERSATION_ID).user_id == 1
+
+
+def test_get_conversation_reloads_evicted_conversation(app, monkeypatch):
+    """Test if a conversation no longer cached is loaded with its most recent messages."""
+    monkeypatch.setattr("backaind.conversations.max_conversation_messages", 2)
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        save_turn(conversation, "Hi!", "Hello!")
+        save_turn(conversation, "How are you?", "Fine.")
+        conversation_cache.invalidate()
+        reloaded = get_conversation(CONVERSATION_ID, 1)
+        assert reloaded is not conversation
+        assert [
+            message.content for message in reloaded.memory.chat_memory.messages
+        ] == ["How are you?", "Fine."]
+
+
+def test_get_conversation_rejects_other_users(app):
+    """Test if a conversation can only be continued by the user who started it."""
+    with app.app_context():
+        save_turn(get_conversation(CONVERSATION_ID, 1), "Hi!", "Hello!")
+        with pytest.raises(ConversationError):
+            get_conversation(CONVERSATION_ID, 2)
+        conversation_cache.invalidate()
+        with pytest.raises(ConversationError):
+            get_conversation(CONVERSATION_ID, None)
+
+
+@pytest.mark.parametrize("conversation_id", ("", "short", "no spaces allowed!", 123))
+def test_get_conversation_rejects_invalid_ids(app, conversation_id):
+    """Test if guessable or malformed conversation IDs are rejected."""
+    with app.app_context(), pytest.raises(ConversationError):
+        get_conversation(conversation_id, 1)
+
+
+def test_summary_memory_compacts_older_messages(app, monkeypatch):
+    """Test if older messages are replaced by a summary which is stored as well."""
+    monkeypatch.setattr("backaind.conversations.conversation_memory", "summary")
+    monkeypatch.setattr("backaind.conversations.conversation_summary_tokens", 20)
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        assert isinstance(conversation.memory, SummaryBufferMemory)
+        save_turn(conversation, "one two three four five", "six seven eight nine")
+        assert not get_messages_to_summarize(conversation)
+        save_turn(conversation, "ten eleven twelve thirteen", "fourteen fifteen")
+
+        messages = get_messages_to_summarize(conversation)
+        assert [message.content for message in messages] == [
+            "one two three four five",
+            "six seven eight nine",
+        ]
+        assert not get_messages_to_summarize(conversation)
+
+        summarize_conversation(
+            conversation,
+            messages,
+            lambda summary, new_messages: f"{summary}{len(new_messages)} messages",
+        )
+        assert not conversation.is_summarizing
+        assert conversation.memory.load_memory_variables({})["history"] == (
+            "System: 2 messages\n"
+            "Human: ten eleven twelve thirteen\n"
+            "AI: fourteen fifteen"
+        )
+
+        conversation_cache.invalidate()
+        reloaded = get_conversation(CONVERSATION_ID, 1)
+        assert reloaded.memory.moving_summary_buffer == "2 messages"
+        assert [
+            message.content for message in reloaded.memory.chat_memory.messages
+        ] == ["ten eleven twelve thirteen", "fourteen fifteen"]
+
+
+def test_summary_is_dropped_if_messages_changed(app, monkeypatch):
+    """Test if a summary is not applied if its messages have been dropped meanwhile."""
+    monkeypatch.setattr("backaind.conversations.conversation_memory", "summary")
+    monkeypatch.setattr("backaind.conversations.conversation_summary_tokens", 4)
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        conversation.max_messages = 4
+        save_turn(conversation, "one two three", "four five six")
+        save_turn(conversation, "seven eight", "nine ten")
+        messages = get_messages_to_summarize(conversation)
+        assert messages
+
+        def summarize(_summary, _messages):
+            save_turn(conversation, "eleven", "twelve")
+            return "summary"
+
+        summarize_conversation(conversation, messages, summarize)
+        assert conversation.memory.moving_summary_buffer == ""
+        assert len(conversation.memory.chat_memory.messages) == 4
+        assert not conversation.is_summarizing
+
+
+def test_window_memory_is_never_summarized(app):
+    """Test if conversations with the default memory keep their messages."""
+    with app.app_context():
+        conversation = get_conversation(CONVERSATION_ID, 1)
+        save_turn(conversation, "word " * 2000, "word " * 2000)
+        assert not get_messages_to_summarize(conversation)
@@ -0,0 +1,150 @@
+"""Test the persistent embedding cache."""
+from contextlib import closing
+import sqlite3
+
+import pytest
+
+from backaind.embedding_cache import (
+    get_embedding_cache,
+    reset_embedding_cache,
+    CachedEmbeddings,
+    EmbeddingCache,
+)
+import backaind.embedding_cache
+from backaind.metrics import render_metrics, reset_metrics
+
+
+class CountingEmbeddings:
+    """Helper class to mock an embeddings model recording the embedded texts."""
+
+    def __init__(self):
+        self.embedded = []
+        self.model_name = "counting"
+
+    def embed_documents(self, texts):
+        """Return the length of each text as embedding."""
+        self.embedded.extend(texts)
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text):
+        """Return the length of the text as embedding."""
+        self.embedded.append(text)
+        return [float(len(text)), 1.5]
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path, monkeypatch):
+    """Provide an empty embedding cache as the global embedding cache."""
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    monkeypatch.setattr(backaind.embedding_cache, "global_embedding_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_cached_embeddings_embed_each_text_once(cache):
+    """Test if texts are only embedded once and hits and misses are counted."""
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, "test/model")
+    assert embeddings.embed_documents(["a", "bb", "a"]) == [
+        [1.0, 0.5],
+        [2.0, 0.5],
+        [1.0, 0.5],
+    ]
+    assert embeddings.embed_documents(["bb", "ccc"]) == [[2.0, 0.5], [3.0, 0.5]]
+    assert model.embedded == ["a", "bb", "ccc"]
+    assert cache.get_stats() == {"hits": 1, "misses": 4, "entries": 3}
+    assert embeddings.model_name == "counting"
+
+
+def test_embedding_cache_exports_metrics(cache):
+    """Test if hits, misses and the number of cached embeddings are exposed as metrics."""
+    reset_metrics()
+    embeddings = CachedEmbeddings(CountingEmbeddings(), "test/model")
+    embeddings.embed_documents(["a", "bb"])
+    embeddings.embed_documents(["a"])
+    metrics = render_metrics()
+    assert 'ownai_embedding_cache_lookups_total{result="hit"} 1' in metrics
+    assert 'ownai_embedding_cache_lookups_total{result="miss"} 2' in metrics
+    assert f"ownai_embedding_cache_entries {cache.get_stats()['entries']}" in metrics
+    reset_metrics()
+
+
+def test_cached_embeddings_cache_queries_separately(cache):
+    """Test if queries are cached apart from documents of the same text."""
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, "test/model")
+    embeddings.embed_documents(["a"])
+    assert embeddings.embed_query("a") == [1.0, 1.5]
+    assert embeddings.embed_query("a") == [1.0, 1.5]
+    assert model.embedded == ["a", "a"]
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_embedding_cache_removes_least_recently_used(cache):
+    """Test if the cache stays within max_entries and keys embeddings by model."""
+    cache.put_many("model", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    cache.get_many("model", ["a"])
+    cache.put_many("model", ["d"], [[4.0]])
+    assert set(cache.get_many("model", ["a", "b", "c", "d"])) == set(
+        cache.get_many("model", ["a", "c", "d"])
+    )
+    assert len(cache.get_many("model", ["a", "b", "c", "d"])) == 3
+    assert not cache.get_many("other-model", ["a"])
+
+
+def test_embedding_cache_removes_a_tenth_at_once(tmp_path):
+    """Test if eviction frees a tenth of max_entries, so it doesn't run with every put."""
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=20)
+    texts = [str(number) for number in range(21)]
+    cache.put_many("model", texts, [[1.0]] * len(texts))
+    assert cache.get_stats()["entries"] == 18
+    cache.put_many("model", ["new", "21"], [[1.0], [1.0]])
+    assert cache.get_stats()["entries"] == 20
+    assert cache.entries == 20
+    cache.close()
+
+
+def test_embedding_cache_writes_last_use_in_batches(tmp_path, monkeypatch):
+    """Test if cache hits don't write to the database until a batch is complete."""
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("model", ["a", "b"], [[1.0], [2.0]])
+
+    def read_last_used():
+        with closing(sqlite3.connect(path)) as connection:
+            return dict(
+                connection.execute("SELECT text_hash, last_used FROM embedding")
+            )
+
+    inserted = read_last_used()
+    monkeypatch.setattr(backaind.embedding_cache, "TOUCH_BATCH_SIZE", 2)
+    monkeypatch.setattr("backaind.embedding_cache.time.time", lambda: 2e9)
+    cache.get_many("model", ["a"])
+    assert read_last_used() == inserted
+    cache.get_many("model", ["b"])
+    assert set(read_last_used().values()) == {2e9}
+    cache.close()
+
+
+def test_embedding_cache_persists_embeddings(tmp_path):
+    """Test if embeddings are still cached after reopening the cache."""
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("model", ["a"], [[0.25, 0.5]])
+    cache.close()
+    cache = EmbeddingCache(path)
+    assert list(cache.get_many("model", ["a"]).values()) == [[0.25, 0.5]]
+    cache.close()
+
+
+def test_embedding_cache_can_be_disabled(app):
+    """Test if the app opens the embedding cache unless it is disabled."""
+    assert get_embedding_cache() is not None
+    app.config["EMBEDDING_CACHE_MAX_ENTRIES"] = -1
+    backaind.embedding_cache.init_app(app)
+    assert get_embedding_cache() is None
+    model = CountingEmbeddings()
+    CachedEmbeddings(model, "test/model").embed_documents(["a"])
+    CachedEmbeddings(model, "test/model").embed_documents(["a"])
+    assert model.embedded == ["a", "a"]
+    reset_embedding_cache()
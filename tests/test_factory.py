@@ -3,10 +3,22 @@ import os
 from backaind import create_app
 
 
-def test_config():
+def test_config(tmp_path):
     """Test whether the app factory takes an external test configuration."""
     os.environ["OWNAI_SQLALCHEMY_DATABASE_URI"] = "sqlite:///testing.db"
-    assert not create_app().testing
+    assert not create_app(instance_path=str(tmp_path)).testing
     assert create_app(
-        {"SQLALCHEMY_DATABASE_URI": "sqlite:///testing.db", "TESTING": True}
+        {"SQLALCHEMY_DATABASE_URI": "sqlite:///testing.db", "TESTING": True},
+        str(tmp_path),
     ).testing
+
+
+def test_instance_path(tmp_path):
+    """Test whether the app factory creates and uses the given instance folder."""
+    instance_path = tmp_path / "instance"
+    app = create_app(
+        {"SQLALCHEMY_DATABASE_URI": "sqlite:///testing.db", "TESTING": True},
+        str(instance_path),
+    )
+    assert app.instance_path == str(instance_path)
+    assert instance_path.is_dir()
@@ -0,0 +1,236 @@
+"""Test the background ingestion of documents into knowledge."""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from langchain.docstore.document import Document
+from langchain.embeddings import fake
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+import pytest
+
+from backaind.ingestion import (
+    cancel_ingestion_job,
+    get_executor,
+    get_ingestion_job,
+    reset_ingestion,
+    run_ingestion_job,
+    submit_ingestion_job,
+    load_lazily,
+    split_lazily,
+    IngestionJob,
+)
+from backaind.knowledge import (
+    create_vector_store,
+    iterate_batches,
+    VECTOR_STORE_BACKENDS,
+)
+
+
+class FakeLoader:
+    """Helper class to mock a document loader."""
+
+    def __init__(self, chunks=3, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def lazy_load(self):
+        """Return the pages of the fake document one by one."""
+        if self.error:
+            raise self.error
+        for i in range(self.chunks):
+            yield Document(page_content=f"Chunk {i}")
+
+
+@pytest.fixture(name="knowledge_store")
+def fixture_knowledge_store(monkeypatch):
+    """Record the documents added to and deleted from knowledge."""
+    store = {}
+
+    def fake_add_to_knowledge(_knowledge_id, documents, batch_size, on_batch):
+        all_ids = []
+        for batch in iterate_batches(documents, batch_size):
+            ids = [str(len(store) + index) for index in range(len(batch))]
+            store.update(zip(ids, batch))
+            on_batch(ids, 0, 0.5)
+            all_ids.extend(ids)
+        return all_ids
+
+    def fake_delete_from_knowledge(_knowledge_id, document_ids):
+        for document_id in document_ids:
+            del store[document_id]
+
+    monkeypatch.setattr("backaind.ingestion.add_to_knowledge", fake_add_to_knowledge)
+    monkeypatch.setattr(
+        "backaind.ingestion.delete_from_knowledge", fake_delete_from_knowledge
+    )
+    yield store
+    reset_ingestion()
+
+
+def test_run_ingestion_job_embeds_chunks_in_batches(app, knowledge_store, tmp_path):
+    """Test if a job embeds all chunks, reports its progress and removes the upload."""
+    app.config["INGESTION_BATCH_SIZE"] = 2
+    job = IngestionJob(1, FakeLoader(5), str(tmp_path))
+    run_ingestion_job(app, job)
+    assert job.status == "done"
+    assert job.chunks_total == job.chunks_embedded == 5
+    assert job.chunks_per_second == 2
+    assert len(knowledge_store) == 5
+    assert not tmp_path.exists()
+
+
+def test_run_ingestion_job_reports_errors(app, knowledge_store):
+    """Test if a failing job gets the failed status and its error message."""
+    job = IngestionJob(1, FakeLoader(error=ValueError("Broken file")))
+    run_ingestion_job(app, job)
+    assert job.status == "failed"
+    assert job.error == "Broken file"
+    assert not knowledge_store
+
+
+def test_run_ingestion_job_fails_for_unknown_knowledge(app, knowledge_store):
+    """Test if a job for a knowledge that doesn't exist fails."""
+    job = IngestionJob(999, FakeLoader())
+    run_ingestion_job(app, job)
+    assert job.status == "failed"
+    assert not knowledge_store
+
+
+def test_cancelled_job_removes_embedded_chunks(app, knowledge_store, monkeypatch):
+    """Test if cancelling a running job removes the chunks embedded so far."""
+    app.config["INGESTION_BATCH_SIZE"] = 1
+    job = IngestionJob(1, FakeLoader(3))
+    add_to_knowledge = __import__("backaind.ingestion").ingestion.add_to_knowledge
+
+    def add_and_cancel(knowledge_id, documents, batch_size, on_batch):
+        def on_batch_and_cancel(ids, skipped, seconds):
+            on_batch(ids, skipped, seconds)
+            job.cancel_requested = True
+
+        return add_to_knowledge(
+            knowledge_id, documents, batch_size, on_batch_and_cancel
+        )
+
+    monkeypatch.setattr("backaind.ingestion.add_to_knowledge", add_and_cancel)
+    run_ingestion_job(app, job)
+    assert job.status == "cancelled"
+    assert job.chunks_embedded == 0
+    assert not knowledge_store
+
+
+@pytest.mark.usefixtures("knowledge_store")
+def test_submit_ingestion_job_runs_in_background(app, monkeypatch):
+    """Test if submitted jobs are queued and can be cancelled before they start."""
+    started = Event()
+    release = Event()
+
+    def wait_for_release(_self):
+        started.set()
+        release.wait(5)
+        return iter([])
+
+    monkeypatch.setattr(FakeLoader, "lazy_load", wait_for_release)
+    with app.app_context():
+        app.config["INGESTION_WORKERS"] = 1
+        running_job = submit_ingestion_job(1, FakeLoader())
+        queued_job = submit_ingestion_job(1, FakeLoader())
+        assert started.wait(5)
+        assert running_job.status == "running"
+        assert queued_job.status == "queued"
+        assert cancel_ingestion_job(queued_job.id) is queued_job
+        release.set()
+        reset_ingestion()
+    assert running_job.status == "done", running_job.error
+    assert queued_job.status == "cancelled"
+    assert get_ingestion_job(queued_job.id) is None
+
+
+def test_load_lazily_falls_back_to_load():
+    """Test if documents are loaded at once if the loader can't load them lazily."""
+
+    class EagerLoader:
+        """Helper class to mock a loader without lazy loading."""
+
+        def lazy_load(self):
+            """Raise like the loaders of LangChain without lazy loading."""
+            raise NotImplementedError()
+
+        def load(self):
+            """Return all documents."""
+            return [Document(page_content="Eager")]
+
+    assert [doc.page_content for doc in load_lazily(EagerLoader())] == ["Eager"]
+
+
+def test_split_lazily_splits_one_document_after_another():
+    """Test if documents are only pulled when their chunks are needed."""
+    pulled = []
+
+    def documents():
+        for text in ["aaaa bbbb", "cccc dddd"]:
+            pulled.append(text)
+            yield Document(page_content=text)
+
+    chunks = split_lazily(
+        documents(), RecursiveCharacterTextSplitter(chunk_size=5, chunk_overlap=0)
+    )
+    assert next(chunks).page_content == "aaaa"
+    assert pulled == ["aaaa bbbb"]
+    assert [chunk.page_content for chunk in chunks] == ["bbbb", "cccc", "dddd"]
+
+
+@pytest.mark.parametrize("backend", VECTOR_STORE_BACKENDS)
+def test_replace_document_only_embeds_changed_chunks(
+    app, monkeypatch, tmp_path, backend
+):
+    """Test if replacing a document keeps unchanged and removes outdated chunks."""
+    embedded = []
+
+    class CountingEmbeddings(fake.FakeEmbeddings):
+        """Helper class to record the embedded texts."""
+
+        def embed_documents(self, texts):
+            embedded.extend(texts)
+            return super().embed_documents(texts)
+
+    knowledge = create_vector_store(str(tmp_path), CountingEmbeddings(size=4), backend)
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: knowledge)
+
+    class TextsLoader:
+        """Helper class to load one chunk per text."""
+
+        def __init__(self, texts):
+            self.texts = texts
+
+        def lazy_load(self):
+            """Return the texts as documents."""
+            return (Document(page_content=text) for text in self.texts)
+
+    first_job = IngestionJob(1, TextsLoader(["Same", "Old"]), None, "test.txt")
+    run_ingestion_job(app, first_job)
+    assert first_job.chunks_embedded == 2
+    duplicate_job = IngestionJob(1, TextsLoader(["Same", "Old"]), None, "copy.txt")
+    run_ingestion_job(app, duplicate_job)
+    # the copy owns its chunks, so replacing or deleting the original doesn't affect it
+    assert duplicate_job.chunks_skipped == 0
+    assert duplicate_job.chunks_embedded == 2
+
+    embedded.clear()
+    job = IngestionJob(1, TextsLoader(["Same", "New"]), None, "test.txt", True)
+    run_ingestion_job(app, job)
+    assert job.status == "done", job.error
+    assert embedded == ["New"]
+    assert (job.chunks_embedded, job.chunks_skipped, job.chunks_removed) == (1, 1, 1)
+    chunk_ids = knowledge.find_chunks("document", ["test.txt"])
+    texts = [
+        text for chunk_id, text in knowledge.get_chunks(10) if chunk_id in chunk_ids
+    ]
+    assert sorted(texts) == ["New", "Same"]
+    assert len(knowledge.find_chunks("document", ["copy.txt"])) == 2
+
+
+def test_ingestion_runs_in_threads_of_the_threading_module(app, monkeypatch):
+    """Test if ingestion workers use (possibly monkeypatched) threads even on gunicorn."""
+    monkeypatch.setenv("SERVER_SOFTWARE", "gunicorn/21.2.0")
+    with app.app_context():
+        assert isinstance(get_executor(), ThreadPoolExecutor)
+        reset_ingestion()
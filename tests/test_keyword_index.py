@@ -0,0 +1,54 @@
+"""Test the keyword index of knowledge."""
+from langchain.embeddings import fake
+
+from backaind.keyword_index import KeywordIndex, tokenize
+from backaind.vector_stores import HnswKnowledgeStore
+
+
+def test_tokenize_splits_lowercase_words():
+    """Test if texts are split into lowercase words without punctuation."""
+    assert tokenize("Hello, World! It's 2023.") == ["hello", "world", "it", "s", "2023"]
+
+
+def test_keyword_index_ranks_by_bm25(tmp_path):
+    """Test if chunks with more (and rarer) query terms are ranked first."""
+    keyword_index = KeywordIndex(str(tmp_path / "keywords.sqlite3"))
+    keyword_index.add(
+        ["1", "2", "3"],
+        [
+            "the rocket reached the orbit",
+            "the garden is green",
+            "the rocket engine of the rocket",
+        ],
+    )
+    assert [chunk_id for chunk_id, _ in keyword_index.search("rocket orbit", 3)] == [
+        "1",
+        "3",
+    ]
+    assert [chunk_id for chunk_id, _ in keyword_index.search("rocket", 1)] == ["3"]
+    assert not keyword_index.search("river", 3)
+
+
+def test_keyword_index_replaces_and_deletes_chunks(tmp_path):
+    """Test if replaced and deleted chunks are no longer found by their old words."""
+    keyword_index = KeywordIndex(str(tmp_path / "keywords.sqlite3"))
+    keyword_index.add(["1", "2"], ["apples", "rivers"])
+    keyword_index.add(["1"], ["gardens"])
+    assert not keyword_index.search("apples", 2)
+    assert keyword_index.search("gardens", 2)[0][0] == "1"
+
+    keyword_index.delete(["1"])
+    assert keyword_index.count() == 1
+    assert not keyword_index.search("gardens", 2)
+
+
+def test_store_builds_missing_keyword_index(tmp_path):
+    """Test if the keyword index of a store with existing chunks is built on first use."""
+    store = HnswKnowledgeStore(str(tmp_path), fake.FakeEmbeddings(size=4))
+    store.upsert_chunks(
+        ["1", "2"], [[0.0] * 4, [1.0] * 4], ["apples", "rivers"], [{}, {}]
+    )
+    keyword_index = store.get_keyword_index()
+    assert keyword_index.count() == 2
+    assert keyword_index.search("rivers", 2)[0][0] == "2"
+    store.close()
@@ -1,8 +1,12 @@
 """Test access to the vector store."""
+from threading import Thread
+import time
+
 import pytest
 
 from langchain.docstore.document import Document
 from langchain.embeddings.base import Embeddings
+from langchain.embeddings import fake
 from langchain.vectorstores.base import VectorStore
 from langchain.vectorstores.chroma import Chroma
 
@@ -10,14 +14,36 @@ from backaind.extensions import db
 from backaind.knowledge import (
     add_knowledge,
     add_to_knowledge,
+    create_vector_store,
+    delete_from_knowledge,
+    fuse_rankings,
+    get_content_hash,
+    get_document_chunks,
     get_embeddings,
+    get_embeddings_info,
+    get_existing_hashes,
     get_knowledge,
+    get_retrieval_config,
+    reset_embeddings,
+    reset_global_knowledge,
+    search_knowledge,
     KnowledgeConfigError,
+    ReadWriteLock,
+    VECTOR_STORE_BACKENDS,
 )
 import backaind.knowledge
+from backaind.metrics import render_metrics
 from backaind.models import Knowledge
 
 
+def wait_until(condition):
+    """Wait for a condition to become true (or fail after a few seconds)."""
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for condition."
+        time.sleep(0.01)
+
+
 def test_get_embeddings_raises_on_unknown_embeddings(client):
     """Test if an exception is raised when requesting an unknown embedding function."""
     with client:
@@ -36,6 +62,58 @@ def test_get_embeddings_returns_embeddings(client):
         assert isinstance(embeddings, Embeddings)
 
 
+def test_get_embeddings_loads_each_model_once(monkeypatch):
+    """Test if embeddings models are shared and their load info is recorded."""
+
+    class FakeTensor:
+        """Helper class to mock a model parameter."""
+
+        def numel(self):
+            """Return the number of elements."""
+            return 10
+
+        def element_size(self):
+            """Return the bytes per element."""
+            return 4
+
+    class FakeClient:
+        """Helper class to mock a sentence-transformers model."""
+
+        def parameters(self):
+            """Return the model parameters."""
+            return [FakeTensor(), FakeTensor()]
+
+    class FakeEmbeddings:
+        """Helper class to mock the HuggingFaceEmbeddings."""
+
+        instances = 0
+
+        def __init__(self, model_name):
+            FakeEmbeddings.instances += 1
+            self.model_name = model_name
+            self.client = FakeClient()
+
+    monkeypatch.setattr("langchain.embeddings.HuggingFaceEmbeddings", FakeEmbeddings)
+    reset_embeddings()
+    embeddings = get_embeddings("huggingface")
+    assert get_embeddings("HuggingFace") is embeddings
+    assert get_embeddings("huggingface", "other-model") is not embeddings
+    assert FakeEmbeddings.instances == 2
+
+    info = get_embeddings_info()
+    assert [entry["model_name"] for entry in info] == [
+        embeddings.model_name,
+        "other-model",
+    ]
+    assert info[0]["memory_bytes"] == 80
+    assert info[0]["load_seconds"] >= 0
+    assert (
+        f'ownai_embeddings_memory_bytes{{type="huggingface",model="{embeddings.model_name}"}} 80'
+        in render_metrics()
+    )
+    reset_embeddings()
+
+
 def test_get_knowledge_returns_vector_store(client):
     """Test if get_knowledge() returns a VectorStore instance."""
     with client:
@@ -44,12 +122,128 @@ def test_get_knowledge_returns_vector_store(client):
         assert isinstance(knowledge, VectorStore)
 
 
-def test_get_knowledge_loads_from_global_knowledge():
-    """Test if get_knowledge() loads from the global knowledge instance."""
-    backaind.knowledge.global_knowledge = "NotRealKnowledge"
-    backaind.knowledge.global_knowledge_id = 999
+def test_get_knowledge_loads_from_knowledge_cache():
+    """Test if get_knowledge() loads from the cache of open vector stores."""
+    backaind.knowledge.knowledge_cache.put(999, "NotRealKnowledge")
     knowledge = get_knowledge(999)
     assert knowledge == "NotRealKnowledge"
+    reset_global_knowledge(999)
+    assert 999 not in backaind.knowledge.knowledge_cache
+
+
+def test_knowledge_cache_keeps_multiple_stores():
+    """Test if multiple vector stores stay open and the least recently used is closed."""
+    reset_global_knowledge()
+    cache = backaind.knowledge.knowledge_cache
+    cache.configure(2)
+    cache.put(997, "First")
+    cache.put(998, "Second")
+    assert get_knowledge(997) == "First"
+    cache.put(999, "Third")
+    assert cache.keys() == [997, 999]
+    reset_global_knowledge()
+    cache.configure(backaind.knowledge.DEFAULT_KNOWLEDGE_CACHE_MAX_ENTRIES)
+
+
+def test_read_write_lock_allows_concurrent_readers_but_single_writer():
+    """Test if readers share the lock and writers wait for readers to finish."""
+    lock = ReadWriteLock()
+    events = []
+    with lock.read():
+        with lock.read():
+            assert lock.readers == 2
+
+        def write():
+            with lock.write():
+                events.append("write")
+
+        writer = Thread(target=write)
+        writer.start()
+        wait_until(lambda: lock.waiting_writers == 1)
+        events.append("read")
+    writer.join()
+    assert events == ["read", "write"]
+    assert not lock.writing
+
+
+def test_search_knowledge_uses_similarity_search(monkeypatch):
+    """Test if search_knowledge() returns the most similar documents."""
+
+    class FakeKnowledge:
+        """Helper class for a fake vector store."""
+
+        def similarity_search(self, query, k):
+            """Mock function returning the query k times."""
+            return [query] * k
+
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: FakeKnowledge())
+    assert search_knowledge(1, "Hi", k=2) == ["Hi", "Hi"]
+
+
+@pytest.mark.parametrize("backend", VECTOR_STORE_BACKENDS)
+def test_search_knowledge_hybrid_finds_keyword_matches(monkeypatch, tmp_path, backend):
+    """Test if hybrid retrieval ranks a chunk matching the keywords first."""
+    knowledge = create_vector_store(
+        str(tmp_path), fake.DeterministicFakeEmbedding(size=8), backend
+    )
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: knowledge)
+    texts = ["apples and pears", "rivers and lakes", "rockets to the moon"]
+    add_to_knowledge(1, [Document(page_content=text) for text in texts])
+
+    documents = search_knowledge(1, "rockets", k=1, mode="hybrid", candidates=3)
+    assert [document.page_content for document in documents] == ["rockets to the moon"]
+
+    delete_from_knowledge(
+        1,
+        list(
+            knowledge.find_chunks(
+                "content_hash", [get_content_hash("rockets to the moon")]
+            )
+        ),
+    )
+    documents = search_knowledge(1, "rockets", k=3, mode="hybrid")
+    assert len(documents) == 2
+    assert "rockets to the moon" not in [
+        document.page_content for document in documents
+    ]
+
+
+def test_search_knowledge_reranks_candidates(monkeypatch, tmp_path):
+    """Test if the reranker chooses the final chunks from the candidates."""
+    knowledge = create_vector_store(
+        str(tmp_path), fake.DeterministicFakeEmbedding(size=8), "hnswlib"
+    )
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: knowledge)
+    add_to_knowledge(1, [Document(page_content=f"Chunk {i}") for i in range(5)])
+
+    class FakeReranker:
+        """Helper class for a cross-encoder preferring the highest chunk number."""
+
+        def predict(self, pairs):
+            """Return the number of every chunk as its score."""
+            return [int(text.split()[-1]) for _query, text in pairs]
+
+    monkeypatch.setattr(
+        "backaind.knowledge.get_reranker", lambda _model_name: FakeReranker()
+    )
+    documents = search_knowledge(1, "Chunk", k=2, candidates=5, reranker="fake")
+    assert [document.page_content for document in documents] == ["Chunk 4", "Chunk 3"]
+
+
+def test_fuse_rankings_prefers_chunks_ranked_high_in_all_rankings():
+    """Test if the reciprocal rank fusion ranks chunks found by both retrievers first."""
+    assert fuse_rankings([["a", "b", "c"], ["c", "d"]]) == ["c", "a", "b", "d"]
+
+
+def test_get_retrieval_config_uses_defaults():
+    """Test if missing retrieval options get their defaults and invalid ones raise."""
+    config = get_retrieval_config({"mode": "hybrid", "k": 2})
+    assert config["mode"] == "hybrid"
+    assert config["k"] == 2
+    assert config["candidates"] == 20
+    assert get_retrieval_config(None)["mode"] == "vector"
+    with pytest.raises(KnowledgeConfigError):
+        get_retrieval_config({"candidates": "many"})
 
 
 def test_add_to_knowledge_adds_documents(client):
@@ -68,6 +262,80 @@ def test_add_to_knowledge_adds_documents(client):
         knowledge._collection.delete(where_document={"$contains": "Test"})
 
 
+@pytest.mark.parametrize("backend", VECTOR_STORE_BACKENDS)
+def test_add_to_knowledge_embeds_lazily_in_batches(monkeypatch, tmp_path, backend):
+    """Test if documents are pulled lazily and embedded batch by batch."""
+    knowledge = create_vector_store(str(tmp_path), fake.FakeEmbeddings(size=4), backend)
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: knowledge)
+    pulled = []
+    batches = []
+
+    def documents():
+        for i in range(5):
+            pulled.append(i)
+            yield Document(page_content=f"Document {i}")
+
+    def on_batch(ids, _skipped, seconds):
+        batches.append((len(ids), len(pulled)))
+        assert seconds >= 0
+
+    ids = add_to_knowledge(1, documents(), batch_size=2, on_batch=on_batch)
+    assert batches == [(2, 2), (2, 4), (1, 5)]
+    assert len(ids) == 5
+    assert knowledge.count_chunks() == 5
+
+
+@pytest.mark.parametrize("backend", VECTOR_STORE_BACKENDS)
+def test_add_to_knowledge_skips_existing_content(monkeypatch, tmp_path, backend):
+    """Test if chunks with content already in the knowledge are not embedded again."""
+    knowledge = create_vector_store(str(tmp_path), fake.FakeEmbeddings(size=4), backend)
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: knowledge)
+    skipped = []
+
+    def documents(*texts):
+        return [
+            Document(page_content=text, metadata={"document": "a"}) for text in texts
+        ]
+
+    first_ids = add_to_knowledge(1, documents("One", "Two", "One"))
+    second_ids = add_to_knowledge(
+        1,
+        documents("Two", "Three"),
+        on_batch=lambda _ids, count, _s: skipped.append(count),
+    )
+    assert len(first_ids) == 2
+    assert len(second_ids) == 1
+    assert skipped == [1]
+    assert list(knowledge.find_chunks("content_hash", [get_content_hash("Three")])) == (
+        second_ids
+    )
+    assert get_existing_hashes(1, [get_content_hash("One"), "unknown"]) == {
+        ("a", get_content_hash("One"))
+    }
+    assert sorted(get_document_chunks(1, "a").values()) == sorted(
+        get_content_hash(text) for text in ["One", "Two", "Three"]
+    )
+    assert len(add_to_knowledge(1, documents("One"), skip_existing=False)) == 1
+
+
+@pytest.mark.parametrize("backend", VECTOR_STORE_BACKENDS)
+def test_add_to_knowledge_keeps_content_of_every_document(
+    monkeypatch, tmp_path, backend
+):
+    """Test if content already in another document is added again for the new document."""
+    knowledge = create_vector_store(str(tmp_path), fake.FakeEmbeddings(size=4), backend)
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: knowledge)
+
+    add_to_knowledge(1, [Document(page_content="Same", metadata={"document": "a"})])
+    add_to_knowledge(1, [Document(page_content="Same", metadata={"document": "b"})])
+    assert get_existing_hashes(1, [get_content_hash("Same")]) == {
+        ("a", get_content_hash("Same")),
+        ("b", get_content_hash("Same")),
+    }
+    delete_from_knowledge(1, list(get_document_chunks(1, "a")))
+    assert list(get_document_chunks(1, "b").values()) == [get_content_hash("Same")]
+
+
 def test_add_knowledge_command_adds_knowledge(app, runner):
     """Test if the add-knowledge command adds a new knowledge entry to the database."""
     knowledge_name = "Test"
@@ -0,0 +1,78 @@
+"""Test the estimation of the latency of AIs."""
+import types
+
+from langchain.llms.fake import FakeListLLM
+from langchain.llms.llamacpp import LlamaCpp
+
+from backaind.latency import approximate_token_count, LatencyModel
+from backaind.workers import get_token_counter
+
+
+def test_latency_model_predicts_with_defaults_and_measurements():
+    """Test if the latency model falls back to defaults until something was measured."""
+    latency_model = LatencyModel(smoothing=0.5)
+    assert latency_model.predict(1, 30) == (10.0, 100 / 3)
+    latency_model.record(1, 60, 10.0, 11, 5.0)
+    assert latency_model.predict(1, 60) == (10.0, 5.5)
+    latency_model.record(1, 60, 30.0, 11, 5.0)
+    assert latency_model.get_rates(1)["prompt_tokens_per_second"] == 4.0
+    assert latency_model.predict(2, 30) == (10.0, 100 / 3)
+
+
+def test_latency_model_persists_rates(tmp_path):
+    """Test if the measured rates survive a restart and can be forgotten."""
+    path = str(tmp_path / "latency.json")
+    LatencyModel(path, save_interval=0).record(1, 60, 10.0, 11, 5.0)
+    latency_model = LatencyModel(path)
+    assert latency_model.get_rates(1)["prompt_tokens_per_second"] == 6.0
+    latency_model.forget(1)
+    assert LatencyModel(path).get_rates(1)["prompt_tokens_per_second"] == 3.0
+
+
+def test_latency_model_saves_measurements_in_intervals(tmp_path, monkeypatch):
+    """Test if measurements are only written after the save interval (or when forced)."""
+    now = [0.0]
+    monkeypatch.setattr("backaind.latency.time.monotonic", lambda: now[0])
+    path = tmp_path / "latency.json"
+    latency_model = LatencyModel(str(path), save_interval=30)
+    latency_model.record(1, 60, 10.0, 11, 5.0)
+    assert not path.exists()
+    now[0] = 31.0
+    latency_model.record(1, 60, 10.0, 11, 5.0)
+    assert LatencyModel(str(path)).get_rates(1)["generated_tokens"] == 11
+    latency_model.record(2, 60, 10.0, 21, 5.0)
+    latency_model.save_if_due()
+    assert LatencyModel(str(path)).get_rates(2)["generated_tokens"] == 100
+    latency_model.save_if_due(force=True)
+    assert LatencyModel(str(path)).get_rates(2)["generated_tokens"] == 21
+
+
+def test_latency_model_ignores_broken_file(tmp_path):
+    """Test if a broken latency file doesn't prevent the start."""
+    path = tmp_path / "latency.json"
+    path.write_text("{broken", encoding="utf-8")
+    assert LatencyModel(str(path)).get_rates(1)["generated_tokens"] == 100
+
+
+def test_approximate_token_count():
+    """Test if the token count is approximated by the number of characters."""
+    assert approximate_token_count("") == 0
+    assert approximate_token_count("abcde") == 2
+
+
+def test_get_token_counter_uses_real_tokenizer():
+    """Test if only models with their own tokenizer are used to count tokens."""
+
+    class FakeLlama:
+        """Helper class to mock a llama.cpp model."""
+
+        def tokenize(self, text):
+            """Return one token per character."""
+            return list(text)
+
+    llamacpp = LlamaCpp.construct(client=FakeLlama())
+    counter = get_token_counter(types.SimpleNamespace(llm=llamacpp))
+    assert counter is not None and counter("abc") == 3
+    assert (
+        get_token_counter(types.SimpleNamespace(llm=FakeListLLM(responses=[]))) is None
+    )
@@ -0,0 +1,116 @@
+"""Test the metrics of the hot paths."""
+import pytest
+
+from backaind.brain import process_chain_messages
+from backaind.knowledge import search_knowledge
+from backaind.latency import LatencyModel
+from backaind.metrics import (
+    render_metrics,
+    reset_metrics,
+    retrieval_seconds,
+    time_to_first_token_seconds,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+)
+
+
+def test_counter_renders_labelled_values():
+    """Test if counters are rendered in the Prometheus text format."""
+    counter = Counter("test_total", "A test counter.", ["ai_id", "status"])
+    counter.inc(ai_id=1, status="success")
+    counter.inc(2, ai_id=1, status="success")
+    counter.inc(ai_id=2, status='say "hi"')
+    assert counter.get(ai_id=1, status="success") == 3
+    assert counter.render() == [
+        "# HELP test_total A test counter.",
+        "# TYPE test_total counter",
+        'test_total{ai_id="1",status="success"} 3',
+        'test_total{ai_id="2",status="say \\"hi\\""} 1',
+    ]
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test if histograms count observations in cumulative buckets."""
+    histogram = Histogram("test_seconds", "A test histogram.", ["ai_id"], [1, 5])
+    histogram.observe(0.5, ai_id=1)
+    histogram.observe(1, ai_id=1)
+    histogram.observe(10, ai_id=1)
+    assert histogram.render_samples() == [
+        'test_seconds_bucket{ai_id="1",le="1"} 2',
+        'test_seconds_bucket{ai_id="1",le="5"} 2',
+        'test_seconds_bucket{ai_id="1",le="+Inf"} 3',
+        'test_seconds_sum{ai_id="1"} 11.5',
+        'test_seconds_count{ai_id="1"} 3',
+    ]
+    with histogram.time(ai_id=2):
+        pass
+    assert histogram.get_count(ai_id=2) == 1
+
+
+def test_metric_requires_rendering_and_reset():
+    """Test if metrics have to implement the rendering of their samples and the reset."""
+    with pytest.raises(TypeError):
+        # pylint: disable-next=abstract-class-instantiated
+        Metric("test", "An incomplete metric.")
+
+
+def test_gauge_renders_value_of_function():
+    """Test if gauges read their value when they are rendered."""
+    gauge = Gauge("test_entries", "A test gauge.")
+    assert not gauge.render_samples()
+    entries = [3]
+    gauge.set_function(lambda: entries[0])
+    entries[0] = 5
+    assert gauge.render() == [
+        "# HELP test_entries A test gauge.",
+        "# TYPE test_entries gauge",
+        "test_entries 5",
+    ]
+
+
+def test_gauge_renders_labelled_values_of_function():
+    """Test if gauges with labels render a sample for every value returned by the function."""
+    gauge = Gauge("test_bytes", "A test gauge.", ["model"])
+    gauge.set_function(lambda: {("b",): 2, ("a",): 1})
+    assert gauge.render_samples() == [
+        'test_bytes{model="a"} 1',
+        'test_bytes{model="b"} 2',
+    ]
+
+
+def test_hot_paths_record_metrics(monkeypatch):
+    """Test if retrieval and chain runs are recorded with their AI and knowledge ID."""
+
+    class FakeKnowledge:
+        """Helper class for a fake vector store."""
+
+        def similarity_search(self, query, k):
+            """Mock function returning the query k times."""
+            return [query] * k
+
+    reset_metrics()
+    monkeypatch.setattr("backaind.knowledge.get_knowledge", lambda _id: FakeKnowledge())
+    monkeypatch.setattr("backaind.brain.get_latency_model", LatencyModel)
+    search_knowledge(3, "Hi", 1)
+    process_chain_messages(
+        iter([("prompts", ["Hi"]), ("token", "a"), ("done", "a")]), None, None, 7
+    )
+    assert retrieval_seconds.get_count(knowledge_id=3) == 1
+    assert time_to_first_token_seconds.get_count(ai_id=7) == 1
+    assert 'ownai_retrieval_seconds_count{knowledge_id="3"} 1' in render_metrics()
+    reset_metrics()
+
+
+def test_metrics_endpoint_is_only_public_locally(client, auth):
+    """Test if remote users have to log in to see the metrics."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert b"# TYPE ownai_response_seconds histogram" in response.data
+
+    remote = {"REMOTE_ADDR": "192.0.2.1"}
+    assert client.get("/metrics", environ_base=remote).status_code == 403
+    auth.login()
+    assert client.get("/metrics", environ_base=remote).status_code == 200
@@ -0,0 +1,72 @@
+"""Test the cache of AI responses."""
+from backaind.response_cache import (
+    cosine_similarity,
+    get_response_key,
+    normalize_input,
+    split_into_tokens,
+    ResponseCache,
+)
+
+
+class FakeClock:
+    """Helper class to control the time seen by the response cache."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_response_key_normalizes_input():
+    """Test if trivially different inputs and configs share or separate keys."""
+    key = get_response_key(1, {"b": 1, "a": 2}, 3, "  What is ownAI? ", "history")
+    assert key == get_response_key(1, {"a": 2, "b": 1}, 3, "what is  ownai", "history")
+    assert key != get_response_key(1, {"a": 2, "b": 2}, 3, "what is ownai", "history")
+    assert key != get_response_key(1, {"a": 2, "b": 1}, 3, "what is ownai", "")
+    assert normalize_input("Hello, World!") == "hello, world"
+
+
+def test_response_cache_expires_and_evicts_responses():
+    """Test if responses expire after the TTL and the oldest get evicted."""
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, ttl=10, clock=clock)
+    cache.put((1, "c", None, "h", "a"), "A")
+    clock.now = 5
+    cache.put((1, "c", None, "h", "b"), "B")
+    cache.put((1, "c", None, "h", "c"), "C")
+    assert cache.get((1, "c", None, "h", "a")) is None
+    assert cache.get((1, "c", None, "h", "b")) == "B"
+    clock.now = 15
+    assert cache.get((1, "c", None, "h", "b")) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_response_cache_returns_similar_responses():
+    """Test if responses to similar inputs in the same scope are returned."""
+    cache = ResponseCache(max_entries=10, similarity_threshold=0.9)
+    cache.put((1, "c", None, "h", "hi"), "Hello", [1.0, 0.0])
+    assert cache.get((1, "c", None, "h", "hey"), [0.99, 0.1]) == "Hello"
+    assert cache.get((1, "c", None, "h", "bye"), [0.0, 1.0]) is None
+    assert cache.get((2, "c", None, "h", "hey"), [0.99, 0.1]) is None
+    assert cosine_similarity([1.0, 0.0], [0.0, 0.0]) == 0.0
+
+
+def test_response_cache_invalidates_by_ai_and_knowledge():
+    """Test if responses can be dropped by AI or by knowledge."""
+    cache = ResponseCache(max_entries=10)
+    cache.put((1, "c", 1, "h", "a"), "A")
+    cache.put((1, "c", 2, "h", "b"), "B")
+    cache.put((2, "c", 2, "h", "c"), "C")
+    cache.invalidate(knowledge_id=2)
+    assert len(cache) == 1
+    cache.invalidate(ai_id=1)
+    assert len(cache) == 0
+
+
+def test_split_into_tokens_keeps_the_text():
+    """Test if a cached response is split into tokens without losing whitespace."""
+    text = " Hello  world,\nhow are you? "
+    assert "".join(split_into_tokens(text)) == text
+    assert list(split_into_tokens("")) == [""]
@@ -0,0 +1,103 @@
+"""Test the scheduler admitting messages to the AIs."""
+from threading import Event, Thread
+import time
+
+import pytest
+
+from backaind.scheduler import QueueFullError, Scheduler, Ticket
+
+
+def wait_until(condition):
+    """Wait for a condition to become true (or fail after a few seconds)."""
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for condition."
+        time.sleep(0.01)
+
+
+def occupy_slot(scheduler, ai_id, user_key, release: Event, admitted: list):
+    """Start a thread that keeps a slot until release is set."""
+
+    def run():
+        with scheduler.slot(ai_id, user_key):
+            admitted.append(user_key)
+            release.wait(5)
+
+    thread = Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_slot_admits_immediately_if_capacity_is_available():
+    """Test if a message is admitted without waiting if there is capacity."""
+    scheduler = Scheduler(max_queue_size=1, max_concurrent=1)
+    positions = []
+    with scheduler.slot(1, "user", positions.append):
+        assert scheduler.running == {1: 1}
+    assert not scheduler.running
+    assert not positions
+
+
+def test_slot_raises_if_queue_is_full():
+    """Test if QueueFullError is raised if too many messages are waiting."""
+    scheduler = Scheduler(max_queue_size=1, max_concurrent=1)
+    scheduler.waiting.append(Ticket(0, 1, "other"))
+    with pytest.raises(QueueFullError):
+        with scheduler.slot(1, "user"):
+            pass
+    assert len(scheduler.waiting) == 1
+
+
+def test_slot_reports_queue_position():
+    """Test if waiting messages get their queue position and are admitted later."""
+    scheduler = Scheduler(max_queue_size=5, max_concurrent=1)
+    release = Event()
+    admitted = []
+    thread = occupy_slot(scheduler, 1, "first", release, admitted)
+    wait_until(lambda: admitted == ["first"])
+
+    positions = []
+
+    def wait_in_queue():
+        with scheduler.slot(1, "second", positions.append):
+            admitted.append("second")
+
+    waiting_thread = Thread(target=wait_in_queue)
+    waiting_thread.start()
+    wait_until(lambda: positions == [1])
+    release.set()
+    thread.join()
+    waiting_thread.join()
+    assert admitted == ["first", "second"]
+
+
+def test_per_ai_limit_does_not_block_other_ais():
+    """Test if a busy AI does not block messages for another AI."""
+    scheduler = Scheduler(max_queue_size=5, max_concurrent=2, max_concurrent_per_ai=1)
+    release = Event()
+    admitted = []
+    thread = occupy_slot(scheduler, 1, "first", release, admitted)
+    wait_until(lambda: admitted == ["first"])
+
+    scheduler.waiting.append(Ticket(-1, 1, "blocked"))
+    with scheduler.slot(2, "second"):
+        assert scheduler.running == {1: 1, 2: 1}
+    scheduler.waiting.clear()
+    release.set()
+    thread.join()
+
+
+def test_waiting_messages_are_ordered_round_robin_across_users():
+    """Test if a user with many messages can't starve other users."""
+    scheduler = Scheduler()
+    scheduler.waiting = [
+        Ticket(0, 1, "a"),
+        Ticket(1, 1, "a"),
+        Ticket(2, 1, "a"),
+        Ticket(3, 1, "b"),
+        Ticket(4, 1, "c"),
+        Ticket(5, 1, "b"),
+    ]
+    # pylint: disable-next=protected-access
+    order = [ticket.sequence for ticket in scheduler._ordered_waiting()]
+    assert order == [0, 3, 4, 1, 5, 2]
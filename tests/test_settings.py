@@ -1,8 +1,10 @@
 """Test the settings blueprint."""
 import pytest
 from flask import session
+from sqlalchemy import event
 from backaind.auth import is_password_correct, set_password
-from backaind.settings import EXTERNAL_PROVIDER_ENVVARS, get_settings
+from backaind.extensions import db
+from backaind.settings import EXTERNAL_PROVIDER_ENVVARS, get_settings, set_settings
 
 SETTINGS_PATHS = (
     "/settings/password",
@@ -156,3 +158,60 @@ def test_save_external_providers(auth, client):
         )
         assert b"Settings saved successfully." in response.data
         assert get_settings(user_id).get("external-providers", {}) == {}
+
+
+def test_get_settings_uses_cache_until_settings_are_saved(app):
+    """Test whether settings are read from the database only once until they change."""
+    statements = []
+
+    def record_statement(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record_statement)
+        try:
+            set_settings(1, "external-providers", {"OPENAI_API_KEY": "key1"})
+            settings = get_settings(1)
+            settings["external-providers"]["OPENAI_API_KEY"] = "changed"
+            assert get_settings(1) == {"external-providers": {"OPENAI_API_KEY": "key1"}}
+            assert len([s for s in statements if s.startswith("SELECT")]) == 2
+
+            set_settings(1, "external-providers", {"OPENAI_API_KEY": "key2"})
+            assert get_settings(1) == {"external-providers": {"OPENAI_API_KEY": "key2"}}
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record_statement)
+
+
+def test_set_settings_deletes_only_given_names(app):
+    """Test whether settings not in the values are deleted only if they are in names."""
+    with app.app_context():
+        set_settings(1, "external-providers", {"A": "1", "B": "2"})
+        set_settings(1, "external-providers", {"B": "3"}, ["B"])
+        assert get_settings(1) == {"external-providers": {"A": "1", "B": "3"}}
+        set_settings(1, "external-providers", {"B": "4"})
+        assert get_settings(1) == {"external-providers": {"B": "4"}}
+
+
+def test_save_external_providers_selects_settings_once(app, auth, client):
+    """Test whether saving the external providers doesn't query every provider."""
+    statements = []
+
+    def record_statement(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    auth.login()
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record_statement)
+    try:
+        client.post(
+            "/settings/external-providers",
+            data={provider: "key" for provider in EXTERNAL_PROVIDER_ENVVARS},
+        )
+    finally:
+        with app.app_context():
+            event.remove(db.engine, "before_cursor_execute", record_statement)
+    setting_selects = [
+        s for s in statements if s.startswith("SELECT") and "FROM setting" in s
+    ]
+    # one query to save and one to render the saved settings
+    assert len(setting_selects) == 2
@@ -0,0 +1,113 @@
+"""Test coalescing of generated tokens."""
+import queue
+import time
+
+from backaind.bench import bench, percentile
+from backaind.streaming import TokenBuffer
+from backaind.workers import run_chain_process
+
+
+class FakeClock:
+    """Helper class to control the time seen by the token buffer."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTokenChain:
+    """Helper class to mock a chain generating multiple tokens."""
+
+    def __call__(self, _inputs, **kwargs):
+        for callback_handler in kwargs["callbacks"]:
+            for token in ["a", "b", "c"]:
+                callback_handler.on_llm_new_token(token)
+        return {"output_text": "abc"}
+
+
+def test_token_buffer_flushes_first_token_immediately():
+    """Test if the first token is passed on without waiting for the interval."""
+    flushed = []
+    token_buffer = TokenBuffer(flushed.append, 50, 0, FakeClock())
+    token_buffer.add("Hello")
+    assert flushed == ["Hello"]
+
+
+def test_token_buffer_coalesces_tokens_within_interval():
+    """Test if tokens are collected until the interval has passed."""
+    flushed = []
+    clock = FakeClock()
+    token_buffer = TokenBuffer(flushed.append, 50, 0, clock)
+    token_buffer.add("Hello")
+    token_buffer.add(" wor")
+    token_buffer.add("ld")
+    assert flushed == ["Hello"]
+    clock.now = 0.05
+    token_buffer.add("!")
+    assert flushed == ["Hello", " world!"]
+    token_buffer.add(" Bye")
+    token_buffer.flush()
+    assert flushed == ["Hello", " world!", " Bye"]
+
+
+def test_token_buffer_flushes_if_max_bytes_are_reached():
+    """Test if tokens are passed on as soon as enough bytes are collected."""
+    flushed = []
+    token_buffer = TokenBuffer(flushed.append, 1000, 4, FakeClock())
+    for token in ["a", "b", "c", "dé", "f"]:
+        token_buffer.add(token)
+    assert flushed == ["a", "bcdé"]
+
+
+def test_token_buffer_passes_every_token_without_interval():
+    """Test if every token is passed on if the interval is 0."""
+    flushed = []
+    token_buffer = TokenBuffer(flushed.append, 0, 0, FakeClock())
+    token_buffer.add("a")
+    token_buffer.add("b")
+    assert flushed == ["a", "b"]
+
+
+def test_token_buffer_flushes_in_background_while_waiting_for_tokens():
+    """Test if collected tokens are passed on after the interval without another token."""
+    flushed = []
+    token_buffer = TokenBuffer(flushed.append, 20, 0, background_flush=True)
+    token_buffer.add("Hello")
+    token_buffer.add(" world")
+    assert flushed == ["Hello"]
+    deadline = time.monotonic() + 5
+    while len(flushed) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert flushed == ["Hello", " world"]
+    assert token_buffer.timer is None
+
+
+def test_run_chain_process_coalesces_tokens():
+    """Test if run_chain_process puts coalesced tokens before the final result."""
+    result_queue = queue.Queue()
+    run_chain_process(FakeTokenChain(), {}, result_queue, (60000, 0))
+    assert result_queue.get() == ("token", "a")
+    assert result_queue.get() == ("token", "bc")
+    assert result_queue.get() == ("generated_tokens", 3)
+    assert result_queue.get() == ("done", "abc")
+
+
+def test_percentile():
+    """Test if the percentile is calculated by nearest rank."""
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == 5.0
+    assert percentile([], 50) == 0.0
+
+
+def test_bench_streaming_command_compares_batching(runner, tmp_path):
+    """Test if the streaming benchmark reports results with and without batching."""
+    output = tmp_path / "results.json"
+    result = runner.invoke(
+        bench, ["streaming", "--tokens", "20", "--output", str(output)]
+    )
+    assert result.exit_code == 0
+    assert "unbatched: 20 pipe messages, 20 events" in result.output
+    assert '"batched"' in output.read_text(encoding="utf-8")
@@ -0,0 +1,100 @@
+"""Test the tracing of answered messages."""
+import json
+
+from backaind.ainteraction import handle_incoming_message
+from backaind.brain import process_chain_messages
+from backaind.tracing import add_span, span, trace, TraceLog
+
+
+def test_trace_writes_spans_to_trace_log(tmp_path, monkeypatch):
+    """Test if a trace with its spans is written as JSON line to the trace log."""
+    trace_log = TraceLog(str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr("backaind.tracing.global_trace_log", trace_log)
+
+    with trace("message", ai_id=1) as new_trace:
+        with span("retrieval", k=4):
+            pass
+        add_span(
+            "first_token", new_trace.started_monotonic, new_trace.started_monotonic
+        )
+
+    with open(tmp_path / "traces.jsonl", "r", encoding="utf-8") as trace_file:
+        trace_data = json.loads(trace_file.readline())
+    assert trace_data["name"] == "message"
+    assert trace_data["status"] == "ok"
+    assert trace_data["attributes"] == {"ai_id": 1}
+    assert [entry["name"] for entry in trace_data["spans"]] == [
+        "retrieval",
+        "first_token",
+    ]
+    assert trace_data["spans"][0]["attributes"] == {"k": 4}
+    assert trace_data["spans"][1]["duration_ms"] == 0
+
+
+def test_spans_without_trace_are_ignored(monkeypatch):
+    """Test if spans outside of a trace and traces with disabled tracing do nothing."""
+    monkeypatch.setattr("backaind.tracing.global_trace_log", None)
+    with trace("message") as new_trace:
+        with span("retrieval"):
+            add_span("first_token", 0, 1)
+    assert new_trace is None
+
+
+def test_trace_log_rotates_and_reads_newest_first(tmp_path):
+    """Test if the trace log stays bounded and returns the most recent traces."""
+    trace_log = TraceLog(str(tmp_path / "traces.jsonl"), max_bytes=30)
+    for number in range(5):
+        trace_log.write({"number": number})
+    assert [entry["number"] for entry in trace_log.read()] == [4, 3, 2]
+    assert [entry["number"] for entry in trace_log.read(limit=2)] == [4, 3]
+    assert not (tmp_path / "traces.jsonl.2").exists()
+
+
+def test_chain_messages_add_spans(tmp_path, monkeypatch):
+    """Test if prompt evaluation, first token and completion are traced."""
+    monkeypatch.setattr(
+        "backaind.tracing.global_trace_log", TraceLog(str(tmp_path / "traces.jsonl"))
+    )
+    messages = [
+        ("prompts", ["Hello"]),
+        ("token", "Hi"),
+        ("token", "!"),
+        ("generated_tokens", 2),
+        ("done", "Hi!"),
+    ]
+    with trace("message") as new_trace:
+        process_chain_messages(iter(messages), None, None)
+    spans = {entry["name"]: entry for entry in new_trace.spans}
+    assert set(spans) == {"prompt_eval", "first_token", "completion"}
+    assert spans["completion"]["attributes"] == {"generated_tokens": 2}
+
+
+def test_handle_incoming_message_is_traced(client, auth, monkeypatch, tmp_path):
+    """Test if handling a message writes a trace and shows it on the traces page."""
+    trace_log = TraceLog(str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr("backaind.tracing.global_trace_log", trace_log)
+    monkeypatch.setattr("backaind.ainteraction.emit", lambda _event, _arg: None)
+    monkeypatch.setattr("backaind.ainteraction.reply", lambda *_args: "Response")
+
+    with client:
+        client.get("/")
+        handle_incoming_message({"aiId": 1, "responseId": 1, "message": {"text": "Hi"}})
+
+    trace_data = trace_log.read()[0]
+    assert trace_data["attributes"] == {
+        "ai_id": 1,
+        "knowledge_id": None,
+        "result": "success",
+    }
+    assert [entry["name"] for entry in trace_data["spans"]] == [
+        "auth_check",
+        "memory_construction",
+        "queue_wait",
+        "settings_lookup",
+    ]
+
+    assert client.get("/traces/").status_code == 302
+    auth.login()
+    assert b"auth_check" in client.get("/traces/").data
+    exported = client.get("/traces/traces.jsonl").data.decode("utf-8")
+    assert json.loads(exported)["id"] == trace_data["id"]
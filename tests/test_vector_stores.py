@@ -0,0 +1,62 @@
+"""Test the vector store backends of knowledge."""
+import os
+
+from langchain.embeddings import fake
+
+from backaind.vector_stores import HNSW_INDEX_FILENAME, HnswKnowledgeStore
+
+
+def get_store(path) -> HnswKnowledgeStore:
+    """Return an hnswlib store with fake embeddings in the given directory."""
+    return HnswKnowledgeStore(str(path), fake.DeterministicFakeEmbedding(size=8))
+
+
+def test_hnswlib_store_finds_added_chunks(tmp_path):
+    """Test if added chunks can be searched, listed, found and counted."""
+    store = get_store(tmp_path)
+    store.add_texts(
+        ["Apples", "Rivers", "Rockets"],
+        [{"document": "a.txt"}, {"document": "a.txt"}, {"document": "b.txt"}],
+        ids=["1", "2", "3"],
+    )
+    assert store.count_chunks() == 3
+    assert store.similarity_search("Rivers", k=1)[0].page_content == "Rivers"
+    assert len(store.similarity_search("Rivers", k=10)) == 3
+    assert store.get_chunks(2) == [("1", "Apples"), ("2", "Rivers")]
+    assert store.get_chunks(2, offset=2) == [("3", "Rockets")]
+    assert set(store.find_chunks("document", ["a.txt"])) == {"1", "2"}
+
+
+def test_hnswlib_store_replaces_and_deletes_chunks(tmp_path):
+    """Test if chunks with an existing ID are replaced and deleted chunks aren't found."""
+    store = get_store(tmp_path)
+    store.add_texts(["Apples", "Rivers"], ids=["1", "2"])
+    store.add_texts(["Gardens"], ids=["1"])
+    assert store.count_chunks() == 2
+    assert dict(store.get_chunks(10))["1"] == "Gardens"
+
+    store.delete(["1"])
+    assert store.get_chunks(10) == [("2", "Rivers")]
+    assert [doc.page_content for doc in store.similarity_search("Gardens")] == [
+        "Rivers"
+    ]
+    store.delete(["2"])
+    assert not store.similarity_search("Rivers")
+
+
+def test_hnswlib_store_reopens_persisted_index(tmp_path):
+    """Test if the store can be reopened and rebuilds a missing index."""
+    store = get_store(tmp_path)
+    store.add_texts(["Apples", "Rivers"], ids=["1", "2"])
+    store.close()
+    assert os.path.isfile(tmp_path / HNSW_INDEX_FILENAME)
+
+    store = get_store(tmp_path)
+    assert store.similarity_search("Apples", k=1)[0].page_content == "Apples"
+    store.add_texts(["Rockets"], ids=["3"])
+    store.connection.close()
+    os.remove(tmp_path / HNSW_INDEX_FILENAME)
+
+    store = get_store(tmp_path)
+    assert store.count_chunks() == 3
+    assert store.similarity_search("Rockets", k=1)[0].page_content == "Rockets"
@@ -0,0 +1,352 @@
+"""Test the pool of warm worker processes."""
+import os
+import queue
+import sys
+import types
+
+from langchain.llms.llamacpp import LlamaCpp
+import pytest
+
+from backaind.aifile import read_aifile_from_path
+from backaind.brain import process_chain_messages
+import backaind.workers
+from backaind.workers import (
+    enable_llamacpp_state_cache,
+    get_chain_environment,
+    get_chain_key,
+    inject_environment,
+    run_chain_process,
+    run_worker,
+    worker_environment,
+    ChainRequest,
+    MultiprocessingWorker,
+    Worker,
+    WorkerCrashedError,
+    WorkerPool,
+)
+
+FAKE_CHAIN_CONFIG = read_aifile_from_path("examples/fake-list/fake-ai.aifile")["chain"]
+
+
+class FakeChannel:
+    """Helper class to mock the channel between parent and worker process."""
+
+    def __init__(self, incoming):
+        self.incoming = queue.Queue()
+        for message in incoming + [None]:
+            self.incoming.put(message)
+        self.outgoing = []
+
+    def get(self):
+        """Return the next incoming message."""
+        return self.incoming.get()
+
+    def put(self, message):
+        """Record an outgoing message."""
+        self.outgoing.append(message)
+
+
+def run_payload(chain_config):
+    """Return the payload for a run message with the fake chain."""
+    return {
+        "chain_key": get_chain_key(1, FAKE_CHAIN_CONFIG),
+        "chain_config": chain_config,
+        "inputs": {"input_text": "Hi"},
+        "environment": {},
+    }
+
+
+@pytest.fixture(name="pool")
+def fixture_pool():
+    """Factory function for a worker pool with a single multiprocessing worker."""
+    pool = WorkerPool([MultiprocessingWorker(2, 0)], health_check_interval=0)
+    runs = []
+    run_chain = pool.run_chain
+
+    def recording_run_chain(*args):
+        messages = run_chain(*args)
+        runs.append(messages)
+        return messages
+
+    pool.run_chain = recording_run_chain
+    yield pool
+    for messages in runs:
+        messages.close()
+    pool.stop()
+
+
+def test_get_chain_key_changes_with_config():
+    """Test if the chain key identifies the AI and the version of its chain config."""
+    key = get_chain_key(1, {"a": 1, "b": 2})
+    assert key == get_chain_key(1, {"b": 2, "a": 1})
+    assert key != get_chain_key(2, {"a": 1, "b": 2})
+    assert key != get_chain_key(1, {"a": 1, "b": 3})
+
+
+def test_get_chain_key_changes_with_environment():
+    """Test if chains loaded with the environment of a user are not shared with others."""
+    key = get_chain_key(1, {"a": 1})
+    assert key == get_chain_key(1, {"a": 1}, {})
+    assert key != get_chain_key(1, {"a": 1}, {"OPENAI_API_KEY": "user-1"})
+    assert get_chain_key(1, {"a": 1}, {"OPENAI_API_KEY": "user-1"}) != get_chain_key(
+        1, {"a": 1}, {"OPENAI_API_KEY": "user-2"}
+    )
+
+
+def test_get_chain_environment_keeps_used_api_keys_only():
+    """Test if chains only get the environment variables read by their models."""
+    environment = {"OPENAI_API_KEY": "openai", "COHERE_API_KEY": "cohere"}
+    assert get_chain_environment({"llm": {"_type": "llamacpp"}}, environment) == {}
+    assert get_chain_environment({"llm": {"_type": "openai"}}, environment) == {
+        "OPENAI_API_KEY": "openai"
+    }
+    assert (
+        get_chain_environment({"llm": {"_type": "unknown"}}, environment) == environment
+    )
+    assert get_chain_environment(FAKE_CHAIN_CONFIG, environment) == {}
+
+
+def test_inject_environment_sets_api_keys_as_fields():
+    """Test if API keys are set as fields of the models if they support it."""
+    chain_config = {"llm": {"_type": "openai"}}
+    assert inject_environment(chain_config, {"OPENAI_API_KEY": "key"}) == {
+        "llm": {"_type": "openai", "openai_api_key": "key"}
+    }
+    assert chain_config == {"llm": {"_type": "openai"}}
+    assert (
+        inject_environment(
+            {"llm": {"_type": "vertexai"}}, {"GOOGLE_APPLICATION_CREDENTIALS": "key"}
+        )
+        is None
+    )
+
+
+def test_worker_environment_resets_values(monkeypatch):
+    """Test if the environment is reset after the context manager."""
+    monkeypatch.setenv("EXISTING_VAR", "old_value")
+    monkeypatch.delenv("NEW_VAR", raising=False)
+
+    with worker_environment({"NEW_VAR": "new_value", "EXISTING_VAR": "new_value"}):
+        assert os.getenv("NEW_VAR") == "new_value"
+        assert os.getenv("EXISTING_VAR") == "new_value"
+
+    assert os.getenv("NEW_VAR") is None
+    assert os.getenv("EXISTING_VAR") == "old_value"
+
+
+def test_worker_environment_handles_exceptions(monkeypatch):
+    """Test if the environment is reset even if an exception is raised."""
+    monkeypatch.setenv("EXISTING_VAR", "old_value")
+    monkeypatch.delenv("NEW_VAR", raising=False)
+
+    with pytest.raises(RuntimeError):
+        with worker_environment({"NEW_VAR": "new_value", "EXISTING_VAR": "new_value"}):
+            raise RuntimeError("Test")
+
+    assert os.getenv("NEW_VAR") is None
+    assert os.getenv("EXISTING_VAR") == "old_value"
+
+
+def test_run_chain_process_loads_chain_request_with_environment(monkeypatch):
+    """Test if a chain request is loaded and run with the environment of the user."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    load_chain_from_config = backaind.workers.load_chain_from_config
+    environments = []
+
+    def recording_load_chain_from_config(config):
+        environments.append(os.getenv("OPENAI_API_KEY"))
+        return load_chain_from_config(config)
+
+    monkeypatch.setattr(
+        "backaind.workers.load_chain_from_config", recording_load_chain_from_config
+    )
+    channel = FakeChannel([])
+    run_chain_process(
+        ChainRequest(FAKE_CHAIN_CONFIG, {"OPENAI_API_KEY": "user-key"}),
+        {"input_text": "Hi"},
+        channel,
+    )
+    assert environments == ["user-key"]
+    assert channel.outgoing[-1] == ("done", "Hello")
+    assert os.getenv("OPENAI_API_KEY") is None
+
+
+def test_run_chain_process_reports_chain_requests_failing_to_load():
+    """Test if chain requests which cannot be loaded are reported as error."""
+    channel = FakeChannel([])
+    run_chain_process(ChainRequest({"_type": "unknown"}, {}), {}, channel)
+    assert [message_type for message_type, _payload in channel.outgoing] == ["error"]
+
+
+def test_run_worker_loads_chain_once():
+    """Test if the worker loads a chain once and reuses it for later runs."""
+    channel = FakeChannel(
+        [
+            ("ping", None),
+            ("run", run_payload(FAKE_CHAIN_CONFIG)),
+            ("run", run_payload(None)),
+            ("invalidate", 1),
+            ("run", run_payload(None)),
+        ]
+    )
+    run_worker(channel, 2, 0)
+    assert channel.outgoing == [
+        ("pong", None),
+        ("prompts", ["Question: Hi\nAnswer:"]),
+        ("generated_tokens", 0),
+        ("done", "Hello"),
+        ("prompts", ["Question: Hi\nAnswer:"]),
+        ("generated_tokens", 0),
+        ("done", "Bye"),
+        ("missing_chain", None),
+    ]
+
+
+def test_enable_llamacpp_state_cache_sets_ram_cache(monkeypatch):
+    """Test if llama.cpp models in the chain get a RAM cache for their prompt states."""
+
+    class FakeRamCache:
+        """Helper class to mock the LlamaRAMCache of llama-cpp-python."""
+
+        def __init__(self, capacity_bytes):
+            self.capacity_bytes = capacity_bytes
+
+    class FakeLlama:
+        """Helper class to mock a llama.cpp model."""
+
+        cache = None
+
+        def set_cache(self, cache):
+            """Record the cache."""
+            self.cache = cache
+
+    monkeypatch.setitem(
+        sys.modules,
+        "llama_cpp",
+        types.SimpleNamespace(LlamaRAMCache=FakeRamCache),
+    )
+    llm = LlamaCpp.construct(client=FakeLlama())
+    chain = types.SimpleNamespace(llm=llm)
+
+    enable_llamacpp_state_cache(chain, 0)
+    assert llm.client.cache is None
+    enable_llamacpp_state_cache(chain, 1024)
+    assert llm.client.cache.capacity_bytes == 1024
+
+
+def test_run_worker_reports_errors():
+    """Test if the worker reports chains that cannot be loaded as error."""
+    channel = FakeChannel([("run", run_payload({"_type": "unknown"}))])
+    run_worker(channel, 2, 0)
+    assert channel.outgoing[0][0] == "error"
+
+
+def test_run_worker_summarizes_with_model_of_the_chain():
+    """Test if the worker summarizes conversations with the model of the loaded chain."""
+    channel = FakeChannel(
+        [
+            ("run", run_payload(FAKE_CHAIN_CONFIG)),
+            (
+                "run",
+                {
+                    **run_payload(None),
+                    "inputs": {"summary": "", "new_lines": "Human: Hi"},
+                    "task": "summarize",
+                },
+            ),
+        ]
+    )
+    run_worker(channel, 2, 0)
+    done = [
+        payload for message_type, payload in channel.outgoing if message_type == "done"
+    ]
+    assert done == ["Hello", "Bye"]
+    assert any(
+        message_type == "prompts" and "New lines of conversation" in payload[0]
+        for message_type, payload in channel.outgoing
+    )
+
+
+def test_worker_pool_runs_chain_in_warm_worker(pool):
+    """Test if the worker pool runs chains and reuses the worker process."""
+    text = process_chain_messages(
+        pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+    )
+    assert text == "Hello"
+    worker = pool.workers[0]
+    process = worker.process
+    assert get_chain_key(1, FAKE_CHAIN_CONFIG) in worker.loaded_chains
+
+    text = process_chain_messages(
+        pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+    )
+    assert text == "Bye"
+    assert worker.process is process
+
+
+def test_worker_pool_resends_chain_after_invalidation(pool):
+    """Test if the chain config is sent again after the worker dropped the chain."""
+    process_chain_messages(
+        pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+    )
+    pool.invalidate(1)
+    assert not pool.workers[0].loaded_chains
+
+    # a fresh chain starts with the first response again
+    text = process_chain_messages(
+        pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+    )
+    assert text == "Hello"
+
+
+def test_worker_pool_restarts_crashed_worker(pool):
+    """Test if a crashed worker gets restarted before it's used again."""
+    process_chain_messages(
+        pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+    )
+    worker = pool.workers[0]
+    worker.process.kill()
+    worker.process.join()
+
+    text = process_chain_messages(
+        pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+    )
+    assert text == "Hello"
+    assert worker.is_alive()
+
+
+def test_worker_pool_raises_if_worker_crashes_while_running(pool, monkeypatch):
+    """Test if a crash during a run raises WorkerCrashedError and restarts the worker."""
+    worker = pool.workers[0]
+    worker.start()
+
+    def fake_receive(_timeout):
+        raise EOFError()
+
+    monkeypatch.setattr(worker, "receive", fake_receive)
+    with pytest.raises(WorkerCrashedError):
+        process_chain_messages(
+            pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {}), None, None
+        )
+    monkeypatch.undo()
+    assert worker.is_alive()
+    assert pool.idle_workers == [worker]
+
+
+def test_stopped_worker_pool_does_not_restart_workers(pool):
+    """Test if an abandoned run doesn't restart its worker after the pool was stopped."""
+    messages = pool.run_chain(1, FAKE_CHAIN_CONFIG, {"input_text": "Hi"}, {})
+    next(messages)
+    pool.stop()
+    messages.close()
+    assert not pool.workers[0].is_alive()
+
+
+def test_worker_requires_process_methods():
+    """Test if a worker class missing the process methods can't be created."""
+
+    class IncompleteWorker(Worker):
+        """Worker that doesn't implement start, send and receive."""
+
+    with pytest.raises(TypeError):
+        IncompleteWorker(2, 0)  # pylint: disable=abstract-class-instantiated